@@ -12,6 +12,7 @@ Usage:
     python bach.py <befehl> [operation] [args]
     python bach.py --<handler> [operation] [args]
     python bach.py --startup
+    python bach.py --profile-startup <befehl> [...]   Importzeiten messen
 """
 
 import os
@@ -56,6 +57,14 @@ for p in [str(SYSTEM_ROOT), str(SKILLS_DIR), str(SKILLS_DIR / "tools")]:
     if p not in sys.path:
         sys.path.insert(0, p)
 
+# ── --profile-startup: Importzeiten messen (vor allen weiteren Imports) ──
+_startup_profiler = None
+if "--profile-startup" in sys.argv:
+    sys.argv.remove("--profile-startup")
+    from core.import_profiler import ImportProfiler
+    _startup_profiler = ImportProfiler()
+    _startup_profiler.start()
+
 # ═══════════════════════════════════════════════════════════════
 # AUTO-LOGGER
 # ═══════════════════════════════════════════════════════════════
@@ -120,22 +129,25 @@ def _run_injectors(text: str, last_command: str = ""):
 # LEGACY DB FUNCTIONS (fuer Rueckwaertskompatibilitaet)
 # ═══════════════════════════════════════════════════════════════
 
-import sqlite3
-
 def get_db():
-    """SQLite-Connection mit optimalen Einstellungen (BUG-HQ5-B-001 Fix)."""
+    """Gepoolte SQLite-Connection (BUG-HQ5-B-001 Fix). close() gibt sie zurueck."""
     from core.db import get_db_connection
     return get_db_connection(DB_PATH)
 
 def db_query(sql, params=()):
-    with get_db() as conn:
-        conn.row_factory = sqlite3.Row
+    conn = get_db()
+    try:
         return conn.execute(sql, params).fetchall()
+    finally:
+        conn.close()  # Zurueck in den Pool
 
 def db_execute(sql, params=()):
-    with get_db() as conn:
+    conn = get_db()
+    try:
         conn.execute(sql, params)
         conn.commit()
+    finally:
+        conn.close()
 
 # ═══════════════════════════════════════════════════════════════
 # INLINE COMMANDS (nicht-Handler, bleiben hier)
@@ -261,33 +273,41 @@ def _handle_file(sub_cmd, args):
 
 
 def _handle_ocr(sub_cmd, args):
-    """OCR-Tool (tools-basiert)."""
-    sys.path.insert(0, str(TOOLS_DIR))
-    from c_ocr_engine import OCREngine, find_beleg_pdf
+    """OCR-Tool (tools/ocr/engine.py)."""
+    from tools.ocr.engine import get_engine
 
     if not sub_cmd:
-        print("Usage: bach ocr <beleg_id|pdf_path>")
+        print("Usage: bach ocr <pdf_path|bild_path> [--dpi N] [--workers N]")
         return 1
 
-    if sub_cmd.lower().startswith("b") or sub_cmd.isdigit():
-        pdf_path = find_beleg_pdf(sub_cmd)
-        if not pdf_path:
-            print(f"[ERROR] Beleg {sub_cmd} nicht gefunden")
-            return 1
-        print(f"[INFO] Gefunden: {pdf_path.name}")
-    else:
-        pdf_path = Path(sub_cmd)
-        if not pdf_path.exists():
-            print(f"[ERROR] Datei nicht gefunden: {sub_cmd}")
-            return 1
+    pdf_path = Path(sub_cmd)
+    if not pdf_path.exists():
+        print(f"[ERROR] Datei nicht gefunden: {sub_cmd}")
+        return 1
 
-    engine = OCREngine()
-    if not engine.is_available:
+    def _int_opt(name):
+        if name in args:
+            idx = args.index(name)
+            if idx + 1 < len(args) and args[idx + 1].isdigit():
+                return int(args[idx + 1])
+        return None
+
+    engine = get_engine()
+    if not engine.available:
         print("[ERROR] Tesseract nicht verfuegbar!")
         return 1
 
     print(f"\n[OCR] Scanne {pdf_path.name}...")
-    results = engine.recognize_pdf(str(pdf_path))
+    if pdf_path.suffix.lower() != ".pdf":
+        result = engine.recognize_image(str(pdf_path))
+        if not result.success:
+            print(f"[ERROR] {result.error}")
+            return 1
+        print(f"\n--- {pdf_path.name} ({result.confidence:.0f}% Konfidenz) ---\n")
+        print(result.text[:2000])
+        return 0
+
+    results = engine.recognize_pdf(str(pdf_path), dpi=_int_opt("--dpi"), workers=_int_opt("--workers"))
     if not results:
         print("[WARN] Keine Ergebnisse")
         return 1
@@ -573,15 +593,17 @@ def _handle_seal(sub_cmd, args):
         print("Usage: bach seal <cmd>")
         print("Commands:")
         print("  check                      Vollstaendige Hash-Pruefung aller CORE-Dateien")
+        print("  check --paranoid           ... ohne Fingerprint-Cache (alle Dateien lesen)")
         print("  repair                     Neuen Kernel-Hash berechnen und speichern")
         print("  status                     Zeige aktuellen Seal-Status")
         return 0
 
     if sub_cmd == "check":
-        return handler.check(verbose=("--verbose" in args or "-v" in args))
+        return handler.check(verbose=("--verbose" in args or "-v" in args),
+                             paranoid="--paranoid" in args)
 
     elif sub_cmd == "repair":
-        return handler.repair()
+        return handler.repair(paranoid="--paranoid" in args)
 
     elif sub_cmd == "status":
         return handler.status()
@@ -770,6 +792,7 @@ SESSION:
   --startup              Komplettes Startprotokoll
   --shutdown [note]      Session beenden
   --status               Schnelle System-Uebersicht
+  --profile-startup <cmd>  Importzeiten pro Modul messen (stderr)
 
 TASKS:
   task add "Titel"       Task hinzufuegen
@@ -853,10 +876,8 @@ def main():
         try:
             from hub.db_sync import DBSyncManager
             manager = DBSyncManager()
-            newer = manager.find_newer_backups()
-            if newer:
-                print(f"[DB SYNC] Neueres Backup gefunden: {newer[0].name}")
-                manager.merge_backup(newer[0])
+            stats = manager.pull()
+            if any(isinstance(v, int) and v for v in stats.values()):
                 print("[DB SYNC] Sync abgeschlossen")
         except Exception as e:
             print(f"[DB SYNC] Fehler: {e}")
@@ -866,7 +887,10 @@ def main():
     def _exit_backup():
         try:
             from hub.db_sync import DBSyncManager
-            DBSyncManager().create_backup_if_needed()
+            manager = DBSyncManager()
+            if sync_config.exists():
+                manager.export_changes()
+            manager.create_backup_if_needed()
         except Exception:
             pass
     atexit.register(_exit_backup)
@@ -1122,5 +1146,19 @@ def main():
     return 1
 
 
+def _print_startup_profile():
+    """Gibt den --profile-startup Report auf stderr aus."""
+    _startup_profiler.stop()
+    if _app is not None and _app._registry is not None:
+        for name, seconds in _app._registry.import_timings:
+            _startup_profiler.add(name, seconds)
+    print("\n" + _startup_profiler.report(), file=sys.stderr)
+
+
 if __name__ == "__main__":
-    sys.exit(main())
+    try:
+        exit_code = main()
+    finally:
+        if _startup_profiler is not None:
+            _print_startup_profile()
+    sys.exit(exit_code)
@@ -84,9 +84,15 @@ class App:
         if self._registry is None:
             self._registry = HandlerRegistry()
             hub_dir = self.base_path / "hub"
-            self._registry.discover(hub_dir, aliases=COMMAND_ALIASES)
+            self._registry.discover(hub_dir, aliases=COMMAND_ALIASES,
+                                    manifest_path=self.handler_manifest_path)
         return self._registry
 
+    @property
+    def handler_manifest_path(self) -> Path:
+        """Manifest-Cache der Handler-Registry (lazy Imports)."""
+        return self.data_dir / ".handler_manifest.json"
+
     @property
     def paths(self):
         """Zugriff auf bach_paths Modul."""
@@ -152,6 +158,10 @@ class App:
         """
         self.hooks.disconnect_messaging()
 
+        if self._messaging is not None:
+            self._messaging.close()
+            self._messaging = None
+
         if self._instance_registry is not None:
             self._instance_registry.deregister()
 
@@ -167,7 +177,8 @@ class App:
         hub_dir = self.base_path / "hub"
         if self._registry is None:
             self._registry = HandlerRegistry()
-        return self._registry.reload(hub_dir, aliases=COMMAND_ALIASES)
+        return self._registry.reload(hub_dir, aliases=COMMAND_ALIASES,
+                                     manifest_path=self.handler_manifest_path)
 
     def get_handler(self, name: str):
         """Holt Handler-Instanz (Legacy oder New-Style).
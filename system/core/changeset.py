@@ -0,0 +1,400 @@
+# -*- coding: utf-8 -*-
+"""
+Copyright (c) 2026 BACH Contributors
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+
+"""
+Changeset - Inkrementelle Replikation von bach.db zwischen PCs
+===============================================================
+
+Statt ganze DB-Kopien zu mergen, zeichnen SQLite-Trigger jede Aenderung an
+den synchronisierten Tabellen in einem Change-Log auf:
+
+    _sync_changes   seq (monoton, AUTOINCREMENT), tbl, pk (JSON), op (U/D)
+    _sync_control   applying-Flag (unterdrueckt Logging beim Einspielen),
+                    exported_seq (eigener High-Water-Mark)
+    _sync_peers     pro Peer: zuletzt eingespielte seq (High-Water-Mark)
+
+Export schreibt die seit dem letzten Export geaenderten Zeilen (pro Schluessel
+nur der aktuelle Stand, geloeschte Zeilen als Delete) als kompakte
+gzip-JSON-Datei:
+
+    bachcs_<host>_<base_seq>-<to_seq>.bachcs
+
+Apply spielt eine Changeset-Datei in einer Transaktion ein (executemany in
+Batches) und setzt den High-Water-Mark des Peers. Updates und Deletes werden
+unabhaengig von Zeitstempeln uebertragen.
+
+Version: 1.0.0
+"""
+
+import gzip
+import json
+import re
+import sqlite3
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .db import json_value, sql_value, transaction
+
+CHANGESET_FORMAT = 1
+CHANGESET_SUFFIX = ".bachcs"
+APPLY_BATCH = 500          # Zeilen pro executemany
+SELECT_BATCH = 500         # Schluessel pro IN (...) beim Export
+
+_NAME_RE = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+_FILE_RE = re.compile(r"^bachcs_(?P<host>.+)_(?P<base>\d+)-(?P<to>\d+)$")
+
+SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS _sync_changes (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    tbl TEXT NOT NULL,
+    pk TEXT NOT NULL,
+    op TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS _sync_control (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    applying INTEGER NOT NULL DEFAULT 0,
+    exported_seq INTEGER NOT NULL DEFAULT 0
+);
+INSERT OR IGNORE INTO _sync_control (id, applying, exported_seq) VALUES (1, 0, 0);
+CREATE TABLE IF NOT EXISTS _sync_peers (
+    peer TEXT PRIMARY KEY,
+    last_seq INTEGER NOT NULL DEFAULT 0,
+    last_file TEXT,
+    updated_at TEXT
+);
+"""
+
+_TRIGGERS_SQL = """
+CREATE TRIGGER IF NOT EXISTS "_sync_{t}_ai" AFTER INSERT ON "{t}"
+WHEN (SELECT applying FROM _sync_control WHERE id = 1) = 0
+BEGIN
+    INSERT INTO _sync_changes (tbl, pk, op) VALUES ('{t}', json_array({new}), 'U');
+END;
+CREATE TRIGGER IF NOT EXISTS "_sync_{t}_au" AFTER UPDATE ON "{t}"
+WHEN (SELECT applying FROM _sync_control WHERE id = 1) = 0
+BEGIN
+    INSERT INTO _sync_changes (tbl, pk, op)
+        SELECT '{t}', json_array({old}), 'D' WHERE json_array({old}) IS NOT json_array({new});
+    INSERT INTO _sync_changes (tbl, pk, op) VALUES ('{t}', json_array({new}), 'U');
+END;
+CREATE TRIGGER IF NOT EXISTS "_sync_{t}_ad" AFTER DELETE ON "{t}"
+WHEN (SELECT applying FROM _sync_control WHERE id = 1) = 0
+BEGIN
+    INSERT INTO _sync_changes (tbl, pk, op) VALUES ('{t}', json_array({old}), 'D');
+END;
+"""
+
+
+# ═══════════════════════════════════════════════════════════════
+# DATEIFORMAT
+# ═══════════════════════════════════════════════════════════════
+
+def changeset_name(host: str, base_seq: int, to_seq: int) -> str:
+    return f"bachcs_{host}_{base_seq:012d}-{to_seq:012d}{CHANGESET_SUFFIX}"
+
+
+def parse_changeset_name(path: Path) -> Optional[Tuple[str, int, int]]:
+    """(host, base_seq, to_seq) aus dem Dateinamen, None wenn kein Changeset."""
+    path = Path(path)
+    if path.suffix != CHANGESET_SUFFIX:
+        return None
+    match = _FILE_RE.match(path.stem)
+    if not match:
+        return None
+    return match.group("host"), int(match.group("base")), int(match.group("to"))
+
+
+def read_changeset(path: Path) -> dict:
+    with gzip.open(str(path), "rt", encoding="utf-8") as f:
+        data = json.load(f)
+    if data.get("format") != CHANGESET_FORMAT:
+        raise ValueError(f"Unbekanntes Changeset-Format: {data.get('format')}")
+    return data
+
+
+def list_changesets(directory: Path) -> Dict[str, List[Tuple[int, int, Path]]]:
+    """Changeset-Dateien im Ordner: {host: [(base_seq, to_seq, path), ...]} nach to_seq sortiert."""
+    by_host: Dict[str, List[Tuple[int, int, Path]]] = {}
+    for path in Path(directory).glob(f"bachcs_*{CHANGESET_SUFFIX}"):
+        parsed = parse_changeset_name(path)
+        if parsed:
+            host, base, to = parsed
+            by_host.setdefault(host, []).append((base, to, path))
+    for files in by_host.values():
+        files.sort(key=lambda f: (f[1], f[0]))
+    return by_host
+
+
+def backup_seq(db_file: Path) -> int:
+    """Letzte vergebene Change-seq einer DB-Datei (z.B. eines Voll-Backups), 0 wenn unbekannt."""
+    try:
+        conn = sqlite3.connect(f"file:{Path(db_file).as_posix()}?mode=ro", uri=True)
+        try:
+            row = conn.execute(
+                "SELECT seq FROM sqlite_sequence WHERE name = '_sync_changes'"
+            ).fetchone()
+            return int(row[0]) if row else 0
+        finally:
+            conn.close()
+    except sqlite3.Error:
+        return 0
+
+
+# ═══════════════════════════════════════════════════════════════
+# CHANGE CAPTURE
+# ═══════════════════════════════════════════════════════════════
+
+def _q(name: str) -> str:
+    return f'"{name}"'
+
+
+@contextmanager
+def suppressed(conn: sqlite3.Connection):
+    """Schreibzugriffe ohne Change-Log (applying = 1), z.B. beim Einspielen
+    fremder Zeilen - sonst gingen sie beim naechsten Export als Echo zurueck.
+
+    Muss innerhalb der Schreib-Transaktion laufen, damit andere Verbindungen
+    das Flag nie sehen. Ohne _sync_control (Capture nie aktiviert) ein No-Op.
+    """
+    active = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = '_sync_control'"
+    ).fetchone() is not None
+    if active:
+        conn.execute("UPDATE _sync_control SET applying = 1 WHERE id = 1")
+    try:
+        yield conn
+    finally:
+        if active:
+            conn.execute("UPDATE _sync_control SET applying = 0 WHERE id = 1")
+
+
+def reset_log(conn: sqlite3.Connection) -> None:
+    """Verwirft das Change-Log einer kopierten DB (fremde Aenderungen, kein Export)."""
+    if conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = '_sync_changes'").fetchone():
+        conn.execute("DELETE FROM _sync_changes")
+        conn.execute("UPDATE _sync_control SET exported_seq = COALESCE("
+                     "(SELECT seq FROM sqlite_sequence WHERE name = '_sync_changes'), 0) WHERE id = 1")
+
+
+class ChangeCapture:
+    """Change-Log, Export und Apply auf einer offenen SQLite-Verbindung."""
+
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+        self.conn.executescript(SCHEMA_SQL)
+        self._table_info: Dict[str, Tuple[List[str], List[str]]] = {}
+
+    # ---------- Schema ----------
+
+    def _columns(self, table: str) -> Tuple[List[str], List[str]]:
+        """(Spalten, Primaerschluessel-Spalten) - ohne deklarierten PK: rowid."""
+        if table not in self._table_info:
+            info = self.conn.execute(f"PRAGMA table_info({_q(table)})").fetchall()
+            columns = [row[1] for row in info]
+            pk = [row[1] for row in sorted(info, key=lambda r: r[5]) if row[5] > 0]
+            self._table_info[table] = (columns, pk or ["rowid"])
+        return self._table_info[table]
+
+    def install(self, tables: Iterable[str]) -> List[str]:
+        """Legt die Change-Trigger an (idempotent). Gibt die erfassten Tabellen zurueck."""
+        installed = []
+        for table in tables:
+            if not _NAME_RE.match(table):
+                continue
+            columns, pk = self._columns(table)
+            if not columns:
+                continue  # Tabelle existiert hier nicht
+            self.conn.executescript(_TRIGGERS_SQL.format(
+                t=table,
+                new=", ".join(f"NEW.{_q(c)}" for c in pk),
+                old=", ".join(f"OLD.{_q(c)}" for c in pk),
+            ))
+            installed.append(table)
+        return installed
+
+    def captured_tables(self) -> List[str]:
+        rows = self.conn.execute(
+            "SELECT DISTINCT tbl_name FROM sqlite_master "
+            "WHERE type = 'trigger' AND name LIKE '\\_sync\\_%' ESCAPE '\\'"
+        ).fetchall()
+        return sorted(r[0] for r in rows)
+
+    # ---------- High-Water-Marks ----------
+
+    def exported_seq(self) -> int:
+        return self.conn.execute("SELECT exported_seq FROM _sync_control WHERE id = 1").fetchone()[0]
+
+    def current_seq(self) -> int:
+        row = self.conn.execute(
+            "SELECT seq FROM sqlite_sequence WHERE name = '_sync_changes'"
+        ).fetchone()
+        return int(row[0]) if row else 0
+
+    def pending_count(self) -> int:
+        return self.conn.execute(
+            "SELECT COUNT(*) FROM _sync_changes WHERE seq > ?", (self.exported_seq(),)
+        ).fetchone()[0]
+
+    def peer_seq(self, peer: str) -> Optional[int]:
+        """Zuletzt eingespielte seq des Peers, None wenn nie synchronisiert."""
+        row = self.conn.execute("SELECT last_seq FROM _sync_peers WHERE peer = ?", (peer,)).fetchone()
+        return row[0] if row else None
+
+    def set_peer_seq(self, peer: str, seq: int, last_file: str = ""):
+        self.conn.execute(
+            "INSERT INTO _sync_peers (peer, last_seq, last_file, updated_at) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT(peer) DO UPDATE SET last_seq = excluded.last_seq, "
+            "last_file = excluded.last_file, updated_at = excluded.updated_at",
+            (peer, seq, last_file, datetime.now().isoformat(timespec="seconds")),
+        )
+
+    def peers(self) -> List[dict]:
+        rows = self.conn.execute(
+            "SELECT peer, last_seq, last_file, updated_at FROM _sync_peers ORDER BY peer"
+        ).fetchall()
+        return [{"peer": r[0], "last_seq": r[1], "last_file": r[2], "updated_at": r[3]} for r in rows]
+
+    # ---------- Export ----------
+
+    def _read_rows(self, table: str, keys: List[str]) -> Tuple[List[str], List[str], Dict[str, tuple]]:
+        """Aktuelle Zeilen zu den Log-Schluesseln: (Spalten, PK, {pk_json: row})."""
+        columns, pk = self._columns(table)
+        select_cols = [c for c in pk if c not in columns] + columns
+        key_expr = f"json_array({', '.join(_q(c) for c in pk)})"
+        col_sql = ", ".join(_q(c) for c in select_cols)
+
+        found: Dict[str, tuple] = {}
+        for start in range(0, len(keys), SELECT_BATCH):
+            chunk = keys[start:start + SELECT_BATCH]
+            placeholders = ",".join("?" * len(chunk))
+            if len(pk) == 1:
+                where, params = f"{_q(pk[0])} IN ({placeholders})", [json.loads(k)[0] for k in chunk]
+            else:
+                where, params = f"{key_expr} IN ({placeholders})", chunk
+            for row in self.conn.execute(
+                f"SELECT {key_expr}, {col_sql} FROM {_q(table)} WHERE {where}", params
+            ):
+                found[row[0]] = tuple(row[1:])
+        return select_cols, pk, found
+
+    def export(self, out_dir: Path, host: str) -> Optional[Path]:
+        """
+        Schreibt alle seit dem letzten Export erfassten Aenderungen als Changeset.
+
+        Returns:
+            Pfad der Datei oder None, wenn nichts zu exportieren war.
+        """
+        base = self.exported_seq()
+        log = self.conn.execute(
+            "SELECT seq, tbl, pk FROM _sync_changes WHERE seq > ? ORDER BY seq", (base,)
+        ).fetchall()
+        if not log:
+            return None
+        to_seq = log[-1][0]
+
+        # Pro Tabelle jeden Schluessel nur einmal (Reihenfolge der letzten Aenderung)
+        keys_by_table: Dict[str, Dict[str, None]] = {}
+        for _, table, pk in log:
+            keys = keys_by_table.setdefault(table, {})
+            keys.pop(pk, None)
+            keys[pk] = None
+
+        tables = {}
+        for table, keys in keys_by_table.items():
+            if not self._columns(table)[0]:
+                continue  # Tabelle inzwischen geloescht
+            key_list = list(keys)
+            select_cols, pk, found = self._read_rows(table, key_list)
+            tables[table] = {
+                "columns": select_cols,
+                "pk": pk,
+                "upserts": [[json_value(v) for v in found[k]] for k in key_list if k in found],
+                "deletes": [[json_value(v) for v in json.loads(k)] for k in key_list if k not in found],
+            }
+
+        payload = {
+            "format": CHANGESET_FORMAT,
+            "host": host,
+            "base_seq": base,
+            "to_seq": to_seq,
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+            "tables": tables,
+        }
+        out_dir = Path(out_dir)
+        out_dir.mkdir(parents=True, exist_ok=True)
+        path = out_dir / changeset_name(host, base, to_seq)
+        tmp = path.with_name(path.name + ".tmp")
+        with gzip.open(str(tmp), "wt", encoding="utf-8") as f:
+            json.dump(payload, f, ensure_ascii=False, separators=(",", ":"))
+        tmp.replace(path)
+
+        with transaction(self.conn):
+            self.conn.execute("UPDATE _sync_control SET exported_seq = ? WHERE id = 1", (to_seq,))
+            self.conn.execute("DELETE FROM _sync_changes WHERE seq <= ?", (to_seq,))
+        return path
+
+    # ---------- Apply ----------
+
+    def apply(self, path: Path, peer: str = None) -> Dict[str, int]:
+        """
+        Spielt ein Changeset in einer Transaktion ein und setzt den
+        High-Water-Mark des Peers. Eingespielte Zeilen landen nicht im
+        eigenen Change-Log (kein Echo zurueck zum Absender).
+
+        Returns:
+            {tabelle: geaenderte Zeilen} (Upserts + Deletes)
+        """
+        data = read_changeset(path)
+        peer = peer or data["host"]
+        stats: Dict[str, int] = {}
+
+        with transaction(self.conn), suppressed(self.conn):
+            for table, block in data["tables"].items():
+                if not _NAME_RE.match(table):
+                    continue
+                local_cols = set(self._columns(table)[0])
+                if not local_cols:
+                    continue  # Tabelle gibt es lokal (noch) nicht
+                local_cols.add("rowid")
+
+                keep = [i for i, c in enumerate(block["columns"]) if c in local_cols]
+                cols = [block["columns"][i] for i in keep]
+                insert_sql = (f"INSERT OR REPLACE INTO {_q(table)} ({', '.join(_q(c) for c in cols)}) "
+                              f"VALUES ({','.join('?' * len(cols))})")
+                rows = [tuple(sql_value(r[i]) for i in keep) for r in block["upserts"]]
+                for start in range(0, len(rows), APPLY_BATCH):
+                    self.conn.executemany(insert_sql, rows[start:start + APPLY_BATCH])
+
+                delete_sql = (f"DELETE FROM {_q(table)} WHERE "
+                              + " AND ".join(f"{_q(c)} = ?" for c in block["pk"]))
+                deletes = [tuple(sql_value(v) for v in k) for k in block["deletes"]]
+                for start in range(0, len(deletes), APPLY_BATCH):
+                    self.conn.executemany(delete_sql, deletes[start:start + APPLY_BATCH])
+
+                if rows or deletes:
+                    stats[table] = len(rows) + len(deletes)
+            self.set_peer_seq(peer, data["to_seq"], Path(path).name)
+        return stats
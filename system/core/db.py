@@ -26,15 +26,324 @@ Database - Connection Management und Migration Runner
 =====================================================
 Zentrale DB-Verwaltung mit Schema-Datei und Migrationen.
 Nutzt bestehende bach.db, fuegt fehlende Tabellen per IF NOT EXISTS hinzu.
+
+Connection-Pool:
+    Alle Verbindungen (Database, get_db_connection, bach.get_db, GUI) laufen
+    ueber einen ConnectionPool pro DB-Datei. Verbindungen werden pro Thread
+    wiederverwendet, PRAGMAs nur einmal beim Oeffnen gesetzt, Statements ueber
+    den sqlite3-Statement-Cache der Verbindung wiederverwendet. close() auf
+    einer Pool-Verbindung gibt sie an den Pool zurueck.
 """
 
+import base64
+import os
 import sqlite3
+import threading
+import time
 from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
 from typing import Optional
 
 
+# Pool-Einstellungen
+POOL_MAX_CONNECTIONS = 16       # Gleichzeitig ausgeliehene Verbindungen pro DB
+POOL_MAX_IDLE_PER_THREAD = 2    # Freie Verbindungen pro Thread und Modus
+POOL_ACQUIRE_TIMEOUT = 5.0      # Danach Overflow-Verbindung statt Deadlock
+STATEMENT_CACHE_SIZE = 256      # sqlite3 cached_statements pro Verbindung
+
+
+class PooledConnection(sqlite3.Connection):
+    """sqlite3-Connection, deren close() sie an den Pool zurueckgibt."""
+
+    _pool = None
+    _readonly = False
+    _generation = 0
+    _owner_thread = None
+    _checked_out = False
+
+    def close(self):
+        pool = self._pool
+        if pool is not None:
+            pool.release(self)
+        else:
+            super().close()
+
+    def __del__(self):
+        # Nie zurueckgegebene Verbindung (fehlendes close()): Slot freigeben
+        pool = self._pool
+        if pool is not None and self._checked_out:
+            self._checked_out = False
+            pool._return_slot()
+
+    def close_really(self):
+        """Schliesst die Verbindung endgueltig (am Pool vorbei)."""
+        self._pool = None
+        super().close()
+
+
+class ConnectionPool:
+    """Thread-bewusster SQLite-Connection-Pool fuer eine DB-Datei.
+
+    - Freie Verbindungen liegen pro Thread (sqlite3 check_same_thread)
+    - PRAGMAs (WAL, foreign_keys, busy_timeout) nur beim Oeffnen
+    - readonly=True oeffnet per URI mode=ro mit query_only
+    - Wird die DB-Datei ersetzt (Restore, Sync), werden alte Verbindungen verworfen
+    """
+
+    def __init__(self, db_path: Path, timeout: float = 30.0,
+                 max_connections: int = POOL_MAX_CONNECTIONS):
+        self.db_path = Path(db_path)
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self._local = threading.local()
+        self._cond = threading.Condition()
+        self._in_use = 0
+        self._generation = 0
+        self._file_id = None
+        self._stats = {
+            "hits": 0, "misses": 0, "waits": 0, "wait_time": 0.0,
+            "overflows": 0, "lock_errors": 0, "lock_time": 0.0,
+            "discarded": 0,
+        }
+
+    # ── Ausleihen / Zurueckgeben ──
+
+    def acquire(self, readonly: bool = False) -> PooledConnection:
+        """Leiht eine Verbindung aus (wiederverwendet oder neu)."""
+        self._check_file()
+        with self._cond:
+            if self._in_use >= self.max_connections:
+                self._stats["waits"] += 1
+                start = time.perf_counter()
+                deadline = start + POOL_ACQUIRE_TIMEOUT
+                while self._in_use >= self.max_connections:
+                    remaining = deadline - time.perf_counter()
+                    if remaining <= 0:
+                        self._stats["overflows"] += 1
+                        break
+                    self._cond.wait(remaining)
+                self._stats["wait_time"] += time.perf_counter() - start
+            self._in_use += 1
+
+        try:
+            idle = self._idle(readonly)
+            while idle:
+                conn = idle.pop()
+                if conn._generation == self._generation:
+                    with self._cond:
+                        self._stats["hits"] += 1
+                    conn._checked_out = True
+                    return conn
+                self._discard(conn)
+
+            conn = self._open(readonly)
+            with self._cond:
+                self._stats["misses"] += 1
+            conn._checked_out = True
+            return conn
+        except BaseException:
+            self._return_slot()
+            raise
+
+    def release(self, conn: PooledConnection):
+        """Gibt eine Verbindung zurueck (offene Transaktion wird verworfen)."""
+        if conn._pool is not self or not conn._checked_out:
+            return  # Fremde Verbindung oder doppeltes close()
+        conn._checked_out = False
+        self._return_slot()
+
+        if conn._owner_thread != threading.get_ident() or conn._generation != self._generation:
+            self._discard(conn)
+            return
+
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+            conn.row_factory = sqlite3.Row
+            conn.text_factory = str
+            conn.isolation_level = ""
+        except sqlite3.Error:
+            self._discard(conn)
+            return
+
+        idle = self._idle(conn._readonly)
+        if len(idle) < POOL_MAX_IDLE_PER_THREAD:
+            idle.append(conn)
+        else:
+            self._discard(conn)
+
+    @contextmanager
+    def connection(self, readonly: bool = False):
+        """Context Manager: leiht aus und gibt garantiert zurueck."""
+        conn = self.acquire(readonly)
+        try:
+            yield conn
+        finally:
+            self.release(conn)
+
+    def close_all(self):
+        """Verwirft alle Verbindungen (z.B. vor Restore oder im Test)."""
+        with self._cond:
+            self._generation += 1
+        for conn in list(self._idle(False)) + list(self._idle(True)):
+            self._discard(conn)
+        self._local.__dict__.clear()
+
+    # ── Statistik ──
+
+    def record_lock(self, seconds: float):
+        """Zaehlt einen 'database is locked'-Fehler samt Wartezeit."""
+        with self._cond:
+            self._stats["lock_errors"] += 1
+            self._stats["lock_time"] += seconds
+
+    def stats(self) -> dict:
+        """Pool-Statistik (hits, misses, waits, Contention-Zeiten)."""
+        with self._cond:
+            stats = dict(self._stats)
+            stats["in_use"] = self._in_use
+        total = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = round(stats["hits"] / total, 3) if total else 0.0
+        stats["wait_time_ms"] = round(stats.pop("wait_time") * 1000, 2)
+        stats["lock_time_ms"] = round(stats.pop("lock_time") * 1000, 2)
+        stats["db_path"] = str(self.db_path)
+        return stats
+
+    # ── Intern ──
+
+    def _idle(self, readonly: bool) -> list:
+        key = "ro" if readonly else "rw"
+        idle = getattr(self._local, key, None)
+        if idle is None:
+            idle = []
+            setattr(self._local, key, idle)
+        return idle
+
+    def _return_slot(self):
+        with self._cond:
+            self._in_use = max(self._in_use - 1, 0)
+            self._cond.notify()
+
+    def _discard(self, conn: PooledConnection):
+        with self._cond:
+            self._stats["discarded"] += 1
+        try:
+            conn.close_really()
+        except sqlite3.Error:
+            pass
+
+    def _check_file(self):
+        """Neue Generation wenn die DB-Datei ersetzt wurde."""
+        try:
+            st = os.stat(self.db_path)
+            file_id = (st.st_dev, st.st_ino)
+        except OSError:
+            file_id = None
+        if file_id != self._file_id:
+            with self._cond:
+                if self._file_id is not None:
+                    self._generation += 1
+                self._file_id = file_id
+
+    def _open(self, readonly: bool) -> PooledConnection:
+        if readonly:
+            uri = self.db_path.resolve().as_uri() + "?mode=ro"
+            conn = sqlite3.connect(uri, uri=True, timeout=self.timeout,
+                                   factory=PooledConnection,
+                                   cached_statements=STATEMENT_CACHE_SIZE,
+                                   check_same_thread=True)
+        else:
+            conn = sqlite3.connect(str(self.db_path), timeout=self.timeout,
+                                   factory=PooledConnection,
+                                   cached_statements=STATEMENT_CACHE_SIZE,
+                                   check_same_thread=True)
+        conn.row_factory = sqlite3.Row
+        if not readonly:
+            conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA foreign_keys=ON")
+        conn.execute(f"PRAGMA busy_timeout={int(self.timeout * 1000)}")
+        if readonly:
+            conn.execute("PRAGMA query_only=ON")
+        conn._pool = self
+        conn._readonly = readonly
+        conn._generation = self._generation
+        conn._owner_thread = threading.get_ident()
+        if self._file_id is None:
+            self._check_file()
+        return conn
+
+
+_pools: dict[str, ConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(db_path: Path) -> ConnectionPool:
+    """Gemeinsamer Pool pro DB-Datei (prozessweit)."""
+    key = os.path.abspath(str(db_path))
+    pool = _pools.get(key)
+    if pool is None:
+        with _pools_lock:
+            pool = _pools.get(key)
+            if pool is None:
+                pool = ConnectionPool(Path(key))
+                _pools[key] = pool
+    return pool
+
+
+def pool_stats() -> dict:
+    """Statistik aller Pools: {db_path: stats}."""
+    with _pools_lock:
+        pools = list(_pools.values())
+    return {str(p.db_path): p.stats() for p in pools}
+
+
+def close_all_pools():
+    """Verwirft alle gepoolten Verbindungen des aktuellen Prozesses."""
+    with _pools_lock:
+        pools = list(_pools.values())
+    for pool in pools:
+        pool.close_all()
+
+
+@contextmanager
+def transaction(conn: sqlite3.Connection, immediate: bool = True):
+    """Transaktions-Scope: BEGIN [IMMEDIATE] ... COMMIT / ROLLBACK.
+
+    IMMEDIATE holt den Schreib-Lock sofort, damit ein Batch nicht mitten
+    im Lauf an einem anderen Schreiber scheitert.
+    """
+    if conn.in_transaction:
+        conn.commit()
+    conn.execute("BEGIN IMMEDIATE" if immediate else "BEGIN")
+    try:
+        yield conn
+    except BaseException:
+        conn.rollback()
+        raise
+    else:
+        conn.commit()
+
+
+def json_value(value):
+    """SQLite-Wert -> JSON-faehiger Wert (BLOBs als {"$b": base64})."""
+    if isinstance(value, bytes):
+        return {"$b": base64.b64encode(value).decode("ascii")}
+    return value
+
+
+def sql_value(value):
+    """Umkehrung von json_value()."""
+    if isinstance(value, dict) and "$b" in value:
+        return base64.b64decode(value["$b"])
+    return value
+
+
+def _is_lock_error(exc: Exception) -> bool:
+    msg = str(exc).lower()
+    return "locked" in msg or "busy" in msg
+
+
 class Database:
     """SQLite-Datenbank mit Connection Management und Migrationen."""
 
@@ -42,27 +351,32 @@ class Database:
         self.db_path = db_path
         self.schema_dir = schema_dir
         self._ensure_dir()
+        self.pool = get_pool(db_path)
 
     def _ensure_dir(self):
         """Stellt sicher, dass DB-Verzeichnis existiert."""
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
 
     @contextmanager
-    def connect(self):
-        """Context Manager fuer DB-Verbindung mit WAL und FK."""
-        conn = sqlite3.connect(str(self.db_path), timeout=30.0)
-        conn.row_factory = sqlite3.Row
-        conn.execute("PRAGMA journal_mode=WAL")
-        conn.execute("PRAGMA foreign_keys=ON")
-        conn.execute("PRAGMA busy_timeout=30000")  # 30 Sekunden in Millisekunden
+    def connect(self, readonly: bool = False):
+        """Context Manager fuer gepoolte DB-Verbindung mit WAL und FK.
+
+        Args:
+            readonly: Nur-Lese-Verbindung (mode=ro, query_only)
+        """
+        conn = self.pool.acquire(readonly)
+        start = time.perf_counter()
         try:
             yield conn
-            conn.commit()
-        except Exception:
+            if not readonly:
+                conn.commit()
+        except Exception as e:
+            if isinstance(e, sqlite3.OperationalError) and _is_lock_error(e):
+                self.pool.record_lock(time.perf_counter() - start)
             conn.rollback()
             raise
         finally:
-            conn.close()
+            self.pool.release(conn)
 
     def execute(self, sql: str, params: tuple = ()) -> list:
         """Fuehrt SQL aus und gibt Ergebnis als list[dict] zurueck."""
@@ -72,6 +386,23 @@ class Database:
                 return [dict(row) for row in cursor.fetchall()]
             return []
 
+    def query(self, sql: str, params: tuple = ()) -> list:
+        """Nur-Lese-Abfrage ueber eine readonly Pool-Verbindung."""
+        with self.connect(readonly=self.db_path.exists()) as conn:
+            return [dict(row) for row in conn.execute(sql, params).fetchall()]
+
+    @contextmanager
+    def transaction(self):
+        """Gepoolte Verbindung in einer BEGIN IMMEDIATE Transaktion."""
+        with self.pool.connection() as conn:
+            with transaction(conn):
+                yield conn
+
+    def execute_many(self, sql: str, seq_of_params) -> int:
+        """executemany in einer Transaktion, gibt Anzahl betroffener Zeilen zurueck."""
+        with self.transaction() as conn:
+            return conn.executemany(sql, seq_of_params).rowcount
+
     def execute_one(self, sql: str, params: tuple = ()) -> Optional[dict]:
         """Fuehrt SQL aus und gibt erste Zeile zurueck."""
         results = self.execute(sql, params)
@@ -173,7 +504,8 @@ def get_db_connection(db_path: Path) -> sqlite3.Connection:
         db_path: Pfad zur Datenbank
 
     Returns:
-        Konfigurierte SQLite-Connection
+        Konfigurierte SQLite-Connection aus dem Pool.
+        close() gibt sie an den Pool zurueck.
 
     Settings:
         - 30s Connection-Timeout (für OneDrive-Sync-Konflikte)
@@ -181,9 +513,4 @@ def get_db_connection(db_path: Path) -> sqlite3.Connection:
         - Foreign Keys aktiviert
         - 30s Busy-Timeout (für concurrent access)
     """
-    conn = sqlite3.connect(str(db_path), timeout=30.0)
-    conn.row_factory = sqlite3.Row
-    conn.execute("PRAGMA journal_mode=WAL")
-    conn.execute("PRAGMA foreign_keys=ON")
-    conn.execute("PRAGMA busy_timeout=30000")  # 30 Sekunden
-    return conn
+    return get_pool(db_path).acquire()
@@ -0,0 +1,266 @@
+# -*- coding: utf-8 -*-
+"""
+Copyright (c) 2026 BACH Contributors
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+
+"""
+Fingerprint - Stat-basierter SHA256-Cache fuer Datei-Hashes
+============================================================
+
+Siegel (startup, seal), Integrity-Check (fs_protection) und Snapshots
+(distribution) hashen dieselben CORE-Dateien. Statt bei jedem Aufruf alle
+Dateien komplett zu lesen, merkt sich der Cache pro Datei
+
+    (path, size, mtime_ns, inode) -> sha256
+
+in einer eigenen SQLite-Datei (data/cache/fingerprints.db, getrennt von
+bach.db, damit laufende Schreib-Transaktionen dort nicht blockieren).
+Neu gehasht wird nur, wenn sich der stat-Schluessel geaendert hat; diese
+Dateien werden parallel in einem Thread-Pool gelesen (hashlib gibt fuer
+grosse Bloecke den GIL frei).
+
+Racy-Clean: Dateien, deren mtime juenger als RACY_WINDOW_NS ist, werden
+gehasht, aber nicht gecacht - eine zweite Aenderung im selben
+Zeitstempel-Takt bliebe sonst unbemerkt.
+
+paranoid=True umgeht den Cache (alle Dateien werden gelesen) und
+aktualisiert ihn anschliessend.
+
+Verwendung:
+    from core.fingerprint import get_cache
+    hashes = get_cache(BACH_DB).hash_files(paths)       # {Path: hexdigest}
+    digest = get_cache(BACH_DB).file_hash(path, paranoid=True)
+"""
+
+import hashlib
+import os
+import sqlite3
+import stat
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Tuple
+
+CHUNK_SIZE = 1024 * 1024
+HASH_WORKERS = min(8, (os.cpu_count() or 2))
+PARALLEL_MIN_FILES = 4           # darunter lohnt der Thread-Pool nicht
+RACY_WINDOW_NS = 2_000_000_000   # 2 s, deckt grobe FAT/SMB-Zeitstempel ab
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS file_fingerprints (
+    path      TEXT PRIMARY KEY,
+    size      INTEGER NOT NULL,
+    mtime_ns  INTEGER NOT NULL,
+    inode     INTEGER NOT NULL,
+    sha256    TEXT NOT NULL,
+    hashed_at REAL NOT NULL
+)
+"""
+
+StatKey = Tuple[int, int, int]
+
+
+def sha256_file(path: Path) -> str:
+    """SHA256 einer Datei in Bloecken; '' bei Lesefehler."""
+    h = hashlib.sha256()
+    try:
+        with open(path, "rb") as f:
+            while chunk := f.read(CHUNK_SIZE):
+                h.update(chunk)
+    except OSError:
+        return ""
+    return h.hexdigest()
+
+
+def _stat_key(path: Path) -> Optional[StatKey]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    if not stat.S_ISREG(st.st_mode):
+        return None
+    return st.st_size, st.st_mtime_ns, st.st_ino
+
+
+class FingerprintCache:
+    """Persistenter (path, size, mtime_ns, inode) -> sha256 Cache."""
+
+    def __init__(self, cache_path: Path):
+        self.cache_path = Path(cache_path)
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "hashed": 0}
+
+    def _connect(self) -> sqlite3.Connection:
+        if self.cache_path != Path(":memory:"):
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(self.cache_path), timeout=10)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(SCHEMA)
+        return conn
+
+    def hash_files(self, paths: Iterable[Path], paranoid: bool = False) -> Dict[Path, str]:
+        """Hasht alle Dateien; nur geaenderte (oder alle bei paranoid) werden gelesen.
+
+        Returns:
+            {Path: sha256-hex} - fehlende/unlesbare Dateien fehlen im Ergebnis
+        """
+        keys: Dict[Path, StatKey] = {}
+        for p in paths:
+            if not isinstance(p, Path):
+                p = Path(p)
+            key = _stat_key(p)
+            if key is not None:
+                keys[p] = key
+        if not keys:
+            return {}
+
+        result: Dict[Path, str] = {}
+        with self._lock:
+            try:
+                conn = self._connect()
+            except sqlite3.Error:
+                conn = None
+            try:
+                if conn is not None and not paranoid:
+                    result = self._lookup(conn, keys)
+                todo = [p for p in keys if p not in result]
+                fresh = self._hash_many(todo)
+                result.update(fresh)
+                self.stats["hits"] += len(keys) - len(todo)
+                self.stats["hashed"] += len(todo)
+                if conn is not None and fresh:
+                    self._store(conn, {p: (keys[p], h) for p, h in fresh.items()})
+            finally:
+                if conn is not None:
+                    conn.close()
+        return result
+
+    def file_hash(self, path: Path, paranoid: bool = False) -> str:
+        """SHA256 einer einzelnen Datei ueber den Cache; '' wenn nicht lesbar."""
+        return self.hash_files([path], paranoid=paranoid).get(Path(path), "")
+
+    def _lookup(self, conn: sqlite3.Connection, keys: Dict[Path, StatKey]) -> Dict[Path, str]:
+        by_name = {os.path.abspath(p): p for p in keys}
+        found: Dict[Path, str] = {}
+        names = list(by_name)
+        for i in range(0, len(names), 500):
+            batch = names[i:i + 500]
+            rows = conn.execute(
+                f"SELECT path, size, mtime_ns, inode, sha256 FROM file_fingerprints "
+                f"WHERE path IN ({','.join('?' * len(batch))})", batch
+            ).fetchall()
+            for name, size, mtime_ns, inode, digest in rows:
+                p = by_name[name]
+                if keys[p] == (size, mtime_ns, inode):
+                    found[p] = digest
+        return found
+
+    def _hash_many(self, paths) -> Dict[Path, str]:
+        if len(paths) < PARALLEL_MIN_FILES:
+            digests = [sha256_file(p) for p in paths]
+        else:
+            with ThreadPoolExecutor(max_workers=HASH_WORKERS,
+                                    thread_name_prefix="bach-fingerprint") as pool:
+                digests = list(pool.map(sha256_file, paths))
+        return {p: d for p, d in zip(paths, digests) if d}
+
+    def _store(self, conn: sqlite3.Connection, entries: Dict[Path, Tuple[StatKey, str]]):
+        now_ns = time.time_ns()
+        rows = [
+            (os.path.abspath(p), key[0], key[1], key[2], digest, now_ns / 1e9)
+            for p, (key, digest) in entries.items()
+            if now_ns - key[1] >= RACY_WINDOW_NS
+        ]
+        if not rows:
+            return
+        try:
+            with conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO file_fingerprints "
+                    "(path, size, mtime_ns, inode, sha256, hashed_at) VALUES (?, ?, ?, ?, ?, ?)",
+                    rows,
+                )
+        except sqlite3.Error:
+            pass  # Cache ist optional, Hashes sind trotzdem korrekt
+
+    def clear(self):
+        """Verwirft alle gecachten Fingerprints."""
+        with self._lock:
+            try:
+                conn = self._connect()
+                with conn:
+                    conn.execute("DELETE FROM file_fingerprints")
+                conn.close()
+            except sqlite3.Error:
+                pass
+
+
+_caches: Dict[str, FingerprintCache] = {}
+_caches_lock = threading.Lock()
+
+
+def cache_path_for(db_path: Path) -> Path:
+    """Cache-Datei neben bach.db: data/cache/fingerprints.db."""
+    return Path(db_path).parent / "cache" / "fingerprints.db"
+
+
+def get_cache(db_path: Optional[Path] = None) -> FingerprintCache:
+    """Prozessweiter Cache zur jeweiligen bach.db (default: hub.bach_paths.BACH_DB)."""
+    if db_path is None:
+        from hub.bach_paths import BACH_DB
+        db_path = BACH_DB
+    key = str(Path(db_path).resolve())
+    with _caches_lock:
+        cache = _caches.get(key)
+        if cache is None:
+            cache = _caches[key] = FingerprintCache(cache_path_for(db_path))
+        return cache
+
+
+def _bench(root: Path):
+    """Vergleicht Vollhash, kalten und warmen Cache ueber alle Dateien unter root."""
+    import tempfile
+
+    files = [p for p in root.rglob("*") if p.is_file() and "__pycache__" not in p.parts]
+    t = time.perf_counter()
+    for p in files:
+        sha256_file(p)
+    full = time.perf_counter() - t
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = FingerprintCache(Path(tmp) / "fingerprints.db")
+        t = time.perf_counter()
+        cache.hash_files(files)
+        cold = time.perf_counter() - t
+        t = time.perf_counter()
+        cache.hash_files(files)
+        warm = time.perf_counter() - t
+    print(f"{len(files)} Dateien: sequentiell {full * 1000:.0f} ms, "
+          f"Cache kalt (parallel) {cold * 1000:.0f} ms, Cache warm {warm * 1000:.1f} ms "
+          f"(warm: {cache.stats['hits']} Treffer)")
+
+
+if __name__ == "__main__":
+    import sys
+    if "--bench" in sys.argv:
+        _bench(Path(sys.argv[-1]) if len(sys.argv) > 2 else Path(__file__).resolve().parent.parent)
@@ -320,16 +320,22 @@ class HookRegistry:
         """Prueft ob Messaging verbunden ist."""
         return self._messaging is not None
 
-    def poll_messages(self) -> int:
+    def poll_messages(self, wait: float = 0) -> int:
         """Pollt eingehende Nachrichten und emittiert sie als lokale Events.
 
         Convenience-Methode die InstanceMessaging.process_incoming() aufruft.
 
+        Args:
+            wait: Sekunden, die vorher auf Nachrichten gewartet wird
+                  (mit Notifier: Rueckkehr sofort beim Eintreffen)
+
         Returns:
             Anzahl verarbeiteter Nachrichten (0 wenn Messaging nicht verbunden)
         """
         if self._messaging is None:
             return 0
+        if wait > 0 and not self._messaging.wait_for_messages(wait):
+            return 0
         return self._messaging.process_incoming(self)
 
 
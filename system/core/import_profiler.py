@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+"""
+Copyright (c) 2026 BACH Contributors
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+"""
+Import-Profiler - Startzeit-Analyse fuer bach --profile-startup
+================================================================
+Haengt sich in builtins.__import__ und misst fuer jedes tatsaechlich
+geladene Modul die kumulierte Zeit (inkl. Unter-Imports) und die
+Eigenzeit (ohne Unter-Imports).
+
+Nutzung:
+    profiler = ImportProfiler()
+    profiler.start()
+    ...  # CLI ausfuehren
+    profiler.stop()
+    print(profiler.report())
+"""
+
+import builtins
+import sys
+import time
+
+
+class ImportProfiler:
+    """Misst Importzeiten pro Modul."""
+
+    def __init__(self):
+        self._original_import = None
+        self._stack: list[list] = []  # [name, start, child_time]
+        self.records: dict[str, dict] = {}  # name -> {cumulative, self, depth}
+        self.extra: list[tuple[str, float]] = []  # Extern gemessene Imports (z.B. Handler)
+        self.started_at: float = 0.0
+        self.stopped_at: float = 0.0
+
+    def start(self):
+        """Aktiviert die Messung."""
+        if self._original_import is not None:
+            return
+        self._original_import = builtins.__import__
+        self.started_at = time.perf_counter()
+        builtins.__import__ = self._import
+
+    def stop(self):
+        """Deaktiviert die Messung."""
+        if self._original_import is None:
+            return
+        builtins.__import__ = self._original_import
+        self._original_import = None
+        self.stopped_at = time.perf_counter()
+
+    def add(self, name: str, seconds: float):
+        """Fuegt eine extern gemessene Importzeit hinzu (exec_module-Pfade)."""
+        self.extra.append((name, seconds))
+
+    def _import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        # Relative Imports und bereits geladene Module nicht messen
+        if level or name in sys.modules:
+            return self._original_import(name, globals, locals, fromlist, level)
+
+        frame = [name, time.perf_counter(), 0.0]
+        self._stack.append(frame)
+        try:
+            return self._original_import(name, globals, locals, fromlist, level)
+        finally:
+            self._stack.pop()
+            elapsed = time.perf_counter() - frame[1]
+            if self._stack:
+                self._stack[-1][2] += elapsed
+            if name not in self.records:
+                self.records[name] = {
+                    "cumulative": elapsed,
+                    "self": max(elapsed - frame[2], 0.0),
+                    "depth": len(self._stack),
+                }
+
+    def report(self, top: int = 25) -> str:
+        """Formatierter Report (Top-N nach Eigenzeit)."""
+        end = self.stopped_at or time.perf_counter()
+        total = end - self.started_at
+        import_total = sum(r["cumulative"] for r in self.records.values()
+                           if r["depth"] == 0)
+
+        lines = [
+            "[PROFILE-STARTUP] Importzeiten",
+            f"  Gesamtlaufzeit:     {total * 1000:8.1f} ms",
+            f"  Imports (top-level):{import_total * 1000:8.1f} ms"
+            f"  ({len(self.records)} Module)",
+            "",
+            f"  {'Eigen ms':>9}  {'Kumul. ms':>9}  Modul",
+        ]
+        ranked = sorted(self.records.items(), key=lambda kv: kv[1]["self"], reverse=True)
+        for name, rec in ranked[:top]:
+            lines.append(f"  {rec['self'] * 1000:9.1f}  {rec['cumulative'] * 1000:9.1f}  "
+                         f"{'  ' * min(rec['depth'], 4)}{name}")
+
+        if self.extra:
+            lines.append("")
+            lines.append("  Handler-Module (exec_module):")
+            for name, seconds in sorted(self.extra, key=lambda x: x[1], reverse=True):
+                lines.append(f"  {seconds * 1000:9.1f}  {'':>9}  {name}")
+
+        return "\n".join(lines)
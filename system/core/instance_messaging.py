@@ -22,13 +22,22 @@ SOFTWARE.
 """
 
 """
-Inter-Instance Messaging - File-basiertes Message-Passing zwischen BACH-Instanzen
-==================================================================================
+Inter-Instance Messaging - Message-Passing zwischen BACH-Instanzen
+==================================================================
 
-Nachrichten sind JSON-Dateien in einem Shared Directory:
+Zustellung ueber austauschbare Transporte (core/message_transport.py):
 
-    data/messages/pending/<to_instance>/<timestamp>_<from>_<event>.json
-    data/messages/archive/<date>/<timestamp>_<from>_<event>.json
+    segment  Append-only Segment-Log pro Empfaenger mit Leser-Offsets
+             data/messages/log/<to_instance>/<segment>.log   (Standard)
+    file     Eine JSON-Datei pro Nachricht (bisheriges Format)
+             data/messages/pending/<to_instance>/<timestamp>_<event>_<id>.json
+             data/messages/archive/<date>/...
+
+Das Dateiformat bleibt Fallback: Schlaegt das Anhaengen ans Log fehl, wird
+die Nachricht als Datei geschrieben, und receive() liest immer auch die
+pending/-Ordner. Mit notify=True bindet jede Instanz einen Unix-Socket;
+Sender wecken den Empfaenger, wait_for_messages() kehrt sofort zurueck
+statt zu pollen.
 
 Nachrichtenformat:
     {
@@ -42,60 +51,78 @@ Nachrichtenformat:
     }
 
 Design-Entscheidungen:
-    - Kein Netzwerk noetig (nur Filesystem)
-    - OneDrive-kompatibel (kein File-Locking, atomic writes)
+    - Kein Netzwerk noetig (Filesystem, Weckruf ueber lokale Sockets)
     - TTL fuer automatische Bereinigung alter Nachrichten
-    - Empfaenger-Ordner (pending/<instance_id>/) fuer schnelles Polling
-    - Broadcast via "*"-Ordner (alle lesen)
+    - Empfaenger-Log/-Ordner fuer schnelles Lesen
+    - Broadcast via "_broadcast" (alle lesen, jeder mit eigenem Offset)
+    - Transport per Argument oder BACH_MESSAGING_TRANSPORT waehlbar;
+      "file" fuer Datenordner, die zwischen Rechnern synchronisiert werden
 
-Version: 1.0.0
+Version: 1.1.0
 """
 
-import json
 import os
 import time
 import uuid
-from datetime import datetime, timedelta
+from datetime import datetime
 from pathlib import Path
 from typing import Optional
 
-# Maximales Alter fuer Nachrichten (Standard: 5 Minuten)
-DEFAULT_TTL_SECONDS = 300
+from .message_transport import (
+    BROADCAST, DEFAULT_TTL_SECONDS, FileTransport, Notifier,
+    SegmentLogTransport, is_expired,
+)
+
+# Standard-Transport ("segment" oder "file")
+DEFAULT_TRANSPORT = os.environ.get("BACH_MESSAGING_TRANSPORT", "segment")
 
-# Maximale Anzahl Nachrichten im Archive pro Tag (Guard gegen Massen-Aufrufe)
-MAX_ARCHIVE_PER_DAY = 1000
+# Poll-Intervall fuer wait_for_messages() ohne Notifier
+POLL_INTERVAL = 0.25
 
 
 class InstanceMessaging:
-    """File-basiertes Inter-Instanz-Messaging.
+    """Inter-Instanz-Messaging ueber Segment-Log oder Einzeldateien.
 
-    Nachrichten werden als JSON-Dateien geschrieben und vom Empfaenger
-    gelesen und ins Archiv verschoben.
+    Empfangene Nachrichten gelten als konsumiert (Offset vorgerueckt bzw.
+    Datei archiviert).
     """
 
-    def __init__(self, data_dir: Path, instance_id: str):
+    def __init__(self, data_dir: Path, instance_id: str,
+                 transport: Optional[str] = None, notify: bool = True):
         """Initialisiert das Messaging-System.
 
         Args:
             data_dir: Pfad zum data/ Verzeichnis
             instance_id: ID dieser Instanz (z.B. "DESKTOP-ABC-12345")
+            transport: "segment" oder "file" (Standard: DEFAULT_TRANSPORT)
+            notify: Empfaenger per Unix-Socket wecken (falls verfuegbar)
         """
         self.messages_dir = data_dir / "messages"
-        self.pending_dir = self.messages_dir / "pending"
-        self.archive_dir = self.messages_dir / "archive"
         self.instance_id = instance_id
+        self.transport_name = transport or DEFAULT_TRANSPORT
+
+        # Datei-Transport: Fallback und Format fuer transport="file"
+        self._files = FileTransport(self.messages_dir)
+        self.pending_dir = self._files.pending_dir
+        self.archive_dir = self._files.archive_dir
 
-        # Verzeichnisse erstellen
-        self.pending_dir.mkdir(parents=True, exist_ok=True)
-        self.archive_dir.mkdir(parents=True, exist_ok=True)
+        # Eigenen Posteingang und Broadcast-Verzeichnis erstellen
+        self._my_inbox = self._files.inbox(self.instance_id)
+        self._broadcast_dir = self._files.inbox(BROADCAST)
 
-        # Eigenen Posteingang erstellen
-        self._my_inbox = self.pending_dir / self.instance_id
-        self._my_inbox.mkdir(exist_ok=True)
+        self._log: Optional[SegmentLogTransport] = None
+        if self.transport_name == SegmentLogTransport.name:
+            self._log = SegmentLogTransport(self.messages_dir)
 
-        # Broadcast-Verzeichnis
-        self._broadcast_dir = self.pending_dir / "_broadcast"
-        self._broadcast_dir.mkdir(exist_ok=True)
+        self._notifier: Optional[Notifier] = None
+        self._wait_primed = False
+        if notify:
+            self._notifier = Notifier(self.messages_dir, self.instance_id)
+
+    @property
+    def notify_available(self) -> bool:
+        """True wenn Empfaenger per Socket geweckt werden (sonst Polling)."""
+        return self._notifier is not None and self._notifier.available
 
     def send(self, to_instance: str, event: str,
              context: dict = None, ttl: int = DEFAULT_TTL_SECONDS) -> bool:
@@ -111,15 +138,23 @@ class InstanceMessaging:
             True wenn erfolgreich geschrieben
         """
         msg = self._create_message(to_instance, event, context, ttl)
+        return self._deliver({to_instance: [msg]}) == 1
 
-        # Ziel-Verzeichnis erstellen falls noetig
-        target_dir = self.pending_dir / to_instance
-        target_dir.mkdir(exist_ok=True)
+    def send_many(self, to_instance: str, events: list,
+                  ttl: int = DEFAULT_TTL_SECONDS) -> int:
+        """Sendet mehrere Nachrichten an eine Instanz mit einem Schreibzugriff.
 
-        filename = self._message_filename(msg)
-        target_file = target_dir / filename
+        Args:
+            to_instance: Ziel-Instanz-ID
+            events: Liste von (event, context)-Tupeln
+            ttl: Time-To-Live in Sekunden
 
-        return self._safe_write_json(target_file, msg)
+        Returns:
+            Anzahl geschriebener Nachrichten
+        """
+        msgs = [self._create_message(to_instance, event, context, ttl)
+                for event, context in events]
+        return self._deliver({to_instance: msgs})
 
     def broadcast(self, event: str, context: dict = None,
                   ttl: int = DEFAULT_TTL_SECONDS,
@@ -128,7 +163,7 @@ class InstanceMessaging:
 
         Zwei Strategien:
         1. Wenn Registry verfuegbar: Direkt an jeden einzeln
-        2. Ohne Registry: In _broadcast/ ablegen (alle lesen dort)
+        2. Ohne Registry: In _broadcast ablegen (alle lesen dort)
 
         Args:
             event: Event-Name
@@ -139,30 +174,22 @@ class InstanceMessaging:
         Returns:
             Anzahl gesendeter Nachrichten
         """
-        sent = 0
-
         if registry:
             # Strategie 1: Gezielte Zustellung
-            others = registry.list_other_instances()
-            for inst in others:
+            batches = {}
+            for inst in registry.list_other_instances():
                 target_id = inst.get("instance_id")
-                if target_id and self.send(target_id, event, context, ttl):
-                    sent += 1
-        else:
-            # Strategie 2: Broadcast-Verzeichnis
-            msg = self._create_message("*", event, context, ttl)
-            filename = self._message_filename(msg)
-            target_file = self._broadcast_dir / filename
+                if target_id:
+                    batches[target_id] = [self._create_message(target_id, event, context, ttl)]
+            return self._deliver(batches)
 
-            if self._safe_write_json(target_file, msg):
-                sent = 1
-
-        return sent
+        # Strategie 2: Broadcast-Log bzw. -Verzeichnis
+        msg = self._create_message("*", event, context, ttl)
+        return 1 if self._deliver({BROADCAST: [msg]}) else 0
 
     def receive(self, include_broadcast: bool = True) -> list[dict]:
-        """Liest und archiviert ausstehende Nachrichten fuer diese Instanz.
+        """Liest und konsumiert ausstehende Nachrichten fuer diese Instanz.
 
-        Nachrichten werden nach dem Lesen ins Archiv verschoben.
         Abgelaufene Nachrichten (TTL ueberschritten) werden verworfen.
 
         Args:
@@ -171,20 +198,53 @@ class InstanceMessaging:
         Returns:
             Liste von Nachricht-Dicts (nur gueltige, nicht-abgelaufene)
         """
-        messages = []
-
-        # 1. Eigenen Posteingang lesen
-        messages.extend(self._read_from_dir(self._my_inbox))
-
-        # 2. Broadcast-Verzeichnis lesen
+        recipients = [self.instance_id]
         if include_broadcast:
-            messages.extend(self._read_from_dir(self._broadcast_dir, is_broadcast=True))
+            recipients.append(BROADCAST)
+
+        messages = []
+        for recipient in recipients:
+            if self._log is not None:
+                messages.extend(self._log.read(recipient, self.instance_id))
+            # Fallback-Dateien (auch von Instanzen mit transport="file")
+            messages.extend(self._files.read(recipient, self.instance_id))
 
         # Nach Zeitstempel sortieren (aelteste zuerst)
         messages.sort(key=lambda m: m.get("created_at", ""))
 
         return messages
 
+    def wait_for_messages(self, timeout: float,
+                          poll_interval: float = POLL_INTERVAL) -> bool:
+        """Wartet bis Nachrichten anstehen oder timeout abgelaufen ist.
+
+        Mit Notifier blockiert der Aufruf auf dem Socket und kehrt beim
+        Weckruf sofort zurueck, sonst wird pending_count() gepollt. Ein
+        Weckruf kann auch von bereits gelesenen Nachrichten stammen.
+
+        Returns:
+            True wenn (wahrscheinlich) Nachrichten anstehen
+        """
+        if self.notify_available:
+            # Weckrufe kommen erst ab dem Binden des Sockets; was davor
+            # geschrieben wurde, findet nur der erste pending_count()
+            if not self._wait_primed:
+                self._wait_primed = True
+                if self.pending_count() > 0:
+                    return True
+            return self._notifier.wait(timeout)
+        if self.pending_count() > 0:
+            return True
+
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            time.sleep(min(poll_interval, remaining))
+            if self.pending_count() > 0:
+                return True
+
     def process_incoming(self, hooks_registry) -> int:
         """Liest ausstehende Nachrichten und emittiert sie als lokale Hook-Events.
 
@@ -217,7 +277,7 @@ class InstanceMessaging:
                 hooks_registry.emit(event, context)
                 processed += 1
             except Exception:
-                # Fehler beim Verarbeiten -- Nachricht ist schon archiviert
+                # Fehler beim Verarbeiten -- Nachricht ist schon konsumiert
                 pass
 
         return processed
@@ -225,46 +285,38 @@ class InstanceMessaging:
     def pending_count(self) -> int:
         """Zaehlt ausstehende Nachrichten fuer diese Instanz.
 
+        Eigene Broadcasts zaehlen nicht. Im Segment-Log wird dafuer nur
+        das Absender-Praefix jeder Zeile verglichen, kein JSON geparst.
+
         Returns:
             Anzahl ausstehender Nachrichten
         """
         count = 0
-
-        if self._my_inbox.exists():
-            count += len(list(self._my_inbox.glob("*.json")))
-
-        if self._broadcast_dir.exists():
-            for f in self._broadcast_dir.glob("*.json"):
-                msg = self._safe_read_json(f)
-                if msg and msg.get("from_instance") != self.instance_id:
-                    count += 1
-
+        for recipient in (self.instance_id, BROADCAST):
+            if self._log is not None:
+                count += self._log.pending_count(recipient, self.instance_id)
+            count += self._files.pending_count(recipient, self.instance_id)
         return count
 
     def cleanup_expired(self) -> int:
-        """Raeumt abgelaufene Nachrichten in allen Verzeichnissen auf.
+        """Raeumt abgelaufene Nachrichten und konsumierte Log-Segmente auf.
 
         Returns:
             Anzahl aufgeraeumter Nachrichten
         """
-        removed = 0
         now = datetime.now()
-
-        # Alle pending-Unterverzeichnisse durchgehen
-        if not self.pending_dir.exists():
-            return 0
-
-        for subdir in self.pending_dir.iterdir():
-            if not subdir.is_dir():
-                continue
-            for f in subdir.glob("*.json"):
-                msg = self._safe_read_json(f)
-                if msg and self._is_expired(msg, now):
-                    self._safe_remove(f)
-                    removed += 1
-
+        removed = self._files.cleanup_expired(now)
+        if self._log is not None:
+            removed += self._log.cleanup_expired(now)
         return removed
 
+    def close(self):
+        """Gibt Notifier-Socket und Offset-Dateien frei (beim Shutdown aufrufen)."""
+        if self._notifier is not None:
+            self._notifier.close()
+        if self._log is not None:
+            self._log.close()
+
     def status(self) -> str:
         """Gibt formatierten Messaging-Status zurueck."""
         pending = self.pending_count()
@@ -272,23 +324,27 @@ class InstanceMessaging:
             "INSTANCE MESSAGING STATUS",
             "=" * 50,
             f"Instanz: {self.instance_id}",
+            f"Transport: {self.transport_name}"
+            f" (Weckruf: {'Unix-Socket' if self.notify_available else 'Polling'})",
             f"Pending Nachrichten: {pending}",
             f"Pending-Dir: {self.pending_dir}",
             f"Archive-Dir: {self.archive_dir}",
         ]
+        if self._log is not None:
+            lines.append(f"Log-Dir: {self._log.log_dir}")
 
         # Pending-Nachrichten auflisten (ohne zu konsumieren)
-        if self._my_inbox.exists():
-            inbox_files = list(self._my_inbox.glob("*.json"))
-            if inbox_files:
-                lines.append(f"\nDirekte Nachrichten ({len(inbox_files)}):")
-                for f in inbox_files[:10]:  # Max 10 anzeigen
-                    msg = self._safe_read_json(f)
-                    if msg:
-                        lines.append(
-                            f"  [{msg.get('created_at', '?')[:19]}] "
-                            f"{msg.get('event', '?')} von {msg.get('from_instance', '?')}"
-                        )
+        direct = []
+        if self._log is not None:
+            direct.extend(self._log.peek(self.instance_id))
+        direct.extend(self._files.peek(self.instance_id))
+        if direct:
+            lines.append("\nDirekte Nachrichten:")
+            for msg in direct[:10]:  # Max 10 anzeigen
+                lines.append(
+                    f"  [{msg.get('created_at', '?')[:19]}] "
+                    f"{msg.get('event', '?')} von {msg.get('from_instance', '?')}"
+                )
 
         return "\n".join(lines)
 
@@ -310,149 +366,33 @@ class InstanceMessaging:
             "ttl_seconds": ttl,
         }
 
-    @staticmethod
-    def _message_filename(msg: dict) -> str:
-        """Erzeugt einen Dateinamen fuer eine Nachricht."""
-        ts = msg.get("created_at", "").replace(":", "-").replace(".", "-")
-        event = msg.get("event", "unknown")
-        msg_id = msg.get("id", "unknown")
-        # Kurzformat: Nur die letzten 8 Zeichen der ID
-        short_id = msg_id[-8:] if len(msg_id) > 8 else msg_id
-        return f"{ts}_{event}_{short_id}.json"
-
-    def _read_from_dir(self, directory: Path, is_broadcast: bool = False) -> list[dict]:
-        """Liest Nachrichten aus einem Verzeichnis und archiviert sie.
+    def _deliver(self, batches: dict) -> int:
+        """Schreibt {empfaenger: [nachrichten]} und weckt die Empfaenger.
 
-        Args:
-            directory: Verzeichnis zum Lesen
-            is_broadcast: True wenn Broadcast-Verzeichnis (eigene Nachrichten skippen)
+        Pro Empfaenger ein Append ans Segment-Log; schlaegt das fehl (oder
+        transport="file"), wird jede Nachricht als Datei geschrieben.
 
         Returns:
-            Liste von gueltigen Nachrichten
+            Anzahl geschriebener Nachrichten
         """
-        messages = []
-        now = datetime.now()
-
-        if not directory.exists():
-            return messages
-
-        for f in directory.glob("*.json"):
-            msg = self._safe_read_json(f)
-            if msg is None:
-                self._safe_remove(f)
-                continue
-
-            # Eigene Broadcasts skippen
-            if is_broadcast and msg.get("from_instance") == self.instance_id:
-                continue
-
-            # Abgelaufene Nachrichten verwerfen
-            if self._is_expired(msg, now):
-                self._safe_remove(f)
-                continue
-
-            # Nachricht archivieren (bei Broadcast: nicht loeschen, andere muessen auch lesen)
-            if is_broadcast:
-                # Broadcast-Nachrichten markieren wir als gelesen fuer diese Instanz
-                # indem wir eine .read-Marker-Datei erstellen
-                read_marker = f.with_suffix(f".read-{self.instance_id}")
-                if read_marker.exists():
-                    # Schon gelesen -- skip
-                    continue
-                try:
-                    read_marker.touch()
-                except OSError:
-                    pass
+        sent = 0
+        woken = []
+        for recipient, msgs in batches.items():
+            written = self._log.append(recipient, msgs) if self._log is not None else 0
+            if not written:
+                written = self._files.append(recipient, msgs)
+            if written:
+                sent += written
+                woken.append(recipient)
+
+        if self._notifier is not None and woken:
+            if BROADCAST in woken:
+                self._notifier.notify_all()
             else:
-                # Direkte Nachrichten: ins Archiv verschieben
-                self._archive_message(f, msg)
-
-            messages.append(msg)
-
-        return messages
-
-    def _archive_message(self, source_file: Path, msg: dict):
-        """Verschiebt eine Nachricht ins Archiv.
-
-        Args:
-            source_file: Quell-Datei
-            msg: Nachricht-Dict
-        """
-        date_str = datetime.now().strftime("%Y-%m-%d")
-        day_archive = self.archive_dir / date_str
-        day_archive.mkdir(exist_ok=True)
-
-        # Guard: Nicht zu viele Archiv-Dateien pro Tag
-        existing = len(list(day_archive.glob("*.json")))
-        if existing >= MAX_ARCHIVE_PER_DAY:
-            # Einfach loeschen statt archivieren
-            self._safe_remove(source_file)
-            return
-
-        target = day_archive / source_file.name
-        try:
-            # Verschieben (atomic auf gleichem Filesystem)
-            os.replace(str(source_file), str(target))
-        except OSError:
-            # Fallback: Kopieren und loeschen
-            self._safe_write_json(target, msg)
-            self._safe_remove(source_file)
+                self._notifier.notify(woken)
+        return sent
 
     @staticmethod
     def _is_expired(msg: dict, now: datetime) -> bool:
         """Prueft ob eine Nachricht abgelaufen ist."""
-        ttl = msg.get("ttl_seconds", DEFAULT_TTL_SECONDS)
-        created_str = msg.get("created_at", "")
-
-        try:
-            created = datetime.fromisoformat(created_str)
-            return (now - created) > timedelta(seconds=ttl)
-        except (ValueError, TypeError):
-            # Kann nicht geparst werden -- als abgelaufen betrachten
-            return True
-
-    @staticmethod
-    def _safe_write_json(path: Path, data: dict) -> bool:
-        """Schreibt JSON-Datei atomar.
-
-        Returns:
-            True wenn erfolgreich
-        """
-        tmp_path = path.with_suffix(".tmp")
-        try:
-            with open(tmp_path, "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
-            os.replace(str(tmp_path), str(path))
-            return True
-        except OSError:
-            try:
-                tmp_path.unlink(missing_ok=True)
-            except OSError:
-                pass
-            # Fallback: Direkt schreiben
-            try:
-                with open(path, "w", encoding="utf-8") as f:
-                    json.dump(data, f, indent=2, ensure_ascii=False)
-                return True
-            except OSError:
-                return False
-
-    @staticmethod
-    def _safe_read_json(path: Path) -> Optional[dict]:
-        """Liest JSON-Datei sicher."""
-        for attempt in range(3):
-            try:
-                with open(path, "r", encoding="utf-8") as f:
-                    return json.load(f)
-            except (OSError, json.JSONDecodeError):
-                if attempt < 2:
-                    time.sleep(0.1)
-        return None
-
-    @staticmethod
-    def _safe_remove(path: Path):
-        """Loescht Datei sicher."""
-        try:
-            path.unlink(missing_ok=True)
-        except OSError:
-            pass
+        return is_expired(msg, now)
@@ -0,0 +1,860 @@
+# -*- coding: utf-8 -*-
+"""
+Copyright (c) 2026 BACH Contributors
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+"""
+Message Transport - Zustellwege fuer InstanceMessaging
+======================================================
+
+Drei Bausteine:
+
+    FileTransport        Eine JSON-Datei pro Nachricht und Empfaenger
+                         (bisheriges Format, bleibt Fallback)
+                         data/messages/pending/<to_instance>/*.json
+
+    SegmentLogTransport  Append-only Log pro Empfaenger
+                         data/messages/log/<to_instance>/<segment>.log
+                         Jede Zeile: "<from_instance>\\t<json>\\n"
+                         Leser merken sich (Segment, Byte-Offset) in
+                         .offset (Posteingang) bzw. .offset-<instanz>
+                         (_broadcast, jeder Leser einzeln)
+
+    Notifier             Unix-Datagram-Socket pro Instanz. Sender wecken
+                         den Empfaenger nach dem Schreiben, statt dass er
+                         pollt. Ohne AF_UNIX/SOCK_DGRAM (Windows) bleibt
+                         es beim Polling.
+
+Der Absender steht vor dem JSON, damit pending_count() und das Ueberspringen
+eigener Broadcasts ohne JSON-Parsing auskommen.
+
+Schreiben: ein os.write() pro Empfaenger und Batch (O_APPEND). Das Segment
+wird unter einer Sperrdatei (.lock) gewaehlt und ab SEGMENT_BYTES gerollt;
+danach schreibt niemand mehr in das alte Segment. Lesen: ein read() ab
+Offset bis zum letzten vollstaendigen Zeilenende.
+
+Benchmark:
+    python -m core.message_transport --bench [--messages 10000] [--instances 5]
+
+Version: 1.0.0
+"""
+
+import hashlib
+import json
+import os
+import select
+import socket
+import tempfile
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Iterable, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+try:
+    import msvcrt
+except ImportError:  # POSIX
+    msvcrt = None
+
+# Maximales Alter fuer Nachrichten (Standard: 5 Minuten)
+DEFAULT_TTL_SECONDS = 300
+
+# Maximale Anzahl Nachrichten im Archive pro Tag (Guard gegen Massen-Aufrufe)
+MAX_ARCHIVE_PER_DAY = 1000
+
+# Segmentgroesse, ab der ein neues Log-Segment begonnen wird
+SEGMENT_BYTES = 1 << 20
+
+# Empfaenger-Name fuer Broadcasts (alle Instanzen lesen dort)
+BROADCAST = "_broadcast"
+
+# Unix-Socket-Pfade sind auf ~104-108 Zeichen begrenzt
+_MAX_SOCKET_PATH = 100
+
+_O_BINARY = getattr(os, "O_BINARY", 0)
+
+
+def is_expired(msg: dict, now: datetime) -> bool:
+    """Prueft ob eine Nachricht abgelaufen ist."""
+    ttl = msg.get("ttl_seconds", DEFAULT_TTL_SECONDS)
+    created_str = msg.get("created_at", "")
+
+    try:
+        created = datetime.fromisoformat(created_str)
+        return (now - created) > timedelta(seconds=ttl)
+    except (ValueError, TypeError):
+        # Kann nicht geparst werden -- als abgelaufen betrachten
+        return True
+
+
+@contextmanager
+def _dir_lock(directory: Path):
+    """Exklusive Sperre ueber <directory>/.lock (flock bzw. msvcrt)."""
+    fd = os.open(str(directory / ".lock"), os.O_RDWR | os.O_CREAT | _O_BINARY, 0o644)
+    try:
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+        elif msvcrt is not None:
+            msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+        yield
+    finally:
+        try:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+            elif msvcrt is not None:
+                os.lseek(fd, 0, os.SEEK_SET)
+                msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+        except OSError:
+            pass
+        os.close(fd)
+
+
+# ═══════════════════════════════════════════════════════════════
+# FILE TRANSPORT (Fallback)
+# ═══════════════════════════════════════════════════════════════
+
+class FileTransport:
+    """Eine JSON-Datei pro Nachricht und Empfaenger.
+
+    OneDrive-kompatibel (kein File-Locking, atomic writes), aber jedes
+    receive() listet und parst alle Dateien im Posteingang.
+    """
+
+    name = "file"
+
+    def __init__(self, messages_dir: Path):
+        self.pending_dir = messages_dir / "pending"
+        self.archive_dir = messages_dir / "archive"
+        self.pending_dir.mkdir(parents=True, exist_ok=True)
+        self.archive_dir.mkdir(parents=True, exist_ok=True)
+
+    def inbox(self, recipient: str) -> Path:
+        """Posteingangs-Verzeichnis eines Empfaengers (wird angelegt)."""
+        inbox = self.pending_dir / recipient
+        inbox.mkdir(exist_ok=True)
+        return inbox
+
+    def append(self, recipient: str, messages: list[dict]) -> int:
+        """Schreibt jede Nachricht als eigene Datei. Gibt Anzahl zurueck."""
+        target_dir = self.inbox(recipient)
+        written = 0
+        for msg in messages:
+            if self._safe_write_json(target_dir / self._message_filename(msg), msg):
+                written += 1
+        return written
+
+    def read(self, recipient: str, reader: str) -> list[dict]:
+        """Liest gueltige Nachrichten und archiviert (direkt) bzw. markiert (Broadcast)."""
+        return self._read_from_dir(self.pending_dir / recipient, reader,
+                                   is_broadcast=(recipient == BROADCAST))
+
+    def pending_count(self, recipient: str, reader: str) -> int:
+        """Zaehlt ausstehende Dateien (Broadcast: ohne eigene)."""
+        directory = self.pending_dir / recipient
+        if not directory.exists():
+            return 0
+        if recipient != BROADCAST:
+            return len(list(directory.glob("*.json")))
+        count = 0
+        for f in directory.glob("*.json"):
+            msg = self._safe_read_json(f)
+            if msg and msg.get("from_instance") != reader:
+                count += 1
+        return count
+
+    def peek(self, recipient: str, limit: int = 10) -> list[dict]:
+        """Erste `limit` Nachrichten ohne zu konsumieren."""
+        directory = self.pending_dir / recipient
+        if not directory.exists():
+            return []
+        messages = []
+        for f in list(directory.glob("*.json"))[:limit]:
+            msg = self._safe_read_json(f)
+            if msg:
+                messages.append(msg)
+        return messages
+
+    def cleanup_expired(self, now: datetime) -> int:
+        """Loescht abgelaufene Nachrichten in allen Posteingaengen."""
+        removed = 0
+        if not self.pending_dir.exists():
+            return 0
+
+        for subdir in self.pending_dir.iterdir():
+            if not subdir.is_dir():
+                continue
+            for f in subdir.glob("*.json"):
+                msg = self._safe_read_json(f)
+                if msg and is_expired(msg, now):
+                    self._safe_remove(f)
+                    removed += 1
+
+        return removed
+
+    @staticmethod
+    def _message_filename(msg: dict) -> str:
+        """Erzeugt einen Dateinamen fuer eine Nachricht."""
+        ts = msg.get("created_at", "").replace(":", "-").replace(".", "-")
+        event = msg.get("event", "unknown")
+        msg_id = msg.get("id", "unknown")
+        # Kurzformat: Nur die letzten 8 Zeichen der ID
+        short_id = msg_id[-8:] if len(msg_id) > 8 else msg_id
+        return f"{ts}_{event}_{short_id}.json"
+
+    def _read_from_dir(self, directory: Path, reader: str,
+                       is_broadcast: bool = False) -> list[dict]:
+        """Liest Nachrichten aus einem Verzeichnis und archiviert sie.
+
+        Args:
+            directory: Verzeichnis zum Lesen
+            reader: Instanz-ID des Lesers
+            is_broadcast: True wenn Broadcast-Verzeichnis (eigene Nachrichten skippen)
+
+        Returns:
+            Liste von gueltigen Nachrichten
+        """
+        messages = []
+        now = datetime.now()
+
+        if not directory.exists():
+            return messages
+
+        archive_slots = None
+        for f in directory.glob("*.json"):
+            msg = self._safe_read_json(f)
+            if msg is None:
+                self._safe_remove(f)
+                continue
+
+            # Eigene Broadcasts skippen
+            if is_broadcast and msg.get("from_instance") == reader:
+                continue
+
+            # Abgelaufene Nachrichten verwerfen
+            if is_expired(msg, now):
+                self._safe_remove(f)
+                continue
+
+            # Nachricht archivieren (bei Broadcast: nicht loeschen, andere muessen auch lesen)
+            if is_broadcast:
+                # Broadcast-Nachrichten markieren wir als gelesen fuer diese Instanz
+                # indem wir eine .read-Marker-Datei erstellen
+                read_marker = f.with_suffix(f".read-{reader}")
+                if read_marker.exists():
+                    # Schon gelesen -- skip
+                    continue
+                try:
+                    read_marker.touch()
+                except OSError:
+                    pass
+            else:
+                # Direkte Nachrichten: ins Archiv verschieben
+                if archive_slots is None:
+                    archive_slots = self._archive_slots()
+                self._archive_message(f, msg, archive_slots > 0)
+                archive_slots -= 1
+
+            messages.append(msg)
+
+        return messages
+
+    def _day_archive(self) -> Path:
+        day_archive = self.archive_dir / datetime.now().strftime("%Y-%m-%d")
+        day_archive.mkdir(exist_ok=True)
+        return day_archive
+
+    def _archive_slots(self) -> int:
+        """Freie Archiv-Plaetze fuer heute (einmal pro receive() gezaehlt)."""
+        existing = len(list(self._day_archive().glob("*.json")))
+        return MAX_ARCHIVE_PER_DAY - existing
+
+    def _archive_message(self, source_file: Path, msg: dict, keep: bool = True):
+        """Verschiebt eine Nachricht ins Archiv.
+
+        Args:
+            source_file: Quell-Datei
+            msg: Nachricht-Dict
+            keep: False wenn das Tages-Limit erreicht ist (dann nur loeschen)
+        """
+        # Guard: Nicht zu viele Archiv-Dateien pro Tag
+        if not keep:
+            self._safe_remove(source_file)
+            return
+
+        target = self._day_archive() / source_file.name
+        try:
+            # Verschieben (atomic auf gleichem Filesystem)
+            os.replace(str(source_file), str(target))
+        except OSError:
+            # Fallback: Kopieren und loeschen
+            self._safe_write_json(target, msg)
+            self._safe_remove(source_file)
+
+    @staticmethod
+    def _safe_write_json(path: Path, data: dict) -> bool:
+        """Schreibt JSON-Datei atomar.
+
+        Returns:
+            True wenn erfolgreich
+        """
+        tmp_path = path.with_suffix(".tmp")
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, indent=2, ensure_ascii=False)
+            os.replace(str(tmp_path), str(path))
+            return True
+        except OSError:
+            try:
+                tmp_path.unlink(missing_ok=True)
+            except OSError:
+                pass
+            # Fallback: Direkt schreiben
+            try:
+                with open(path, "w", encoding="utf-8") as f:
+                    json.dump(data, f, indent=2, ensure_ascii=False)
+                return True
+            except OSError:
+                return False
+
+    @staticmethod
+    def _safe_read_json(path: Path) -> Optional[dict]:
+        """Liest JSON-Datei sicher."""
+        for attempt in range(3):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    return json.load(f)
+            except (OSError, json.JSONDecodeError):
+                if attempt < 2:
+                    time.sleep(0.1)
+        return None
+
+    @staticmethod
+    def _safe_remove(path: Path):
+        """Loescht Datei sicher."""
+        try:
+            path.unlink(missing_ok=True)
+        except OSError:
+            pass
+
+
+# ═══════════════════════════════════════════════════════════════
+# SEGMENT LOG TRANSPORT
+# ═══════════════════════════════════════════════════════════════
+
+class SegmentLogTransport:
+    """Append-only Segment-Log pro Empfaenger mit Leser-Offsets.
+
+    Eine Nachricht kostet beim Senden einen write() und beim Empfangen
+    einen Teil eines read(); es entstehen keine Dateien pro Nachricht.
+    Konsumierte Segmente werden in cleanup_expired() geloescht, das
+    juengste Segment bleibt immer stehen (Segment-Nummern laufen weiter).
+    """
+
+    name = "segment"
+
+    def __init__(self, messages_dir: Path, segment_bytes: int = SEGMENT_BYTES):
+        self.log_dir = messages_dir / "log"
+        self.log_dir.mkdir(parents=True, exist_ok=True)
+        self.segment_bytes = segment_bytes
+        # Eigene Leser-Offsets: im Speicher gespiegelt, Datei bleibt offen
+        self._offsets: dict = {}
+        self._offset_fds: dict = {}
+
+    def append(self, recipient: str, messages: list[dict]) -> int:
+        """Haengt alle Nachrichten mit einem write() an. Gibt Anzahl zurueck (0 bei Fehler)."""
+        if not messages:
+            return 0
+        payload = "".join(
+            f"{m.get('from_instance', '')}\t{json.dumps(m, ensure_ascii=False)}\n"
+            for m in messages
+        ).encode("utf-8")
+
+        queue_dir = self.log_dir / recipient
+        try:
+            queue_dir.mkdir(exist_ok=True)
+            with _dir_lock(queue_dir):
+                segments = self._segments(queue_dir)
+                index = segments[-1] if segments else 0
+                path = self._segment_path(queue_dir, index)
+                try:
+                    size = os.path.getsize(path)
+                except OSError:
+                    size = 0
+                if size and size + len(payload) > self.segment_bytes:
+                    index += 1
+                    path = self._segment_path(queue_dir, index)
+                fd = os.open(str(path), os.O_WRONLY | os.O_CREAT | os.O_APPEND | _O_BINARY, 0o644)
+                try:
+                    view = memoryview(payload)
+                    while view:
+                        view = view[os.write(fd, view):]
+                finally:
+                    os.close(fd)
+        except OSError:
+            return 0
+        return len(messages)
+
+    def read(self, recipient: str, reader: str) -> list[dict]:
+        """Liest alle neuen, gueltigen Nachrichten und rueckt den Offset vor.
+
+        Eigene Broadcasts werden anhand des Absender-Praefixes ohne
+        JSON-Parsing uebersprungen.
+        """
+        queue_dir = self.log_dir / recipient
+        offset_file = self._offset_file(queue_dir, recipient, reader)
+        lines, start, end = self._scan(queue_dir, offset_file)
+        if end != start:
+            self._store_offset(offset_file, end)
+
+        skip = reader.encode("utf-8") if recipient == BROADCAST else None
+        now = datetime.now()
+        messages = []
+        for line in lines:
+            sender, _, body = line.partition(b"\t")
+            if skip is not None and sender == skip:
+                continue
+            try:
+                msg = json.loads(body)
+            except ValueError:
+                continue
+            if isinstance(msg, dict) and not is_expired(msg, now):
+                messages.append(msg)
+        return messages
+
+    def pending_count(self, recipient: str, reader: str) -> int:
+        """Zaehlt ungelesene Zeilen ohne JSON-Parsing und ohne den Offset zu bewegen."""
+        queue_dir = self.log_dir / recipient
+        lines, _, _ = self._scan(queue_dir, self._offset_file(queue_dir, recipient, reader))
+        if recipient != BROADCAST:
+            return len(lines)
+        own = reader.encode("utf-8") + b"\t"
+        return sum(1 for line in lines if not line.startswith(own))
+
+    def peek(self, recipient: str, limit: int = 10) -> list[dict]:
+        """Erste `limit` ungelesene Nachrichten ohne zu konsumieren."""
+        queue_dir = self.log_dir / recipient
+        lines, _, _ = self._scan(queue_dir, self._offset_file(queue_dir, recipient, recipient))
+        messages = []
+        for line in lines[:limit]:
+            try:
+                messages.append(json.loads(line.partition(b"\t")[2]))
+            except ValueError:
+                continue
+        return messages
+
+    def cleanup_expired(self, now: datetime) -> int:
+        """Loescht alte Segmente (ausser dem juengsten).
+
+        Ein Segment faellt weg, wenn der Empfaenger es komplett gelesen hat
+        (nur Posteingaenge) oder wenn alle enthaltenen Nachrichten
+        abgelaufen sind. Gibt die Anzahl entfernter Nachrichten zurueck.
+        """
+        removed = 0
+        if not self.log_dir.exists():
+            return 0
+
+        for queue_dir in self.log_dir.iterdir():
+            if not queue_dir.is_dir():
+                continue
+            recipient = queue_dir.name
+            segments = self._segments(queue_dir)
+            consumed_below = -1
+            if recipient != BROADCAST:
+                consumed_below = self._read_offset(queue_dir / ".offset")[0]
+            for index in segments[:-1]:
+                path = self._segment_path(queue_dir, index)
+                try:
+                    data = path.read_bytes()
+                except OSError:
+                    continue
+                lines = data.splitlines()
+                if index >= consumed_below and not self._all_expired(lines, now):
+                    continue
+                try:
+                    path.unlink()
+                    removed += len(lines)
+                except OSError:
+                    pass
+        return removed
+
+    # ─── Intern ─────────────────────────────────────────────────────
+
+    @staticmethod
+    def _segments(queue_dir: Path) -> list[int]:
+        try:
+            names = os.listdir(queue_dir)
+        except OSError:
+            return []
+        return sorted(int(n[:-4]) for n in names if n.endswith(".log") and n[:-4].isdigit())
+
+    @staticmethod
+    def _segment_path(queue_dir: Path, index: int) -> Path:
+        return queue_dir / f"{index:08d}.log"
+
+    @staticmethod
+    def _offset_file(queue_dir: Path, recipient: str, reader: str) -> Path:
+        return queue_dir / (".offset" if recipient == reader else f".offset-{reader}")
+
+    def _load_offset(self, path: Path) -> tuple[int, int]:
+        """Offset eines Lesers (eigene Offsets aus dem Speicher)."""
+        cached = self._offsets.get(str(path))
+        if cached is not None:
+            return cached
+        return self._read_offset(path)
+
+    @staticmethod
+    def _read_offset(path: Path) -> tuple[int, int]:
+        try:
+            segment, position = path.read_text(encoding="ascii").split()
+            return int(segment), int(position)
+        except (OSError, ValueError):
+            return -1, 0
+
+    def _store_offset(self, path: Path, offset: tuple[int, int]):
+        """Ueberschreibt den Offset-Datensatz fester Laenge an Ort und Stelle."""
+        key = str(path)
+        self._offsets[key] = offset
+        try:
+            fd = self._offset_fds.get(key)
+            if fd is None:
+                fd = os.open(key, os.O_RDWR | os.O_CREAT | _O_BINARY, 0o644)
+                self._offset_fds[key] = fd
+            os.lseek(fd, 0, os.SEEK_SET)
+            os.write(fd, f"{offset[0]:08d} {offset[1]:016d}".encode("ascii"))
+        except OSError:
+            pass
+
+    def close(self):
+        """Schliesst offene Offset-Dateien."""
+        for fd in self._offset_fds.values():
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+        self._offset_fds.clear()
+
+    def _scan(self, queue_dir: Path, offset_file: Path):
+        """Liest alle vollstaendigen Zeilen ab dem gespeicherten Offset.
+
+        Returns:
+            (Zeilen, Start-Offset, End-Offset) - Offsets als (Segment, Byte)
+        """
+        segments = self._segments(queue_dir)
+        if not segments:
+            return [], None, None
+
+        start = self._load_offset(offset_file)
+        segment, position = start
+        if segment not in segments:
+            # Erster Lauf oder Segment weggeraeumt: ab dem naechsten vorhandenen
+            later = [s for s in segments if s > segment]
+            segment, position = (later[0] if later else segments[0]), 0
+
+        lines = []
+        while True:
+            try:
+                with open(self._segment_path(queue_dir, segment), "rb") as f:
+                    f.seek(position)
+                    data = f.read()
+            except OSError:
+                data = b""
+            complete = data.rfind(b"\n") + 1
+            if complete:
+                lines.extend(data[:complete].splitlines())
+                position += complete
+
+            newer = [s for s in segments if s > segment]
+            if not newer:
+                break
+            # Das Folgesegment existierte schon vor dem read(): Writer haben
+            # unter der Sperre gerollt, dieses Segment ist abgeschlossen.
+            segment, position = newer[0], 0
+
+        return lines, start, (segment, position)
+
+    @staticmethod
+    def _all_expired(lines: list[bytes], now: datetime) -> bool:
+        for line in lines:
+            try:
+                msg = json.loads(line.partition(b"\t")[2])
+            except ValueError:
+                continue
+            if not is_expired(msg, now):
+                return False
+        return True
+
+
+# ═══════════════════════════════════════════════════════════════
+# NOTIFIER
+# ═══════════════════════════════════════════════════════════════
+
+class Notifier:
+    """Weckt Empfaenger ueber Unix-Datagram-Sockets.
+
+    Jede Instanz bindet <sock_dir>/<hash(instance_id)>.sock. Ein Sender
+    schickt nach dem Schreiben ein Byte dorthin; wait() kehrt sofort
+    zurueck. available ist False, wenn die Plattform das nicht kann -
+    dann pollt InstanceMessaging.wait_for_messages().
+    """
+
+    def __init__(self, messages_dir: Path, instance_id: str):
+        self.sock_dir = self._socket_dir(messages_dir)
+        self.instance_id = instance_id
+        self.path = self.socket_path(instance_id)
+        self._sock: Optional[socket.socket] = None
+        self._out: Optional[socket.socket] = None
+        self.available = self._bind()
+
+    @staticmethod
+    def _socket_dir(messages_dir: Path) -> Path:
+        sock_dir = messages_dir / "notify"
+        if len(str(sock_dir)) + 22 > _MAX_SOCKET_PATH:
+            digest = hashlib.sha1(str(messages_dir.resolve()).encode("utf-8")).hexdigest()[:12]
+            sock_dir = Path(tempfile.gettempdir()) / f"bach-msg-{digest}"
+        return sock_dir
+
+    def socket_path(self, instance_id: str) -> Path:
+        digest = hashlib.sha1(instance_id.encode("utf-8")).hexdigest()[:16]
+        return self.sock_dir / f"{digest}.sock"
+
+    def _bind(self) -> bool:
+        if not hasattr(socket, "AF_UNIX"):
+            return False
+        try:
+            self.sock_dir.mkdir(parents=True, exist_ok=True)
+            try:
+                self.path.unlink()
+            except FileNotFoundError:
+                pass
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+            try:
+                sock.bind(str(self.path))
+                sock.setblocking(False)
+            except OSError:
+                sock.close()
+                raise
+        except OSError:
+            return False
+        self._sock = sock
+        return True
+
+    def notify(self, instance_ids: Iterable[str]) -> int:
+        """Weckt die angegebenen Instanzen. Gibt Anzahl erreichter Sockets zurueck."""
+        return self._send(self.socket_path(i) for i in instance_ids if i != self.instance_id)
+
+    def notify_all(self) -> int:
+        """Weckt alle Instanzen mit gebundenem Socket (Broadcast)."""
+        try:
+            paths = [p for p in self.sock_dir.glob("*.sock") if p != self.path]
+        except OSError:
+            return 0
+        return self._send(paths)
+
+    def _send(self, paths: Iterable[Path]) -> int:
+        if not self.available:
+            return 0
+        if self._out is None:
+            try:
+                self._out = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+                self._out.setblocking(False)
+            except OSError:
+                return 0
+        reached = 0
+        for path in paths:
+            try:
+                self._out.sendto(b"\x01", str(path))
+                reached += 1
+            except BlockingIOError:
+                reached += 1  # Puffer voll: Empfaenger ist ohnehin schon geweckt
+            except ConnectionRefusedError:
+                # Socket-Datei einer beendeten Instanz
+                try:
+                    path.unlink()
+                except OSError:
+                    pass
+            except OSError:
+                pass
+        return reached
+
+    def wait(self, timeout: float) -> bool:
+        """Blockiert bis zu timeout Sekunden. True wenn geweckt."""
+        if self._sock is None:
+            return False
+        try:
+            ready, _, _ = select.select([self._sock], [], [], max(0.0, timeout))
+        except (OSError, ValueError):
+            return False
+        if not ready:
+            return False
+        # Alle aufgelaufenen Weckrufe verwerfen
+        while True:
+            try:
+                self._sock.recv(64)
+            except OSError:
+                break
+        return True
+
+    def close(self):
+        """Schliesst die Sockets und entfernt die eigene Socket-Datei."""
+        for sock in (self._sock, self._out):
+            if sock is not None:
+                try:
+                    sock.close()
+                except OSError:
+                    pass
+        if self._sock is not None:
+            try:
+                self.path.unlink()
+            except OSError:
+                pass
+        self._sock = self._out = None
+        self.available = False
+
+
+# ═══════════════════════════════════════════════════════════════
+# BENCHMARK
+# ═══════════════════════════════════════════════════════════════
+
+def _percentile(values: list, pct: float) -> float:
+    ordered = sorted(values)
+    idx = min(len(ordered) - 1, max(0, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[idx]
+
+
+def _bench_instance(data_dir: str, ids: list, k: int, per_sender: int, expected: int,
+                    transport: str, notify: bool, poll_interval: float, start, out):
+    """Eine Benchmark-Instanz (eigener Prozess): Sender-Thread + Empfangsschleife."""
+    import threading
+    from .instance_messaging import InstanceMessaging
+
+    node = InstanceMessaging(Path(data_dir), ids[k], transport=transport, notify=notify)
+    n = len(ids)
+
+    def sender():
+        for j in range(per_sender):
+            # Reihum an alle anderen Instanzen
+            target = ids[(k + 1 + j % (n - 1)) % n]
+            node.send(target, "bench", {"t": time.time()})
+
+    start.wait()
+    t0 = time.perf_counter()
+    thread = threading.Thread(target=sender)
+    thread.start()
+    latencies = []
+    deadline = time.monotonic() + 120
+    while len(latencies) < expected and time.monotonic() < deadline:
+        node.wait_for_messages(0.2, poll_interval)
+        msgs = node.receive(include_broadcast=False)
+        now = time.time()
+        latencies.extend(now - m["context"]["t"] for m in msgs)
+    received_at = time.perf_counter() - t0
+    thread.join()
+    node.close()
+    out.put((latencies, received_at))
+
+
+def run_benchmark(n_messages: int = 10000, n_instances: int = 5,
+                  mode: str = "segment+notify", poll_interval: float = 0.25) -> dict:
+    """Schickt n_messages Einzelnachrichten reihum zwischen n_instances Instanzen.
+
+    Jede Instanz ist ein eigener Prozess mit Sender-Thread und
+    Empfangsschleife (wait_for_messages + receive). Die Latenz wird von
+    send() bis receive() gemessen.
+
+    Args:
+        mode: "file", "segment" oder "segment+notify"
+        poll_interval: Poll-Intervall der Empfaenger ohne Notifier
+
+    Returns:
+        dict mit Durchsatz, Latenz-Perzentilen und Zustellquote
+    """
+    import multiprocessing
+    import shutil
+
+    transport, _, notify = mode.partition("+")
+    tmp = Path(tempfile.mkdtemp(prefix="bach-msg-bench-"))
+    ids = [f"bench-{i}" for i in range(n_instances)]
+    per_sender = n_messages // n_instances
+    # Reihum-Verteilung: jede Instanz empfaengt so viele, wie sie sendet
+    expected = per_sender
+
+    ctx = multiprocessing.get_context()
+    start, out = ctx.Event(), ctx.Queue()
+    procs = [ctx.Process(target=_bench_instance,
+                         args=(str(tmp), ids, k, per_sender, expected,
+                               transport, bool(notify), poll_interval, start, out))
+             for k in range(n_instances)]
+    for p in procs:
+        p.start()
+    time.sleep(0.5)  # Sockets binden lassen
+    start.set()
+    results = [out.get(timeout=180) for _ in procs]
+    for p in procs:
+        p.join(timeout=10)
+    shutil.rmtree(tmp, ignore_errors=True)
+
+    latencies = [lat for r in results for lat in r[0]]
+    seconds = max(r[1] for r in results)
+    total = per_sender * n_instances
+    return {
+        "mode": mode,
+        "instances": n_instances,
+        "messages": total,
+        "received": len(latencies),
+        "per_s": round(len(latencies) / seconds) if seconds else None,
+        "seconds": round(seconds, 2),
+        "p50_ms": round(_percentile(latencies, 50) * 1000, 2) if latencies else None,
+        "p95_ms": round(_percentile(latencies, 95) * 1000, 2) if latencies else None,
+        "p99_ms": round(_percentile(latencies, 99) * 1000, 2) if latencies else None,
+        "max_ms": round(max(latencies) * 1000, 2) if latencies else None,
+    }
+
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description="BACH Inter-Instance Messaging")
+    parser.add_argument("--bench", action="store_true", help="Durchsatz-/Latenz-Benchmark ausfuehren")
+    parser.add_argument("--messages", type=int, default=10000)
+    parser.add_argument("--instances", type=int, default=5)
+    parser.add_argument("--modes", default="file,segment,segment+notify")
+    args = parser.parse_args()
+
+    if not args.bench:
+        parser.print_help()
+        return 0
+
+    ok = True
+    print(f"[BENCH] {args.messages} Nachrichten, {args.instances} Instanzen")
+    for mode in args.modes.split(","):
+        r = run_benchmark(args.messages, args.instances, mode.strip())
+        ok = ok and r["received"] == r["messages"]
+        print(f"  {r['mode']:<15} {r['per_s']:>7} Nachr./s  {r['seconds']:>6} s  "
+              f"p50 {r['p50_ms']:>8} ms  p95 {r['p95_ms']:>8} ms  p99 {r['p99_ms']:>8} ms  "
+              f"({r['received']}/{r['messages']})")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    import sys
+    sys.exit(main())
@@ -26,30 +26,46 @@ Handler Registry - Auto-Discovery und Command Routing
 =====================================================
 Scannt hub/ Verzeichnis und registriert alle BaseHandler-Subklassen.
 Unterstuetzt Multi-Handler-Dateien (time.py, tuev.py).
+
+Lazy Loading (Manifest):
+    Mit manifest_path merkt sich die Registry pro hub/-Datei (mtime_ns, size)
+    und die darin gefundenen Handler. Bei unveraenderten Dateien wird nur das
+    Manifest gelesen - importiert wird erst das Modul des aufgerufenen Handlers.
+    Geaenderte, neue oder geloeschte Dateien werden automatisch neu erfasst.
 """
 
 import importlib
 import importlib.util
+import json
+import os
 import sys
+import time
 from pathlib import Path
 from typing import Optional
 
 from .base import ParsedArgs, Result, parse_args
 
+MANIFEST_VERSION = 1
+
 
 class HandlerRegistry:
     """Verwaltet alle verfuegbaren Handler via Auto-Discovery."""
 
     def __init__(self):
-        self._handlers: dict[str, dict] = {}  # name -> {class, module_name, file}
+        self._handlers: dict[str, dict] = {}  # name -> {class, class_name, module_name, file}
         self._instances: dict[str, object] = {}
+        self._hub_dir: Optional[Path] = None
+        self.import_timings: list[tuple[str, float]] = []  # (module_name, Sekunden)
 
-    def discover(self, hub_dir: Path, aliases: dict = None) -> int:
+    def discover(self, hub_dir: Path, aliases: dict = None,
+                 manifest_path: Path = None) -> int:
         """Scannt hub/ Verzeichnis und registriert Handler-Klassen.
 
         Args:
             hub_dir: Pfad zum hub/ Verzeichnis
             aliases: Optionale Alias-Map (wird nach Discovery angewendet)
+            manifest_path: Optionaler Manifest-Cache (JSON). Ohne Manifest
+                werden alle Module importiert (bisheriges Verhalten).
 
         Returns:
             Anzahl gefundener Handler
@@ -57,13 +73,42 @@ class HandlerRegistry:
         count = 0
         if not hub_dir.exists():
             return 0
+        self._hub_dir = hub_dir
+
+        manifest = self._read_manifest(manifest_path) if manifest_path else {}
+        files = {}
+        changed = False
 
         for py_file in sorted(hub_dir.glob("*.py")):
             if py_file.name.startswith("_"):
                 continue
 
+            try:
+                st = py_file.stat()
+            except OSError:
+                continue
+
+            cached = manifest.get(py_file.name)
+            if (cached and cached.get("mtime_ns") == st.st_mtime_ns
+                    and cached.get("size") == st.st_size):
+                count += self._register_from_manifest(py_file, cached["handlers"])
+                files[py_file.name] = cached
+                continue
+
             found = self._load_handlers_from_file(py_file, hub_dir)
             count += found
+            changed = True
+            if manifest_path:
+                entries = self._manifest_entries_for(py_file)
+                if entries is not None:
+                    files[py_file.name] = {
+                        "mtime_ns": st.st_mtime_ns,
+                        "size": st.st_size,
+                        "handlers": entries,
+                    }
+
+        if manifest_path and (changed or set(files) != set(manifest)):
+            self._write_manifest(manifest_path, files)
 
         # Aliases anwenden (mem -> memory, etc.)
         if aliases:
@@ -73,6 +118,126 @@ class HandlerRegistry:
 
         return count
 
+    def _register_from_manifest(self, py_file: Path, handlers: list) -> int:
+        """Registriert Handler aus dem Manifest ohne das Modul zu importieren."""
+        for entry in handlers:
+            name = entry["name"]
+            if name in self._handlers:
+                old_file = self._handlers[name]["file"].name
+                print(f"[WARN] Handler '{name}' aus {old_file} wird von {py_file.name} ueberschrieben!")
+            self._handlers[name] = {
+                "class": None,
+                "class_name": entry["class_name"],
+                "module_name": entry["module_name"],
+                "file": py_file,
+            }
+        return len(handlers)
+
+    def _manifest_entries_for(self, py_file: Path) -> Optional[list]:
+        """Manifest-Eintraege fuer alle Handler einer frisch geladenen Datei.
+
+        Returns:
+            Liste oder None wenn die Datei nicht importiert werden konnte
+            (defekte Handler werden nicht gecacht, damit die Warnung bleibt).
+        """
+        module_name = f"hub.{py_file.stem}"
+        if module_name not in sys.modules:
+            return None
+        return [
+            {"name": name, "class_name": entry["class"].__name__,
+             "module_name": module_name}
+            for name, entry in self._handlers.items()
+            if entry["file"] == py_file and entry.get("class") is not None
+        ]
+
+    @staticmethod
+    def _read_manifest(path: Path) -> dict:
+        """Liest das Manifest. Fehlend, defekt oder alte Version -> leer."""
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(data, dict) or data.get("version") != MANIFEST_VERSION:
+            return {}
+        return data.get("files") or {}
+
+    @staticmethod
+    def _write_manifest(path: Path, files: dict):
+        """Schreibt das Manifest atomar (erst temp, dann rename)."""
+        tmp_path = path.with_suffix(".tmp")
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"version": MANIFEST_VERSION, "files": files}, f,
+                          indent=1, ensure_ascii=False)
+            os.replace(str(tmp_path), str(path))
+        except OSError:
+            # Cache ist optional - naechster Aufruf baut ihn neu
+            try:
+                tmp_path.unlink(missing_ok=True)
+            except OSError:
+                pass
+
+    def _import_module(self, module_name: str, py_file: Path, hub_dir: Path):
+        """Importiert ein hub/-Modul (oder nutzt das bereits geladene).
+
+        Returns:
+            Modul oder None
+        """
+        # sys.path sicherstellen
+        parent = str(hub_dir.parent)
+        if parent not in sys.path:
+            sys.path.insert(0, parent)
+
+        # Bereits geladenes Modul wiederverwenden (verhindert doppeltes Laden)
+        if module_name in sys.modules:
+            return sys.modules[module_name]
+
+        spec = importlib.util.spec_from_file_location(module_name, py_file)
+        if not spec or not spec.loader:
+            return None
+
+        start = time.perf_counter()
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[module_name] = module
+        try:
+            spec.loader.exec_module(module)
+        except BaseException:
+            sys.modules.pop(module_name, None)
+            raise
+        finally:
+            self.import_timings.append((module_name, time.perf_counter() - start))
+        return module
+
+    def _resolve_class(self, name: str):
+        """Laedt die Handler-Klasse eines Manifest-Eintrags nach (lazy).
+
+        Faellt auf vollstaendiges Neuladen der Datei zurueck, falls die Klasse
+        im Modul nicht (mehr) existiert.
+        """
+        entry = self._handlers[name]
+        if entry.get("class") is not None:
+            return entry["class"]
+
+        py_file = entry["file"]
+        hub_dir = self._hub_dir or py_file.parent
+        try:
+            module = self._import_module(entry["module_name"], py_file, hub_dir)
+        except Exception as e:
+            print(f"[WARN] Handler {py_file.name}: {e}")
+            return None
+
+        handler_class = getattr(module, entry.get("class_name") or "", None)
+        if isinstance(handler_class, type):
+            entry["class"] = handler_class
+            return handler_class
+
+        # Manifest veraltet: Datei komplett neu scannen
+        self._load_handlers_from_file(py_file, hub_dir)
+        entry = self._handlers.get(name)
+        return entry.get("class") if entry else None
+
     def _load_handlers_from_file(self, py_file: Path, hub_dir: Path) -> int:
         """Laedt alle Handler-Klassen aus einer Python-Datei.
 
@@ -85,22 +250,9 @@ class HandlerRegistry:
         count = 0
 
         try:
-            # sys.path sicherstellen
-            parent = str(hub_dir.parent)
-            if parent not in sys.path:
-                sys.path.insert(0, parent)
-
-            # Bereits geladenes Modul wiederverwenden (verhindert doppeltes Laden)
-            if module_name in sys.modules:
-                module = sys.modules[module_name]
-            else:
-                spec = importlib.util.spec_from_file_location(module_name, py_file)
-                if not spec or not spec.loader:
-                    return 0
-
-                module = importlib.util.module_from_spec(spec)
-                sys.modules[module_name] = module
-                spec.loader.exec_module(module)
+            module = self._import_module(module_name, py_file, hub_dir)
+            if module is None:
+                return 0
 
             # BaseHandler aus hub.base importieren
             from hub.base import BaseHandler
@@ -119,14 +271,21 @@ class HandlerRegistry:
                     # profile_name extrahieren
                     name = self._extract_profile_name(attr, py_file)
                     if name:
-                        if name in self._handlers:
-                            old_file = self._handlers[name]["file"].name
+                        existing = self._handlers.get(name)
+                        if existing and existing["file"] != py_file:
+                            old_file = existing["file"].name
                             print(f"[WARN] Handler '{name}' aus {old_file} wird von {py_file.name} ueberschrieben!")
-                        self._handlers[name] = {
+                        new_entry = {
                             "class": attr,
+                            "class_name": attr.__name__,
                             "module_name": module_name,
                             "file": py_file,
                         }
+                        if existing is not None and existing["file"] == py_file:
+                            # In-place, damit Aliase auf denselben Eintrag zeigen
+                            existing.update(new_entry)
+                        else:
+                            self._handlers[name] = new_entry
                         count += 1
 
         except Exception as e:
@@ -161,7 +320,8 @@ class HandlerRegistry:
         # Methode 4: Dateiname als Fallback
         return py_file.stem
 
-    def reload(self, hub_dir: Path, aliases: dict = None) -> int:
+    def reload(self, hub_dir: Path, aliases: dict = None,
+               manifest_path: Path = None) -> int:
         """Hot-Reload: Cleared alle Handler und entdeckt neu.
 
         Ermoeglicht das Hinzufuegen neuer Handler ohne Neustart.
@@ -169,18 +329,20 @@ class HandlerRegistry:
         Args:
             hub_dir: Pfad zum hub/ Verzeichnis
             aliases: Optionale Alias-Map
+            manifest_path: Optionaler Manifest-Cache (siehe discover)
 
         Returns:
             Anzahl gefundener Handler
         """
         self._handlers.clear()
         self._instances.clear()
-        return self.discover(hub_dir, aliases)
+        return self.discover(hub_dir, aliases, manifest_path=manifest_path)
 
     def register(self, name: str, handler_class, **kwargs):
         """Manuell einen Handler registrieren."""
         self._handlers[name] = {
             "class": handler_class,
+            "class_name": handler_class.__name__,
             "module_name": kwargs.get("module_name", ""),
             "file": kwargs.get("file"),
         }
@@ -203,7 +365,9 @@ class HandlerRegistry:
         if not entry:
             return None
 
-        handler_class = entry["class"]
+        handler_class = self._resolve_class(name)
+        if handler_class is None:
+            return None
 
         try:
             # Versuche zuerst mit app (neuer Stil)
@@ -0,0 +1,5 @@
+-- Migration 036: Indizes fuer Task-Listen (Keyset-Pagination)
+-- hub/_services/tasks/task_query.py sortiert nach (priority, id) und filtert meist nach status
+
+CREATE INDEX IF NOT EXISTS idx_tasks_status_priority_id ON tasks(status, priority, id);
+CREATE INDEX IF NOT EXISTS idx_tasks_priority_id ON tasks(priority, id);
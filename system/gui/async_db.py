@@ -0,0 +1,172 @@
+# SPDX-License-Identifier: MIT
+"""
+BACH GUI Async DB - Nicht-blockierender Datenzugriff fuer server.py
+
+Der Event-Loop des FastAPI-Servers darf nie auf SQLite oder psutil warten,
+sonst haengen alle WebSocket-Clients und Requests an einer langsamen Query.
+
+Bausteine:
+- run_db():          fuehrt blockierende DB-Arbeit in einem begrenzten
+                     Worker-Pool aus (gepoolte Verbindungen aus core.db)
+- fetch_all/one/value, execute: Kurzformen fuer einzelne Statements
+- SystemSampler:     misst psutil im Hintergrund-Thread, Endpoints lesen
+                     nur den letzten Messwert
+- configure_threadpool(): begrenzt den Starlette-Threadpool, in dem die
+                     synchronen (def) Endpoints laufen
+
+Verwendung in server.py:
+    rows = await async_db.fetch_all(BACH_DB, "SELECT ...", (x,))
+    result = await async_db.run_db(_blocking_fn, arg)
+"""
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+DB_WORKERS = 8            # Threads fuer run_db (SQLite serialisiert Writer ohnehin)
+THREADPOOL_LIMIT = 32     # Max. gleichzeitige synchrone Endpoints
+SAMPLE_INTERVAL = 2.0     # Sekunden zwischen psutil-Messungen
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=DB_WORKERS,
+                                               thread_name_prefix="bach-gui-db")
+    return _executor
+
+
+async def run_db(fn: Callable, *args, **kwargs) -> Any:
+    """Fuehrt fn(*args, **kwargs) im DB-Worker-Pool aus und wartet nicht-blockierend."""
+    loop = asyncio.get_running_loop()
+    if kwargs:
+        return await loop.run_in_executor(_get_executor(), lambda: fn(*args, **kwargs))
+    return await loop.run_in_executor(_get_executor(), fn, *args)
+
+
+def _query(db_path: Path, sql: str, params, mode: str):
+    from core.db import get_pool
+    conn = get_pool(db_path).acquire(readonly=(mode != "execute"))
+    try:
+        cur = conn.execute(sql, params)
+        if mode == "all":
+            return [dict(r) for r in cur.fetchall()]
+        if mode == "one":
+            row = cur.fetchone()
+            return dict(row) if row is not None else None
+        if mode == "value":
+            row = cur.fetchone()
+            return row[0] if row is not None else None
+        conn.commit()
+        return {"lastrowid": cur.lastrowid, "rowcount": cur.rowcount}
+    finally:
+        conn.close()
+
+
+async def fetch_all(db_path: Path, sql: str, params=()) -> List[Dict[str, Any]]:
+    """Alle Zeilen als dicts (read-only Verbindung)."""
+    return await run_db(_query, db_path, sql, params, "all")
+
+
+async def fetch_one(db_path: Path, sql: str, params=()) -> Optional[Dict[str, Any]]:
+    """Erste Zeile als dict oder None."""
+    return await run_db(_query, db_path, sql, params, "one")
+
+
+async def fetch_value(db_path: Path, sql: str, params=(), default=None) -> Any:
+    """Erster Wert der ersten Zeile; default bei Fehler (z.B. Tabelle fehlt)."""
+    try:
+        value = await run_db(_query, db_path, sql, params, "value")
+    except Exception:
+        return default
+    return default if value is None else value
+
+
+async def execute(db_path: Path, sql: str, params=()) -> Dict[str, int]:
+    """Schreibendes Statement mit Commit. Gibt lastrowid/rowcount zurueck."""
+    return await run_db(_query, db_path, sql, params, "execute")
+
+
+def configure_threadpool(limit: int = THREADPOOL_LIMIT):
+    """Begrenzt den AnyIO-Threadpool fuer synchrone Endpoints (im Event-Loop aufrufen)."""
+    try:
+        import anyio.to_thread
+        anyio.to_thread.current_default_thread_limiter().total_tokens = limit
+    except Exception as e:
+        logger.debug(f"Threadpool-Limit nicht gesetzt: {e}")
+
+
+def shutdown():
+    """Worker-Pool beenden (Server-Shutdown)."""
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False)
+            _executor = None
+
+
+class SystemSampler:
+    """Misst RAM/CPU/Disk periodisch in einem Hintergrund-Thread.
+
+    cpu_percent(interval=None) vergleicht mit der letzten Messung und
+    blockiert daher nicht; der erste Wert wird beim Start verworfen.
+    """
+
+    def __init__(self, interval: float = SAMPLE_INTERVAL):
+        self.interval = interval
+        self._snapshot: Dict[str, Any] = {}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _sample(self, psutil) -> Dict[str, Any]:
+        mem = psutil.virtual_memory()
+        return {
+            "ram_used_gb": round(mem.used / (1024**3), 1),
+            "ram_total_gb": round(mem.total / (1024**3), 1),
+            "ram_percent": mem.percent,
+            "cpu_percent": psutil.cpu_percent(interval=None),
+            "disk_percent": psutil.disk_usage(os.path.abspath(os.sep)).percent if hasattr(psutil, 'disk_usage') else None,
+            "sampled_at": time.time(),
+        }
+
+    def _run(self):
+        try:
+            import psutil
+        except ImportError:
+            self._snapshot = {"error": "psutil not installed"}
+            return
+        psutil.cpu_percent(interval=None)
+        while not self._stop.is_set():
+            try:
+                self._snapshot = self._sample(psutil)
+            except Exception as e:
+                self._snapshot = {"error": str(e)}
+            self._stop.wait(self.interval)
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="bach-gui-sampler", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Letzter Messwert (leer bis zur ersten Messung)."""
+        return dict(self._snapshot)
+
+
+system_sampler = SystemSampler()
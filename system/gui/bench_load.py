@@ -0,0 +1,124 @@
+# SPDX-License-Identifier: MIT
+"""
+BACH GUI Last-Benchmark - simuliert gleichzeitige Dashboard-Clients
+
+Jeder Client ruft wie static/js/app.js (loadDashboard) parallel
+/api/status und /api/tasks?status=pending|open ab, mehrere Runden lang.
+Ausgabe: p50/p95/p99-Latenz pro Endpoint und Requests/s.
+
+Standard ist In-Process (ASGI, gleicher Event-Loop wie der Server) - ein
+blockierender Endpoint bremst dort sofort alle Clients aus.
+
+Verwendung:
+    python gui/bench_load.py                       # 200 Clients, 5 Runden, in-process
+    python gui/bench_load.py --clients 50 --rounds 10
+    python gui/bench_load.py --url http://127.0.0.1:8000   # laufender Server
+
+Abhaengigkeit: pip install httpx
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+DASHBOARD_REQUESTS = [
+    "/api/status",
+    "/api/tasks?status=pending",
+    "/api/tasks?status=open",
+]
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    idx = min(len(ordered) - 1, max(0, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[idx]
+
+
+async def _client(http, rounds: int, latencies: Dict[str, List[float]], errors: List[str]):
+    async def hit(path):
+        start = time.perf_counter()
+        try:
+            resp = await http.get(path)
+            if resp.status_code != 200:
+                errors.append(f"{path}: HTTP {resp.status_code}")
+        except Exception as e:
+            errors.append(f"{path}: {e}")
+        latencies[path].append((time.perf_counter() - start) * 1000)
+
+    for _ in range(rounds):
+        await asyncio.gather(*(hit(p) for p in DASHBOARD_REQUESTS))
+
+
+async def run_benchmark(clients: int = 200, rounds: int = 5, url: str = None) -> Dict:
+    """Startet `clients` gleichzeitige Dashboard-Clients. Gibt Latenz-Statistik zurueck."""
+    import httpx
+
+    latencies = {p: [] for p in DASHBOARD_REQUESTS}
+    errors: List[str] = []
+    limits = httpx.Limits(max_connections=clients * len(DASHBOARD_REQUESTS))
+
+    if url:
+        http = httpx.AsyncClient(base_url=url, limits=limits, timeout=60)
+        lifespan = None
+    else:
+        from gui.server import app
+        http = httpx.AsyncClient(transport=httpx.ASGITransport(app=app),
+                                 base_url="http://bench", limits=limits, timeout=60)
+        lifespan = app.router.lifespan_context(app)
+        await lifespan.__aenter__()
+
+    start = time.perf_counter()
+    try:
+        async with http:
+            await asyncio.gather(*(_client(http, rounds, latencies, errors) for _ in range(clients)))
+    finally:
+        if lifespan is not None:
+            await lifespan.__aexit__(None, None, None)
+    elapsed = time.perf_counter() - start
+
+    total = sum(len(v) for v in latencies.values())
+    return {
+        "clients": clients,
+        "requests": total,
+        "errors": len(errors),
+        "error_samples": errors[:5],
+        "seconds": round(elapsed, 2),
+        "rps": round(total / elapsed, 1) if elapsed else 0,
+        "endpoints": {
+            path: {
+                "p50_ms": round(statistics.median(v), 1),
+                "p95_ms": round(_percentile(v, 95), 1),
+                "p99_ms": round(_percentile(v, 99), 1),
+                "max_ms": round(max(v), 1),
+            }
+            for path, v in latencies.items() if v
+        },
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="BACH GUI Last-Benchmark")
+    parser.add_argument("--clients", type=int, default=200)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--url", default=None, help="Laufender Server statt in-process")
+    args = parser.parse_args()
+
+    r = asyncio.run(run_benchmark(args.clients, args.rounds, args.url))
+    print(f"[BENCH] {r['clients']} Clients, {r['requests']} Requests in {r['seconds']}s "
+          f"({r['rps']} req/s), Fehler: {r['errors']}")
+    for path, s in r["endpoints"].items():
+        print(f"  {path:<28} p50 {s['p50_ms']:>8.1f} ms  p95 {s['p95_ms']:>8.1f} ms  "
+              f"p99 {s['p99_ms']:>8.1f} ms  max {s['max_ms']:>8.1f} ms")
+    for e in r["error_samples"]:
+        print(f"  [FEHLER] {e}")
+    return 0 if r["errors"] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
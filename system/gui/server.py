@@ -25,6 +25,8 @@ import os
 
 import json
 
+import asyncio
+
 import sqlite3
 
 from pathlib import Path
@@ -39,6 +41,9 @@ from contextlib import asynccontextmanager
 sys.path.insert(0, str(Path(__file__).parent.parent))
 from hub.lang import t, get_lang
 
+from core.db import get_db_connection
+from gui import async_db
+
 # Claude Router Import
 sys.path.insert(0, str(Path(__file__).parent / "api"))
 try:
@@ -417,33 +422,25 @@ ws_manager = ConnectionManager()
 
 def get_user_db():
 
-    """User-DB Verbindung mit Row-Factory."""
+    """User-DB Verbindung mit Row-Factory (gepoolt, close() gibt zurueck)."""
 
     if not USER_DB.exists():
 
         raise FileNotFoundError(f"User-DB nicht gefunden: {USER_DB}")
 
-    conn = sqlite3.connect(USER_DB)
-
-    conn.row_factory = sqlite3.Row
-
-    return conn
+    return get_db_connection(USER_DB)
 
 
 
 def get_bach_db():
 
-    """System-DB Verbindung."""
+    """System-DB Verbindung (gepoolt, close() gibt zurueck)."""
 
     if not BACH_DB.exists():
 
         raise FileNotFoundError(f"BACH-DB nicht gefunden: {BACH_DB}")
 
-    conn = sqlite3.connect(BACH_DB)
-
-    conn.row_factory = sqlite3.Row
-
-    return conn
+    return get_db_connection(BACH_DB)
 
 
 
@@ -487,6 +484,10 @@ async def lifespan(app: FastAPI):
 
     print(f"           USER_DB:  {USER_DB}")
 
+    # Blockierende Arbeit vom Event-Loop fernhalten (def-Endpoints -> Threadpool)
+    async_db.configure_threadpool()
+    async_db.system_sampler.start()
+
     
 
     # File Watcher für Live-Updates (Phase 4.3)
@@ -583,6 +584,9 @@ async def lifespan(app: FastAPI):
 
         print(f"[BACH GUI] File-Watcher gestoppt")
 
+    async_db.system_sampler.stop()
+    async_db.shutdown()
+
     print(f"[BACH GUI] Server beendet.")
 
 
@@ -667,100 +671,21 @@ async def get_status():
 
     """Liefert System-Status."""
 
-    conn_user = get_user_db()
-
-    conn_bach = get_bach_db()
-
-
-
-    # Tasks aus bach.db (mit Fallback)
-
-    try:
-
-        tasks_open = conn_bach.execute(
-
-            "SELECT COUNT(*) FROM tasks WHERE status IN ('pending', 'open', 'in_progress')"
-
-        ).fetchone()[0]
-
-    except:
-
-        tasks_open = 0
-
-
-
-    # Scanned tasks aus bach.db (mit Fallback)
-    try:
-        scanned_tasks = conn_bach.execute(
-            "SELECT COUNT(*) FROM ati_tasks WHERE status = 'offen'"
-        ).fetchone()[0]
-    except:
-        scanned_tasks = 0
-
-
-
-    # Messages (mit Fallback)
-    try:
-        messages_unread = conn_bach.execute(
-            "SELECT COUNT(*) FROM messages WHERE status = 'unread'"
-        ).fetchone()[0]
-    except:
-        messages_unread = 0
-
-
-
-    # Daemon Jobs (mit Fallback)
+    if not USER_DB.exists() or not BACH_DB.exists():
+        raise FileNotFoundError(f"DB nicht gefunden: {BACH_DB}")
 
-    try:
-
-        daemon_active = conn_user.execute(
-
-            "SELECT COUNT(*) FROM scheduler_jobs WHERE is_active = 1"
-
-        ).fetchone()[0]
-
-    except:
-
-        daemon_active = 0
-
-
-
-    # Last Scan (mit Fallback)
-
-    try:
-
-        last_scan = conn_user.execute(
-
-            "SELECT started_at FROM scan_runs ORDER BY id DESC LIMIT 1"
-
-        ).fetchone()
-
-    except:
-
-        last_scan = None
-
-
-
-    conn_user.close()
+    # Zaehler parallel im DB-Worker-Pool (jeweils mit Fallback 0/None)
+    tasks_open, scanned_tasks, messages_unread, daemon_active, last_scan = await asyncio.gather(
+        async_db.fetch_value(BACH_DB, "SELECT COUNT(*) FROM tasks WHERE status IN ('pending', 'open', 'in_progress')", default=0),
+        async_db.fetch_value(BACH_DB, "SELECT COUNT(*) FROM ati_tasks WHERE status = 'offen'", default=0),
+        async_db.fetch_value(BACH_DB, "SELECT COUNT(*) FROM messages WHERE status = 'unread'", default=0),
+        async_db.fetch_value(USER_DB, "SELECT COUNT(*) FROM scheduler_jobs WHERE is_active = 1", default=0),
+        async_db.fetch_value(USER_DB, "SELECT started_at FROM scan_runs ORDER BY id DESC LIMIT 1"),
+    )
 
-    conn_bach.close()
-
-    # System-Ressourcen (NEU v1.1.85)
-    system_info = {}
-    try:
-        import psutil
-        mem = psutil.virtual_memory()
-        system_info = {
-            "ram_used_gb": round(mem.used / (1024**3), 1),
-            "ram_total_gb": round(mem.total / (1024**3), 1),
-            "ram_percent": mem.percent,
-            "cpu_percent": psutil.cpu_percent(interval=0.1),
-            "disk_percent": psutil.disk_usage(os.path.abspath(os.sep)).percent if hasattr(psutil, 'disk_usage') else None
-        }
-    except ImportError:
-        system_info = {"error": "psutil not installed"}
-    except Exception as e:
-        system_info = {"error": str(e)}
+    # System-Ressourcen (NEU v1.1.85) - Messwert aus dem Hintergrund-Sampler
+    system_info = async_db.system_sampler.snapshot()
+    system_info.pop("sampled_at", None)
 
     return {
 
@@ -781,7 +706,7 @@ async def get_status():
 
             "scheduler_jobs_active": daemon_active,
 
-            "last_scan": last_scan[0] if last_scan else None
+            "last_scan": last_scan
 
         },
         "system": system_info
@@ -806,7 +731,7 @@ async def get_status():
 
 @app.delete("/api/tasks/{task_id}")
 
-async def api_del_task(task_id: int):
+def api_del_task(task_id: int):
 
     """Löscht einen Task in bach.db."""
 
@@ -830,7 +755,7 @@ async def api_del_task(task_id: int):
 
 @app.post("/api/tasks/export")
 
-async def api_tasks_export():
+def api_tasks_export():
 
     """Exportiert offene Tasks in eine JSON-Datei."""
 
@@ -876,59 +801,35 @@ async def api_tasks_export():
 # --- Old duplicate GET single + PUT mit TaskUpdate entfernt (Bug #902) ---
 
 @app.get("/api/tasks")
-async def api_get_tasks(status: str = "all", project: str = None, assigned_to: str = None, limit: int = 100):
-    """Liefert Tasks mit erweitertem Filter und Blockierungs-Check."""
+def api_get_tasks(status: str = "all", project: str = None, assigned_to: str = None,
+                  limit: int = 100, cursor: str = None):
+    """Liefert Tasks mit erweitertem Filter und Blockierungs-Check.
+
+    Keyset-Pagination: next_cursor als ?cursor= fuer die naechste Seite.
+    """
+    from hub._services.tasks.task_query import list_tasks
     try:
         conn = get_bach_db()
-
-        # Support "all" to return all statuses (fix for task disappearing bug)
-        if status and status.lower() != "all":
-            query = "SELECT * FROM tasks WHERE status = ?"
-            params = [status]
-        else:
-            query = "SELECT * FROM tasks WHERE 1=1"
-            params = []
-        
-        if project:
-            query += " AND category = ?"
-            params.append(project)
-        if assigned_to:
-            query += " AND assigned_to = ?"
-            params.append(assigned_to)
-            
-        query += " ORDER BY priority ASC, created_at DESC LIMIT ?"
-        params.append(limit)
-        
-        rows = conn.execute(query, params).fetchall()
-        tasks = rows_to_list(rows)
-
-        # image_data nicht in Liste senden (Performance), nur Flag
-        for task in tasks:
-            if task.get("image_data"):
-                task["has_image"] = True
-            task.pop("image_data", None)
-
-        # Check dependencies for blocking status
-        for task in tasks:
-            if task.get("depends_on"):
-                try:
-                    dep_ids = [int(x.strip()) for x in task["depends_on"].split(",") if x.strip()]
-                    if dep_ids:
-                        # Prüfen ob alle erledigt sind
-                        placeholders = ",".join(["?"] * len(dep_ids))
-                        unfinished = conn.execute(f"SELECT COUNT(*) FROM tasks WHERE id IN ({placeholders}) AND status != 'done'", dep_ids).fetchone()[0]
-                        if unfinished > 0:
-                            task["is_blocked_by_dep"] = True
-                except:
-                    pass
-                    
-        conn.close()
-        return {"success": True, "tasks": tasks, "count": len(tasks)}
+        try:
+            page = list_tasks(
+                conn,
+                # Support "all" to return all statuses (fix for task disappearing bug)
+                status=status if status and status.lower() != "all" else None,
+                category=project,
+                assigned_to=assigned_to,
+                limit=limit,
+                cursor=cursor,
+                newest_first=True,
+            )
+        finally:
+            conn.close()
+        return {"success": True, "tasks": page.tasks, "count": len(page.tasks),
+                "next_cursor": page.next_cursor}
     except Exception as e:
         return {"success": False, "error": str(e)}
 
 @app.post("/api/tasks")
-async def api_post_task(payload: dict = Body(...)):
+def api_post_task(payload: dict = Body(...)):
     """Erstellt neuen Task in bach.db via JSON Payload."""
     try:
         conn = get_bach_db()
@@ -958,7 +859,7 @@ async def api_post_task(payload: dict = Body(...)):
         return {"success": False, "error": str(e)}
 
 @app.put("/api/tasks/{task_id}")
-async def api_put_task(task_id: int, payload: dict = Body(...)):
+def api_put_task(task_id: int, payload: dict = Body(...)):
     """Aktualisiert einen Task in bach.db."""
     try:
         conn = get_bach_db()
@@ -984,7 +885,7 @@ async def api_put_task(task_id: int, payload: dict = Body(...)):
         return {"success": False, "error": str(e)}
 
 @app.get("/api/tasks/{task_id}")
-async def get_task(task_id: int):
+def get_task(task_id: int):
     """Holt einzelnen Task aus bach.db."""
     conn = get_bach_db()
     row = conn.execute("SELECT * FROM tasks WHERE id = ?", (task_id,)).fetchone()
@@ -996,7 +897,7 @@ async def get_task(task_id: int):
     return row_to_dict(row)
 
 @app.put("/api/tasks/{task_id}")
-async def update_task(task_id: int, update: TaskUpdate):
+def update_task(task_id: int, update: TaskUpdate):
     """Aktualisiert Task in bach.db."""
     conn = get_bach_db()
     
@@ -1054,7 +955,7 @@ async def update_task(task_id: int, update: TaskUpdate):
 # ═══════════════════════════════════════════════════════════════
 
 @app.get("/api/assignees")
-async def list_assignees():
+def list_assignees():
     """Listet alle moeglichen Zuweisungsempfaenger: user, agents, experts, connections."""
     conn = get_bach_db()
     assignees = []
@@ -1152,7 +1053,7 @@ async def list_assignees():
 
 @app.get("/api/agents")
 
-async def api_list_agents():
+def api_list_agents():
 
     """Detaillierte Liste aller Agenten inkl. Experten."""
 
@@ -1219,7 +1120,7 @@ async def api_list_agents():
 
 @app.put("/api/agents/{agent_id}/toggle")
 
-async def api_toggle_agent(agent_id: int):
+def api_toggle_agent(agent_id: int):
 
     """Aktiviert/Deaktiviert einen Agenten."""
 
@@ -1267,7 +1168,7 @@ async def api_toggle_agent(agent_id: int):
 
 @app.get("/api/scanned-tasks")
 @app.get("/api/ati/tasks")
-async def list_scanned_tasks(tool: Optional[str] = None, status: Optional[str] = None, limit: int = 50):
+def list_scanned_tasks(tool: Optional[str] = None, status: Optional[str] = None, limit: int = 50):
 
     """Listet gescannte Tasks."""
 
@@ -1327,7 +1228,7 @@ async def list_scanned_tasks(tool: Optional[str] = None, status: Optional[str] =
 
 @app.get("/api/bericht/status")
 
-async def api_bericht_status():
+def api_bericht_status():
 
     """Ruft Status der Bericht-Pipeline ab."""
 
@@ -1351,7 +1252,7 @@ async def api_bericht_status():
 
 @app.get("/api/bericht/clients")
 
-async def api_bericht_clients():
+def api_bericht_clients():
 
     """Listet Klienten-Ordner auf."""
 
@@ -1375,7 +1276,7 @@ async def api_bericht_clients():
 
 @app.post("/api/bericht/export")
 
-async def api_bericht_export(payload: BerichtExport):
+def api_bericht_export(payload: BerichtExport):
 
     """Exportiert (de-anonymisiert) einen Bericht."""
 
@@ -1401,7 +1302,7 @@ async def api_bericht_export(payload: BerichtExport):
 
 @app.post("/api/bericht/generate")
 
-async def api_bericht_generate(payload: BerichtGenerate):
+def api_bericht_generate(payload: BerichtGenerate):
 
     """Generiert einen Bericht."""
 
@@ -1439,7 +1340,7 @@ async def api_bericht_generate(payload: BerichtGenerate):
 
 @app.get("/api/mounts")
 
-async def api_list_mounts():
+def api_list_mounts():
 
     """Listet alle Mounts auf."""
 
@@ -1507,7 +1408,7 @@ async def api_list_mounts():
 
 @app.post("/api/mounts")
 
-async def api_add_mount(payload: MountAdd):
+def api_add_mount(payload: MountAdd):
 
     """Fügt einen neuen Mount hinzu."""
 
@@ -1531,7 +1432,7 @@ async def api_add_mount(payload: MountAdd):
 
 @app.delete("/api/mounts/{alias}")
 
-async def api_remove_mount(alias: str):
+def api_remove_mount(alias: str):
 
     """Entfernt einen Mount."""
 
@@ -1555,7 +1456,7 @@ async def api_remove_mount(alias: str):
 
 @app.post("/api/mounts/restore")
 
-async def api_restore_mounts():
+def api_restore_mounts():
 
     """Stellt alle Mounts wieder her."""
 
@@ -1591,7 +1492,7 @@ async def api_restore_mounts():
 
 @app.get("/api/messages")
 
-async def list_messages(direction: Optional[str] = None, status: Optional[str] = None,
+def list_messages(direction: Optional[str] = None, status: Optional[str] = None,
 
                         include_archived: bool = True, limit: int = 50):
 
@@ -1660,7 +1561,7 @@ async def list_messages(direction: Optional[str] = None, status: Optional[str] =
 
 
 @app.post("/api/claude/chat")
-async def claude_chat(
+def claude_chat(
     request_type: str = Body(...),
     prompt: str = Body(...),
     user_id: str = Body(default="user")
@@ -1682,7 +1583,7 @@ async def claude_chat(
 
 @app.post("/api/messages")
 
-async def create_message(msg: MessageCreate):
+def create_message(msg: MessageCreate):
 
     """Erstellt neue Nachricht."""
 
@@ -1714,7 +1615,7 @@ async def create_message(msg: MessageCreate):
 
 @app.put("/api/messages/{msg_id}/read")
 
-async def mark_message_read(msg_id: int):
+def mark_message_read(msg_id: int):
 
     """Markiert Nachricht als gelesen."""
 
@@ -1740,7 +1641,7 @@ async def mark_message_read(msg_id: int):
 
 @app.put("/api/messages/{msg_id}/archive")
 
-async def archive_message(msg_id: int):
+def archive_message(msg_id: int):
 
     """Archiviert eine Nachricht."""
 
@@ -1766,7 +1667,7 @@ async def archive_message(msg_id: int):
 
 @app.put("/api/messages/{msg_id}/delete")
 
-async def delete_message(msg_id: int):
+def delete_message(msg_id: int):
 
     """Markiert Nachricht als geloescht (soft delete)."""
 
@@ -1798,7 +1699,7 @@ async def delete_message(msg_id: int):
 
 @app.get("/api/daemon/jobs")
 
-async def list_scheduler_jobs():
+def list_scheduler_jobs():
 
     """Listet alle Daemon-Jobs."""
 
@@ -1814,7 +1715,7 @@ async def list_scheduler_jobs():
 
 @app.post("/api/daemon/jobs")
 
-async def create_daemon_job(job: DaemonJobCreate):
+def create_daemon_job(job: DaemonJobCreate):
 
     """Erstellt neuen Daemon-Job."""
 
@@ -1846,7 +1747,7 @@ async def create_daemon_job(job: DaemonJobCreate):
 
 @app.put("/api/daemon/jobs/{job_id}/toggle")
 
-async def toggle_daemon_job(job_id: int):
+def toggle_daemon_job(job_id: int):
 
     """Aktiviert/Deaktiviert Daemon-Job."""
 
@@ -1880,7 +1781,7 @@ async def toggle_daemon_job(job_id: int):
 
 @app.get("/api/daemon/runs")
 
-async def list_scheduler_runs(job_id: Optional[int] = None, limit: int = 20):
+def list_scheduler_runs(job_id: Optional[int] = None, limit: int = 20):
 
     """Listet Daemon-Laeufe."""
 
@@ -1920,7 +1821,7 @@ async def list_scheduler_runs(job_id: Optional[int] = None, limit: int = 20):
 
 @app.get("/api/daemon/status")
 
-async def get_daemon_status():
+def get_daemon_status():
 
     """Liefert aktuellen Daemon-Status."""
 
@@ -2010,7 +1911,7 @@ async def get_daemon_status():
 
 @app.post("/api/daemon/start")
 
-async def start_daemon(background_tasks: BackgroundTasks):
+def start_daemon(background_tasks: BackgroundTasks):
 
     """Startet den Daemon-Service im Hintergrund."""
 
@@ -2044,7 +1945,7 @@ async def start_daemon(background_tasks: BackgroundTasks):
 
 @app.post("/api/daemon/stop")
 
-async def stop_daemon():
+def stop_daemon():
 
     """Stoppt den Daemon-Service."""
 
@@ -2076,7 +1977,7 @@ async def stop_daemon():
 
 @app.post("/api/daemon/kill-all")
 
-async def kill_all_daemons():
+def kill_all_daemons():
 
     """Beendet alle Daemon-Prozesse (Zombie-Praevention)."""
 
@@ -2106,7 +2007,7 @@ async def kill_all_daemons():
 
 @app.post("/api/daemon/jobs/{job_id}/run")
 
-async def run_daemon_job(job_id: int, background_tasks: BackgroundTasks):
+def run_daemon_job(job_id: int, background_tasks: BackgroundTasks):
 
     """Fuehrt einen Job sofort aus."""
 
@@ -2140,7 +2041,7 @@ async def run_daemon_job(job_id: int, background_tasks: BackgroundTasks):
 
 @app.get("/api/daemon/chains")
 
-async def list_chains():
+def list_chains():
 
     """Listet alle Toolchains aus der DB."""
 
@@ -2156,7 +2057,7 @@ async def list_chains():
 
 @app.post("/api/daemon/chains")
 
-async def create_chain(chain: ChainCreate):
+def create_chain(chain: ChainCreate):
 
     """Erstellt eine neue Toolchain."""
 
@@ -2194,7 +2095,7 @@ async def create_chain(chain: ChainCreate):
 
 @app.put("/api/daemon/chains/{chain_id}")
 
-async def update_chain(chain_id: int, chain: ChainUpdate):
+def update_chain(chain_id: int, chain: ChainUpdate):
 
     """Aktualisiert eine Toolchain."""
 
@@ -2270,7 +2171,7 @@ async def update_chain(chain_id: int, chain: ChainUpdate):
 
 @app.put("/api/daemon/chains/{chain_id}/toggle")
 
-async def toggle_chain(chain_id: int):
+def toggle_chain(chain_id: int):
 
     """Aktiviert/Deaktiviert eine Toolchain."""
 
@@ -2298,7 +2199,7 @@ async def toggle_chain(chain_id: int):
 
 @app.delete("/api/daemon/chains/{chain_id}")
 
-async def delete_chain(chain_id: int):
+def delete_chain(chain_id: int):
 
     """Loescht eine Toolchain."""
 
@@ -2326,7 +2227,7 @@ async def delete_chain(chain_id: int):
 
 @app.post("/api/daemon/chains/{chain_id}/run")
 
-async def run_chain(chain_id: int, background_tasks: BackgroundTasks):
+def run_chain(chain_id: int, background_tasks: BackgroundTasks):
 
     """Fuehrt eine Toolchain sofort aus (im Hintergrund)."""
 
@@ -2356,7 +2257,7 @@ async def run_chain(chain_id: int, background_tasks: BackgroundTasks):
 
 @app.get("/api/daemon/chains/{chain_id}/runs")
 
-async def list_chain_runs(chain_id: int, limit: int = 10):
+def list_chain_runs(chain_id: int, limit: int = 10):
 
     """Listet Ausfuehrungen einer bestimmten Toolchain."""
 
@@ -2386,7 +2287,7 @@ async def list_chain_runs(chain_id: int, limit: int = 10):
 
 @app.post("/api/wartung/trigger")
 
-async def trigger_wartung_job(request: Request, background_tasks: BackgroundTasks):
+def trigger_wartung_job(background_tasks: BackgroundTasks, data: dict = Body(...)):
 
     """
 
@@ -2398,7 +2299,6 @@ async def trigger_wartung_job(request: Request, background_tasks: BackgroundTask
 
     try:
 
-        data = await request.json()
 
         job_type = data.get("type", "all")  # scanner, daemon, memory, backup, all
 
@@ -2533,7 +2433,7 @@ async def trigger_wartung_job(request: Request, background_tasks: BackgroundTask
 
 @app.get("/api/wartung/status")
 
-async def get_wartung_status():
+def get_wartung_status():
 
     """WARTUNG_003: Konsolidierte Wartungs-Uebersicht."""
 
@@ -2662,7 +2562,7 @@ async def get_wartung_status():
 
 @app.get("/api/tokens/usage")
 
-async def get_token_usage():
+def get_token_usage():
 
     """Liefert Token-Verbrauch und Kosten."""
 
@@ -2754,7 +2654,7 @@ async def get_token_usage():
 
 @app.post("/api/scanner/trigger")
 
-async def trigger_scanner(background_tasks: BackgroundTasks):
+def trigger_scanner(background_tasks: BackgroundTasks):
 
     """WARTUNG_002: Direkter Scanner-Trigger."""
 
@@ -2796,7 +2696,7 @@ async def trigger_scanner(background_tasks: BackgroundTasks):
 
 @app.post("/api/scanner/run")
 
-async def run_scanner(background_tasks: BackgroundTasks):
+def run_scanner(background_tasks: BackgroundTasks):
 
     """Startet ATI-Scanner im Hintergrund."""
 
@@ -2828,7 +2728,7 @@ async def run_scanner(background_tasks: BackgroundTasks):
 
 @app.get("/api/scanner/status")
 
-async def get_scanner_status():
+def get_scanner_status():
 
     """Liefert Scanner-Status."""
 
@@ -2890,7 +2790,7 @@ async def get_scanner_status():
 
 @app.get("/api/scanner/tools")
 
-async def list_tools():
+def list_tools():
 
     """Listet registrierte Tools."""
 
@@ -2910,7 +2810,7 @@ async def list_tools():
 
 @app.get("/api/scanner/config")
 
-async def get_scan_config():
+def get_scan_config():
 
     """Liefert Scanner-Konfiguration."""
 
@@ -2953,7 +2853,7 @@ async def get_scan_config():
 
 
 @app.get("/api/ati/stats")
-async def get_ati_stats():
+def get_ati_stats():
     """Liefert ATI-Statistiken inkl. Tages-Zähler."""
     try:
         conn = get_user_db()
@@ -2993,7 +2893,7 @@ async def get_ati_stats():
 
 @app.get("/api/ati/tasks/{task_id}")
 
-async def get_ati_task(task_id: int):
+def get_ati_task(task_id: int):
 
     """Holt einzelnen ATI-Task."""
 
@@ -3014,7 +2914,7 @@ async def get_ati_task(task_id: int):
     return {"task": row_to_dict(row)}
 
 @app.get("/api/ati/sessions")
-async def get_ati_sessions(limit: int = 10):
+def get_ati_sessions(limit: int = 10):
     """Liefert die letzten KI-Sessions."""
     try:
         conn = get_user_db()
@@ -3029,7 +2929,7 @@ async def get_ati_sessions(limit: int = 10):
 
 
 @app.post("/api/ati/session/start")
-async def start_ati_session(work_time: int = 15):
+def start_ati_session(work_time: int = 15):
     """Startet eine ATI-Session mit dem gleichen Prompt wie im Prompt-Manager.
 
     Generiert den ATI-Prompt, kopiert ihn in die Zwischenablage und
@@ -3151,7 +3051,7 @@ bach --memory session
 
 
 @app.post("/api/ati/session/start-cli")
-async def start_ati_session_cli(work_time: int = 15, task_prompt: str = ""):
+def start_ati_session_cli(work_time: int = 15, task_prompt: str = ""):
     """Startet eine ATI-Session direkt ueber Claude Code CLI.
 
     Oeffnet ein neues Terminal-Fenster mit 'claude' und uebergibt den
@@ -3257,7 +3157,7 @@ class ATITaskUpdate(BaseModel):
 
 @app.post("/api/ati/tasks")
 
-async def create_ati_task(task: ATITaskCreate):
+def create_ati_task(task: ATITaskCreate):
 
     """Erstellt neuen ATI-Task."""
 
@@ -3333,7 +3233,7 @@ async def create_ati_task(task: ATITaskCreate):
 
 @app.put("/api/ati/tasks/{task_id}")
 
-async def update_ati_task(task_id: int, update: ATITaskUpdate):
+def update_ati_task(task_id: int, update: ATITaskUpdate):
 
     """Aktualisiert ATI-Task."""
 
@@ -3415,7 +3315,7 @@ async def update_ati_task(task_id: int, update: ATITaskUpdate):
 
 @app.delete("/api/ati/tasks/{task_id}")
 
-async def delete_ati_task(task_id: int):
+def delete_ati_task(task_id: int):
 
     """Loescht ATI-Task."""
 
@@ -3443,7 +3343,7 @@ async def delete_ati_task(task_id: int):
 
 @app.get("/api/skills")
 
-async def list_skills(category: Optional[str] = None, is_active: Optional[bool] = None, limit: int = 100):
+def list_skills(category: Optional[str] = None, is_active: Optional[bool] = None, limit: int = 100):
 
     """Listet Skills aus bach.db mit optionalen Filtern."""
 
@@ -3491,7 +3391,7 @@ async def list_skills(category: Optional[str] = None, is_active: Optional[bool]
 
 @app.get("/api/skills/categories")
 
-async def list_skill_categories():
+def list_skill_categories():
 
     """Listet alle Skill-Kategorien mit Zaehler."""
 
@@ -3521,7 +3421,7 @@ async def list_skill_categories():
 
 @app.get("/api/skills/{skill_id}")
 
-async def get_skill(skill_id: int):
+def get_skill(skill_id: int):
 
     """Holt einzelnen Skill mit Details."""
 
@@ -3546,7 +3446,7 @@ async def get_skill(skill_id: int):
 
 
 @app.get("/api/system/logs")
-async def list_system_logs():
+def list_system_logs():
     """Listet Log-Dateien aus /data/logs (konsolidiert 2026-02-06)."""
     log_dirs = {
         "data": DATA_DIR / "logs",
@@ -3570,7 +3470,7 @@ async def list_system_logs():
 
 
 @app.get("/api/system/logs/{filename}")
-async def get_log_content(filename: str, lines: int = 500, source: str = "data"):
+def get_log_content(filename: str, lines: int = 500, source: str = "data"):
     """Gibt die letzten N Zeilen einer Log-Datei zurueck."""
     # Sicherheit
     if ".." in filename or "/" in filename or "\\" in filename:
@@ -3610,7 +3510,7 @@ if STATIC_DIR.exists():
 
 @app.get("/", response_class=HTMLResponse)
 
-async def index():
+def index():
 
     """Startseite."""
 
@@ -3648,7 +3548,7 @@ async def index():
 
 @app.get("/inbox", response_class=HTMLResponse)
 
-async def inbox_page():
+def inbox_page():
 
     """Inbox Seite."""
 
@@ -3664,7 +3564,7 @@ async def inbox_page():
 
 @app.get("/financial", response_class=HTMLResponse)
 
-async def financial_page():
+def financial_page():
 
     """Financial Seite."""
 
@@ -3680,7 +3580,7 @@ async def financial_page():
 
 @app.get("/memory", response_class=HTMLResponse)
 
-async def memory_page():
+def memory_page():
 
     """Memory Seite."""
 
@@ -3696,7 +3596,7 @@ async def memory_page():
 
 @app.get("/prompt-generator", response_class=HTMLResponse)
 
-async def prompt_generator_page():
+def prompt_generator_page():
 
     """Prompt Generator Seite."""
 
@@ -3712,7 +3612,7 @@ async def prompt_generator_page():
 
 @app.get("/daemon", response_class=HTMLResponse)
 
-async def daemon_page():
+def daemon_page():
 
     """Daemon Manager Seite."""
 
@@ -3728,7 +3628,7 @@ async def daemon_page():
 
 @app.get("/tasks", response_class=HTMLResponse)
 
-async def tasks_page():
+def tasks_page():
 
     """Tasks Seite."""
 
@@ -3744,7 +3644,7 @@ async def tasks_page():
 
 @app.get("/scanner", response_class=HTMLResponse)
 
-async def scanner_page():
+def scanner_page():
 
     """Scanner Seite."""
 
@@ -3760,7 +3660,7 @@ async def scanner_page():
 
 @app.get("/messages", response_class=HTMLResponse)
 
-async def messages_page():
+def messages_page():
 
     """Messages Seite."""
 
@@ -3776,7 +3676,7 @@ async def messages_page():
 
 @app.get("/help", response_class=HTMLResponse)
 
-async def help_page():
+def help_page():
 
     """Help/Dokumentation Seite."""
 
@@ -3794,7 +3694,7 @@ async def help_page():
 
 @app.get("/maintenance", response_class=HTMLResponse)
 
-async def maintenance_page():
+def maintenance_page():
 
     """Wartungs-Board Seite."""
 
@@ -3820,7 +3720,7 @@ async def maintenance_page():
 
 @app.get("/logs", response_class=HTMLResponse)
 
-async def logs_page():
+def logs_page():
 
     """Logs Anzeige Seite."""
 
@@ -3838,7 +3738,7 @@ async def logs_page():
 
 @app.get("/wiki", response_class=HTMLResponse)
 
-async def wiki_page():
+def wiki_page():
 
     """Wiki Seite."""
 
@@ -3853,7 +3753,7 @@ async def wiki_page():
 
 
 @app.get("/agents", response_class=HTMLResponse)
-async def agents_page():
+def agents_page():
     """Agenten-Uebersicht Seite."""
     agents_file = TEMPLATES_DIR / "agents.html"
     if agents_file.exists():
@@ -3862,7 +3762,7 @@ async def agents_page():
 
 @app.get("/ati", response_class=HTMLResponse)
 @app.get("/agents/ati", response_class=HTMLResponse)
-async def ati_agent_page():
+def ati_agent_page():
     """ATI Agent Dashboard Seite."""
     ati_file = TEMPLATES_DIR / "ati.html"
     if ati_file.exists():
@@ -3875,7 +3775,7 @@ async def ati_agent_page():
 
 @app.get("/partners", response_class=HTMLResponse)
 
-async def partners_page():
+def partners_page():
 
     """Partner Dashboard Seite."""
 
@@ -3893,7 +3793,7 @@ async def partners_page():
 
 @app.get("/agents/ati", response_class=HTMLResponse)
 
-async def ati_dashboard_page():
+def ati_dashboard_page():
 
     """ATI Agent Dashboard."""
 
@@ -3909,7 +3809,7 @@ async def ati_dashboard_page():
 
 @app.get("/agents/steuer", response_class=HTMLResponse)
 
-async def steuer_dashboard_page():
+def steuer_dashboard_page():
 
     """Steuer Agent Dashboard - Redirect zu Scanner vorerst."""
 
@@ -3927,7 +3827,7 @@ async def steuer_dashboard_page():
 
 @app.get("/agents/gesundheit", response_class=HTMLResponse)
 
-async def gesundheit_dashboard_page():
+def gesundheit_dashboard_page():
 
     """Gesundheitsassistent Dashboard."""
 
@@ -3943,7 +3843,7 @@ async def gesundheit_dashboard_page():
 
 @app.get("/agents/persoenlich", response_class=HTMLResponse)
 
-async def persoenlich_dashboard_page():
+def persoenlich_dashboard_page():
 
     """Persoenlicher Assistent Dashboard."""
 
@@ -3958,7 +3858,7 @@ async def persoenlich_dashboard_page():
 
 
 @app.get("/agents/foerderplaner", response_class=HTMLResponse)
-async def foerderplaner_dashboard_page():
+def foerderplaner_dashboard_page():
     """Foerderplaner Dashboard."""
     template_file = TEMPLATES_DIR / "anonymization.html"
     if template_file.exists():
@@ -3969,7 +3869,7 @@ async def foerderplaner_dashboard_page():
 
 @app.get("/skills-board", response_class=HTMLResponse)
 
-async def skills_board_page():
+def skills_board_page():
 
     """Skills Board - Hierarchie-Verwaltung."""
 
@@ -3987,7 +3887,7 @@ async def skills_board_page():
 
 @app.get("/tools", response_class=HTMLResponse)
 
-async def tools_page():
+def tools_page():
 
     """Tools Übersicht Seite."""
 
@@ -4005,7 +3905,7 @@ async def tools_page():
 
 @app.get("/tokens", response_class=HTMLResponse)
 
-async def tokens_page():
+def tokens_page():
 
     """Token Dashboard Seite."""
 
@@ -4025,7 +3925,7 @@ async def tokens_page():
 
 @app.get("/tasks-board", response_class=HTMLResponse)
 
-async def tasks_board_api():
+def tasks_board_api():
 
     """Tasks Board Seite."""
 
@@ -4043,7 +3943,7 @@ async def tasks_board_api():
 
 @app.get("/api/inbox/config")
 
-async def api_get_inbox_config():
+def api_get_inbox_config():
 
     """Lädt die aktuelle Inbox-Konfiguration."""
 
@@ -4067,7 +3967,7 @@ async def api_get_inbox_config():
 
 @app.post("/api/ai/headless/run")
 
-async def api_ai_headless_run(payload: dict = Body(...)):
+def api_ai_headless_run(payload: dict = Body(...)):
 
     """Triggert eine Headless AI Session."""
 
@@ -4115,7 +4015,7 @@ async def api_ai_headless_run(payload: dict = Body(...)):
 
 @app.post("/api/inbox/config")
 
-async def api_save_inbox_config(payload: dict = Body(...)):
+def api_save_inbox_config(payload: dict = Body(...)):
 
     """Speichert die Inbox-Konfiguration."""
 
@@ -4269,7 +4169,7 @@ async def api_save_inbox_config(payload: dict = Body(...)):
 
 @app.get("/api/steuer/dokumente/unlinked")
 
-async def api_steuer_unlinked_docs(username: str = "user", jahr: int = 2025):
+def api_steuer_unlinked_docs(username: str = "user", jahr: int = 2025):
 
     """Liefert Dokumente, die noch nicht mit einem Posten verknüpft sind."""
 
@@ -4305,7 +4205,7 @@ async def api_steuer_unlinked_docs(username: str = "user", jahr: int = 2025):
 
 @app.post("/api/steuer/posten/{posten_id}/link")
 
-async def api_steuer_link_posten(posten_id: int, payload: dict = Body(...)):
+def api_steuer_link_posten(posten_id: int, payload: dict = Body(...)):
 
     """Verknüpft einen Posten mit einem Dokument."""
 
@@ -4349,7 +4249,7 @@ async def api_steuer_link_posten(posten_id: int, payload: dict = Body(...)):
 
 @app.post("/api/steuer/match-bank")
 
-async def api_steuer_match_bank(payload: dict = Body(...)):
+def api_steuer_match_bank(payload: dict = Body(...)):
 
     """Triggert den Bank-Abgleich."""
 
@@ -4403,7 +4303,7 @@ async def api_steuer_match_bank(payload: dict = Body(...)):
 
 @app.get("/api/tools/{name}")
 
-async def api_get_tool_detail(name: str):
+def api_get_tool_detail(name: str):
 
     """Details zu einem Tool abrufen."""
 
@@ -4485,7 +4385,7 @@ async def api_get_tool_detail(name: str):
 
 @app.post("/api/tools/{name}/run")
 
-async def api_run_tool(name: str, payload: dict = Body(...)):
+def api_run_tool(name: str, payload: dict = Body(...)):
 
     """Tool ausführen."""
 
@@ -4565,7 +4465,7 @@ async def api_run_tool(name: str, payload: dict = Body(...)):
 
 @app.get("/api/bach-agents")
 
-async def get_bach_agents():
+def get_bach_agents():
 
     """Laedt Agenten und Experten aus der Datenbank."""
 
@@ -4901,7 +4801,7 @@ SKILLS_HIERARCHY_FILE = DATA_DIR / "skills_hierarchy.json"
 
 @app.get("/api/skills-board/item-file")
 
-async def get_skills_item_file(type: str, id: str, description: Optional[str] = ""):
+def get_skills_item_file(type: str, id: str, description: Optional[str] = ""):
 
     """Sucht und liefert den Inhalt der Quelldatei eines Items."""
 
@@ -4939,7 +4839,7 @@ async def get_skills_item_file(type: str, id: str, description: Optional[str] =
 
 @app.put("/api/skills-board/item-file")
 
-async def update_skills_item_file(request: FileUpdateRequest):
+def update_skills_item_file(request: FileUpdateRequest):
 
     """Speichert den Inhalt der Quelldatei."""
 
@@ -4981,7 +4881,7 @@ async def update_skills_item_file(request: FileUpdateRequest):
 
 @app.get("/api/skills-board/hierarchy")
 
-async def get_skills_hierarchy():
+def get_skills_hierarchy():
 
     """Laedt die Skills-Hierarchie."""
 
@@ -5005,7 +4905,7 @@ async def get_skills_hierarchy():
 
 @app.put("/api/skills-board/hierarchy")
 
-async def save_skills_hierarchy(request: Request):
+def save_skills_hierarchy(data: dict = Body(...)):
 
     """Speichert die Skills-Hierarchie."""
 
@@ -5015,7 +4915,6 @@ async def save_skills_hierarchy(request: Request):
 
 
 
-    data = await request.json()
 
 
 
@@ -5049,7 +4948,7 @@ async def save_skills_hierarchy(request: Request):
 
 @app.get("/api/help")
 
-async def list_help_files():
+def list_help_files():
 
     """Listet alle Help-Dateien inkl. Wiki-Unterordner (rekursiv)."""
 
@@ -5205,7 +5104,7 @@ async def list_help_files():
 
 @app.get("/api/docs/help/{name:path}")
 
-async def get_help_file(name: str):
+def get_help_file(name: str):
 
     """Liefert Inhalt einer Help-Datei (unterstuetzt auch wiki/ordner/datei)."""
 
@@ -5301,7 +5200,7 @@ class HelpUpdate(BaseModel):
 
 @app.put("/api/docs/help/{name:path}")
 
-async def update_help_file(name: str, data: HelpUpdate):
+def update_help_file(name: str, data: HelpUpdate):
 
     """Aktualisiert eine Help-Datei (nur im Entwicklermodus)."""
 
@@ -5377,7 +5276,7 @@ async def update_help_file(name: str, data: HelpUpdate):
 
 @app.post("/api/help")
 
-async def create_help_file(name: str = Query(...), data: HelpUpdate = None):
+def create_help_file(name: str = Query(...), data: HelpUpdate = None):
 
     """Erstellt eine neue Help-Datei."""
 
@@ -5435,7 +5334,7 @@ async def create_help_file(name: str = Query(...), data: HelpUpdate = None):
 
 @app.delete("/api/docs/help/{name:path}")
 
-async def delete_help_file(name: str):
+def delete_help_file(name: str):
 
     """Loescht eine Help-Datei (verschiebt sie nach .deleted)."""
 
@@ -5476,7 +5375,7 @@ async def delete_help_file(name: str):
 
 @app.get("/api/docs/help/search/{term}")
 
-async def search_help(term: str):
+def search_help(term: str):
 
     """Durchsucht Help-Dateien nach Begriff."""
 
@@ -5764,7 +5663,7 @@ def save_financial_data_json():
 
 @app.get("/financial", response_class=HTMLResponse)
 
-async def financial_page():
+def financial_page():
 
     """Financial Mail Dashboard."""
 
@@ -5786,7 +5685,7 @@ async def financial_page():
 
 @app.get("/api/financial/status")
 
-async def financial_status():
+def financial_status():
 
     """Status der Financial Mail Service."""
 
@@ -5894,7 +5793,7 @@ async def financial_status():
 
 @app.get("/api/financial/emails")
 
-async def financial_emails(
+def financial_emails(
 
     status: Optional[str] = None,
 
@@ -5970,7 +5869,7 @@ async def financial_emails(
 
 @app.get("/api/financial/emails/{email_id}")
 
-async def get_financial_email(email_id: int):
+def get_financial_email(email_id: int):
 
     """Holt eine einzelne Financial E-Mail mit Body."""
 
@@ -6000,7 +5899,7 @@ async def get_financial_email(email_id: int):
 
 @app.get("/api/financial/subscriptions")
 
-async def financial_subscriptions(active_only: bool = True):
+def financial_subscriptions(active_only: bool = True):
 
     """Liste der erkannten Abonnements."""
 
@@ -6040,7 +5939,7 @@ async def financial_subscriptions(active_only: bool = True):
 
 
 @app.get("/api/financial/subscriptions-unified")
-async def financial_subscriptions_unified():
+def financial_subscriptions_unified():
     """v1.1.84: Unified subscriptions aus v_subscriptions View mit Duplikat-Info."""
     try:
         conn = get_user_db()
@@ -6086,7 +5985,7 @@ async def financial_subscriptions_unified():
 
 @app.delete("/api/financial/subscriptions/{sub_id}")
 
-async def delete_financial_subscription(sub_id: int):
+def delete_financial_subscription(sub_id: int):
 
     """Loescht ein Abonnement."""
 
@@ -6112,7 +6011,7 @@ async def delete_financial_subscription(sub_id: int):
 
 @app.get("/api/financial/categories")
 
-async def financial_categories():
+def financial_categories():
 
     """Uebersicht nach Kategorien."""
 
@@ -6164,7 +6063,7 @@ async def financial_categories():
 
 @app.post("/api/financial/sync")
 
-async def financial_sync(background_tasks: BackgroundTasks):
+def financial_sync(background_tasks: BackgroundTasks):
 
     """Startet E-Mail-Synchronisierung."""
 
@@ -6224,7 +6123,7 @@ async def financial_sync(background_tasks: BackgroundTasks):
 
 @app.post("/api/financial/save-json")
 
-async def save_financial_json():
+def save_financial_json():
 
     """Speichert aktuelle Financial-Daten als JSON."""
 
@@ -6272,7 +6171,7 @@ def save_mail_config(config: dict):
 
 @app.get("/api/financial/config")
 
-async def financial_config():
+def financial_config():
 
     """Liefert die Mail-Service Konfiguration."""
 
@@ -6296,7 +6195,7 @@ async def financial_config():
 
 @app.put("/api/financial/config")
 
-async def update_financial_config(
+def update_financial_config(
 
     date_range_days: Optional[int] = None,
 
@@ -6352,7 +6251,7 @@ async def update_financial_config(
 
 @app.put("/api/financial/emails/{email_id}/status")
 
-async def update_email_status(email_id: int, status: str):
+def update_email_status(email_id: int, status: str):
 
     """Aktualisiert E-Mail-Status."""
 
@@ -6384,7 +6283,7 @@ async def update_email_status(email_id: int, status: str):
 
 @app.get("/api/financial/export")
 
-async def financial_export():
+def financial_export():
 
     """Exportiert Finanzdaten als JSON."""
 
@@ -6476,7 +6375,7 @@ async def financial_export():
 
 @app.get("/api/financial/accounts")
 
-async def financial_accounts():
+def financial_accounts():
 
     """Liste der E-Mail-Konten."""
 
@@ -6524,7 +6423,7 @@ class MailAccountCreate(BaseModel):
 
 @app.post("/api/financial/accounts")
 
-async def create_mail_account(account: MailAccountCreate):
+def create_mail_account(account: MailAccountCreate):
 
     """Erstellt neues E-Mail-Konto."""
 
@@ -6640,7 +6539,7 @@ async def create_mail_account(account: MailAccountCreate):
 
 @app.delete("/api/financial/accounts/{account_id}")
 
-async def delete_mail_account(account_id: int):
+def delete_mail_account(account_id: int):
 
     """Loescht E-Mail-Konto."""
 
@@ -6700,7 +6599,7 @@ async def delete_mail_account(account_id: int):
 
 @app.put("/api/financial/accounts/{account_id}/toggle")
 
-async def toggle_mail_account(account_id: int):
+def toggle_mail_account(account_id: int):
 
     """Aktiviert/Deaktiviert E-Mail-Konto."""
 
@@ -6752,7 +6651,7 @@ async def toggle_mail_account(account_id: int):
 
 @app.post("/api/financial/accounts/{account_id}/test")
 
-async def test_mail_account(account_id: int):
+def test_mail_account(account_id: int):
 
     """Testet Verbindung zum E-Mail-Konto."""
 
@@ -6862,7 +6761,7 @@ async def test_mail_account(account_id: int):
 
 @app.get("/api/financial/imap-presets")
 
-async def get_imap_presets():
+def get_imap_presets():
 
     """Gibt IMAP-Presets fuer bekannte Provider zurueck."""
 
@@ -6894,7 +6793,7 @@ async def get_imap_presets():
 
 @app.get("/api/financial/gmail/find-credentials")
 
-async def find_gmail_credentials():
+def find_gmail_credentials():
 
     """Sucht nach vorhandenen Gmail credentials.json Dateien."""
 
@@ -6932,7 +6831,7 @@ async def find_gmail_credentials():
 
 @app.post("/api/financial/gmail/setup")
 
-async def setup_gmail_api():
+def setup_gmail_api():
 
     """
 
@@ -7126,7 +7025,7 @@ async def setup_gmail_api():
 
 @app.get("/api/financial/gmail/status")
 
-async def gmail_api_status():
+def gmail_api_status():
 
     """Prueft den aktuellen Gmail API Status."""
 
@@ -7350,7 +7249,7 @@ def is_quiet_time(quiet_start: str, quiet_end: str) -> bool:
 
 @app.put("/api/daemon/config")
 
-async def update_daemon_config(request: Request):
+def update_daemon_config(data: dict = Body(...)):
 
     """
 
@@ -7362,7 +7261,6 @@ async def update_daemon_config(request: Request):
 
     try:
 
-        data = await request.json()
 
         
 
@@ -7416,7 +7314,7 @@ async def update_daemon_config(request: Request):
 
 @app.get("/api/daemon/status")
 
-async def daemon_status():
+def daemon_status():
 
     """
 
@@ -7576,7 +7474,7 @@ async def daemon_status():
 
 @app.get("/api/recurring")
 
-async def get_recurring_tasks():
+def get_recurring_tasks():
 
     """Listet alle konfigurierten recurring Tasks mit Status."""
 
@@ -7608,7 +7506,7 @@ async def get_recurring_tasks():
 
 @app.post("/api/recurring/check")
 
-async def check_recurring():
+def check_recurring():
 
     """Prueft faellige recurring Tasks und erstellt sie."""
 
@@ -7640,7 +7538,7 @@ async def check_recurring():
 
 @app.post("/api/recurring/trigger/{task_id}")
 
-async def trigger_recurring(task_id: str):
+def trigger_recurring(task_id: str):
 
     """Loest einen recurring Task manuell aus."""
 
@@ -7682,7 +7580,7 @@ async def trigger_recurring(task_id: str):
 
 @app.get("/memory", response_class=HTMLResponse)
 
-async def memory_page():
+def memory_page():
 
     """Memory Dashboard (Task 144)."""
 
@@ -7700,7 +7598,7 @@ async def memory_page():
 
 @app.get("/api/memory/overview")
 
-async def get_memory_overview():
+def get_memory_overview():
 
     """Memory-Uebersicht mit allen Kategorien."""
 
@@ -7842,7 +7740,7 @@ async def get_memory_overview():
 
 @app.get("/api/memory/working")
 
-async def get_working_memory(limit: int = 50):
+def get_working_memory(limit: int = 50):
 
     """Working Memory Eintraege."""
 
@@ -7872,7 +7770,7 @@ async def get_working_memory(limit: int = 50):
 
 @app.get("/api/memory/lessons")
 
-async def get_lessons(limit: int = 50, category: Optional[str] = None):
+def get_lessons(limit: int = 50, category: Optional[str] = None):
 
     """Lessons Learned."""
 
@@ -7920,7 +7818,7 @@ async def get_lessons(limit: int = 50, category: Optional[str] = None):
 
 @app.get("/api/memory/sessions")
 
-async def get_sessions(limit: int = 20):
+def get_sessions(limit: int = 20):
 
     """Session-History."""
 
@@ -7962,7 +7860,7 @@ class MemoryCreate(BaseModel):
 
 @app.post("/api/memory/working")
 
-async def add_working_memory(entry: MemoryCreate):
+def add_working_memory(entry: MemoryCreate):
 
     """Neuen Working Memory Eintrag erstellen."""
 
@@ -7992,7 +7890,7 @@ async def add_working_memory(entry: MemoryCreate):
 
 @app.post("/api/memory/lessons")
 
-async def add_lesson(entry: MemoryCreate):
+def add_lesson(entry: MemoryCreate):
 
     """Neue Lesson erstellen."""
 
@@ -8022,7 +7920,7 @@ async def add_lesson(entry: MemoryCreate):
 
 @app.get("/api/memory/facts")
 
-async def get_facts(limit: int = 50):
+def get_facts(limit: int = 50):
 
     """Memory Facts abrufen."""
 
@@ -8052,7 +7950,7 @@ async def get_facts(limit: int = 50):
 
 @app.post("/api/memory/facts")
 
-async def add_fact(entry: dict):
+def add_fact(entry: dict):
 
     """Memory Fact erstellen."""
 
@@ -8092,7 +7990,7 @@ async def add_fact(entry: dict):
 
 @app.delete("/api/memory/facts/{fact_id}")
 
-async def delete_fact(fact_id: int):
+def delete_fact(fact_id: int):
 
     """Memory Fact loeschen."""
 
@@ -8116,7 +8014,7 @@ async def delete_fact(fact_id: int):
 
 @app.delete("/api/memory/working/{entry_id}")
 
-async def delete_working_memory(entry_id: int):
+def delete_working_memory(entry_id: int):
 
     """Working Memory Eintrag deaktivieren."""
 
@@ -8138,7 +8036,7 @@ async def delete_working_memory(entry_id: int):
 
 @app.delete("/api/memory/lessons/{lesson_id}")
 
-async def delete_lesson(lesson_id: int):
+def delete_lesson(lesson_id: int):
 
     """Lesson deaktivieren."""
 
@@ -8162,7 +8060,7 @@ async def delete_lesson(lesson_id: int):
 
 @app.get("/api/memory/stats/db")
 
-async def get_memory_db_stats():
+def get_memory_db_stats():
 
     """Detaillierte DB-Statistiken fuer Memory-Tabellen."""
 
@@ -8240,7 +8138,7 @@ async def get_memory_db_stats():
 
 @app.post("/api/memory/maintenance/cleanup")
 
-async def memory_maintenance_cleanup():
+def memory_maintenance_cleanup():
 
     """System-Cleanup fuer Memory (Orphans, alte Eintraege)."""
 
@@ -8314,7 +8212,7 @@ async def memory_maintenance_cleanup():
 
 @app.get("/api/memory/sessions/{session_id}")
 
-async def get_session_detail(session_id: str):
+def get_session_detail(session_id: str):
 
     """Session-Details abrufen (entweder via ID oder session_id String)."""
 
@@ -8382,7 +8280,7 @@ TOOLS_DIR = BACH_DIR / "tools"
 
 @app.get("/tools", response_class=HTMLResponse)
 
-async def tools_page():
+def tools_page():
 
     """Tools Dashboard (Task 100)."""
 
@@ -8400,7 +8298,7 @@ async def tools_page():
 
 @app.get("/api/tools")
 
-async def get_tools(
+def get_tools(
 
     type: Optional[str] = None,
 
@@ -8664,7 +8562,7 @@ async def get_tools(
 
 @app.get("/api/tools/{tool_name}")
 
-async def get_tool_detail(tool_name: str):
+def get_tool_detail(tool_name: str):
 
     """Tool-Details abrufen."""
 
@@ -8798,7 +8696,7 @@ async def get_tool_detail(tool_name: str):
 
 @app.post("/api/tools/{tool_name}/run")
 
-async def run_tool(tool_name: str, args: Optional[List[str]] = None):
+def run_tool(tool_name: str, args: Optional[List[str]] = None):
 
     """Python-Tool ausfuehren (nur fuer Python-Tools)."""
 
@@ -8912,7 +8810,7 @@ except ImportError:
 
 @app.get("/prompt-generator", response_class=HTMLResponse)
 
-async def prompt_generator_page():
+def prompt_generator_page():
 
     """Prompt-Generator Dashboard (PROMPT_GEN_001)."""
 
@@ -8930,7 +8828,7 @@ async def prompt_generator_page():
 
 @app.get("/api/prompt-generator/templates")
 
-async def get_prompt_templates():
+def get_prompt_templates():
 
     """Listet alle verfuegbaren Templates (PROMPT_GEN_002)."""
 
@@ -8958,7 +8856,7 @@ async def get_prompt_templates():
 
 @app.get("/api/prompt-generator/template/{template_path:path}")
 
-async def get_prompt_template(template_path: str):
+def get_prompt_template(template_path: str):
 
     """Laedt ein einzelnes Template (PROMPT_GEN_003)."""
 
@@ -9010,7 +8908,7 @@ class PromptSendRequest(BaseModel):
 
 @app.post("/api/prompt-generator/send/task")
 
-async def send_prompt_as_task(req: PromptSendRequest):
+def send_prompt_as_task(req: PromptSendRequest):
 
     """Erstellt Task aus Prompt (PROMPT_GEN_004)."""
 
@@ -9038,7 +8936,7 @@ async def send_prompt_as_task(req: PromptSendRequest):
 
 @app.post("/api/prompt-generator/send/session")
 
-async def send_prompt_direct_session(req: PromptSendRequest):
+def send_prompt_direct_session(req: PromptSendRequest):
 
     """Startet direkte Claude-Session (PROMPT_GEN_004).
 
@@ -9157,7 +9055,7 @@ bach --shutdown "Zusammenfassung der erledigten Arbeit"
 
 @app.post("/api/prompt-generator/send/copy")
 
-async def copy_prompt_to_clipboard(req: PromptSendRequest):
+def copy_prompt_to_clipboard(req: PromptSendRequest):
 
     """Kopiert Prompt in Zwischenablage (PROMPT_GEN_004)."""
 
@@ -9185,7 +9083,7 @@ async def copy_prompt_to_clipboard(req: PromptSendRequest):
 
 @app.get("/api/prompt-generator/daemon/status")
 
-async def get_prompt_daemon_status():
+def get_prompt_daemon_status():
 
     """Daemon-Status fuer Prompt-Generator (PROMPT_GEN_005)."""
 
@@ -9273,7 +9171,7 @@ class DaemonConfigRequest(BaseModel):
 
 @app.put("/api/prompt-generator/daemon/config")
 
-async def update_prompt_daemon_config(req: DaemonConfigRequest):
+def update_prompt_daemon_config(req: DaemonConfigRequest):
 
     """Aktualisiert Daemon-Konfiguration (PROMPT_GEN_005)."""
 
@@ -9330,7 +9228,7 @@ async def update_prompt_daemon_config(req: DaemonConfigRequest):
 
 
 @app.post("/api/prompt-generator/start-desktop")
-async def start_prompt_manager_desktop():
+def start_prompt_manager_desktop():
     """Startet den PyQt6 Prompt-Manager als Desktop-App (v2.0)."""
     try:
         import subprocess
@@ -9381,7 +9279,7 @@ async def start_prompt_manager_desktop():
 
 @app.post("/api/prompt-generator/daemon/toggle")
 
-async def toggle_prompt_daemon():
+def toggle_prompt_daemon():
 
     """Startet/Stoppt Prompt-Generator Daemon (PROMPT_GEN_005)."""
 
@@ -9550,11 +9448,10 @@ async def toggle_prompt_daemon():
 
 
 @app.post("/api/auto-sessions/launch")
-async def launch_auto_session(request: Request):
+def launch_auto_session(data: dict = Body(...)):
     """Startet eine vordefinierte Claude Code Auto-Session."""
     import subprocess
     try:
-        data = await request.json()
         session_id = data.get("session_id", "")
         start_dir = Path(__file__).parent.parent.parent / "start"
         bat_file = start_dir / f"{session_id}.bat"
@@ -9591,7 +9488,7 @@ class TemplateSaveRequest(BaseModel):
 
 @app.post("/api/prompt-generator/templates/save")
 
-async def save_prompt_template(req: TemplateSaveRequest):
+def save_prompt_template(req: TemplateSaveRequest):
 
     """Speichert eigene Vorlage (PROMPT_GEN_007)."""
 
@@ -9647,7 +9544,7 @@ async def save_prompt_template(req: TemplateSaveRequest):
 
 @app.get("/api/session/activities")
 
-async def get_session_activities():
+def get_session_activities():
 
     """ASM_001: Laedt Aktivitaeten der aktuellen Session."""
 
@@ -9759,7 +9656,7 @@ async def get_session_activities():
 
 @app.post("/api/session/generate-summary")
 
-async def generate_session_summary():
+def generate_session_summary():
 
     """ASM_002: Generiert automatische Session-Zusammenfassung."""
 
@@ -9833,7 +9730,7 @@ async def generate_session_summary():
 
 @app.post("/api/session/end")
 
-async def end_session():
+def end_session():
 
     """ASM_001: Beendet die aktuelle Session."""
 
@@ -9883,13 +9780,12 @@ async def end_session():
 
 @app.post("/api/memory/sessions")
 
-async def add_session_memory(request: Request):
+def add_session_memory(data: dict = Body(...)):
 
     """Speichert Session-Memory Eintrag."""
 
     try:
 
-        data = await request.json()
 
         content = data.get("content", "")
 
@@ -10075,7 +9971,7 @@ def save_false_positives(data: dict):
 
 @app.get("/api/financial/profiles")
 
-async def get_mail_profiles():
+def get_mail_profiles():
 
     """MAIL_001: Alle Mail-Profile laden."""
 
@@ -10161,7 +10057,7 @@ async def get_mail_profiles():
 
 @app.post("/api/financial/profiles")
 
-async def create_mail_profile(profile: MailProfileCreate):
+def create_mail_profile(profile: MailProfileCreate):
 
     """MAIL_001: Neues benutzerdefiniertes Profil erstellen."""
 
@@ -10235,7 +10131,7 @@ async def create_mail_profile(profile: MailProfileCreate):
 
 @app.put("/api/financial/profiles/{profile_id}")
 
-async def update_mail_profile(profile_id: str, profile: MailProfileCreate):
+def update_mail_profile(profile_id: str, profile: MailProfileCreate):
 
     """MAIL_001: Benutzerdefiniertes Profil aktualisieren."""
 
@@ -10301,7 +10197,7 @@ async def update_mail_profile(profile_id: str, profile: MailProfileCreate):
 
 @app.delete("/api/financial/profiles/{profile_id}")
 
-async def delete_mail_profile(profile_id: str):
+def delete_mail_profile(profile_id: str):
 
     """MAIL_001: Benutzerdefiniertes Profil loeschen."""
 
@@ -10341,7 +10237,7 @@ async def delete_mail_profile(profile_id: str):
 
 @app.get("/api/financial/false-positives")
 
-async def get_false_positives():
+def get_false_positives():
 
     """MAIL_002: Alle False-Positives laden."""
 
@@ -10361,7 +10257,7 @@ async def get_false_positives():
 
 @app.post("/api/financial/false-positives")
 
-async def add_false_positive(fp: FalsePositiveCreate):
+def add_false_positive(fp: FalsePositiveCreate):
 
     """MAIL_002/003: E-Mail als False-Positive markieren."""
 
@@ -10451,7 +10347,7 @@ async def add_false_positive(fp: FalsePositiveCreate):
 
 @app.delete("/api/financial/false-positives/{message_id}")
 
-async def remove_false_positive(message_id: str):
+def remove_false_positive(message_id: str):
 
     """MAIL_002: False-Positive entfernen."""
 
@@ -10487,7 +10383,7 @@ async def remove_false_positive(message_id: str):
 
 @app.post("/api/financial/profiles/test")
 
-async def test_mail_profile(req: ProfileTestRequest):
+def test_mail_profile(req: ProfileTestRequest):
 
     """MAIL_005: Testet eine E-Mail gegen alle Profile."""
 
@@ -10495,7 +10391,7 @@ async def test_mail_profile(req: ProfileTestRequest):
 
         # Lade alle Profile (System + User)
 
-        profiles_resp = await get_mail_profiles()
+        profiles_resp = get_mail_profiles()
 
         all_profiles = profiles_resp.get('system_profiles', []) + profiles_resp.get('user_profiles', [])
 
@@ -10677,7 +10573,7 @@ async def test_mail_profile(req: ProfileTestRequest):
 
 @app.post("/api/financial/profiles/import")
 
-async def import_profiles_from_universal_mail():
+def import_profiles_from_universal_mail():
 
     """MAIL_004: Importiert Profile aus UniversalInvoiceMail Config."""
 
@@ -10851,7 +10747,7 @@ async def import_profiles_from_universal_mail():
 
 @app.get("/api/financial/contracts")
 
-async def get_contracts():
+def get_contracts():
 
     """FIN_002: Alle Vertraege/Abos laden."""
 
@@ -10881,7 +10777,7 @@ async def get_contracts():
 
 @app.post("/api/financial/contracts")
 
-async def add_contract(contract: ContractModel):
+def add_contract(contract: ContractModel):
 
     """FIN_002: Neuen Vertrag/Abo anlegen."""
 
@@ -10915,7 +10811,7 @@ async def add_contract(contract: ContractModel):
 
 @app.put("/api/financial/contracts/{contract_id}")
 
-async def update_contract(contract_id: int, contract: ContractModel):
+def update_contract(contract_id: int, contract: ContractModel):
 
     """FIN_002: Vertrag/Abo aktualisieren."""
 
@@ -10947,7 +10843,7 @@ async def update_contract(contract_id: int, contract: ContractModel):
 
 @app.delete("/api/financial/contracts/{contract_id}")
 
-async def delete_contract(contract_id: int):
+def delete_contract(contract_id: int):
 
     """FIN_002: Vertrag/Abo loeschen."""
 
@@ -10975,7 +10871,7 @@ async def delete_contract(contract_id: int):
 
 @app.get("/api/financial/insurances")
 
-async def get_insurances():
+def get_insurances():
 
     """FIN_002: Alle Versicherungen laden."""
 
@@ -11017,7 +10913,7 @@ async def get_insurances():
 
 @app.get("/api/financial/deadlines")
 
-async def get_financial_deadlines():
+def get_financial_deadlines():
 
     """FIN_002c: Gemeinsame Fristenliste für Versicherungen und Vertraege."""
 
@@ -11133,7 +11029,7 @@ async def get_financial_deadlines():
 
 @app.post("/api/financial/insurances")
 
-async def add_insurance(ins: InsuranceModel):
+def add_insurance(ins: InsuranceModel):
 
     """FIN_001: Neue Versicherung anlegen."""
 
@@ -11167,7 +11063,7 @@ async def add_insurance(ins: InsuranceModel):
 
 @app.put("/api/financial/insurances/{ins_id}")
 
-async def update_insurance(ins_id: int, ins: InsuranceModel):
+def update_insurance(ins_id: int, ins: InsuranceModel):
 
     """FIN_001: Versicherung aktualisieren."""
 
@@ -11199,7 +11095,7 @@ async def update_insurance(ins_id: int, ins: InsuranceModel):
 
 @app.delete("/api/financial/insurances/{ins_id}")
 
-async def delete_insurance(ins_id: int):
+def delete_insurance(ins_id: int):
 
     """FIN_001: Versicherung loeschen."""
 
@@ -11227,7 +11123,7 @@ async def delete_insurance(ins_id: int):
 # ═══════════════════════════════════════════════════════════════
 
 @app.get("/usecases", response_class=HTMLResponse)
-async def usecases_page():
+def usecases_page():
     """Usecase Verwaltung."""
     usecases_file = TEMPLATES_DIR / "usecases.html"
     if usecases_file.exists():
@@ -11236,7 +11132,7 @@ async def usecases_page():
 
 
 @app.get("/api/usecases")
-async def get_usecases():
+def get_usecases():
     """Alle Usecases laden mit Stats."""
     try:
         conn = get_user_db()
@@ -11269,7 +11165,7 @@ async def get_usecases():
 
 
 @app.get("/api/usecases/{usecase_id}")
-async def get_usecase(usecase_id: int):
+def get_usecase(usecase_id: int):
     """Einzelnen Usecase laden."""
     try:
         conn = get_user_db()
@@ -11286,10 +11182,9 @@ async def get_usecase(usecase_id: int):
 
 
 @app.post("/api/usecases")
-async def add_usecase(request: Request):
+def add_usecase(data: dict = Body(...)):
     """Neuen Usecase anlegen."""
     try:
-        data = await request.json()
         conn = get_user_db()
         cursor = conn.cursor()
         cursor.execute("""
@@ -11310,10 +11205,9 @@ async def add_usecase(request: Request):
 
 
 @app.put("/api/usecases/{usecase_id}")
-async def update_usecase(usecase_id: int, request: Request):
+def update_usecase(usecase_id: int, data: dict = Body(...)):
     """Usecase aktualisieren."""
     try:
-        data = await request.json()
         conn = get_user_db()
         cursor = conn.cursor()
         cursor.execute("""
@@ -11337,7 +11231,7 @@ async def update_usecase(usecase_id: int, request: Request):
 
 
 @app.delete("/api/usecases/{usecase_id}")
-async def delete_usecase(usecase_id: int):
+def delete_usecase(usecase_id: int):
     """Usecase loeschen."""
     try:
         conn = get_user_db()
@@ -11351,7 +11245,7 @@ async def delete_usecase(usecase_id: int):
 
 
 @app.post("/api/usecases/{usecase_id}/test")
-async def test_usecase(usecase_id: int):
+def test_usecase(usecase_id: int):
     """Usecase testen (simuliert)."""
     try:
         from datetime import datetime
@@ -11435,7 +11329,7 @@ async def test_usecase(usecase_id: int):
 
 
 @app.post("/api/usecases/test-all")
-async def test_all_usecases():
+def test_all_usecases():
     """Alle Usecases testen."""
     try:
         from datetime import datetime
@@ -11498,10 +11392,9 @@ async def test_all_usecases():
 
 
 @app.post("/api/usecases/{usecase_id}/execute")
-async def execute_usecase(usecase_id: int, request: Request):
+def execute_usecase(usecase_id: int, data: dict = Body(...)):
     """Usecase ausfuehren (simuliert)."""
     try:
-        data = await request.json()
         user_input = data.get('input', '')
 
         conn = get_user_db()
@@ -11531,7 +11424,7 @@ async def execute_usecase(usecase_id: int, request: Request):
 # ═══════════════════════════════════════════════════════════════
 
 @app.get("/kontakte", response_class=HTMLResponse)
-async def kontakte_page():
+def kontakte_page():
     """Kontakte Verwaltung."""
     kontakte_file = TEMPLATES_DIR / "kontakte.html"
     if kontakte_file.exists():
@@ -11540,7 +11433,7 @@ async def kontakte_page():
 
 
 @app.get("/api/contacts")
-async def get_contacts(category: str = None):
+def get_contacts(category: str = None):
     """Alle Kontakte laden mit Stats."""
     try:
         conn = get_user_db()
@@ -11585,7 +11478,7 @@ async def get_contacts(category: str = None):
 
 
 @app.get("/api/contacts/{contact_id}")
-async def get_contact(contact_id: int):
+def get_contact(contact_id: int):
     """Einzelnen Kontakt laden."""
     try:
         conn = get_user_db()
@@ -11602,10 +11495,9 @@ async def get_contact(contact_id: int):
 
 
 @app.post("/api/contacts")
-async def add_contact(request: Request):
+def add_contact(data: dict = Body(...)):
     """Neuen Kontakt anlegen."""
     try:
-        data = await request.json()
         conn = get_user_db()
         cursor = conn.cursor()
         cursor.execute("""
@@ -11640,10 +11532,9 @@ async def add_contact(request: Request):
 
 
 @app.put("/api/contacts/{contact_id}")
-async def update_contact(contact_id: int, request: Request):
+def update_contact(contact_id: int, data: dict = Body(...)):
     """Kontakt aktualisieren."""
     try:
-        data = await request.json()
         conn = get_user_db()
         cursor = conn.cursor()
         cursor.execute("""
@@ -11681,7 +11572,7 @@ async def update_contact(contact_id: int, request: Request):
 
 
 @app.delete("/api/contacts/{contact_id}")
-async def delete_contact(contact_id: int):
+def delete_contact(contact_id: int):
     """Kontakt loeschen (soft delete)."""
     try:
         conn = get_user_db()
@@ -11695,7 +11586,7 @@ async def delete_contact(contact_id: int):
 
 
 @app.get("/api/contacts/export")
-async def export_contacts():
+def export_contacts():
     """Kontakte als TXT exportieren."""
     try:
         from datetime import date
@@ -11750,7 +11641,7 @@ async def export_contacts():
 # ═══════════════════════════════════════════════════════════════
 
 @app.get("/routinen", response_class=HTMLResponse)
-async def routinen_page():
+def routinen_page():
     """Routinen Dashboard."""
     routinen_file = TEMPLATES_DIR / "routinen.html"
     if routinen_file.exists():
@@ -11759,7 +11650,7 @@ async def routinen_page():
 
 
 @app.get("/api/routines")
-async def get_routines(category: str = None, interval: str = None):
+def get_routines(category: str = None, interval: str = None):
     """Alle Routinen laden mit Stats."""
     try:
         from datetime import date, timedelta
@@ -11822,7 +11713,7 @@ async def get_routines(category: str = None, interval: str = None):
 
 
 @app.get("/api/routines/{routine_id}")
-async def get_routine(routine_id: int):
+def get_routine(routine_id: int):
     """Einzelne Routine laden."""
     try:
         conn = get_user_db()
@@ -11839,11 +11730,10 @@ async def get_routine(routine_id: int):
 
 
 @app.post("/api/routines")
-async def add_routine(request: Request):
+def add_routine(data: dict = Body(...)):
     """Neue Routine anlegen."""
     try:
         from datetime import date, timedelta
-        data = await request.json()
         conn = get_user_db()
         cursor = conn.cursor()
 
@@ -11874,10 +11764,9 @@ async def add_routine(request: Request):
 
 
 @app.put("/api/routines/{routine_id}")
-async def update_routine(routine_id: int, request: Request):
+def update_routine(routine_id: int, data: dict = Body(...)):
     """Routine aktualisieren."""
     try:
-        data = await request.json()
         conn = get_user_db()
         cursor = conn.cursor()
         cursor.execute("""
@@ -11905,7 +11794,7 @@ async def update_routine(routine_id: int, request: Request):
 
 
 @app.post("/api/routines/{routine_id}/complete")
-async def complete_routine(routine_id: int):
+def complete_routine(routine_id: int):
     """Routine als erledigt markieren und naechstes Datum berechnen."""
     try:
         from datetime import date, timedelta
@@ -11960,7 +11849,7 @@ async def complete_routine(routine_id: int):
 
 
 @app.delete("/api/routines/{routine_id}")
-async def delete_routine(routine_id: int):
+def delete_routine(routine_id: int):
     """Routine loeschen."""
     try:
         conn = get_user_db()
@@ -11974,7 +11863,7 @@ async def delete_routine(routine_id: int):
 
 
 @app.get("/api/routines/export")
-async def export_routines():
+def export_routines():
     """Routinen als TXT exportieren."""
     try:
         import os
@@ -12027,7 +11916,7 @@ async def export_routines():
 # ═══════════════════════════════════════════════════════════════
 
 @app.get("/api/financial/bank-accounts")
-async def get_bank_accounts():
+def get_bank_accounts():
     """Alle Bankkonten laden."""
     try:
         conn = get_user_db()
@@ -12043,10 +11932,9 @@ async def get_bank_accounts():
 
 
 @app.post("/api/financial/bank-accounts")
-async def add_bank_account(request: Request):
+def add_bank_account(data: dict = Body(...)):
     """Neues Bankkonto anlegen."""
     try:
-        data = await request.json()
         conn = get_user_db()
         cursor = conn.cursor()
         cursor.execute("""
@@ -12068,10 +11956,9 @@ async def add_bank_account(request: Request):
 
 
 @app.put("/api/financial/bank-accounts/{account_id}")
-async def update_bank_account(account_id: int, request: Request):
+def update_bank_account(account_id: int, data: dict = Body(...)):
     """Bankkonto aktualisieren."""
     try:
-        data = await request.json()
         conn = get_user_db()
         cursor = conn.cursor()
         cursor.execute("""
@@ -12096,7 +11983,7 @@ async def update_bank_account(account_id: int, request: Request):
 
 
 @app.delete("/api/financial/bank-accounts/{account_id}")
-async def delete_bank_account(account_id: int):
+def delete_bank_account(account_id: int):
     """Bankkonto loeschen."""
     try:
         conn = get_user_db()
@@ -12114,7 +12001,7 @@ async def delete_bank_account(account_id: int):
 # ═══════════════════════════════════════════════════════════════
 
 @app.get("/api/financial/credits")
-async def get_credits():
+def get_credits():
     """Alle Kredite laden."""
     try:
         conn = get_user_db()
@@ -12130,10 +12017,9 @@ async def get_credits():
 
 
 @app.post("/api/financial/credits")
-async def add_credit(request: Request):
+def add_credit(data: dict = Body(...)):
     """Neuen Kredit anlegen."""
     try:
-        data = await request.json()
         conn = get_user_db()
         cursor = conn.cursor()
         cursor.execute("""
@@ -12161,10 +12047,9 @@ async def add_credit(request: Request):
 
 
 @app.put("/api/financial/credits/{credit_id}")
-async def update_credit(credit_id: int, request: Request):
+def update_credit(credit_id: int, data: dict = Body(...)):
     """Kredit aktualisieren."""
     try:
-        data = await request.json()
         conn = get_user_db()
         cursor = conn.cursor()
         cursor.execute("""
@@ -12196,7 +12081,7 @@ async def update_credit(credit_id: int, request: Request):
 
 
 @app.delete("/api/financial/credits/{credit_id}")
-async def delete_credit(credit_id: int):
+def delete_credit(credit_id: int):
     """Kredit loeschen."""
     try:
         conn = get_user_db()
@@ -12227,7 +12112,7 @@ INBOX_CONFIG_FILE = DATA_DIR / "inbox_config.json"
 
 @app.get("/api/inbox/status")
 
-async def get_inbox_status():
+def get_inbox_status():
 
     """INBOX_001: Scanner-Status abrufen."""
 
@@ -12309,7 +12194,7 @@ async def get_inbox_status():
 
 @app.get("/api/inbox/config")
 
-async def get_inbox_config():
+def get_inbox_config():
 
     """INBOX_008c: Komplette Inbox-Konfiguration abrufen."""
 
@@ -12333,7 +12218,7 @@ async def get_inbox_config():
 
 @app.get("/api/inbox/folders")
 
-async def get_inbox_folders():
+def get_inbox_folders():
 
     """INBOX_001: Ueberwachte Ordner abrufen."""
 
@@ -12357,7 +12242,7 @@ async def get_inbox_folders():
 
 @app.post("/api/inbox/folders")
 
-async def add_inbox_folder(folder: dict):
+def add_inbox_folder(folder: dict):
 
     """INBOX_008: Ordner hinzufuegen."""
 
@@ -12403,7 +12288,7 @@ async def add_inbox_folder(folder: dict):
 
 @app.put("/api/inbox/folders")
 
-async def update_inbox_folder(folder: dict):
+def update_inbox_folder(folder: dict):
 
     """INBOX_008: Ordner bearbeiten (Pfad, Modus, Filter)."""
 
@@ -12479,7 +12364,7 @@ async def update_inbox_folder(folder: dict):
 
 @app.delete("/api/inbox/folders")
 
-async def remove_inbox_folder(path: str):
+def remove_inbox_folder(path: str):
 
     """INBOX_008: Ordner entfernen."""
 
@@ -12511,7 +12396,7 @@ async def remove_inbox_folder(path: str):
 
 @app.get("/api/inbox/rules")
 
-async def get_inbox_rules():
+def get_inbox_rules():
 
     """INBOX_005: Sortier-Regeln abrufen."""
 
@@ -12539,7 +12424,7 @@ async def get_inbox_rules():
 
 @app.post("/api/inbox/rules")
 
-async def add_inbox_rule(rule: dict):
+def add_inbox_rule(rule: dict):
 
     """INBOX_005: Regel hinzufuegen."""
 
@@ -12585,7 +12470,7 @@ async def add_inbox_rule(rule: dict):
 
 @app.put("/api/inbox/rules/{rule_id}")
 
-async def update_inbox_rule(rule_id: str, rule: dict):
+def update_inbox_rule(rule_id: str, rule: dict):
 
     """INBOX_005: Regel aktualisieren."""
 
@@ -12619,7 +12504,7 @@ async def update_inbox_rule(rule_id: str, rule: dict):
 
 @app.delete("/api/inbox/rules/{rule_id}")
 
-async def delete_inbox_rule(rule_id: str):
+def delete_inbox_rule(rule_id: str):
 
     """INBOX_005: Regel loeschen."""
 
@@ -12652,7 +12537,7 @@ async def delete_inbox_rule(rule_id: str):
 
 
 @app.get("/anonymization", response_class=HTMLResponse)
-async def serve_anonymization():
+def serve_anonymization():
     # Alias fuer Abwaertskompatibilitaet, leitet nun auf das Agenten-Dashboard um
     return FileResponse(TEMPLATES_DIR / "anonymization.html")
 
@@ -12662,7 +12547,7 @@ async def serve_anonymization():
 
 @app.post("/api/inbox/scan")
 
-async def run_inbox_scan():
+def run_inbox_scan():
 
     """INBOX_003: Einmaligen Scan ausfuehren."""
 
@@ -12702,7 +12587,7 @@ async def run_inbox_scan():
 
 @app.get("/api/inbox/unsorted")
 
-async def get_unsorted_files():
+def get_unsorted_files():
 
     """INBOX_007: Unsortierte Dateien auflisten (Review-Queue)."""
 
@@ -12750,7 +12635,7 @@ async def get_unsorted_files():
 
 @app.post("/api/inbox/sort")
 
-async def sort_inbox_file(data: dict):
+def sort_inbox_file(data: dict):
 
     """INBOX_007: Datei manuell sortieren/verschieben."""
 
@@ -12840,7 +12725,7 @@ async def sort_inbox_file(data: dict):
 
 @app.get("/api/inbox/preview/{filename}")
 
-async def get_inbox_preview(filename: str):
+def get_inbox_preview(filename: str):
 
     """INBOX_007: Vorschau fuer unsortierte Dateien."""
 
@@ -12878,7 +12763,7 @@ async def get_inbox_preview(filename: str):
 
 @app.get("/api/inbox/analyze/{filename}")
 
-async def analyze_inbox_file(filename: str):
+def analyze_inbox_file(filename: str):
 
     """INBOX_007: Datei analysieren und Vorschlag generieren."""
 
@@ -12966,7 +12851,7 @@ async def analyze_inbox_file(filename: str):
 
 @app.put("/api/inbox/settings")
 
-async def update_inbox_settings(settings: dict):
+def update_inbox_settings(settings: dict):
 
     """INBOX_008: Scanner-Einstellungen aktualisieren."""
 
@@ -13062,7 +12947,7 @@ async def websocket_endpoint(websocket: WebSocket):
 
 @app.get("/api/ws/status")
 
-async def websocket_status():
+def websocket_status():
 
     """Status der WebSocket-Verbindungen."""
 
@@ -13088,7 +12973,7 @@ async def websocket_status():
 
 @app.get("/api/anonymization/clients")
 
-async def list_anon_clients():
+def list_anon_clients():
 
     """Listet Klienten/Ordner in Quarantine."""
 
@@ -13110,7 +12995,7 @@ async def list_anon_clients():
 
 @app.post("/api/anonymization/profile")
 
-async def create_anon_profile(data: dict = Body(...)):
+def create_anon_profile(data: dict = Body(...)):
 
     """Erstellt ein Anonymisierungsprofil."""
 
@@ -13148,7 +13033,7 @@ async def create_anon_profile(data: dict = Body(...)):
 
 @app.post("/api/anonymization/upload")
 
-async def upload_anon_file(file: Request):
+def upload_anon_file(file: Request):
 
     """
 
@@ -13185,7 +13070,7 @@ def get_report_workflow_service():
 
 
 @app.post("/api/report/session/start")
-async def start_report_session():
+def start_report_session():
     """Startet eine neue Report-Workflow-Session."""
     try:
         service = get_report_workflow_service()
@@ -13200,7 +13085,7 @@ async def start_report_session():
 
 
 @app.post("/api/report/session/{session_id}/import")
-async def import_files_to_session(session_id: str, data: dict = Body(...)):
+def import_files_to_session(session_id: str, data: dict = Body(...)):
     """
     Importiert Dateien in eine Session.
 
@@ -13232,7 +13117,7 @@ async def import_files_to_session(session_id: str, data: dict = Body(...)):
 
 
 @app.post("/api/report/session/{session_id}/profile")
-async def create_session_profile(session_id: str, data: dict = Body(...)):
+def create_session_profile(session_id: str, data: dict = Body(...)):
     """
     Erstellt ein temporaeres Anonymisierungsprofil.
 
@@ -13271,7 +13156,7 @@ async def create_session_profile(session_id: str, data: dict = Body(...)):
 
 
 @app.post("/api/report/session/{session_id}/anonymize")
-async def anonymize_session_documents(session_id: str, data: dict = Body(default={})):
+def anonymize_session_documents(session_id: str, data: dict = Body(default={})):
     """
     Anonymisiert die importierten Dokumente.
 
@@ -13298,7 +13183,7 @@ async def anonymize_session_documents(session_id: str, data: dict = Body(default
 
 
 @app.post("/api/report/session/{session_id}/prompt")
-async def generate_session_prompt(session_id: str, data: dict = Body(default={})):
+def generate_session_prompt(session_id: str, data: dict = Body(default={})):
     """
     Generiert den LLM-Prompt.
 
@@ -13336,7 +13221,7 @@ async def generate_session_prompt(session_id: str, data: dict = Body(default={})
 
 
 @app.post("/api/report/session/{session_id}/generate")
-async def generate_session_report(session_id: str, data: dict = Body(...)):
+def generate_session_report(session_id: str, data: dict = Body(...)):
     """
     Generiert das Word-Dokument.
 
@@ -13369,7 +13254,7 @@ async def generate_session_report(session_id: str, data: dict = Body(...)):
 
 
 @app.post("/api/report/session/{session_id}/cleanup")
-async def cleanup_session(session_id: str, data: dict = Body(default={})):
+def cleanup_session(session_id: str, data: dict = Body(default={})):
     """
     Räumt alle temporären Session-Daten auf.
 
@@ -13390,7 +13275,7 @@ async def cleanup_session(session_id: str, data: dict = Body(default={})):
 
 
 @app.get("/api/report/session/{session_id}")
-async def get_session_status(session_id: str):
+def get_session_status(session_id: str):
     """Gibt den aktuellen Session-Status zurück."""
     try:
         service = get_report_workflow_service()
@@ -13404,7 +13289,7 @@ async def get_session_status(session_id: str):
 
 
 @app.get("/api/report/pending")
-async def list_pending_reports():
+def list_pending_reports():
     """Listet wartende Ordner für Berichte."""
     try:
         sys.path.insert(0, str(BACH_DIR))
@@ -13451,7 +13336,7 @@ def run_server(host: str = "127.0.0.1", port: int = 8000):
 # ═══════════════════════════════════════════════════════════════
 
 @app.get("/prompt-generator", response_class=HTMLResponse)
-async def prompt_generator_page():
+def prompt_generator_page():
     """Serves the Prompt Generator GUI."""
     if (TEMPLATES_DIR / "prompt-generator.html").exists():
         return FileResponse(TEMPLATES_DIR / "prompt-generator.html")
@@ -13485,7 +13370,7 @@ if __name__ == "__main__":
 
 @app.get("/api/tokens/usage")
 
-async def api_tokens_usage():
+def api_tokens_usage():
 
     """Liefert Token-Nutzung fuer das Dashboard."""
 
@@ -13621,7 +13506,7 @@ def _ensure_workflow_tuev_table():
     conn.close()
 
 @app.get("/workflow-tuev", response_class=HTMLResponse)
-async def workflow_tuev_page():
+def workflow_tuev_page():
     """Workflow TÜV Dashboard."""
     workflow_tuev_file = TEMPLATES_DIR / "workflow_tuev.html"
     if workflow_tuev_file.exists():
@@ -13630,7 +13515,7 @@ async def workflow_tuev_page():
 
 
 @app.get("/api/workflow-tuev")
-async def get_workflow_tuev():
+def get_workflow_tuev():
     """Alle Workflows mit TÜV-Status laden."""
     try:
         _ensure_workflow_tuev_table()
@@ -13681,11 +13566,10 @@ async def get_workflow_tuev():
 
 
 @app.post("/api/workflow-tuev/{workflow_id}/check")
-async def check_workflow_tuev(workflow_id: int, request: Request):
+def check_workflow_tuev(workflow_id: int, data: dict = Body(...)):
     """TÜV für einen Workflow durchführen."""
     try:
         _ensure_workflow_tuev_table()
-        data = await request.json()
         result = data.get("result", "pass")
         validity_days = data.get("validity_days", 90)
         notes = data.get("notes", "")
@@ -13737,7 +13621,7 @@ async def check_workflow_tuev(workflow_id: int, request: Request):
 
 
 @app.post("/api/workflow-tuev/check-all")
-async def check_all_workflows():
+def check_all_workflows():
     """Alle Workflows als geprüft markieren (90 Tage Gültigkeit)."""
     try:
         _ensure_workflow_tuev_table()
@@ -13768,7 +13652,7 @@ async def check_all_workflows():
 
 
 @app.post("/api/workflow-tuev/sync")
-async def sync_workflow_tuev():
+def sync_workflow_tuev():
     """Workflow-TÜV Tabelle mit Dateisystem synchronisieren."""
     _ensure_workflow_tuev_table()
     try:
@@ -13803,7 +13687,7 @@ async def sync_workflow_tuev():
 
 
 @app.get("/api/workflow-tuev/content")
-async def get_workflow_content(path: str):
+def get_workflow_content(path: str):
     """Workflow-Inhalt anzeigen."""
     try:
         if ".." in path or path.startswith("/"):
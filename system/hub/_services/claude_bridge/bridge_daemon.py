@@ -58,6 +58,12 @@ New in v2.3:
 - Bearer-Token Auth, konfigurierbare CORS-Origins
 - Deployment via SSH-Tunnel + systemd auf Hetzner
 
+New in v2.4:
+- EVENT INTAKE: Connector-Poller im eigenen Thread (Telegram Long-Polling)
+  weckt die Hauptschleife; andere Prozesse wecken per UDP (message_intake.py)
+- Adaptives Batching: Flush nach Ruhepause oder max. Batchgroesse statt festem Sleep
+- Statusaenderungen (verarbeitet / zu alt) als ein UPDATE pro Batch
+
 Architektur: Persistent Chat + Sandboxed Workers + Async Main Loop
 - Chat-Claude: EINE Session pro Tag, --continue fuer Kontext-Erhalt
 - Worker-Claude: Laeuft autonom, DARF bridge_daemon.py NICHT editieren
@@ -93,6 +99,7 @@ from pathlib import Path
 from threading import Event, Thread, Lock
 
 from fackel import acquire_fackel, heartbeat, release_fackel, get_fackel_holder, check_fackel_mine
+from message_intake import MessageIntake, notify_bridge
 
 FACKEL_LOST_EXIT_CODE = 2  # Exit-Code wenn Fackel durch anderen PC uebernommen wurde
 
@@ -501,12 +508,12 @@ def db_execute(query, params=(), fetch=False, fetchone=False):
 
 # ============ MULTI-CONNECTOR POLLING ============
 
-def run_connector_poll():
+def run_connector_poll(long_poll_timeout: int = 1):
     """Pollt alle aktiven Connectors (Telegram, WhatsApp, Signal, Discord)."""
     total_new = 0
 
     # Telegram
-    total_new += run_telegram_poll()
+    total_new += run_telegram_poll(long_poll_timeout)
 
     # WhatsApp (wenn konfiguriert)
     # total_new += run_whatsapp_poll()
@@ -577,8 +584,12 @@ def _load_bot_token_from_file() -> str:
     return ""
 
 
-def run_telegram_poll():
-    """Pollt neue Nachrichten direkt von Telegram API in die DB."""
+def run_telegram_poll(long_poll_timeout: int = 1):
+    """Pollt neue Nachrichten direkt von Telegram API in die DB.
+
+    long_poll_timeout: Sekunden, die Telegram auf neue Updates wartet
+    (Long-Polling, antwortet sofort bei Eingang einer Nachricht).
+    """
     try:
         conn = db_connect()
         row = conn.execute(
@@ -596,8 +607,9 @@ def run_telegram_poll():
             return 0
 
         import urllib.request
-        url = f"https://api.telegram.org/bot{token}/getUpdates?offset={last_update_id + 1}&timeout=1&limit=10"
-        resp = urllib.request.urlopen(url, timeout=5)
+        url = (f"https://api.telegram.org/bot{token}/getUpdates"
+               f"?offset={last_update_id + 1}&timeout={long_poll_timeout}&limit=10")
+        resp = urllib.request.urlopen(url, timeout=long_poll_timeout + 10)
         data = json.loads(resp.read())
 
         if not data.get("ok") or not data.get("result"):
@@ -1452,6 +1464,9 @@ class BridgeDaemon:
         self.work_mode = state.get("work_mode",
                                    self.config.get("work_modes", {}).get("default", "assistant"))
 
+        # Ereignisgesteuerte Nachrichtenaufnahme (Weckruf statt festem Poll-Intervall)
+        self.intake = MessageIntake.from_config(db_connect, self.config, MAX_MESSAGE_AGE, log=log)
+
     def _save_state(self):
         """Speichert aktuellen State persistent."""
         save_state({
@@ -1471,63 +1486,35 @@ class BridgeDaemon:
 
     # ---------- POLLING ----------
 
-    def poll_new_messages(self) -> list:
-        """Pollt neue Nachrichten mit Alters-Limit und Batch-Fenster."""
-        connector = self.config.get("connector_name", "telegram_main")
-        batch_wait = self.config.get("chat", {}).get("message_batch_wait_seconds", 3)
-        max_age = MAX_MESSAGE_AGE
-
-        # Berechne Cutoff-Zeitpunkt
-        cutoff = (datetime.now() - timedelta(seconds=max_age)).isoformat()
-
-        rows = db_execute(
-            "SELECT id, sender, content, created_at FROM connector_messages "
-            "WHERE direction = 'in' AND connector_name = ? "
-            "AND bridge_processed = 0 AND created_at >= ? "
-            "ORDER BY created_at ASC",
-            (connector, cutoff), fetch=True
-        )
+    def poll_new_messages(self, timeout: float = 0) -> list:
+        """Wartet bis zu timeout Sekunden auf neue Nachrichten und liefert einen Batch.
 
-        # Alte unverarbeitete Nachrichten als verarbeitet markieren (aufraemen)
-        old_rows = db_execute(
-            "SELECT id FROM connector_messages "
-            "WHERE direction = 'in' AND connector_name = ? "
-            "AND bridge_processed = 0 AND created_at < ?",
-            (connector, cutoff), fetch=True
-        )
-        if old_rows:
-            old_count = len(old_rows)
-            for r in old_rows:
-                db_execute(
-                    "UPDATE connector_messages SET bridge_processed = 1 WHERE id = ?",
-                    (r["id"],)
-                )
-            log(f"CLEANUP: {old_count} alte Nachricht(en) uebersprungen (aelter als {max_age}s)")
-
-        if not rows:
-            return []
-
-        # Kurz warten fuer Batching
-        time.sleep(batch_wait)
-
-        # Nochmal lesen (vielleicht kamen mehr)
-        rows = db_execute(
-            "SELECT id, sender, content, created_at FROM connector_messages "
-            "WHERE direction = 'in' AND connector_name = ? "
-            "AND bridge_processed = 0 AND created_at >= ? "
-            "ORDER BY created_at ASC",
-            (connector, cutoff), fetch=True
-        )
-
-        return [dict(r) for r in rows] if rows else []
+        Gesammelt wird bis zur Ruhepause (chat.batch_idle_gap_seconds), bis
+        chat.batch_max_messages erreicht ist oder spaetestens
+        chat.message_batch_wait_seconds nach der ersten Nachricht.
+        """
+        return self.intake.next_batch(timeout)
 
     def mark_processed(self, msg_ids: list):
-        """Markiert Nachrichten als verarbeitet."""
-        for mid in msg_ids:
-            db_execute(
-                "UPDATE connector_messages SET bridge_processed = 1 WHERE id = ?",
-                (mid,)
-            )
+        """Markiert Nachrichten als verarbeitet (ein UPDATE)."""
+        self.intake.mark_processed(msg_ids)
+
+    def _connector_poll_loop(self):
+        """Connector-Poller im eigenen Thread: Long-Polling, weckt die Hauptschleife."""
+        long_poll = self.config.get("long_poll_seconds", 25)
+        retry_interval = self.config.get("poll_interval_seconds", 5)
+        while not self.stop_event.is_set():
+            started = time.monotonic()
+            try:
+                stored = run_connector_poll(long_poll)
+            except Exception as e:
+                log(f"Connector-Poller Fehler: {e}", "ERROR")
+                stored = 0
+            if stored:
+                self.intake.notify()
+            elif time.monotonic() - started < 1:
+                # Sofort zurueck ohne Nachrichten (kein Token, Fehler): nicht im Kreis pollen
+                self.stop_event.wait(retry_interval)
 
     # ---------- CODEWORT ----------
 
@@ -2674,7 +2661,15 @@ class BridgeDaemon:
         # Orphaned Workers aufraumen
         self.cleanup_orphaned_workers()
 
-        poll_interval = self.config.get("poll_interval_seconds", 5)
+        # Wartezeit der Hauptschleife ohne Nachrichten (Timeout-/Tray-Pruefungen)
+        housekeeping_interval = self.config.get("poll_interval_seconds", 5)
+
+        # Weckruf fuer Schreiber aus anderen Prozessen (--test, Server-API) und Connector-Poller
+        wakeup_port = self.intake.signal.start_listener()
+        if wakeup_port:
+            log(f"Intake-Weckruf auf 127.0.0.1:{wakeup_port}", "INFO")
+        poller_thread = Thread(target=self._connector_poll_loop, daemon=True, name="ConnectorPollThread")
+        poller_thread.start()
 
         # Tray-Kopplung: Merke ob Tray beim Start aktiv war
         _tray_was_present = TRAY_LOCK_FILE.exists()
@@ -2683,7 +2678,7 @@ class BridgeDaemon:
         else:
             log("Kein Tray-Lock gefunden - CLI-Modus (laeuft unabhaengig)", "INFO")
 
-        _tray_check_counter = 0
+        _tray_checked_at = time.monotonic()
 
         log("Hauptschleife startet...")
         try:
@@ -2693,9 +2688,8 @@ class BridgeDaemon:
                     self.check_full_mode_timeout()
 
                     # Tray-Kopplung: Alle 30s pruefen ob Tray noch lebt
-                    _tray_check_counter += 1
-                    if _tray_was_present and _tray_check_counter >= 6:
-                        _tray_check_counter = 0
+                    if _tray_was_present and time.monotonic() - _tray_checked_at >= 30:
+                        _tray_checked_at = time.monotonic()
                         if not self._check_tray_alive():
                             send_telegram(
                                 "Bridge Daemon beendet sich - Tray wurde geschlossen.",
@@ -2704,11 +2698,9 @@ class BridgeDaemon:
                             self.stop_event.set()
                             break
 
-                    # 0. Multi-Connector Poll (Telegram, WhatsApp, Signal, Discord)
-                    run_connector_poll()
-
-                    # 1. Neue Nachrichten aus DB (mit Alters-Limit)
-                    new_messages = self.poll_new_messages()
+                    # 0./1. Connector-Poller laeuft im eigenen Thread; hier auf
+                    # Weckruf warten und neue Nachrichten aus DB holen (mit Alters-Limit)
+                    new_messages = self.poll_new_messages(housekeeping_interval)
 
                     if new_messages:
                         # 2. Codewort-Check (vor Claude)
@@ -2752,9 +2744,11 @@ class BridgeDaemon:
 
                 except Exception as e:
                     log(f"Fehler im Hauptloop: {e}", "ERROR")
-
-                self.stop_event.wait(poll_interval)
+                    self.stop_event.wait(housekeeping_interval)
         finally:
+            self.intake.signal.stop_listener()
+            self.intake.close()
+
             # Chat-Thread abwarten falls noch aktiv
             if self._chat_thread and self._chat_thread.is_alive():
                 log("SHUTDOWN: Warte auf Chat-Thread (max 30s)...")
@@ -2868,7 +2862,10 @@ def test_message(text: str):
         (connector, chat_id, text, datetime.now().isoformat())
     )
     print(f"Test-Nachricht eingefuegt: '{text}'")
-    print("Der Bridge-Daemon wird sie beim naechsten Poll verarbeiten.")
+    if notify_bridge():
+        print("Bridge-Daemon geweckt.")
+    else:
+        print("Der Bridge-Daemon wird sie beim naechsten Start verarbeiten.")
 
 
 # ============ SERVER MODE ============
@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# SPDX-License-Identifier: MIT
+"""
+Copyright (c) 2026 BACH Contributors
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+"""
+Message Intake - Ereignisgesteuerte Nachrichtenaufnahme fuer den Bridge-Daemon
+===============================================================================
+Ersetzt das feste Poll-Intervall + sleep(message_batch_wait_seconds).
+
+- IntakeSignal:  Weckruf fuer die Hauptschleife. In-Process per Event
+                 (Connector-Poller-Thread), prozessuebergreifend per
+                 UDP-Datagramm an 127.0.0.1 (Port in WAKEUP_PORT_FILE).
+- MessageIntake: Liest nur nach einem Weckruf aus connector_messages und
+                 sammelt adaptiv: Flush nach Ruhepause (idle_gap) oder bei
+                 max_batch Nachrichten, spaetestens nach max_wait.
+- mark_processed / skip_stale: je ein UPDATE fuer alle betroffenen Zeilen.
+
+Als Sicherheitsnetz fuer Schreiber ohne Weckruf prueft die Intake
+PRAGMA data_version (liest nur den DB-Header, keine Tabellenseiten).
+
+Usage (Schreiber in anderem Prozess):
+    from message_intake import notify_bridge
+    notify_bridge()
+"""
+
+import socket
+import sqlite3
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable, Iterable, List, Optional
+
+WAKEUP_PORT_FILE = Path(tempfile.gettempdir()) / "bach_bridge_wakeup.port"
+
+DEFAULT_IDLE_GAP = 0.4         # Sekunden Ruhe bis zum Flush
+DEFAULT_MAX_BATCH = 20         # Nachrichten pro Batch
+DEFAULT_MAX_WAIT = 3.0         # Obergrenze fuers Sammeln (frueher fester Sleep)
+DEFAULT_FALLBACK_CHECK = 2.0   # Sekunden zwischen data_version-Pruefungen
+
+_IN_CHUNK = 500
+
+
+def mark_processed(conn: sqlite3.Connection, msg_ids: Iterable[int]) -> int:
+    """Setzt bridge_processed = 1 fuer alle IDs. Gibt Anzahl geaenderter Zeilen zurueck."""
+    ids = list(msg_ids)
+    changed = 0
+    for i in range(0, len(ids), _IN_CHUNK):
+        chunk = ids[i:i + _IN_CHUNK]
+        cur = conn.execute(
+            f"UPDATE connector_messages SET bridge_processed = 1 "
+            f"WHERE id IN ({','.join('?' * len(chunk))}) AND bridge_processed = 0",
+            chunk,
+        )
+        changed += cur.rowcount
+    conn.commit()
+    return changed
+
+
+def skip_stale(conn: sqlite3.Connection, connector: str, cutoff: str) -> int:
+    """Markiert unverarbeitete Nachrichten vor cutoff als verarbeitet (ein UPDATE)."""
+    cur = conn.execute(
+        "UPDATE connector_messages SET bridge_processed = 1 "
+        "WHERE direction = 'in' AND connector_name = ? "
+        "AND bridge_processed = 0 AND created_at < ?",
+        (connector, cutoff),
+    )
+    conn.commit()
+    return cur.rowcount
+
+
+def notify_bridge() -> bool:
+    """Weckt einen laufenden Bridge-Daemon (auch aus anderem Prozess). False wenn keiner lauscht."""
+    try:
+        port = int(WAKEUP_PORT_FILE.read_text().strip())
+    except (OSError, ValueError):
+        return False
+    try:
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as s:
+            s.sendto(b"1", ("127.0.0.1", port))
+        return True
+    except OSError:
+        return False
+
+
+class IntakeSignal:
+    """Weckruf fuer die Hauptschleife (Event + optionaler UDP-Listener)."""
+
+    def __init__(self):
+        self._event = threading.Event()
+        self._sock: Optional[socket.socket] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def notify(self):
+        self._event.set()
+
+    def wait(self, timeout: Optional[float]) -> bool:
+        """Wartet auf einen Weckruf. True wenn geweckt (Signal wird zurueckgesetzt)."""
+        woke = self._event.wait(timeout)
+        if woke:
+            self._event.clear()
+        return woke
+
+    def start_listener(self, port_file: Path = WAKEUP_PORT_FILE) -> Optional[int]:
+        """Bindet einen UDP-Socket an 127.0.0.1 und schreibt den Port nach port_file."""
+        try:
+            sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            sock.bind(("127.0.0.1", 0))
+        except OSError:
+            return None
+        self._sock = sock
+        port = sock.getsockname()[1]
+        try:
+            port_file.write_text(str(port))
+        except OSError:
+            pass
+        self._thread = threading.Thread(target=self._listen, daemon=True, name="BridgeWakeup")
+        self._thread.start()
+        return port
+
+    def _listen(self):
+        sock = self._sock
+        while sock is not None:
+            try:
+                sock.recv(64)
+            except OSError:
+                return  # Socket geschlossen
+            self._event.set()
+
+    def stop_listener(self, port_file: Path = WAKEUP_PORT_FILE):
+        sock, self._sock = self._sock, None
+        if sock is not None:
+            try:
+                port_file.unlink()
+            except OSError:
+                pass
+            sock.close()
+
+
+class MessageIntake:
+    """Adaptives Batching neuer Eingangsnachrichten eines Connectors.
+
+    Args:
+        connect: Callable, das eine sqlite3-Verbindung (row_factory=Row) liefert
+        connector: connector_name in connector_messages
+        max_age: Aeltere unverarbeitete Nachrichten werden uebersprungen (Sekunden)
+        idle_gap / max_batch / max_wait: Flush-Kriterien
+        fallback_check: Intervall der data_version-Pruefung (0 = aus)
+    """
+
+    def __init__(self, connect: Callable[[], sqlite3.Connection], connector: str,
+                 max_age: int = 300, idle_gap: float = DEFAULT_IDLE_GAP,
+                 max_batch: int = DEFAULT_MAX_BATCH, max_wait: float = DEFAULT_MAX_WAIT,
+                 fallback_check: float = DEFAULT_FALLBACK_CHECK,
+                 signal: Optional[IntakeSignal] = None, log: Callable = None):
+        self.connect = connect
+        self.connector = connector
+        self.max_age = max_age
+        self.idle_gap = idle_gap
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.fallback_check = fallback_check
+        self.signal = signal or IntakeSignal()
+        self._log = log or (lambda msg, level="INFO": None)
+        self._watch_conn: Optional[sqlite3.Connection] = None
+        self._data_version = None
+        self._pending_check = True  # Beim Start einmal nachsehen
+
+    @classmethod
+    def from_config(cls, connect, config: dict, max_age: int, log: Callable = None) -> "MessageIntake":
+        chat = config.get("chat", {})
+        return cls(
+            connect,
+            config.get("connector_name", "telegram_main"),
+            max_age=max_age,
+            idle_gap=chat.get("batch_idle_gap_seconds", DEFAULT_IDLE_GAP),
+            max_batch=chat.get("batch_max_messages", DEFAULT_MAX_BATCH),
+            max_wait=chat.get("message_batch_wait_seconds", DEFAULT_MAX_WAIT),
+            fallback_check=chat.get("intake_fallback_check_seconds", DEFAULT_FALLBACK_CHECK),
+            log=log,
+        )
+
+    def notify(self):
+        """Von Poller/Schreibern im selben Prozess aufrufen."""
+        self.signal.notify()
+
+    # ---------- intern ----------
+
+    def _db_changed(self) -> bool:
+        """True wenn ein anderer Prozess seit der letzten Pruefung geschrieben hat."""
+        try:
+            if self._watch_conn is None:
+                self._watch_conn = self.connect()
+            version = self._watch_conn.execute("PRAGMA data_version").fetchone()[0]
+        except sqlite3.Error:
+            self._watch_conn = None
+            return True
+        changed = self._data_version is not None and version != self._data_version
+        self._data_version = version
+        return changed
+
+    def _wait(self, timeout: float) -> bool:
+        """Wartet auf Weckruf; zwischendurch data_version als Fallback."""
+        if self._pending_check:
+            self._pending_check = False
+            return True
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            step = min(remaining, self.fallback_check) if self.fallback_check > 0 else remaining
+            if self.signal.wait(step):
+                return True
+            if self.fallback_check > 0 and self._db_changed():
+                return True
+
+    def _fetch(self, after_id: int) -> List[dict]:
+        cutoff = (datetime.now() - timedelta(seconds=self.max_age)).isoformat()
+        conn = self.connect()
+        try:
+            skipped = skip_stale(conn, self.connector, cutoff)
+            rows = conn.execute(
+                "SELECT id, sender, content, created_at FROM connector_messages "
+                "WHERE direction = 'in' AND connector_name = ? "
+                "AND bridge_processed = 0 AND created_at >= ? AND id > ? "
+                "ORDER BY created_at ASC, id ASC",
+                (self.connector, cutoff, after_id),
+            ).fetchall()
+        finally:
+            conn.close()
+        if skipped:
+            self._log(f"CLEANUP: {skipped} alte Nachricht(en) uebersprungen (aelter als {self.max_age}s)")
+        return [dict(r) for r in rows]
+
+    # ---------- API ----------
+
+    def next_batch(self, timeout: float) -> List[dict]:
+        """Naechster Nachrichten-Batch oder [] nach timeout ohne neue Nachrichten."""
+        if not self._wait(timeout):
+            return []
+        batch = self._fetch(0)
+        if not batch:
+            return []
+
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or not self.signal.wait(min(self.idle_gap, remaining)):
+                break  # Ruhepause erreicht oder max_wait ausgeschoepft
+            batch.extend(self._fetch(max(m["id"] for m in batch)))
+        return batch
+
+    def mark_processed(self, msg_ids: Iterable[int]) -> int:
+        ids = list(msg_ids)
+        if not ids:
+            return 0
+        conn = self.connect()
+        try:
+            return mark_processed(conn, ids)
+        finally:
+            conn.close()
+
+    def close(self):
+        if self._watch_conn is not None:
+            try:
+                self._watch_conn.close()
+            except sqlite3.Error:
+                pass
+            self._watch_conn = None
@@ -134,6 +134,7 @@ def create_app(config: dict) -> "FastAPI":
                 "VALUES (?, 'in', ?, '', ?, 'pending', 0, ?)",
                 (connector, chat_id, req.text, datetime.now().isoformat())
             )
+            bd.notify_bridge()
             return MessageResponse(ok=True, message="Message queued for processing")
         except Exception as e:
             raise HTTPException(status_code=500, detail=str(e))
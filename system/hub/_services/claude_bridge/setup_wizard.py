@@ -130,6 +130,7 @@ def run_wizard(base_path: Path = None):
     config = {
         "enabled": True,
         "poll_interval_seconds": 5,
+        "long_poll_seconds": 25,
         "connector_name": "telegram_main",
         "chat_id": "",
         "claude_cli": {"path": "", "cwd": "", "model": "sonnet"},
@@ -138,7 +139,8 @@ def run_wizard(base_path: Path = None):
             "full_access_timeout_seconds": 3600,
             "restricted_allowed_tools": "Read,Write,Edit,Glob,Grep,Bash,WebFetch,WebSearch,Task,NotebookEdit,Skill"
         },
-        "chat": {"timeout_seconds": 300, "message_batch_wait_seconds": 3, "history_count": 15, "max_turns": 3},
+        "chat": {"timeout_seconds": 300, "message_batch_wait_seconds": 3, "batch_idle_gap_seconds": 0.4,
+                 "batch_max_messages": 20, "history_count": 15, "max_turns": 3},
         "worker": {"timeout_seconds": 1800, "max_concurrent": 2, "model": "sonnet"},
         "budget": {"daily_limit_usd": 5.0, "warn_at_percent": 80, "chat_cost_estimate": 0.03, "worker_minute_cost": 0.05},
         "quiet_hours": {"enabled": False, "start": "23:00", "end": "07:00"},
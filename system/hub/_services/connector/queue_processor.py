@@ -365,6 +365,14 @@ def route_incoming() -> Dict[str, Any]:
         except ImportError:
             logger.debug("ContextInjector nicht verfuegbar")
 
+        # context_triggers einmal pro Batch kompilieren (geteilter Aho-Corasick-Matcher)
+        trigger_matcher = None
+        try:
+            from tools.trigger_matcher import get_trigger_matcher
+            trigger_matcher = get_trigger_matcher(DB_PATH, conn)
+        except Exception:
+            pass  # Tabelle existiert evtl. nicht
+
         now = _now_iso()
 
         for row in rows:
@@ -392,18 +400,10 @@ def route_incoming() -> Dict[str, Any]:
                     pass
 
             # b) context_triggers Tabelle (900+ dynamische Trigger)
-            try:
-                content_lower = content.lower()
-                triggers = conn.execute("""
-                    SELECT trigger_phrase, hint_text FROM context_triggers
-                    WHERE is_active = 1
-                """).fetchall()
-                matched = [t['trigger_phrase'] for t in triggers
-                           if t['trigger_phrase'] in content_lower]
+            if trigger_matcher is not None:
+                matched = [t['trigger_phrase'] for t in trigger_matcher.match(content.lower())]
                 if matched:
                     metadata["context_triggers"] = matched
-            except Exception:
-                pass  # Tabelle existiert evtl. nicht
 
             try:
                 # Duplikat-Check: gleicher Sender+Body bereits in messages?
@@ -48,11 +48,19 @@ import os
 import re
 import secrets
 import string
+from collections import Counter
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
+try:
+    from .anonymization_engine import ReplacementEngine
+    from .extraction_service import SUPPORTED_SUFFIXES, get_extraction_service
+except ImportError:
+    from anonymization_engine import ReplacementEngine
+    from extraction_service import SUPPORTED_SUFFIXES, get_extraction_service
+
 # AES-Verschluesselung
 try:
     from cryptography.fernet import Fernet
@@ -121,6 +129,7 @@ class AnonymResult:
     skipped_files: int = 0
     errors: List[str] = field(default_factory=list)
     replacements_total: int = 0
+    replacements_by_category: Dict[str, int] = field(default_factory=dict)
 
 
 @dataclass
@@ -752,47 +761,16 @@ class DocumentAnonymizer:
             filepath: Pfad zur Datei
 
         Returns:
-            Extrahierter Text
+            Extrahierter Text ("" bei Fehler oder nicht unterstuetztem Format)
         """
         path = Path(filepath)
-        suffix = path.suffix.lower()
-        text = ""
-
-        try:
-            if suffix == ".docx" and DOCX_AVAILABLE:
-                doc = Document(str(path))
-                paragraphs = [p.text for p in doc.paragraphs]
-                # Auch Tabellen
-                for table in doc.tables:
-                    for row in table.rows:
-                        for cell in row.cells:
-                            paragraphs.append(cell.text)
-                text = "\n".join(paragraphs)
-
-            elif suffix in (".txt", ".md"):
-                try:
-                    text = path.read_text(encoding="utf-8")
-                except UnicodeDecodeError:
-                    text = path.read_text(encoding="latin-1")
-
-            elif suffix == ".pdf" and FITZ_AVAILABLE:
-                doc = fitz.open(str(path))
-                for page in doc:
-                    text += page.get_text()
-                doc.close()
-
-            elif suffix in (".xlsx", ".xls") and EXCEL_AVAILABLE:
-                wb = openpyxl.load_workbook(str(path), data_only=True)
-                for sheet in wb.worksheets:
-                    for row in sheet.iter_rows():
-                        for cell in row:
-                            if cell.value:
-                                text += str(cell.value) + " "
-                wb.close()
-        except Exception as e:
-            print(f"[WARN] Text-Extraktion fehlgeschlagen fuer {path.name}: {e}")
-
-        return text
+        if path.suffix.lower() not in SUPPORTED_SUFFIXES:
+            return ""
+        result = get_extraction_service().extract_result(path)
+        if not result.ok:
+            print(f"[WARN] Text-Extraktion fehlgeschlagen fuer {path.name}: {result.error}")
+            return ""
+        return result.text
 
     def scan_folder_for_sensitive_data(self, folder: str) -> Dict[str, List[str]]:
         """
@@ -825,27 +803,36 @@ class DocumentAnonymizer:
 
         return combined
 
-    def anonymize_file(self, filepath: str, profile: AnonymProfile) -> Tuple[bool, int]:
+    def anonymize_file(self, filepath: str, profile: AnonymProfile,
+                       counts: Optional[Counter] = None) -> Tuple[bool, int]:
         """
         Anonymisiert eine einzelne Datei.
 
+        Args:
+            counts: Optionaler Counter fuer Ersetzungen pro Kategorie
+
         Returns:
             (success, replacement_count)
         """
         path = Path(filepath)
         suffix = path.suffix.lower()
+        file_counts = Counter()
 
         if suffix == ".docx":
-            return self._anonymize_docx(path, profile)
+            success, count = self._anonymize_docx(path, profile, file_counts)
         elif suffix == ".txt" or suffix == ".md":
-            return self._anonymize_text(path, profile)
+            success, count = self._anonymize_text(path, profile, file_counts)
         elif suffix == ".pdf":
             return self._anonymize_pdf(path, profile)
         elif suffix in (".xlsx", ".xls"):
-            return self._anonymize_excel(path, profile)
+            success, count = self._anonymize_excel(path, profile, file_counts)
         else:
             return False, 0
 
+        if counts is not None:
+            counts.update(file_counts)
+        return success, count
+
     def anonymize_folder(
         self,
         folder: str,
@@ -882,6 +869,7 @@ class DocumentAnonymizer:
         self._progress = ProgressInfo(total_files=len(files), status="anonymizing")
 
         # Dateien verarbeiten
+        counts = Counter()
         for filepath in files:
             self._progress.current_file = filepath.name
             self._progress.processed_files += 1
@@ -897,7 +885,7 @@ class DocumentAnonymizer:
                 import shutil
                 shutil.copy2(filepath, dest_file)
 
-                success, count = self.anonymize_file(str(dest_file), profile)
+                success, count = self.anonymize_file(str(dest_file), profile, counts)
                 if success:
                     result.anonymized_files += 1
                     result.replacements_total += count
@@ -927,59 +915,30 @@ class DocumentAnonymizer:
         profil_path = dest / ".profil.json"
         profil_path.write_text(json.dumps(profil_info, indent=2, ensure_ascii=False), encoding="utf-8")
 
+        result.replacements_by_category = dict(counts)
         self._progress.status = "done"
         return result
 
-    def _anonymize_docx(self, path: Path, profile: AnonymProfile) -> Tuple[bool, int]:
-        """Anonymisiert ein Word-Dokument."""
+    def _anonymize_docx(self, path: Path, profile: AnonymProfile,
+                        counts: Optional[Counter] = None) -> Tuple[bool, int]:
+        """Anonymisiert ein Word-Dokument (Run-Formatierung bleibt erhalten)."""
         if not DOCX_AVAILABLE:
             return False, 0
 
         doc = Document(str(path))
-        count = 0
-
-        # Alle Mappings anwenden
-        all_replacements = {}
-        for category in profile.mappings.values():
-            all_replacements.update(category)
-
-        # Nach Laenge sortieren (laengste zuerst, verhindert Teilersetzungen)
-        sorted_replacements = sorted(all_replacements.items(), key=lambda x: len(x[0]), reverse=True)
+        engine = ReplacementEngine.for_profile(profile)
+        counts = counts if counts is not None else Counter()
+        before = sum(counts.values())
 
         def replace_in_paragraphs(paragraphs):
-            nonlocal count
             for paragraph in paragraphs:
-                full_text = "".join(run.text for run in paragraph.runs)
-                
-                # Check ob ueberhaupt was zu tun ist
-                if not any(old in full_text for old, _ in sorted_replacements):
+                runs = paragraph.runs
+                new_texts = engine.replace_runs([run.text for run in runs], counts)
+                if new_texts is None:
                     continue
-
-                for old, new in sorted_replacements:
-                    if old in full_text:
-                        # Versuch 1: Einzel-Run Ersetzung
-                        replaced_in_runs = False
-                        for run in paragraph.runs:
-                            if old in run.text:
-                                run.text = run.text.replace(old, new)
-                                count += 1
-                                replaced_in_runs = True
-                        
-                        # Versuch 2: Falls gesplittet (destruktiver Fallback fuer Privacy)
-                        if not replaced_in_runs:
-                            p_text = paragraph.text
-                            new_p_text = p_text.replace(old, new)
-                            if new_p_text != p_text:
-                                # Alle Runs leeren
-                                for run in paragraph.runs:
-                                    run.text = ""
-                                # Text in den ersten Run schreiben
-                                if paragraph.runs:
-                                    paragraph.runs[0].text = new_p_text
-                                else:
-                                    paragraph.add_run(new_p_text)
-                                count += 1
-                                full_text = new_p_text # Update fuer naechste Ersetzung
+                for run, new_text in zip(runs, new_texts):
+                    if run.text != new_text:
+                        run.text = new_text
 
         # Paragraphen
         replace_in_paragraphs(doc.paragraphs)
@@ -1000,32 +959,25 @@ class DocumentAnonymizer:
                     replace_in_paragraphs(footer.paragraphs)
 
         doc.save(str(path))
-        return True, count
+        return True, sum(counts.values()) - before
 
-    def _anonymize_text(self, path: Path, profile: AnonymProfile) -> Tuple[bool, int]:
+    def _anonymize_text(self, path: Path, profile: AnonymProfile,
+                        counts: Optional[Counter] = None) -> Tuple[bool, int]:
         """Anonymisiert eine Textdatei."""
         try:
             text = path.read_text(encoding="utf-8")
         except UnicodeDecodeError:
             text = path.read_text(encoding="latin-1")
 
-        count = 0
-        all_replacements = {}
-        for category in profile.mappings.values():
-            all_replacements.update(category)
-
-        sorted_replacements = sorted(all_replacements.items(), key=lambda x: len(x[0]), reverse=True)
-
-        for old, new in sorted_replacements:
-            occurrences = text.count(old)
-            if occurrences > 0:
-                text = text.replace(old, new)
-                count += occurrences
+        text, file_counts = ReplacementEngine.for_profile(profile).replace_counted(text)
+        if counts is not None:
+            counts.update(file_counts)
 
         path.write_text(text, encoding="utf-8")
-        return True, count
+        return True, sum(file_counts.values())
 
-    def _anonymize_excel(self, path: Path, profile: AnonymProfile) -> Tuple[bool, int]:
+    def _anonymize_excel(self, path: Path, profile: AnonymProfile,
+                         counts: Optional[Counter] = None) -> Tuple[bool, int]:
         """
         Anonymisiert eine Excel-Datei (.xlsx, .xls).
 
@@ -1039,13 +991,9 @@ class DocumentAnonymizer:
         except Exception:
             return False, 0
 
-        count = 0
-        all_replacements = {}
-        for category in profile.mappings.values():
-            all_replacements.update(category)
-
-        # Nach Laenge sortieren (laengste zuerst, verhindert Teilersetzungen)
-        sorted_replacements = sorted(all_replacements.items(), key=lambda x: len(x[0]), reverse=True)
+        engine = ReplacementEngine.for_profile(profile)
+        counts = counts if counts is not None else Counter()
+        before = sum(counts.values())
 
         # Alle Tabellenblätter durchgehen
         for sheet_name in wb.sheetnames:
@@ -1053,18 +1001,13 @@ class DocumentAnonymizer:
             for row in sheet.iter_rows():
                 for cell in row:
                     if cell.value and isinstance(cell.value, str):
-                        original = cell.value
-                        new_value = original
-                        for old, new in sorted_replacements:
-                            if old in new_value:
-                                new_value = new_value.replace(old, new)
-                                count += 1
-                        if new_value != original:
+                        new_value = engine.replace(cell.value, counts)
+                        if new_value != cell.value:
                             cell.value = new_value
 
         wb.save(str(path))
         wb.close()
-        return True, count
+        return True, sum(counts.values()) - before
 
     def _anonymize_filename(self, filepath: Path, profile: AnonymProfile) -> Path:
         """
@@ -1074,23 +1017,10 @@ class DocumentAnonymizer:
             Neuer Pfad (umbenannt) oder urspruenglicher Pfad (unveraendert)
         """
         filename = filepath.stem
-        suffix = filepath.suffix
-
-        all_replacements = {}
-        for category in profile.mappings.values():
-            all_replacements.update(category)
-
-        sorted_replacements = sorted(all_replacements.items(), key=lambda x: len(x[0]), reverse=True)
-
-        new_filename = filename
-        changed = False
-        for old, new in sorted_replacements:
-            if old in new_filename:
-                new_filename = new_filename.replace(old, new)
-                changed = True
+        new_filename = ReplacementEngine.for_profile(profile).replace(filename)
 
-        if changed:
-            new_path = filepath.parent / f"{new_filename}{suffix}"
+        if new_filename != filename:
+            new_path = filepath.parent / f"{new_filename}{filepath.suffix}"
             filepath.rename(new_path)
             return new_path
         return filepath
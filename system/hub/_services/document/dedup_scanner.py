@@ -11,14 +11,28 @@ Features:
 - Chunk-basierte Hash-Berechnung (speichereffizient)
 - OneDrive Cloud-Placeholder-Erkennung (kein Download)
 - Duplikat-Report mit Groesse und Pfaden
+- Gestufte Erkennung: nur Dateien mit gleicher Groesse werden gelesen,
+  zuerst Anfang+Ende (Teil-Hash), dann volle Hashes im Thread-Pool
+- Optionaler Hash-Cache (SQLite) ueber Laeufe hinweg,
+  Schluessel: Inode + Groesse + mtime
 """
 
 import hashlib
 import os
+import sqlite3
+import threading
+import time
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
+PARTIAL_BYTES = 64 * 1024      # Anfang und Ende fuer den Teil-Hash
+HASH_WORKERS = 4               # Threads fuer volle Hashes
+
+# Standard-Cache fuer `bach doc dedup` (system/data/)
+DEFAULT_CACHE_PATH = Path(__file__).resolve().parents[3] / "data" / "dedup_hash_cache.db"
+
 
 def sha256_file(path: Path, chunk_size: int = 1024 * 1024) -> str:
     """Berechnet SHA256-Hash einer Datei mit Chunk-Verarbeitung."""
@@ -32,6 +46,22 @@ def sha256_file(path: Path, chunk_size: int = 1024 * 1024) -> str:
     return h.hexdigest()
 
 
+def partial_hash(path: Path, size: int, block: int = PARTIAL_BYTES) -> str:
+    """SHA256 ueber die ersten und letzten `block` Bytes.
+
+    Fuer Dateien bis 2*block wird der ganze Inhalt gelesen - das Ergebnis
+    ist dann identisch mit sha256_file().
+    """
+    if size <= 2 * block:
+        return sha256_file(path)
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        h.update(f.read(block))
+        f.seek(-block, os.SEEK_END)
+        h.update(f.read(block))
+    return h.hexdigest()
+
+
 def is_cloud_placeholder(path: Path) -> bool:
     """Prueft ob eine Datei ein OneDrive Cloud-Placeholder ist (nicht lokal)."""
     if os.name != "nt":
@@ -45,21 +75,121 @@ def is_cloud_placeholder(path: Path) -> bool:
         return False
 
 
+class HashCache:
+    """Persistenter Hash-Cache. Eintraege gelten nur bei gleicher Groesse und mtime."""
+
+    def __init__(self, db_path: Path):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS dedup_hash_cache (
+                file_key TEXT PRIMARY KEY,
+                size INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                partial_hash TEXT,
+                full_hash TEXT,
+                seen_at REAL
+            )
+        """)
+        self._conn.commit()
+        self._lock = threading.Lock()
+        self._pending: Dict[str, tuple] = {}
+
+    @staticmethod
+    def key(path: str, stat: os.stat_result) -> str:
+        """dev:inode, auf Dateisystemen ohne Inode der Pfad."""
+        if stat.st_ino:
+            return f"{stat.st_dev}:{stat.st_ino}"
+        return f"path:{path}"
+
+    def get(self, key: str, size: int, mtime_ns: int) -> Tuple[Optional[str], Optional[str]]:
+        """(partial_hash, full_hash) oder (None, None) wenn veraltet/unbekannt."""
+        with self._lock:
+            row = self._pending.get(key) or self._conn.execute(
+                "SELECT size, mtime_ns, partial_hash, full_hash FROM dedup_hash_cache WHERE file_key = ?",
+                (key,)
+            ).fetchone()
+        if row is None or row[0] != size or row[1] != mtime_ns:
+            return None, None
+        return row[2], row[3]
+
+    def put(self, key: str, size: int, mtime_ns: int,
+            partial: Optional[str] = None, full: Optional[str] = None):
+        with self._lock:
+            old = self._pending.get(key)
+            if old is not None and old[0] == size and old[1] == mtime_ns:
+                partial = partial or old[2]
+                full = full or old[3]
+            self._pending[key] = (size, mtime_ns, partial, full)
+
+    def flush(self):
+        """Schreibt gesammelte Eintraege in einer Transaktion."""
+        with self._lock:
+            if not self._pending:
+                return
+            now = time.time()
+            self._conn.executemany(
+                "INSERT INTO dedup_hash_cache (file_key, size, mtime_ns, partial_hash, full_hash, seen_at) "
+                "VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(file_key) DO UPDATE SET size = excluded.size, mtime_ns = excluded.mtime_ns, "
+                "partial_hash = excluded.partial_hash, full_hash = excluded.full_hash, seen_at = excluded.seen_at",
+                [(k, v[0], v[1], v[2], v[3], now) for k, v in self._pending.items()]
+            )
+            self._conn.commit()
+            self._pending.clear()
+
+    def close(self):
+        self.flush()
+        self._conn.close()
+
+
 class DedupScanner:
-    """Scannt Verzeichnisse und findet Duplikate per SHA256."""
+    """Scannt Verzeichnisse und findet Duplikate per SHA256 (gestuft)."""
 
-    def __init__(self, min_size: int = 0, skip_cloud: bool = True):
+    def __init__(self, min_size: int = 0, skip_cloud: bool = True,
+                 cache_path: Optional[Path] = None, workers: int = HASH_WORKERS):
         """
         Args:
             min_size: Minimale Dateigroesse in Bytes (0 = alle)
             skip_cloud: Cloud-Placeholder ueberspringen
+            cache_path: SQLite-Datei fuer den Hash-Cache (None = kein Cache)
+            workers: Threads fuer volle Hashes (Stufe 3)
         """
         self.min_size = min_size
         self.skip_cloud = skip_cloud
+        self.cache_path = cache_path
+        self.workers = max(1, workers)
+
+    def _collect(self, path: Path, recursive: bool):
+        """Liefert (pfad, stat) aller Dateien; stat kommt bei scandir meist ohne Syscall."""
+        if path.is_file():
+            yield str(path), path.stat()
+            return
+        stack = [str(path)]
+        while stack:
+            current = stack.pop()
+            try:
+                with os.scandir(current) as it:
+                    for entry in it:
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                if recursive:
+                                    stack.append(entry.path)
+                            elif entry.is_file():
+                                yield entry.path, entry.stat()
+                        except OSError:
+                            continue
+            except OSError:
+                continue
 
     def scan(self, path: Path, recursive: bool = True) -> Dict:
         """Scannt Verzeichnis und liefert Duplikat-Report.
 
+        Stufe 1 gruppiert nach Groesse, Stufe 2 hasht Anfang+Ende der
+        Dateien mit gleicher Groesse, Stufe 3 hasht die verbleibenden
+        Kandidaten vollstaendig.
+
         Returns:
             {
                 "total_files": int,
@@ -73,45 +203,78 @@ class DedupScanner:
                     "files": [str, ...]
                 }, ...],
                 "wasted_bytes": int,
+                "stages": {
+                    "size_candidates": int,   # Dateien mit Groessen-Kollision
+                    "partial_hashed": int,
+                    "full_candidates": int,   # nach Teil-Hash noch Kandidat
+                    "full_hashed": int,
+                    "cache_hits": int,
+                    "bytes_read": int,
+                },
             }
         """
         path = Path(path)
         if not path.exists():
             raise ValueError(f"Pfad existiert nicht: {path}")
 
-        hash_map = defaultdict(list)  # hash -> [(path, size), ...]
         total_files = 0
         total_size = 0
         skipped_cloud = 0
-
-        # Dateien sammeln
-        if path.is_file():
-            files = [path]
-        elif recursive:
-            files = [f for f in path.rglob("*") if f.is_file()]
-        else:
-            files = [f for f in path.iterdir() if f.is_file()]
-
-        for fpath in files:
-            try:
-                stat = fpath.stat()
-                size = stat.st_size
-
-                if size < self.min_size:
-                    continue
-
-                if self.skip_cloud and is_cloud_placeholder(fpath):
-                    skipped_cloud += 1
-                    continue
-
-                total_files += 1
-                total_size += size
-
-                file_hash = sha256_file(fpath)
-                hash_map[file_hash].append((str(fpath), size))
-
-            except (PermissionError, OSError):
+        stages = {"size_candidates": 0, "partial_hashed": 0, "full_candidates": 0,
+                  "full_hashed": 0, "cache_hits": 0, "bytes_read": 0}
+
+        # Stufe 1: nach Groesse gruppieren (nur stat, kein Lesen)
+        by_size = defaultdict(list)  # size -> [(path, stat), ...]
+        for fpath, stat in self._collect(path, recursive):
+            size = stat.st_size
+            if size < self.min_size:
+                continue
+            if self.skip_cloud and is_cloud_placeholder(Path(fpath)):
+                skipped_cloud += 1
                 continue
+            total_files += 1
+            total_size += size
+            by_size[size].append((fpath, stat))
+
+        cache = HashCache(self.cache_path) if self.cache_path else None
+        try:
+            candidates = [entries for entries in by_size.values() if len(entries) > 1]
+            stages["size_candidates"] = sum(len(e) for e in candidates)
+
+            # Stufe 2: Teil-Hash (Anfang + Ende)
+            by_partial = defaultdict(list)  # (size, partial) -> [(path, stat, full), ...]
+            for entries in candidates:
+                for fpath, stat in entries:
+                    info = self._partial(fpath, stat, cache, stages)
+                    if info is not None:
+                        by_partial[(stat.st_size, info[0])].append((fpath, stat, info[1]))
+
+            # Stufe 3: volle Hashes nur fuer verbleibende Kandidaten, parallel
+            full_jobs = []
+            hash_map = defaultdict(list)  # full hash -> [(path, size), ...]
+            for (size, _), entries in by_partial.items():
+                if len(entries) < 2:
+                    continue
+                stages["full_candidates"] += len(entries)
+                for fpath, stat, full in entries:
+                    if full is not None:
+                        hash_map[full].append((fpath, size))
+                    else:
+                        full_jobs.append((fpath, stat))
+
+            if full_jobs:
+                with ThreadPoolExecutor(max_workers=self.workers) as pool:
+                    for (fpath, stat), full in zip(full_jobs, pool.map(self._full_hash, full_jobs)):
+                        if full is None:
+                            continue
+                        stages["full_hashed"] += 1
+                        stages["bytes_read"] += stat.st_size
+                        if cache:
+                            cache.put(HashCache.key(fpath, stat), stat.st_size, stat.st_mtime_ns, full=full)
+                        hash_map[full].append((fpath, stat.st_size))
+        finally:
+            if cache:
+                cache.close()
 
         # Duplikate filtern (mehr als 1 Datei pro Hash)
         duplicate_groups = []
@@ -124,21 +287,54 @@ class DedupScanner:
                     "hash": h[:12],  # Gekuerzter Hash fuer Anzeige
                     "size": size,
                     "count": len(entries),
-                    "files": [e[0] for e in entries],
+                    "files": sorted(e[0] for e in entries),
                 })
 
         # Sortieren: groesste Verschwendung zuerst
         duplicate_groups.sort(key=lambda x: x["size"] * (x["count"] - 1), reverse=True)
 
+        # Nicht gehashte Dateien sind per Groesse/Teil-Hash garantiert eindeutig
+        duplicates = sum(g["count"] - 1 for g in duplicate_groups)
+
         return {
             "total_files": total_files,
             "total_size": total_size,
             "skipped_cloud": skipped_cloud,
-            "unique_hashes": len(hash_map),
+            "unique_hashes": total_files - duplicates,
             "duplicate_groups": duplicate_groups,
             "wasted_bytes": wasted,
+            "stages": stages,
         }
 
+    def _partial(self, fpath: str, stat: os.stat_result, cache: Optional[HashCache],
+                 stages: Dict) -> Optional[Tuple[str, Optional[str]]]:
+        """(partial_hash, full_hash oder None) - aus Cache oder gelesen."""
+        size = stat.st_size
+        key = HashCache.key(fpath, stat) if cache else None
+        if cache:
+            partial, full = cache.get(key, size, stat.st_mtime_ns)
+            if partial:
+                stages["cache_hits"] += 1
+                return partial, full
+        try:
+            partial = partial_hash(Path(fpath), size)
+        except (PermissionError, OSError):
+            return None
+        stages["partial_hashed"] += 1
+        stages["bytes_read"] += min(size, 2 * PARTIAL_BYTES)
+        # Kleine Dateien wurden komplett gelesen: Teil-Hash == voller Hash
+        full = partial if size <= 2 * PARTIAL_BYTES else None
+        if cache:
+            cache.put(key, size, stat.st_mtime_ns, partial=partial, full=full)
+        return partial, full
+
+    @staticmethod
+    def _full_hash(job) -> Optional[str]:
+        try:
+            return sha256_file(Path(job[0]))
+        except (PermissionError, OSError):
+            return None
+
     @staticmethod
     def format_report(result: Dict) -> str:
         """Formatiert Scan-Ergebnis als Text-Report."""
@@ -154,6 +350,18 @@ class DedupScanner:
         if result["skipped_cloud"]:
             lines.append(f"  Cloud-Placeholder: {result['skipped_cloud']} uebersprungen")
 
+        stages = result.get("stages")
+        if stages:
+            lines.extend([
+                "",
+                f"  Stufe 1 Groesse:   {stages['size_candidates']} Kandidaten",
+                f"  Stufe 2 Teil-Hash: {stages['partial_hashed']} gelesen, "
+                f"{stages['full_candidates']} Kandidaten",
+                f"  Stufe 3 Voll-Hash: {stages['full_hashed']} gelesen",
+                f"  Cache-Treffer:     {stages['cache_hits']}",
+                f"  Gelesen:           {_fmt_size(stages['bytes_read'])}",
+            ])
+
         groups = result["duplicate_groups"]
         if not groups:
             lines.append("")
@@ -61,13 +61,19 @@ Aktualisiert: 2026-02-02
 """
 
 import re
-import sys
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple, TYPE_CHECKING
 from enum import Enum
 
+try:
+    from .anonymization_engine import ReplacementEngine
+    from .extraction_service import get_extraction_service
+except ImportError:
+    from anonymization_engine import ReplacementEngine
+    from extraction_service import get_extraction_service
+
 if TYPE_CHECKING:
     from .anonymizer_service import AnonymProfile
 
@@ -449,34 +455,9 @@ class DocumentCollector:
         """
         bundle = TextBundle()
 
-        # Anonymisierungs-Mappings vorbereiten
-        if anonym_profile:
-            all_replacements = {}
-            for category in anonym_profile.mappings.values():
-                all_replacements.update(category)
-            sorted_replacements = sorted(
-                all_replacements.items(),
-                key=lambda x: len(x[0]),
-                reverse=True
-            )
-        else:
-            sorted_replacements = []
-
-        def anonymize_text(text: str) -> str:
-            """Wendet Anonymisierung auf Text an."""
-            if not sorted_replacements:
-                return text
-            for old, new in sorted_replacements:
-                text = text.replace(old, new)
-            return text
-
-        def anonymize_filename(filename: str) -> str:
-            """Anonymisiert Dateinamen fuer Header."""
-            if not sorted_replacements:
-                return filename
-            for old, new in sorted_replacements:
-                filename = filename.replace(old, new)
-            return filename
+        # Anonymisierung: ein kompilierter Durchlauf pro Text
+        anonymize_text = ReplacementEngine.for_profile(anonym_profile).replace
+        anonymize_filename = anonymize_text
 
         core_parts = []
         stufe2_parts = []
@@ -520,321 +501,8 @@ class DocumentCollector:
         return bundle
 
     def _extract_text(self, doc: DocumentInfo) -> str:
-        """Extrahiert Text aus einem Dokument."""
-        filepath = str(doc.path)
-        suffix = doc.suffix
-
-        try:
-            if suffix == ".docx":
-                return self._extract_docx(filepath)
-            elif suffix == ".doc":
-                return self._extract_doc(filepath)
-            elif suffix in [".txt", ".md"]:
-                return self._extract_txt(filepath)
-            elif suffix == ".pdf":
-                return self._extract_pdf(filepath)
-            elif suffix in [".xlsx", ".xls"]:
-                return self._extract_excel(filepath)
-            elif suffix == ".msg":
-                return self._extract_msg(filepath)
-            elif suffix == ".eml":
-                return self._extract_eml(filepath)
-            else:
-                return f"[Nicht unterstuetztes Format: {suffix}]"
-        except Exception as e:
-            return f"[FEHLER bei {doc.filename}: {e}]"
-
-    def _extract_docx(self, filepath: str) -> str:
-        """Extrahiert Text aus Word-Dokument (.docx)."""
-        try:
-            from docx import Document
-            doc = Document(filepath)
-            parts = []
-            for para in doc.paragraphs:
-                if para.text.strip():
-                    parts.append(para.text.strip())
-            for table in doc.tables:
-                for row in table.rows:
-                    cells = [c.text.strip() for c in row.cells if c.text.strip()]
-                    if cells:
-                        parts.append(" | ".join(cells))
-            return "\n".join(parts)
-        except ImportError:
-            return "[python-docx nicht installiert]"
-        except Exception as e:
-            # Manchmal ist eine .doc Datei als .docx benanned
-            return f"[DOCX-Fehler: {e}]"
-
-    def _extract_doc(self, filepath: str) -> str:
-        """Extrahiert Text aus altem Word-Format (.doc) via antiword oder textract."""
-        import subprocess
-        import shutil
-
-        # Methode 1: antiword (Linux/Windows mit antiword installiert)
-        if shutil.which("antiword"):
-            try:
-                result = subprocess.run(
-                    ["antiword", filepath],
-                    capture_output=True,
-                    text=True,
-                    timeout=30
-                )
-                if result.returncode == 0 and result.stdout.strip():
-                    return result.stdout.strip()
-            except Exception:
-                pass
-
-        # Methode 2: LibreOffice Konvertierung zu txt
-        if shutil.which("soffice"):
-            try:
-                import tempfile
-                with tempfile.TemporaryDirectory() as tmpdir:
-                    result = subprocess.run(
-                        ["soffice", "--headless", "--convert-to", "txt:Text",
-                         "--outdir", tmpdir, filepath],
-                        capture_output=True,
-                        timeout=60
-                    )
-                    if result.returncode == 0:
-                        txt_file = Path(tmpdir) / (Path(filepath).stem + ".txt")
-                        if txt_file.exists():
-                            return txt_file.read_text(encoding="utf-8", errors="replace")
-            except Exception:
-                pass
-
-        # Methode 3: textract (falls installiert)
-        try:
-            import textract
-            text = textract.process(filepath).decode("utf-8", errors="replace")
-            return text.strip()
-        except ImportError:
-            pass
-        except Exception:
-            pass
-
-        return "[.doc-Extraktion fehlgeschlagen - antiword/LibreOffice/textract nicht verfuegbar]"
-
-    def _extract_txt(self, filepath: str) -> str:
-        """Liest Textdatei."""
-        path = Path(filepath)
-        try:
-            return path.read_text(encoding="utf-8")
-        except UnicodeDecodeError:
-            return path.read_text(encoding="latin-1")
-
-    def _extract_pdf(self, filepath: str) -> str:
-        """Extrahiert Text aus PDF, mit OCR-Fallback fuer Bild-PDFs."""
-        text_parts = []
-        needs_ocr = False
-
-        # Primaer: pypdf (MIT-Lizenz)
-        try:
-            from pypdf import PdfReader
-            reader = PdfReader(filepath)
-            for page in reader.pages:
-                page_text = (page.extract_text() or "").strip()
-                if page_text:
-                    text_parts.append(page_text)
-                else:
-                    needs_ocr = True
-
-            if text_parts:
-                if needs_ocr and not text_parts:
-                    return self._extract_pdf_ocr(filepath)
-                return "\n".join(text_parts)
-        except ImportError:
-            pass
-        except Exception:
-            pass
-
-        # Fallback: pdfplumber (MIT-Lizenz) -- besser bei Tabellen
-        try:
-            import pdfplumber
-            with pdfplumber.open(filepath) as pdf:
-                for page in pdf.pages:
-                    page_text = (page.extract_text() or "").strip()
-                    if page_text:
-                        text_parts.append(page_text)
-                    else:
-                        needs_ocr = True
-            if text_parts:
-                return "\n".join(text_parts)
-        except ImportError:
-            pass
-        except Exception:
-            pass
-
-        # Optional: PyMuPDF (AGPL) -- nur wenn verfuegbar
-        try:
-            import fitz  # PyMuPDF optional
-            doc = fitz.open(filepath)
-            fitz_parts = []
-            fitz_needs_ocr = False
-            for page in doc:
-                page_text = page.get_text().strip()
-                if page_text:
-                    fitz_parts.append(page_text)
-                else:
-                    fitz_needs_ocr = True
-            doc.close()
-            if fitz_parts:
-                if fitz_needs_ocr and not fitz_parts:
-                    return self._extract_pdf_ocr(filepath)
-                return "\n".join(fitz_parts)
-        except ImportError:
-            pass
-        except Exception:
-            pass
-
-        # Wenn kein Text gefunden, OCR versuchen
-        if needs_ocr:
-            return self._extract_pdf_ocr(filepath)
-
-        return "[PDF-Extraktion fehlgeschlagen: pypdf, pdfplumber und PyMuPDF nicht verfuegbar]"
-
-    def _extract_pdf_ocr(self, filepath: str) -> str:
-        """OCR fuer Bild-PDFs via tools.ocr.engine.OCREngine."""
-        try:
-            # tools/ocr/engine.py ist der aktuelle Pfad nach Refactoring
-            try:
-                from tools.ocr.engine import OCREngine
-            except ImportError:
-                # Fallback: tools-Verzeichnis manuell zum sys.path hinzufuegen
-                tools_dir = Path(__file__).resolve().parent.parent.parent.parent / "tools"
-                if tools_dir.exists() and str(tools_dir.parent) not in sys.path:
-                    sys.path.insert(0, str(tools_dir.parent))
-                from tools.ocr.engine import OCREngine
-
-            engine = OCREngine()
-            if not engine.available:
-                return "[OCR nicht verfuegbar - Tesseract nicht installiert]"
-
-            text = engine.extract_text(filepath)
-            return text if text else "[OCR: Kein Text erkannt]"
-        except ImportError as e:
-            return f"[OCR Import-Fehler: {e}]"
-        except Exception as e:
-            return f"[OCR-Fehler: {e}]"
-
-    def _extract_excel(self, filepath: str) -> str:
-        """Extrahiert Text aus Excel."""
-        try:
-            import openpyxl
-            wb = openpyxl.load_workbook(filepath, data_only=True)
-            parts = []
-            for sheet_name in wb.sheetnames:
-                sheet = wb[sheet_name]
-                parts.append(f"[Tabelle: {sheet_name}]")
-                for row in sheet.iter_rows(values_only=True):
-                    cells = [str(c) if c else "" for c in row]
-                    if any(cells):
-                        parts.append(" | ".join(cells))
-            wb.close()
-            return "\n".join(parts)
-        except ImportError:
-            return "[openpyxl nicht installiert]"
-
-    def _extract_msg(self, filepath: str) -> str:
-        """Extrahiert Text aus Outlook .msg (inkl. Anhaenge)."""
-        try:
-            import extract_msg
-            msg = extract_msg.Message(filepath)
-            parts = []
-            if msg.date:
-                parts.append(f"Datum: {msg.date}")
-            if msg.sender:
-                parts.append(f"Von: {msg.sender}")
-            if msg.to:
-                parts.append(f"An: {msg.to}")
-            if msg.subject:
-                parts.append(f"Betreff: {msg.subject}")
-            parts.append("")
-            if msg.body:
-                parts.append(msg.body)
-
-            # Anhaenge extrahieren (PDF, DOCX, TXT)
-            if hasattr(msg, 'attachments') and msg.attachments:
-                for attach in msg.attachments:
-                    try:
-                        attach_name = attach.longFilename or attach.shortFilename or "unbekannt"
-                        suffix = Path(attach_name).suffix.lower()
-
-                        if suffix == ".pdf":
-                            # PDF-Anhang temporaer speichern und extrahieren
-                            import tempfile
-                            with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as tmp:
-                                tmp.write(attach.data)
-                                tmp_path = tmp.name
-                            parts.append(f"\n[Anhang: {attach_name}]")
-                            pdf_text = self._extract_pdf(tmp_path)
-                            parts.append(pdf_text)
-                            Path(tmp_path).unlink(missing_ok=True)
-
-                        elif suffix == ".docx":
-                            import tempfile
-                            with tempfile.NamedTemporaryFile(suffix=".docx", delete=False) as tmp:
-                                tmp.write(attach.data)
-                                tmp_path = tmp.name
-                            parts.append(f"\n[Anhang: {attach_name}]")
-                            docx_text = self._extract_docx(tmp_path)
-                            parts.append(docx_text)
-                            Path(tmp_path).unlink(missing_ok=True)
-
-                        elif suffix in [".txt", ".md"]:
-                            parts.append(f"\n[Anhang: {attach_name}]")
-                            try:
-                                text = attach.data.decode('utf-8')
-                            except:
-                                text = attach.data.decode('latin-1')
-                            parts.append(text)
-
-                    except Exception as e:
-                        parts.append(f"\n[Anhang {attach_name}: Fehler - {e}]")
-
-            msg.close()
-            return "\n".join(parts)
-        except ImportError:
-            return "[extract-msg nicht installiert]"
-
-    def _extract_eml(self, filepath: str) -> str:
-        """Extrahiert Text aus .eml."""
-        import email
-        from email import policy
-        from email.parser import BytesParser
-
-        with open(filepath, 'rb') as f:
-            msg = BytesParser(policy=policy.default).parse(f)
-
-        parts = []
-        if msg['Date']:
-            parts.append(f"Datum: {msg['Date']}")
-        if msg['From']:
-            parts.append(f"Von: {msg['From']}")
-        if msg['To']:
-            parts.append(f"An: {msg['To']}")
-        if msg['Subject']:
-            parts.append(f"Betreff: {msg['Subject']}")
-        parts.append("")
-
-        if msg.is_multipart():
-            for part in msg.walk():
-                if part.get_content_type() == 'text/plain':
-                    charset = part.get_content_charset() or 'utf-8'
-                    try:
-                        body = part.get_payload(decode=True).decode(charset)
-                        parts.append(body)
-                        break
-                    except:
-                        pass
-        else:
-            charset = msg.get_content_charset() or 'utf-8'
-            try:
-                body = msg.get_payload(decode=True).decode(charset)
-                parts.append(body)
-            except:
-                parts.append(str(msg.get_payload()))
-
-        return "\n".join(parts)
+        """Extrahiert Text aus einem Dokument (geteilter extraction_service)."""
+        return get_extraction_service().extract(doc.path)
 
     def create_anonymized_bundle(
         self,
@@ -851,22 +519,7 @@ class DocumentCollector:
         Returns:
             Neues TextBundle mit anonymisiertem Text
         """
-        # Alle Mappings sammeln
-        all_replacements = {}
-        for category in profile.mappings.values():
-            all_replacements.update(category)
-
-        # Nach Laenge sortieren (laengste zuerst)
-        sorted_replacements = sorted(
-            all_replacements.items(),
-            key=lambda x: len(x[0]),
-            reverse=True
-        )
-
-        def anonymize_text(text: str) -> str:
-            for old, new in sorted_replacements:
-                text = text.replace(old, new)
-            return text
+        anonymize_text = ReplacementEngine.for_profile(profile).replace
 
         return TextBundle(
             core_text=anonymize_text(bundle.core_text),
@@ -34,7 +34,7 @@ Ersetzt die redundante Logik aus:
 Gemeinsamer Kern beider Dateien:
   - Ordner scannen (rglob, Dateityp-Filter)
   - Dokument-Typ erkennen (pattern-matching auf Dateinamen)
-  - Text extrahieren (DOCX, PDF, TXT, XLSX, MSG, EML)
+  - Text extrahieren (DOCX, PDF, TXT, XLSX, MSG, EML) - via extraction_service
   - Anonymisierung anwenden (optional)
 
 WICHTIG: Die asynchronen / proaktiven Teile aus file_access_hook.py
@@ -71,13 +71,19 @@ Ersetzt: document_collector.py (gemeinsame Scan/Extraktion-Logik)
 """
 
 import re
-import sys
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple, TYPE_CHECKING
 from enum import Enum
 
+try:
+    from .anonymization_engine import ReplacementEngine
+    from .extraction_service import TextExtractionService, get_extraction_service
+except ImportError:
+    from anonymization_engine import ReplacementEngine
+    from extraction_service import TextExtractionService, get_extraction_service
+
 if TYPE_CHECKING:
     from .anonymizer_service import AnonymProfile
 
@@ -260,13 +266,16 @@ class DocumentPipeline:
     def __init__(
         self,
         berichtszeitraum_monate: int = 12,
-        stichtag: Optional[datetime] = None
+        stichtag: Optional[datetime] = None,
+        extractor: Optional[TextExtractionService] = None
     ):
         """
         Args:
             berichtszeitraum_monate: Zeitraum fuer aktuelle Dokumente (Default: 12)
             stichtag: Referenzdatum (Default: heute)
+            extractor: Text-Extraktion (Default: geteilter Service mit Cache)
         """
+        self.extractor = extractor or get_extraction_service()
         self.berichtszeitraum_monate = berichtszeitraum_monate
         self.stichtag = stichtag or datetime.now()
         self.zeitraum_start = self.stichtag - timedelta(days=berichtszeitraum_monate * 30)
@@ -508,25 +517,8 @@ class DocumentPipeline:
         """
         bundle = TextBundle()
 
-        # Anonymisierungs-Mappings vorbereiten
-        if anonym_profile:
-            all_replacements = {}
-            for category in anonym_profile.mappings.values():
-                all_replacements.update(category)
-            sorted_replacements = sorted(
-                all_replacements.items(),
-                key=lambda x: len(x[0]),
-                reverse=True
-            )
-        else:
-            sorted_replacements = []
-
-        def anonymize_text(text: str) -> str:
-            if not sorted_replacements:
-                return text
-            for old, new in sorted_replacements:
-                text = text.replace(old, new)
-            return text
+        # Anonymisierung: ein kompilierter Durchlauf pro Text
+        anonymize_text = ReplacementEngine.for_profile(anonym_profile).replace
 
         # Prioritaets-Gruppen innerhalb der Kategorien
         high_prio_parts = []    # Aktuelle Protokolle, Hilfeplan, Bewilligung, Aktendeckblatt
@@ -537,13 +529,16 @@ class DocumentPipeline:
 
         ten_years_ago = datetime.now() - timedelta(days=10 * 365)
 
-        for doc in documents:
-            if doc.category == DocumentCategory.SKIP:
-                continue
-            if doc.category == DocumentCategory.EXTENDED and not include_extended:
-                continue
+        selected = [
+            doc for doc in documents
+            if doc.category != DocumentCategory.SKIP
+            and (doc.category != DocumentCategory.EXTENDED or include_extended)
+        ]
+        # Einmal gesammelt extrahieren: Cache-Treffer sofort, Rest im Prozess-Pool
+        extracted = self.extractor.extract_many([doc.path for doc in selected])
 
-            text = self._extract_text_from_file(doc.path)
+        for doc, result in zip(selected, extracted):
+            text = result.text
             if not text or text.startswith("[FEHLER"):
                 continue
 
@@ -662,7 +657,7 @@ class DocumentPipeline:
         if include_extended and (bundle_path / "extended").exists():
             folders.append(bundle_path / "extended")
 
-        all_content = []
+        files = []
 
         for folder in folders:
             if not folder.exists():
@@ -681,10 +676,13 @@ class DocumentPipeline:
                 if filename_filter and filename_filter.lower() not in filepath.name.lower():
                     continue
 
-                text = self._extract_text_from_file(filepath)
-                if text.strip():
-                    rel_path = filepath.relative_to(bundle_path)
-                    all_content.append(f"--- Quelle: {rel_path} ---\n{text}")
+                files.append(filepath)
+
+        all_content = []
+        for filepath, result in zip(files, self.extractor.extract_many(files)):
+            if result.text.strip():
+                rel_path = filepath.relative_to(bundle_path)
+                all_content.append(f"--- Quelle: {rel_path} ---\n{result.text}")
 
         if not all_content:
             return "[KEINE DATEN] Keine passenden Dokumente im Bundle gefunden."
@@ -747,20 +745,7 @@ class DocumentPipeline:
         Returns:
             Neues TextBundle mit anonymisiertem Text
         """
-        all_replacements = {}
-        for category in profile.mappings.values():
-            all_replacements.update(category)
-
-        sorted_replacements = sorted(
-            all_replacements.items(),
-            key=lambda x: len(x[0]),
-            reverse=True
-        )
-
-        def anonymize_text(text: str) -> str:
-            for old, new in sorted_replacements:
-                text = text.replace(old, new)
-            return text
+        anonymize_text = ReplacementEngine.for_profile(profile).replace
 
         return TextBundle(
             core_text=anonymize_text(bundle.core_text),
@@ -771,315 +756,16 @@ class DocumentPipeline:
         )
 
     # ─────────────────────────────────────────────────────────────
-    # Text-Extraktion (konsolidierter Code aus beiden Quell-Dateien)
+    # Text-Extraktion (extraction_service: gemeinsamer Cache)
     # ─────────────────────────────────────────────────────────────
 
     def _extract_text_from_file(self, filepath: Path) -> str:
         """
-        Extrahiert Text aus einer Datei.
+        Extrahiert Text aus einer Datei (DOCX, DOC, PDF, TXT, XLSX, MSG, EML).
 
-        Konsolidiert die identische Logik aus:
-          - DocumentCollector._extract_text()
-          - FileAccessHook._extract_text()
-
-        Zusaetzlich gegenueber FileAccessHook: DOC, MSG, EML Unterstuetzung.
+        Fehler kommen als "[...]"-Marker zurueck, z.B. "[FEHLER bei x.pdf: ...]".
         """
-        suffix = filepath.suffix.lower()
-        filepath_str = str(filepath)
-
-        try:
-            if suffix == ".docx":
-                return self._extract_docx(filepath_str)
-            elif suffix == ".doc":
-                return self._extract_doc(filepath_str)
-            elif suffix in [".txt", ".md"]:
-                return self._extract_txt(filepath_str)
-            elif suffix == ".pdf":
-                return self._extract_pdf(filepath_str)
-            elif suffix in [".xlsx", ".xls"]:
-                return self._extract_excel(filepath_str)
-            elif suffix == ".msg":
-                return self._extract_msg(filepath_str)
-            elif suffix == ".eml":
-                return self._extract_eml(filepath_str)
-            else:
-                return f"[Nicht unterstuetztes Format: {suffix}]"
-        except Exception as e:
-            return f"[FEHLER bei {filepath.name}: {e}]"
-
-    def _extract_docx(self, filepath: str) -> str:
-        """Extrahiert Text aus Word-Dokument (.docx)."""
-        try:
-            from docx import Document
-            doc = Document(filepath)
-            parts = []
-            for para in doc.paragraphs:
-                if para.text.strip():
-                    parts.append(para.text.strip())
-            for table in doc.tables:
-                for row in table.rows:
-                    cells = [c.text.strip() for c in row.cells if c.text.strip()]
-                    if cells:
-                        parts.append(" | ".join(cells))
-            return "\n".join(parts)
-        except ImportError:
-            return "[python-docx nicht installiert]"
-        except Exception as e:
-            return f"[DOCX-Fehler: {e}]"
-
-    def _extract_doc(self, filepath: str) -> str:
-        """Extrahiert Text aus altem Word-Format (.doc) via antiword oder LibreOffice."""
-        import subprocess
-        import shutil
-
-        if shutil.which("antiword"):
-            try:
-                result = subprocess.run(
-                    ["antiword", filepath],
-                    capture_output=True, text=True, timeout=30
-                )
-                if result.returncode == 0 and result.stdout.strip():
-                    return result.stdout.strip()
-            except Exception:
-                pass
-
-        if shutil.which("soffice"):
-            try:
-                import tempfile
-                with tempfile.TemporaryDirectory() as tmpdir:
-                    result = subprocess.run(
-                        ["soffice", "--headless", "--convert-to", "txt:Text",
-                         "--outdir", tmpdir, filepath],
-                        capture_output=True, timeout=60
-                    )
-                    if result.returncode == 0:
-                        txt_file = Path(tmpdir) / (Path(filepath).stem + ".txt")
-                        if txt_file.exists():
-                            return txt_file.read_text(encoding="utf-8", errors="replace")
-            except Exception:
-                pass
-
-        try:
-            import textract
-            text = textract.process(filepath).decode("utf-8", errors="replace")
-            return text.strip()
-        except ImportError:
-            pass
-        except Exception:
-            pass
-
-        return "[.doc-Extraktion fehlgeschlagen - antiword/LibreOffice/textract nicht verfuegbar]"
-
-    def _extract_txt(self, filepath: str) -> str:
-        """Liest Textdatei."""
-        path = Path(filepath)
-        try:
-            return path.read_text(encoding="utf-8")
-        except UnicodeDecodeError:
-            return path.read_text(encoding="latin-1")
-
-    def _extract_pdf(self, filepath: str) -> str:
-        """Extrahiert Text aus PDF, mit OCR-Fallback fuer Bild-PDFs."""
-        text_parts = []
-        needs_ocr = False
-
-        # Primaer: pypdf (MIT-Lizenz)
-        try:
-            from pypdf import PdfReader
-            reader = PdfReader(filepath)
-            for page in reader.pages:
-                page_text = (page.extract_text() or "").strip()
-                if page_text:
-                    text_parts.append(page_text)
-                else:
-                    needs_ocr = True
-            if text_parts:
-                return "\n".join(text_parts)
-        except ImportError:
-            pass
-        except Exception:
-            pass
-
-        # Fallback: pdfplumber (MIT-Lizenz)
-        try:
-            import pdfplumber
-            with pdfplumber.open(filepath) as pdf:
-                for page in pdf.pages:
-                    page_text = (page.extract_text() or "").strip()
-                    if page_text:
-                        text_parts.append(page_text)
-                    else:
-                        needs_ocr = True
-            if text_parts:
-                return "\n".join(text_parts)
-        except ImportError:
-            pass
-        except Exception:
-            pass
-
-        # Optional: PyMuPDF (AGPL)
-        try:
-            import fitz
-            doc = fitz.open(filepath)
-            fitz_parts = []
-            fitz_needs_ocr = False
-            for page in doc:
-                page_text = page.get_text().strip()
-                if page_text:
-                    fitz_parts.append(page_text)
-                else:
-                    fitz_needs_ocr = True
-            doc.close()
-            if fitz_parts:
-                return "\n".join(fitz_parts)
-        except ImportError:
-            pass
-        except Exception:
-            pass
-
-        if needs_ocr:
-            return self._extract_pdf_ocr(filepath)
-
-        return "[PDF-Extraktion fehlgeschlagen: pypdf, pdfplumber und PyMuPDF nicht verfuegbar]"
-
-    def _extract_pdf_ocr(self, filepath: str) -> str:
-        """OCR fuer Bild-PDFs via tools.ocr.engine.OCREngine."""
-        try:
-            try:
-                from tools.ocr.engine import OCREngine
-            except ImportError:
-                # Fallback: tools-Verzeichnis manuell zum sys.path hinzufuegen
-                tools_dir = Path(__file__).resolve().parent.parent.parent.parent / "tools"
-                if tools_dir.exists() and str(tools_dir.parent) not in sys.path:
-                    sys.path.insert(0, str(tools_dir.parent))
-                from tools.ocr.engine import OCREngine
-
-            engine = OCREngine()
-            if not engine.available:
-                return "[OCR nicht verfuegbar - Tesseract nicht installiert]"
-
-            text = engine.extract_text(filepath)
-            return text if text else "[OCR: Kein Text erkannt]"
-        except ImportError as e:
-            return f"[OCR Import-Fehler: {e}]"
-        except Exception as e:
-            return f"[OCR-Fehler: {e}]"
-
-    def _extract_excel(self, filepath: str) -> str:
-        """Extrahiert Text aus Excel."""
-        try:
-            import openpyxl
-            wb = openpyxl.load_workbook(filepath, data_only=True)
-            parts = []
-            for sheet_name in wb.sheetnames:
-                sheet = wb[sheet_name]
-                parts.append(f"[Tabelle: {sheet_name}]")
-                for row in sheet.iter_rows(values_only=True):
-                    cells = [str(c) if c else "" for c in row]
-                    if any(cells):
-                        parts.append(" | ".join(cells))
-            wb.close()
-            return "\n".join(parts)
-        except ImportError:
-            return "[openpyxl nicht installiert]"
-
-    def _extract_msg(self, filepath: str) -> str:
-        """Extrahiert Text aus Outlook .msg (inkl. Anhaenge)."""
-        try:
-            import extract_msg
-            msg = extract_msg.Message(filepath)
-            parts = []
-            if msg.date:
-                parts.append(f"Datum: {msg.date}")
-            if msg.sender:
-                parts.append(f"Von: {msg.sender}")
-            if msg.to:
-                parts.append(f"An: {msg.to}")
-            if msg.subject:
-                parts.append(f"Betreff: {msg.subject}")
-            parts.append("")
-            if msg.body:
-                parts.append(msg.body)
-
-            if hasattr(msg, 'attachments') and msg.attachments:
-                for attach in msg.attachments:
-                    try:
-                        attach_name = attach.longFilename or attach.shortFilename or "unbekannt"
-                        suffix = Path(attach_name).suffix.lower()
-
-                        if suffix == ".pdf":
-                            import tempfile
-                            with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as tmp:
-                                tmp.write(attach.data)
-                                tmp_path = tmp.name
-                            parts.append(f"\n[Anhang: {attach_name}]")
-                            parts.append(self._extract_pdf(tmp_path))
-                            Path(tmp_path).unlink(missing_ok=True)
-
-                        elif suffix == ".docx":
-                            import tempfile
-                            with tempfile.NamedTemporaryFile(suffix=".docx", delete=False) as tmp:
-                                tmp.write(attach.data)
-                                tmp_path = tmp.name
-                            parts.append(f"\n[Anhang: {attach_name}]")
-                            parts.append(self._extract_docx(tmp_path))
-                            Path(tmp_path).unlink(missing_ok=True)
-
-                        elif suffix in [".txt", ".md"]:
-                            parts.append(f"\n[Anhang: {attach_name}]")
-                            try:
-                                text = attach.data.decode('utf-8')
-                            except Exception:
-                                text = attach.data.decode('latin-1')
-                            parts.append(text)
-
-                    except Exception as e:
-                        parts.append(f"\n[Anhang {attach_name}: Fehler - {e}]")
-
-            msg.close()
-            return "\n".join(parts)
-        except ImportError:
-            return "[extract-msg nicht installiert]"
-
-    def _extract_eml(self, filepath: str) -> str:
-        """Extrahiert Text aus .eml."""
-        import email
-        from email import policy
-        from email.parser import BytesParser
-
-        with open(filepath, 'rb') as f:
-            msg = BytesParser(policy=policy.default).parse(f)
-
-        parts = []
-        if msg['Date']:
-            parts.append(f"Datum: {msg['Date']}")
-        if msg['From']:
-            parts.append(f"Von: {msg['From']}")
-        if msg['To']:
-            parts.append(f"An: {msg['To']}")
-        if msg['Subject']:
-            parts.append(f"Betreff: {msg['Subject']}")
-        parts.append("")
-
-        if msg.is_multipart():
-            for part in msg.walk():
-                if part.get_content_type() == 'text/plain':
-                    charset = part.get_content_charset() or 'utf-8'
-                    try:
-                        body = part.get_payload(decode=True).decode(charset)
-                        parts.append(body)
-                        break
-                    except Exception:
-                        pass
-        else:
-            charset = msg.get_content_charset() or 'utf-8'
-            try:
-                body = msg.get_payload(decode=True).decode(charset)
-                parts.append(body)
-            except Exception:
-                parts.append(str(msg.get_payload()))
-
-        return "\n".join(parts)
+        return self.extractor.extract(filepath)
 
 
 # ═══════════════════════════════════════════════════════════════
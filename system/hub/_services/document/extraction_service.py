@@ -0,0 +1,758 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# SPDX-License-Identifier: MIT
+"""
+Copyright (c) 2026 BACH Contributors
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+
+"""
+Extraction Service - Text-Extraktion mit inhaltsadressiertem Cache
+==================================================================
+
+Gemeinsame Text-Extraktion fuer DocumentPipeline, DocumentCollector,
+FileAccessHook, DocumentAnonymizer und unified_search. Vorher hatte jede
+Stelle eigene Extraktoren und parste dieselben Dateien bei jedem Lauf neu.
+
+Cache (system/data/extraction_cache.db):
+  - Schluessel: SHA256 des Inhalts + Dateiendung + EXTRACTOR_VERSION.
+    Umbenannte/kopierte Dateien treffen denselben Eintrag, geaenderte
+    Extraktoren (Version erhoehen!) verwerfen alte Eintraege.
+  - Pfad-Memo (Groesse + mtime_ns -> Hash): unveraenderte Dateien werden
+    nicht erneut gehasht.
+  - Fehler und fehlende Bibliotheken werden nicht gecacht.
+  - Klartext (.txt/.md) geht am Cache vorbei - Lesen ist so billig wie
+    ein Cache-Zugriff.
+
+extract_many() verteilt Cache-Misses auf einen begrenzten Prozess-Pool
+(Parsen ist CPU-gebunden); geschrieben wird nur im Hauptprozess.
+metrics() liefert Dateien, Cache-Treffer, Fehler und Zeit pro Format.
+
+Usage:
+    from hub._services.document.extraction_service import get_extraction_service
+
+    service = get_extraction_service()
+    text = service.extract(path)                 # str, Fehler als "[...]"-Marker
+    result = service.extract_result(path)        # ExtractionResult
+    results = service.extract_many(paths)        # Liste in Eingabe-Reihenfolge
+
+    python extraction_service.py --stats
+    python extraction_service.py --prune
+"""
+
+import hashlib
+import logging
+import os
+import sqlite3
+import sys
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Erhoehen, sobald sich die Ausgabe eines Extraktors aendert
+EXTRACTOR_VERSION = 1
+
+SUPPORTED_SUFFIXES = frozenset({
+    ".docx", ".doc", ".txt", ".md", ".pdf", ".xlsx", ".xls", ".msg", ".eml",
+})
+PLAIN_TEXT_SUFFIXES = frozenset({".txt", ".md"})
+
+EXTRACT_WORKERS = 4       # Prozesse fuer extract_many
+POOL_MIN_FILES = 8        # darunter wird im eigenen Prozess extrahiert
+
+# Standard-Cache (system/data/)
+DEFAULT_CACHE_PATH = Path(__file__).resolve().parents[3] / "data" / "extraction_cache.db"
+
+
+class ExtractionError(Exception):
+    """Extraktion nicht moeglich; die Meldung wird als "[...]"-Marker ausgegeben."""
+
+
+@dataclass
+class ExtractionResult:
+    """Ergebnis einer Extraktion."""
+    text: str                       # Text oder "[...]"-Marker bei Fehler
+    ok: bool = True
+    error: Optional[str] = None
+    cached: bool = False
+    seconds: float = 0.0            # Extraktionszeit (0 bei Cache-Treffer)
+    content_hash: Optional[str] = None
+
+
+def sha256_file(path: Path, chunk_size: int = 1024 * 1024) -> str:
+    """SHA256 des Dateiinhalts."""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            h.update(chunk)
+    return h.hexdigest()
+
+
+# ═══════════════════════════════════════════════════════════════
+# Extraktoren (aus DocumentPipeline uebernommen)
+# ═══════════════════════════════════════════════════════════════
+
+def _extract_docx(filepath: str) -> str:
+    """Word-Dokument (.docx): Absaetze, dann Tabellenzeilen."""
+    try:
+        from docx import Document
+    except ImportError:
+        raise ExtractionError("python-docx nicht installiert")
+    try:
+        doc = Document(filepath)
+        parts = []
+        for para in doc.paragraphs:
+            if para.text.strip():
+                parts.append(para.text.strip())
+        for table in doc.tables:
+            for row in table.rows:
+                cells = [c.text.strip() for c in row.cells if c.text.strip()]
+                if cells:
+                    parts.append(" | ".join(cells))
+        return "\n".join(parts)
+    except Exception as e:
+        raise ExtractionError(f"DOCX-Fehler: {e}")
+
+
+def _extract_doc(filepath: str) -> str:
+    """Altes Word-Format (.doc) via antiword, LibreOffice oder textract."""
+    import shutil
+    import subprocess
+
+    if shutil.which("antiword"):
+        try:
+            result = subprocess.run(
+                ["antiword", filepath],
+                capture_output=True, text=True, timeout=30
+            )
+            if result.returncode == 0 and result.stdout.strip():
+                return result.stdout.strip()
+        except Exception:
+            pass
+
+    if shutil.which("soffice"):
+        try:
+            import tempfile
+            with tempfile.TemporaryDirectory() as tmpdir:
+                result = subprocess.run(
+                    ["soffice", "--headless", "--convert-to", "txt:Text",
+                     "--outdir", tmpdir, filepath],
+                    capture_output=True, timeout=60
+                )
+                if result.returncode == 0:
+                    txt_file = Path(tmpdir) / (Path(filepath).stem + ".txt")
+                    if txt_file.exists():
+                        return txt_file.read_text(encoding="utf-8", errors="replace")
+        except Exception:
+            pass
+
+    try:
+        import textract
+        text = textract.process(filepath).decode("utf-8", errors="replace")
+        return text.strip()
+    except Exception:
+        pass
+
+    raise ExtractionError(".doc-Extraktion fehlgeschlagen - antiword/LibreOffice/textract nicht verfuegbar")
+
+
+def _extract_txt(filepath: str) -> str:
+    """Textdatei (UTF-8, sonst Latin-1)."""
+    path = Path(filepath)
+    try:
+        return path.read_text(encoding="utf-8")
+    except UnicodeDecodeError:
+        return path.read_text(encoding="latin-1")
+
+
+def _extract_pdf(filepath: str) -> str:
+    """PDF: pypdf -> pdfplumber -> PyMuPDF, OCR-Fallback fuer Bild-PDFs."""
+    text_parts = []
+    needs_ocr = False
+
+    # Primaer: pypdf (MIT-Lizenz)
+    try:
+        from pypdf import PdfReader
+        reader = PdfReader(filepath)
+        for page in reader.pages:
+            page_text = (page.extract_text() or "").strip()
+            if page_text:
+                text_parts.append(page_text)
+            else:
+                needs_ocr = True
+        if text_parts:
+            return "\n".join(text_parts)
+    except Exception:
+        pass
+
+    # Fallback: pdfplumber (MIT-Lizenz)
+    try:
+        import pdfplumber
+        with pdfplumber.open(filepath) as pdf:
+            for page in pdf.pages:
+                page_text = (page.extract_text() or "").strip()
+                if page_text:
+                    text_parts.append(page_text)
+                else:
+                    needs_ocr = True
+        if text_parts:
+            return "\n".join(text_parts)
+    except Exception:
+        pass
+
+    # Optional: PyMuPDF (AGPL)
+    try:
+        import fitz
+        doc = fitz.open(filepath)
+        fitz_parts = []
+        for page in doc:
+            page_text = page.get_text().strip()
+            if page_text:
+                fitz_parts.append(page_text)
+            else:
+                needs_ocr = True
+        doc.close()
+        if fitz_parts:
+            return "\n".join(fitz_parts)
+    except Exception:
+        pass
+
+    if needs_ocr:
+        return _extract_pdf_ocr(filepath)
+
+    raise ExtractionError("PDF-Extraktion fehlgeschlagen: pypdf, pdfplumber und PyMuPDF nicht verfuegbar")
+
+
+def _extract_pdf_ocr(filepath: str) -> str:
+    """OCR fuer Bild-PDFs via tools.ocr.engine.OCREngine."""
+    try:
+        try:
+            from tools.ocr.engine import OCREngine
+        except ImportError:
+            # Fallback: system/ zum sys.path hinzufuegen
+            system_dir = Path(__file__).resolve().parents[3]
+            if (system_dir / "tools").exists() and str(system_dir) not in sys.path:
+                sys.path.insert(0, str(system_dir))
+            from tools.ocr.engine import OCREngine
+    except ImportError as e:
+        raise ExtractionError(f"OCR Import-Fehler: {e}")
+
+    try:
+        engine = OCREngine()
+        if not engine.available:
+            raise ExtractionError("OCR nicht verfuegbar - Tesseract nicht installiert")
+        text = engine.extract_text(filepath)
+    except ExtractionError:
+        raise
+    except Exception as e:
+        raise ExtractionError(f"OCR-Fehler: {e}")
+    return text if text else "[OCR: Kein Text erkannt]"
+
+
+def _extract_excel(filepath: str) -> str:
+    """Excel: eine Zeile pro Tabellenzeile, Zellen mit " | " getrennt."""
+    try:
+        import openpyxl
+    except ImportError:
+        raise ExtractionError("openpyxl nicht installiert")
+    wb = openpyxl.load_workbook(filepath, data_only=True)
+    parts = []
+    for sheet_name in wb.sheetnames:
+        sheet = wb[sheet_name]
+        parts.append(f"[Tabelle: {sheet_name}]")
+        for row in sheet.iter_rows(values_only=True):
+            cells = [str(c) if c else "" for c in row]
+            if any(cells):
+                parts.append(" | ".join(cells))
+    wb.close()
+    return "\n".join(parts)
+
+
+def _extract_attachment(data: bytes, suffix: str) -> str:
+    """Anhang ueber eine temporaere Datei mit dem passenden Extraktor lesen."""
+    import tempfile
+    with tempfile.NamedTemporaryFile(suffix=suffix, delete=False) as tmp:
+        tmp.write(data)
+        tmp_path = tmp.name
+    try:
+        return _EXTRACTORS[suffix](tmp_path)
+    except ExtractionError as e:
+        return f"[{e}]"
+    finally:
+        Path(tmp_path).unlink(missing_ok=True)
+
+
+def _extract_msg(filepath: str) -> str:
+    """Outlook .msg inkl. PDF/DOCX/TXT-Anhaengen."""
+    try:
+        import extract_msg
+    except ImportError:
+        raise ExtractionError("extract-msg nicht installiert")
+    msg = extract_msg.Message(filepath)
+    parts = []
+    if msg.date:
+        parts.append(f"Datum: {msg.date}")
+    if msg.sender:
+        parts.append(f"Von: {msg.sender}")
+    if msg.to:
+        parts.append(f"An: {msg.to}")
+    if msg.subject:
+        parts.append(f"Betreff: {msg.subject}")
+    parts.append("")
+    if msg.body:
+        parts.append(msg.body)
+
+    for attach in getattr(msg, "attachments", None) or []:
+        attach_name = "unbekannt"
+        try:
+            attach_name = attach.longFilename or attach.shortFilename or "unbekannt"
+            suffix = Path(attach_name).suffix.lower()
+            if suffix in (".pdf", ".docx"):
+                parts.append(f"\n[Anhang: {attach_name}]")
+                parts.append(_extract_attachment(attach.data, suffix))
+            elif suffix in PLAIN_TEXT_SUFFIXES:
+                parts.append(f"\n[Anhang: {attach_name}]")
+                try:
+                    text = attach.data.decode("utf-8")
+                except Exception:
+                    text = attach.data.decode("latin-1")
+                parts.append(text)
+        except Exception as e:
+            parts.append(f"\n[Anhang {attach_name}: Fehler - {e}]")
+
+    msg.close()
+    return "\n".join(parts)
+
+
+def _extract_eml(filepath: str) -> str:
+    """E-Mail (.eml): Kopfzeilen und erster text/plain-Teil."""
+    from email import policy
+    from email.parser import BytesParser
+
+    with open(filepath, "rb") as f:
+        msg = BytesParser(policy=policy.default).parse(f)
+
+    parts = []
+    if msg["Date"]:
+        parts.append(f"Datum: {msg['Date']}")
+    if msg["From"]:
+        parts.append(f"Von: {msg['From']}")
+    if msg["To"]:
+        parts.append(f"An: {msg['To']}")
+    if msg["Subject"]:
+        parts.append(f"Betreff: {msg['Subject']}")
+    parts.append("")
+
+    if msg.is_multipart():
+        for part in msg.walk():
+            if part.get_content_type() == "text/plain":
+                charset = part.get_content_charset() or "utf-8"
+                try:
+                    parts.append(part.get_payload(decode=True).decode(charset))
+                    break
+                except Exception:
+                    pass
+    else:
+        charset = msg.get_content_charset() or "utf-8"
+        try:
+            parts.append(msg.get_payload(decode=True).decode(charset))
+        except Exception:
+            parts.append(str(msg.get_payload()))
+
+    return "\n".join(parts)
+
+
+_EXTRACTORS = {
+    ".docx": _extract_docx,
+    ".doc": _extract_doc,
+    ".txt": _extract_txt,
+    ".md": _extract_txt,
+    ".pdf": _extract_pdf,
+    ".xlsx": _extract_excel,
+    ".xls": _extract_excel,
+    ".msg": _extract_msg,
+    ".eml": _extract_eml,
+}
+
+
+def _run_extractor(item: tuple) -> tuple:
+    """Worker: (path, suffix) -> (text, error, seconds). Ohne DB-Zugriff."""
+    path, suffix = item
+    start = time.perf_counter()
+    try:
+        text, error = _EXTRACTORS[suffix](path), None
+    except ExtractionError as e:
+        text, error = None, str(e)
+    except Exception as e:
+        text, error = None, f"FEHLER bei {Path(path).name}: {e}"
+    return text, error, time.perf_counter() - start
+
+
+# ═══════════════════════════════════════════════════════════════
+# Cache
+# ═══════════════════════════════════════════════════════════════
+
+class ExtractionCache:
+    """SQLite-Cache: Inhalts-Hash -> extrahierter Text (zlib-komprimiert)."""
+
+    def __init__(self, db_path: Path):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.db_path), timeout=30.0, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS extraction_cache (
+                content_hash TEXT NOT NULL,
+                suffix TEXT NOT NULL,
+                extractor_version INTEGER NOT NULL,
+                text BLOB NOT NULL,
+                chars INTEGER NOT NULL,
+                extract_ms REAL,
+                created_at REAL,
+                PRIMARY KEY (content_hash, suffix, extractor_version)
+            );
+            CREATE TABLE IF NOT EXISTS extraction_file_hashes (
+                path TEXT PRIMARY KEY,
+                size INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                content_hash TEXT NOT NULL
+            );
+        """)
+        self._conn.commit()
+        self._lock = threading.Lock()
+
+    def file_hash(self, path: str, stat: os.stat_result) -> Optional[str]:
+        """Gemerkter Hash, wenn Groesse und mtime unveraendert sind."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT size, mtime_ns, content_hash FROM extraction_file_hashes WHERE path = ?",
+                (path,)
+            ).fetchone()
+        if row is None or row[0] != stat.st_size or row[1] != stat.st_mtime_ns:
+            return None
+        return row[2]
+
+    def remember_hash(self, path: str, stat: os.stat_result, content_hash: str):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO extraction_file_hashes (path, size, mtime_ns, content_hash) "
+                "VALUES (?, ?, ?, ?)",
+                (path, stat.st_size, stat.st_mtime_ns, content_hash)
+            )
+            self._conn.commit()
+
+    def get(self, content_hash: str, suffix: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT text FROM extraction_cache "
+                "WHERE content_hash = ? AND suffix = ? AND extractor_version = ?",
+                (content_hash, suffix, EXTRACTOR_VERSION)
+            ).fetchone()
+        if row is None:
+            return None
+        return zlib.decompress(row[0]).decode("utf-8")
+
+    def put(self, content_hash: str, suffix: str, text: str, seconds: float):
+        blob = zlib.compress(text.encode("utf-8"))
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO extraction_cache "
+                "(content_hash, suffix, extractor_version, text, chars, extract_ms, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (content_hash, suffix, EXTRACTOR_VERSION, blob, len(text),
+                 round(seconds * 1000, 1), time.time())
+            )
+            self._conn.commit()
+
+    def prune(self) -> int:
+        """Loescht Eintraege anderer Extraktor-Versionen und verwaiste Pfade."""
+        with self._lock:
+            removed = self._conn.execute(
+                "DELETE FROM extraction_cache WHERE extractor_version != ?", (EXTRACTOR_VERSION,)
+            ).rowcount
+            paths = [r[0] for r in self._conn.execute("SELECT path FROM extraction_file_hashes")]
+            gone = [(p,) for p in paths if not os.path.exists(p)]
+            self._conn.executemany("DELETE FROM extraction_file_hashes WHERE path = ?", gone)
+            self._conn.commit()
+        return removed + len(gone)
+
+    def stats(self) -> List[dict]:
+        """Eintraege, Zeichen und mittlere Extraktionszeit pro Format."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT suffix, COUNT(*), SUM(chars), AVG(extract_ms), SUM(LENGTH(text)) "
+                "FROM extraction_cache WHERE extractor_version = ? GROUP BY suffix ORDER BY suffix",
+                (EXTRACTOR_VERSION,)
+            ).fetchall()
+        return [{"suffix": r[0], "entries": r[1], "chars": r[2] or 0,
+                 "avg_extract_ms": round(r[3] or 0, 1), "stored_bytes": r[4] or 0}
+                for r in rows]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+# ═══════════════════════════════════════════════════════════════
+# Service
+# ═══════════════════════════════════════════════════════════════
+
+class TextExtractionService:
+    """Text-Extraktion mit Cache, Prozess-Pool und Metriken pro Format."""
+
+    def __init__(self, cache_path: Optional[Path] = DEFAULT_CACHE_PATH,
+                 workers: int = EXTRACT_WORKERS):
+        """
+        Args:
+            cache_path: SQLite-Datei fuer den Cache (None = ohne Cache)
+            workers: Maximale Prozesse fuer extract_many
+        """
+        self.workers = workers
+        self.cache: Optional[ExtractionCache] = None
+        if cache_path is not None:
+            try:
+                self.cache = ExtractionCache(cache_path)
+            except (sqlite3.Error, OSError) as e:
+                logger.warning(f"Extraktions-Cache nicht verfuegbar ({e}) - ohne Cache weiter")
+        self._metrics: Dict[str, Dict[str, float]] = {}
+        self._metrics_lock = threading.Lock()
+
+    # ── Metriken ──────────────────────────────────────────────
+
+    def _record(self, suffix: str, result: ExtractionResult):
+        with self._metrics_lock:
+            m = self._metrics.setdefault(suffix, {
+                "files": 0, "cache_hits": 0, "extracted": 0, "errors": 0,
+                "seconds": 0.0, "max_seconds": 0.0,
+            })
+            m["files"] += 1
+            if result.cached:
+                m["cache_hits"] += 1
+            elif not result.ok:
+                m["errors"] += 1
+            else:
+                m["extracted"] += 1
+            m["seconds"] += result.seconds
+            m["max_seconds"] = max(m["max_seconds"], result.seconds)
+
+    def metrics(self) -> Dict[str, Dict[str, float]]:
+        """Zaehler und Extraktionszeit pro Dateiendung seit dem Start."""
+        with self._metrics_lock:
+            return {s: {k: round(v, 4) if isinstance(v, float) else v for k, v in m.items()}
+                    for s, m in sorted(self._metrics.items())}
+
+    def format_metrics(self) -> str:
+        lines = [f"{'Format':<7} {'Dateien':>8} {'Cache':>7} {'Neu':>6} {'Fehler':>7} {'Zeit':>9} {'Max':>8}"]
+        for suffix, m in self.metrics().items():
+            lines.append(f"{suffix:<7} {m['files']:>8} {m['cache_hits']:>7} {m['extracted']:>6} "
+                         f"{m['errors']:>7} {m['seconds']:>8.2f}s {m['max_seconds']:>7.2f}s")
+        return "\n".join(lines)
+
+    # ── Extraktion ────────────────────────────────────────────
+
+    def _lookup(self, path: Path, suffix: str,
+                content_hash: Optional[str]) -> tuple:
+        """(content_hash, cached_text) fuer cachebare Formate, sonst (None, None)."""
+        if self.cache is None or suffix in PLAIN_TEXT_SUFFIXES:
+            return content_hash, None
+        path_str = str(path)
+        if content_hash is None:
+            stat = os.stat(path_str)
+            content_hash = self.cache.file_hash(path_str, stat)
+            if content_hash is None:
+                content_hash = sha256_file(path)
+                self.cache.remember_hash(path_str, stat, content_hash)
+        return content_hash, self.cache.get(content_hash, suffix)
+
+    def _finish(self, path: Path, suffix: str, content_hash: Optional[str],
+                text: Optional[str], error: Optional[str], seconds: float) -> ExtractionResult:
+        if error is not None:
+            result = ExtractionResult(f"[{error}]", ok=False, error=error,
+                                      seconds=seconds, content_hash=content_hash)
+        else:
+            result = ExtractionResult(text, seconds=seconds, content_hash=content_hash)
+            if content_hash is not None and self.cache is not None:
+                try:
+                    self.cache.put(content_hash, suffix, text, seconds)
+                except sqlite3.Error:
+                    pass  # Cache ist optional (z.B. DB gesperrt)
+        self._record(suffix, result)
+        return result
+
+    def _unsupported(self, path: Path, suffix: str) -> ExtractionResult:
+        error = f"Nicht unterstuetztes Format: {suffix}"
+        result = ExtractionResult(f"[{error}]", ok=False, error=error)
+        self._record(suffix or "(ohne)", result)
+        return result
+
+    def extract_result(self, path, content_hash: Optional[str] = None) -> ExtractionResult:
+        """
+        Extrahiert Text aus einer Datei (Cache zuerst).
+
+        Args:
+            path: Dateipfad
+            content_hash: Bekannter SHA256 des Inhalts (spart das Hashen)
+        """
+        path = Path(path)
+        suffix = path.suffix.lower()
+        if suffix not in _EXTRACTORS:
+            return self._unsupported(path, suffix)
+        try:
+            content_hash, cached = self._lookup(path, suffix, content_hash)
+        except OSError as e:
+            return self._finish(path, suffix, None, None, f"FEHLER bei {path.name}: {e}", 0.0)
+        except sqlite3.Error:
+            content_hash, cached = None, None
+        if cached is not None:
+            result = ExtractionResult(cached, cached=True, content_hash=content_hash)
+            self._record(suffix, result)
+            return result
+        text, error, seconds = _run_extractor((str(path), suffix))
+        return self._finish(path, suffix, content_hash, text, error, seconds)
+
+    def extract(self, path, content_hash: Optional[str] = None) -> str:
+        """Wie extract_result(), gibt aber nur den Text bzw. "[...]"-Marker zurueck."""
+        return self.extract_result(path, content_hash).text
+
+    def extract_many(self, paths: Iterable, workers: Optional[int] = None) -> List[ExtractionResult]:
+        """
+        Extrahiert mehrere Dateien; Cache-Misses laufen im Prozess-Pool.
+
+        Args:
+            paths: Dateipfade
+            workers: Maximale Prozesse (Default: self.workers)
+
+        Returns:
+            ExtractionResult pro Pfad in Eingabe-Reihenfolge
+        """
+        paths = [Path(p) for p in paths]
+        results: List[Optional[ExtractionResult]] = [None] * len(paths)
+        pending = []  # (index, path, suffix, content_hash)
+
+        for i, path in enumerate(paths):
+            suffix = path.suffix.lower()
+            if suffix not in _EXTRACTORS:
+                results[i] = self._unsupported(path, suffix)
+                continue
+            try:
+                content_hash, cached = self._lookup(path, suffix, None)
+            except OSError as e:
+                results[i] = self._finish(path, suffix, None, None, f"FEHLER bei {path.name}: {e}", 0.0)
+                continue
+            except sqlite3.Error:
+                content_hash, cached = None, None
+            if cached is not None:
+                results[i] = ExtractionResult(cached, cached=True, content_hash=content_hash)
+                self._record(suffix, results[i])
+            else:
+                pending.append((i, path, suffix, content_hash))
+
+        items = [(str(p), s) for _, p, s, _ in pending]
+        for (i, path, suffix, content_hash), (text, error, seconds) in zip(
+                pending, self._map_extract(items, workers)):
+            results[i] = self._finish(path, suffix, content_hash, text, error, seconds)
+        return results
+
+    def _map_extract(self, items: List[tuple], workers: Optional[int]):
+        """_run_extractor ueber items, im Prozess-Pool wenn es sich lohnt."""
+        workers = min(workers or self.workers, os.cpu_count() or 1, len(items))
+        if workers <= 1 or len(items) < POOL_MIN_FILES:
+            for item in items:
+                yield _run_extractor(item)
+            return
+
+        import pickle
+        from concurrent.futures import ProcessPoolExecutor
+        done = 0
+        try:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                for result in pool.map(_run_extractor, items):
+                    done += 1
+                    yield result
+        except (OSError, RuntimeError, ImportError, pickle.PicklingError):
+            # Kein Prozess-Pool moeglich (eingeschraenkte Umgebung): sequentiell weiter
+            for item in items[done:]:
+                yield _run_extractor(item)
+
+    def close(self):
+        if self.cache is not None:
+            self.cache.close()
+            self.cache = None
+
+
+_services: Dict[str, TextExtractionService] = {}
+_services_lock = threading.Lock()
+
+
+def get_extraction_service(cache_path: Optional[Path] = None) -> TextExtractionService:
+    """Geteilter Service pro Cache-Datei (Default: system/data/extraction_cache.db)."""
+    path = Path(cache_path) if cache_path is not None else DEFAULT_CACHE_PATH
+    key = str(path)
+    with _services_lock:
+        service = _services.get(key)
+        if service is None:
+            service = TextExtractionService(path)
+            _services[key] = service
+        return service
+
+
+def extract_text(path, content_hash: Optional[str] = None) -> str:
+    """Kurzform: Text einer Datei ueber den geteilten Service."""
+    return get_extraction_service().extract(path, content_hash)
+
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description="BACH Extraktions-Cache")
+    parser.add_argument("paths", nargs="*", help="Dateien extrahieren (Metriken ausgeben)")
+    parser.add_argument("--stats", action="store_true", help="Cache-Inhalt pro Format")
+    parser.add_argument("--prune", action="store_true", help="Alte Versionen und verwaiste Pfade loeschen")
+    parser.add_argument("--workers", type=int, default=EXTRACT_WORKERS)
+    args = parser.parse_args()
+
+    service = get_extraction_service()
+    if service.cache is None:
+        return 1
+    if args.prune:
+        print(f"[OK] {service.cache.prune()} Eintraege entfernt")
+    if args.paths:
+        start = time.perf_counter()
+        results = service.extract_many(args.paths, workers=args.workers)
+        print(f"[OK] {len(results)} Dateien in {time.perf_counter() - start:.2f}s")
+        print(service.format_metrics())
+    if args.stats or not (args.prune or args.paths):
+        print(f"Cache: {service.cache.db_path} (Extraktor-Version {EXTRACTOR_VERSION})")
+        for s in service.cache.stats():
+            print(f"  {s['suffix']:<6} {s['entries']:>6} Eintraege  {s['chars']:>10} Zeichen  "
+                  f"{s['stored_bytes']:>10} Bytes  {s['avg_extract_ms']:>8.1f} ms/Datei")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -315,82 +315,14 @@ class FileAccessHook:
         return "\n\n".join(all_content)
 
     def _extract_text(self, filepath: Path) -> str:
-        """Extrahiert Text aus einer Datei."""
-        suffix = filepath.suffix.lower()
-
+        """Extrahiert Text aus einer Datei (geteilter extraction_service)."""
         try:
-            if suffix in {".txt", ".md"}:
-                return filepath.read_text(encoding="utf-8")
-
-            elif suffix == ".docx":
-                try:
-                    from docx import Document
-                    doc = Document(str(filepath))
-                    return "\n".join(p.text for p in doc.paragraphs if p.text.strip())
-                except ImportError:
-                    return f"[python-docx nicht installiert]"
-
-            elif suffix == ".pdf":
-                # pypdf (MIT) primaer
-                try:
-                    from pypdf import PdfReader
-                    reader = PdfReader(str(filepath))
-                    text = []
-                    for page in reader.pages:
-                        text.append(page.extract_text() or "")
-                    result = "\n".join(text)
-                    if result.strip():
-                        return result
-                except ImportError:
-                    pass
-                except Exception:
-                    pass
-                # Fallback: pdfplumber (MIT)
-                try:
-                    import pdfplumber
-                    text = []
-                    with pdfplumber.open(str(filepath)) as pdf:
-                        for page in pdf.pages:
-                            text.append(page.extract_text() or "")
-                    result = "\n".join(text)
-                    if result.strip():
-                        return result
-                except ImportError:
-                    pass
-                except Exception:
-                    pass
-                # Optional: PyMuPDF (AGPL)
-                try:
-                    import fitz  # PyMuPDF optional
-                    doc = fitz.open(str(filepath))
-                    text = []
-                    for page in doc:
-                        text.append(page.get_text())
-                    doc.close()
-                    return "\n".join(text)
-                except ImportError:
-                    return "[PDF-Extraktion: pypdf, pdfplumber und PyMuPDF nicht installiert]"
-
-            elif suffix in {".xlsx", ".xls"}:
-                try:
-                    import openpyxl
-                    wb = openpyxl.load_workbook(str(filepath), data_only=True)
-                    text = []
-                    for sheet in wb.worksheets:
-                        text.append(f"[Tabelle: {sheet.title}]")
-                        for row in sheet.iter_rows(values_only=True):
-                            cells = [str(c) if c is not None else "" for c in row]
-                            if any(cells):
-                                text.append(" | ".join(cells))
-                    wb.close()
-                    return "\n".join(text)
-                except ImportError:
-                    return f"[openpyxl nicht installiert]"
-
+            from .extraction_service import get_extraction_service
+        except ImportError:
+            from extraction_service import get_extraction_service
+        if filepath.suffix.lower() not in {".txt", ".md", ".docx", ".pdf", ".xlsx", ".xls"}:
             return ""
-
-        except Exception as e:
-            return f"[FEHLER beim Lesen: {e}]"
+        return get_extraction_service().extract(filepath)
 
     def list_available_files(self, klient_name: str) -> List[dict]:
         """
@@ -0,0 +1,445 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# SPDX-License-Identifier: MIT
+"""
+Copyright (c) 2026 BACH Contributors
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+
+"""
+BACH IMAP Sync - Inkrementeller UID-Abruf mit Header-Vorfilter
+==============================================================
+Ersetzt in FinancialMailService.fetch_emails das "SEARCH SINCE 90 Tage +
+RFC822 pro Mail" bei jedem Lauf.
+
+Ablauf pro Konto/Ordner:
+1. EXAMINE (read-only), UIDVALIDITY/UIDNEXT lesen
+2. Neue UIDs: `UID SEARCH UID <last+1>:*` - nur beim ersten Lauf oder
+   nach UIDVALIDITY-Wechsel `SINCE <initial_days>`
+3. Header gebuendelt per `UID FETCH <bereiche> BODY.PEEK[HEADER.FIELDS ...]`
+4. prefilter(header) entscheidet, ob der Body gebraucht wird
+5. Nur Kandidaten: `UID FETCH <bereiche> BODY.PEEK[]` (setzt kein \\Seen)
+6. Neuer Stand (UIDVALIDITY, letzte UID) steht in SyncStats; ueber
+   max_bodies hinausgehende und fehlgeschlagene Kandidaten bleiben fuer den
+   naechsten Lauf - eine UID, die max_attempts Laeufe in Folge scheitert,
+   wird uebersprungen (Warnung im Log), damit sie den Stand nicht dauerhaft
+   festhaelt
+7. commit() speichert ihn in mail_sync_state - erst nachdem der Aufrufer
+   die Ergebnisse persistiert hat, sonst gingen sie bei einem Fehler
+   dazwischen verloren
+
+ImapConnectionPool haelt eingeloggte Verbindungen pro (Host, Port, Login)
+und prueft sie vor der Wiederverwendung mit NOOP.
+
+Verwendung:
+    pool = ImapConnectionPool(connect_fn)
+    sync = IncrementalImapSync(SyncStateStore(db_path), pool)
+    results, stats = sync.sync(account, prefilter, process)
+    save(results)
+    sync.commit(account, stats)
+    pool.close_all()
+"""
+
+import email
+import imaplib
+import json
+import logging
+import re
+import sqlite3
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from email.message import Message
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+HEADER_FIELDS = "FROM SUBJECT DATE MESSAGE-ID"
+HEADER_CHUNK = 500      # UIDs pro Header-FETCH
+BODY_CHUNK = 20         # UIDs pro Body-FETCH
+MAX_ATTEMPTS = 3        # Laeufe, bevor eine stets fehlschlagende UID uebersprungen wird
+
+_UID_RE = re.compile(rb"UID (\d+)")
+_STATUS_RE = re.compile(rb"UIDVALIDITY (\d+)")
+
+STATE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS mail_sync_state (
+    account_id INTEGER NOT NULL,
+    folder TEXT NOT NULL,
+    uidvalidity INTEGER NOT NULL,
+    last_uid INTEGER NOT NULL DEFAULT 0,
+    failures TEXT NOT NULL DEFAULT '{}',
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (account_id, folder)
+)
+"""
+
+
+# ============ HILFSFUNKTIONEN ============
+
+def compress_uids(uids: Iterable[int]) -> str:
+    """UID-Liste als IMAP-Sequenz: [1,2,3,7,9,10] -> "1:3,7,9:10"."""
+    ranges = []
+    start = prev = None
+    for uid in sorted(set(uids)):
+        if start is None:
+            start = prev = uid
+        elif uid == prev + 1:
+            prev = uid
+        else:
+            ranges.append(f"{start}:{prev}" if start != prev else str(start))
+            start = prev = uid
+    if start is not None:
+        ranges.append(f"{start}:{prev}" if start != prev else str(start))
+    return ",".join(ranges)
+
+
+def parse_search(data) -> List[int]:
+    """UIDs aus einer UID-SEARCH-Antwort."""
+    uids = []
+    for line in data or []:
+        if line:
+            uids.extend(int(x) for x in line.split())
+    return uids
+
+
+def parse_fetch(data) -> List[Tuple[int, bytes]]:
+    """(uid, literal) aus einer UID-FETCH-Antwort.
+
+    Die UID steht meist vor dem Literal, manche Server senden sie danach
+    (dann im folgenden bytes-Element).
+    """
+    out = []
+    items = list(data or [])
+    for i, item in enumerate(items):
+        if not isinstance(item, tuple) or len(item) < 2:
+            continue
+        m = _UID_RE.search(item[0])
+        if m is None and i + 1 < len(items) and isinstance(items[i + 1], bytes):
+            m = _UID_RE.search(items[i + 1])
+        if m is not None:
+            out.append((int(m.group(1)), item[1]))
+    return out
+
+
+def _chunks(items: List[int], size: int):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+def _check(typ, data, what: str):
+    if typ != "OK":
+        raise imaplib.IMAP4.error(f"{what} fehlgeschlagen: {data!r}")
+
+
+# ============ SYNC-STAND ============
+
+class SyncStateStore:
+    """UIDVALIDITY, letzte verarbeitete UID und Fehlversuche pro Konto und Ordner."""
+
+    def __init__(self, db_path: Path):
+        self.db_path = Path(db_path)
+        conn = sqlite3.connect(self.db_path)
+        try:
+            conn.execute(STATE_SCHEMA)
+            columns = {r[1] for r in conn.execute("PRAGMA table_info(mail_sync_state)")}
+            if "failures" not in columns:
+                conn.execute("ALTER TABLE mail_sync_state "
+                             "ADD COLUMN failures TEXT NOT NULL DEFAULT '{}'")
+            conn.commit()
+        finally:
+            conn.close()
+
+    def load(self, account_id: int, folder: str) -> Optional[Tuple[int, int, Dict[int, int]]]:
+        """(UIDVALIDITY, letzte UID, {UID: Fehlversuche}) oder None."""
+        conn = sqlite3.connect(self.db_path)
+        try:
+            row = conn.execute(
+                "SELECT uidvalidity, last_uid, failures FROM mail_sync_state "
+                "WHERE account_id = ? AND folder = ?",
+                (account_id, folder)
+            ).fetchone()
+        finally:
+            conn.close()
+        if not row:
+            return None
+        failures = {int(uid): n for uid, n in json.loads(row[2] or "{}").items()}
+        return row[0], row[1], failures
+
+    def save(self, account_id: int, folder: str, uidvalidity: int, last_uid: int,
+             failures: Optional[Dict[int, int]] = None):
+        conn = sqlite3.connect(self.db_path)
+        try:
+            conn.execute(
+                "INSERT INTO mail_sync_state (account_id, folder, uidvalidity, last_uid, failures, "
+                "updated_at) VALUES (?, ?, ?, ?, ?, CURRENT_TIMESTAMP) "
+                "ON CONFLICT(account_id, folder) DO UPDATE SET uidvalidity = excluded.uidvalidity, "
+                "last_uid = excluded.last_uid, failures = excluded.failures, "
+                "updated_at = excluded.updated_at",
+                (account_id, folder, uidvalidity, last_uid, json.dumps(failures or {}))
+            )
+            conn.commit()
+        finally:
+            conn.close()
+
+    def reset(self, account_id: int, folder: Optional[str] = None):
+        """Erzwingt beim naechsten Lauf einen vollen Abruf (SINCE-Fenster)."""
+        conn = sqlite3.connect(self.db_path)
+        try:
+            if folder is None:
+                conn.execute("DELETE FROM mail_sync_state WHERE account_id = ?", (account_id,))
+            else:
+                conn.execute("DELETE FROM mail_sync_state WHERE account_id = ? AND folder = ?",
+                             (account_id, folder))
+            conn.commit()
+        finally:
+            conn.close()
+
+
+# ============ VERBINDUNGEN ============
+
+class ImapConnectionPool:
+    """Eingeloggte IMAP-Verbindungen pro (Host, Port, Login), wiederverwendbar."""
+
+    def __init__(self, connect: Callable[[Any], Optional[imaplib.IMAP4]]):
+        """
+        Args:
+            connect: Baut und loggt eine Verbindung fuer ein Konto ein (None bei Fehler)
+        """
+        self._connect = connect
+        self._conns: Dict[tuple, imaplib.IMAP4] = {}
+        self.opened = 0
+
+    @staticmethod
+    def key(account) -> tuple:
+        return (account.imap_host, account.imap_port, account.email.lower())
+
+    def get(self, account) -> Optional[imaplib.IMAP4]:
+        """Bestehende Verbindung (nach NOOP-Pruefung) oder neue."""
+        key = self.key(account)
+        conn = self._conns.get(key)
+        if conn is not None:
+            try:
+                if conn.noop()[0] == "OK":
+                    return conn
+            except (imaplib.IMAP4.error, OSError):
+                pass
+            self.discard(account)
+        conn = self._connect(account)
+        if conn is not None:
+            self._conns[key] = conn
+            self.opened += 1
+        return conn
+
+    def discard(self, account):
+        """Verbindung schliessen und vergessen (z.B. nach Abbruch)."""
+        conn = self._conns.pop(self.key(account), None)
+        if conn is not None:
+            try:
+                conn.logout()
+            except Exception:
+                pass
+
+    def close_all(self):
+        for conn in self._conns.values():
+            try:
+                conn.logout()
+            except Exception:
+                pass
+        self._conns.clear()
+
+    def __len__(self):
+        return len(self._conns)
+
+
+# ============ SYNC ============
+
+@dataclass
+class SyncStats:
+    """Kennzahlen eines Laufs."""
+    folder: str
+    uidvalidity: int = 0
+    full_resync: bool = False
+    new_messages: int = 0
+    header_candidates: int = 0
+    bodies_fetched: int = 0
+    deferred: int = 0
+    failed: int = 0
+    skipped: int = 0        # nach max_attempts Fehlversuchen aufgegeben
+    last_uid: int = 0       # neuer Stand, gespeichert erst durch commit()
+    failures: Dict[int, int] = field(default_factory=dict)   # UID -> Fehlversuche
+
+
+class IncrementalImapSync:
+    """UID-basierter Abruf: Header zuerst, Bodies nur fuer Kandidaten."""
+
+    def __init__(self, state: SyncStateStore, pool: ImapConnectionPool,
+                 folder: str = "INBOX", initial_days: int = 90, max_bodies: int = 50,
+                 max_attempts: int = MAX_ATTEMPTS):
+        """
+        Args:
+            state: Speicher fuer UIDVALIDITY/letzte UID
+            pool: IMAP-Verbindungen
+            folder: IMAP-Ordner
+            initial_days: SINCE-Fenster fuer den ersten Lauf
+            max_bodies: Max. Bodies pro Lauf (Rest im naechsten Lauf)
+            max_attempts: Fehlversuche, nach denen eine UID uebersprungen wird
+        """
+        self.state = state
+        self.pool = pool
+        self.folder = folder
+        self.initial_days = initial_days
+        self.max_bodies = max_bodies
+        self.max_attempts = max_attempts
+
+    def _mailbox_ids(self, conn) -> Tuple[int, Optional[int]]:
+        """(UIDVALIDITY, UIDNEXT) des gerade gewaehlten Ordners."""
+        uidvalidity = uidnext = None
+        _, data = conn.response("UIDVALIDITY")
+        if data and data[0]:
+            uidvalidity = int(data[0])
+        _, data = conn.response("UIDNEXT")
+        if data and data[0]:
+            uidnext = int(data[0])
+        if uidvalidity is None:
+            typ, data = conn.status(self.folder, "(UIDVALIDITY)")
+            _check(typ, data, "STATUS")
+            m = _STATUS_RE.search(data[0] or b"")
+            uidvalidity = int(m.group(1)) if m else 0
+        return uidvalidity, uidnext
+
+    def sync(self, account, prefilter: Callable[[Message], bool],
+             process: Callable[[Message], Any],
+             initial_days: Optional[int] = None) -> Tuple[List[Any], SyncStats]:
+        """
+        Ruft neue Nachrichten eines Kontos ab.
+
+        Args:
+            account: Konto mit id, email, imap_host, imap_port
+            prefilter: Bekommt nur die Header; True = Body laden
+            process: Bekommt die komplette Nachricht; Ergebnis != None wird gesammelt
+            initial_days: Ueberschreibt das SINCE-Fenster fuer den ersten Lauf
+
+        Der Stand wird nicht gespeichert: nach dem Persistieren der
+        Ergebnisse commit(account, stats) aufrufen.
+
+        Returns:
+            (Ergebnisse von process, SyncStats mit neuem last_uid)
+
+        Raises:
+            ConnectionError: Keine Verbindung moeglich
+            imaplib.IMAP4.error: Serverfehler (Stand bleibt unveraendert)
+        """
+        conn = self.pool.get(account)
+        if conn is None:
+            raise ConnectionError(f"Keine IMAP-Verbindung fuer {account.email}")
+        try:
+            return self._sync(conn, account, prefilter, process, initial_days)
+        except (imaplib.IMAP4.abort, OSError):
+            self.pool.discard(account)
+            raise
+
+    def _sync(self, conn, account, prefilter, process, initial_days):
+        stats = SyncStats(folder=self.folder)
+        typ, data = conn.select(self.folder, readonly=True)
+        _check(typ, data, f"EXAMINE {self.folder}")
+        uidvalidity, uidnext = self._mailbox_ids(conn)
+        stats.uidvalidity = uidvalidity
+
+        saved = self.state.load(account.id, self.folder)
+        attempts: Dict[int, int] = {}
+        if saved is not None and saved[0] == uidvalidity:
+            last_uid, attempts = saved[1], saved[2]
+            typ, data = conn.uid("SEARCH", None, f"UID {last_uid + 1}:*")
+        else:
+            # Erster Lauf oder Ordner neu nummeriert: Zeitfenster statt UIDs
+            last_uid = 0
+            stats.full_resync = True
+            days = initial_days if initial_days is not None else self.initial_days
+            since = (datetime.now() - timedelta(days=days)).strftime("%d-%b-%Y")
+            typ, data = conn.uid("SEARCH", None, f'(SINCE "{since}")')
+        _check(typ, data, "UID SEARCH")
+        # "n:*" liefert auch die hoechste UID, wenn sie kleiner als n ist
+        uids = sorted(u for u in parse_search(data) if u > last_uid)
+        stats.new_messages = len(uids)
+
+        candidates = []
+        for chunk in _chunks(uids, HEADER_CHUNK):
+            typ, data = conn.uid("FETCH", compress_uids(chunk),
+                                 f"(UID BODY.PEEK[HEADER.FIELDS ({HEADER_FIELDS})])")
+            _check(typ, data, "UID FETCH (Header)")
+            for uid, raw in parse_fetch(data):
+                if prefilter(email.message_from_bytes(raw)):
+                    candidates.append(uid)
+        candidates.sort()
+        stats.header_candidates = len(candidates)
+
+        todo, deferred = candidates[:self.max_bodies], candidates[self.max_bodies:]
+        results = []
+        done, failed = set(), []
+        for chunk in _chunks(todo, BODY_CHUNK):
+            typ, data = conn.uid("FETCH", compress_uids(chunk), "(UID BODY.PEEK[])")
+            _check(typ, data, "UID FETCH (Body)")
+            for uid, raw in parse_fetch(data):
+                stats.bodies_fetched += 1
+                done.add(uid)
+                try:
+                    result = process(email.message_from_bytes(raw))
+                except Exception as e:
+                    logger.error(f"Fehler bei UID {uid}: {e}")
+                    failed.append(uid)
+                    continue
+                if result is not None:
+                    results.append(result)
+
+        if deferred:
+            new_last = deferred[0] - 1
+            stats.deferred = len(deferred)
+        else:
+            new_last = max([last_uid] + uids[-1:] + ([uidnext - 1] if uidnext else []))
+        # Fehlgeschlagene oder vom Server nicht gelieferte Bodies: erneut versuchen
+        failed.extend(uid for uid in todo if uid not in done)
+        if failed:
+            attempts = {uid: attempts.get(uid, 0) + 1 for uid in failed}
+            retry = [uid for uid in failed if attempts[uid] < self.max_attempts]
+            stats.skipped = len(failed) - len(retry)
+            for uid in failed:
+                if attempts[uid] == self.max_attempts:
+                    logger.warning(f"IMAP-Sync {account.email}/{self.folder}: UID {uid} nach "
+                                   f"{self.max_attempts} Fehlversuchen uebersprungen")
+            if retry:
+                new_last = min(new_last, min(retry) - 1)
+            stats.failed = len(failed)
+            # Uebersprungene UIDs oberhalb des Stands kommen erneut, zaehlen aber weiter
+            stats.failures = {uid: n for uid, n in attempts.items() if uid > new_last}
+        stats.last_uid = new_last
+        logger.info(
+            f"IMAP-Sync {account.email}/{self.folder}: {stats.new_messages} neu, "
+            f"{stats.header_candidates} Kandidaten, {stats.bodies_fetched} Bodies"
+            + (f", {stats.deferred} im naechsten Lauf" if deferred else "")
+            + (f", {stats.failed} fehlgeschlagen" if failed else "")
+        )
+        return results, stats
+
+    def commit(self, account, stats: SyncStats):
+        """Speichert den Stand eines Laufs (nach dem Persistieren der Ergebnisse)."""
+        self.state.save(account.id, stats.folder, stats.uidvalidity, stats.last_uid,
+                        stats.failures)
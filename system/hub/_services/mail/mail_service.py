@@ -24,12 +24,12 @@ SOFTWARE.
 """
 
 """
-BACH Financial Mail Service v1.1
+BACH Financial Mail Service v1.2
 ================================
 Sammelt und extrahiert Finanzdaten aus E-Mails.
 
 Features:
-- IMAP-basierter E-Mail-Abruf
+- IMAP-basierter E-Mail-Abruf (inkrementell per UID, Header zuerst)
 - Gmail API mit OAuth2 Support
 - Pattern-Matching fuer Anbieter-Erkennung
 - PDF-Anhang-Extraktion
@@ -110,6 +110,12 @@ try:
 except ImportError:
     ACCOUNT_MANAGER_AVAILABLE = False
 
+# Inkrementeller IMAP-Abruf
+try:
+    from .imap_sync import ImapConnectionPool, IncrementalImapSync, SyncStateStore
+except ImportError:
+    from imap_sync import ImapConnectionPool, IncrementalImapSync, SyncStateStore
+
 
 # ============ DATENMODELLE ============
 
@@ -404,6 +410,27 @@ class ProviderMatcher:
         logger.debug(f"Kein Match fuer: {sender[:30]} | {subject[:50]}")
         return None
 
+    def may_match(self, sender: str, subject: str) -> bool:
+        """
+        Header-Vorfilter: Kann match() mit irgendeinem Body einen Provider liefern?
+
+        Notwendige Bedingung ohne Body: ein spezifischer Provider erreicht
+        ueber Sender/Betreff Score >= 5 (Body bringt hoechstens +2) oder ein
+        Catch-All-Provider passt auf den Betreff und seine Blacklist nicht.
+        False heisst: Body muss nicht geladen werden.
+        """
+        sender_lower = sender.lower()
+        subject_lower = subject.lower()
+        for provider in self.providers:
+            if '*' in provider.sender_patterns:
+                if any(p.lower() in subject_lower for p in provider.subject_patterns) \
+                        and self._passes_filters(provider, subject_lower, ""):
+                    return True
+            elif any(p.lower() in sender_lower for p in provider.sender_patterns) \
+                    or any(p.lower() in subject_lower for p in provider.subject_patterns):
+                return True
+        return False
+
     def _passes_filters(self, provider: Provider, subject_lower: str, body_lower: str) -> bool:
         """
         Prueft Blacklist und Body-Filter (wie UniversalInvoiceMail).
@@ -448,6 +475,18 @@ class FinancialMailService:
         self.config = self._load_config()
         self.matcher = ProviderMatcher()
         self._init_database()
+        # IMAP-Verbindungen bleiben ueber Konten und Laeufe offen (close() schliesst)
+        self.imap_pool = ImapConnectionPool(self.connect_imap)
+        self.imap_sync = IncrementalImapSync(
+            SyncStateStore(USER_DB), self.imap_pool,
+            initial_days=self.config.get('date_range_days', 90),
+            max_bodies=self.config.get('max_emails_per_run', 50)
+        )
+        self._pending_sync = {}   # account_id -> SyncStats bis commit_sync()
+
+    def close(self):
+        """Schliesst offene IMAP-Verbindungen."""
+        self.imap_pool.close_all()
 
     def _load_config(self) -> dict:
         """Laedt Service-Konfiguration"""
@@ -796,57 +835,57 @@ class FinancialMailService:
         )
 
     def fetch_emails(self, account: MailAccount, days: int = 90) -> List[FinancialEmail]:
-        """Ruft E-Mails ab - automatisch IMAP oder Gmail API"""
+        """Ruft E-Mails ab - automatisch IMAP oder Gmail API
+
+        IMAP laeuft inkrementell (imap_sync): nur UIDs seit dem letzten Lauf,
+        Header zuerst, Bodies nur fuer moegliche Provider-Treffer. `days` gilt
+        nur fuer den ersten Lauf bzw. nach einem UIDVALIDITY-Wechsel. Der neue
+        Stand wird erst mit commit_sync() gespeichert (nach save_to_database).
+        """
         # Gmail API bevorzugen wenn verfuegbar
         if account.provider == 'gmail_api' and account.use_oauth:
             return self.fetch_emails_gmail_api(account, days)
 
-        # Fallback auf IMAP
-        mail = self.connect_imap(account)
-        if not mail:
-            return []
-
-        results = []
-        since_date = (datetime.now() - timedelta(days=days)).strftime("%d-%b-%Y")
-
         try:
-            mail.select("INBOX")
-
-            # Suche nach E-Mails seit Datum
-            _, message_ids = mail.search(None, f'(SINCE "{since_date}")')
-
-            if not message_ids[0]:
-                logger.info("Keine neuen E-Mails gefunden")
-                return []
-
-            ids = message_ids[0].split()
-            logger.info(f"{len(ids)} E-Mails gefunden")
-
-            # Limit anwenden
-            max_emails = self.config.get('max_emails_per_run', 50)
-            ids = ids[-max_emails:]  # Neueste zuerst
-
-            for email_id in ids:
-                try:
-                    result = self._process_email(mail, email_id, account)
-                    if result:
-                        results.append(result)
-                except Exception as e:
-                    logger.error(f"Fehler bei E-Mail {email_id}: {e}")
-
-            mail.logout()
-
+            results, stats = self.imap_sync.sync(
+                account,
+                prefilter=self._header_prefilter,
+                process=lambda msg: self._parse_email(msg, account),
+                initial_days=days
+            )
+        except ConnectionError as e:
+            logger.error(str(e))
+            return []
         except Exception as e:
             logger.error(f"IMAP-Fehler: {e}")
+            return []
 
+        self._pending_sync[account.id] = stats
+        if not stats.new_messages:
+            logger.info("Keine neuen E-Mails gefunden")
         return results
 
+    def commit_sync(self, account: MailAccount):
+        """Speichert den IMAP-Stand des letzten fetch_emails() fuer das Konto."""
+        stats = self._pending_sync.pop(account.id, None)
+        if stats is not None:
+            self.imap_sync.commit(account, stats)
+
+    def _header_prefilter(self, headers) -> bool:
+        """True, wenn die Mail laut Headern ein Provider-Treffer sein kann."""
+        return self.matcher.may_match(
+            decode_header(headers.get("From", "")),
+            decode_header(headers.get("Subject", ""))
+        )
+
     def _process_email(self, mail, email_id, account: MailAccount) -> Optional[FinancialEmail]:
-        """Verarbeitet einzelne E-Mail mit Blacklist/Body-Filter Support"""
+        """Laedt und verarbeitet einzelne E-Mail (Sequenznummer)"""
         _, msg_data = mail.fetch(email_id, "(RFC822)")
         raw_email = msg_data[0][1]
-        msg = email.message_from_bytes(raw_email)
+        return self._parse_email(email.message_from_bytes(raw_email), account)
 
+    def _parse_email(self, msg, account: MailAccount) -> Optional[FinancialEmail]:
+        """Verarbeitet geladene E-Mail mit Blacklist/Body-Filter Support"""
         # Header dekodieren
         sender = decode_header(msg.get("From", ""))
         subject = decode_header(msg.get("Subject", ""))
@@ -940,11 +979,18 @@ class FinancialMailService:
         )
 
     def save_to_database(self, emails: List[FinancialEmail], account_id: int):
-        """Speichert erkannte E-Mails in Datenbank"""
+        """Speichert erkannte E-Mails in Datenbank
+
+        Raises:
+            RuntimeError: Einzelne E-Mails konnten nicht gespeichert werden
+                (die uebrigen sind committet; run_sync speichert dann keinen
+                neuen IMAP-Stand, INSERT OR IGNORE verhindert Duplikate)
+        """
         conn = sqlite3.connect(USER_DB)
         cursor = conn.cursor()
 
         saved = 0
+        errors = 0
         for fe in emails:
             try:
                 cursor.execute("""
@@ -976,10 +1022,13 @@ class FinancialMailService:
                     saved += 1
             except Exception as e:
                 logger.error(f"DB-Fehler: {e}")
+                errors += 1
 
         conn.commit()
         conn.close()
         logger.info(f"{saved} E-Mails gespeichert")
+        if errors:
+            raise RuntimeError(f"{errors} E-Mails nicht gespeichert")
         return saved
 
     def export_n8n_json(self, output_path: Optional[Path] = None) -> Path:
@@ -1113,6 +1162,8 @@ class FinancialMailService:
             try:
                 emails = self.fetch_emails(account, self.config.get('date_range_days', 90))
                 saved = self.save_to_database(emails, account.id)
+                # UID-Stand erst jetzt - schlaegt das Speichern fehl, kommen die Mails erneut
+                self.commit_sync(account)
 
                 total_processed += len(emails)
                 total_matched += saved
@@ -1133,6 +1184,7 @@ class FinancialMailService:
 
             except Exception as e:
                 logger.error(f"Sync-Fehler: {e}")
+                self._pending_sync.pop(account.id, None)   # Stand nicht vorruecken
                 conn = sqlite3.connect(USER_DB)
                 cursor = conn.cursor()
                 cursor.execute("""
@@ -1177,7 +1229,10 @@ def main():
     service = FinancialMailService()
 
     if args.command == 'sync':
-        result = service.run_sync(args.account)
+        try:
+            result = service.run_sync(args.account)
+        finally:
+            service.close()
         print(json.dumps(result, indent=2))
 
     elif args.command == 'export':
@@ -47,6 +47,19 @@ CREATE TABLE IF NOT EXISTS mail_sync_runs (
 
 CREATE INDEX IF NOT EXISTS idx_mail_sync_account ON mail_sync_runs(account_id);
 
+-- ============================================================
+-- MAIL_SYNC_STATE - Inkrementeller IMAP-Stand (imap_sync.py)
+-- ============================================================
+
+CREATE TABLE IF NOT EXISTS mail_sync_state (
+    account_id INTEGER NOT NULL,
+    folder TEXT NOT NULL,                  -- "INBOX"
+    uidvalidity INTEGER NOT NULL,          -- Wechsel = voller Neuabruf
+    last_uid INTEGER NOT NULL DEFAULT 0,   -- hoechste verarbeitete UID
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (account_id, folder)
+);
+
 -- ============================================================
 -- FINANCIAL_EMAILS - Erkannte Finanz-E-Mails
 -- ============================================================
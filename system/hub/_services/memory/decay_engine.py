@@ -0,0 +1,214 @@
+# -*- coding: utf-8 -*-
+# SPDX-License-Identifier: MIT
+"""
+Copyright (c) 2026 BACH Contributors
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+"""
+Decay Engine - Set-basierte Gewichts-Decay und Archivierung
+============================================================
+
+Gemeinsame Engine fuer memory_consolidation (ConsolidationHandler) und
+shared_memory_consolidation (SharedMemoryHandler).
+
+Statt alle aktiven Zeilen nach Python zu laden und pro Zeile ein UPDATE
+abzusetzen, rechnet jeder Pass als einzelnes SQL-Statement innerhalb einer
+Transaktion (BEGIN IMMEDIATE). Der Schreib-Lock wird damit nur fuer die
+Dauer weniger Statements gehalten.
+
+Usage:
+    from hub._services.memory.decay_engine import decay_step, archive_below
+
+    result = decay_step(conn, "shared_memory_consolidation")
+    print(result.summary())
+"""
+
+import math
+import sqlite3
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+
+from core.db import transaction
+
+CONSOLIDATION_TABLES = ("memory_consolidation", "shared_memory_consolidation")
+
+# Quell-Tabellen beim Vergessen: deaktivieren statt loeschen
+FORGET_DEACTIVATE_TABLES = ("memory_lessons", "memory_working")
+FORGET_DELETE_TABLES = ("memory_facts",)
+
+
+@dataclass
+class DecayResult:
+    """Ergebnis eines Decay-/Archiv-Passes."""
+    table: str
+    pass_name: str
+    touched: int = 0      # Zeilen mit neuem Gewicht
+    archived: int = 0     # Zeilen nach 'archived' verschoben
+    deleted: int = 0      # Zeilen nach 'deleted' verschoben
+    dry_run: bool = False
+
+    def summary(self) -> str:
+        prefix = "[DRY-RUN] " if self.dry_run else ""
+        return (f"{prefix}{self.table} {self.pass_name}: {self.touched} decayed, "
+                f"{self.archived} archiviert, {self.deleted} geloescht")
+
+
+def _check_table(table: str):
+    if table not in CONSOLIDATION_TABLES:
+        raise ValueError(f"Keine Consolidation-Tabelle: {table}")
+
+
+def _now(now: Optional[datetime]) -> str:
+    return (now or datetime.now()).isoformat()
+
+
+def decay_step(conn: sqlite3.Connection, table: str,
+               default_decay: float = 0.95, default_threshold: float = 0.1,
+               dry_run: bool = False, now: datetime = None) -> DecayResult:
+    """Ein Decay-Schritt: weight *= decay_rate, archiviere unter threshold.
+
+    Leere/0-Werte fallen wie bisher auf Defaults zurueck
+    (weight 1.0, decay_rate default_decay, threshold default_threshold).
+    """
+    _check_table(table)
+    result = DecayResult(table, "decay", dry_run=dry_run)
+    new_weight = (f"(COALESCE(NULLIF(weight, 0), 1.0) * "
+                  f"COALESCE(NULLIF(decay_rate, 0), {float(default_decay)}))")
+    below = f"{new_weight} < COALESCE(NULLIF(threshold, 0), {float(default_threshold)})"
+
+    if dry_run:
+        row = conn.execute(f"""
+            SELECT COUNT(*), COALESCE(SUM(CASE WHEN {below} THEN 1 ELSE 0 END), 0)
+            FROM {table} WHERE status = 'active'
+        """).fetchone()
+        result.touched, result.archived = row[0], row[1]
+        return result
+
+    ts = _now(now)
+    with transaction(conn):
+        # Archivieren zuerst (Bedingung nutzt noch das alte Gewicht)
+        cur = conn.execute(f"""
+            UPDATE {table}
+            SET weight = {new_weight}, status = 'archived', updated_at = ?
+            WHERE status = 'active' AND {below}
+        """, (ts,))
+        result.archived = cur.rowcount
+        cur = conn.execute(f"""
+            UPDATE {table}
+            SET weight = {new_weight}, updated_at = ?
+            WHERE status = 'active'
+        """, (ts,))
+        result.touched = cur.rowcount + result.archived
+    return result
+
+
+def decay_by_age(conn: sqlite3.Connection, table: str,
+                 dry_run: bool = False, now: datetime = None) -> DecayResult:
+    """Decay nach Alter: weight *= decay_rate ** tage_seit(last_accessed), clamp 0..1.
+
+    Zeilen ohne last_accessed oder mit weniger als einem Tag Abstand
+    bleiben unveraendert.
+    """
+    _check_table(table)
+    result = DecayResult(table, "decay_by_age", dry_run=dry_run)
+    ts = _now(now)
+    days = "CAST(julianday(?) - julianday(last_accessed) AS INTEGER)"
+    where = f"status = 'active' AND last_accessed IS NOT NULL AND {days} > 0"
+
+    if dry_run:
+        result.touched = conn.execute(
+            f"SELECT COUNT(*) FROM {table} WHERE {where}", (ts,)).fetchone()[0]
+        return result
+
+    # math.pow als SQL-Funktion: SQLite hat pow() nur mit MATH_FUNCTIONS
+    conn.create_function("bach_pow", 2, _safe_pow, deterministic=True)
+    with transaction(conn):
+        cur = conn.execute(f"""
+            UPDATE {table}
+            SET weight = MAX(0.0, MIN(1.0, weight * bach_pow(COALESCE(decay_rate, 0.95), {days}))),
+                updated_at = ?
+            WHERE {where}
+        """, (ts, ts, ts))
+        result.touched = cur.rowcount
+    return result
+
+
+def archive_below(conn: sqlite3.Connection, table: str, threshold: float,
+                  dry_run: bool = False, now: datetime = None) -> DecayResult:
+    """Archiviert alle aktiven Zeilen mit weight < threshold."""
+    _check_table(table)
+    result = DecayResult(table, "archive", dry_run=dry_run)
+    if dry_run:
+        result.archived = conn.execute(
+            f"SELECT COUNT(*) FROM {table} WHERE status = 'active' AND weight < ?",
+            (threshold,)).fetchone()[0]
+        return result
+
+    with transaction(conn):
+        cur = conn.execute(f"""
+            UPDATE {table} SET status = 'archived', updated_at = ?
+            WHERE status = 'active' AND weight < ?
+        """, (_now(now), threshold))
+        result.archived = cur.rowcount
+    return result
+
+
+def forget_below(conn: sqlite3.Connection, threshold: float,
+                 dry_run: bool = False, now: datetime = None) -> DecayResult:
+    """Vergisst memory_consolidation-Eintraege mit weight < threshold.
+
+    Markiert sie als 'deleted', deaktiviert Lessons/Working-Eintraege und
+    loescht Facts in der Quell-Tabelle - alles set-basiert in einer Transaktion.
+    """
+    table = "memory_consolidation"
+    result = DecayResult(table, "forget", dry_run=dry_run)
+    selector = f"SELECT source_id FROM {table} WHERE status = 'active' AND weight < ? AND source_table = ?"
+
+    if dry_run:
+        result.deleted = conn.execute(
+            f"SELECT COUNT(*) FROM {table} WHERE status = 'active' AND weight < ?",
+            (threshold,)).fetchone()[0]
+        return result
+
+    ts = _now(now)
+    with transaction(conn):
+        for source in FORGET_DEACTIVATE_TABLES:
+            conn.execute(f"UPDATE {source} SET is_active = 0, updated_at = ? "
+                         f"WHERE id IN ({selector})", (ts, threshold, source))
+        for source in FORGET_DELETE_TABLES:
+            conn.execute(f"DELETE FROM {source} WHERE id IN ({selector})",
+                         (threshold, source))
+        cur = conn.execute(f"""
+            UPDATE {table} SET status = 'deleted', updated_at = ?
+            WHERE status = 'active' AND weight < ?
+        """, (ts, threshold))
+        result.deleted = cur.rowcount
+    return result
+
+
+def _safe_pow(base, exp):
+    if base is None or exp is None:
+        return None
+    try:
+        return math.pow(base, exp)
+    except (OverflowError, ValueError):
+        return 0.0
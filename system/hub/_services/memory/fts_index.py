@@ -0,0 +1,389 @@
+# -*- coding: utf-8 -*-
+# SPDX-License-Identifier: MIT
+"""
+Copyright (c) 2026 BACH Contributors
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+
+"""
+Memory FTS - BM25-Volltextindex fuer Memory, Lessons und Kontakte
+=================================================================
+
+FTS5-Tabellen (<tabelle>_fts, rowid = id der Quelle) ueber memory_working,
+memory_facts, memory_lessons und assistant_contacts. Trigger (AFTER
+INSERT/DELETE/UPDATE OF <spalten>) halten den Index synchron.
+ensure_index() legt fehlende Tabellen/Trigger an und fuellt den Index
+dann einmal aus der Quelltabelle.
+
+Der Index speichert den Text selbst (kein content='...'): INSERT OR
+REPLACE (consolidation, changeset, backup_store, db_sync) loescht die
+alte Zeile ohne DELETE-Trigger, solange recursive_triggers aus ist. Der
+INSERT-Trigger entfernt deshalb zuerst den alten Eintrag zur rowid; bei
+externem Content waeren dafuer die alten Werte noetig und der Index
+danach korrupt. Verwaiste Eintraege (REPLACE ueber einen UNIQUE-Key mit
+neuer id) werden von den Abfragen per Join ausgefiltert und bei
+rebuild() entfernt.
+
+Abfragen liefern die Top-k nach bm25, optional verstaerkt durch Gewicht
+und letzten Zugriff aus memory_consolidation. Suchsyntax:
+    wort          Praefix-Suche (wort*)
+    "zwei worte"  Phrase
+
+Usage:
+    from hub._services.memory.fts_index import ensure_index, search
+
+    if ensure_index(conn):
+        hits = search(conn, "backup fehler", ("working", "fact", "lesson"), limit=15)
+
+    python -m hub._services.memory.fts_index --bench [--rows 100000]
+"""
+
+import re
+import sqlite3
+import threading
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Boost aus memory_consolidation: Faktor (1 + WEIGHT_BOOST * weight) und
+# (1 + RECENCY_BOOST / (1 + alter_tage / RECENCY_DAYS))
+WEIGHT_BOOST = 1.0
+RECENCY_BOOST = 0.5
+RECENCY_DAYS = 30.0
+
+
+@dataclass(frozen=True)
+class Source:
+    """Quelltabelle mit indexierten Spalten."""
+    table: str
+    columns: Tuple[str, ...]
+    display: str                 # SQL-Ausdruck fuer den Anzeigetext (Alias t)
+    active: Optional[str] = None  # Zusatzfilter (Alias t)
+    time_column: Optional[str] = "COALESCE(t.updated_at, t.created_at)"
+    consolidation: bool = True   # Boost aus memory_consolidation
+
+    @property
+    def fts(self) -> str:
+        return f"{self.table}_fts"
+
+
+SOURCES: Dict[str, Source] = {
+    "working": Source("memory_working", ("content", "tags"), "t.content",
+                      active="t.is_active = 1"),
+    "fact": Source("memory_facts", ("category", "key", "value"), "t.key || ': ' || t.value"),
+    "lesson": Source("memory_lessons", ("title", "problem", "solution", "trigger_words"),
+                     "t.title || ': ' || t.solution", active="t.is_active = 1"),
+    "contact": Source("assistant_contacts",
+                      ("name", "email", "phone", "mobile", "address", "notes",
+                       "company", "position", "tags"),
+                      "t.name", active="t.is_active = 1", consolidation=False),
+}
+
+
+@dataclass
+class Hit:
+    """Ein Suchtreffer."""
+    source: str
+    id: int
+    text: str
+    bm25: float
+    score: float   # groesser = relevanter (bm25 inkl. Boost, positiv)
+
+
+def _fts_sql(src: Source) -> str:
+    cols = ", ".join(src.columns)
+    new_vals = ", ".join(f"new.{c}" for c in src.columns)
+    fts, table = src.fts, src.table
+    return f"""
+CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5(
+    {cols},
+    tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+);
+CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table} BEGIN
+    DELETE FROM {fts} WHERE rowid = new.id;
+    INSERT INTO {fts}(rowid, {cols}) VALUES (new.id, {new_vals});
+END;
+CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table} BEGIN
+    DELETE FROM {fts} WHERE rowid = old.id;
+END;
+CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF {cols} ON {table} BEGIN
+    DELETE FROM {fts} WHERE rowid = old.id;
+    INSERT INTO {fts}(rowid, {cols}) VALUES (new.id, {new_vals});
+END;
+"""
+
+
+_ensured: set = set()
+_ensure_lock = threading.Lock()
+
+
+def _db_key(conn: sqlite3.Connection) -> str:
+    row = conn.execute("PRAGMA database_list").fetchone()
+    return row[2] or f":memory:{id(conn)}"
+
+
+def ensure_index(conn: sqlite3.Connection, force: bool = False) -> bool:
+    """Legt fehlende FTS-Tabellen/Trigger an und baut sie dann auf.
+
+    Pro DB und Prozess nur einmal geprueft (force=True prueft erneut).
+
+    Returns:
+        True wenn der Index nutzbar ist (False z.B. ohne FTS5 oder read-only)
+    """
+    key = _db_key(conn)
+    if key in _ensured and not force:
+        return True
+    with _ensure_lock:
+        try:
+            objects = {name: sql or "" for name, sql in conn.execute(
+                "SELECT name, sql FROM sqlite_master WHERE type IN ('table', 'trigger')")}
+            for src in SOURCES.values():
+                if src.table not in objects:
+                    continue
+                fts = src.fts
+                triggers = (f"{fts}_ai", f"{fts}_ad", f"{fts}_au")
+                if "content='" in objects.get(fts, ""):
+                    # Alter externer-Content-Index: nicht REPLACE-fest, neu anlegen
+                    for name in triggers:
+                        conn.execute(f"DROP TRIGGER IF EXISTS {name}")
+                    conn.execute(f"DROP TABLE {fts}")
+                    objects.pop(fts)
+                if fts in objects and all(name in objects for name in triggers):
+                    continue
+                conn.executescript(_fts_sql(src))
+                _fill(conn, src)
+            conn.commit()
+        except sqlite3.Error:
+            return False
+        _ensured.add(key)
+    return True
+
+
+def rebuild(conn: sqlite3.Connection, sources: Iterable[str] = tuple(SOURCES)) -> None:
+    """Baut die Indizes komplett aus den Quelltabellen neu auf."""
+    ensure_index(conn, force=True)
+    for name in sources:
+        _fill(conn, SOURCES[name])
+    conn.commit()
+
+
+def _fill(conn: sqlite3.Connection, src: Source) -> None:
+    """Index einer Quelle leeren und komplett aus der Tabelle fuellen."""
+    cols = ", ".join(src.columns)
+    conn.execute(f"DELETE FROM {src.fts}")
+    conn.execute(f"INSERT INTO {src.fts}(rowid, {cols}) SELECT id, {cols} FROM {src.table}")
+
+
+_TOKEN_RE = re.compile(r'"([^"]*)"|(\S+)')
+_WORD_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def build_match(query: str, mode: str = "and") -> str:
+    """Suchtext -> FTS5-Ausdruck.
+
+    Woerter werden zur Praefix-Suche ("wort"*), "..." bleibt Phrase.
+    mode="or" verknuepft alle Teile mit OR (bm25 bevorzugt mehr Treffer).
+    """
+    parts = []
+    for phrase, word in _TOKEN_RE.findall(query):
+        if phrase:
+            words = _WORD_RE.findall(phrase)
+            if words:
+                parts.append('"' + " ".join(words) + '"')
+        else:
+            parts.extend(f'"{w}"*' for w in _WORD_RE.findall(word))
+    return (" OR " if mode == "or" else " ").join(parts)
+
+
+def _query_sql(src: Source, boost: bool) -> str:
+    where = f"AND {src.active}" if src.active else ""
+    join = ""
+    factor = "1.0"
+    if boost and src.consolidation:
+        join = (f"LEFT JOIN memory_consolidation mc "
+                f"ON mc.source_table = '{src.table}' AND mc.source_id = t.id")
+        last = f"COALESCE(mc.last_accessed, {src.time_column})" if src.time_column else "mc.last_accessed"
+        factor = (f"(1.0 + :weight_boost * COALESCE(mc.weight, 0.5)) * "
+                  f"(1.0 + :recency_boost / (1.0 + MAX(0.0, COALESCE("
+                  f"julianday('now') - julianday({last}), 3650.0)) / :recency_days))")
+    return f"""
+        SELECT t.id, {src.display} AS text, bm25({src.fts}) AS bm25,
+               -bm25({src.fts}) * {factor} AS score
+        FROM {src.fts} JOIN {src.table} t ON t.id = {src.fts}.rowid
+        {join}
+        WHERE {src.fts} MATCH :match {where}
+        ORDER BY score DESC
+        LIMIT :limit
+    """
+
+
+def search(conn: sqlite3.Connection, query: str, sources: Iterable[str] = ("working", "fact", "lesson"),
+           limit: int = 15, mode: str = "and", boost: bool = True) -> List[Hit]:
+    """Top-k Treffer ueber mehrere Quellen, nach Score absteigend.
+
+    Raises:
+        sqlite3.OperationalError: FTS5 fehlt oder Index nicht angelegt
+    """
+    match = build_match(query, mode)
+    if not match:
+        return []
+    params = {"match": match, "limit": limit, "weight_boost": WEIGHT_BOOST,
+              "recency_boost": RECENCY_BOOST, "recency_days": RECENCY_DAYS}
+    hits: List[Hit] = []
+    for name in sources:
+        src = SOURCES[name]
+        use_boost = boost and src.consolidation and _has_table(conn, "memory_consolidation")
+        for row in conn.execute(_query_sql(src, use_boost), params):
+            hits.append(Hit(name, row[0], row[1] or "", row[2], row[3]))
+    hits.sort(key=lambda h: h.score, reverse=True)
+    return hits[:limit]
+
+
+def count(conn: sqlite3.Connection, query: str, sources: Iterable[str] = ("working", "fact", "lesson"),
+          mode: str = "and") -> int:
+    """Anzahl aller Treffer (ohne Ranking)."""
+    match = build_match(query, mode)
+    if not match:
+        return 0
+    total = 0
+    for name in sources:
+        src = SOURCES[name]
+        where = f"AND {src.active}" if src.active else ""
+        total += conn.execute(f"""
+            SELECT COUNT(*) FROM {src.table} t
+            WHERE t.id IN (SELECT rowid FROM {src.fts} WHERE {src.fts} MATCH ?) {where}
+        """, (match,)).fetchone()[0]
+    return total
+
+
+def _has_table(conn: sqlite3.Connection, table: str) -> bool:
+    return conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?",
+                        (table,)).fetchone() is not None
+
+
+# ═══════════════════════════════════════════════════════════════
+# BENCHMARK
+# ═══════════════════════════════════════════════════════════════
+
+def _legacy_search(conn: sqlite3.Connection, query: str) -> int:
+    """Bisheriges MemoryHandler._search: alles laden, in Python bewerten."""
+    keywords = query.lower().split()
+    rows = conn.execute("SELECT content FROM memory_working WHERE is_active = 1").fetchall()
+    rows += conn.execute("SELECT key || ': ' || value FROM memory_facts").fetchall()
+    rows += conn.execute("SELECT title || ': ' || solution FROM memory_lessons WHERE is_active = 1").fetchall()
+    scored = []
+    for (content,) in rows:
+        text = content.lower()
+        score = sum(1 for kw in keywords if kw in text)
+        if score:
+            scored.append((score, content))
+    scored.sort(key=lambda x: x[0], reverse=True)
+    return len(scored)
+
+
+def run_benchmark(rows: int = 100000, queries: int = 20, seed: int = 42) -> dict:
+    """Vergleicht Voll-Scan mit FTS5-Top-k auf synthetischen Memory-Tabellen."""
+    import random
+    import time
+    rng = random.Random(seed)
+    vocab = ["".join(rng.choice("abcdefghiklmnoprstuw") for _ in range(rng.randint(4, 10)))
+             for _ in range(5000)]
+    conn = sqlite3.connect(":memory:")
+    conn.executescript("""
+        CREATE TABLE memory_working (id INTEGER PRIMARY KEY, type TEXT, content TEXT NOT NULL,
+            tags TEXT, created_at TEXT, updated_at TEXT, is_active INTEGER DEFAULT 1);
+        CREATE TABLE memory_facts (id INTEGER PRIMARY KEY, category TEXT, key TEXT, value TEXT,
+            created_at TEXT, updated_at TEXT);
+        CREATE TABLE memory_lessons (id INTEGER PRIMARY KEY, category TEXT, title TEXT,
+            problem TEXT, solution TEXT, trigger_words TEXT, is_active INTEGER DEFAULT 1,
+            created_at TEXT, updated_at TEXT);
+        CREATE TABLE memory_consolidation (id INTEGER PRIMARY KEY, source_table TEXT,
+            source_id INTEGER, last_accessed TEXT, weight REAL DEFAULT 0.5,
+            UNIQUE(source_table, source_id));
+    """)
+
+    def text(n):
+        return " ".join(rng.choice(vocab) for _ in range(n))
+    third = rows // 3
+    conn.executemany("INSERT INTO memory_working (type, content, created_at) VALUES ('note', ?, '2026-01-01')",
+                     [(text(20),) for _ in range(third)])
+    conn.executemany("INSERT INTO memory_facts (category, key, value) VALUES ('project', ?, ?)",
+                     [(f"key{i}", text(10)) for i in range(third)])
+    conn.executemany("INSERT INTO memory_lessons (category, title, problem, solution) VALUES ('bug', ?, ?, ?)",
+                     [(text(5), text(15), text(20)) for _ in range(rows - 2 * third)])
+    conn.executemany("INSERT INTO memory_consolidation (source_table, source_id, weight) VALUES (?, ?, ?)",
+                     [("memory_lessons", i, rng.random()) for i in range(1, rows // 10)])
+    conn.commit()
+
+    t0 = time.perf_counter()
+    ensure_index(conn)
+    t_build = time.perf_counter() - t0
+
+    terms = [f"{rng.choice(vocab)} {rng.choice(vocab)}" for _ in range(queries)]
+    t0 = time.perf_counter()
+    for q in terms:
+        _legacy_search(conn, q)
+    t_legacy = (time.perf_counter() - t0) / queries
+
+    t0 = time.perf_counter()
+    for q in terms:
+        search(conn, q, limit=15, mode="or")
+    t_fts = (time.perf_counter() - t0) / queries
+
+    t0 = time.perf_counter()
+    for q in terms:
+        conn.execute("INSERT INTO memory_working (type, content) VALUES ('note', ?)", (q,))
+    conn.commit()
+    t_insert = (time.perf_counter() - t0) / queries
+    synced = all(search(conn, f'"{q}"', ("working",), limit=1) for q in terms)
+    conn.close()
+
+    return {
+        "rows": rows,
+        "build_s": round(t_build, 2),
+        "legacy_ms": round(t_legacy * 1000, 1),
+        "fts_ms": round(t_fts * 1000, 2),
+        "insert_ms": round(t_insert * 1000, 3),
+        "synced": synced,
+    }
+
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description="BACH Memory FTS")
+    parser.add_argument("--bench", action="store_true", help="Micro-Benchmark ausfuehren")
+    parser.add_argument("--rows", type=int, default=100000)
+    args = parser.parse_args()
+    if not args.bench:
+        parser.print_help()
+        return 0
+    r = run_benchmark(args.rows)
+    print(f"[BENCH] {r['rows']} Memory-Zeilen")
+    print(f"  Index-Aufbau:           {r['build_s']:8.2f} s")
+    print(f"  Voll-Scan pro Suche:    {r['legacy_ms']:8.1f} ms")
+    print(f"  FTS5 Top-15 pro Suche:  {r['fts_ms']:8.2f} ms")
+    print(f"  INSERT inkl. Trigger:   {r['insert_ms']:8.3f} ms")
+    print(f"  Index synchron:         {r['synced']}")
+    return 0 if r['synced'] else 1
+
+
+if __name__ == "__main__":
+    import sys
+    sys.exit(main())
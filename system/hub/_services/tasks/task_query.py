@@ -0,0 +1,223 @@
+# -*- coding: utf-8 -*-
+# SPDX-License-Identifier: MIT
+"""
+Copyright (c) 2026 BACH Contributors
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+
+"""
+Task Query - Gemeinsame Listen-Abfrage fuer GUI und `bach task list`
+======================================================================
+
+Vorher lud /api/tasks jede Zeile per SELECT * (inkl. image_data mit
+Screenshots) nur um das Feld danach zu verwerfen, und pruefte jede
+Abhaengigkeit mit einer eigenen COUNT-Query (N+1).
+
+Jetzt:
+- Explizite Spaltenliste, image_data wird nie gelesen
+- has_image wird in SQL berechnet
+- Blockiert-Status aller Tasks einer Seite mit einer einzigen Query
+- Keyset-Pagination ueber (priority, id) statt nur LIMIT
+
+Usage:
+    from hub._services.tasks.task_query import list_tasks
+
+    page = list_tasks(conn, status="pending", limit=100)
+    more = list_tasks(conn, status="pending", limit=100, cursor=page.next_cursor)
+"""
+
+import sqlite3
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Listen-Spalten (ohne image_data); fehlende Spalten in alten DBs werden uebersprungen
+TASK_LIST_COLUMNS = (
+    "id", "title", "description", "category", "priority", "tags", "status",
+    "delegated_to", "created_at", "started_at", "completed_at", "updated_at",
+    "modified_by", "depends_on", "created_by", "assigned_to", "project", "source",
+)
+
+HAS_IMAGE_SQL = "(t.image_data IS NOT NULL AND t.image_data != '') AS has_image"
+
+# SQLite-Limit fuer Host-Parameter bleibt weit entfernt
+_IN_CHUNK = 500
+
+
+@dataclass
+class TaskPage:
+    """Eine Seite der Task-Liste."""
+    tasks: List[dict] = field(default_factory=list)
+    next_cursor: Optional[str] = None
+
+
+def parse_dep_ids(depends_on) -> List[int]:
+    """'3, 7,x' -> [3, 7]; ungueltige Eintraege werden ignoriert."""
+    if not depends_on:
+        return []
+    ids = []
+    for part in str(depends_on).split(","):
+        part = part.strip()
+        if part.isdigit():
+            ids.append(int(part))
+    return ids
+
+
+def encode_cursor(task: dict) -> str:
+    """Cursor 'id:priority' des letzten Tasks einer Seite (priority NULL -> 'id')."""
+    if task.get("priority") is None:
+        return str(task["id"])
+    return f"{task['id']}:{task['priority']}"
+
+
+def decode_cursor(cursor: str) -> Tuple[int, Optional[str]]:
+    """Gegenstueck zu encode_cursor. ValueError bei ungueltigem Cursor."""
+    task_id, sep, priority = str(cursor).partition(":")
+    return int(task_id), (priority if sep else None)
+
+
+def _available_columns(conn: sqlite3.Connection) -> set:
+    return {r[1] for r in conn.execute("PRAGMA table_info(tasks)").fetchall()}
+
+
+def _keyset_condition(cursor: str, newest_first: bool) -> Tuple[str, list]:
+    """WHERE-Teil fuer 'nach dem Cursor' bei ORDER BY priority, id [DESC].
+
+    NULL-Prioritaeten sortieren in SQLite zuerst.
+    """
+    last_id, last_priority = decode_cursor(cursor)
+    id_op = "<" if newest_first else ">"
+    if last_priority is None:
+        return f"(priority IS NOT NULL OR id {id_op} ?)", [last_id]
+    return (f"(priority > ? OR (priority = ? AND id {id_op} ?))",
+            [last_priority, last_priority, last_id])
+
+
+def resolve_blocked(conn: sqlite3.Connection, tasks: Iterable[dict]) -> None:
+    """Setzt is_blocked_by_dep fuer alle Tasks mit einer Query pro 500 Abhaengigkeiten.
+
+    Blockiert ist ein Task, wenn mindestens eine existierende Abhaengigkeit
+    nicht 'done' ist (wie die bisherige COUNT-Pruefung).
+    """
+    tasks = list(tasks)
+    deps: Dict[int, List[int]] = {}
+    all_ids = set()
+    for task in tasks:
+        ids = parse_dep_ids(task.get("depends_on"))
+        deps[id(task)] = ids
+        all_ids.update(ids)
+
+    unfinished = set()
+    all_ids = sorted(all_ids)
+    for i in range(0, len(all_ids), _IN_CHUNK):
+        chunk = all_ids[i:i + _IN_CHUNK]
+        rows = conn.execute(
+            f"SELECT id FROM tasks WHERE id IN ({','.join('?' * len(chunk))}) AND status != 'done'",
+            chunk,
+        ).fetchall()
+        unfinished.update(r[0] for r in rows)
+
+    for task in tasks:
+        task["is_blocked_by_dep"] = any(d in unfinished for d in deps[id(task)])
+
+
+def list_tasks(conn: sqlite3.Connection,
+               status: Optional[str] = None,
+               category: Optional[str] = None,
+               assigned_to: Optional[str] = None,
+               partner: Optional[str] = None,
+               unassigned: bool = False,
+               title_contains: Optional[str] = None,
+               limit: Optional[int] = 100,
+               cursor: Optional[str] = None,
+               newest_first: bool = False) -> TaskPage:
+    """Task-Liste mit Filtern, has_image und is_blocked_by_dep.
+
+    Args:
+        conn: Offene Verbindung zur bach.db
+        status: Exakter Status (None = alle)
+        category: Exakte Kategorie
+        assigned_to: Exakter assigned_to-Wert
+        partner: assigned_to ODER delegated_to
+        unassigned: Nur Tasks ohne assigned_to und delegated_to
+        title_contains: LIKE-Filter auf title
+        limit: Seitengroesse (None = alle)
+        cursor: next_cursor der vorherigen Seite
+        newest_first: ORDER BY priority, id DESC statt priority, id
+
+    Returns:
+        TaskPage; next_cursor ist None auf der letzten Seite
+    """
+    available = _available_columns(conn)
+    if not available:
+        raise sqlite3.OperationalError("no such table: tasks")
+    columns = [c for c in TASK_LIST_COLUMNS if c in available]
+
+    conditions, params = [], []
+    if status:
+        conditions.append("status = ?")
+        params.append(status)
+    if category:
+        conditions.append("category = ?")
+        params.append(category)
+    if assigned_to:
+        conditions.append("assigned_to = ?")
+        params.append(assigned_to)
+    if partner:
+        conditions.append("(assigned_to = ? OR delegated_to = ?)")
+        params.extend([partner, partner])
+    if unassigned:
+        conditions.append("(assigned_to IS NULL OR assigned_to = '') "
+                          "AND (delegated_to IS NULL OR delegated_to = '')")
+    if title_contains:
+        conditions.append("title LIKE ?")
+        params.append(f"%{title_contains}%")
+    if cursor:
+        cond, cond_params = _keyset_condition(cursor, newest_first)
+        conditions.append(cond)
+        params.extend(cond_params)
+
+    order = f"priority, id{' DESC' if newest_first else ''}"
+    sql = (f"SELECT {', '.join(columns)} FROM tasks"
+           f" WHERE {' AND '.join(conditions) if conditions else '1=1'}"
+           f" ORDER BY {order}")
+    if limit is not None:
+        sql += " LIMIT ?"
+        params.append(int(limit) + 1)
+    if "image_data" in available:
+        # Erst nach LIMIT per id nachschlagen - sonst liest der Sortierer image_data aller Treffer
+        sql = (f"SELECT page.*, {HAS_IMAGE_SQL} FROM ({sql}) AS page"
+               f" JOIN tasks t ON t.id = page.id"
+               f" ORDER BY page.priority, page.id{' DESC' if newest_first else ''}")
+
+    cur = conn.execute(sql, params)
+    names = [d[0] for d in cur.description]
+    tasks = [dict(zip(names, row)) for row in cur.fetchall()]
+
+    next_cursor = None
+    if limit is not None and len(tasks) > limit:
+        tasks = tasks[:limit]
+        next_cursor = encode_cursor(tasks[-1]) if tasks else None
+
+    for task in tasks:
+        if "has_image" in task:
+            task["has_image"] = bool(task["has_image"])
+    resolve_blocked(conn, tasks)
+    return TaskPage(tasks=tasks, next_cursor=next_cursor)
@@ -0,0 +1,358 @@
+# -*- coding: utf-8 -*-
+# SPDX-License-Identifier: MIT
+"""
+Copyright (c) 2026 BACH Contributors
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+
+"""
+ClassificationStage - Vorstufe vor dem Mistral-Classifier
+==========================================================
+Schuetzt den Watcher davor, bei Event-Bursts pro Event auf die LLM-Latenz
+zu warten:
+
+1. RulePrefilter: deterministische Regeln (leere Nachrichten, /start,
+   Gruesse/Kurzwoerter, konfigurierbare Keyword-Regeln) - ohne Modell
+2. ClassificationCache: LRU + TTL auf dem normalisierten Event-Inhalt
+3. Micro-Batching: die restlichen Events eines Poll-Zyklus gehen als ein
+   Prompt an MistralClassifier.classify_batch()
+4. ClassificationMetrics: Treffer-Quote und Modell-Latenz, als JSON
+   persistiert und von watcher_daemon.py --status angezeigt
+
+Konfiguration (config.json, Abschnitt "classification"):
+    prefilter, batch_size, cache_size, cache_ttl_seconds, rules
+
+Version: 1.0.0
+Erstellt: 2026-10-17
+"""
+
+import json
+import re
+import threading
+import time
+from collections import OrderedDict, deque
+from dataclasses import replace
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+try:
+    from .classifier import ClassificationResult, EventAction, WatcherEvent
+except ImportError:
+    from classifier import ClassificationResult, EventAction, WatcherEvent
+
+
+BATCH_SIZE = 8              # Max. Events pro Modell-Call
+CACHE_SIZE = 512            # Max. Eintraege im LRU-Cache
+CACHE_TTL_SECONDS = 3600    # Gueltigkeit eines gecachten Ergebnisses
+LATENCY_WINDOW = 200        # Anzahl Modell-Calls fuer p50/p95
+
+STATS_FILE = Path(__file__).parent / "classifier_stats.json"
+
+ACTIONS = {a.name: a for a in EventAction}
+
+_PUNCT_RE = re.compile(r"[^\w\s/]+", re.UNICODE)
+_SPACE_RE = re.compile(r"\s+")
+
+
+def normalize_text(text: str) -> str:
+    """Kleinschreibung, ohne Satzzeichen/Emojis, Whitespace zusammengefasst."""
+    text = _PUNCT_RE.sub(" ", (text or "").lower())
+    return _SPACE_RE.sub(" ", text).strip()
+
+
+def event_key(event: WatcherEvent) -> str:
+    """Cache-Schluessel: Quelle, Typ und normalisierter Inhalt (ohne Absender)."""
+    return f"{event.source}|{event.event_type}|{normalize_text(event.content[:500])}"
+
+
+# ============ REGEL-VORFILTER ============
+
+class RulePrefilter:
+    """
+    Loest eindeutige Events ohne Modell auf.
+
+    Eingebaut (nur Connector-Nachrichten, entspricht prompts/classify_event.txt):
+    - leere Nachricht, /start-Kommando -> IGNORE
+    - reiner Gruss / Kurzwort (hi, danke, ok, ...) -> RESPOND_DIRECT mit fester Antwort
+
+    Zusaetzliche Regeln aus der Config:
+        {"source": "filesystem", "event_type": "", "pattern": "\\.tmp$",
+         "action": "IGNORE", "response": "", "profile": ""}
+    pattern ist ein Regex (case-insensitive) auf dem Event-Inhalt;
+    leere source/event_type passen auf alles.
+    """
+
+    DIRECT_REPLIES = {
+        "hi": "Hallo! Was kann ich fuer dich tun?",
+        "hallo": "Hallo! Was kann ich fuer dich tun?",
+        "hey": "Hey! Was kann ich fuer dich tun?",
+        "moin": "Moin! Was kann ich fuer dich tun?",
+        "servus": "Servus! Was kann ich fuer dich tun?",
+        "yo": "Hey! Was kann ich fuer dich tun?",
+        "guten morgen": "Guten Morgen! Was kann ich fuer dich tun?",
+        "guten abend": "Guten Abend! Was kann ich fuer dich tun?",
+        "danke": "Gern geschehen!",
+        "vielen dank": "Gern geschehen!",
+        "ok": "Alles klar.",
+        "okay": "Alles klar.",
+        "ja": "Alles klar.",
+        "nein": "Alles klar.",
+        "tschuess": "Tschuess, bis bald!",
+        "ciao": "Tschuess, bis bald!",
+    }
+
+    def __init__(self, rules: List[dict] = None):
+        self.rules = []
+        for rule in rules or []:
+            action = ACTIONS.get(str(rule.get("action", "")).upper())
+            pattern = rule.get("pattern", "")
+            if action is None or not pattern:
+                continue
+            try:
+                regex = re.compile(pattern, re.IGNORECASE)
+            except re.error:
+                continue
+            self.rules.append((rule.get("source", ""), rule.get("event_type", ""),
+                               regex, action, rule))
+
+    def match(self, event: WatcherEvent) -> Optional[ClassificationResult]:
+        """Ergebnis fuer eindeutige Events, sonst None (-> Modell)."""
+        for source, event_type, regex, action, rule in self.rules:
+            if source and source != event.source:
+                continue
+            if event_type and event_type != event.event_type:
+                continue
+            if regex.search(event.content or ""):
+                return self._result(action, f"Regel: {rule['pattern']}",
+                                    rule.get("response", ""), rule.get("profile", ""))
+
+        if event.source != "connector":
+            return None
+
+        content = (event.content or "").strip()
+        if not content:
+            return self._result(EventAction.IGNORE, "Regel: leere Nachricht")
+        if content.lower().startswith("/start"):
+            return self._result(EventAction.IGNORE, "Regel: /start-Kommando")
+
+        reply = self.DIRECT_REPLIES.get(normalize_text(content))
+        if reply:
+            return self._result(EventAction.RESPOND_DIRECT, "Regel: Gruss/Kurzwort", reply)
+        return None
+
+    @staticmethod
+    def _result(action: EventAction, reasoning: str, response: str = "",
+                profile: str = "") -> ClassificationResult:
+        return ClassificationResult(action=action, confidence=1.0, reasoning=reasoning,
+                                    direct_response=response, escalation_profile=profile,
+                                    origin="rule")
+
+
+# ============ CACHE ============
+
+class ClassificationCache:
+    """
+    LRU-Cache mit TTL fuer Modell-Ergebnisse.
+
+    Direkte Antworten werden nicht mitgecacht (koennen zeitabhaengig sein,
+    z.B. "wie spaet ist es") - ein Cache-Treffer mit RESPOND_DIRECT laesst
+    die Antwort vom Daemon neu erzeugen.
+    """
+
+    def __init__(self, max_entries: int = CACHE_SIZE, ttl_seconds: float = CACHE_TTL_SECONDS):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[ClassificationResult]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            stored_at, result = entry
+            if time.monotonic() - stored_at > self.ttl_seconds:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+        return replace(result, processing_time_ms=0, origin="cache")
+
+    def put(self, key: str, result: ClassificationResult):
+        if self.max_entries <= 0:
+            return
+        stored = replace(result, direct_response="", raw_response="")
+        with self._lock:
+            self._entries[key] = (time.monotonic(), stored)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+# ============ METRIKEN ============
+
+def _percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    idx = min(len(ordered) - 1, max(0, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[idx]
+
+
+class ClassificationMetrics:
+    """Zaehlt Ergebnisse nach Herkunft und misst die Latenz der Modell-Calls."""
+
+    def __init__(self):
+        self.started_at = datetime.now().isoformat(timespec="seconds")
+        self.by_origin: Dict[str, int] = {"rule": 0, "cache": 0, "model": 0, "fallback": 0}
+        self.model_calls = 0
+        self.model_events = 0
+        self._latencies = deque(maxlen=LATENCY_WINDOW)
+
+    def record(self, result: ClassificationResult):
+        self.by_origin[result.origin] = self.by_origin.get(result.origin, 0) + 1
+
+    def record_call(self, batch_size: int, seconds: float):
+        self.model_calls += 1
+        self.model_events += batch_size
+        self._latencies.append(seconds * 1000)
+
+    def snapshot(self) -> dict:
+        total = sum(self.by_origin.values())
+        hits = self.by_origin.get("rule", 0) + self.by_origin.get("cache", 0)
+        latencies = list(self._latencies)
+        return {
+            "started_at": self.started_at,
+            "updated_at": datetime.now().isoformat(timespec="seconds"),
+            "events": total,
+            "by_origin": dict(self.by_origin),
+            "hit_rate": round(hits / total, 3) if total else 0.0,
+            "model_calls": self.model_calls,
+            "avg_batch_size": round(self.model_events / self.model_calls, 1) if self.model_calls else 0.0,
+            "latency_p50_ms": round(_percentile(latencies, 50)) if latencies else 0,
+            "latency_p95_ms": round(_percentile(latencies, 95)) if latencies else 0,
+        }
+
+
+def load_stats(path: Path = STATS_FILE) -> dict:
+    """Liest die zuletzt vom Daemon geschriebenen Metriken ({} wenn keine)."""
+    try:
+        return json.loads(Path(path).read_text(encoding="utf-8"))
+    except Exception:
+        return {}
+
+
+def format_stats(stats: dict) -> List[str]:
+    """Status-Zeilen fuer watcher_daemon.py --status."""
+    if not stats.get("events"):
+        return []
+    origin = stats.get("by_origin", {})
+    return [
+        f"  Events:       {stats['events']} (seit {stats.get('started_at', '?')})",
+        f"  Regel/Cache/Modell/Fallback: {origin.get('rule', 0)}/{origin.get('cache', 0)}/"
+        f"{origin.get('model', 0)}/{origin.get('fallback', 0)}",
+        f"  Hit-Rate:     {stats.get('hit_rate', 0.0) * 100:.1f}% (ohne Modell)",
+        f"  Modell-Calls: {stats.get('model_calls', 0)} (Batch avg {stats.get('avg_batch_size', 0.0)})",
+        f"  Latenz:       p50 {stats.get('latency_p50_ms', 0)} ms, p95 {stats.get('latency_p95_ms', 0)} ms",
+        f"  Cache:        {stats.get('cache_entries', 0)} Eintraege",
+    ]
+
+
+# ============ STAGE ============
+
+class ClassificationStage:
+    """
+    Klassifiziert Events: Regeln -> Cache -> Modell (gebuendelt).
+
+    Usage:
+        stage = ClassificationStage(MistralClassifier(BACH_DIR), config.get("classification"))
+        results = stage.classify_many(events)
+    """
+
+    def __init__(self, classifier, config: dict = None, stats_path: Path = STATS_FILE):
+        config = config or {}
+        self.classifier = classifier
+        self.prefilter = RulePrefilter(config.get("rules")) if config.get("prefilter", True) else None
+        self.cache = ClassificationCache(config.get("cache_size", CACHE_SIZE),
+                                         config.get("cache_ttl_seconds", CACHE_TTL_SECONDS))
+        self.batch_size = max(1, int(config.get("batch_size", BATCH_SIZE)))
+        self.metrics = ClassificationMetrics()
+        self.stats_path = stats_path
+
+    def classify(self, event: WatcherEvent) -> ClassificationResult:
+        return self.classify_many([event])[0]
+
+    def classify_many(self, events: List[WatcherEvent]) -> List[ClassificationResult]:
+        """Ergebnisse in der Reihenfolge von events."""
+        results: List[Optional[ClassificationResult]] = [None] * len(events)
+        pending: Dict[str, List[int]] = {}  # Schluessel -> Positionen (gleicher Inhalt = ein Call)
+
+        for i, event in enumerate(events):
+            result = self.prefilter.match(event) if self.prefilter else None
+            if result is None:
+                key = event_key(event)
+                result = self.cache.get(key)
+                if result is None:
+                    pending.setdefault(key, []).append(i)
+                    continue
+            results[i] = result
+
+        keys = list(pending)
+        for start in range(0, len(keys), self.batch_size):
+            chunk = keys[start:start + self.batch_size]
+            batch = [events[pending[k][0]] for k in chunk]
+            t0 = time.perf_counter()
+            batch_results = self.classifier.classify_batch(batch)
+            self.metrics.record_call(len(batch), time.perf_counter() - t0)
+
+            for key, result in zip(chunk, batch_results):
+                if result.origin == "model":
+                    self.cache.put(key, result)
+                positions = pending[key]
+                results[positions[0]] = result
+                for pos in positions[1:]:
+                    results[pos] = replace(result, origin="cache") if result.origin == "model" else result
+
+        for result in results:
+            self.metrics.record(result)
+        return results
+
+    def stats(self) -> dict:
+        snap = self.metrics.snapshot()
+        snap["cache_entries"] = len(self.cache)
+        return snap
+
+    def save_stats(self):
+        """Schreibt die Metriken fuer --status (atomar, Fehler werden ignoriert)."""
+        if self.stats_path is None:
+            return
+        try:
+            path = Path(self.stats_path)
+            tmp = path.with_suffix(".tmp")
+            tmp.write_text(json.dumps(self.stats(), indent=2), encoding="utf-8")
+            tmp.replace(path)
+        except Exception:
+            pass
@@ -28,7 +28,11 @@ MistralClassifier - Event-Klassifikation via lokales Mistral-Modell
 Nutzt OllamaClient (Chat-API) um eingehende Events in 4 Aktions-Kategorien
 zu klassifizieren.
 
-Version: 1.0.1
+classify_batch() klassifiziert mehrere Events mit einem einzigen Chat-Call
+(nummerierte Liste rein, JSON-Array raus) - genutzt von
+classification_stage.ClassificationStage.
+
+Version: 1.1.0
 Erstellt: 2026-02-10
 """
 
@@ -37,7 +41,7 @@ import re
 import time
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import Optional
+from typing import Dict, List, Optional
 from pathlib import Path
 
 
@@ -73,6 +77,7 @@ class ClassificationResult:
     escalation_profile: str = ""
     processing_time_ms: int = 0
     raw_response: str = ""
+    origin: str = "model"    # "model", "rule", "cache", "fallback"
 
 
 class MistralClassifier:
@@ -87,8 +92,23 @@ class MistralClassifier:
     TEMPERATURE = 0.1
     TIMEOUT = 120
 
-    def __init__(self, base_path: Path):
+    BATCH_INSTRUCTION = (
+        "\n\nDu bekommst mehrere nummerierte Nachrichten. Klassifiziere JEDE einzeln "
+        "nach den Regeln oben. Antwort NUR als JSON-Array mit einem Objekt pro Nachricht, "
+        'jeweils mit zusaetzlichem Feld "id" (Nummer der Nachricht): '
+        '[{"id":1,"action":"...","confidence":0.9,"reasoning":"...","response":"","profile":""}]'
+    )
+
+    ACTION_MAP = {
+        "RESPOND_DIRECT": EventAction.RESPOND_DIRECT,
+        "ESCALATE_CLAUDE": EventAction.ESCALATE_CLAUDE,
+        "LOG_ONLY": EventAction.LOG_ONLY,
+        "IGNORE": EventAction.IGNORE,
+    }
+
+    def __init__(self, base_path: Path, base_url: str = None):
         self.base_path = base_path
+        self.base_url = base_url  # None = OllamaClient-Default (localhost:11434)
         self._client = None
         self._system_prompt = None
         self._prompts_dir = Path(__file__).parent / "prompts"
@@ -102,7 +122,7 @@ class MistralClassifier:
             if tools_path not in sys.path:
                 sys.path.insert(0, tools_path)
             from ollama_client import OllamaClient
-            self._client = OllamaClient(timeout=self.TIMEOUT)
+            self._client = OllamaClient(base_url=self.base_url, timeout=self.TIMEOUT)
         return self._client
 
     def _load_system_prompt(self) -> str:
@@ -169,6 +189,51 @@ class MistralClassifier:
         except Exception as e:
             return self._fallback_result(start, str(e))
 
+    def classify_batch(self, events: List[WatcherEvent]) -> List[ClassificationResult]:
+        """
+        Klassifiziert mehrere Events mit einem Chat-Call.
+
+        Ergebnisse, die in der Antwort fehlen oder nicht parsebar sind,
+        werden einzeln per classify() nachgeholt. Schlaegt der Batch-Call
+        selbst fehl, bekommen alle Events den sicheren Fallback.
+
+        Returns:
+            Ergebnisse in der Reihenfolge von events.
+        """
+        if len(events) <= 1:
+            return [self.classify(e) for e in events]
+
+        start = time.time()
+        lines = [f"[{i}] {self._build_classify_prompt(e)}" for i, e in enumerate(events, 1)]
+
+        try:
+            response = self.client.chat(
+                messages=[
+                    {"role": "system", "content": self._load_system_prompt() + self.BATCH_INSTRUCTION},
+                    {"role": "user", "content": "\n".join(lines)}
+                ],
+                model=self.MODEL
+            )
+        except Exception as e:
+            return [self._fallback_result(start, str(e)) for _ in events]
+
+        if not response.success:
+            return [self._fallback_result(start, f"Ollama-Fehler: {response.error}") for _ in events]
+
+        parsed = self._parse_batch_response(response.text, len(events))
+        elapsed_ms = int((time.time() - start) * 1000)
+
+        results = []
+        for i, event in enumerate(events, 1):
+            result = parsed.get(i)
+            if result is None:
+                result = self.classify(event)
+            else:
+                result.processing_time_ms = elapsed_ms
+                result.raw_response = response.text
+            results.append(result)
+        return results
+
     def generate_response(self, event: WatcherEvent) -> str:
         """
         Generiert eine direkte Antwort fuer RESPOND_DIRECT Events.
@@ -199,22 +264,7 @@ class MistralClassifier:
         json_data = self._extract_json(text)
 
         if json_data:
-            action_str = json_data.get("action", "ESCALATE_CLAUDE").upper()
-            action_map = {
-                "RESPOND_DIRECT": EventAction.RESPOND_DIRECT,
-                "ESCALATE_CLAUDE": EventAction.ESCALATE_CLAUDE,
-                "LOG_ONLY": EventAction.LOG_ONLY,
-                "IGNORE": EventAction.IGNORE,
-            }
-            action = action_map.get(action_str, EventAction.ESCALATE_CLAUDE)
-
-            return ClassificationResult(
-                action=action,
-                confidence=float(json_data.get("confidence", 0.5)),
-                reasoning=json_data.get("reasoning", ""),
-                direct_response=json_data.get("response", ""),
-                escalation_profile=json_data.get("profile", ""),
-            )
+            return self._result_from_json(json_data)
 
         # Fallback: Keywords in Rohtext suchen
         text_upper = text.upper()
@@ -231,6 +281,68 @@ class MistralClassifier:
             reasoning="Konnte Antwort nicht parsen - sicher eskalieren"
         )
 
+    def _result_from_json(self, json_data: dict) -> ClassificationResult:
+        """Baut ClassificationResult aus einem geparsten JSON-Objekt."""
+        action_str = str(json_data.get("action", "ESCALATE_CLAUDE")).upper()
+        action = self.ACTION_MAP.get(action_str, EventAction.ESCALATE_CLAUDE)
+        try:
+            confidence = float(json_data.get("confidence", 0.5))
+        except (TypeError, ValueError):
+            confidence = 0.5
+
+        return ClassificationResult(
+            action=action,
+            confidence=confidence,
+            reasoning=json_data.get("reasoning", "") or "",
+            direct_response=json_data.get("response", "") or "",
+            escalation_profile=json_data.get("profile", "") or "",
+        )
+
+    def _parse_batch_response(self, text: str, count: int) -> Dict[int, ClassificationResult]:
+        """
+        Parst eine Batch-Antwort in {Nummer: ClassificationResult}.
+
+        Akzeptiert ein JSON-Array, {"results": [...]} oder lose
+        aneinandergereihte Objekte. Objekte ohne gueltige "id" werden
+        ueber ihre Position zugeordnet.
+        """
+        items = None
+        text = text.strip()
+        candidates = [text]
+        match = re.search(r'\[.*\]', text, re.DOTALL)
+        if match:
+            candidates.append(match.group())
+        for candidate in candidates:
+            try:
+                data = json.loads(candidate)
+            except (json.JSONDecodeError, ValueError):
+                continue
+            if isinstance(data, dict):
+                data = data.get("results", [data])
+            if isinstance(data, list):
+                items = data
+                break
+
+        if items is None:
+            items = []
+            for match in re.finditer(r'\{[^{}]*\}', text):
+                try:
+                    items.append(json.loads(match.group()))
+                except (json.JSONDecodeError, ValueError):
+                    pass
+
+        results: Dict[int, ClassificationResult] = {}
+        for pos, item in enumerate(items, 1):
+            if not isinstance(item, dict) or "action" not in item:
+                continue
+            try:
+                idx = int(item.get("id", pos))
+            except (TypeError, ValueError):
+                idx = pos
+            if 1 <= idx <= count and idx not in results:
+                results[idx] = self._result_from_json(item)
+        return results
+
     def _extract_json(self, text: str) -> Optional[dict]:
         """Extrahiert JSON aus Text (robust)."""
         text = text.strip()
@@ -261,5 +373,6 @@ class MistralClassifier:
             action=EventAction.ESCALATE_CLAUDE,
             confidence=0.0,
             reasoning=f"Fallback: {error}",
-            processing_time_ms=int((time.time() - start_time) * 1000)
+            processing_time_ms=int((time.time() - start_time) * 1000),
+            origin="fallback",
         )
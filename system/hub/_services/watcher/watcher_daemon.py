@@ -24,11 +24,14 @@ SOFTWARE.
 """
 
 """
-BACH Mistral Watcher Daemon v1.0
+BACH Mistral Watcher Daemon v1.1
 =================================
 Always-on Hintergrund-Prozess der Events via Mistral klassifiziert
 und bei Bedarf Claude Code Sessions startet.
 
+Die Events eines Poll-Zyklus laufen gesammelt durch die ClassificationStage
+(Regeln -> Cache -> ein gebuendelter Mistral-Call).
+
 Usage:
   python watcher_daemon.py                # Starten
   python watcher_daemon.py --stop         # Stoppen
@@ -263,6 +266,19 @@ def show_status():
     print(f"  Modell:       {config.get('mistral_model', 'Mistral:latest')}")
     print(f"  Max Escalations/Tag: {config.get('max_daily_escalations', 20)}")
 
+    # Klassifikations-Metriken (vom laufenden Daemon geschrieben)
+    try:
+        if str(WATCHER_DIR) not in sys.path:
+            sys.path.insert(0, str(WATCHER_DIR))
+        from classification_stage import load_stats, format_stats
+        stats_lines = format_stats(load_stats())
+        if stats_lines:
+            print(f"\nKlassifikation:")
+            for line in stats_lines:
+                print(line)
+    except Exception:
+        pass
+
     sources = config.get("sources", {})
     print(f"\nEvent Sources:")
     for name, src in sources.items():
@@ -307,6 +323,7 @@ class WatcherDaemon:
         self.config = load_config()
         self.stop_event = Event()
         self.classifier = None
+        self.stage = None
         self.responder = None
         self.sources = []
         self._escalation_count_today = 0
@@ -325,13 +342,15 @@ class WatcherDaemon:
             sys.path.insert(0, watcher_str)
 
         from classifier import MistralClassifier
+        from classification_stage import ClassificationStage
         from responder import DirectResponder
         from event_sources import (
             ConnectorEventSource, TaskQueueEventSource,
             FileSystemEventSource, ScheduledEventSource
         )
 
-        self.classifier = MistralClassifier(BACH_DIR)
+        self.classifier = MistralClassifier(BACH_DIR, self.config.get("ollama_url"))
+        self.stage = ClassificationStage(self.classifier, self.config.get("classification", {}))
         self.responder = DirectResponder(DB_PATH)
 
         sources_config = self.config.get("sources", {})
@@ -375,11 +394,12 @@ class WatcherDaemon:
 
         return True
 
-    def _handle_event(self, event, source_name: str):
-        """Verarbeitet ein einzelnes Event."""
+    def _handle_event(self, event, source_name: str, result=None):
+        """Verarbeitet ein einzelnes Event (result: bereits klassifiziert, sonst via Stage)."""
         from classifier import EventAction
 
-        result = self.classifier.classify(event)
+        if result is None:
+            result = self.stage.classify(event)
         response_sent = ""
 
         if result.action == EventAction.RESPOND_DIRECT:
@@ -481,24 +501,35 @@ class WatcherDaemon:
                     self.stop_event.wait(30)
                     continue
 
-                # Alle Sources pollen
-                total_events = 0
+                # Alle Sources pollen, Events des Zyklus sammeln
+                batch = []
                 for source_name, source in self.sources:
                     if self.stop_event.is_set():
                         break
 
                     events = source.poll()
-                    for event in events[:max_per_cycle - total_events]:
+                    for event in events[:max_per_cycle - len(batch)]:
+                        batch.append((event, source_name))
+
+                    if len(batch) >= max_per_cycle:
+                        break
+
+                # Gemeinsam klassifizieren (Regeln/Cache/ein Modell-Call pro Batch)
+                total_events = 0
+                if batch and not self.stop_event.is_set():
+                    results = self.stage.classify_many([event for event, _ in batch])
+                    for (event, source_name), result in zip(batch, results):
                         if self.stop_event.is_set():
                             break
-                        self._handle_event(event, source_name)
+                        self._handle_event(event, source_name, result)
                         total_events += 1
-
-                    if total_events >= max_per_cycle:
-                        break
+                    self.stage.save_stats()
 
                 if total_events > 0:
-                    log(f"Zyklus: {total_events} Events verarbeitet")
+                    stats = self.stage.stats()
+                    log(f"Zyklus: {total_events} Events verarbeitet "
+                        f"(Hit-Rate {stats['hit_rate'] * 100:.0f}%, "
+                        f"Modell p50 {stats['latency_p50_ms']} ms)")
 
             except Exception as e:
                 log(f"Fehler im Hauptloop: {e}", "ERROR")
@@ -112,6 +112,19 @@ class BackupHandler(BaseHandler):
         """Backups auflisten."""
         results = ["BACKUPS", "=" * 40]
         
+        manager = self._get_backup_manager()
+        if manager:
+            backups = manager.list_backups(show_nas)
+            if not backups:
+                return True, t("keine_backups", default="Keine Backups gefunden.")
+            for b in backups[:20]:
+                size = f"{b.get('size_mb', 0):.2f} MB"
+                date = str(b.get("created_at", "?"))[:16].replace("T", " ")
+                results.append(f"  {b.get('name', '?'):<35} {size:>8} ({date})")
+            if len(backups) > 20:
+                results.append(f"  ... und {len(backups) - 20} weitere")
+            return True, "\n".join(results)
+        
         if not self.backups_dir.exists():
             return True, t("keine_backups", default="Keine Backups gefunden.")
 
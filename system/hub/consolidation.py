@@ -190,72 +190,31 @@ class ConsolidationHandler(BaseHandler):
         return True, f"{prefix}[CONSOLIDATION] Run All\n" + "\n".join(results)
 
     def _update_weights(self, dry_run: bool = False) -> tuple:
-        """Aktualisiert Gewichtungen (decay)"""
-        conn = self._get_db()
-        cursor = conn.cursor()
-
-        # Berechne Decay basierend auf last_accessed
-        now = datetime.now()
-
-        cursor.execute("""
-            SELECT id, weight, last_accessed, decay_rate
-            FROM memory_consolidation
-            WHERE status = 'active'
-        """)
-        entries = cursor.fetchall()
-
-        updated = 0
-        for entry in entries:
-            if entry['last_accessed']:
-                last = datetime.fromisoformat(entry['last_accessed'])
-                days_since = (now - last).days
-                if days_since > 0:
-                    # Decay anwenden
-                    decay = entry['decay_rate'] ** days_since
-                    new_weight = entry['weight'] * decay
-                    new_weight = max(0.0, min(1.0, new_weight))  # Clamp 0-1
+        """Aktualisiert Gewichtungen (decay, set-basiert)"""
+        from ._services.memory.decay_engine import decay_by_age
 
-                    if not dry_run:
-                        cursor.execute("""
-                            UPDATE memory_consolidation
-                            SET weight = ?, updated_at = ?
-                            WHERE id = ?
-                        """, (new_weight, now.isoformat(), entry['id']))
-                    updated += 1
-
-        if not dry_run:
-            conn.commit()
-        conn.close()
+        conn = self._get_db()
+        try:
+            result = decay_by_age(conn, "memory_consolidation", dry_run=dry_run)
+        finally:
+            conn.close()
 
         prefix = "[DRY-RUN] " if dry_run else ""
-        return True, f"{prefix}[OK] {updated} Gewichtungen aktualisiert (decay)"
+        return True, f"{prefix}[OK] {result.touched} Gewichtungen aktualisiert (decay)"
 
     def _archive_old(self, dry_run: bool = False) -> tuple:
-        """Archiviert Eintraege unter Schwellenwert"""
-        conn = self._get_db()
-        cursor = conn.cursor()
-
-        cursor.execute("""
-            SELECT id, source_table, source_id, weight
-            FROM memory_consolidation
-            WHERE status = 'active' AND weight < ?
-        """, (self.WEIGHT_THRESHOLD_ARCHIVE,))
-
-        to_archive = cursor.fetchall()
-
-        if not dry_run:
-            for entry in to_archive:
-                cursor.execute("""
-                    UPDATE memory_consolidation
-                    SET status = 'archived', updated_at = ?
-                    WHERE id = ?
-                """, (datetime.now().isoformat(), entry['id']))
-            conn.commit()
+        """Archiviert Eintraege unter Schwellenwert (ein UPDATE)"""
+        from ._services.memory.decay_engine import archive_below
 
-        conn.close()
+        conn = self._get_db()
+        try:
+            result = archive_below(conn, "memory_consolidation",
+                                   self.WEIGHT_THRESHOLD_ARCHIVE, dry_run=dry_run)
+        finally:
+            conn.close()
 
         prefix = "[DRY-RUN] " if dry_run else ""
-        return True, f"{prefix}[OK] {len(to_archive)} Eintraege archiviert"
+        return True, f"{prefix}[OK] {result.archived} Eintraege archiviert"
 
     def _index_facts(self, dry_run: bool = False) -> tuple:
         """Erstellt Facts-Index aus Help/Wiki"""
@@ -643,40 +602,16 @@ class ConsolidationHandler(BaseHandler):
 
     def _deactivate_unused(self, dry_run: bool = False) -> tuple:
         """Deaktiviert oder loescht Eintraege mit sehr geringem Gewicht (v1.1.80)."""
-        conn = self._get_db()
-        cursor = conn.cursor()
-
-        cursor.execute("""
-            SELECT id, source_table, source_id, weight
-            FROM memory_consolidation
-            WHERE status = 'active' AND weight < ?
-        """, (self.WEIGHT_THRESHOLD_DELETE,))
+        from ._services.memory.decay_engine import forget_below
 
-        to_delete = cursor.fetchall()
-
-        if not dry_run:
-            now = datetime.now().isoformat()
-            for entry in to_delete:
-                # 1. Status in Consolidation-Table
-                cursor.execute("""
-                    UPDATE memory_consolidation
-                    SET status = 'deleted', updated_at = ?
-                    WHERE id = ?
-                """, (now, entry['id']))
-                
-                # 2. Deaktivieren in Source-Table (if possible)
-                table = entry['source_table']
-                if table in ['memory_lessons', 'memory_working']:
-                    cursor.execute(f"UPDATE {table} SET is_active = 0, updated_at = ? WHERE id = ?", 
-                                 (now, entry['source_id']))
-                elif table == 'memory_facts':
-                    cursor.execute("DELETE FROM memory_facts WHERE id = ?", (entry['source_id'],))
-            
-            conn.commit()
+        conn = self._get_db()
+        try:
+            result = forget_below(conn, self.WEIGHT_THRESHOLD_DELETE, dry_run=dry_run)
+        finally:
+            conn.close()
 
-        conn.close()
         prefix = "[DRY-RUN] " if dry_run else ""
-        return True, f"{prefix}[OK] {len(to_delete)} Eintraege geloescht/deaktiviert"
+        return True, f"{prefix}[OK] {result.deleted} Eintraege geloescht/deaktiviert"
 
     def _reclassify(self, args: list, dry_run: bool = False) -> tuple:
         """Korrigiert falsch kategorisierte Eintraege (v1.1.81).
@@ -143,17 +143,23 @@ class ContactHandler(BaseHandler):
         if not term:
             return False, "Kein Suchbegriff angegeben."
 
+        from hub._services.memory import fts_index
         conn = self._get_db()
         try:
-            like = f"%{term}%"
-            rows = conn.execute("""
-                SELECT * FROM assistant_contacts
-                WHERE is_active = 1
-                  AND (name LIKE ? OR email LIKE ? OR phone LIKE ?
-                       OR mobile LIKE ? OR address LIKE ? OR notes LIKE ?
-                       OR company LIKE ? OR position LIKE ? OR tags LIKE ?)
-                ORDER BY name ASC
-            """, (like, like, like, like, like, like, like, like, like)).fetchall()
+            rows = []
+            try:
+                if fts_index.ensure_index(conn):
+                    ids = [h.id for h in fts_index.search(conn, term, ("contact",), limit=100)]
+                    if ids:
+                        by_id = {r["id"]: r for r in conn.execute(
+                            f"SELECT * FROM assistant_contacts WHERE id IN ({','.join('?' * len(ids))})",
+                            ids)}
+                        rows = [by_id[i] for i in ids if i in by_id]
+            except sqlite3.OperationalError:
+                rows = []
+            if not rows:
+                # Teilstrings (z.B. Telefonnummern ohne Trenner) findet nur LIKE
+                rows = self._search_like(conn, term)
 
             if not rows:
                 return True, f"[CONTACTS] Keine Treffer fuer \"{term}\"."
@@ -170,6 +176,18 @@ class ContactHandler(BaseHandler):
         finally:
             conn.close()
 
+    def _search_like(self, conn, term: str) -> list:
+        """Fallback: LIKE-Scan ueber alle Kontaktfelder."""
+        like = f"%{term}%"
+        return conn.execute("""
+            SELECT * FROM assistant_contacts
+            WHERE is_active = 1
+              AND (name LIKE ? OR email LIKE ? OR phone LIKE ?
+                   OR mobile LIKE ? OR address LIKE ? OR notes LIKE ?
+                   OR company LIKE ? OR position LIKE ? OR tags LIKE ?)
+            ORDER BY name ASC
+        """, (like, like, like, like, like, like, like, like, like)).fetchall()
+
     # ------------------------------------------------------------------
     # ADD - Neuen Kontakt anlegen
     # ------------------------------------------------------------------
@@ -30,13 +30,21 @@ DB-Sync-Manager - OneDrive-basiertes Backup-Sync-System
 Synchronisiert bach.db über OneDrive-Backups mit .bachdb Endung.
 Live-DB bleibt lokal (keine Konflikte), Backups werden synchronisiert.
 
+Seit v1.1 laufen Aenderungen inkrementell über Changesets (core/changeset.py):
+Trigger protokollieren Änderungen an SYNC_TABLES, `sync` exportiert nur diese
+als .bachcs-Datei und spielt die Changesets der anderen PCs ab deren
+High-Water-Mark ein. Das tägliche Voll-Backup bleibt Rückfall für Peers ohne
+lückenlose Changeset-Kette.
+
 Verwendung:
     bach db backup              # Manuelles Backup
     bach db sync                # Pull + Merge + Push
     bach db sync --status       # Status anzeigen
+    bach db export              # Nur eigene Änderungen als Changeset
+    bach db pull                # Nur fremde Changesets einspielen
     bach db cleanup             # Alte Backups löschen
 
-Version: 1.0.0
+Version: 1.1.0
 Erstellt: 2026-02-14
 """
 
@@ -52,6 +60,19 @@ from typing import List, Dict, Optional, Tuple
 
 from .base import BaseHandler
 
+# Synchronisierte Tabellen -> Timestamp-Spalte (für den Voll-Merge aus Backups)
+SYNC_TABLES = {
+    'ati_tasks': 'updated_at',
+    'connector_messages': 'created_at',
+    'memory_facts': 'created_at',
+    'memory_context': 'created_at',
+    'tasks': 'updated_at',
+    'steuer_dokumente': 'created_at',
+    'agent_synergies': 'updated_at',
+    'bach_agents': 'updated_at',
+    'assistant_calendar': 'updated_at',
+}
+
 
 class DBSyncManager:
     """Verwaltet DB-Backups und Sync zwischen PCs."""
@@ -188,10 +209,19 @@ class DBSyncManager:
         """
         print(f"[DB SYNC] Merge Backup: {backup_path.name}")
 
+        from core.changeset import reset_log, suppressed
+
         if not self.db_path.exists():
             # Keine lokale DB - einfach kopieren
             import shutil
             shutil.copy2(backup_path, self.db_path)
+            # Change-Log des Peers gehoert nicht zu unseren Aenderungen
+            conn = sqlite3.connect(str(self.db_path))
+            try:
+                reset_log(conn)
+                conn.commit()
+            finally:
+                conn.close()
             print(f"[DB SYNC] Initiale DB erstellt aus {backup_path.name}")
             return {"_initial_copy": 1}
 
@@ -200,66 +230,55 @@ class DBSyncManager:
         remote = sqlite3.connect(str(backup_path))
         remote.row_factory = sqlite3.Row
 
-        # Tabellen mit Timestamp-Spalten (für intelligenten Merge)
-        timestamped_tables = {
-            'ati_tasks': 'updated_at',
-            'connector_messages': 'created_at',
-            'memory_facts': 'created_at',
-            'memory_context': 'created_at',
-            'tasks': 'updated_at',
-            'steuer_dokumente': 'created_at',
-            'agent_synergies': 'updated_at',
-            'bach_agents': 'updated_at',
-            'assistant_calendar': 'updated_at',
-        }
-
         stats = {}
 
-        for table, ts_col in timestamped_tables.items():
-            try:
-                # Prüfe ob Tabelle existiert
-                table_exists = local.execute(
-                    "SELECT name FROM sqlite_master WHERE type='table' AND name=?",
-                    (table,)
-                ).fetchone()
-
-                if not table_exists:
-                    continue
-
-                # Hole Spalten-Info
-                columns = [row[1] for row in local.execute(
-                    f"PRAGMA table_info({table})"
-                ).fetchall()]
-
-                if ts_col not in columns:
-                    continue
-
-                # Hole neuere Rows vom Remote
-                max_ts_query = f"""
-                    SELECT COALESCE(MAX({ts_col}), '1970-01-01')
-                    FROM {table}
-                """
-                max_local_ts = local.execute(max_ts_query).fetchone()[0]
-
-                newer_rows = remote.execute(f"""
-                    SELECT * FROM {table}
-                    WHERE {ts_col} > ?
-                """, (max_local_ts,)).fetchall()
-
-                if newer_rows:
-                    # INSERT OR REPLACE
-                    placeholders = ','.join(['?'] * len(columns))
-                    insert_query = f"INSERT OR REPLACE INTO {table} VALUES ({placeholders})"
-
-                    for row in newer_rows:
-                        local.execute(insert_query, tuple(row))
-
-                    stats[table] = len(newer_rows)
-                    print(f"  {table}: {len(newer_rows)} Zeilen")
-
-            except sqlite3.Error as e:
-                print(f"  FEHLER {table}: {e}")
-                stats[f"{table}_error"] = str(e)
+        # Gemergte Zeilen nicht ins eigene Change-Log (kein Echo zum Peer)
+        with suppressed(local):
+            for table, ts_col in SYNC_TABLES.items():
+                try:
+                    # Prüfe ob Tabelle existiert
+                    table_exists = local.execute(
+                        "SELECT name FROM sqlite_master WHERE type='table' AND name=?",
+                        (table,)
+                    ).fetchone()
+
+                    if not table_exists:
+                        continue
+
+                    # Hole Spalten-Info
+                    columns = [row[1] for row in local.execute(
+                        f"PRAGMA table_info({table})"
+                    ).fetchall()]
+
+                    if ts_col not in columns:
+                        continue
+
+                    # Hole neuere Rows vom Remote
+                    max_ts_query = f"""
+                        SELECT COALESCE(MAX({ts_col}), '1970-01-01')
+                        FROM {table}
+                    """
+                    max_local_ts = local.execute(max_ts_query).fetchone()[0]
+
+                    newer_rows = remote.execute(f"""
+                        SELECT * FROM {table}
+                        WHERE {ts_col} > ?
+                    """, (max_local_ts,)).fetchall()
+
+                    if newer_rows:
+                        # INSERT OR REPLACE
+                        placeholders = ','.join(['?'] * len(columns))
+                        insert_query = f"INSERT OR REPLACE INTO {table} VALUES ({placeholders})"
+
+                        for row in newer_rows:
+                            local.execute(insert_query, tuple(row))
+
+                        stats[table] = len(newer_rows)
+                        print(f"  {table}: {len(newer_rows)} Zeilen")
+
+                except sqlite3.Error as e:
+                    print(f"  FEHLER {table}: {e}")
+                    stats[f"{table}_error"] = str(e)
 
         local.commit()
         local.close()
@@ -289,23 +308,142 @@ class DBSyncManager:
             except (EOFError, KeyboardInterrupt):
                 return False, "Sync abgebrochen"
 
-        # 2. Pull & Merge
-        newer = self.find_newer_backups()
-        if newer:
-            latest = newer[0]
-            print(f"[DB SYNC] Neueres Backup gefunden: {latest.name}")
-            stats = self.merge_backup(latest)
-            total = sum(v for v in stats.values() if isinstance(v, int))
-            print(f"[DB SYNC] Merged: {total} Zeilen")
-        else:
-            print("[DB SYNC] Keine neueren Backups")
-
-        # 3. Push (eigenes Backup)
-        backup_path = self.create_backup()
-        print(f"[DB SYNC] Backup erstellt: {backup_path.name}")
+        # 2. Pull (Changesets, Rückfall auf Voll-Backup)
+        stats = self.pull()
+        total = sum(v for v in stats.values() if isinstance(v, int))
+        print(f"[DB SYNC] Eingespielt: {total} Zeilen" if total else "[DB SYNC] Keine neuen Änderungen")
+
+        # 3. Push: eigene Änderungen als Changeset, Voll-Backup max. 1x täglich
+        changeset = self.export_changes()
+        if changeset:
+            print(f"[DB SYNC] Changeset erstellt: {changeset.name} "
+                  f"({changeset.stat().st_size / 1024:.1f} KB)")
+        backup_path = self.create_backup_if_needed()
+        if backup_path:
+            print(f"[DB SYNC] Backup erstellt: {backup_path.name}")
+        self._update_heartbeat()
 
         return True, "Sync erfolgreich"
 
+    # ==================== CHANGESETS ====================
+
+    def _capture(self):
+        """Offene Verbindung + ChangeCapture mit installierten Triggern.
+
+        Nur fuer aktive Sync-Operationen (export/pull/sync): ab hier zeichnen
+        die Trigger jede Aenderung an SYNC_TABLES auf.
+        """
+        from core.changeset import ChangeCapture
+        conn = sqlite3.connect(str(self.db_path), timeout=30.0)
+        capture = ChangeCapture(conn)
+        capture.install(SYNC_TABLES)
+        return conn, capture
+
+    def _capture_state(self):
+        """Vorhandener Capture-Stand nur lesen; (None, None) wenn nie aktiviert."""
+        from core.changeset import ChangeCapture
+        conn = sqlite3.connect(str(self.db_path), timeout=30.0)
+        if conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' "
+                        "AND name = '_sync_control'").fetchone() is None:
+            conn.close()
+            return None, None
+        return conn, ChangeCapture(conn)
+
+    def export_changes(self) -> Optional[Path]:
+        """Exportiert eigene Änderungen seit dem letzten Export (None wenn keine)."""
+        if not self.db_path.exists():
+            return None
+        conn, capture = self._capture()
+        try:
+            return capture.export(self.backup_dir, self.hostname)
+        finally:
+            conn.close()
+
+    def _latest_backup(self, host: str) -> Optional[Path]:
+        backups = [b for b in self.backup_dir.glob(f"bach_{host}_*.bachdb")
+                   if b.stem.split('_')[1] == host]
+        return max(backups, key=lambda p: p.stat().st_mtime) if backups else None
+
+    def pull(self) -> Dict[str, int]:
+        """Spielt die Changesets aller anderen PCs ab deren High-Water-Mark ein.
+
+        Ohne bekannten High-Water-Mark oder bei einer Lücke in der Kette
+        (z.B. nach Cleanup) wird einmalig das neueste Voll-Backup des Peers
+        gemerged. PCs ohne Changesets (ältere Versionen) laufen wie bisher
+        über find_newer_backups + merge_backup.
+
+        Returns:
+            Dict mit Statistiken: {table_name: merged_count}
+        """
+        from core.changeset import backup_seq, list_changesets
+
+        stats: Dict[str, int] = {}
+
+        def add(result):
+            for key, value in result.items():
+                if isinstance(value, int):
+                    stats[key] = stats.get(key, 0) + value
+                else:
+                    stats[key] = value
+
+        if not self.db_path.exists():
+            # Noch keine lokale DB: neuestes fremdes Backup als Ausgangsstand
+            newer = self.find_newer_backups()
+            if not newer:
+                return stats
+            add(self.merge_backup(newer[0]))
+            conn, capture = self._capture()
+            try:
+                capture.set_peer_seq(newer[0].stem.split('_')[1], backup_seq(newer[0]), newer[0].name)
+                conn.commit()
+            finally:
+                conn.close()
+
+        changesets = list_changesets(self.backup_dir)
+        changesets.pop(self.hostname, None)
+
+        legacy = [b for b in self.find_newer_backups() if b.stem.split('_')[1] not in changesets]
+        if legacy:
+            print(f"[DB SYNC] Neueres Backup gefunden: {legacy[0].name}")
+            add(self.merge_backup(legacy[0]))
+
+        for host, files in sorted(changesets.items()):
+            conn, capture = self._capture()
+            try:
+                last = capture.peer_seq(host)
+                pending = [f for f in files if last is None or f[1] > last]
+                if not pending:
+                    continue
+
+                if last is None or pending[0][0] > last:
+                    # Lücke: Stand des Peers aus dessen Voll-Backup übernehmen
+                    backup = self._latest_backup(host)
+                    if backup is not None:
+                        print(f"[DB SYNC] {host}: Changeset-Kette unvollständig, "
+                              f"Merge aus {backup.name}")
+                        conn.close()
+                        add(self.merge_backup(backup))
+                        conn, capture = self._capture()
+                        last = backup_seq(backup)
+                        capture.set_peer_seq(host, last, backup.name)
+                        conn.commit()
+                        pending = [f for f in pending if f[1] > last]
+                    else:
+                        print(f"[DB SYNC] {host}: Changeset-Kette unvollständig, "
+                              f"kein Backup - spiele vorhandene Changesets ein")
+
+                for _, _, path in pending:
+                    result = capture.apply(path, host)
+                    add(result)
+                    print(f"[DB SYNC] {path.name}: {sum(result.values())} Zeilen")
+            except Exception as e:
+                print(f"[DB SYNC] FEHLER {host}: {e}")
+                stats[f"{host}_error"] = str(e)
+            finally:
+                conn.close()
+
+        return stats
+
     # ==================== HEARTBEAT ====================
 
     def _update_heartbeat(self):
@@ -405,6 +543,17 @@ class DBSyncManager:
                 except OSError:
                     pass
 
+        # Changesets: nur nach Alter (Peers mit Lücke mergen das Voll-Backup)
+        from core.changeset import CHANGESET_SUFFIX
+        for changeset in self.backup_dir.glob(f"bachcs_*{CHANGESET_SUFFIX}"):
+            if datetime.fromtimestamp(changeset.stat().st_mtime) > cutoff:
+                continue
+            try:
+                changeset.unlink()
+                deleted += 1
+            except OSError:
+                pass
+
         return deleted
 
     # ==================== STATUS ====================
@@ -437,6 +586,31 @@ class DBSyncManager:
                 f"(vor {int(age.total_seconds()/60)}m, {size_mb:.1f} MB)"
             )
 
+        # Changeset-Info
+        if self.db_path.exists():
+            try:
+                from core.changeset import list_changesets
+                conn, capture = self._capture_state()
+                if capture is None:
+                    lines.append("")
+                    lines.append("Changesets: nicht aktiv (erst nach export/pull/sync)")
+                else:
+                    try:
+                        lines.append("")
+                        lines.append(f"Changesets: {capture.pending_count()} Änderungen ausstehend "
+                                     f"(exportiert bis seq {capture.exported_seq()})")
+                        files = list_changesets(self.backup_dir)
+                        for peer in capture.peers():
+                            lines.append(f"  {peer['peer']}: eingespielt bis seq {peer['last_seq']} "
+                                         f"({peer['updated_at']})")
+                        total = sum(len(f) for f in files.values())
+                        size_kb = sum(p.stat().st_size for f in files.values() for _, _, p in f) / 1024
+                        lines.append(f"  {total} Changeset-Dateien, {size_kb:.1f} KB")
+                    finally:
+                        conn.close()
+            except sqlite3.Error as e:
+                lines.append(f"Changesets: Fehler ({e})")
+
         # Heartbeat-Info
         if self.heartbeat_file.exists():
             try:
@@ -469,6 +643,8 @@ class DBSyncHandler(BaseHandler):
         return {
             "backup": "Manuelles Backup erstellen",
             "sync": "Pull + Merge + Push",
+            "export": "Eigene Änderungen als Changeset exportieren",
+            "pull": "Changesets anderer PCs einspielen",
             "status": "Status und Backups anzeigen",
             "cleanup": "Alte Backups löschen",
             "enable": "Auto-Sync aktivieren (bei Startup/Exit)",
@@ -493,6 +669,23 @@ class DBSyncHandler(BaseHandler):
             except Exception as e:
                 return False, f"Sync fehlgeschlagen: {e}"
 
+        elif operation == "export":
+            try:
+                path = manager.export_changes()
+                if path is None:
+                    return True, "Keine neuen Änderungen"
+                return True, f"Changeset erstellt: {path.name} ({path.stat().st_size / 1024:.1f} KB)"
+            except Exception as e:
+                return False, f"Export fehlgeschlagen: {e}"
+
+        elif operation == "pull":
+            try:
+                stats = manager.pull()
+                total = sum(v for v in stats.values() if isinstance(v, int))
+                return True, f"Eingespielt: {total} Zeilen"
+            except Exception as e:
+                return False, f"Pull fehlgeschlagen: {e}"
+
         elif operation == "status":
             return True, manager.get_status()
 
@@ -42,7 +42,7 @@ class DistHandler(BaseHandler):
     def get_operations(self) -> dict:
         return {
             "status": "System-Status (Siegel, dist_type Statistiken)",
-            "verify": "Siegel-Integritaet pruefen",
+            "verify": "Siegel-Integritaet pruefen (--paranoid: ohne Fingerprint-Cache)",
             "classify": "dist_type Verteilung anzeigen",
             "snapshot": "Snapshot erstellen",
             "release": "Release erstellen",
@@ -72,7 +72,7 @@ class DistHandler(BaseHandler):
         if op == "status":
             return self._show_status()
         elif op == "verify":
-            return self._verify_seal()
+            return self._verify_seal(paranoid="--paranoid" in args)
         elif op == "classify":
             return self._classify()
         elif op == "snapshot":
@@ -169,14 +169,14 @@ class DistHandler(BaseHandler):
         except Exception as e:
             return False, f"[ERR] Status-Abfrage fehlgeschlagen: {e}"
     
-    def _verify_seal(self) -> tuple:
-        """Prueft Siegel-Integritaet."""
+    def _verify_seal(self, paranoid: bool = False) -> tuple:
+        """Prueft Siegel-Integritaet (--paranoid: ohne Fingerprint-Cache)."""
         dist, err = self._get_dist_system()
         if err:
             return False, err
         
         try:
-            intact, message = dist.verify_seal()
+            intact, message = dist.verify_seal(paranoid)
             
             if intact:
                 return True, f"[OK] Siegel-Verifizierung: {message}"
@@ -373,11 +373,12 @@ class DocHandler(BaseHandler):
     # ------------------------------------------------------------------
     def _dedup(self, args: list) -> tuple:
         if not args:
-            return False, "Usage: bach doc dedup <pfad> [--min-size 1024] [--no-recursive]"
+            return False, "Usage: bach doc dedup <pfad> [--min-size 1024] [--no-recursive] [--no-cache]"
 
         scan_path = Path(args[0])
         min_size = 0
         recursive = True
+        use_cache = True
 
         i = 1
         while i < len(args):
@@ -387,6 +388,9 @@ class DocHandler(BaseHandler):
             elif args[i] in ("--no-recursive", "-n"):
                 recursive = False
                 i += 1
+            elif args[i] == "--no-cache":
+                use_cache = False
+                i += 1
             else:
                 i += 1
 
@@ -397,7 +401,8 @@ class DocHandler(BaseHandler):
         mod = importlib.util.module_from_spec(spec)
         spec.loader.exec_module(mod)
         DedupScanner = mod.DedupScanner
-        scanner = DedupScanner(min_size=min_size)
+        scanner = DedupScanner(min_size=min_size,
+                               cache_path=mod.DEFAULT_CACHE_PATH if use_cache else None)
         try:
             result = scanner.scan(scan_path, recursive=recursive)
             return True, scanner.format_report(result)
@@ -93,6 +93,9 @@ class LangHandler(BaseHandler):
         "verfuegbar", "nicht gefunden", "ungueltig", "erforderlich"
     ]
 
+    # Operationen, die Uebersetzungen/Woerterbuch/Konfiguration schreiben
+    WRITE_OPERATIONS = {"scan", "translate", "add", "add-language", "import", "set", "dict"}
+
     def __init__(self, base_path: Path):
         super().__init__(base_path)
         self.db_path = base_path / "data" / "bach.db"
@@ -175,6 +178,13 @@ class LangHandler(BaseHandler):
         return conn
 
     def handle(self, operation: str, args: list, dry_run: bool = False) -> tuple:
+        result = self._dispatch(operation, args, dry_run)
+        if operation in self.WRITE_OPERATIONS and not dry_run:
+            clear_t_cache()  # Katalog fuer t() sofort neu laden
+            _catalog_module().invalidate(self.db_path)
+        return result
+
+    def _dispatch(self, operation: str, args: list, dry_run: bool) -> tuple:
         if operation == "help" or not operation:
             return self._show_help()
         elif operation == "status":
@@ -1126,7 +1136,6 @@ DATENBANK: bach.db / languages_config, languages_translations, languages_diction
 #   print(t("datei", lang="en"))    # -> "file" (explizit EN)
 # =============================================================================
 
-_t_cache: Dict[str, str] = {}
 _t_lang_cache: Optional[str] = None
 _t_db_path: Optional[Path] = None
 
@@ -1140,38 +1149,40 @@ def _get_t_db_path() -> Path:
     return _t_db_path
 
 
+_t_catalog = None
+
+
+def _catalog_module():
+    """tools/lang_catalog (lazy, einmal importiert)."""
+    global _t_catalog
+    if _t_catalog is None:
+        try:
+            from tools import lang_catalog
+        except ImportError:
+            import lang_catalog
+        _t_catalog = lang_catalog
+    return _t_catalog
+
+
 def get_lang() -> str:
     """Gibt die aktuelle Sprache zurueck (de/en)."""
-    global _t_lang_cache
     if _t_lang_cache is not None:
         return _t_lang_cache
-
-    db_path = _get_t_db_path()
-    if not db_path.exists():
-        return "de"
-
-    try:
-        conn = sqlite3.connect(str(db_path))
-        row = conn.execute("SELECT default_language FROM languages_config LIMIT 1").fetchone()
-        conn.close()
-        _t_lang_cache = row[0] if row else "de"
-        return _t_lang_cache
-    except Exception:
-        return "de"
+    return _get_lang_config()['default']
 
 
 def set_lang(lang: str) -> None:
     """Setzt die aktuelle Sprache (cleared cache)."""
-    global _t_lang_cache, _t_cache
+    global _t_lang_cache
     _t_lang_cache = lang
-    _t_cache.clear()
+    _catalog_module().invalidate(_get_t_db_path())
 
 
 def clear_t_cache() -> None:
-    """Leert den Translation-Cache."""
-    global _t_cache, _t_lang_cache
-    _t_cache.clear()
+    """Leert den Translation-Cache (Katalog wird beim naechsten t() neu geladen)."""
+    global _t_lang_cache
     _t_lang_cache = None
+    _catalog_module().invalidate(_get_t_db_path())
 
 
 def _get_lang_config() -> Dict[str, str]:
@@ -1181,29 +1192,17 @@ def _get_lang_config() -> Dict[str, str]:
     Returns:
         Dict mit 'default' und 'fallback' Sprach-Codes.
     """
-    db_path = _get_t_db_path()
-    if not db_path.exists():
-        return {'default': 'de', 'fallback': 'en'}
-
-    try:
-        conn = sqlite3.connect(str(db_path))
-        row = conn.execute(
-            "SELECT default_language, fallback_language FROM languages_config LIMIT 1"
-        ).fetchone()
-        conn.close()
-
-        if row:
-            return {'default': row[0] or 'de', 'fallback': row[1] or 'en'}
-    except Exception:
-        pass
-
-    return {'default': 'de', 'fallback': 'en'}
+    return _catalog_module().get_config(_get_t_db_path())
 
 
 def t(key: str, lang: Optional[str] = None, default: Optional[str] = None) -> str:
     """
     Uebersetzt einen Key in die aktuelle/angegebene Sprache.
 
+    Der Lookup laeuft gegen den vorgeladenen Katalog der Sprache
+    (tools/lang_catalog.py): Zielsprache, dann Woerterbuch, dann
+    Fallback-Sprache - ohne DB-Zugriff pro Aufruf.
+
     Args:
         key: Translation-Key (z.B. "speichern", "datei_nicht_gefunden")
         lang: Optional Zielsprache ("de" oder "en"), sonst System-Einstellung
@@ -1218,91 +1217,18 @@ def t(key: str, lang: Optional[str] = None, default: Optional[str] = None) -> st
         t("speichern", lang="en")   # -> "save"
         t("unknown_key", default="Unbekannt")  # -> "Unbekannt"
     """
-    global _t_cache
-
     target_lang = lang or get_lang()
-    cache_key = f"{key}:{target_lang}"
-
-    # Cache-Hit?
-    if cache_key in _t_cache:
-        return _t_cache[cache_key]
-
-    # 1. Versuche exakten Match in languages_translations
-    db_path = _get_t_db_path()
-    if db_path.exists():
-        try:
-            conn = sqlite3.connect(str(db_path))
-
-            # Exakte Suche nach Key + Sprache
-            row = conn.execute("""
-                SELECT value FROM languages_translations
-                WHERE key = ? AND language = ? AND value != ''
-                LIMIT 1
-            """, (key, target_lang)).fetchone()
-
-            if row and row[0]:
-                _t_cache[cache_key] = row[0]
-                conn.close()
-                return row[0]
-
-            # 2. Fallback: Woerterbuch (fuer einzelne Woerter)
-            # Wenn Zielsprache nicht Default: Default->Target Lookup
-            lang_config = _get_lang_config()
-            default_lang = lang_config['default']
-
-            if target_lang != default_lang:
-                dict_row = conn.execute("""
-                    SELECT translation FROM languages_dictionary
-                    WHERE term = ? AND source_lang = ? AND target_lang = ?
-                    AND is_preferred = 1
-                    ORDER BY usage_count DESC LIMIT 1
-                """, (key.lower(), default_lang, target_lang)).fetchone()
-
-                if dict_row and dict_row[0]:
-                    _t_cache[cache_key] = dict_row[0]
-                    conn.close()
-                    return dict_row[0]
-
-            # 3. Fallback: Fallback-Sprache aus Config pruefen
-            fallback_lang = lang_config['fallback'] if target_lang != lang_config['fallback'] else lang_config['default']
-            fallback_row = conn.execute("""
-                SELECT value FROM languages_translations
-                WHERE key = ? AND language = ? AND value != ''
-                LIMIT 1
-            """, (key, fallback_lang)).fetchone()
-
-            conn.close()
-
-            if fallback_row and fallback_row[0]:
-                # Fallback-Wert cachen
-                _t_cache[cache_key] = fallback_row[0]
-                return fallback_row[0]
-
-        except Exception:
-            pass
+    catalog = _catalog_module().get_catalog(_get_t_db_path(), target_lang)
+    if catalog is not None:
+        value = catalog.lookup(key)
+        if value is not None:
+            return value
 
     # Nicht gefunden: default oder Key zurueckgeben
-    result = default if default is not None else key
-    _t_cache[cache_key] = result
-    return result
+    return default if default is not None else key
 
 
 def t_exists(key: str, lang: Optional[str] = None) -> bool:
     """Prueft ob ein Translation-Key existiert."""
-    db_path = _get_t_db_path()
-    if not db_path.exists():
-        return False
-
-    target_lang = lang or get_lang()
-
-    try:
-        conn = sqlite3.connect(str(db_path))
-        row = conn.execute("""
-            SELECT 1 FROM languages_translations
-            WHERE key = ? AND language = ? AND value != ''
-            LIMIT 1
-        """, (key, target_lang)).fetchone()
-        conn.close()
-        return row is not None
-    except Exception:
-        return False
+    catalog = _catalog_module().get_catalog(_get_t_db_path(), lang or get_lang())
+    return catalog is not None and key in catalog
@@ -364,15 +364,25 @@ Beispiele:
             conn.close()
     
     def _search(self, keyword: str) -> tuple:
+        """Lessons nach Relevanz (FTS5/bm25, Top 50); ohne FTS5 per LIKE."""
+        from ._services.memory import fts_index
         conn = sqlite3.connect(self.db_path)
         try:
-            rows = conn.execute("""
-                SELECT id, category, title, solution 
-                FROM memory_lessons 
-                WHERE is_active = 1 
-                  AND (title LIKE ? OR solution LIKE ? OR problem LIKE ?)
-                ORDER BY created_at DESC
-            """, (f"%{keyword}%", f"%{keyword}%", f"%{keyword}%")).fetchall()
+            try:
+                rows = None
+                if fts_index.ensure_index(conn):
+                    hits = fts_index.search(conn, keyword, ("lesson",), limit=50)
+                    total = fts_index.count(conn, keyword, ("lesson",)) if hits else 0
+                    ids = [h.id for h in hits]
+                    by_id = {r[0]: r for r in conn.execute(
+                        f"SELECT id, category, title, solution FROM memory_lessons "
+                        f"WHERE id IN ({','.join('?' * len(ids))})", ids)} if ids else {}
+                    rows = [by_id[i] for i in ids if i in by_id]
+            except sqlite3.OperationalError:
+                rows = None
+            if rows is None:
+                rows = self._search_like(conn, keyword)
+                total = len(rows)
             
             if not rows:
                 return True, f"Keine Treffer fuer: {keyword}"
@@ -381,11 +391,21 @@ Beispiele:
             for id, cat, title, solution in rows:
                 results.append(f"  #{id} [{cat}] {title[:40]}")
             
-            results.append(f"\n{len(rows)} Treffer")
+            results.append(f"\n{total} Treffer")
             return True, "\n".join(results)
         finally:
             conn.close()
     
+    def _search_like(self, conn, keyword: str) -> list:
+        """Fallback ohne FTS5: LIKE-Scan ueber Titel, Problem, Loesung."""
+        return conn.execute("""
+            SELECT id, category, title, solution 
+            FROM memory_lessons 
+            WHERE is_active = 1 
+              AND (title LIKE ? OR solution LIKE ? OR problem LIKE ?)
+            ORDER BY created_at DESC
+        """, (f"%{keyword}%", f"%{keyword}%", f"%{keyword}%")).fetchall()
+    
     def _show(self, lesson_id: str) -> tuple:
         conn = sqlite3.connect(self.db_path)
         try:
@@ -62,6 +62,14 @@ class LogsHandler(BaseHandler):
             size_str = f"{size:,} B" if size < 1024 else f"{size/1024:.1f} KB"
             results.append(f"  {log_file.name:<25} {size_str:>10}  ({mtime})")
         
+        # Auto-Log (Tages-Segmente)
+        autolog_dir = self.logs_dir / "autolog"
+        segments = sorted(autolog_dir.glob("*.log")) if autolog_dir.exists() else []
+        if segments:
+            total = sum(f.stat().st_size for f in segments)
+            results.append(f"\n[AUTO-LOG] ({len(segments)} Tages-Segmente, {total/1024:.1f} KB)")
+            results.append(f"  {segments[0].stem} .. {segments[-1].stem}")
+        
         # Session-Logs
         sessions_dir = self.logs_dir / "sessions"
         if sessions_dir.exists():
@@ -109,21 +117,18 @@ class LogsHandler(BaseHandler):
         return True, "\n".join(results)
     
     def _tail(self, lines: int = 50) -> tuple:
-        """Letzte n Zeilen des Haupt-Logs."""
-        auto_log = self.logs_dir / "auto_log.txt"
-        
-        if not auto_log.exists():
-            return False, "Kein auto_log.txt gefunden."
-        
-        results = [f"LOG TAIL (letzte {lines} Zeilen)", "=" * 50]
-        
+        """Letzte n Zeilen des Auto-Logs (ueber die Tages-Segmente)."""
         try:
-            content = auto_log.read_text(encoding='utf-8', errors='ignore')
-            log_lines = content.split('\n')
-            results.extend(log_lines[-lines:])
+            from tools.autolog import AutoLogger
+            log_lines = AutoLogger(self.base_path).tail(lines)
         except Exception as e:
             return False, f"Fehler: {e}"
         
+        if not log_lines:
+            return False, "Keine Auto-Log-Eintraege gefunden."
+        
+        results = [f"LOG TAIL (letzte {lines} Zeilen)", "=" * 50]
+        results.extend(log_lines)
         return True, "\n".join(results)
     
     def _clear(self, dry_run: bool) -> tuple:
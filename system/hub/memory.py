@@ -414,14 +414,45 @@ class MemoryHandler(BaseHandler):
             conn.close()
     
     def _search(self, query: str) -> tuple:
-        """Durchsucht alle Memory-Tabellen mit Relevanz-Scoring (Assoziativ)."""
-        conn = self._get_conn()
-        results = [f"ASSOZIATIVE SUCHE: {query}", "=" * 50]
-        
+        """Durchsucht alle Memory-Tabellen mit Relevanz-Scoring (Assoziativ).
+
+        Top-15 per FTS5/bm25 (hub/_services/memory/fts_index.py), verstaerkt
+        durch Gewicht/Zugriff aus memory_consolidation. Ohne FTS5: Voll-Scan.
+        """
         keywords = query.lower().split()
         if not keywords:
             return False, "Leere Suchanfrage."
-            
+
+        from ._services.memory import fts_index
+        conn = self._get_conn()
+        try:
+            if fts_index.ensure_index(conn):
+                hits = fts_index.search(conn, query, ("working", "fact", "lesson"), limit=15, mode="or")
+                total = fts_index.count(conn, query, ("working", "fact", "lesson"), mode="or") if hits else 0
+            else:
+                hits = None
+        except sqlite3.OperationalError:
+            hits = None
+        finally:
+            conn.close()
+
+        if hits is None:
+            return self._search_scan(query, keywords)
+        if not hits:
+            return True, f"Keine Treffer fuer: {query}"
+
+        results = [f"ASSOZIATIVE SUCHE: {query}", "=" * 50]
+        for hit in hits:
+            relevance = "*" * max(1, self._calculate_relevance(hit.text, keywords))
+            results.append(f"  [{hit.source}] {relevance} {hit.text[:80]}...")
+        results.append(f"\n{total} Treffer")
+        return True, "\n".join(results)
+
+    def _search_scan(self, query: str, keywords: list) -> tuple:
+        """Fallback ohne FTS5: alle Zeilen laden und in Python bewerten."""
+        conn = self._get_conn()
+        results = [f"ASSOZIATIVE SUCHE: {query}", "=" * 50]
+
         try:
             # 1. Alles abrufen (roh)
             working = conn.execute("SELECT content FROM memory_working WHERE is_active = 1").fetchall()
@@ -14,6 +14,7 @@ Das Siegel:
 
 CLI:
     bach seal check       Vollstaendige Hash-Pruefung
+    bach seal check --paranoid   ... ohne Fingerprint-Cache
     bach seal repair      Neuen Hash berechnen und speichern
     bach seal status      Zeige aktuellen Seal-Status
 
@@ -56,24 +57,21 @@ class SealHandler:
         conn.close()
         return files
 
-    def _calculate_file_hash(self, file_path: Path) -> str:
-        """Berechnet SHA256-Hash einer Datei."""
-        hasher = hashlib.sha256()
-        try:
-            with open(file_path, 'rb') as f:
-                while chunk := f.read(8192):
-                    hasher.update(chunk)
-            return hasher.hexdigest()
-        except Exception:
-            return ""
-
-    def _calculate_kernel_hash(self) -> Tuple[str, int, int]:
+    def _calculate_kernel_hash(self, paranoid: bool = False) -> Tuple[str, int, int]:
         """
         Berechnet Kernel-Hash ueber alle CORE-Dateien.
 
+        Datei-Hashes kommen aus dem Fingerprint-Cache (core.fingerprint);
+        gelesen werden nur Dateien mit geaendertem stat.
+
+        Args:
+            paranoid: Cache umgehen und alle Dateien neu lesen
+
         Returns:
             (kernel_hash, processed_count, skipped_count)
         """
+        from core.fingerprint import get_cache
+
         core_files = self._get_core_files()
 
         if not core_files:
@@ -83,18 +81,21 @@ class SealHandler:
         processed = 0
         skipped = 0
 
+        paths = []
         for relative_path in core_files:
             # Pfade sind relativ zu system/
             if not relative_path.startswith('system/'):
-                file_path = self.system_root / relative_path
+                paths.append(self.system_root / relative_path)
             else:
-                file_path = self.base_path / relative_path
+                paths.append(self.base_path / relative_path)
+        file_hashes = get_cache(self.db_path).hash_files(paths, paranoid=paranoid)
 
+        for relative_path, file_path in zip(core_files, paths):
             if not file_path.exists():
                 skipped += 1
                 continue
 
-            file_hash = self._calculate_file_hash(file_path)
+            file_hash = file_hashes.get(file_path, "")
             if file_hash:
                 # Hash + Pfad kombinieren
                 combined_hasher.update(file_hash.encode('utf-8'))
@@ -142,12 +143,13 @@ class SealHandler:
         except Exception:
             return False
 
-    def check(self, verbose: bool = False) -> int:
+    def check(self, verbose: bool = False, paranoid: bool = False) -> int:
         """
         Vollstaendige Hash-Pruefung.
 
         Args:
             verbose: Detaillierte Ausgabe
+            paranoid: Fingerprint-Cache umgehen (alle Dateien lesen)
 
         Returns:
             0 = INTACT, 1 = MODIFIED, 2 = NO_SEAL, 3 = ERROR
@@ -168,8 +170,8 @@ class SealHandler:
         print("")
 
         # Aktuellen Hash berechnen
-        print("Berechne Kernel-Hash...")
-        current_hash, processed, skipped = self._calculate_kernel_hash()
+        print("Berechne Kernel-Hash..." + (" (paranoid, ohne Cache)" if paranoid else ""))
+        current_hash, processed, skipped = self._calculate_kernel_hash(paranoid)
 
         if not current_hash:
             print("[ERROR] Kernel-Hash konnte nicht berechnet werden!")
@@ -204,10 +206,13 @@ class SealHandler:
             print("  bach restore --full  System wiederherstellen")
             return 1
 
-    def repair(self) -> int:
+    def repair(self, paranoid: bool = False) -> int:
         """
         Neuen Kernel-Hash berechnen und speichern.
 
+        Args:
+            paranoid: Fingerprint-Cache umgehen (alle Dateien lesen)
+
         Returns:
             0 = SUCCESS, 1 = ERROR
         """
@@ -215,7 +220,7 @@ class SealHandler:
         print("")
         print("Berechne neuen Kernel-Hash...")
 
-        kernel_hash, processed, skipped = self._calculate_kernel_hash()
+        kernel_hash, processed, skipped = self._calculate_kernel_hash(paranoid)
 
         if not kernel_hash:
             print("[ERROR] Kernel-Hash konnte nicht berechnet werden!")
@@ -111,11 +111,15 @@ class SearchHandler(BaseHandler):
         sources = None
         tags = None
         limit = 20
+        hybrid = False
 
         i = 0
         while i < len(args):
             arg = args[i]
-            if arg in ('--source', '-s') and i + 1 < len(args):
+            if arg == '--hybrid':
+                hybrid = True
+                i += 1
+            elif arg in ('--source', '-s') and i + 1 < len(args):
                 sources = [args[i + 1]]
                 i += 2
             elif arg in ('--tag', '-t') and i + 1 < len(args):
@@ -138,7 +142,10 @@ class SearchHandler(BaseHandler):
             return False, "Kein Suchbegriff angegeben."
 
         engine = self._get_engine()
-        ok, results = engine.search(query, sources=sources, tags=tags, limit=limit)
+        if hybrid:
+            ok, results = engine.search_hybrid(query, sources=sources, limit=limit)
+        else:
+            ok, results = engine.search(query, sources=sources, tags=tags, limit=limit)
 
         if not ok:
             return False, "Suche fehlgeschlagen."
@@ -211,7 +218,8 @@ class SearchHandler(BaseHandler):
           bach search index wiki              -- Nur Wiki indexieren
           bach search index memory            -- Nur Memory indexieren
           bach search index documents         -- Nur Dokumente indexieren
-          bach search index <pfad>            -- Verzeichnis scannen
+          bach search index <pfad>            -- Verzeichnis scannen (inkrementell)
+          bach search index <pfad> --full     -- Alle Dateien neu hashen
         """
         engine = self._get_engine()
 
@@ -236,7 +244,9 @@ class SearchHandler(BaseHandler):
         # Fallback: Verzeichnis scannen
         directory = args[0]
         no_tags = "--no-tags" in args
-        return engine.scan_directory(directory, tags_from_path=not no_tags)
+        full = "--full" in args
+        return engine.scan_directory(directory, tags_from_path=not no_tags,
+                                     incremental=not full)
 
     # ------------------------------------------------------------------
     # STATUS
@@ -371,12 +381,14 @@ Befehle:
   bach search <query>              Suche ueber alle Quellen (FTS5)
   bach search <query> --source wiki  Nur in Wiki suchen
   bach search <query> --tag health   Nur Eintraege mit Tag 'health'
+  bach search <query> --hybrid     BM25 + Vektor-Aehnlichkeit (vorher: unified_search.py embed)
   bach search index                Alle BACH-Quellen indexieren
   bach search index knowledgedigest  Nur KnowledgeDigest indexieren (auch: kd)
   bach search index wiki           Nur Wiki indexieren
   bach search index memory         Nur Memory indexieren
   bach search index documents      Nur Dokumente indexieren (auch: docs)
-  bach search index <pfad>         Verzeichnis scannen + indexieren
+  bach search index <pfad>         Verzeichnis scannen + indexieren (inkrementell)
+  bach search index <pfad> --full  Alle Dateien neu hashen (ignoriert mtime/size)
   bach search status               Index-Statistiken
   bach search rebuild              Index komplett neu aufbauen
   bach search tags                 Alle Tags anzeigen
@@ -866,57 +866,28 @@ class SharedMemoryHandler(BaseHandler):
             return False, f"Datenbankfehler bei consolidation consolidate: {e}"
 
     def _consolidation_run_decay(self, args: list, dry_run: bool) -> tuple:
-        """B57: Decay-Logik -- weight *= decay_rate, archiviere unter threshold."""
-        try:
-            conn = sqlite3.connect(self.db_path)
-            now = datetime.now().isoformat()
+        """B57: Decay-Logik -- weight *= decay_rate, archiviere unter threshold.
 
-            # Hole alle aktiven Eintraege mit decay_rate und threshold
-            cursor = conn.execute("""
-                SELECT id, weight, decay_rate, threshold
-                FROM shared_memory_consolidation
-                WHERE status = 'active'
-            """)
-            rows = cursor.fetchall()
+        Set-basiert (decay_engine): zwei UPDATEs in einer Transaktion statt
+        einem UPDATE pro Zeile.
+        """
+        from ._services.memory.decay_engine import decay_step
 
-            if not rows:
+        try:
+            conn = sqlite3.connect(self.db_path)
+            try:
+                result = decay_step(conn, "shared_memory_consolidation",
+                                    default_decay=0.95,      # Default: 5% Decay
+                                    default_threshold=0.1,   # Default: Archivierung unter 0.1
+                                    dry_run=dry_run)
+            finally:
                 conn.close()
-                return True, "Keine aktiven Consolidation-Eintraege zum Decay."
-
-            decayed_count = 0
-            archived_count = 0
 
-            for row in rows:
-                cid, weight, decay_rate, threshold = row
-                weight = weight or 1.0
-                decay_rate = decay_rate or 0.95  # Default: 5% Decay
-                threshold = threshold or 0.1     # Default: Archivierung unter 0.1
-
-                new_weight = weight * decay_rate
-                decayed_count += 1
-
-                if new_weight < threshold:
-                    if not dry_run:
-                        conn.execute("""
-                            UPDATE shared_memory_consolidation
-                            SET weight = ?, status = 'archived', updated_at = ?
-                            WHERE id = ?
-                        """, (new_weight, now, cid))
-                    archived_count += 1
-                else:
-                    if not dry_run:
-                        conn.execute("""
-                            UPDATE shared_memory_consolidation
-                            SET weight = ?, updated_at = ?
-                            WHERE id = ?
-                        """, (new_weight, now, cid))
-
-            if not dry_run:
-                conn.commit()
-            conn.close()
+            if result.touched == 0:
+                return True, "Keine aktiven Consolidation-Eintraege zum Decay."
 
             prefix = "[DRY-RUN] " if dry_run else ""
-            return True, f"{prefix}Decay ausgefuehrt: {decayed_count} Eintraege decayed, {archived_count} archiviert"
+            return True, f"{prefix}Decay ausgefuehrt: {result.touched} Eintraege decayed, {result.archived} archiviert"
 
         except sqlite3.Error as e:
             return False, f"Datenbankfehler bei consolidation run: {e}"
@@ -121,37 +121,25 @@ class ShutdownHandler(BaseHandler):
         Returns:
             str: Automatisch generierte Zusammenfassung oder None
         """
-        autolog_path = self.base_path / "data" / "logs" / "auto_log_extended.txt"
-        
-        if not autolog_path.exists():
-            return None
-        
         try:
+            from tools.autolog import AutoLogger
+            
             # Session-Start parsen
             start_time = datetime.fromisoformat(session_start.replace('Z', '+00:00'))
             
-            # Autolog lesen
-            with open(autolog_path, 'r', encoding='utf-8', errors='replace') as f:
-                lines = f.readlines()
+            # Nur Segmente ab dem Tag des Session-Starts lesen
+            lines = AutoLogger(self.base_path).read_since(start_time)
+            if not lines:
+                return None
             
             # Befehle sammeln seit Session-Start
+            # Format: [YYYY-MM-DD HH:MM:SS] CMD: befehl
             commands = []
             for line in lines:
-                # Format: [HH:MM:SS] CMD: befehl
                 if 'CMD:' in line:
-                    # Zeit extrahieren (erste 10 Zeichen: [HH:MM:SS])
-                    try:
-                        time_str = line[1:9]  # HH:MM:SS
-                        today = datetime.now().date()
-                        line_time = datetime.strptime(f"{today} {time_str}", "%Y-%m-%d %H:%M:%S")
-                        
-                        if line_time >= start_time:
-                            # Befehl extrahieren
-                            cmd_part = line.split('CMD:')[1].strip()
-                            if cmd_part and cmd_part not in ['startup', 'shutdown']:
-                                commands.append(cmd_part)
-                    except (ValueError, IndexError):
-                        continue
+                    cmd_part = line.split('CMD:', 1)[1].strip()
+                    if cmd_part and cmd_part not in ['startup', 'shutdown']:
+                        commands.append(cmd_part)
             
             if not commands:
                 return "[AUTO] Keine Befehle in dieser Session"
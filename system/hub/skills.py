@@ -82,6 +82,7 @@ class SkillsHandler(BaseHandler):
             clean_args = [a for a in args if not a.startswith('--') and a not in ("agent", "expert", "service", "tool", "handler", "anthropic", "bach")]
             if not clean_args:
                 return False, "Usage: bach skills create <name> [--type agent|expert|service|tool|handler] [--format anthropic]"
+            self._catalog().invalidate("skill")
             return self._create(clean_args[0], skill_type, dry_run, fmt=fmt)
         elif operation == "reload":
             return self._reload()
@@ -104,6 +105,7 @@ class SkillsHandler(BaseHandler):
             output_dir = clean_args[1] if len(clean_args) > 1 else None
             return self._export(clean_args[0], output_dir, dry_run, fmt="agent")
         elif operation == "install" and args:
+            self._catalog().invalidate("skill")
             return self._install(args[0], dry_run)
         elif operation == "hierarchy":
             type_filter = args[0] if args else None
@@ -178,8 +180,6 @@ class SkillsHandler(BaseHandler):
     
     def _find_skill(self, name: str) -> Path:
         """Skill-Datei oder Verzeichnis finden."""
-        name_lower = name.lower()
-        
         # 1. Exakte Verzeichnis-Suche in agents/, agents/_experts, _services
         agents_dir = self.base_path / "agents"
         experts_dir = agents_dir / "_experts"
@@ -189,47 +189,35 @@ class SkillsHandler(BaseHandler):
             if skill_dir.exists() and skill_dir.is_dir():
                 return skill_dir
         
-        # 2. Datei-Suche (.txt, .md)
-        for suffix in ['.txt', '.md']:
-            for skill_file in self.skills_dir.rglob(f"*{suffix}"):
-                if name_lower in skill_file.stem.lower():
-                    return skill_file
-        
-        return None
-    
+        # 2. Datei-Suche (.txt, .md) ueber den Katalog
+        entry = self._catalog().resolve("skill", name)
+        return self._catalog().path(entry) if entry else None
+
+    def _catalog(self):
+        """Geteilter Skill-/Tool-Katalog (FTS5, mtime-gepflegt)."""
+        from tools.catalog_index import get_catalog
+        return get_catalog(self.base_path)
+
     def _search(self, term: str) -> tuple:
-        """Skills nach Begriff durchsuchen."""
+        """Skills nach Begriff durchsuchen (Name, Header, Inhalt - nach Relevanz)."""
         results = [f"{t('skills_search_title', default='SKILL-SUCHE')}: '{term}'", "=" * 50]
-        
-        found = []
-        term_lower = term.lower()
-        
-        for skill_file in self.skills_dir.rglob("*"):
-            if skill_file.is_file() and skill_file.suffix in ['.txt', '.md']:
-                # Im Namen suchen
-                if term_lower in skill_file.stem.lower():
-                    found.append((skill_file, "Name"))
-                    continue
-                
-                # Im Inhalt suchen
-                try:
-                    content = skill_file.read_text(encoding='utf-8', errors='ignore').lower()
-                    if term_lower in content:
-                        found.append((skill_file, "Inhalt"))
-                except:
-                    pass
-        
+
+        catalog = self._catalog()
+        found = catalog.search(term, kind="skill", limit=20)
+        total = catalog.count(term, kind="skill") if found else 0
+
         if not found:
             results.append(f"{t('no_results', default='Keine Treffer')}: {term}")
         else:
-            results.append(f"{t('search_results', default='Gefunden')}: {len(found)}\n")
-            for skill, match_type in found[:20]:
-                rel_path = skill.relative_to(self.skills_dir)
-                results.append(f"  [{match_type}] {rel_path}")
-            
-            if len(found) > 20:
-                results.append(f"\n  ... und {len(found) - 20} weitere")
-        
+            results.append(f"{t('search_results', default='Gefunden')}: {total}\n")
+            for hit in found:
+                results.append(f"  [{hit['match']}] {hit['entry'].rel_path}")
+                if hit['snippet']:
+                    results.append(f"      {hit['snippet'][:100]}")
+
+            if total > len(found):
+                results.append(f"\n  ... und {total - len(found)} weitere")
+
         return True, "\n".join(results)
     
     def _export(self, name: str, output_dir: str = None, dry_run: bool = False, fmt: str = "bach") -> tuple:
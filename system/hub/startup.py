@@ -42,7 +42,7 @@ class StartupHandler(BaseHandler):
 
     def get_operations(self) -> dict:
         return {
-            "run": "Komplettes Startprotokoll (Standard)",
+            "run": "Komplettes Startprotokoll (Standard; --paranoid: Kernel-Hash ohne Fingerprint-Cache)",
             "quick": "Schnellstart ohne Dir-Scan",
             "mode": "Modus aendern: gui|text|dual|silent"
         }
@@ -167,7 +167,8 @@ class StartupHandler(BaseHandler):
         except Exception:
             pass
 
-        success, message = self._run_startup(quick, dry_run, startup_mode, partner_id)
+        paranoid = "--paranoid" in args
+        success, message = self._run_startup(quick, dry_run, startup_mode, partner_id, paranoid)
 
         # Hook: after_startup
         try:
@@ -332,7 +333,8 @@ class StartupHandler(BaseHandler):
             pass
         return max_mtime
 
-    def _run_startup(self, quick: bool, dry_run: bool, startup_mode: str = "gui", partner_id: str = "user") -> tuple:
+    def _run_startup(self, quick: bool, dry_run: bool, startup_mode: str = "gui", partner_id: str = "user",
+                     paranoid: bool = False) -> tuple:
         results = []
         now = datetime.now()
 
@@ -623,7 +625,6 @@ class StartupHandler(BaseHandler):
         # ══════════════════════════════════════════════════════════════
         if not quick:
             try:
-                import hashlib
                 import sqlite3
 
                 conn = sqlite3.connect(str(self.db_path))
@@ -633,24 +634,29 @@ class StartupHandler(BaseHandler):
                 ).fetchall()
 
                 if core_files:
+                    from core.fingerprint import get_cache
+
                     system_dir = self.base_path
                     bach_root = self.base_path.parent
                     combined_hash = hashlib.sha256()
                     files_hashed = 0
 
+                    abs_paths = []
                     for (rel_path,) in core_files:
                         if '*' in rel_path:
                             continue
                         abs_path = system_dir / rel_path
                         if not abs_path.exists():
                             abs_path = bach_root / rel_path
-                        if abs_path.exists() and abs_path.is_file():
-                            try:
-                                file_hash = hashlib.sha256(abs_path.read_bytes()).hexdigest()
-                                combined_hash.update(file_hash.encode())
-                                files_hashed += 1
-                            except (OSError, IOError):
-                                pass
+                        abs_paths.append(abs_path)
+
+                    # Stat-Cache: nur geaenderte Dateien werden neu gelesen
+                    file_hashes = get_cache(self.db_path).hash_files(abs_paths, paranoid=paranoid)
+                    for abs_path in abs_paths:
+                        file_hash = file_hashes.get(abs_path)
+                        if file_hash:
+                            combined_hash.update(file_hash.encode())
+                            files_hashed += 1
 
                     current_hash = combined_hash.hexdigest()[:16]
 
@@ -1267,15 +1273,14 @@ class StartupHandler(BaseHandler):
             results.append(f" [ERROR] {e}")
         
         # ══════════════════════════════════════════════════════════════
-        # 8. AUTOLOG (.txt - bleibt Datei-basiert!)
+        # 8. AUTOLOG (Tages-Segmente - bleibt Datei-basiert!)
         # ══════════════════════════════════════════════════════════════
         results.append("")
         results.append("[AUTOLOG]")
-        autolog = self.base_path / "data" / "logs" / "auto_log.txt"
-        if autolog.exists():
-            try:
-                content = autolog.read_text(encoding="utf-8")
-                lines = content.strip().split("\n")
+        try:
+            from tools.autolog import AutoLogger
+            lines = AutoLogger(self.base_path).tail()
+            if lines:
                 results.append(f" {len(lines)} Eintraege")
                 # Letzte 3 Befehle
                 cmd_lines = [l for l in lines if "CMD:" in l][-3:]
@@ -1286,10 +1291,10 @@ class StartupHandler(BaseHandler):
                         if len(parts) > 1:
                             results.append(f"   {parts[1].strip()[:40]}")
                 results.append(" --> bach logs tail 20 fuer mehr")
-            except:
-                results.append(" [?] Nicht lesbar")
-        else:
-            results.append(" Kein Autolog vorhanden")
+            else:
+                results.append(" Kein Autolog vorhanden")
+        except Exception:
+            results.append(" [?] Nicht lesbar")
         
         # ══════════════════════════════════════════════════════════════
         # 9. INJEKTOREN
@@ -295,47 +295,16 @@ class TaskHandler(BaseHandler):
                 unassigned_only = True
             i += 1
         
-        # Query aufbauen
-        conditions = []
-        params = []
-        
-        if status_filter:
-            conditions.append("status = ?")
-            params.append(status_filter)
-        
-        if filter_text:
-            conditions.append("title LIKE ?")
-            params.append(f"%{filter_text}%")
-        
-        if assigned_filter:
-            conditions.append("(assigned_to = ? OR delegated_to = ?)")
-            params.extend([assigned_filter, assigned_filter])
-        
-        if unassigned_only:
-            conditions.append("(assigned_to IS NULL OR assigned_to = '') AND (delegated_to IS NULL OR delegated_to = '')")
-        
-        where_clause = " AND ".join(conditions) if conditions else "1=1"
-        
+        from ._services.tasks.task_query import list_tasks
         with self._get_db() as conn:
-            rows = conn.execute(f"""
-                SELECT id, priority, title, status, category, assigned_to, delegated_to, depends_on 
-                FROM tasks 
-                WHERE {where_clause}
-                ORDER BY priority, id
-            """, params).fetchall()
-            
-            # Tasks in Liste umwandeln und Abhängigkeiten prüfen
-            task_list = []
-            for r in rows:
-                item = dict(r)
-                is_blocked = False
-                if item['depends_on']:
-                    dep_ids = [int(x.strip()) for x in item['depends_on'].split(',') if x.strip()]
-                    total_unfinished = conn.execute(f"SELECT COUNT(*) FROM tasks WHERE id IN ({','.join(['?']*len(dep_ids))}) AND status != 'done'", dep_ids).fetchone()[0]
-                    if total_unfinished > 0:
-                        is_blocked = True
-                item['is_blocked_by_dep'] = is_blocked
-                task_list.append(item)
+            task_list = list_tasks(
+                conn,
+                status=status_filter,
+                partner=assigned_filter,
+                unassigned=unassigned_only,
+                title_contains=filter_text,
+                limit=None,
+            ).tasks
         
         if not task_list:
             filter_desc = []
@@ -59,6 +59,11 @@ class ToolsHandler(BaseHandler):
         conn.row_factory = sqlite3.Row
         return conn
     
+    def _catalog(self):
+        """Geteilter Skill-/Tool-Katalog (FTS5, mtime-gepflegt)."""
+        from tools.catalog_index import get_catalog
+        return get_catalog(self.base_path)
+    
     def handle(self, operation: str, args: list, dry_run: bool = False) -> tuple:
         if operation == "db":
             return self._list_db(args)
@@ -270,12 +275,10 @@ class ToolsHandler(BaseHandler):
                     results.append(f"  {row['use_for']}")
                 return True, "\n".join(results)
         
-        # Dann im Dateisystem suchen
-        found = None
-        for tool_file in self.tools_dir.rglob("*.py"):
-            if name.lower() in tool_file.stem.lower():
-                found = tool_file
-                break
+        # Dann im Katalog suchen
+        catalog = self._catalog()
+        entry = catalog.resolve("tool", name)
+        found = catalog.path(entry) if entry else None
         
         if not found:
             return False, f"Tool nicht gefunden: {name}\nNutze: bach tools list"
@@ -316,19 +319,10 @@ class ToolsHandler(BaseHandler):
     
     def _run(self, name: str, args: list, dry_run: bool) -> tuple:
         """Tool ausfuehren."""
-        # Tool suchen
-        found = None
-        for tool_file in self.tools_dir.glob("*.py"):
-            if name.lower() == tool_file.stem.lower():
-                found = tool_file
-                break
-        
-        if not found:
-            # Auch mit Prefix suchen
-            for tool_file in self.tools_dir.glob("*.py"):
-                if name.lower() in tool_file.stem.lower():
-                    found = tool_file
-                    break
+        # Tool suchen (nur tools/*.py: exakt, dann Teilstring)
+        catalog = self._catalog()
+        entry = catalog.resolve("tool", name, top_level=True)
+        found = catalog.path(entry) if entry else None
         
         if not found:
             return False, f"Tool nicht gefunden: {name}\nNutze: bach tools list"
@@ -368,7 +362,6 @@ class ToolsHandler(BaseHandler):
         results = [f"TOOL-SUCHE: '{term}'", "=" * 50]
         
         found = []
-        term_lower = term.lower()
         
         # In Datenbank suchen
         if self.db_path.exists():
@@ -383,35 +376,26 @@ class ToolsHandler(BaseHandler):
             
             for row in db_results:
                 found.append((row['name'], f"DB/{row['type']}", row['description']))
+        db_count = len(found)
         
-        # Im Dateisystem suchen
-        for tool_file in self.tools_dir.rglob("*.py"):
-            if tool_file.name.startswith('__'):
-                continue
-            
-            # Im Namen suchen
-            if term_lower in tool_file.stem.lower():
-                found.append((tool_file.stem, "Script", ""))
-                continue
-            
-            # Im Inhalt suchen
-            try:
-                content = tool_file.read_text(encoding='utf-8', errors='ignore').lower()
-                if term_lower in content:
-                    found.append((tool_file.stem, "Script/Inhalt", ""))
-            except:
-                pass
+        # Im Katalog suchen (Name, Docstring, Inhalt - nach Relevanz)
+        catalog = self._catalog()
+        for hit in catalog.search(term, kind="tool", limit=25):
+            entry = hit['entry']
+            source = "Script" if hit['match'] == "Name" else "Script/Inhalt"
+            found.append((entry.name, source, entry.description or hit['snippet']))
+        total = db_count + (catalog.count(term, kind="tool") if len(found) > db_count else 0)
         
         if not found:
             results.append(f"Keine Tools gefunden fuer: {term}")
         else:
-            results.append(f"Gefunden: {len(found)}\n")
+            results.append(f"Gefunden: {total}\n")
             for name, source, desc in found[:25]:
                 desc_short = (desc or '')[:35]
                 results.append(f"  [{source}] {name:<20} {desc_short}")
             
-            if len(found) > 25:
-                results.append(f"\n  ... und {len(found) - 25} weitere")
+            if total > 25:
+                results.append(f"\n  ... und {total - 25} weitere")
         
         return True, "\n".join(results)
     
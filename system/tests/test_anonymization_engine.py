@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+# SPDX-License-Identifier: MIT
+"""
+Copyright (c) 2026 BACH Contributors
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+"""
+Tests fuer hub/_services/document/anonymization_engine.py - Ersetzung in einem Durchlauf
+=========================================================================================
+"""
+
+import sys
+from collections import Counter
+from pathlib import Path
+
+import pytest
+
+SYSTEM_ROOT = Path(__file__).parent.parent
+if str(SYSTEM_ROOT) not in sys.path:
+    sys.path.insert(0, str(SYSTEM_ROOT))
+
+MAPPINGS = {
+    "names": {"Max Mustermann": "Felix Bergmann", "Max": "Felix", "Dr. Meyer": "Dr. Lindner"},
+    "dates": {"15.03.2016": "22.07.2016"},
+    "addresses": {"Musterstr. 5": "Waldweg 12"},
+}
+
+
+def _profile(mappings=MAPPINGS):
+    from hub._services.document.anonymizer_service import AnonymProfile
+    return AnonymProfile(client_id="K_TEST", tarnname="Felix Bergmann",
+                         fake_geburtsdatum="22.07.2016", mappings=mappings)
+
+
+class TestReplacementEngine:
+    def test_longest_match_and_counts(self):
+        from hub._services.document.anonymization_engine import ReplacementEngine
+
+        engine = ReplacementEngine(MAPPINGS)
+        text, counts = engine.replace_counted(
+            "Max Mustermann (geb. 15.03.2016), Musterstr. 5. Max war bei Dr. Meyer.")
+        assert text == "Felix Bergmann (geb. 22.07.2016), Waldweg 12. Felix war bei Dr. Lindner."
+        assert counts == Counter(names=3, dates=1, addresses=1)
+
+    def test_no_cascading_replacements(self):
+        from hub._services.document.anonymization_engine import ReplacementEngine
+
+        # Frueher: "Anna" -> "Lena", danach "Lena" -> "Mia"
+        engine = ReplacementEngine({"names": {"Anna": "Lena", "Lena": "Mia"}})
+        assert engine.replace("Anna und Lena") == "Lena und Mia"
+
+    def test_replace_runs_keeps_untouched_runs(self):
+        from hub._services.document.anonymization_engine import ReplacementEngine
+
+        engine = ReplacementEngine(MAPPINGS)
+        runs = ["Bericht ueber ", "Max Muster", "mann", " am ", "15.03.2016", " (fett)"]
+        counts = Counter()
+        new = engine.replace_runs(runs, counts)
+        assert "".join(new) == "Bericht ueber Felix Bergmann am 22.07.2016 (fett)"
+        assert new[0] == runs[0] and new[3] == runs[3] and new[5] == runs[5]
+        assert new[1] == "Felix Bergmann" and new[2] == ""
+        assert new[4] == "22.07.2016"
+        assert counts == Counter(names=1, dates=1)
+        assert engine.replace_runs(["nichts", " hier"]) is None
+
+    def test_empty_profile_is_identity(self):
+        from hub._services.document.anonymization_engine import ReplacementEngine
+
+        engine = ReplacementEngine.for_profile(None)
+        assert not engine
+        assert engine.replace("Max") == "Max"
+        assert engine.replace_runs(["Max"]) is None
+
+    def test_for_profile_cache_follows_mappings(self):
+        from hub._services.document.anonymization_engine import ReplacementEngine
+
+        profile = _profile({"names": {"Max": "Felix"}})
+        first = ReplacementEngine.for_profile(profile)
+        assert ReplacementEngine.for_profile(profile) is first
+        profile.mappings["names"]["Moritz"] = "Paul"
+        assert ReplacementEngine.for_profile(profile).replace("Moritz") == "Paul"
+
+
+class TestAnonymizerIntegration:
+    def test_text_file_counts_by_category(self, tmp_path):
+        from hub._services.document.anonymizer_service import DocumentAnonymizer
+
+        f = tmp_path / "akte.txt"
+        f.write_text("Max Mustermann, 15.03.2016, Max", encoding="utf-8")
+        counts = Counter()
+        ok, n = DocumentAnonymizer().anonymize_file(str(f), _profile(), counts)
+        assert ok and n == 3
+        assert counts == Counter(names=2, dates=1)
+        assert f.read_text(encoding="utf-8") == "Felix Bergmann, 22.07.2016, Felix"
+
+    def test_docx_preserves_run_formatting(self, tmp_path):
+        docx = pytest.importorskip("docx")
+        from hub._services.document.anonymizer_service import DocumentAnonymizer
+
+        path = tmp_path / "akte.docx"
+        doc = docx.Document()
+        p = doc.add_paragraph()
+        p.add_run("Klient: ")
+        p.add_run("Max Muster").bold = True
+        p.add_run("mann").bold = True
+        p.add_run(" wohnt ")
+        p.add_run("Musterstr. 5").italic = True
+        doc.save(str(path))
+
+        ok, n = DocumentAnonymizer().anonymize_file(str(path), _profile())
+        assert ok and n == 2
+        runs = docx.Document(str(path)).paragraphs[0].runs
+        assert "".join(r.text for r in runs) == "Klient: Felix Bergmann wohnt Waldweg 12"
+        assert runs[1].bold and runs[1].text == "Felix Bergmann"
+        assert runs[4].italic and runs[4].text == "Waldweg 12"
+        assert runs[0].bold is None
@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+# SPDX-License-Identifier: MIT
+"""
+Copyright (c) 2026 BACH Contributors
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+
+
+"""
+Tests fuer tools/autolog.py - Tages-Segmente, Puffer, Tail, Migration
+======================================================================
+"""
+
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+SYSTEM_ROOT = Path(__file__).parent.parent
+if str(SYSTEM_ROOT) not in sys.path:
+    sys.path.insert(0, str(SYSTEM_ROOT))
+
+from tools import autolog  # noqa: E402
+from tools.autolog import AutoLogger  # noqa: E402
+
+
+def _day(offset: int = 0) -> str:
+    return (datetime.now() - timedelta(days=offset)).strftime("%Y-%m-%d")
+
+
+class TestAutoLogger:
+    def test_init_touches_nothing_and_writes_are_buffered(self, tmp_path):
+        logger = AutoLogger(tmp_path)
+        assert not (tmp_path / "data").exists()
+
+        logger.cmd("task", ["list"])
+        logger.log("zweiter Eintrag")
+        assert not logger.log_dir.exists()
+
+        logger.flush()
+        segment = logger.segment_path(_day())
+        lines = segment.read_text(encoding="utf-8").splitlines()
+        assert len(lines) == 2
+        assert lines[0].endswith("CMD: task list")
+        assert lines[0][1:11] == _day()
+
+    def test_error_and_full_buffer_flush_immediately(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(autolog, "FLUSH_LINES", 3)
+        logger = AutoLogger(tmp_path)
+        logger.log("[ERROR] kaputt")
+        assert logger.segment_path(_day()).exists()
+        for i in range(3):
+            logger.log(f"eintrag {i}")
+        assert logger._buffer == []
+
+    def test_tail_spans_segments_and_blocks(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(autolog, "TAIL_BLOCK", 64)
+        logger = AutoLogger(tmp_path)
+        logger.log_dir.mkdir(parents=True)
+        older = [f"[{_day(1)} 10:00:{i:02d}] alt {i}" for i in range(50)]
+        logger.segment_path(_day(1)).write_text("\n".join(older) + "\n", encoding="utf-8")
+        for i in range(5):
+            logger.log(f"neu {i}")
+
+        tail = logger.tail(8)
+        assert tail[:3] == older[-3:]
+        assert [l.split("] ", 1)[1] for l in tail[3:]] == [f"neu {i}" for i in range(5)]
+        assert logger.tail(500)[0] == older[0]
+        assert logger.count()["entries"] == 55
+
+    def test_retention_deletes_old_segments_on_new_day(self, tmp_path):
+        logger = AutoLogger(tmp_path)
+        logger.log_dir.mkdir(parents=True)
+        old = logger.segment_path(_day(autolog.ARCHIVE_DAYS + 5))
+        kept = logger.segment_path(_day(3))
+        old.write_text("[x] alt\n", encoding="utf-8")
+        kept.write_text("[x] neu\n", encoding="utf-8")
+
+        logger.log("heute")
+        logger.flush()
+        assert not old.exists()
+        assert kept.exists()
+
+    def test_legacy_files_are_migrated_once(self, tmp_path):
+        logs = tmp_path / "data" / "logs"
+        logs.mkdir(parents=True)
+        ancient = _day(autolog.ARCHIVE_DAYS + 10)
+        (logs / "auto_log_extended.txt").write_text(
+            f"[{ancient} 08:00:00] viel zu alt\n"
+            f"[{_day(2)} 09:00:00] CMD: vorgestern\n"
+            "Fortsetzungszeile\n", encoding="utf-8")
+        (logs / "auto_log.txt").write_text(f"[{_day(1)} 09:00:00] CMD: gestern\n", encoding="utf-8")
+
+        logger = AutoLogger(tmp_path)
+        logger.cmd("heute")
+        logger.flush()
+
+        assert not (logs / "auto_log.txt").exists()
+        assert not (logs / "auto_log_extended.txt").exists()
+        assert [p.stem for p in logger.segments()] == [_day(2), _day(1), _day()]
+        assert logger.segment_path(_day(2)).read_text(encoding="utf-8").splitlines()[1] == "Fortsetzungszeile"
+        assert [l.split("CMD: ")[1] for l in logger.tail() if "CMD:" in l] == ["vorgestern", "gestern", "heute"]
+
+    def test_read_since_filters_by_timestamp(self, tmp_path):
+        logger = AutoLogger(tmp_path)
+        logger.log_dir.mkdir(parents=True)
+        logger.segment_path(_day(1)).write_text(f"[{_day(1)} 23:00:00] CMD: gestern\n", encoding="utf-8")
+        logger.segment_path(_day()).write_text(
+            f"[{_day()} 00:00:01] CMD: frueh\n[{_day()} 00:00:05] CMD: spaeter\n", encoding="utf-8")
+
+        since = datetime.strptime(f"{_day()} 00:00:03", "%Y-%m-%d %H:%M:%S")
+        assert [l.split("CMD: ")[1] for l in logger.read_since(since)] == ["spaeter"]
@@ -0,0 +1,229 @@
+# -*- coding: utf-8 -*-
+# SPDX-License-Identifier: MIT
+"""
+Copyright (c) 2026 BACH Contributors
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+
+
+"""
+Tests fuer tools/backup_store.py - inkrementelle, deduplizierte Backups
+========================================================================
+"""
+
+import os
+import sqlite3
+import sys
+from pathlib import Path
+
+import pytest
+
+SYSTEM_ROOT = Path(__file__).parent.parent
+if str(SYSTEM_ROOT) not in sys.path:
+    sys.path.insert(0, str(SYSTEM_ROOT))
+
+from tools.backup_store import BackupError, BackupStore  # noqa: E402
+import tools.backup_store as backup_store  # noqa: E402
+
+
+@pytest.fixture
+def instance(tmp_path, monkeypatch):
+    """Mini-Instanz: Ordner mit Dateien + DB mit tasks."""
+    monkeypatch.setattr(backup_store, "CHUNK_SIZE", 4096)
+    monkeypatch.setattr(backup_store, "ROWS_PER_CHUNK", 100)
+    base = tmp_path / "bach"
+    (base / "memory").mkdir(parents=True)
+    (base / "data" / "logs").mkdir(parents=True)
+    (base / "memory" / "notes.md").write_text("Notiz\n" * 100, encoding="utf-8")
+    (base / "data" / "logs" / "app.log").write_bytes(os.urandom(20000))
+    db = base / "data" / "bach.db"
+    conn = sqlite3.connect(str(db))
+    conn.execute("CREATE TABLE tasks (id INTEGER PRIMARY KEY, title TEXT, data BLOB)")
+    conn.executemany("INSERT INTO tasks VALUES (?, ?, ?)",
+                     [(i, f"Task {i}", b"\x00\x01" if i == 7 else None) for i in range(1, 1001)])
+    conn.execute("CREATE TABLE kv (k TEXT PRIMARY KEY, v TEXT) WITHOUT ROWID")
+    conn.execute("INSERT INTO kv VALUES ('a', '1')")
+    conn.commit()
+    conn.close()
+    return base, db, BackupStore(tmp_path / "store")
+
+
+def _backup(store, base, db, name, **kw):
+    return store.create(name, base_dir=base, dirs=[base / "memory", base / "data" / "logs"],
+                        db_path=db, tables=["tasks", "kv", "fehlt"], **kw)
+
+
+class TestBackupStore:
+    def test_second_backup_is_incremental(self, instance):
+        base, db, store = instance
+        manifest, first = _backup(store, base, db, "b1")
+        assert first.files == 2 and first.tables == 2 and first.rows == 1001
+        assert set(manifest["tables"]) == {"tasks", "kv"}
+        assert len(manifest["tables"]["tasks"]["chunks"]) == 11   # rowid 1-99, 100-199, ..., 1000
+
+        # Log waechst, eine Zeile aendert sich, Rest unveraendert
+        with open(base / "data" / "logs" / "app.log", "ab") as f:
+            f.write(b"neue Zeile\n")
+        conn = sqlite3.connect(str(db))
+        conn.execute("UPDATE tasks SET title = 'geaendert' WHERE id = 555")
+        conn.commit()
+        conn.close()
+
+        _, second = _backup(store, base, db, "b2")
+        assert second.files_unchanged == 1
+        assert second.new_chunks == 2          # letzter Log-Chunk + rowid-Bereich 500-599
+        assert second.stored_bytes < first.stored_bytes / 5
+        assert second.dedup_ratio > 10
+
+        _, third = _backup(store, base, db, "b3")
+        assert third.new_chunks == 0 and third.format().endswith("alles dedupliziert)")
+
+    def test_restore_roundtrip_and_verify(self, instance, tmp_path):
+        base, db, store = instance
+        original_log = (base / "data" / "logs" / "app.log").read_bytes()
+        _backup(store, base, db, "b1", db_snapshot=True)
+
+        (base / "data" / "logs" / "app.log").write_bytes(b"kaputt")
+        conn = sqlite3.connect(str(db))
+        conn.execute("DELETE FROM tasks WHERE id > 10")
+        conn.execute("INSERT INTO tasks VALUES (5000, 'neu', NULL)")
+        conn.commit()
+        conn.close()
+
+        assert store.verify("b1") == (True, [])
+        result = store.restore("b1", base, db_path=db, snapshot_target=tmp_path / "snap.db")
+        assert result == {"files": 2, "tables": 2, "rows": 1001, "snapshot": 1}
+        assert (base / "data" / "logs" / "app.log").read_bytes() == original_log
+        conn = sqlite3.connect(str(db))
+        assert conn.execute("SELECT COUNT(*), MAX(id) FROM tasks").fetchone() == (1000, 1000)
+        assert conn.execute("SELECT data FROM tasks WHERE id = 7").fetchone()[0] == b"\x00\x01"
+        conn.close()
+        snap = sqlite3.connect(str(tmp_path / "snap.db"))
+        assert snap.execute("SELECT COUNT(*) FROM tasks").fetchone()[0] == 1000
+        snap.close()
+
+    def test_restore_skips_empty_and_unselected_tables(self, instance):
+        base, db, store = instance
+        conn = sqlite3.connect(str(db))
+        conn.execute("DELETE FROM kv")
+        conn.commit()
+        _backup(store, base, db, "b1")
+        conn.execute("INSERT INTO kv VALUES ('live', 'x')")
+        conn.execute("DELETE FROM tasks WHERE id > 10")
+        conn.commit()
+
+        result = store.restore("b1", base, db_path=db)
+        assert result["tables"] == 1 and result["rows"] == 1000
+        assert conn.execute("SELECT * FROM kv").fetchall() == [("live", "x")]
+
+        conn.execute("DELETE FROM tasks WHERE id > 10")
+        conn.commit()
+        assert store.restore("b1", base, db_path=db, tables=["kv"])["tables"] == 0
+        assert conn.execute("SELECT COUNT(*) FROM tasks").fetchone()[0] == 10
+        conn.close()
+
+    def test_verify_detects_damage_and_restore_keeps_file(self, instance):
+        base, db, store = instance
+        manifest, _ = _backup(store, base, db, "b1")
+        digest = manifest["files"]["memory/notes.md"]["chunks"][0]
+        store.objects._path(digest).write_bytes(b"muell")
+
+        ok, problems = store.verify("b1")
+        assert not ok and "memory/notes.md" in problems[0]
+        (base / "memory" / "notes.md").write_text("aktuell", encoding="utf-8")
+        with pytest.raises(BackupError):
+            store.restore("b1", base, tables=())
+        assert (base / "memory" / "notes.md").read_text(encoding="utf-8") == "aktuell"
+
+    def test_rotate_collects_unreferenced_chunks(self, instance):
+        base, db, store = instance
+        _backup(store, base, db, "b1")
+        (base / "data" / "logs" / "app.log").write_bytes(os.urandom(20000))
+        _backup(store, base, db, "b2")
+        before = len(list(store.objects.digests()))
+
+        assert store.rotate(keep=1) == ["b1"]
+        assert store.list_manifests() == ["b2"]
+        assert len(list(store.objects.digests())) == before - 5   # alter Log-Inhalt
+        assert store.verify("b2")[0]
+
+    def test_copy_to_is_incremental(self, instance, tmp_path):
+        base, db, store = instance
+        _backup(store, base, db, "b1")
+        copied = store.copy_to(tmp_path / "nas", "b1")
+        assert copied > 0
+        (base / "memory" / "notes.md").write_text("neu", encoding="utf-8")
+        _backup(store, base, db, "b2")
+        assert store.copy_to(tmp_path / "nas", "b2") == 1
+        assert BackupStore(tmp_path / "nas").verify("b2")[0]
+
+
+class TestBackupManagerRestore:
+    def test_restore_oldest_keeps_source_backup(self, instance, tmp_path, monkeypatch):
+        import tools.backup_manager as backup_manager
+
+        base, db, _ = instance
+        for attr, path in (("BACH_DIR", base), ("MEMORY_DIR", base / "memory"),
+                           ("LOGS_DIR", base / "data" / "logs"), ("USER_DIR", base / "user"),
+                           ("SNAPSHOTS_DIR", tmp_path / "snapshots")):
+            monkeypatch.setattr(backup_manager, attr, path)
+        monkeypatch.setattr(backup_manager, "USER_TABLES", ["tasks", "kv"])
+        manager = backup_manager.BackupManager(backups_dir=tmp_path / "backups", db_path=db)
+
+        names = [f"userdata_2026-01-0{i}_000000" for i in range(1, 8)]
+        for name in names:
+            _backup(manager.store, base, db, name)
+        (base / "memory" / "notes.md").write_text("ueberschrieben", encoding="utf-8")
+
+        ok, result = manager.restore_backup(names[0], force=True, auto_backup=True)
+
+        assert ok, result
+        assert (base / "memory" / "notes.md").read_text(encoding="utf-8") == "Notiz\n" * 100
+        manifests = manager.store.list_manifests()
+        assert manifests[:7] == names and len(manifests) == 8   # Auto-Backup ohne Rotation
+        assert manager.store.verify(names[0])[0]
+
+    def test_restore_replaces_only_default_tables(self, instance, tmp_path, monkeypatch):
+        import tools.backup_manager as backup_manager
+
+        base, db, _ = instance
+        for attr, path in (("BACH_DIR", base), ("MEMORY_DIR", base / "memory"),
+                           ("LOGS_DIR", base / "data" / "logs"), ("USER_DIR", base / "user"),
+                           ("SNAPSHOTS_DIR", tmp_path / "snapshots")):
+            monkeypatch.setattr(backup_manager, attr, path)
+        monkeypatch.setattr(backup_manager, "USER_TABLES", ["tasks", "kv"])
+        manager = backup_manager.BackupManager(backups_dir=tmp_path / "backups", db_path=db)
+        _backup(manager.store, base, db, "userdata_2026-01-01_000000")
+        conn = sqlite3.connect(str(db))
+        conn.execute("INSERT INTO kv VALUES ('live', 'x')")
+        conn.execute("DELETE FROM tasks WHERE id > 10")
+        conn.commit()
+
+        ok, result = manager.restore_backup("latest", force=True, auto_backup=False)
+        assert ok, result
+        assert conn.execute("SELECT COUNT(*) FROM tasks").fetchone()[0] == 1000
+        assert conn.execute("SELECT COUNT(*) FROM kv").fetchone()[0] == 2
+
+        ok, result = manager.restore_backup("latest", force=True, auto_backup=False,
+                                            tables=["kv"])
+        assert ok, result
+        assert conn.execute("SELECT * FROM kv").fetchall() == [("a", "1")]
+        conn.close()
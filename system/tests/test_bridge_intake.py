@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+# SPDX-License-Identifier: MIT
+"""
+Copyright (c) 2026 BACH Contributors
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+"""
+Tests fuer hub/_services/claude_bridge/message_intake.py - Weckruf + adaptives Batching
+========================================================================================
+"""
+
+import sqlite3
+import sys
+import threading
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+SYSTEM_ROOT = Path(__file__).parent.parent
+BRIDGE_DIR = SYSTEM_ROOT / "hub" / "_services" / "claude_bridge"
+if str(BRIDGE_DIR) not in sys.path:
+    sys.path.insert(0, str(BRIDGE_DIR))
+
+
+@pytest.fixture
+def db(tmp_path):
+    path = tmp_path / "bach.db"
+    conn = sqlite3.connect(str(path))
+    conn.execute("""CREATE TABLE connector_messages (
+        id INTEGER PRIMARY KEY, connector_name TEXT, direction TEXT, sender TEXT,
+        recipient TEXT, content TEXT, status TEXT, created_at TEXT,
+        bridge_processed INTEGER DEFAULT 0)""")
+    conn.commit()
+    conn.close()
+
+    def connect():
+        c = sqlite3.connect(str(path))
+        c.row_factory = sqlite3.Row
+        return c
+    return connect
+
+
+def _insert(connect, text, age_seconds=0):
+    c = connect()
+    c.execute("INSERT INTO connector_messages (connector_name, direction, sender, content, created_at) "
+              "VALUES ('telegram_main', 'in', 'u', ?, ?)",
+              (text, (datetime.now() - timedelta(seconds=age_seconds)).isoformat()))
+    c.commit()
+    c.close()
+
+
+class TestMessageIntake:
+    def _intake(self, connect, **kw):
+        from message_intake import MessageIntake
+        intake = MessageIntake(connect, "telegram_main", fallback_check=0, **kw)
+        intake._pending_check = False
+        return intake
+
+    def test_idle_timeout_without_db_access(self, db):
+        intake = self._intake(db)
+        statements = []
+        orig = intake.connect
+        intake.connect = lambda: statements.append(1) or orig()
+        assert intake.next_batch(0.05) == []
+        assert statements == []
+
+    def test_notify_flushes_after_idle_gap(self, db):
+        intake = self._intake(db, idle_gap=0.1, max_wait=5)
+        _insert(db, "a")
+        intake.notify()
+
+        def later():
+            time.sleep(0.03)
+            _insert(db, "b")
+            intake.notify()
+        threading.Thread(target=later).start()
+
+        start = time.monotonic()
+        batch = intake.next_batch(1)
+        assert [m["content"] for m in batch] == ["a", "b"]
+        assert time.monotonic() - start < 1
+
+    def test_max_batch_flushes_immediately(self, db):
+        intake = self._intake(db, idle_gap=5, max_batch=2)
+        _insert(db, "a")
+        _insert(db, "b")
+        intake.notify()
+        start = time.monotonic()
+        assert len(intake.next_batch(1)) == 2
+        assert time.monotonic() - start < 1
+
+    def test_stale_and_processed_single_updates(self, db):
+        intake = self._intake(db, idle_gap=0.01, max_age=60)
+        _insert(db, "old", age_seconds=600)
+        _insert(db, "new1")
+        _insert(db, "new2")
+        intake.notify()
+
+        statements = []
+        orig = intake.connect
+
+        def traced():
+            c = orig()
+            c.set_trace_callback(statements.append)
+            return c
+        intake.connect = traced
+
+        batch = intake.next_batch(1)
+        assert [m["content"] for m in batch] == ["new1", "new2"]
+        assert intake.mark_processed([m["id"] for m in batch]) == 2
+        assert sum(s.startswith("UPDATE") for s in statements) == 2
+
+        c = db()
+        assert c.execute("SELECT COUNT(*) FROM connector_messages WHERE bridge_processed = 0").fetchone()[0] == 0
+
+    def test_udp_wakeup(self, db, tmp_path, monkeypatch):
+        import message_intake
+        port_file = tmp_path / "wakeup.port"
+        monkeypatch.setattr(message_intake, "WAKEUP_PORT_FILE", port_file)
+        intake = self._intake(db)
+        assert intake.signal.start_listener(port_file)
+        try:
+            assert message_intake.notify_bridge()
+            assert intake.signal.wait(2)
+        finally:
+            intake.signal.stop_listener(port_file)
+        assert not port_file.exists()
+        assert not message_intake.notify_bridge()
+
+    def test_data_version_fallback(self, db):
+        intake = self._intake(db, idle_gap=0.01)
+        intake.fallback_check = 0.02
+        intake._db_changed()  # Basiswert
+        _insert(db, "ohne Weckruf")
+        assert [m["content"] for m in intake.next_batch(1)] == ["ohne Weckruf"]
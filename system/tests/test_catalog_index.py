@@ -0,0 +1,171 @@
+# -*- coding: utf-8 -*-
+# SPDX-License-Identifier: MIT
+"""
+Copyright (c) 2026 BACH Contributors
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+
+
+"""
+Tests fuer tools/catalog_index.py - FTS5-Katalog fuer Skills und Tools
+======================================================================
+"""
+
+import os
+import sqlite3
+import sys
+from pathlib import Path
+
+import pytest
+
+SYSTEM_ROOT = Path(__file__).parent.parent
+if str(SYSTEM_ROOT) not in sys.path:
+    sys.path.insert(0, str(SYSTEM_ROOT))
+
+from tools.catalog_index import CatalogIndex  # noqa: E402
+
+
+def _write(path: Path, text: str):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+
+
+@pytest.fixture
+def base(tmp_path):
+    _write(tmp_path / "skills" / "_services" / "backup-manager.md",
+           "---\nname: backup-manager\ndescription: Sichert Userdaten\nversion: 1.2.0\n---\n"
+           "# Backup\nInkrementelle Sicherung mit Rotation.\n")
+    _write(tmp_path / "skills" / "workflows" / "steuer-export.md",
+           "# Steuer-Export\nErstellt den Export fuer die Steuererklaerung inkl. Backup der Belege.\n")
+    _write(tmp_path / "skills" / "TEMPLATE_HELP.txt",
+           "# Version: 1.0.0\n\nHILFE-VORLAGE\nText.\n")
+    _write(tmp_path / "tools" / "ocr_engine.py",
+           '"""\nTool: ocr_engine\nVersion: 2.0.0\n\nDescription:\n    Texterkennung fuer Scans.\n\n'
+           'Usage:\n    python ocr_engine.py <datei>\n"""\n')
+    _write(tmp_path / "tools" / "rag" / "ocr_index.py", '"""Index fuer OCR-Ergebnisse."""\n')
+    _write(tmp_path / "tools" / "__init__.py", "")
+    (tmp_path / "data").mkdir()
+    sqlite3.connect(str(tmp_path / "data" / "bach.db")).close()
+    return tmp_path
+
+
+class TestMaintenance:
+    def test_only_changed_files_are_read(self, base, monkeypatch):
+        catalog = CatalogIndex(base)
+        assert catalog.refresh(force=True) == {"added": 5, "updated": 0, "removed": 0}
+
+        reads = []
+        original = CatalogIndex._read_entry
+
+        def counting(self, kind, rel_path, *args):
+            reads.append(rel_path)
+            return original(self, kind, rel_path, *args)
+        monkeypatch.setattr(CatalogIndex, "_read_entry", counting)
+
+        assert catalog.refresh(force=True) == {"added": 0, "updated": 0, "removed": 0}
+        assert reads == []
+
+        target = base / "skills" / "workflows" / "steuer-export.md"
+        target.write_text("# Steuer-Export\nNeu: Quittungen scannen.\n", encoding="utf-8")
+        os.utime(target, ns=(1, 1))
+        (base / "tools" / "rag" / "ocr_index.py").unlink()
+        assert catalog.refresh(force=True) == {"added": 0, "updated": 1, "removed": 1}
+        assert reads == ["workflows/steuer-export.md"]
+        assert catalog.resolve("tool", "ocr_index") is None
+        assert catalog.search("Quittungen", kind="skill")[0]["entry"].name == "steuer-export"
+
+    def test_catalog_persists_in_bach_db(self, base):
+        CatalogIndex(base).refresh(force=True)
+        conn = sqlite3.connect(str(base / "data" / "bach.db"))
+        assert conn.execute("SELECT COUNT(*) FROM catalog_entries").fetchone()[0] == 5
+        conn.close()
+
+    def test_long_running_instance_sees_rows_of_other_process(self, base):
+        first = CatalogIndex(base)
+        assert [e.name for e in first.entries("tool")] == ["ocr_engine", "ocr_index"]
+
+        _write(base / "tools" / "beta.py", '"""\nTool: beta\n\nDescription:\n    Zweites Werkzeug.\n"""\n')
+        second = CatalogIndex(base)                     # z.B. CLI-Aufruf
+        assert second.refresh("tool", force=True)["added"] == 1
+
+        first.invalidate()
+        assert first.refresh("tool")["added"] == 0      # Zeile existiert schon
+        assert "beta" in [e.name for e in first.entries("tool")]
+        assert first.resolve("tool", "beta").description == "Zweites Werkzeug."
+        assert [r["entry"].name for r in first.search("werkzeug", kind="tool")] == ["beta"]
+
+
+class TestQueries:
+    def test_header_metadata(self, base):
+        catalog = CatalogIndex(base)
+        skill = catalog.resolve("skill", "backup-manager")
+        assert (skill.category, skill.description, skill.version) == ("services", "Sichert Userdaten", "1.2.0")
+        assert catalog.resolve("skill", "TEMPLATE_HELP").version == "1.0.0"
+        tool = catalog.resolve("tool", "ocr_engine")
+        assert tool.description == "Texterkennung fuer Scans."
+        assert tool.version == "2.0.0" and tool.usage == "python ocr_engine.py <datei>"
+
+    def test_resolve_exact_substring_and_top_level(self, base):
+        catalog = CatalogIndex(base)
+        assert catalog.resolve("tool", "OCR_ENGINE").rel_path == "ocr_engine.py"
+        assert catalog.resolve("tool", "index").rel_path == "rag/ocr_index.py"
+        assert catalog.resolve("tool", "index", top_level=True) is None
+        assert catalog.resolve("skill", "steuer", substring=False) is None
+
+    def test_search_ranks_name_then_content_with_snippet(self, base):
+        catalog = CatalogIndex(base)
+        hits = catalog.search("backup", kind="skill")
+        assert [h["match"] for h in hits] == ["Name", "Inhalt"]
+        assert hits[1]["entry"].name == "steuer-export"
+        assert ">>>Backup<<<" in hits[1]["snippet"]
+        assert catalog.count("backup", kind="skill") == 2
+        assert catalog.search("ocr")[0]["entry"].kind == "tool"
+        assert catalog.search('"(') == []  # kein FTS-Syntaxfehler
+
+    def test_content_substring_fallback_finds_word_parts(self, base):
+        catalog = CatalogIndex(base)
+        hits = catalog.search("klaerung", kind="skill")
+        assert [(h["entry"].name, h["match"], h["rank"]) for h in hits] == \
+            [("steuer-export", "Inhalt", None)]
+        assert "Steuerer>>>klaerung<<<" in hits[0]["snippet"]
+        assert catalog.count("klaerung") == 1
+        assert catalog.search("erung_", kind="skill") == []  # LIKE-Platzhalter maskiert
+
+
+class TestHandlers:
+    def test_skills_search_and_show(self, base):
+        from hub.skills import SkillsHandler
+        handler = SkillsHandler(base)
+        ok, text = handler.handle("search", ["backup"])
+        assert ok and "Gefunden: 2" in text and "[Name] _services/backup-manager.md" in text
+        ok, text = handler.handle("show", ["steuer"])
+        assert ok and "workflows/steuer-export.md" in text
+
+    def test_tools_run_only_top_level(self, base):
+        from hub.tools import ToolsHandler
+        (base / "data" / "bach.db").unlink()  # ohne DB: nur Katalog (im Speicher)
+        handler = ToolsHandler(base)
+        ok, text = handler.handle("run", ["ocr"], dry_run=True)
+        assert ok and "ocr_engine.py" in text
+        ok, _ = handler.handle("run", ["ocr_index"], dry_run=True)
+        assert not ok
+        ok, text = handler.handle("show", ["ocr_index"])
+        assert ok and "rag/ocr_index.py" in text.replace("\\", "/")
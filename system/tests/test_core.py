@@ -196,6 +196,41 @@ class TestDatabase:
         db.init_schema()
         assert "test_table" in db.tables()
 
+    def test_pool_reuses_connection(self):
+        from core.db import Database
+        db = Database(self.db_path, self.schema_dir)
+        db.init_schema()
+        before = db.pool.stats()
+        for i in range(5):
+            db.execute_write("INSERT INTO test_table (name) VALUES (?)", (f"n{i}",))
+        after = db.pool.stats()
+        assert after["hits"] - before["hits"] == 5
+        assert after["misses"] == before["misses"]
+        assert after["in_use"] == 0
+
+    def test_pool_readonly_query(self):
+        import sqlite3 as _sqlite3
+        from core.db import Database
+        db = Database(self.db_path, self.schema_dir)
+        db.init_schema()
+        db.execute_write("INSERT INTO test_table (name) VALUES (?)", ("Dora",))
+        assert db.query("SELECT name FROM test_table")[0]["name"] == "Dora"
+        with pytest.raises(_sqlite3.OperationalError):
+            with db.connect(readonly=True) as conn:
+                conn.execute("INSERT INTO test_table (name) VALUES ('x')")
+
+    def test_get_db_connection_close_returns_to_pool(self):
+        from core.db import get_db_connection, get_pool
+        conn = get_db_connection(self.db_path)
+        conn.execute("CREATE TABLE IF NOT EXISTS t (x)")
+        conn.close()
+        conn.close()  # Doppeltes close ist harmlos
+        pool = get_pool(self.db_path)
+        assert pool.stats()["in_use"] == 0
+        again = get_db_connection(self.db_path)
+        assert again is conn
+        again.close()
+
     def test_migrations(self):
         from core.db import Database
         # Migration erstellen
@@ -250,6 +285,57 @@ class TestHandlerRegistry:
         suggestions = reg.suggest("taks")  # Tippfehler
         assert "task" in suggestions
 
+    def test_manifest_lazy_import(self, tmp_path):
+        import textwrap
+        from core.registry import HandlerRegistry
+        hub_dir = tmp_path / "hub"
+        hub_dir.mkdir()
+        probe = hub_dir / "zz_manifest_probe.py"
+        probe.write_text(textwrap.dedent("""
+            from hub.base import BaseHandler
+
+            class ProbeHandler(BaseHandler):
+                @property
+                def profile_name(self):
+                    return "zzprobe"
+
+                @property
+                def target_file(self):
+                    return None
+
+                def get_operations(self):
+                    return {}
+
+                def handle(self, operation, args, dry_run=False):
+                    return True, "probe"
+        """), encoding="utf-8")
+        manifest = tmp_path / "manifest.json"
+        try:
+            reg = HandlerRegistry()
+            assert reg.discover(hub_dir, manifest_path=manifest) == 1
+            assert manifest.exists()
+
+            # Zweiter Lauf: Handler bekannt, Modul aber nicht importiert
+            sys.modules.pop("hub.zz_manifest_probe", None)
+            reg2 = HandlerRegistry()
+            assert reg2.discover(hub_dir, manifest_path=manifest) == 1
+            assert reg2.has("zzprobe")
+            assert "hub.zz_manifest_probe" not in sys.modules
+            handler = reg2.get("zzprobe", base_path=tmp_path)
+            assert handler.handle("", []) == (True, "probe")
+            assert "hub.zz_manifest_probe" in sys.modules
+
+            # Geaenderte Datei wird neu erfasst
+            sys.modules.pop("hub.zz_manifest_probe", None)
+            probe.write_text(probe.read_text(encoding="utf-8").replace(
+                '"zzprobe"', '"zzprobe2"'), encoding="utf-8")
+            reg3 = HandlerRegistry()
+            reg3.discover(hub_dir, manifest_path=manifest)
+            assert reg3.has("zzprobe2")
+            assert not reg3.has("zzprobe")
+        finally:
+            sys.modules.pop("hub.zz_manifest_probe", None)
+
     def test_levenshtein(self):
         from core.registry import HandlerRegistry
         assert HandlerRegistry._levenshtein("task", "task") == 0
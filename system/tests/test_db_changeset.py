@@ -0,0 +1,237 @@
+# -*- coding: utf-8 -*-
+# SPDX-License-Identifier: MIT
+"""
+Copyright (c) 2026 BACH Contributors
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+
+
+"""
+Tests fuer core/changeset.py und die Changeset-Replikation in hub/db_sync.py
+=============================================================================
+"""
+
+import sqlite3
+import sys
+from pathlib import Path
+
+import pytest
+
+SYSTEM_ROOT = Path(__file__).parent.parent
+if str(SYSTEM_ROOT) not in sys.path:
+    sys.path.insert(0, str(SYSTEM_ROOT))
+
+from core.changeset import (  # noqa: E402
+    ChangeCapture, list_changesets, parse_changeset_name, read_changeset,
+)
+from hub.db_sync import DBSyncManager  # noqa: E402
+
+
+SCHEMA = """
+CREATE TABLE tasks (id INTEGER PRIMARY KEY, title TEXT, status TEXT, updated_at TEXT, data BLOB);
+CREATE TABLE memory_context (key TEXT, scope TEXT, value TEXT, created_at TEXT,
+                             PRIMARY KEY (key, scope));
+CREATE TABLE connector_messages (content TEXT, created_at TEXT);
+"""
+
+
+def _make_db(path: Path, rows: int = 0) -> Path:
+    conn = sqlite3.connect(str(path))
+    conn.executescript(SCHEMA)
+    conn.executemany("INSERT INTO tasks (id, title, status, updated_at) VALUES (?, ?, 'open', '2026-01-01')",
+                     [(i, f"Task {i}") for i in range(1, rows + 1)])
+    conn.commit()
+    conn.close()
+    return path
+
+
+def _rows(path: Path, sql: str):
+    conn = sqlite3.connect(str(path))
+    try:
+        return conn.execute(sql).fetchall()
+    finally:
+        conn.close()
+
+
+@pytest.fixture
+def capture(tmp_path):
+    conn = sqlite3.connect(str(_make_db(tmp_path / "a.db")))
+    cap = ChangeCapture(conn)
+    cap.install(["tasks", "memory_context", "connector_messages", "fehlt"])
+    yield cap
+    conn.close()
+
+
+class TestChangeCapture:
+    def test_install_only_existing_tables(self, capture):
+        assert capture.captured_tables() == ["connector_messages", "memory_context", "tasks"]
+
+    def test_log_is_monotonic_and_export_compacts(self, capture, tmp_path):
+        conn = capture.conn
+        conn.execute("INSERT INTO tasks (id, title, updated_at, data) VALUES (1, 'A', '2026-05-01', x'00ff')")
+        conn.execute("UPDATE tasks SET title = 'A2' WHERE id = 1")
+        conn.execute("INSERT INTO tasks (id, title) VALUES (2, 'B')")
+        conn.execute("DELETE FROM tasks WHERE id = 2")
+        conn.execute("INSERT INTO memory_context VALUES ('k', 'user', 'v', '2026-05-01')")
+        conn.execute("INSERT INTO connector_messages VALUES ('hi', '2026-05-01')")
+        conn.commit()
+        seqs = [r[0] for r in conn.execute("SELECT seq FROM _sync_changes ORDER BY seq")]
+        assert seqs == sorted(seqs) and len(seqs) == 6
+
+        path = capture.export(tmp_path / "out", "PC1")
+        host, base, to = parse_changeset_name(path)
+        assert (host, base, to) == ("PC1", 0, seqs[-1])
+        data = read_changeset(path)
+        tasks = data["tables"]["tasks"]
+        assert tasks["upserts"] == [[1, "A2", None, "2026-05-01", {"$b": "AP8="}]]
+        assert tasks["deletes"] == [[2]]
+        assert data["tables"]["memory_context"]["pk"] == ["key", "scope"]
+        assert data["tables"]["connector_messages"]["columns"][0] == "rowid"
+
+        assert capture.pending_count() == 0
+        assert capture.export(tmp_path / "out", "PC1") is None
+
+    def test_apply_replays_updates_and_deletes_without_echo(self, capture, tmp_path):
+        target_path = _make_db(tmp_path / "b.db", rows=3)
+        conn = capture.conn
+        conn.executemany("INSERT INTO tasks (id, title, updated_at) VALUES (?, ?, '2026-01-01')",
+                         [(1, "Task 1"), (2, "Task 2"), (3, "Task 3")])
+        conn.commit()
+        capture.export(tmp_path / "out", "PC1")
+
+        # Update mit aelterem Zeitstempel und Delete - beides ging bisher verloren
+        conn.execute("UPDATE tasks SET status = 'done', updated_at = '2025-01-01' WHERE id = 1")
+        conn.execute("DELETE FROM tasks WHERE id = 3")
+        conn.execute("INSERT INTO memory_context VALUES ('k', 'user', 'v', '2026-05-01')")
+        conn.commit()
+        path = capture.export(tmp_path / "out", "PC1")
+
+        target = sqlite3.connect(str(target_path))
+        other = ChangeCapture(target)
+        other.install(["tasks", "memory_context"])
+        stats = other.apply(path)
+        assert stats == {"tasks": 2, "memory_context": 1}
+        assert target.execute("SELECT id, status, updated_at FROM tasks ORDER BY id").fetchall() == [
+            (1, "done", "2025-01-01"), (2, "open", "2026-01-01")]
+        assert other.peer_seq("PC1") == parse_changeset_name(path)[2]
+        assert other.pending_count() == 0            # kein Echo
+        target.execute("UPDATE tasks SET title = 'lokal' WHERE id = 2")
+        assert other.pending_count() == 1            # lokale Aenderungen weiter erfasst
+        target.close()
+
+
+class TestDBSyncManager:
+    def _manager(self, tmp_path, host, rows=0):
+        db = _make_db(tmp_path / f"{host}.db", rows)
+        manager = DBSyncManager(db_path=db, backup_dir=tmp_path / "shared")
+        manager.hostname = host
+        manager.heartbeat_file = manager.backup_dir / "heartbeat.json"
+        return manager
+
+    def test_two_hosts_exchange_changesets(self, tmp_path):
+        a = self._manager(tmp_path, "PCA", rows=200)
+        b = self._manager(tmp_path, "PCB")
+
+        # Erster Sync von B: noch keine Changeset-Kette von A -> Voll-Backup von A
+        a.sync(auto_confirm=True)
+        b.sync(auto_confirm=True)
+        assert len(_rows(b.db_path, "SELECT id FROM tasks")) == 200
+
+        conn = sqlite3.connect(str(a.db_path))
+        conn.execute("UPDATE tasks SET status = 'done', updated_at = '2020-01-01' WHERE id = 5")
+        conn.execute("DELETE FROM tasks WHERE id = 6")
+        conn.commit()
+        conn.close()
+        a.sync(auto_confirm=True)
+
+        files = list_changesets(a.backup_dir)["PCA"]
+        assert files[-1][2].stat().st_size < 1024
+        stats = b.pull()
+        assert stats.get("tasks") == 2
+        assert _rows(b.db_path, "SELECT status FROM tasks WHERE id = 5") == [("done",)]
+        assert _rows(b.db_path, "SELECT COUNT(*) FROM tasks WHERE id = 6") == [(0,)]
+
+        # Zweiter Pull ohne neue Changesets: nichts zu tun
+        assert b.pull() == {}
+
+        # Rueckrichtung, ohne dass A die eigenen Aenderungen zurueckbekommt
+        conn = sqlite3.connect(str(b.db_path))
+        conn.execute("INSERT INTO tasks (id, title, status, updated_at) VALUES (500, 'von B', 'open', '2026-01-01')")
+        conn.commit()
+        conn.close()
+        b.sync(auto_confirm=True)
+        assert a.pull().get("tasks") == 1
+        assert _rows(a.db_path, "SELECT title FROM tasks WHERE id = 500") == [("von B",)]
+        assert a.export_changes() is None
+
+    def test_gap_falls_back_to_full_backup(self, tmp_path):
+        a = self._manager(tmp_path, "PCA", rows=10)
+        b = self._manager(tmp_path, "PCB")
+        a.export_changes()                          # Trigger installieren
+        conn = sqlite3.connect(str(a.db_path))
+        conn.execute("UPDATE tasks SET title = 'x', updated_at = '2026-06-01' WHERE id = 1")
+        conn.commit()
+        conn.close()
+        first = a.export_changes()
+        conn = sqlite3.connect(str(a.db_path))
+        conn.execute("UPDATE tasks SET title = 'y', updated_at = '2026-06-02' WHERE id = 2")
+        conn.commit()
+        conn.close()
+        a.create_backup()                           # enthaelt seq 1-2
+        conn = sqlite3.connect(str(a.db_path))
+        conn.execute("UPDATE tasks SET title = 'z', updated_at = '2020-01-01' WHERE id = 3")
+        conn.commit()
+        conn.close()
+        a.export_changes()                          # seq 2-3
+        first.unlink()                              # Kette unterbrochen (z.B. Cleanup)
+
+        b.pull()
+        assert _rows(b.db_path, "SELECT title FROM tasks WHERE id IN (1, 2, 3) ORDER BY id") == [
+            ("x",), ("y",), ("z",)]
+        conn = sqlite3.connect(str(b.db_path))
+        assert ChangeCapture(conn).peer_seq("PCA") == 3
+        conn.close()
+
+    def test_merged_backup_rows_are_not_echoed(self, tmp_path):
+        a = self._manager(tmp_path, "PCA", rows=20)
+        b = self._manager(tmp_path, "PCB")
+        assert b.export_changes() is None           # Trigger bei B aktiv
+        backup = a.create_backup()
+
+        assert b.merge_backup(backup).get("tasks") == 20
+        assert len(_rows(b.db_path, "SELECT id FROM tasks")) == 20
+        assert _rows(b.db_path, "SELECT applying FROM _sync_control") == [(0,)]
+        assert b.export_changes() is None           # nichts zurueck an PCA
+
+        conn = sqlite3.connect(str(b.db_path))
+        conn.execute("UPDATE tasks SET title = 'lokal' WHERE id = 1")
+        conn.commit()
+        conn.close()
+        assert read_changeset(b.export_changes())["tables"]["tasks"]["upserts"][0][1] == "lokal"
+
+    def test_status_does_not_install_capture(self, tmp_path):
+        a = self._manager(tmp_path, "PCA", rows=3)
+        assert "nicht aktiv" in a.get_status()
+        assert _rows(a.db_path, "SELECT name FROM sqlite_master "
+                                "WHERE name LIKE '%sync%' ORDER BY name") == []
+
+        a.export_changes()
+        assert "0 Änderungen ausstehend" in a.get_status()
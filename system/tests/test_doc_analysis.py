@@ -135,6 +135,68 @@ class TestDedupScanner:
         assert "x2" in report
 
 
+class TestDedupStages:
+    def test_unique_sizes_not_read(self, tmp_path, monkeypatch):
+        (tmp_path / "a.txt").write_text("a")
+        (tmp_path / "b.txt").write_text("bb")
+        (tmp_path / "c.txt").write_text("ccc")
+
+        def fail(*args, **kwargs):
+            raise AssertionError("Datei mit eindeutiger Groesse gelesen")
+        monkeypatch.setattr(dedup_mod, "sha256_file", fail)
+        result = DedupScanner().scan(tmp_path)
+        assert result["unique_hashes"] == 3
+        assert result["stages"]["bytes_read"] == 0
+
+    def test_same_head_and_tail_needs_full_hash(self, tmp_path):
+        block = dedup_mod.PARTIAL_BYTES
+        head, tail = b"H" * block, b"T" * block
+        (tmp_path / "a.bin").write_bytes(head + b"1" * 100 + tail)
+        (tmp_path / "b.bin").write_bytes(head + b"2" * 100 + tail)
+        (tmp_path / "c.bin").write_bytes(head + b"1" * 100 + tail)
+        (tmp_path / "d.bin").write_bytes(b"X" * (2 * block + 100))
+        result = DedupScanner().scan(tmp_path)
+        stages = result["stages"]
+        assert stages["size_candidates"] == 4
+        assert stages["full_candidates"] == 3  # d.bin faellt nach Teil-Hash raus
+        assert stages["full_hashed"] == 3
+        assert len(result["duplicate_groups"]) == 1
+        assert [Path(f).name for f in result["duplicate_groups"][0]["files"]] == ["a.bin", "c.bin"]
+        assert result["unique_hashes"] == 3
+
+    def test_cache_reused_and_invalidated(self, tmp_path):
+        data = tmp_path / "data"
+        data.mkdir()
+        block = dedup_mod.PARTIAL_BYTES
+        content = b"A" * (3 * block)
+        (data / "a.bin").write_bytes(content)
+        (data / "b.bin").write_bytes(content)
+        cache = tmp_path / "cache.db"
+
+        first = DedupScanner(cache_path=cache).scan(data)
+        assert first["stages"]["full_hashed"] == 2
+        second = DedupScanner(cache_path=cache).scan(data)
+        assert second["stages"]["cache_hits"] == 2
+        assert second["stages"]["bytes_read"] == 0
+        assert second["duplicate_groups"] == first["duplicate_groups"]
+
+        import os
+        st = (data / "b.bin").stat()
+        (data / "b.bin").write_bytes(b"A" * (2 * block) + b"B" * block)
+        os.utime(data / "b.bin", ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+        third = DedupScanner(cache_path=cache).scan(data)
+        assert third["stages"]["cache_hits"] == 1
+        assert third["duplicate_groups"] == []
+
+    def test_report_contains_stages(self, tmp_path):
+        (tmp_path / "a.txt").write_text("dup")
+        (tmp_path / "b.txt").write_text("dup")
+        result = DedupScanner().scan(tmp_path)
+        report = DedupScanner.format_report(result)
+        assert "Stufe 1 Groesse" in report
+        assert "x2" in report
+
+
 class TestFmtSize:
     def test_bytes(self):
         assert _fmt_size(500) == "500 B"
@@ -0,0 +1,161 @@
+# -*- coding: utf-8 -*-
+# SPDX-License-Identifier: MIT
+"""
+Copyright (c) 2026 BACH Contributors
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+
+"""
+Tests fuer hub/_services/document/extraction_service.py - Text-Extraktion mit Cache
+===================================================================================
+"""
+
+import shutil
+import sys
+from pathlib import Path
+
+import pytest
+
+SYSTEM_ROOT = Path(__file__).parent.parent
+if str(SYSTEM_ROOT) not in sys.path:
+    sys.path.insert(0, str(SYSTEM_ROOT))
+
+from hub._services.document import extraction_service as es  # noqa: E402
+
+
+def _eml(path: Path, body: str) -> Path:
+    path.write_text(
+        "From: a@example.org\nTo: b@example.org\nSubject: Test\n"
+        "Content-Type: text/plain; charset=utf-8\n\n" + body + "\n",
+        encoding="utf-8",
+    )
+    return path
+
+
+@pytest.fixture
+def service(tmp_path):
+    svc = es.TextExtractionService(tmp_path / "cache.db", workers=2)
+    yield svc
+    svc.close()
+
+
+class TestCache:
+    def test_second_call_hits_cache(self, tmp_path, service, monkeypatch):
+        mail = _eml(tmp_path / "a.eml", "Hallo Welt")
+        first = service.extract_result(mail)
+        assert first.ok and not first.cached
+        assert "Betreff: Test" in first.text and "Hallo Welt" in first.text
+
+        monkeypatch.setitem(es._EXTRACTORS, ".eml", lambda p: pytest.fail("neu extrahiert"))
+        second = service.extract_result(mail)
+        assert second.cached
+        assert second.text == first.text
+
+    def test_copy_shares_entry_by_content(self, tmp_path, service):
+        mail = _eml(tmp_path / "a.eml", "Inhalt")
+        service.extract(mail)
+        copy = tmp_path / "kopie.eml"
+        shutil.copy(mail, copy)
+        assert service.extract_result(copy).cached
+
+    def test_changed_content_is_extracted_again(self, tmp_path, service):
+        mail = _eml(tmp_path / "a.eml", "alt")
+        service.extract(mail)
+        _eml(mail, "neu und laenger")
+        result = service.extract_result(mail)
+        assert not result.cached
+        assert "neu und laenger" in result.text
+
+    def test_version_bump_invalidates(self, tmp_path, service, monkeypatch):
+        mail = _eml(tmp_path / "a.eml", "x")
+        service.extract(mail)
+        monkeypatch.setattr(es, "EXTRACTOR_VERSION", es.EXTRACTOR_VERSION + 1)
+        assert not service.extract_result(mail).cached
+        assert service.cache.prune() == 1
+
+    def test_persists_across_instances(self, tmp_path):
+        mail = _eml(tmp_path / "a.eml", "x")
+        es.TextExtractionService(tmp_path / "c.db").extract(mail)
+        assert es.TextExtractionService(tmp_path / "c.db").extract_result(mail).cached
+
+    def test_plain_text_bypasses_cache(self, tmp_path, service):
+        note = tmp_path / "n.txt"
+        note.write_text("Notiz", encoding="utf-8")
+        service.extract(note)
+        assert not service.extract_result(note).cached
+        assert service.cache.stats() == []
+
+
+class TestErrors:
+    def test_unsupported_format_marker(self, tmp_path, service):
+        result = service.extract_result(tmp_path / "bild.png")
+        assert not result.ok
+        assert result.text == "[Nicht unterstuetztes Format: .png]"
+
+    def test_failures_are_not_cached(self, tmp_path, service, monkeypatch):
+        mail = _eml(tmp_path / "a.eml", "x")
+
+        def broken(path):
+            raise ValueError("kaputt")
+        monkeypatch.setitem(es._EXTRACTORS, ".eml", broken)
+        result = service.extract_result(mail)
+        assert not result.ok
+        assert result.text == "[FEHLER bei a.eml: kaputt]"
+
+        monkeypatch.undo()
+        assert not service.extract_result(mail).cached
+
+    def test_missing_file(self, tmp_path, service):
+        result = service.extract_result(tmp_path / "fehlt.pdf")
+        assert not result.ok
+        assert result.text.startswith("[FEHLER bei fehlt.pdf")
+
+
+class TestBatch:
+    def test_extract_many_order_and_metrics(self, tmp_path, service):
+        paths = [_eml(tmp_path / f"m{i:02d}.eml", f"Nachricht {i}") for i in range(12)]
+        paths.insert(3, tmp_path / "x.png")
+        results = service.extract_many(paths)
+        assert len(results) == 13
+        assert results[3].text.startswith("[Nicht unterstuetztes Format")
+        assert "Nachricht 11" in results[-1].text
+
+        again = service.extract_many(paths)
+        assert sum(r.cached for r in again) == 12
+        m = service.metrics()[".eml"]
+        assert m["files"] == 24
+        assert m["extracted"] == 12
+        assert m["cache_hits"] == 12
+        assert m["errors"] == 0
+        assert service.metrics()[".png"]["errors"] == 2
+
+
+class TestPipelineIntegration:
+    def test_read_bundle_dir_uses_service(self, tmp_path, service):
+        from hub._services.document.document_pipeline import DocumentPipeline
+
+        bundle = tmp_path / "K_TEST"
+        (bundle / "core").mkdir(parents=True)
+        (bundle / "core" / "bericht.md").write_text("Bericht", encoding="utf-8")
+        pipeline = DocumentPipeline(extractor=service)
+        content = pipeline.read_bundle_dir(bundle)
+        assert "Bericht" in content
+        assert service.metrics()[".md"]["extracted"] == 1
@@ -0,0 +1,165 @@
+# -*- coding: utf-8 -*-
+# SPDX-License-Identifier: MIT
+"""
+Copyright (c) 2026 BACH Contributors
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+
+
+"""
+Tests fuer core/fingerprint.py - stat-basierter Hash-Cache
+===========================================================
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+SYSTEM_ROOT = Path(__file__).parent.parent
+if str(SYSTEM_ROOT) not in sys.path:
+    sys.path.insert(0, str(SYSTEM_ROOT))
+
+from core import fingerprint  # noqa: E402
+from core.fingerprint import FingerprintCache  # noqa: E402
+
+OLD_NS = 1_600_000_000 * 10**9  # ausserhalb des Racy-Fensters
+
+
+def _write(path: Path, data: bytes, mtime_ns: int = OLD_NS) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(data)
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+    return path
+
+
+@pytest.fixture
+def counting(monkeypatch):
+    """Zaehlt tatsaechliche Datei-Lesevorgaenge."""
+    calls = []
+    real = fingerprint.sha256_file
+
+    def counted(path):
+        calls.append(Path(path).name)
+        return real(path)
+
+    monkeypatch.setattr(fingerprint, "sha256_file", counted)
+    return calls
+
+
+class TestFingerprintCache:
+    def test_hashes_once_until_stat_changes(self, tmp_path, counting):
+        files = [_write(tmp_path / f"f{i}.txt", f"inhalt {i}".encode()) for i in range(6)]
+        cache = FingerprintCache(tmp_path / "cache" / "fingerprints.db")
+
+        first = cache.hash_files(files)
+        assert first[files[0]] == hashlib.sha256(b"inhalt 0").hexdigest()
+        assert len(counting) == 6
+
+        counting.clear()
+        again = FingerprintCache(tmp_path / "cache" / "fingerprints.db").hash_files(files)
+        assert again == first and counting == []
+
+        _write(files[2], b"geaendert")
+        third = cache.hash_files(files)
+        assert counting == ["f2.txt"]
+        assert third[files[2]] == hashlib.sha256(b"geaendert").hexdigest()
+
+    def test_missing_and_directories_are_skipped(self, tmp_path):
+        f = _write(tmp_path / "a.txt", b"a")
+        cache = FingerprintCache(tmp_path / "fp.db")
+        result = cache.hash_files([f, tmp_path / "fehlt.txt", tmp_path])
+        assert list(result) == [f]
+        assert cache.file_hash(tmp_path / "fehlt.txt") == ""
+
+    def test_recent_mtime_is_not_cached(self, tmp_path, counting):
+        f = _write(tmp_path / "frisch.txt", b"x", mtime_ns=time.time_ns())
+        cache = FingerprintCache(tmp_path / "fp.db")
+        cache.file_hash(f)
+        cache.file_hash(f)
+        assert counting == ["frisch.txt", "frisch.txt"]
+
+    def test_paranoid_bypasses_cache(self, tmp_path):
+        f = _write(tmp_path / "core.py", b"AAAA")
+        cache = FingerprintCache(tmp_path / "fp.db")
+        cache.file_hash(f)
+
+        # Inhalt aendern, stat (Groesse, mtime, Inode) bleibt gleich
+        with open(f, "r+b") as fh:
+            fh.write(b"BBBB")
+        os.utime(f, ns=(OLD_NS, OLD_NS))
+
+        assert cache.file_hash(f) == hashlib.sha256(b"AAAA").hexdigest()
+        assert cache.file_hash(f, paranoid=True) == hashlib.sha256(b"BBBB").hexdigest()
+        assert cache.file_hash(f) == hashlib.sha256(b"BBBB").hexdigest()
+
+
+@pytest.fixture
+def bach_root(tmp_path):
+    system = tmp_path / "system"
+    (system / "data").mkdir(parents=True)
+    for name in ("bach.py", "core/app.py", "hub/seal.py"):
+        _write(system / name, f"# {name}\n".encode() * 50)
+    conn = sqlite3.connect(str(system / "data" / "bach.db"))
+    conn.execute("CREATE TABLE distribution_manifest (id INTEGER PRIMARY KEY, path TEXT, "
+                 "dist_type INTEGER, template_hash TEXT)")
+    conn.executemany("INSERT INTO distribution_manifest (path, dist_type) VALUES (?, 2)",
+                     [("bach.py",), ("core/app.py",), ("hub/seal.py",), ("fehlt.py",)])
+    conn.commit()
+    conn.close()
+    return tmp_path
+
+
+class TestKernelHash:
+    def test_seal_hash_matches_uncached_algorithm(self, bach_root):
+        from hub.seal import SealHandler
+
+        expected = hashlib.sha256()
+        for rel in ("bach.py", "core/app.py", "hub/seal.py"):
+            data = (bach_root / "system" / rel).read_bytes()
+            expected.update(hashlib.sha256(data).hexdigest().encode())
+            expected.update(rel.encode())
+
+        handler = SealHandler(bach_root)
+        assert handler._calculate_kernel_hash() == (expected.hexdigest(), 3, 1)
+        assert handler._calculate_kernel_hash(paranoid=True)[0] == expected.hexdigest()
+        assert (bach_root / "system" / "data" / "cache" / "fingerprints.db").exists()
+
+    def test_distribution_migrates_legacy_seal(self, bach_root):
+        from tools.distribution import DistributionManager, KERNEL_HASH_PREFIX
+
+        system = bach_root / "system"
+        dm = DistributionManager(db_path=system / "data" / "bach.db", root_path=bach_root)
+        dm.identity_file = system / "data" / "identity.json"
+        legacy = dm._calculate_legacy_kernel_hash()
+        dm._save_identity({"seal": {"status": "intact", "kernel_hash": legacy}})
+
+        assert dm.verify_seal() == (True, "Siegel intakt")
+        stored = json.loads(dm.identity_file.read_text(encoding="utf-8"))["seal"]["kernel_hash"]
+        assert stored.startswith(KERNEL_HASH_PREFIX) and stored == dm._calculate_kernel_hash()
+
+        _write(system / "core" / "app.py", b"manipuliert")
+        assert dm.verify_seal() == (False, "Kernel-Hash abweichend")
@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+# SPDX-License-Identifier: MIT
+"""
+Copyright (c) 2026 BACH Contributors
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+"""
+Tests fuer gui/async_db.py - DB-Zugriff ausserhalb des Event-Loops
+===================================================================
+"""
+
+import asyncio
+import sqlite3
+import sys
+import threading
+from pathlib import Path
+
+SYSTEM_ROOT = Path(__file__).parent.parent
+if str(SYSTEM_ROOT) not in sys.path:
+    sys.path.insert(0, str(SYSTEM_ROOT))
+
+
+class TestAsyncDb:
+    def test_queries_run_off_loop(self, tmp_path):
+        from gui import async_db
+
+        db = tmp_path / "bach.db"
+        conn = sqlite3.connect(str(db))
+        conn.execute("CREATE TABLE tasks (id INTEGER PRIMARY KEY, status TEXT)")
+        conn.commit()
+        conn.close()
+
+        threads = set()
+
+        def blocking():
+            threads.add(threading.current_thread().name)
+            return 42
+
+        async def scenario():
+            await async_db.execute(db, "INSERT INTO tasks (status) VALUES (?)", ("open",))
+            rows = await async_db.fetch_all(db, "SELECT * FROM tasks")
+            count = await async_db.fetch_value(db, "SELECT COUNT(*) FROM tasks")
+            missing = await async_db.fetch_value(db, "SELECT COUNT(*) FROM no_such_table", default=0)
+            value = await async_db.run_db(blocking)
+            return rows, count, missing, value
+
+        rows, count, missing, value = asyncio.run(scenario())
+        assert rows == [{"id": 1, "status": "open"}]
+        assert (count, missing, value) == (1, 0, 42)
+        assert all(name.startswith("bach-gui-db") for name in threads)
+        async_db.shutdown()
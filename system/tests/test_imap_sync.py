@@ -0,0 +1,334 @@
+# -*- coding: utf-8 -*-
+# SPDX-License-Identifier: MIT
+"""
+Copyright (c) 2026 BACH Contributors
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+
+"""
+Tests fuer hub/_services/mail/imap_sync.py - inkrementeller UID-Abruf gegen einen lokalen IMAP-Stub
+====================================================================================================
+"""
+
+import imaplib
+import re
+import socketserver
+import sys
+import threading
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+SYSTEM_ROOT = Path(__file__).parent.parent
+if str(SYSTEM_ROOT) not in sys.path:
+    sys.path.insert(0, str(SYSTEM_ROOT))
+
+from hub._services.mail.imap_sync import (  # noqa: E402
+    ImapConnectionPool, IncrementalImapSync, SyncStateStore,
+    compress_uids, parse_fetch,
+)
+
+
+# ============ IMAP-STUB ============
+
+def _raw(sender: str, subject: str, body: str = "Text") -> bytes:
+    return (f"From: {sender}\r\nSubject: {subject}\r\nDate: Mon, 05 Oct 2026 10:00:00 +0200\r\n"
+            f"Message-ID: <{abs(hash((sender, subject)))}@test>\r\n\r\n{body}\r\n").encode()
+
+
+class Mailbox:
+    def __init__(self):
+        self.uidvalidity = 1000
+        self.messages = {}  # uid -> raw
+        self.log = []       # empfangene Kommandos
+
+    def add(self, uid, sender, subject, body="Text"):
+        self.messages[uid] = _raw(sender, subject, body)
+
+
+def _uid_set(spec: str, uids):
+    out = set()
+    top = max(uids) if uids else 0
+    for part in spec.split(","):
+        lo, _, hi = part.partition(":")
+        lo = top if lo == "*" else int(lo)
+        hi = lo if not hi else (top if hi == "*" else int(hi))
+        lo, hi = min(lo, hi), max(lo, hi)
+        out.update(u for u in uids if lo <= u <= hi)
+    return sorted(out)
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    disable_nagle_algorithm = True
+
+    def send(self, line):
+        self.wfile.write(line if isinstance(line, bytes) else line.encode() + b"\r\n")
+
+    def handle(self):
+        box = self.server.mailbox
+        self.send("* OK IMAP4rev1 Stub bereit")
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            tag, cmd, *rest = line.decode().rstrip("\r\n").split(" ", 2)
+            cmd = cmd.upper()
+            arg = rest[0] if rest else ""
+            box.log.append(f"{cmd} {arg}".strip())
+            uids = sorted(box.messages)
+            if cmd == "CAPABILITY":
+                self.send("* CAPABILITY IMAP4rev1")
+            elif cmd in ("EXAMINE", "SELECT"):
+                self.send(f"* {len(uids)} EXISTS")
+                self.send(f"* OK [UIDVALIDITY {box.uidvalidity}] UIDs valid")
+                self.send(f"* OK [UIDNEXT {(uids[-1] if uids else 0) + 1}] next")
+                self.send(f"{tag} OK [READ-ONLY] done")
+                continue
+            elif cmd == "UID":
+                sub, _, params = arg.partition(" ")
+                if sub.upper() == "SEARCH":
+                    m = re.match(r"UID (\S+)", params)
+                    found = _uid_set(m.group(1), uids) if m else uids
+                    self.send("* SEARCH " + " ".join(map(str, found)))
+                elif sub.upper() == "FETCH":
+                    spec, _, items = params.partition(" ")
+                    header_only = "HEADER.FIELDS" in items
+                    for uid in _uid_set(spec, uids):
+                        raw = box.messages[uid]
+                        if header_only:
+                            raw = raw.split(b"\r\n\r\n", 1)[0] + b"\r\n\r\n"
+                            label = "BODY[HEADER.FIELDS (FROM SUBJECT DATE MESSAGE-ID)]"
+                        else:
+                            label = "BODY[]"
+                        seq = uids.index(uid) + 1
+                        self.send(f"* {seq} FETCH (UID {uid} {label} {{{len(raw)}}}".encode() + b"\r\n" + raw + b")\r\n")
+            elif cmd == "LOGOUT":
+                self.send("* BYE")
+                self.send(f"{tag} OK LOGOUT done")
+                return
+            self.send(f"{tag} OK {cmd} done")
+
+
+@pytest.fixture
+def imap_server():
+    server = socketserver.ThreadingTCPServer(("127.0.0.1", 0), _Handler)
+    server.daemon_threads = True
+    server.mailbox = Mailbox()
+    thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _account(server, account_id=1, login="user@test"):
+    return SimpleNamespace(id=account_id, email=login, imap_host="127.0.0.1",
+                           imap_port=server.server_address[1])
+
+
+def _connect(account):
+    conn = imaplib.IMAP4(account.imap_host, account.imap_port)
+    conn.login(account.email, "pw")
+    return conn
+
+
+def _sender_filter(headers):
+    return "shop" in headers.get("From", "")
+
+
+def _process(msg):
+    return msg.get("Subject")
+
+
+@pytest.fixture
+def sync(tmp_path):
+    pool = ImapConnectionPool(_connect)
+    engine = IncrementalImapSync(SyncStateStore(tmp_path / "state.db"), pool, max_bodies=10)
+    yield engine
+    pool.close_all()
+
+
+def _run(engine, account, prefilter=None, process=None):
+    """Ein Lauf wie in run_sync: abrufen, dann Stand committen."""
+    results, stats = engine.sync(account, prefilter or _sender_filter, process or _process)
+    engine.commit(account, stats)
+    return results, stats
+
+
+def _body_fetches(box):
+    return [c for c in box.log if c.startswith("UID FETCH") and "BODY.PEEK[]" in c]
+
+
+# ============ TESTS ============
+
+class TestHelpers:
+    def test_compress_uids(self):
+        assert compress_uids([9, 1, 2, 3, 7, 10]) == "1:3,7,9:10"
+        assert compress_uids([]) == ""
+
+    def test_parse_fetch_uid_after_literal(self):
+        data = [(b"1 (BODY[] {3}", b"abc"), b" UID 42)"]
+        assert parse_fetch(data) == [(42, b"abc")]
+
+
+class TestIncrementalSync:
+    def test_headers_first_bodies_only_for_candidates(self, imap_server, sync):
+        box = imap_server.mailbox
+        box.add(1, "news@blog.de", "Newsletter")
+        box.add(2, "rechnung@shop.de", "Rechnung 1")
+        box.add(3, "freund@mail.de", "Hallo")
+        box.add(4, "rechnung@shop.de", "Rechnung 2")
+
+        results, stats = sync.sync(_account(imap_server), _sender_filter, _process)
+        assert results == ["Rechnung 1", "Rechnung 2"]
+        assert stats.full_resync and stats.new_messages == 4
+        assert stats.header_candidates == 2 and stats.bodies_fetched == 2
+        assert _body_fetches(box) == ["UID FETCH 2,4 (UID BODY.PEEK[])"]
+        assert stats.last_uid == 4
+
+    def test_second_run_only_new_uids(self, imap_server, sync):
+        box = imap_server.mailbox
+        box.add(1, "rechnung@shop.de", "Alt")
+        account = _account(imap_server)
+        _run(sync, account)
+
+        box.log.clear()
+        results, stats = _run(sync, account)
+        assert results == [] and stats.new_messages == 0 and not stats.full_resync
+        assert "UID SEARCH UID 2:*" in box.log
+        assert not [c for c in box.log if c.startswith("UID FETCH")]
+
+        box.add(5, "rechnung@shop.de", "Neu")
+        results, stats = sync.sync(account, _sender_filter, _process)
+        assert results == ["Neu"]
+        assert stats.last_uid == 5
+
+    def test_uidvalidity_change_triggers_full_resync(self, imap_server, sync):
+        box = imap_server.mailbox
+        box.add(1, "rechnung@shop.de", "A")
+        account = _account(imap_server)
+        _run(sync, account)
+
+        box.uidvalidity += 1
+        results, stats = sync.sync(account, _sender_filter, _process)
+        assert stats.full_resync
+        assert results == ["A"]
+
+    def test_body_limit_defers_rest_to_next_run(self, imap_server, tmp_path):
+        box = imap_server.mailbox
+        for uid in range(1, 6):
+            box.add(uid, "rechnung@shop.de", f"R{uid}")
+        pool = ImapConnectionPool(_connect)
+        engine = IncrementalImapSync(SyncStateStore(tmp_path / "s.db"), pool, max_bodies=2)
+        account = _account(imap_server)
+
+        seen = []
+        for _ in range(3):
+            results, stats = _run(engine, account)
+            seen.extend(results)
+        assert seen == ["R1", "R2", "R3", "R4", "R5"]
+        assert stats.deferred == 0 and stats.last_uid == 5
+        pool.close_all()
+
+    def test_state_advances_only_on_commit(self, imap_server, sync):
+        box = imap_server.mailbox
+        box.add(1, "rechnung@shop.de", "R1")
+        account = _account(imap_server)
+
+        results, stats = sync.sync(account, _sender_filter, _process)
+        assert results == ["R1"] and stats.last_uid == 1
+        # z.B. save_to_database fehlgeschlagen: ohne commit kommt die Mail erneut
+        results, stats = sync.sync(account, _sender_filter, _process)
+        assert results == ["R1"] and stats.full_resync
+
+        sync.commit(account, stats)
+        assert sync.sync(account, _sender_filter, _process)[0] == []
+
+    def test_failed_uid_caps_state(self, imap_server, sync):
+        box = imap_server.mailbox
+        for uid, subject in ((1, "R1"), (2, "kaputt"), (3, "R3")):
+            box.add(uid, "rechnung@shop.de", subject)
+        account = _account(imap_server)
+
+        def flaky(msg):
+            if msg.get("Subject") == "kaputt":
+                raise ValueError("Parserfehler")
+            return msg.get("Subject")
+
+        results, stats = _run(sync, account, process=flaky)
+        assert results == ["R1", "R3"]
+        assert stats.failed == 1 and stats.last_uid == 1
+
+        box.log.clear()
+        results, stats = _run(sync, account)
+        assert "UID SEARCH UID 2:*" in box.log
+        assert results == ["kaputt", "R3"] and stats.failed == 0 and stats.last_uid == 3
+
+
+    def test_always_failing_uid_skipped_after_max_attempts(self, imap_server, sync, caplog):
+        box = imap_server.mailbox
+        for uid, subject in ((1, "R1"), (2, "kaputt"), (3, "R3")):
+            box.add(uid, "rechnung@shop.de", subject)
+        account = _account(imap_server)
+
+        def broken(msg):
+            if msg.get("Subject") == "kaputt":
+                raise ValueError("Parserfehler")
+            return msg.get("Subject")
+
+        for _ in range(sync.max_attempts - 1):
+            results, stats = _run(sync, account, process=broken)
+            assert stats.last_uid == 1 and stats.skipped == 0
+        with caplog.at_level("WARNING"):
+            results, stats = _run(sync, account, process=broken)
+        assert stats.skipped == 1 and stats.last_uid == 3
+        assert "UID 2 nach 3 Fehlversuchen uebersprungen" in caplog.text
+
+        box.add(4, "rechnung@shop.de", "R4")
+        results, stats = _run(sync, account, process=broken)
+        assert results == ["R4"] and stats.failed == 0
+
+class TestConnectionPool:
+    def test_connection_reused_across_runs_and_accounts(self, imap_server, tmp_path):
+        box = imap_server.mailbox
+        box.add(1, "rechnung@shop.de", "R")
+        pool = ImapConnectionPool(_connect)
+        engine = IncrementalImapSync(SyncStateStore(tmp_path / "s.db"), pool)
+
+        engine.sync(_account(imap_server, 1), _sender_filter, _process)
+        engine.sync(_account(imap_server, 1), _sender_filter, _process)
+        assert pool.opened == 1
+        assert "NOOP" in box.log
+
+        engine.sync(_account(imap_server, 2, login="zweit@test"), _sender_filter, _process)
+        assert pool.opened == 2 and len(pool) == 2
+        pool.close_all()
+        assert len(pool) == 0
+
+    def test_broken_connection_is_replaced(self, imap_server, tmp_path):
+        pool = ImapConnectionPool(_connect)
+        account = _account(imap_server)
+        conn = pool.get(account)
+        conn.shutdown()
+        assert pool.get(account) is not conn
+        assert pool.opened == 2
+        pool.close_all()
@@ -0,0 +1,169 @@
+# -*- coding: utf-8 -*-
+# SPDX-License-Identifier: MIT
+"""
+Copyright (c) 2026 BACH Contributors
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+
+
+"""
+Tests fuer tools/lang_catalog.py - vorgeladener Katalog fuer hub.lang.t()
+=========================================================================
+"""
+
+import sqlite3
+import sys
+from pathlib import Path
+
+import pytest
+
+SYSTEM_ROOT = Path(__file__).parent.parent
+if str(SYSTEM_ROOT) not in sys.path:
+    sys.path.insert(0, str(SYSTEM_ROOT))
+
+import hub.lang as lang  # noqa: E402
+import tools.lang_catalog as lc  # noqa: E402
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    """Sprach-Tabellen in tmp/data/bach.db; t() zeigt auf diese DB."""
+    path = tmp_path / "data" / "bach.db"
+    path.parent.mkdir()
+    conn = sqlite3.connect(str(path))
+    conn.executescript("""
+        CREATE TABLE languages_config (id INTEGER PRIMARY KEY, default_language TEXT,
+            fallback_language TEXT, enabled_languages TEXT, updated_at TEXT);
+        INSERT INTO languages_config VALUES (1, 'de', 'en', '["de", "en"]', NULL);
+        CREATE TABLE languages_translations (id INTEGER PRIMARY KEY, key TEXT NOT NULL,
+            namespace TEXT DEFAULT 'common', language TEXT NOT NULL, value TEXT NOT NULL,
+            is_verified BOOLEAN DEFAULT 0, source TEXT, created_at TEXT, updated_at TEXT,
+            UNIQUE(key, namespace, language));
+        CREATE TABLE languages_dictionary (id INTEGER PRIMARY KEY, term TEXT NOT NULL,
+            source_lang TEXT NOT NULL, target_lang TEXT NOT NULL, translation TEXT NOT NULL,
+            context TEXT, is_preferred BOOLEAN DEFAULT 1, usage_count INTEGER DEFAULT 0,
+            created_at TEXT);
+        INSERT INTO languages_translations (key, language, value) VALUES
+            ('task.created', 'de', 'Aufgabe erstellt'),
+            ('task.created', 'en', 'Task created'),
+            ('nur.englisch', 'en', 'English only'),
+            ('Datei', 'de', 'Datei'),
+            ('leer', 'en', '');
+        INSERT INTO languages_dictionary (term, source_lang, target_lang, translation, usage_count)
+        VALUES ('speichern', 'de', 'en', 'store', 1), ('speichern', 'de', 'en', 'save', 5),
+               ('datei', 'de', 'en', 'file', 0);
+    """)
+    conn.commit()
+    conn.close()
+
+    monkeypatch.setattr(lang, "_t_db_path", path)
+    monkeypatch.setattr(lang, "_t_lang_cache", None)
+    monkeypatch.setattr(lc, "VERSION_CHECK_INTERVAL_SEC", 0)
+    lc.invalidate()
+    yield path
+    lc.invalidate()
+
+
+def _write(path, sql, params=()):
+    conn = sqlite3.connect(str(path))  # wie ein anderer Prozess
+    conn.execute(sql, params)
+    conn.commit()
+    conn.close()
+
+
+class TestLookup:
+    def test_fallback_chain(self, db):
+        assert lang.get_lang() == "de"
+        assert lang.t("task.created") == "Aufgabe erstellt"
+        assert lang.t("task.created", lang="en") == "Task created"
+        # Woerterbuch (meistgenutzt gewinnt), auch fuer Keys mit Grossbuchstaben
+        assert lang.t("Speichern", lang="en") == "save"
+        assert lang.t("Datei", lang="en") == "file"
+        # Fallback-Sprache
+        assert lang.t("nur.englisch") == "English only"
+        assert lang.t_exists("task.created", "en")
+        assert not lang.t_exists("nur.englisch", "de")
+
+    def test_miss_uses_callers_default(self, db):
+        assert lang.t("fehlt") == "fehlt"
+        assert lang.t("fehlt", default="A") == "A"
+        assert lang.t("fehlt", default="B") == "B"
+        assert lang.t("leer", lang="en", default="x") == "x"
+
+    def test_single_load_per_language(self, db, monkeypatch):
+        calls = []
+        build = lc.TranslationCatalog.build.__func__
+
+        def counting(cls, *args, **kwargs):
+            calls.append(args[1])
+            return build(cls, *args, **kwargs)
+        monkeypatch.setattr(lc.TranslationCatalog, "build", classmethod(counting))
+
+        for _ in range(50):
+            lang.t("task.created")
+            lang.t("fehlt", lang="en")
+        assert calls == ["de", "en"]
+
+
+class TestInvalidation:
+    def test_external_write_bumps_version(self, db):
+        assert lang.t("task.created", lang="en") == "Task created"
+        _write(db, "UPDATE languages_translations SET value = 'Task added' "
+                   "WHERE key = 'task.created' AND language = 'en'")
+        assert lang.t("task.created", lang="en") == "Task added"
+
+        _write(db, "UPDATE languages_config SET default_language = 'en'")
+        assert lang.get_lang() == "en"
+
+    def test_lang_handler_write_clears_catalog(self, db, monkeypatch):
+        monkeypatch.setattr(lc, "VERSION_CHECK_INTERVAL_SEC", 3600)
+        assert lang.t("neu.key", lang="en") == "neu.key"
+
+        handler = lang.LangHandler(db.parent.parent)
+        ok, _ = handler.handle("add", ["neu.key", "--en", "New key"])
+        assert ok
+        assert lang.t("neu.key", lang="en") == "New key"
+
+    def test_snapshot_used_for_cold_start(self, db, monkeypatch):
+        assert lang.t("task.created", lang="en") == "Task created"
+        snapshot = lc.snapshot_path(db, "en")
+        assert snapshot.exists()
+
+        lc.invalidate()
+
+        def fail(*args, **kwargs):
+            raise AssertionError("Snapshot haette reichen muessen")
+        monkeypatch.setattr(lc.TranslationCatalog, "build", classmethod(fail))
+        assert lang.t("task.created", lang="en") == "Task created"
+
+        # Veralteter Snapshot (Version geaendert) wird nicht verwendet
+        monkeypatch.undo()
+        monkeypatch.setattr(lang, "_t_db_path", db)
+        monkeypatch.setattr(lc, "VERSION_CHECK_INTERVAL_SEC", 0)
+        _write(db, "INSERT INTO languages_translations (key, language, value) "
+                   "VALUES ('x', 'en', 'X')")
+        lc.invalidate()
+        assert lang.t("x", lang="en") == "X"
+
+
+def test_benchmark_results_match_legacy_lookup():
+    r = lc.run_benchmark(n_keys=300, n_lookups=2000)
+    assert r["results_equal"]
@@ -0,0 +1,200 @@
+# -*- coding: utf-8 -*-
+# SPDX-License-Identifier: MIT
+"""
+Copyright (c) 2026 BACH Contributors
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+
+
+"""
+Tests fuer tools/mcp_runtime.py - Ergebnis-Cache, Invalidierung, Histogramme
+=============================================================================
+"""
+
+import asyncio
+import sqlite3
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+SYSTEM_ROOT = Path(__file__).parent.parent
+if str(SYSTEM_ROOT) not in sys.path:
+    sys.path.insert(0, str(SYSTEM_ROOT))
+
+from core.hooks import HookRegistry  # noqa: E402
+from tools.mcp_runtime import LatencyHistogram, MCPRuntime, ResultCache  # noqa: E402
+
+
+class FakeApp:
+    """Minimale App: zaehlt Aufrufe und feuert after_command wie core.app."""
+
+    def __init__(self, hooks, delay: float = 0.0):
+        self.hooks = hooks
+        self.delay = delay
+        self.calls = []
+        self.active = {}
+        self.max_parallel = {}
+        self._lock = threading.Lock()
+
+    def get_handler(self, name):
+        return object()
+
+    def execute(self, handler, operation, args):
+        with self._lock:
+            self.calls.append((handler, operation, tuple(args)))
+            self.active[handler] = self.active.get(handler, 0) + 1
+            total = sum(self.active.values())
+            self.max_parallel["total"] = max(self.max_parallel.get("total", 0), total)
+            self.max_parallel[handler] = max(self.max_parallel.get(handler, 0), self.active[handler])
+        time.sleep(self.delay)
+        with self._lock:
+            self.active[handler] -= 1
+        self.hooks.emit("after_command", {"handler": handler, "operation": operation,
+                                          "success": True, "args": args})
+        return True, f"{handler} {operation} #{len(self.calls)}"
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = tmp_path / "bach.db"
+    conn = sqlite3.connect(str(path))
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript("""
+        CREATE TABLE tasks (id INTEGER PRIMARY KEY, title TEXT, status TEXT);
+        INSERT INTO tasks (title, status) VALUES ('a', 'pending'), ('b', 'done');
+    """)
+    conn.commit()
+    conn.close()
+    return path
+
+
+@pytest.fixture
+def runtime(tmp_path, db_path):
+    hooks = HookRegistry()
+    rt = MCPRuntime(tmp_path, db_path=db_path, app=FakeApp(hooks))
+    rt.warm_up(handlers=("task",))
+    yield rt
+    rt.close()
+
+
+class TestResultCache:
+    def test_invalidate_by_table_and_stale_put(self):
+        cache = ResultCache()
+        cache.put(("a",), "A", {"tasks"})
+        cache.put(("b",), "B", {"memory_lessons"})
+        gen = cache.generation({"tasks"})
+        assert cache.invalidate({"tasks"}) == 1
+        assert cache.get(("a",)) is None
+        assert cache.get(("b",)) == "B"
+        # Berechnung lief waehrend der Invalidierung: nicht speichern
+        assert cache.put(("a",), "alt", {"tasks"}, gen) is False
+        assert cache.put(("a",), "neu", {"tasks"}, cache.generation({"tasks"})) is True
+
+    def test_lru_and_max_age(self, monkeypatch):
+        cache = ResultCache(max_entries=2, max_age=10)
+        for key in "xyz":
+            cache.put((key,), key, {"t"})
+        assert cache.get(("x",)) is None and len(cache) == 2
+        now = time.monotonic()
+        monkeypatch.setattr(time, "monotonic", lambda: now + 11)
+        assert cache.get(("z",)) is None
+
+
+class TestRuntime:
+    def test_read_cached_until_write_hook(self, runtime):
+        app = runtime.app
+        first = runtime.execute("task", "list")
+        assert runtime.execute("task", "list") == first
+        assert len(app.calls) == 1
+
+        runtime.execute("task", "add", ["Neu"])  # schreibend -> after_command
+        assert runtime.execute("task", "list") != first
+        assert len(app.calls) == 3
+
+    def test_domain_event_invalidates_only_its_tables(self, runtime):
+        app = runtime.app
+        runtime.execute("task", "list")
+        runtime.execute("lesson", "list")
+        app.hooks.emit("after_task_done", {"task_id": 1})
+        runtime.execute("task", "list")
+        runtime.execute("lesson", "list")
+        assert [c[:2] for c in app.calls] == [("task", "list"), ("lesson", "list"), ("task", "list")]
+
+    def test_external_write_clears_cache(self, runtime, db_path):
+        rows = runtime.query("SELECT COUNT(*) AS n FROM tasks", tables={"tasks"})
+        assert rows == [{"n": 2}]
+        runtime.execute("task", "list")
+
+        other = sqlite3.connect(str(db_path))  # anderer Prozess/Verbindung
+        other.execute("INSERT INTO tasks (title, status) VALUES ('c', 'pending')")
+        other.commit()
+        other.close()
+
+        assert runtime.query("SELECT COUNT(*) AS n FROM tasks", tables={"tasks"}) == [{"n": 3}]
+        runtime.execute("task", "list")
+        assert len(runtime.app.calls) == 2
+
+    def test_schema_metadata(self, runtime):
+        assert runtime.schema()["tasks"] == ["id", "title", "status"]
+
+    def test_histograms_and_metrics_text(self, runtime):
+        for _ in range(3):
+            runtime.call("task_list", runtime.execute, "task", "list")
+        h = runtime.histograms["task_list"]
+        assert h.count == 3 and h.cache_hits == 2
+        text = runtime.format_metrics()
+        assert "task_list" in text and "Trefferquote" in text
+
+    def test_concurrent_calls_parallel_across_handlers(self, tmp_path, db_path):
+        hooks = HookRegistry()
+        app = FakeApp(hooks, delay=0.1)
+        rt = MCPRuntime(tmp_path, db_path=db_path, app=app)
+        rt.attach_hooks()
+
+        async def main():
+            return await asyncio.gather(
+                rt.run("a", rt.execute, "task", "add", ["1"]),
+                rt.run("b", rt.execute, "task", "add", ["2"]),
+                rt.run("c", rt.execute, "memory", "write", ["x"]),
+                rt.run("d", rt.execute, "lesson", "add", ["y"]),
+            )
+        try:
+            start = time.perf_counter()
+            asyncio.run(main())
+            elapsed = time.perf_counter() - start
+        finally:
+            rt.close()
+        assert app.max_parallel["task"] == 1       # gleicher Handler: seriell
+        assert app.max_parallel["total"] >= 2      # unabhaengige parallel
+        assert elapsed < 0.35
+
+
+def test_histogram_percentiles():
+    h = LatencyHistogram()
+    for ms in [0.1] * 90 + [7] * 9 + [300]:
+        h.record(ms)
+    assert h.percentile(50) == 0.25
+    assert h.percentile(95) == 10
+    assert h.percentile(100) == 500
+    assert h.to_dict()["count"] == 100
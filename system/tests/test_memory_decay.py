@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+# SPDX-License-Identifier: MIT
+"""
+Copyright (c) 2026 BACH Contributors
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+"""
+Tests fuer hub/_services/memory/decay_engine.py
+================================================
+Set-basierter Decay fuer memory_consolidation und shared_memory_consolidation.
+"""
+
+import sys
+import sqlite3
+from datetime import datetime, timedelta
+from pathlib import Path
+
+SYSTEM_ROOT = Path(__file__).parent.parent
+if str(SYSTEM_ROOT) not in sys.path:
+    sys.path.insert(0, str(SYSTEM_ROOT))
+
+import pytest
+
+
+@pytest.fixture
+def conn():
+    c = sqlite3.connect(":memory:")
+    c.row_factory = sqlite3.Row
+    for table in ("memory_consolidation", "shared_memory_consolidation"):
+        c.execute(f"""
+            CREATE TABLE {table} (
+                id INTEGER PRIMARY KEY, source_table TEXT, source_id INTEGER,
+                last_accessed TEXT, weight REAL, decay_rate REAL, threshold REAL,
+                status TEXT DEFAULT 'active', updated_at TEXT
+            )
+        """)
+    c.execute("CREATE TABLE memory_facts (id INTEGER PRIMARY KEY)")
+    c.execute("CREATE TABLE memory_lessons (id INTEGER PRIMARY KEY, is_active INTEGER DEFAULT 1, updated_at TEXT)")
+    c.execute("CREATE TABLE memory_working (id INTEGER PRIMARY KEY, is_active INTEGER DEFAULT 1, updated_at TEXT)")
+    c.commit()
+    yield c
+    c.close()
+
+
+class TestDecayStep:
+    def test_decay_and_archive(self, conn):
+        from hub._services.memory.decay_engine import decay_step
+        conn.executemany(
+            "INSERT INTO shared_memory_consolidation (weight, decay_rate, threshold, status) VALUES (?, ?, ?, ?)",
+            [(1.0, 0.5, 0.1, "active"), (0.15, 0.5, 0.1, "active"),
+             (None, None, None, "active"), (0.9, 0.5, 0.1, "archived")])
+        conn.commit()
+
+        dry = decay_step(conn, "shared_memory_consolidation", dry_run=True)
+        assert (dry.touched, dry.archived) == (3, 1)
+
+        result = decay_step(conn, "shared_memory_consolidation")
+        assert (result.touched, result.archived) == (3, 1)
+        rows = conn.execute("SELECT weight, status FROM shared_memory_consolidation ORDER BY id").fetchall()
+        assert [tuple(r) for r in rows] == [
+            (0.5, "active"), (0.075, "archived"), (0.95, "active"), (0.9, "archived")]
+
+    def test_rejects_unknown_table(self, conn):
+        from hub._services.memory.decay_engine import decay_step
+        with pytest.raises(ValueError):
+            decay_step(conn, "tasks")
+
+
+class TestDecayByAge:
+    def test_days_since_access(self, conn):
+        from hub._services.memory.decay_engine import decay_by_age, archive_below
+        now = datetime(2026, 3, 10, 12, 0)
+        conn.executemany(
+            "INSERT INTO memory_consolidation (last_accessed, weight, decay_rate) VALUES (?, ?, ?)",
+            [((now - timedelta(days=2)).isoformat(), 0.8, 0.5),
+             ((now - timedelta(hours=3)).isoformat(), 0.8, 0.5),
+             (None, 0.8, 0.5)])
+        conn.commit()
+
+        result = decay_by_age(conn, "memory_consolidation", now=now)
+        assert result.touched == 1
+        weights = [r[0] for r in conn.execute("SELECT weight FROM memory_consolidation ORDER BY id")]
+        assert weights == [pytest.approx(0.2), 0.8, 0.8]
+
+        archived = archive_below(conn, "memory_consolidation", 0.25)
+        assert archived.archived == 1
+
+    def test_forget_below(self, conn):
+        from hub._services.memory.decay_engine import forget_below
+        conn.execute("INSERT INTO memory_facts (id) VALUES (7)")
+        conn.execute("INSERT INTO memory_lessons (id) VALUES (3)")
+        conn.executemany(
+            "INSERT INTO memory_consolidation (source_table, source_id, weight) VALUES (?, ?, ?)",
+            [("memory_facts", 7, 0.01), ("memory_lessons", 3, 0.01), ("memory_facts", 8, 0.9)])
+        conn.commit()
+
+        result = forget_below(conn, 0.05)
+        assert result.deleted == 2
+        assert conn.execute("SELECT COUNT(*) FROM memory_facts").fetchone()[0] == 0
+        assert conn.execute("SELECT is_active FROM memory_lessons").fetchone()[0] == 0
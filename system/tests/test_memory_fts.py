@@ -0,0 +1,209 @@
+# -*- coding: utf-8 -*-
+# SPDX-License-Identifier: MIT
+"""
+Copyright (c) 2026 BACH Contributors
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+
+
+"""
+Tests fuer hub/_services/memory/fts_index.py - FTS5/bm25-Suche
+===============================================================
+"""
+
+import sqlite3
+import sys
+from pathlib import Path
+
+import pytest
+
+SYSTEM_ROOT = Path(__file__).parent.parent
+if str(SYSTEM_ROOT) not in sys.path:
+    sys.path.insert(0, str(SYSTEM_ROOT))
+
+from hub._services.memory import fts_index  # noqa: E402
+
+SCHEMA = """
+CREATE TABLE memory_working (id INTEGER PRIMARY KEY AUTOINCREMENT, type TEXT, content TEXT NOT NULL,
+    priority INTEGER DEFAULT 0, tags TEXT, created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP, is_active INTEGER DEFAULT 1);
+CREATE TABLE memory_facts (id INTEGER PRIMARY KEY AUTOINCREMENT, category TEXT NOT NULL, key TEXT NOT NULL,
+    value TEXT NOT NULL, confidence REAL DEFAULT 1.0, created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP, UNIQUE(category, key));
+CREATE TABLE memory_lessons (id INTEGER PRIMARY KEY, category TEXT NOT NULL, severity TEXT, title TEXT NOT NULL,
+    problem TEXT, solution TEXT NOT NULL, trigger_words TEXT, is_active INTEGER DEFAULT 1,
+    times_shown INTEGER DEFAULT 0, related_tools TEXT, created_at TEXT, updated_at TEXT);
+CREATE TABLE memory_consolidation (id INTEGER PRIMARY KEY AUTOINCREMENT, source_table TEXT NOT NULL,
+    source_id INTEGER NOT NULL, times_accessed INTEGER DEFAULT 0, last_accessed TIMESTAMP,
+    weight REAL DEFAULT 0.5, UNIQUE(source_table, source_id));
+CREATE TABLE assistant_contacts (id INTEGER PRIMARY KEY AUTOINCREMENT, name TEXT NOT NULL, context TEXT,
+    email TEXT, phone TEXT, mobile TEXT, address TEXT, birthday DATE, notes TEXT, is_active INTEGER DEFAULT 1,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP, updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    company TEXT, position TEXT, tags TEXT);
+"""
+
+
+@pytest.fixture
+def base(tmp_path):
+    (tmp_path / "data").mkdir()
+    conn = sqlite3.connect(str(tmp_path / "data" / "bach.db"))
+    conn.executescript(SCHEMA)
+    conn.executescript("""
+        INSERT INTO memory_lessons (id, category, title, problem, solution, created_at) VALUES
+            (1, 'bug', 'Backup scheitert', 'Datenbank gesperrt', 'WAL-Modus aktivieren', '2026-01-01'),
+            (2, 'bug', 'Backup langsam', 'Volle Kopie', 'Inkrementelles Backup nutzen', '2026-01-01'),
+            (3, 'tool', 'OCR Umlaute', 'Umlaute kaputt', 'Encoding pruefen', '2026-01-01');
+        INSERT INTO memory_working (type, content) VALUES ('note', 'Backup-Rotation auf NAS testen');
+        INSERT INTO memory_facts (category, key, value) VALUES ('system', 'backup_ziel', 'NAS im Keller');
+        INSERT INTO assistant_contacts (name, email, phone) VALUES
+            ('Erika Mustermann', 'erika@example.org', '0176-1234567'),
+            ('Max Mueller', 'max@firma.de', '089 555');
+    """)
+    conn.commit()
+    conn.close()
+    return tmp_path
+
+
+@pytest.fixture
+def conn(base):
+    c = sqlite3.connect(str(base / "data" / "bach.db"))
+    assert fts_index.ensure_index(c)
+    yield c
+    c.close()
+
+
+class TestIndex:
+    def test_backfill_and_trigger_sync(self, conn):
+        assert {h.id for h in fts_index.search(conn, "backup", ("lesson",))} == {1, 2}
+
+        conn.execute("INSERT INTO memory_lessons (id, category, title, solution) "
+                     "VALUES (4, 'general', 'Backup pruefen', 'Restore testen')")
+        conn.execute("UPDATE memory_lessons SET title = 'Sicherung langsam', solution = 'Inkrementell' "
+                     "WHERE id = 2")
+        conn.execute("UPDATE memory_lessons SET is_active = 0 WHERE id = 1")
+        conn.execute("DELETE FROM memory_lessons WHERE id = 3")
+        conn.commit()
+
+        assert [h.id for h in fts_index.search(conn, "backup", ("lesson",))] == [4]
+        assert [h.id for h in fts_index.search(conn, "sicherung", ("lesson",))] == [2]
+        assert fts_index.search(conn, "umlaute", ("lesson",)) == []
+        conn.execute("INSERT INTO memory_lessons_fts(memory_lessons_fts) VALUES ('integrity-check')")
+
+    def test_insert_or_replace_keeps_index_consistent(self, conn):
+        fact_id = conn.execute("SELECT id FROM memory_facts WHERE key = 'backup_ziel'").fetchone()[0]
+        # gleiche id (changeset/backup_store) und neuer id per UNIQUE-Key (consolidation)
+        conn.execute("INSERT OR REPLACE INTO memory_facts (id, category, key, value) "
+                     "VALUES (?, 'system', 'backup_ziel', 'Cloud-Speicher')", (fact_id,))
+        conn.execute("INSERT OR REPLACE INTO memory_lessons (id, category, title, solution) "
+                     "VALUES (3, 'tool', 'OCR Sonderzeichen', 'Codepage setzen')")
+        conn.execute("INSERT OR REPLACE INTO memory_facts (category, key, value) "
+                     "VALUES ('system', 'backup_ziel', 'Bandlaufwerk')")
+        conn.commit()
+
+        assert fts_index.search(conn, "nas", ("fact",)) == []
+        assert fts_index.search(conn, "cloud", ("fact",)) == []
+        assert [h.text for h in fts_index.search(conn, "bandlaufwerk", ("fact",))] == ["backup_ziel: Bandlaufwerk"]
+        assert fts_index.search(conn, "umlaute", ("lesson",)) == []
+        assert [h.id for h in fts_index.search(conn, "codepage", ("lesson",))] == [3]
+        assert fts_index.count(conn, "backup", ("fact",)) == 1
+        for fts in ("memory_facts_fts", "memory_lessons_fts"):
+            conn.execute(f"INSERT INTO {fts}({fts}) VALUES ('integrity-check')")
+
+        fts_index.rebuild(conn, ("fact",))
+        assert conn.execute("SELECT COUNT(*) FROM memory_facts_fts").fetchone()[0] == \
+            conn.execute("SELECT COUNT(*) FROM memory_facts").fetchone()[0]
+
+    def test_external_content_index_is_migrated(self, base):
+        db = sqlite3.connect(str(base / "data" / "bach.db"))
+        try:
+            db.executescript("""
+                CREATE VIRTUAL TABLE memory_lessons_fts USING fts5(
+                    title, problem, solution, trigger_words,
+                    content='memory_lessons', content_rowid='id');
+                CREATE TRIGGER memory_lessons_fts_ai AFTER INSERT ON memory_lessons BEGIN
+                    INSERT INTO memory_lessons_fts(rowid, title) VALUES (new.id, new.title);
+                END;
+            """)
+            assert fts_index.ensure_index(db, force=True)
+            sql = db.execute("SELECT sql FROM sqlite_master WHERE name = 'memory_lessons_fts'").fetchone()[0]
+            assert "content=" not in sql
+            db.execute("INSERT OR REPLACE INTO memory_lessons (id, category, title, solution) "
+                       "VALUES (1, 'bug', 'Backup haengt', 'Lock pruefen')")
+            db.commit()
+            assert [h.id for h in fts_index.search(db, "lock", ("lesson",))] == [1]
+            assert fts_index.search(db, "gesperrt", ("lesson",)) == []
+        finally:
+            db.close()
+
+    def test_missing_trigger_is_repaired(self, conn, base):
+        conn.execute("DROP TRIGGER memory_facts_fts_ai")
+        conn.commit()
+        fresh = sqlite3.connect(str(base / "data" / "bach.db"))
+        try:
+            assert fts_index.ensure_index(fresh, force=True)
+            fresh.execute("INSERT INTO memory_facts (category, key, value) VALUES ('user', 'editor', 'vim')")
+            fresh.commit()
+            assert [h.text for h in fts_index.search(fresh, "vim", ("fact",))] == ["editor: vim"]
+        finally:
+            fresh.close()
+
+    def test_prefix_phrase_and_or(self, conn):
+        assert fts_index.build_match('back "WAL Modus"') == '"back"* "WAL Modus"'
+        assert fts_index.build_match("a b", mode="or") == '"a"* OR "b"*'
+        assert {h.id for h in fts_index.search(conn, "back", ("lesson",))} == {1, 2}
+        assert [h.id for h in fts_index.search(conn, '"WAL Modus"', ("lesson",))] == [1]
+        assert fts_index.search(conn, '"Modus WAL"', ("lesson",)) == []
+        assert fts_index.count(conn, "backup umlaute", ("lesson",), mode="or") == 3
+        assert fts_index.search(conn, '"(*', ("lesson",)) == []
+
+    def test_consolidation_weight_boosts_rank(self, conn):
+        conn.execute("INSERT INTO memory_lessons (id, category, title, solution, created_at) "
+                     "VALUES (10, 'bug', 'Cache', 'Cache leeren', '2026-01-01'), "
+                     "(11, 'bug', 'Cache', 'Cache leeren', '2026-01-01')")
+        conn.execute("INSERT INTO memory_consolidation (source_table, source_id, weight) "
+                     "VALUES ('memory_lessons', 11, 1.0), ('memory_lessons', 10, 0.1)")
+        conn.commit()
+        assert [h.id for h in fts_index.search(conn, "cache", ("lesson",))] == [11, 10]
+        assert [h.id for h in fts_index.search(conn, "cache", ("lesson",), boost=False)] in ([10, 11], [11, 10])
+
+
+class TestHandlers:
+    def test_memory_search_ranked_across_tables(self, base):
+        from hub.memory import MemoryHandler
+        ok, text = MemoryHandler(base).handle("search", ["backup", "nas"])
+        assert ok
+        assert "[working]" in text and "[fact]" in text and "[lesson]" in text
+        assert text.strip().endswith("4 Treffer")
+
+    def test_lesson_search(self, base):
+        from hub.lesson import LessonHandler
+        ok, text = LessonHandler(base).handle("search", ["backup"])
+        assert ok and "#1 [bug]" in text and "#2 [bug]" in text and "2 Treffer" in text
+
+    def test_contact_search_with_like_fallback(self, base):
+        from hub.contact import ContactHandler
+        handler = ContactHandler(base)
+        ok, text = handler.handle("search", ["mustermann"])
+        assert ok and "Erika Mustermann" in text and "Max" not in text
+        ok, text = handler.handle("search", ["1234567"])
+        assert ok and "Erika Mustermann" in text
+        ok, text = handler.handle("search", ["rika@exam"])  # Teilstring -> LIKE
+        assert ok and "Erika Mustermann" in text
@@ -0,0 +1,158 @@
+# -*- coding: utf-8 -*-
+# SPDX-License-Identifier: MIT
+"""
+Copyright (c) 2026 BACH Contributors
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+
+"""
+Tests fuer tools/ocr/engine.py - ein Tesseract-Durchlauf pro Seite, DPI-Wahl, Seiten-Cache
+===========================================================================================
+"""
+
+import sys
+import types
+from pathlib import Path
+
+import pytest
+
+SYSTEM_ROOT = Path(__file__).parent.parent
+if str(SYSTEM_ROOT) not in sys.path:
+    sys.path.insert(0, str(SYSTEM_ROOT))
+
+from tools.ocr import engine  # noqa: E402
+
+
+def _data(words):
+    """image_to_data-DICT aus (block, par, line, text, conf)-Tupeln."""
+    keys = ("page_num", "block_num", "par_num", "line_num", "text", "conf")
+    data = {k: [] for k in keys}
+    for block, par, line, text, conf in words:
+        for k, v in zip(keys, (1, block, par, line, text, conf)):
+            data[k].append(v)
+    return data
+
+
+class TestTextFromData:
+    def test_lines_and_paragraphs(self):
+        data = _data([
+            (1, 1, 0, "", -1),
+            (1, 1, 1, "Rechnung", 96),
+            (1, 1, 1, "Nr.", 90),
+            (1, 1, 2, "4711", 88),
+            (1, 2, 1, "Summe", 92),
+            (1, 2, 1, " ", 0),
+        ])
+        text, confidence, words = engine.text_from_data(data)
+        assert text == "Rechnung Nr.\n4711\n\nSumme"
+        assert words == 4
+        assert confidence == pytest.approx((96 + 90 + 88 + 92 + 0) / 5)
+
+    def test_string_confidences(self):
+        text, confidence, _ = engine.text_from_data(_data([(1, 1, 1, "a", "-1"), (1, 1, 1, "b", "80.5")]))
+        assert text == "a b"
+        assert confidence == 80.5
+
+    def test_empty(self):
+        assert engine.text_from_data({}) == ("", 0.0, 0)
+
+
+class TestChooseDpi:
+    def test_a4_is_300(self):
+        assert engine.choose_dpi(595, 842) == 300
+
+    def test_receipt_gets_more_pixels(self):
+        assert engine.choose_dpi(226, 600) == engine.MAX_DPI
+
+    def test_large_page_gets_fewer(self):
+        assert engine.choose_dpi(1684, 2384) == engine.MIN_DPI
+
+
+class TestPageCache:
+    def test_roundtrip_per_language(self, tmp_path):
+        cache = engine.PageCache(tmp_path / "ocr.db")
+        cache.put("h1", "deu", "Text", 91.0, 1, 0.5)
+        assert cache.get("h1", "deu") == ("Text", 91.0, 1)
+        assert cache.get("h1", "eng") is None
+        cache.close()
+
+
+class _FakePixmap:
+    def __init__(self, w, h):
+        self.width, self.height = w, h
+        self.samples = bytes(w * h * 3)
+
+
+class _FakePage:
+    rect = types.SimpleNamespace(width=595, height=842)
+
+    def get_pixmap(self, matrix):
+        return _FakePixmap(int(595 * matrix.z / 72), int(842 * matrix.z / 72))
+
+
+@pytest.fixture
+def fake_ocr(monkeypatch):
+    calls = {"image_to_data": 0, "image_to_string": 0}
+
+    def image_to_data(image, lang, output_type):
+        calls["image_to_data"] += 1
+        return _data([(1, 1, 1, "Beleg", 95)])
+
+    def image_to_string(*a, **k):
+        calls["image_to_string"] += 1
+        return ""
+
+    fake_tess = types.SimpleNamespace(image_to_data=image_to_data, image_to_string=image_to_string,
+                                      Output=types.SimpleNamespace(DICT="dict"))
+    monkeypatch.setattr(engine, "pytesseract", fake_tess, raising=False)
+    monkeypatch.setattr(engine, "fitz", types.SimpleNamespace(
+        Matrix=lambda x, y: types.SimpleNamespace(z=x * 72)), raising=False)
+    monkeypatch.setattr(engine, "Image", types.SimpleNamespace(
+        frombytes=lambda mode, size, data: object()), raising=False)
+    return calls
+
+
+class TestPdfPage:
+    def test_single_tesseract_pass_and_cache(self, tmp_path, fake_ocr):
+        cache = engine.PageCache(tmp_path / "ocr.db")
+        doc = [_FakePage()]
+
+        first = engine._ocr_pdf_page(doc, 0, "deu", None, cache)
+        page_idx, page_hash, text, confidence, words, cached, seconds, error = first
+        assert error is None and not cached
+        assert text == "Beleg" and words == 1
+        assert fake_ocr == {"image_to_data": 1, "image_to_string": 0}
+
+        cache.put(page_hash, "deu", text, confidence, words, seconds)
+        second = engine._ocr_pdf_page(doc, 0, "deu", None, cache)
+        assert second[5] is True and second[2] == "Beleg"
+        assert fake_ocr["image_to_data"] == 1
+        cache.close()
+
+    def test_dpi_changes_page_hash(self, fake_ocr):
+        doc = [_FakePage()]
+        h300 = engine._ocr_pdf_page(doc, 0, "deu", 300, None)[1]
+        h200 = engine._ocr_pdf_page(doc, 0, "deu", 200, None)[1]
+        assert h300 != h200
+
+    def test_errors_are_reported_per_page(self, fake_ocr):
+        result = engine._ocr_pdf_page([], 0, "deu", None, None)
+        assert result[7] is not None
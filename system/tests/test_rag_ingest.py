@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+# SPDX-License-Identifier: MIT
+"""
+Copyright (c) 2026 BACH Contributors
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+"""
+Tests fuer tools/rag/ingest.py - gebatchte Embedding-Pipeline gegen Stub-Server
+================================================================================
+"""
+
+import json
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+SYSTEM_ROOT = Path(__file__).parent.parent
+if str(SYSTEM_ROOT) not in sys.path:
+    sys.path.insert(0, str(SYSTEM_ROOT))
+
+import pytest
+
+
+class _StubEmbedHandler(BaseHTTPRequestHandler):
+    requests = []
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        self.requests.append(body["input"])
+        data = json.dumps({"embeddings": [[float(len(t)), 1.0, 0.5] for t in body["input"]]})
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.end_headers()
+        self.wfile.write(data.encode("utf-8"))
+
+    def log_message(self, *args):
+        pass
+
+
+class _Collection:
+    """Minimaler ChromaDB-Ersatz (get/add/delete)."""
+
+    def __init__(self):
+        self.rows = {}
+        self.get_calls = 0
+
+    def get(self, where):
+        self.get_calls += 1
+        ids = [i for i, r in self.rows.items() if r["meta"]["source"] == where["source"]]
+        return {"ids": ids, "metadatas": [self.rows[i]["meta"] for i in ids]}
+
+    def add(self, ids, documents, metadatas, embeddings):
+        for i, d, m, e in zip(ids, documents, metadatas, embeddings):
+            self.rows[i] = {"doc": d, "meta": m, "emb": e}
+
+    def delete(self, ids):
+        for i in ids:
+            self.rows.pop(i, None)
+
+
+@pytest.fixture
+def stub_server():
+    _StubEmbedHandler.requests = []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubEmbedHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+    server.server_close()
+
+
+class TestBatchedIngest:
+    def test_batches_cache_and_resume(self, stub_server, tmp_path, monkeypatch):
+        from tools.rag import ingest
+
+        monkeypatch.setattr(ingest, "BASE_DIR", tmp_path)
+        files = []
+        for n in range(3):
+            f = tmp_path / f"doc{n}.txt"
+            f.write_text("\n\n".join(f"Absatz {n}-{i} " + "x" * 300 for i in range(4)), encoding="utf-8")
+            files.append(f)
+
+        collection = _Collection()
+        cache_path = tmp_path / "cache.db"
+        progress = ingest.IngestProgress(tmp_path / "progress.json")
+        with ingest.Embedder(url=stub_server, batch_size=5, concurrency=3,
+                             cache=ingest.EmbeddingCache(cache_path)) as embedder:
+            added = ingest.ingest_files(files, collection, embedder, progress)
+
+        assert added == len(collection.rows) > 5
+        assert all(len(batch) <= 5 for batch in _StubEmbedHandler.requests)
+        assert len(_StubEmbedHandler.requests) < added
+
+        # Neuer Index, gleicher Cache: keine Requests
+        _StubEmbedHandler.requests = []
+        fresh = _Collection()
+        with ingest.Embedder(url=stub_server, cache=ingest.EmbeddingCache(cache_path)) as embedder:
+            assert ingest.ingest_files(files, fresh, embedder) == added
+        assert _StubEmbedHandler.requests == []
+
+        # Fortschrittsdatei: fertige Dateien werden ohne Index-Abfrage uebersprungen
+        resumed = ingest.IngestProgress(tmp_path / "progress.json")
+        with ingest.Embedder(url=stub_server) as embedder:
+            assert ingest.ingest_files(files, collection, embedder, resumed) == 0
+        assert collection.get_calls == 3
@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+# SPDX-License-Identifier: MIT
+"""
+Copyright (c) 2026 BACH Contributors
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+"""
+Tests fuer hub/_services/tasks/task_query.py - Task-Listen ohne BLOBs und N+1
+==============================================================================
+"""
+
+import sqlite3
+import sys
+from pathlib import Path
+
+import pytest
+
+SYSTEM_ROOT = Path(__file__).parent.parent
+if str(SYSTEM_ROOT) not in sys.path:
+    sys.path.insert(0, str(SYSTEM_ROOT))
+
+
+@pytest.fixture
+def conn():
+    c = sqlite3.connect(":memory:")
+    c.execute("""CREATE TABLE tasks (
+        id INTEGER PRIMARY KEY, title TEXT NOT NULL, category TEXT,
+        priority TEXT DEFAULT 'P3', status TEXT DEFAULT 'pending',
+        delegated_to TEXT, created_at TEXT, depends_on TEXT,
+        assigned_to TEXT DEFAULT 'user', image_data TEXT)""")
+    rows = [
+        (1, "Basis", "P1", "done", None, None),
+        (2, "Offen", "P2", "pending", None, "data:image/png;base64,AAAA"),
+        (3, "Haengt an 1", "P2", "pending", "1", ""),
+        (4, "Haengt an 2", "P3", "pending", "2, x", None),
+        (5, "Haengt an Geist", "P3", "pending", "999", None),
+        (6, "Ohne Prio", None, "pending", None, None),
+    ]
+    c.executemany("INSERT INTO tasks (id, title, priority, status, depends_on, image_data) "
+                  "VALUES (?, ?, ?, ?, ?, ?)", rows)
+    yield c
+    c.close()
+
+
+class TestListTasks:
+    def test_projection_and_flags(self, conn):
+        from hub._services.tasks.task_query import list_tasks
+
+        tasks = {t["id"]: t for t in list_tasks(conn, limit=None).tasks}
+        assert all("image_data" not in t for t in tasks.values())
+        assert tasks[2]["has_image"] is True
+        assert tasks[3]["has_image"] is False
+        assert tasks[3]["is_blocked_by_dep"] is False
+        assert tasks[4]["is_blocked_by_dep"] is True
+        assert tasks[5]["is_blocked_by_dep"] is False
+
+    def test_blocked_resolution_is_single_query(self, conn):
+        from hub._services.tasks.task_query import list_tasks
+
+        statements = []
+        conn.set_trace_callback(statements.append)
+        list_tasks(conn, limit=None)
+        conn.set_trace_callback(None)
+        assert sum("status != 'done'" in s for s in statements) == 1
+
+    @pytest.mark.parametrize("newest_first", [False, True])
+    def test_keyset_pages_cover_all(self, conn, newest_first):
+        from hub._services.tasks.task_query import list_tasks
+
+        full = [t["id"] for t in list_tasks(conn, limit=None, newest_first=newest_first).tasks]
+        seen, cursor = [], None
+        while True:
+            page = list_tasks(conn, limit=2, cursor=cursor, newest_first=newest_first)
+            seen.extend(t["id"] for t in page.tasks)
+            if page.next_cursor is None:
+                break
+            cursor = page.next_cursor
+        assert seen == full
+        assert len(full) == 6
+
+    def test_filters(self, conn):
+        from hub._services.tasks.task_query import list_tasks
+
+        ids = [t["id"] for t in list_tasks(conn, status="pending", title_contains="Haengt").tasks]
+        assert ids == [3, 4, 5]
+        assert list_tasks(conn, status="done").tasks[0]["id"] == 1
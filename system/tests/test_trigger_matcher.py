@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+# SPDX-License-Identifier: MIT
+"""
+Copyright (c) 2026 BACH Contributors
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+"""
+Tests fuer tools/trigger_matcher.py - Aho-Corasick ueber context_triggers
+==========================================================================
+"""
+
+import random
+import sqlite3
+import sys
+from pathlib import Path
+
+SYSTEM_ROOT = Path(__file__).parent.parent
+if str(SYSTEM_ROOT) not in sys.path:
+    sys.path.insert(0, str(SYSTEM_ROOT))
+
+
+class TestAhoCorasick:
+    def test_matches_linear_scan(self):
+        from tools.trigger_matcher import AhoCorasick
+        rng = random.Random(7)
+        patterns = ["he", "she", "his", "hers", "a", "ab", "bab", "", "datei suchen", "suche"]
+        patterns += ["".join(rng.choice("abhs ") for _ in range(rng.randint(1, 5))) for _ in range(200)]
+        ac = AhoCorasick(patterns)
+        for _ in range(300):
+            text = "".join(rng.choice("abhsxe ") for _ in range(rng.randint(0, 60)))
+            expected = {i for i, p in enumerate(patterns) if p and p in text}
+            assert ac.find(text) == expected
+
+
+class TestTriggerMatcher:
+    def _db(self, tmp_path):
+        db = tmp_path / "bach.db"
+        conn = sqlite3.connect(str(db))
+        conn.execute("""CREATE TABLE context_triggers (
+            id INTEGER PRIMARY KEY, trigger_phrase TEXT UNIQUE, hint_text TEXT,
+            source TEXT, usage_count INTEGER DEFAULT 0, is_active INTEGER DEFAULT 1)""")
+        conn.executemany("INSERT INTO context_triggers (trigger_phrase, hint_text, source) VALUES (?, ?, ?)",
+                         [("steuer", "Steuer-Tools", "manual"), ("backup", "Backup", "manual")])
+        conn.commit()
+        return db, conn
+
+    def test_rebuild_only_on_change(self, tmp_path, monkeypatch):
+        import tools.trigger_matcher as tm
+        monkeypatch.setattr(tm, "VERSION_CHECK_INTERVAL_SEC", 0)
+        tm.clear_cache()
+        db, conn = self._db(tmp_path)
+
+        m1 = tm.get_trigger_matcher(db)
+        assert [e['trigger_phrase'] for e in m1.match("backup und steuer")] == ["steuer", "backup"]
+
+        # usage_count-Updates invalidieren nicht
+        conn.execute("UPDATE context_triggers SET usage_count = usage_count + 1")
+        conn.commit()
+        assert tm.get_trigger_matcher(db) is m1
+
+        conn.execute("UPDATE context_triggers SET is_active = 0 WHERE trigger_phrase = 'steuer'")
+        conn.commit()
+        m2 = tm.get_trigger_matcher(db)
+        assert m2 is not m1
+        assert [e['trigger_phrase'] for e in m2.match("backup und steuer")] == ["backup"]
+        conn.close()
+        tm.clear_cache()
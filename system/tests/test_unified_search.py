@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+# SPDX-License-Identifier: MIT
+"""
+Copyright (c) 2026 BACH Contributors
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+"""
+Tests fuer tools/unified_search.py - inkrementeller Verzeichnis-Scan
+=====================================================================
+"""
+
+import os
+import sys
+from pathlib import Path
+
+SYSTEM_ROOT = Path(__file__).parent.parent
+for p in (SYSTEM_ROOT, SYSTEM_ROOT / "tools"):
+    if str(p) not in sys.path:
+        sys.path.insert(0, str(p))
+
+import pytest
+
+
+@pytest.fixture
+def engine(tmp_path):
+    from unified_search import UnifiedSearch
+    return UnifiedSearch(tmp_path / "search.db")
+
+
+def _indexed(msg: str) -> int:
+    return int(msg.split("Indexiert:")[1].split("|")[0])
+
+
+class TestIncrementalScan:
+    def test_unchanged_files_are_skipped(self, engine, tmp_path):
+        docs = tmp_path / "docs" / "health"
+        docs.mkdir(parents=True)
+        for i in range(5):
+            (docs / f"note{i}.txt").write_text(f"befund nummer {i}", encoding="utf-8")
+
+        ok, msg = engine.scan_directory(str(tmp_path / "docs"), workers=1)
+        assert ok and _indexed(msg) == 5
+
+        ok, msg = engine.scan_directory(str(tmp_path / "docs"), workers=1)
+        assert ok and _indexed(msg) == 0
+        assert "Unveraendert: 5" in msg
+
+    def test_changed_file_is_reindexed(self, engine, tmp_path):
+        docs = tmp_path / "docs"
+        docs.mkdir()
+        target = docs / "a.txt"
+        target.write_text("alter inhalt", encoding="utf-8")
+        engine.scan_directory(str(docs), workers=1)
+
+        target.write_text("neuer inhalt zahnarzt", encoding="utf-8")
+        st = target.stat()
+        os.utime(target, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+        ok, msg = engine.scan_directory(str(docs), workers=1)
+        assert ok and _indexed(msg) == 1
+
+        ok, results = engine.search("zahnarzt")
+        assert ok and [r["title"] for r in results] == ["a.txt"]
@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+# SPDX-License-Identifier: MIT
+"""
+Copyright (c) 2026 BACH Contributors
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+"""
+Tests fuer tools/rag/vector_store.py und UnifiedSearch.search_hybrid
+=====================================================================
+"""
+
+import math
+import random
+import sys
+from pathlib import Path
+
+SYSTEM_ROOT = Path(__file__).parent.parent
+for p in (SYSTEM_ROOT, SYSTEM_ROOT / "tools"):
+    if str(p) not in sys.path:
+        sys.path.insert(0, str(p))
+
+import pytest
+
+
+def _cos(a, b):
+    return sum(x * y for x, y in zip(a, b)) / (math.sqrt(sum(x * x for x in a)) * math.sqrt(sum(y * y for y in b)))
+
+
+@pytest.fixture
+def store(tmp_path):
+    from rag.vector_store import VectorStore
+    return VectorStore("test", vector_dir=tmp_path / "vs", db_path=tmp_path / "bach.db")
+
+
+class TestVectorStore:
+    def test_topk_matches_exact_cosine(self, store):
+        rng = random.Random(3)
+        vectors = {f"d{i}": [rng.uniform(-1, 1) for _ in range(16)] for i in range(200)}
+        store.add(ids=list(vectors), embeddings=list(vectors.values()),
+                  metadatas=[{"source": f"s{i % 5}"} for i in range(200)])
+        store.delete(ids=["d0", "d1"])
+        assert store.count() == 198
+
+        q = [rng.uniform(-1, 1) for _ in range(16)]
+        expected = sorted((k for k in vectors if k not in ("d0", "d1")),
+                          key=lambda k: -_cos(q, vectors[k]))[:5]
+        res = store.query([q], n_results=5)
+        assert res["ids"][0] == expected
+        assert res["distances"][0][0] == pytest.approx(1 - _cos(q, vectors[expected[0]]), abs=1e-5)
+
+        assert store.compact() == 2
+        assert store.query([q], n_results=5)["ids"][0] == expected
+        assert len(store.get(where={"source": "s3"})["ids"]) == 40
+
+    def test_ivf_finds_nearest(self, store):
+        pytest.importorskip("numpy")
+        import rag.vector_store as vs
+        rng = random.Random(5)
+        vectors = [[rng.gauss(0, 1) for _ in range(8)] for _ in range(500)]
+        store.add(ids=[str(i) for i in range(500)], embeddings=vectors)
+        assert store.build_ivf(nlist=10) == 10
+        old = vs.IVF_MIN_ROWS
+        vs.IVF_MIN_ROWS = 0
+        try:
+            res = store.query([vectors[42]], n_results=1, nprobe=3)
+        finally:
+            vs.IVF_MIN_ROWS = old
+        assert res["ids"][0] == ["42"]
+
+
+class _Embedder:
+    """Deterministische Bag-of-Letters-Embeddings statt Ollama."""
+
+    @staticmethod
+    def vec(text):
+        v = [0.0] * 26
+        for ch in text.lower():
+            if "a" <= ch <= "z":
+                v[ord(ch) - 97] += 1
+        return v
+
+    def embed(self, texts):
+        return [self.vec(t) for t in texts]
+
+
+class TestHybridSearch:
+    def test_hybrid_fuses_bm25_and_vector(self, tmp_path):
+        from unified_search import UnifiedSearch
+        engine = UnifiedSearch(tmp_path / "bach.db")
+        engine.ensure_schema()
+        conn = engine._get_db()
+        for i, (title, content) in enumerate([
+            ("Steuererklaerung", "belege fuer das finanzamt sammeln"),
+            ("Zzzyx", "zzzyx zzzyx"),
+            ("Backup", "nas sicherung taeglich"),
+        ]):
+            conn.execute("INSERT INTO search_index (source, source_id, title, content, content_hash) "
+                         "VALUES ('wiki', ?, ?, ?, ?)", (str(i), title, content, f"h{i}"))
+        conn.commit()
+        conn.close()
+
+        ok, msg = engine.embed_index(embedder=_Embedder())
+        assert ok and "3 eingebettet" in msg
+        ok, msg = engine.embed_index(embedder=_Embedder())
+        assert "Aktuell" in msg
+
+        ok, results = engine.search_hybrid("finanzamt", query_embedding=_Embedder.vec("zzzyx"), limit=5)
+        assert ok
+        titles = [r["title"] for r in results]
+        assert titles[:2] in (["Steuererklaerung", "Zzzyx"], ["Zzzyx", "Steuererklaerung"])
+        assert results[0]["bm25_rank"] or results[0]["vector_rank"]
@@ -0,0 +1,223 @@
+# -*- coding: utf-8 -*-
+# SPDX-License-Identifier: MIT
+"""
+Copyright (c) 2026 BACH Contributors
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+
+
+"""
+Tests fuer hub/_services/watcher/classification_stage.py - Regeln, Cache und Batching gegen einen lokalen Ollama-Stub
+======================================================================================================================
+"""
+
+import json
+import re
+import shutil
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+SYSTEM_ROOT = Path(__file__).parent.parent
+if str(SYSTEM_ROOT) not in sys.path:
+    sys.path.insert(0, str(SYSTEM_ROOT))
+
+from hub._services.watcher.classifier import (  # noqa: E402
+    EventAction, MistralClassifier, WatcherEvent,
+)
+from hub._services.watcher.classification_stage import (  # noqa: E402
+    ClassificationCache, ClassificationStage, RulePrefilter, format_stats, load_stats,
+)
+
+
+# ============ OLLAMA-STUB ============
+
+def _decide(text: str) -> dict:
+    action = "ESCALATE_CLAUDE" if "bug" in text.lower() else "LOG_ONLY"
+    return {"action": action, "confidence": 0.8, "reasoning": "stub", "response": "", "profile": ""}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def _json(self, data):
+        body = json.dumps(data).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        self._json({"models": [{"name": "Mistral:latest"}]})
+
+    def do_POST(self):
+        payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        user = payload["messages"][-1]["content"]
+        server = self.server
+        server.calls.append(user)
+        items = re.findall(r"^\[(\d+)\] (.*)$", user, re.MULTILINE)
+        if items:
+            answer = [dict(_decide(text), id=int(i)) for i, text in items
+                      if int(i) not in server.drop_ids]
+            content = "Hier die Ergebnisse:\n" + json.dumps(answer)
+        else:
+            content = json.dumps(_decide(user))
+        self._json({"model": payload["model"], "message": {"role": "assistant", "content": content}})
+
+
+@pytest.fixture
+def ollama_server():
+    try:
+        import requests  # noqa: F401
+    except ImportError:
+        if shutil.which("curl") is None:
+            pytest.skip("OllamaClient braucht requests oder curl")
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    server.daemon_threads = True
+    server.calls = []
+    server.drop_ids = set()
+    thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def stage(ollama_server, tmp_path):
+    classifier = MistralClassifier(SYSTEM_ROOT, f"http://127.0.0.1:{ollama_server.server_address[1]}")
+    return ClassificationStage(classifier, {"batch_size": 4}, stats_path=tmp_path / "stats.json")
+
+
+def _msg(content, sender="anna"):
+    return WatcherEvent(source="connector", event_type="message", content=content,
+                        sender=sender, connector_name="telegram")
+
+
+def _task(title):
+    return WatcherEvent(source="task_queue", event_type="new_task", content=f"[P1] {title}",
+                        sender="bach-system")
+
+
+# ============ TESTS ============
+
+class TestRulePrefilter:
+    def test_builtin_rules(self):
+        rules = RulePrefilter()
+        assert rules.match(_msg("  ")).action == EventAction.IGNORE
+        assert rules.match(_msg("/start")).action == EventAction.IGNORE
+        hello = rules.match(_msg("Hallo!!"))
+        assert hello.action == EventAction.RESPOND_DIRECT
+        assert hello.direct_response and hello.origin == "rule"
+        assert rules.match(_msg("Hallo, kannst du den Bug fixen?")) is None
+        # Gruss-Regeln gelten nur fuer Connector-Nachrichten
+        assert rules.match(_task("hallo")) is None
+
+    def test_config_rules(self):
+        rules = RulePrefilter([
+            {"source": "task_queue", "pattern": r"backup", "action": "log_only"},
+            {"pattern": "x", "action": "UNBEKANNT"},
+            {"pattern": "(", "action": "IGNORE"},
+        ])
+        assert len(rules.rules) == 1
+        assert rules.match(_task("Nightly Backup erledigt")).action == EventAction.LOG_ONLY
+        assert rules.match(_msg("backup")) is None
+
+
+class TestClassificationCache:
+    def test_lru_ttl_and_no_direct_response(self, monkeypatch):
+        import hub._services.watcher.classification_stage as mod
+        now = [1000.0]
+        monkeypatch.setattr(mod.time, "monotonic", lambda: now[0])
+
+        cache = ClassificationCache(max_entries=2, ttl_seconds=60)
+        hit = RulePrefilter().match(_msg("hallo"))
+        cache.put("a", hit)
+        cache.put("b", hit)
+        assert cache.get("a").origin == "cache"
+        cache.put("c", hit)                      # verdraengt "b" (laenger ungenutzt)
+        assert cache.get("b") is None
+        assert cache.get("a").direct_response == ""
+        now[0] += 61
+        assert cache.get("a") is None and cache.get("c") is None
+
+
+class TestClassificationStage:
+    def test_burst_is_batched_and_cached(self, stage, ollama_server):
+        events = [_msg("hi"), _msg("Bug im Export"), _msg("Deploy fertig"),
+                  _msg("deploy fertig."), _task("Rechnung pruefen")]
+        results = stage.classify_many(events)
+
+        assert [r.action for r in results] == [
+            EventAction.RESPOND_DIRECT, EventAction.ESCALATE_CLAUDE, EventAction.LOG_ONLY,
+            EventAction.LOG_ONLY, EventAction.LOG_ONLY]
+        assert [r.origin for r in results] == ["rule", "model", "model", "cache", "model"]
+        assert len(ollama_server.calls) == 1     # 3 verschiedene Inhalte, ein Prompt
+
+        again = stage.classify_many([_msg("Bug im Export", sender="ben")])
+        assert again[0].origin == "cache"
+        assert len(ollama_server.calls) == 1
+
+        stats = stage.stats()
+        assert stats["events"] == 6 and stats["model_calls"] == 1
+        assert stats["hit_rate"] == 0.5
+        stage.save_stats()
+        assert load_stats(stage.stats_path)["events"] == 6
+        assert any("Hit-Rate" in line for line in format_stats(load_stats(stage.stats_path)))
+
+    def test_batch_size_splits_calls(self, stage, ollama_server):
+        stage.classify_many([_task(f"Aufgabe {i}") for i in range(9)])
+        assert len(ollama_server.calls) == 3     # 4 + 4 + 1
+
+    def test_missing_batch_entries_are_classified_singly(self, stage, ollama_server):
+        ollama_server.drop_ids = {2}
+        results = stage.classify_many([_task("Eins"), _task("Bug zwei"), _task("Drei")])
+        assert results[1].action == EventAction.ESCALATE_CLAUDE
+        assert results[1].origin == "model"
+        assert len(ollama_server.calls) == 2
+
+    def test_unreachable_model_falls_back_and_is_not_cached(self, tmp_path):
+        classifier = MistralClassifier(SYSTEM_ROOT, "http://127.0.0.1:9")
+        stage = ClassificationStage(classifier, stats_path=None)
+        results = stage.classify_many([_task("A"), _task("B")])
+        assert all(r.action == EventAction.ESCALATE_CLAUDE and r.origin == "fallback"
+                   for r in results)
+        assert len(stage.cache) == 0
+
+
+class TestBatchParsing:
+    def test_tolerates_wrapped_and_loose_objects(self):
+        classifier = MistralClassifier(SYSTEM_ROOT)
+        wrapped = classifier._parse_batch_response(
+            '{"results": [{"id": 2, "action": "IGNORE"}, {"id": 1, "action": "log_only"}]}', 2)
+        assert wrapped[1].action == EventAction.LOG_ONLY
+        assert wrapped[2].action == EventAction.IGNORE
+
+        loose = classifier._parse_batch_response(
+            'Nr 1: {"action": "IGNORE"} Nr 2: {"action": "RESPOND_DIRECT", "response": "Hi"} '
+            '{"id": 7, "action": "IGNORE"}', 2)
+        assert set(loose) == {1, 2}
+        assert loose[2].direct_response == "Hi"
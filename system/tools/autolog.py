@@ -3,10 +3,10 @@
 # SPDX-License-Identifier: MIT
 """
 Tool: autolog
-Version: 1.0.1
+Version: 1.1.0
 Author: BACH Team
 Created: 2026-02-04
-Updated: 2026-02-08
+Updated: 2026-10-17
 Anthropic-Compatible: True
 
 VERSIONS-HINWEIS: Prüfe auf neuere Versionen mit: bach tools version autolog
@@ -14,32 +14,70 @@ VERSIONS-HINWEIS: Prüfe auf neuere Versionen mit: bach tools version autolog
 Description:
     Auto-Logging System - Protokolliert alle BACH Aktionen
     Log-Pfad konsolidiert nach data/logs/ (2026-02-06)
+    Tages-Segmente unter data/logs/autolog/, gepuffertes Schreiben (2026-10-17)
 
 Usage:
     python autolog.py [args]
 """
 
-__version__ = "1.0.1"
+__version__ = "1.1.0"
 __author__ = "BACH Team"
 
 """
 Auto-Logger - Protokolliert automatisch alle Aktionen
 =====================================================
 
-Zweistufiges System:
-1. auto_log.txt        - Letzte 300 Zeilen (Kurzzeitgedaechtnis)
-2. auto_log_extended.txt - Aeltere Eintraege, max 30 Tage (Archiv)
+Ein Segment pro Tag, nur angehaengt, nie umgeschrieben:
 
-Nach 30 Tagen werden Eintraege endgueltig geloescht.
+    data/logs/autolog/2026-10-17.log
+    [2026-10-17 09:12:01] CMD: task list
+
+- Eintraege werden gepuffert und beim Prozessende (atexit), ab
+  FLUSH_LINES Eintraegen oder bei [ERROR] mit einem write() geschrieben.
+- Wartung laeuft nur, wenn das Segment des Tages neu angelegt wird:
+  Segmente aelter als ARCHIVE_DAYS werden geloescht (Vergleich der
+  Dateinamen, keine Zeile wird gelesen), alte auto_log.txt /
+  auto_log_extended.txt einmalig in Segmente ueberfuehrt.
+- tail(n) liest die juengsten Segmente blockweise von hinten; die Kosten
+  haengen von n ab, nicht von der Log-Groesse.
+
+Der Logger selbst beruehrt beim Start kein Dateisystem.
 """
+import atexit
+import os
 import sys
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional
+
+
+MAX_LINES = 300           # Zeilen der Tail-Ansicht (Kurzzeitgedaechtnis)
+ARCHIVE_DAYS = 30         # Aufbewahrung der Tages-Segmente
+FLUSH_LINES = 50          # Puffer spaetestens nach so vielen Eintraegen schreiben
+TAIL_BLOCK = 8192         # Blockgroesse beim Rueckwaertslesen
+SEGMENT_SUFFIX = ".log"
 
 
-MAX_LINES = 300           # Maximale Zeilen im Haupt-Log
-ARCHIVE_DAYS = 30         # Tage im Extended-Archiv
+def _tail_lines(path: Path, n: int) -> List[str]:
+    """Letzte n Zeilen einer Datei, von hinten in Bloecken gelesen."""
+    if n <= 0:
+        return []
+    try:
+        with open(path, "rb") as f:
+            f.seek(0, os.SEEK_END)
+            pos = f.tell()
+            data = b""
+            while pos > 0 and data.count(b"\n") <= n:
+                step = min(TAIL_BLOCK, pos)
+                pos -= step
+                f.seek(pos)
+                data = f.read(step) + data
+    except OSError:
+        return []
+    lines = data.decode("utf-8", errors="replace").splitlines()
+    if pos > 0:
+        lines = lines[1:]  # Erste Zeile ist angeschnitten
+    return lines[-n:]
 
 
 class AutoLogger:
@@ -47,93 +85,165 @@ class AutoLogger:
     
     def __init__(self, base_path: Path):
         self.base_path = Path(base_path)
-        self.log_file = self.base_path / "data" / "logs" / "auto_log.txt"
-        self.extended_file = self.base_path / "data" / "logs" / "auto_log_extended.txt"
-        
-        # Verzeichnis sicherstellen
-        self.log_file.parent.mkdir(parents=True, exist_ok=True)
-        
-        # Cleanup bei Start
-        self._cleanup_if_needed()
-        self._cleanup_extended()
-    
-    def _cleanup_if_needed(self):
-        """Verschiebt alte Eintraege ins Extended-Archiv wenn Log zu gross."""
-        if not self.log_file.exists():
-            return
+        logs_dir = self.base_path / "data" / "logs"
+        self.log_dir = logs_dir / "autolog"
+        # Bisheriges Zwei-Dateien-Format (wird beim naechsten Tageswechsel migriert)
+        self.log_file = logs_dir / "auto_log.txt"
+        self.extended_file = logs_dir / "auto_log_extended.txt"
         
-        try:
-            lines = self.log_file.read_text(encoding="utf-8").splitlines()
-            if len(lines) > MAX_LINES:
-                # Alte Zeilen ins Extended-Archiv verschieben
-                old_lines = lines[:-MAX_LINES]
-                keep_lines = lines[-MAX_LINES:]
-                
-                # Ans Extended-Archiv anhaengen
-                with open(self.extended_file, "a", encoding="utf-8") as f:
-                    f.write("\n".join(old_lines) + "\n")
-                
-                # Haupt-Log kuerzen
-                self.log_file.write_text("\n".join(keep_lines) + "\n", encoding="utf-8")
-                
-        except Exception:
-            pass  # Nicht kritisch
+        self._buffer: List[tuple] = []          # (Tag, Zeile)
+        self._ready_day: Optional[str] = None   # Segment dieses Tages existiert
+        self._atexit_registered = False
     
-    def _cleanup_extended(self):
-        """Entfernt Eintraege aelter als ARCHIVE_DAYS aus dem Extended-Archiv."""
-        if not self.extended_file.exists():
-            return
-        
-        try:
-            cutoff = datetime.now() - timedelta(days=ARCHIVE_DAYS)
-            lines = self.extended_file.read_text(encoding="utf-8").splitlines()
-            
-            kept_lines = []
-            for line in lines:
-                # Datum aus Zeile extrahieren [YYYY-MM-DD HH:MM:SS] oder [HH:MM:SS]
-                if line.startswith("["):
-                    try:
-                        # Neues Format: [2026-01-17 02:20:22]
-                        if len(line) > 20 and line[5] == "-":
-                            date_str = line[1:11]  # YYYY-MM-DD
-                            line_date = datetime.strptime(date_str, "%Y-%m-%d")
-                            if line_date >= cutoff:
-                                kept_lines.append(line)
-                            continue
-                    except:
-                        pass
-                    
-                    # Altes Format ohne Datum: behalten (koennen wir nicht datieren)
-                    kept_lines.append(line)
-                else:
-                    # Cleanup-Marker oder andere Zeilen: behalten
-                    kept_lines.append(line)
-            
-            # Nur schreiben wenn sich was geaendert hat
-            if len(kept_lines) < len(lines):
-                removed = len(lines) - len(kept_lines)
-                self.extended_file.write_text(
-                    f"[--- {removed} Eintraege aelter als {ARCHIVE_DAYS} Tage entfernt ---]\n" +
-                    "\n".join(kept_lines) + "\n",
-                    encoding="utf-8"
-                )
-                
-        except Exception:
-            pass  # Nicht kritisch
+    # ─── Schreiben ──────────────────────────────────────────────────
     
     def _write_log(self, message: str):
-        """Schreibt direkt in Log-Datei."""
+        """Puffert einen Eintrag; schreibt bei Bedarf sofort."""
         now = datetime.now()
         # Format: [YYYY-MM-DD HH:MM:SS] message
         timestamp = now.strftime("%Y-%m-%d %H:%M:%S")
-        entry = f"[{timestamp}] {message}\n"
+        self._buffer.append((timestamp[:10], f"[{timestamp}] {message}\n"))
+        
+        if not self._atexit_registered:
+            atexit.register(self.flush)
+            self._atexit_registered = True
+        
+        if len(self._buffer) >= FLUSH_LINES or message.startswith("[ERROR]"):
+            self.flush()
+    
+    def flush(self):
+        """Schreibt gepufferte Eintraege (ein write() pro Tages-Segment)."""
+        if not self._buffer:
+            return
+        entries, self._buffer = self._buffer, []
+        
+        by_day = {}
+        for day, line in entries:
+            by_day.setdefault(day, []).append(line)
         
         try:
-            with open(self.log_file, "a", encoding="utf-8") as f:
-                f.write(entry)
+            for day, lines in by_day.items():
+                segment = self.segment_path(day)
+                if day != self._ready_day:
+                    if not segment.exists():
+                        self._start_segment(day)
+                    self._ready_day = day
+                with open(segment, "a", encoding="utf-8") as f:
+                    f.write("".join(lines))
         except Exception as e:
             print(f"[LOG ERROR] {e}", file=sys.stderr)
     
+    # ─── Wartung (nur beim Anlegen eines neuen Tages-Segments) ──────
+    
+    def _start_segment(self, day: str):
+        """Legt das Log-Verzeichnis an, migriert Altdateien, loescht alte Segmente."""
+        self.log_dir.mkdir(parents=True, exist_ok=True)
+        self._migrate_legacy(day)
+        self._apply_retention(day)
+    
+    def _cutoff(self, day: str) -> str:
+        return (datetime.strptime(day, "%Y-%m-%d") - timedelta(days=ARCHIVE_DAYS)).strftime("%Y-%m-%d")
+    
+    def _apply_retention(self, day: str) -> int:
+        """Loescht Segmente aelter als ARCHIVE_DAYS. Gibt Anzahl zurueck."""
+        cutoff = self._cutoff(day)
+        removed = 0
+        for segment in self.segments():
+            if segment.stem < cutoff:
+                try:
+                    segment.unlink()
+                    removed += 1
+                except OSError:
+                    pass
+        return removed
+    
+    def _migrate_legacy(self, day: str):
+        """Ueberfuehrt auto_log_extended.txt und auto_log.txt einmalig in Segmente."""
+        cutoff = self._cutoff(day)
+        for legacy in (self.extended_file, self.log_file):  # aelteste zuerst
+            claimed = legacy.with_name(f"{legacy.name}.migrating-{os.getpid()}")
+            try:
+                # Umbenennen ist atomar: nur ein Prozess migriert
+                os.replace(str(legacy), str(claimed))
+            except OSError:
+                continue
+            try:
+                current = datetime.fromtimestamp(claimed.stat().st_mtime).strftime("%Y-%m-%d")
+                by_day = {}
+                with open(claimed, "r", encoding="utf-8", errors="replace") as f:
+                    for line in f:
+                        # [YYYY-MM-DD HH:MM:SS]; undatierte Zeilen zum vorigen Tag
+                        if line.startswith("[") and line[5:6] == "-" and line[11:12] == " ":
+                            current = line[1:11]
+                        if current >= cutoff:
+                            by_day.setdefault(current, []).append(line.rstrip("\n") + "\n")
+                for seg_day, lines in sorted(by_day.items()):
+                    with open(self.segment_path(seg_day), "a", encoding="utf-8") as f:
+                        f.write("".join(lines))
+                claimed.unlink()
+            except (OSError, ValueError) as e:
+                print(f"[LOG ERROR] Migration {legacy.name}: {e}", file=sys.stderr)
+    
+    # ─── Lesen ──────────────────────────────────────────────────────
+    
+    def segment_path(self, day: str) -> Path:
+        """Pfad des Segments fuer einen Tag (YYYY-MM-DD)."""
+        return self.log_dir / f"{day}{SEGMENT_SUFFIX}"
+    
+    def segments(self) -> List[Path]:
+        """Alle Tages-Segmente, aelteste zuerst."""
+        try:
+            names = os.listdir(self.log_dir)
+        except OSError:
+            return []
+        return [self.log_dir / n for n in sorted(names)
+                if n.endswith(SEGMENT_SUFFIX) and len(n) == 10 + len(SEGMENT_SUFFIX)]
+    
+    def tail(self, n: int = MAX_LINES) -> List[str]:
+        """Letzte n Eintraege ueber alle Segmente (juengstes zuletzt)."""
+        self.flush()
+        lines: List[str] = []
+        for segment in reversed(self.segments()):
+            lines = _tail_lines(segment, n - len(lines)) + lines
+            if len(lines) >= n:
+                break
+        return lines[-n:] if n > 0 else []
+    
+    def read_since(self, since: datetime) -> List[str]:
+        """Eintraege ab einem Zeitpunkt (nur Segmente ab dessen Tag werden gelesen)."""
+        self.flush()
+        if since.tzinfo is not None:
+            since = since.astimezone().replace(tzinfo=None)
+        stamp = since.strftime("[%Y-%m-%d %H:%M:%S]")
+        day = stamp[1:11]
+        lines = []
+        for segment in self.segments():
+            if segment.stem < day:
+                continue
+            try:
+                content = segment.read_text(encoding="utf-8", errors="replace")
+            except OSError:
+                continue
+            # Zeitstempel sind fest formatiert: Stringvergleich statt strptime
+            lines.extend(l for l in content.splitlines() if l[:21] >= stamp)
+        return lines
+    
+    def count(self) -> dict:
+        """Anzahl Segmente, Eintraege und Bytes."""
+        self.flush()
+        entries = size = 0
+        segments = self.segments()
+        for segment in segments:
+            try:
+                data = segment.read_bytes()
+            except OSError:
+                continue
+            entries += data.count(b"\n")
+            size += len(data)
+        return {"segments": len(segments), "entries": entries, "bytes": size}
+    
+    # ─── API ────────────────────────────────────────────────────────
+    
     def log(self, message: str):
         """Loggt eine Nachricht mit Timestamp."""
         self._write_log(message)
@@ -206,13 +316,13 @@ if __name__ == "__main__":
 Beispiele:
   python autolog.py                    # Letzte 20 Eintraege
   python autolog.py --tail 50          # Letzte 50 Eintraege
-  python autolog.py --extended         # Extended-Archiv anzeigen
+  python autolog.py --extended         # Alle Segmente (max 30 Tage) anzeigen
   python autolog.py --count            # Anzahl Eintraege
   python autolog.py --log "Test"       # Manueller Eintrag
 """
     )
     parser.add_argument("--tail", type=int, nargs="?", const=20, default=None, help="Letzte n Eintraege (Standard: 20)")
-    parser.add_argument("--extended", action="store_true", help="Extended-Archiv anzeigen")
+    parser.add_argument("--extended", action="store_true", help="Alle Tages-Segmente anzeigen")
     parser.add_argument("--count", action="store_true", help="Anzahl Eintraege anzeigen")
     parser.add_argument("--log", type=str, help="Manuellen Eintrag schreiben")
     parser.add_argument("--path", type=str, default=None, help="Basis-Pfad (Standard: BACH-Ordner)")
@@ -225,35 +335,29 @@ Beispiele:
     
     if args.log:
         logger.log(args.log)
+        logger.flush()
         print(f"[OK] Eintrag geschrieben: {args.log}")
     
     elif args.count:
-        main_count = 0
-        ext_count = 0
-        if logger.log_file.exists():
-            main_count = len(logger.log_file.read_text(encoding="utf-8").splitlines())
-        if logger.extended_file.exists():
-            ext_count = len(logger.extended_file.read_text(encoding="utf-8").splitlines())
+        stats = logger.count()
         print(f"[AUTOLOG]")
-        print(f"  Haupt-Log:  {main_count} Eintraege (max {MAX_LINES})")
-        print(f"  Extended:   {ext_count} Eintraege")
-        print(f"  Gesamt:     {main_count + ext_count} Eintraege")
+        print(f"  Segmente:   {stats['segments']} Tage (max {ARCHIVE_DAYS})")
+        print(f"  Eintraege:  {stats['entries']}")
+        print(f"  Groesse:    {stats['bytes'] / 1024:.1f} KB")
     
     elif args.extended:
-        if logger.extended_file.exists():
-            content = logger.extended_file.read_text(encoding="utf-8")
-            print(content)
+        segments = logger.segments()
+        if segments:
+            for segment in segments:
+                print(segment.read_text(encoding="utf-8", errors="replace"), end="")
         else:
-            print("[INFO] Kein Extended-Archiv vorhanden")
+            print("[INFO] Keine Log-Segmente vorhanden")
     
     else:
         # Standard: Tail anzeigen
         n = args.tail if args.tail else 20
-        if logger.log_file.exists():
-            lines = logger.log_file.read_text(encoding="utf-8").splitlines()
-            for line in lines[-n:]:
-                print(line)
-            if len(lines) > n:
-                print(f"\n[...] {len(lines) - n} aeltere Eintraege nicht angezeigt")
-        else:
+        lines = logger.tail(n)
+        for line in lines:
+            print(line)
+        if not lines:
             print("[INFO] Noch keine Log-Eintraege")
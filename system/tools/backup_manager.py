@@ -3,10 +3,10 @@
 # SPDX-License-Identifier: MIT
 """
 Tool: backup_manager
-Version: 1.0.0
+Version: 1.1.0
 Author: BACH Team
 Created: 2026-02-08
-Updated: 2026-02-08
+Updated: 2026-10-17
 Anthropic-Compatible: True
 
 VERSIONS-HINWEIS: Prüfe auf neuere Versionen mit: bach tools version backup_manager
@@ -14,15 +14,17 @@ VERSIONS-HINWEIS: Prüfe auf neuere Versionen mit: bach tools version backup_man
 backup_manager.py - BACH Backup & Restore System
 
 Verwaltet:
-- User-Backup (dist_type=0) -> system/data/system/data/system/data/system/data/backups/*.zip
+- User-Backup (dist_type=0) -> _backups/store/ (inkrementell, dedupliziert,
+  siehe backup_store.py); alte userdata_*.zip bleiben les- und restorebar
 - Template-Snapshots (dist_type=1) -> dist/snapshots/*.orig  
 - Distribution-Restore (dist_type=2) -> Aus dist/
 
 Usage:
-    python backup_manager.py create [--to-nas]
+    python backup_manager.py create [--to-nas] [--db-snapshot]
     python backup_manager.py list [--nas]
     python backup_manager.py info <name>
-    python backup_manager.py restore backup <name>
+    python backup_manager.py verify [<name>]
+    python backup_manager.py restore backup <name> [--tables tasks,memory_sessions|all]
     python backup_manager.py restore template <file>
     python backup_manager.py restore dist <name>
 """
@@ -48,6 +50,20 @@ MEMORY_DIR = BACH_DIR / "memory"
 LOGS_DIR = BACH_DIR / "data" / "logs"
 USER_DIR = BACH_DIR / "user"
 
+# Zeilenweise gesicherte User-Tabellen
+USER_TABLES = [
+    "tasks",
+    "memory_sessions",
+    "memory_lessons",
+    "memory_context",
+    "monitor_tokens",
+    "monitor_success",
+]
+
+# Beim Restore standardmaessig ersetzte Tabellen (wie vor dem Backup-Store);
+# weitere nur explizit (--tables), da Restore die Tabelle komplett ersetzt
+RESTORE_TABLES = ["tasks", "memory_sessions"]
+
 # NAS-Pfad (wird aus DB geladen)
 DEFAULT_NAS_PATH = r"\YOUR_NAS_IP\fritz.nas\Extreme_SSD\BACKUP\BACH_Backups"
 
@@ -55,17 +71,27 @@ DEFAULT_NAS_PATH = r"\YOUR_NAS_IP\fritz.nas\Extreme_SSD\BACKUP\BACH_Backups"
 class BackupManager:
     """Verwaltet Backups, Snapshots und Restores."""
     
-    def __init__(self):
-        self.db_path = DB_PATH
-        self.backups_dir = BACKUPS_DIR
+    def __init__(self, backups_dir: Path = None, db_path: Path = None):
+        self.db_path = db_path or DB_PATH
+        self.backups_dir = backups_dir or BACKUPS_DIR
         self.snapshots_dir = SNAPSHOTS_DIR
         self._ensure_dirs()
         self.nas_path = self._get_nas_path()
+        self._store = None
+    
+    @property
+    def store(self):
+        """Lazy-Load BackupStore unter backups_dir/store."""
+        if self._store is None:
+            sys.path.insert(0, str(Path(__file__).parent))
+            from backup_store import BackupStore
+            self._store = BackupStore(self.backups_dir / "store")
+        return self._store
     
     def _ensure_dirs(self):
         """Erstellt notwendige Verzeichnisse."""
-        self.backups_dir.mkdir(exist_ok=True)
-        self.snapshots_dir.mkdir(exist_ok=True)
+        self.backups_dir.mkdir(parents=True, exist_ok=True)
+        self.snapshots_dir.mkdir(parents=True, exist_ok=True)
     
     def _get_nas_path(self) -> Optional[Path]:
         """Lädt NAS-Pfad aus Datenbank."""
@@ -80,6 +106,16 @@ class BackupManager:
             pass
         return Path(DEFAULT_NAS_PATH)
     
+    def _nas_store(self):
+        """BackupStore auf dem NAS, None wenn (noch) nicht vorhanden."""
+        try:
+            if self.nas_path and (self.nas_path / "store").exists():
+                store_cls = type(self.store)  # importiert backup_store bei Bedarf
+                return store_cls(self.nas_path / "store")
+        except OSError:
+            pass
+        return None
+    
     def _get_db(self):
         """Datenbank-Verbindung."""
         return sqlite3.connect(self.db_path)
@@ -88,137 +124,64 @@ class BackupManager:
     # BACKUP CREATE
     # ═══════════════════════════════════════════════════════════════
     
-    def create_backup(self, to_nas: bool = False) -> Tuple[bool, str]:
+    def create_backup(self, to_nas: bool = False, db_snapshot: bool = False,
+                      rotate: bool = True) -> Tuple[bool, str]:
         """
         Erstellt Backup aller Userdaten (dist_type=0).
         
+        Inkrementell: unveraenderte Dateien werden nicht gelesen, bereits
+        gespeicherte Chunks (Dateien, Tabellen-Bereiche) nicht erneut geschrieben.
+        
+        Args:
+            to_nas: Zusaetzlich (inkrementell) auf NAS kopieren
+            db_snapshot: Zusaetzlich Seiten-Snapshot der kompletten bach.db
+            rotate: Danach alte Backups rotieren (False beim Auto-Backup vor
+                    einem Restore, sonst koennte das Quell-Backup geloescht werden)
+        
         Returns:
-            (success, message/path)
+            (success, message/name)
         """
         timestamp = datetime.now().strftime("%Y-%m-%d_%H%M%S")
         backup_name = f"userdata_{timestamp}"
-        zip_path = self.backups_dir / f"{backup_name}.zip"
         
         print(f"\n[BACKUP] Erstelle Backup: {backup_name}")
         print("=" * 60)
         
         try:
-            with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zf:
-                
-                # 1. Manifest erstellen
-                manifest = {
-                    "name": backup_name,
-                    "created_at": datetime.now().isoformat(),
+            print("  -> Sichere Datenbank-Tabellen, Memory, Logs, User-Daten...")
+            manifest, stats = self.store.create(
+                backup_name,
+                base_dir=BACH_DIR,
+                dirs=[MEMORY_DIR, LOGS_DIR, USER_DIR],
+                db_path=self.db_path,
+                tables=USER_TABLES,
+                db_snapshot=db_snapshot,
+                meta={
                     "bach_version": self._get_bach_version(),
                     "type": "userdata",
                     "dist_type": 0,
-                    "contents": []
-                }
-                
-                # 2. Datenbank-Export (nur User-Tabellen)
-                print("  -> Exportiere Datenbank...")
-                db_export = self._export_user_tables()
-                zf.writestr("db_export.json", json.dumps(db_export, indent=2, ensure_ascii=False))
-                manifest["contents"].append("db_export.json")
-                
-                # 3. Memory-Verzeichnis
-                if MEMORY_DIR.exists():
-                    print("  -> Sichere Memory...")
-                    for file in MEMORY_DIR.rglob("*"):
-                        if file.is_file():
-                            arcname = f"memory/{file.relative_to(MEMORY_DIR)}"
-                            zf.write(file, arcname)
-                            manifest["contents"].append(arcname)
-                
-                # 4. Logs-Verzeichnis
-                if LOGS_DIR.exists():
-                    print("  -> Sichere Logs...")
-                    for file in LOGS_DIR.rglob("*"):
-                        if file.is_file():
-                            arcname = f"logs/{file.relative_to(LOGS_DIR)}"
-                            zf.write(file, arcname)
-                            manifest["contents"].append(arcname)
-                
-                # 5. User-Verzeichnis
-                if USER_DIR.exists():
-                    print("  -> Sichere User-Daten...")
-                    for file in USER_DIR.rglob("*"):
-                        if file.is_file():
-                            arcname = f"user/{file.relative_to(USER_DIR)}"
-                            zf.write(file, arcname)
-                            manifest["contents"].append(arcname)
-                
-                # 6. Manifest speichern
-                zf.writestr("manifest.json", json.dumps(manifest, indent=2, ensure_ascii=False))
-            
-            # Größe berechnen
-            size_mb = zip_path.stat().st_size / (1024 * 1024)
-            print(f"\n  [OK] Backup erstellt: {zip_path.name} ({size_mb:.2f} MB)")
+                },
+            )
+            print(f"\n  [OK] Backup erstellt: {backup_name}")
+            print(f"       {stats.format()}")
             
             # Optional: Auf NAS kopieren
             if to_nas and self.nas_path:
-                nas_result = self._copy_to_nas(zip_path)
+                nas_result = self._copy_to_nas(backup_name)
                 if nas_result:
                     print(f"  [OK] Auf NAS kopiert: {self.nas_path}")
             
             # Rotation durchführen
-            self._rotate_backups()
+            if rotate:
+                self._rotate_backups()
             
             print("=" * 60)
-            return True, str(zip_path)
+            return True, backup_name
             
         except Exception as e:
             print(f"\n  [ERR] Fehler: {e}")
             return False, str(e)
     
-    def _export_user_tables(self) -> Dict:
-        """Exportiert User-Tabellen aus der Datenbank."""
-        export = {}
-        
-        with self._get_db() as conn:
-            conn.row_factory = sqlite3.Row
-            
-            # Tasks (immer dist_type=0)
-            tasks = conn.execute("SELECT * FROM tasks").fetchall()
-            export["tasks"] = [dict(row) for row in tasks]
-            
-            # Memory Sessions
-            try:
-                sessions = conn.execute("SELECT * FROM memory_sessions").fetchall()
-                export["memory_sessions"] = [dict(row) for row in sessions]
-            except:
-                export["memory_sessions"] = []
-            
-            # Memory Lessons
-            try:
-                lessons = conn.execute("SELECT * FROM memory_lessons").fetchall()
-                export["memory_lessons"] = [dict(row) for row in lessons]
-            except:
-                export["memory_lessons"] = []
-            
-            # Memory Context
-            try:
-                context = conn.execute("SELECT * FROM memory_context").fetchall()
-                export["memory_context"] = [dict(row) for row in context]
-            except:
-                export["memory_context"] = []
-            
-            # Token-Monitoring
-            try:
-                tokens = conn.execute("SELECT * FROM monitor_tokens").fetchall()
-                export["monitor_tokens"] = [dict(row) for row in tokens]
-            except:
-                export["monitor_tokens"] = []
-            
-            # Success-Monitoring
-            try:
-                success = conn.execute("SELECT * FROM monitor_success").fetchall()
-                export["monitor_success"] = [dict(row) for row in success]
-            except:
-                export["monitor_success"] = []
-        
-        return export
-    
     def _get_bach_version(self) -> str:
         """Holt BACH-Version aus der Datenbank."""
         try:
@@ -232,15 +195,14 @@ class BackupManager:
             pass
         return "unknown"
     
-    def _copy_to_nas(self, source: Path) -> bool:
-        """Kopiert Backup auf NAS."""
+    def _copy_to_nas(self, backup_name: str) -> bool:
+        """Kopiert Backup auf NAS (nur dort fehlende Chunks + Manifest)."""
         try:
             if not self.nas_path:
                 return False
             
-            self.nas_path.mkdir(parents=True, exist_ok=True)
-            dest = self.nas_path / source.name
-            shutil.copy2(source, dest)
+            copied = self.store.copy_to(self.nas_path / "store", backup_name)
+            print(f"  -> {copied} neue Chunks auf NAS")
             return True
         except Exception as e:
             print(f"  ! NAS-Kopie fehlgeschlagen: {e}")
@@ -248,7 +210,15 @@ class BackupManager:
     
     def _rotate_backups(self, local_keep: int = 7, nas_keep: int = 30):
         """Löscht alte Backups."""
-        # Lokale Rotation
+        # Store: alte Manifeste weg, danach unreferenzierte Chunks
+        for name in self.store.rotate(local_keep):
+            print(f"  -> Gelöscht (lokal): {name}")
+        nas = self._nas_store()
+        if nas:
+            for name in nas.rotate(nas_keep):
+                print(f"  -> Gelöscht (NAS): {name}")
+        
+        # Alte ZIP-Backups (vor Store)
         backups = sorted(self.backups_dir.glob("userdata_*.zip"), reverse=True)
         for old in backups[local_keep:]:
             old.unlink()
@@ -269,7 +239,34 @@ class BackupManager:
         """Listet verfügbare Backups."""
         backups = []
         
-        # Lokale Backups
+        # Store-Backups (neueste zuerst)
+        if show_nas:
+            nas = self._nas_store()
+            stores = [(nas, "NAS")] if nas else []
+        else:
+            stores = [(self.store, "lokal")]
+        for store, location in stores:
+            for name in reversed(store.list_manifests()):
+                try:
+                    manifest = store.load_manifest(name)
+                except Exception:
+                    continue
+                stats = manifest.get("stats", {})
+                backups.append({
+                    "name": name,
+                    "created_at": manifest.get("created_at", "unknown"),
+                    "bach_version": manifest.get("bach_version"),
+                    "type": manifest.get("type"),
+                    "files": len(manifest.get("files", {})),
+                    "tables": {t: e["rows"] for t, e in manifest.get("tables", {}).items()},
+                    "db_snapshot": bool(manifest.get("db_snapshot")),
+                    "stats": stats,
+                    "size_mb": stats.get("stored_bytes", 0) / (1024 * 1024),
+                    "location": location,
+                    "format": "store",
+                })
+        
+        # Lokale ZIP-Backups
         if not show_nas:
             for zip_file in sorted(self.backups_dir.glob("userdata_*.zip"), reverse=True):
                 info = self._get_backup_info(zip_file)
@@ -329,7 +326,8 @@ class BackupManager:
     # ═══════════════════════════════════════════════════════════════
     
     def restore_backup(self, name: str, force: bool = False, 
-                       auto_backup: bool = True) -> Tuple[bool, str]:
+                       auto_backup: bool = True, db_snapshot: bool = False,
+                       tables: Optional[List[str]] = None) -> Tuple[bool, str]:
         """
         Stellt Userdaten aus Backup wieder her.
         
@@ -337,8 +335,18 @@ class BackupManager:
             name: Backup-Name oder "latest"
             force: Ohne Bestätigung
             auto_backup: Vorher Auto-Backup erstellen
+            db_snapshot: DB-Snapshot (falls im Backup) nach data/bach_restored.db schreiben
+            tables: Zu ersetzende Tabellen (None = RESTORE_TABLES; nur Store-Backups)
         """
-        # Backup finden
+        # Store-Backup (bevorzugt)
+        store_names = self.store.list_manifests()
+        if name == "latest" and store_names:
+            name = store_names[-1]
+        if name in store_names:
+            return self._restore_from_store(name, force, auto_backup, db_snapshot,
+                                            RESTORE_TABLES if tables is None else tables)
+        
+        # Backup finden (altes ZIP-Format)
         if name == "latest":
             backups = sorted(self.backups_dir.glob("userdata_*.zip"), reverse=True)
             if not backups:
@@ -364,7 +372,7 @@ class BackupManager:
         # Auto-Backup
         if auto_backup:
             print("\n  -> Erstelle Auto-Backup...")
-            self.create_backup()
+            self.create_backup(rotate=False)  # keine Rotation: Quell-Backup bleibt
         
         try:
             with zipfile.ZipFile(zip_path, 'r') as zf:
@@ -410,6 +418,56 @@ class BackupManager:
             print(f"\n  [ERR] Fehler: {e}")
             return False, str(e)
     
+    def _restore_from_store(self, name: str, force: bool, auto_backup: bool,
+                            db_snapshot: bool, tables: List[str]) -> Tuple[bool, str]:
+        """Restore aus dem Backup-Store: erst Verify, dann Dateien und Tabellen."""
+        print(f"\n[RESTORE] Backup: {name}")
+        print("=" * 60)
+        
+        print("  -> Prüfe Backup...")
+        ok, problems = self.store.verify(name)
+        if not ok:
+            for problem in problems[:10]:
+                print(f"  [ERR] {problem}")
+            return False, f"Backup beschädigt: {len(problems)} Probleme"
+        
+        if not force:
+            print("\n  [!]  ACHTUNG: Dies überschreibt aktuelle Userdaten!")
+            confirm = input("  Fortfahren? [y/N]: ").strip().lower()
+            if confirm != 'y':
+                return False, "Abgebrochen"
+        
+        if auto_backup:
+            print("\n  -> Erstelle Auto-Backup...")
+            self.create_backup(rotate=False)  # keine Rotation: Quell-Backup bleibt
+        
+        try:
+            print(f"  -> Stelle Dateien und Tabellen wieder her ({', '.join(tables) or '-'})...")
+            snapshot_target = self.db_path.with_name("bach_restored.db") if db_snapshot else None
+            result = self.store.restore(name, BACH_DIR, db_path=self.db_path, tables=tables,
+                                        snapshot_target=snapshot_target)
+            print(f"  [OK] {result['files']} Dateien, {result['tables']} Tabellen "
+                  f"({result['rows']} Zeilen)")
+            if result["snapshot"]:
+                print(f"  [OK] DB-Snapshot: {snapshot_target}")
+            print("\n  [OK] Restore abgeschlossen!")
+            print("=" * 60)
+            return True, name
+        except Exception as e:
+            print(f"\n  [ERR] Fehler: {e}")
+            return False, str(e)
+    
+    def verify_backup(self, name: str = "latest") -> Tuple[bool, List[str]]:
+        """Prüft alle Chunks eines Store-Backups gegen sein Manifest."""
+        names = self.store.list_manifests()
+        if name == "latest":
+            if not names:
+                return False, ["Keine Backups gefunden"]
+            name = names[-1]
+        if name not in names:
+            return False, [f"Backup nicht gefunden: {name}"]
+        return self.store.verify(name)
+    
     def _restore_db_tables(self, export: Dict):
         """Stellt Datenbank-Tabellen wieder her."""
         with self._get_db() as conn:
@@ -501,6 +559,7 @@ def main():
 Beispiele:
   %(prog)s create                  Backup erstellen (lokal)
   %(prog)s create --to-nas         Backup erstellen + NAS
+  %(prog)s verify                  Neuestes Backup prüfen
   %(prog)s list                    Lokale Backups anzeigen
   %(prog)s list --nas              NAS-Backups anzeigen
   %(prog)s info userdata_2026-01-14  Backup-Details
@@ -514,6 +573,8 @@ Beispiele:
     # create
     p_create = subparsers.add_parser("create", help="Backup erstellen")
     p_create.add_argument("--to-nas", action="store_true", help="Auch auf NAS kopieren")
+    p_create.add_argument("--db-snapshot", action="store_true",
+                          help="Zusätzlich Seiten-Snapshot der ganzen bach.db")
     
     # list
     p_list = subparsers.add_parser("list", help="Backups auflisten")
@@ -523,6 +584,10 @@ Beispiele:
     p_info = subparsers.add_parser("info", help="Backup-Info anzeigen")
     p_info.add_argument("name", help="Backup-Name")
     
+    # verify
+    p_verify = subparsers.add_parser("verify", help="Backup gegen Manifest prüfen")
+    p_verify.add_argument("name", nargs="?", default="latest", help="Backup-Name")
+    
     # restore
     p_restore = subparsers.add_parser("restore", help="Wiederherstellen")
     p_restore.add_argument("type", choices=["backup", "template", "dist"], 
@@ -531,6 +596,11 @@ Beispiele:
     p_restore.add_argument("--force", action="store_true", help="Ohne Bestätigung")
     p_restore.add_argument("--no-auto-backup", action="store_true", 
                           help="Kein Auto-Backup vor Restore")
+    p_restore.add_argument("--db-snapshot", action="store_true",
+                          help="DB-Snapshot nach data/bach_restored.db schreiben")
+    p_restore.add_argument("--tables", default=None,
+                          help=f"Zu ersetzende Tabellen, kommagetrennt oder 'all' "
+                               f"(Standard: {','.join(RESTORE_TABLES)})")
     
     # snapshot
     p_snapshot = subparsers.add_parser("snapshot", help="Template-Snapshot erstellen")
@@ -545,9 +615,16 @@ Beispiele:
     manager = BackupManager()
     
     if args.command == "create":
-        success, msg = manager.create_backup(to_nas=args.to_nas)
+        success, msg = manager.create_backup(to_nas=args.to_nas, db_snapshot=args.db_snapshot)
         sys.exit(0 if success else 1)
     
+    elif args.command == "verify":
+        ok, problems = manager.verify_backup(args.name)
+        for problem in problems:
+            print(f"  [ERR] {problem}")
+        print("[OK] Backup vollständig" if ok else f"[ERR] {len(problems)} Probleme")
+        sys.exit(0 if ok else 1)
+    
     elif args.command == "list":
         manager.print_backup_list(show_nas=args.nas)
     
@@ -564,7 +641,10 @@ Beispiele:
             success, msg = manager.restore_backup(
                 args.name, 
                 force=args.force,
-                auto_backup=not args.no_auto_backup
+                auto_backup=not args.no_auto_backup,
+                db_snapshot=args.db_snapshot,
+                tables=(None if args.tables is None else USER_TABLES if args.tables == "all"
+                        else [t.strip() for t in args.tables.split(",") if t.strip()])
             )
         elif args.type == "template":
             success, msg = manager.restore_template(args.name)
@@ -0,0 +1,622 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# SPDX-License-Identifier: MIT
+"""
+Tool: backup_store
+Version: 1.0.0
+Author: BACH Team
+Created: 2026-10-17
+Anthropic-Compatible: True
+
+Description:
+    Inkrementeller, deduplizierter Backup-Speicher fuer BackupManager.
+
+    - Dateien werden in 1-MiB-Chunks gelesen, unveraenderte Dateien
+      (Groesse + mtime wie im letzten Manifest) gar nicht erst gelesen.
+    - Tabellen werden zeilenweise als JSONL gestreamt, ein Chunk pro
+      rowid-Bereich: Anhaengen/Aendern beruehrt nur die betroffenen Bereiche.
+    - Optional ein Seiten-Snapshot der ganzen DB (sqlite3-Backup-API),
+      gechunkt an Seitengrenzen.
+    - Jeder Chunk liegt zlib-komprimiert unter seinem SHA-256 und wird
+      ueber alle Backups hinweg nur einmal gespeichert.
+    - Ein Manifest pro Backup beschreibt Dateien, Tabellen und Snapshot;
+      Restore und Verify arbeiten nur ueber das Manifest.
+
+    Speicherbedarf ist unabhaengig von der Datenmenge (ein Chunk bzw. ein
+    rowid-Bereich gleichzeitig), nur das Manifest waechst mit der Dateianzahl.
+
+Layout:
+    <root>/objects/ab/<sha256>        Chunks
+    <root>/manifests/<name>.json.gz   Manifeste
+
+Usage:
+    python backup_store.py <root> list
+    python backup_store.py <root> verify <name>
+    python backup_store.py <root> gc
+"""
+
+__version__ = "1.0.0"
+__author__ = "BACH Team"
+
+import gzip
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+import time
+import zlib
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+if str(Path(__file__).parent.parent) not in sys.path:
+    sys.path.insert(0, str(Path(__file__).parent.parent))  # fuer core.db
+
+from core.db import json_value, sql_value  # noqa: E402
+
+CHUNK_SIZE = 1 << 20        # Datei-Chunks: 1 MiB
+ROWS_PER_CHUNK = 1000       # Tabellen-Chunks: rowid-Bereich dieser Groesse
+SNAPSHOT_PAGES = 256        # DB-Snapshot-Chunks: Seiten pro Chunk
+COMPRESS_LEVEL = 6
+MANIFEST_FORMAT = 1
+
+
+class BackupError(Exception):
+    """Fehlender oder beschaedigter Chunk, unbekanntes Backup."""
+
+
+# ═══════════════════════════════════════════════════════════════
+# CHUNK STORE
+# ═══════════════════════════════════════════════════════════════
+
+class ChunkStore:
+    """Inhalt-adressierte, zlib-komprimierte Chunks."""
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, digest: str) -> Path:
+        return self.root / digest[:2] / digest
+
+    def has(self, digest: str) -> bool:
+        return self._path(digest).exists()
+
+    def put(self, data: bytes) -> Tuple[str, int]:
+        """Speichert data, falls neu. Returns (sha256, neu geschriebene Bytes - 0 bei Dedup)."""
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._path(digest)
+        if path.exists():
+            return digest, 0
+        path.parent.mkdir(exist_ok=True)
+        packed = zlib.compress(data, COMPRESS_LEVEL)
+        tmp = path.with_name(f"{digest}.{os.getpid()}.tmp")
+        tmp.write_bytes(packed)
+        tmp.replace(path)
+        return digest, len(packed)
+
+    def get(self, digest: str) -> bytes:
+        """Liest und prueft einen Chunk."""
+        try:
+            data = zlib.decompress(self._path(digest).read_bytes())
+        except FileNotFoundError:
+            raise BackupError(f"Chunk fehlt: {digest}")
+        except zlib.error as e:
+            raise BackupError(f"Chunk beschaedigt: {digest} ({e})")
+        if hashlib.sha256(data).hexdigest() != digest:
+            raise BackupError(f"Pruefsumme falsch: {digest}")
+        return data
+
+    def digests(self) -> Iterator[str]:
+        for sub in self.root.iterdir():
+            if sub.is_dir() and len(sub.name) == 2:
+                for path in sub.iterdir():
+                    if not path.name.endswith(".tmp"):
+                        yield path.name
+
+    def remove(self, digest: str):
+        try:
+            self._path(digest).unlink()
+        except FileNotFoundError:
+            pass
+
+    def size_bytes(self) -> int:
+        return sum(p.stat().st_size for p in self.root.rglob("*") if p.is_file())
+
+
+# ═══════════════════════════════════════════════════════════════
+# STATISTIK
+# ═══════════════════════════════════════════════════════════════
+
+@dataclass
+class BackupStats:
+    files: int = 0
+    files_unchanged: int = 0
+    tables: int = 0
+    rows: int = 0
+    logical_bytes: int = 0     # Umfang der gesicherten Daten
+    stored_bytes: int = 0      # davon neu geschrieben (komprimiert)
+    chunks: int = 0
+    new_chunks: int = 0
+    seconds: float = 0.0
+
+    def add_chunk(self, size: int, written: int):
+        self.logical_bytes += size
+        self.stored_bytes += written
+        self.chunks += 1
+        if written:
+            self.new_chunks += 1
+
+    @property
+    def throughput_mb_s(self) -> float:
+        return self.logical_bytes / (1024 * 1024) / self.seconds if self.seconds else 0.0
+
+    @property
+    def dedup_ratio(self) -> float:
+        """Gesicherte Bytes pro neu geschriebenem Byte (Dedup + Kompression)."""
+        if not self.stored_bytes:
+            return float("inf") if self.logical_bytes else 1.0
+        return self.logical_bytes / self.stored_bytes
+
+    def as_dict(self) -> dict:
+        data = asdict(self)
+        data["seconds"] = round(self.seconds, 2)
+        data["throughput_mb_s"] = round(self.throughput_mb_s, 1)
+        ratio = self.dedup_ratio
+        data["dedup_ratio"] = round(ratio, 1) if ratio != float("inf") else None  # None = nichts neu
+        return data
+
+    def format(self) -> str:
+        ratio = self.dedup_ratio
+        dedup = f"Dedup x{ratio:.1f}" if ratio != float("inf") else "alles dedupliziert"
+        return (f"{self.files} Dateien ({self.files_unchanged} unveraendert), "
+                f"{self.tables} Tabellen/{self.rows} Zeilen, "
+                f"{self.logical_bytes / (1024 * 1024):.1f} MB in {self.seconds:.1f}s "
+                f"({self.throughput_mb_s:.1f} MB/s), neu gespeichert "
+                f"{self.stored_bytes / (1024 * 1024):.2f} MB "
+                f"({self.new_chunks}/{self.chunks} Chunks, {dedup})")
+
+
+def _quote(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+# ═══════════════════════════════════════════════════════════════
+# BACKUP STORE
+# ═══════════════════════════════════════════════════════════════
+
+class BackupStore:
+    """Manifeste + ChunkStore unter einem Wurzelordner."""
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+        self.objects = ChunkStore(self.root / "objects")
+        self.manifests_dir = self.root / "manifests"
+        self.manifests_dir.mkdir(parents=True, exist_ok=True)
+
+    # ---------- Manifeste ----------
+
+    def _manifest_path(self, name: str) -> Path:
+        return self.manifests_dir / f"{name}.json.gz"
+
+    def list_manifests(self) -> List[str]:
+        """Backup-Namen, aelteste zuerst."""
+        return sorted(p.name[:-len(".json.gz")] for p in self.manifests_dir.glob("*.json.gz"))
+
+    def has(self, name: str) -> bool:
+        return self._manifest_path(name).exists()
+
+    def load_manifest(self, name: str) -> dict:
+        try:
+            with gzip.open(str(self._manifest_path(name)), "rt", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            raise BackupError(f"Backup nicht gefunden: {name}")
+
+    def _write_manifest(self, manifest: dict):
+        path = self._manifest_path(manifest["name"])
+        tmp = path.with_name(path.name + ".tmp")
+        with gzip.open(str(tmp), "wt", encoding="utf-8") as f:
+            json.dump(manifest, f, ensure_ascii=False, separators=(",", ":"))
+        tmp.replace(path)
+
+    def delete(self, name: str):
+        """Entfernt ein Manifest (Chunks raeumt gc() auf)."""
+        try:
+            self._manifest_path(name).unlink()
+        except FileNotFoundError:
+            pass
+
+    # ---------- Create ----------
+
+    def create(self, name: str, base_dir: Path, dirs: Iterable[Path] = (),
+               db_path: Path = None, tables: Iterable[str] = (),
+               db_snapshot: bool = False, meta: dict = None) -> Tuple[dict, BackupStats]:
+        """
+        Erstellt ein Backup.
+
+        Args:
+            name: Backup-Name (Manifest-Dateiname)
+            base_dir: Bezugsordner fuer Dateipfade im Manifest
+            dirs: Zu sichernde Ordner (rekursiv)
+            db_path: SQLite-DB fuer tables/db_snapshot
+            tables: Zeilenweise zu sichernde Tabellen (fehlende werden uebersprungen)
+            db_snapshot: Zusaetzlich Seiten-Snapshot der ganzen DB
+            meta: Zusaetzliche Manifest-Felder
+
+        Returns:
+            (manifest, BackupStats)
+        """
+        start = time.perf_counter()
+        stats = BackupStats()
+        base_dir = Path(base_dir)
+        previous = self._latest_files()
+
+        files: Dict[str, dict] = {}
+        for directory in dirs:
+            directory = Path(directory)
+            if not directory.exists():
+                continue
+            for path in sorted(directory.rglob("*")):
+                if path.is_file():
+                    arcname = path.relative_to(base_dir).as_posix()
+                    files[arcname] = self._backup_file(path, previous.get(arcname), stats)
+
+        table_entries: Dict[str, dict] = {}
+        snapshot = None
+        if db_path is not None and Path(db_path).exists():
+            conn = sqlite3.connect(f"file:{Path(db_path).as_posix()}?mode=ro", uri=True)
+            try:
+                conn.execute("BEGIN")  # ein konsistenter Lese-Stand fuer alle Tabellen
+                for table in tables:
+                    entry = self._backup_table(conn, table, stats)
+                    if entry is not None:
+                        table_entries[table] = entry
+                conn.rollback()
+            finally:
+                conn.close()
+            if db_snapshot:
+                snapshot = self._backup_db_snapshot(Path(db_path), stats)
+
+        stats.seconds = time.perf_counter() - start
+        manifest = dict(meta or {})
+        manifest.update({
+            "format": MANIFEST_FORMAT,
+            "name": name,
+            "created_at": datetime.now().isoformat(),
+            "files": files,
+            "tables": table_entries,
+            "db_snapshot": snapshot,
+            "stats": stats.as_dict(),
+        })
+        self._write_manifest(manifest)
+        return manifest, stats
+
+    def _latest_files(self) -> Dict[str, dict]:
+        """Datei-Eintraege des juengsten Manifests (Basis fuer unveraenderte Dateien)."""
+        for name in reversed(self.list_manifests()):
+            try:
+                return self.load_manifest(name).get("files", {})
+            except (BackupError, OSError, ValueError):
+                continue
+        return {}
+
+    def _backup_file(self, path: Path, previous: Optional[dict], stats: BackupStats) -> dict:
+        st = path.stat()
+        stats.files += 1
+        if (previous and previous["size"] == st.st_size and previous["mtime_ns"] == st.st_mtime_ns
+                and all(self.objects.has(d) for d in previous["chunks"])):
+            stats.files_unchanged += 1
+            stats.logical_bytes += st.st_size
+            stats.chunks += len(previous["chunks"])
+            return previous
+
+        sha = hashlib.sha256()
+        chunks = []
+        size = 0
+        with open(path, "rb") as f:
+            while True:
+                data = f.read(CHUNK_SIZE)
+                if not data:
+                    break
+                sha.update(data)
+                size += len(data)
+                digest, written = self.objects.put(data)
+                stats.add_chunk(len(data), written)
+                chunks.append(digest)
+        return {"size": size, "mtime_ns": st.st_mtime_ns, "sha256": sha.hexdigest(), "chunks": chunks}
+
+    def _backup_table(self, conn: sqlite3.Connection, table: str, stats: BackupStats) -> Optional[dict]:
+        try:
+            cur = conn.execute(f"SELECT rowid, * FROM {_quote(table)} ORDER BY rowid")
+            keyed = True
+        except sqlite3.OperationalError:
+            try:
+                cur = conn.execute(f"SELECT * FROM {_quote(table)}")  # WITHOUT ROWID
+                keyed = False
+            except sqlite3.OperationalError:
+                return None  # Tabelle existiert nicht
+
+        columns = [d[0] for d in cur.description][1 if keyed else 0:]
+        chunks: List[dict] = []
+        lines: List[str] = []
+        bucket = None
+        total = 0
+
+        def flush():
+            data = ("\n".join(lines) + "\n").encode("utf-8")
+            digest, written = self.objects.put(data)
+            stats.add_chunk(len(data), written)
+            chunks.append({"digest": digest, "rows": len(lines)})
+            lines.clear()
+
+        for row in cur:
+            key = row[0] // ROWS_PER_CHUNK if keyed else total // ROWS_PER_CHUNK
+            if key != bucket and lines:
+                flush()
+            bucket = key
+            values = row[1:] if keyed else row
+            lines.append(json.dumps([json_value(v) for v in values], ensure_ascii=False,
+                                    separators=(",", ":")))
+            total += 1
+        if lines:
+            flush()
+
+        stats.tables += 1
+        stats.rows += total
+        return {"columns": columns, "rows": total, "chunks": chunks}
+
+    def _backup_db_snapshot(self, db_path: Path, stats: BackupStats) -> dict:
+        tmp = self.root / f"snapshot.{os.getpid()}.tmp"
+        try:
+            src = sqlite3.connect(str(db_path))
+            dst = sqlite3.connect(str(tmp))
+            try:
+                src.backup(dst)
+                page_size = dst.execute("PRAGMA page_size").fetchone()[0]
+            finally:
+                dst.close()
+                src.close()
+
+            sha = hashlib.sha256()
+            chunks = []
+            size = 0
+            with open(tmp, "rb") as f:
+                while True:
+                    data = f.read(page_size * SNAPSHOT_PAGES)
+                    if not data:
+                        break
+                    sha.update(data)
+                    size += len(data)
+                    digest, written = self.objects.put(data)
+                    stats.add_chunk(len(data), written)
+                    chunks.append(digest)
+            return {"file": db_path.name, "size": size, "page_size": page_size,
+                    "sha256": sha.hexdigest(), "chunks": chunks}
+        finally:
+            try:
+                tmp.unlink()
+            except FileNotFoundError:
+                pass
+
+    # ---------- Verify / Restore ----------
+
+    def _stream(self, digests: Iterable[str]) -> Iterator[bytes]:
+        for digest in digests:
+            yield self.objects.get(digest)
+
+    def _check_stream(self, entry: dict, label: str, out=None) -> Optional[str]:
+        """Liest alle Chunks eines Eintrags, prueft Groesse + SHA-256; schreibt optional nach out."""
+        sha = hashlib.sha256()
+        size = 0
+        try:
+            for data in self._stream(entry["chunks"]):
+                sha.update(data)
+                size += len(data)
+                if out is not None:
+                    out.write(data)
+        except BackupError as e:
+            return f"{label}: {e}"
+        if size != entry["size"] or sha.hexdigest() != entry["sha256"]:
+            return f"{label}: Inhalt stimmt nicht mit Manifest ueberein"
+        return None
+
+    def verify(self, name: str) -> Tuple[bool, List[str]]:
+        """Prueft alle Chunks eines Backups gegen Manifest. Returns (ok, Probleme)."""
+        manifest = self.load_manifest(name)
+        problems = []
+        for arcname, entry in manifest.get("files", {}).items():
+            problem = self._check_stream(entry, arcname)
+            if problem:
+                problems.append(problem)
+        for table, entry in manifest.get("tables", {}).items():
+            try:
+                rows = sum(data.count(b"\n") for data in self._stream(c["digest"] for c in entry["chunks"]))
+            except BackupError as e:
+                problems.append(f"Tabelle {table}: {e}")
+                continue
+            if rows != entry["rows"]:
+                problems.append(f"Tabelle {table}: {rows} statt {entry['rows']} Zeilen")
+        if manifest.get("db_snapshot"):
+            problem = self._check_stream(manifest["db_snapshot"], "DB-Snapshot")
+            if problem:
+                problems.append(problem)
+        return not problems, problems
+
+    def _restore_file(self, entry: dict, target: Path, label: str):
+        target.parent.mkdir(parents=True, exist_ok=True)
+        tmp = target.with_name(target.name + ".restore.tmp")
+        with open(tmp, "wb") as out:
+            problem = self._check_stream(entry, label, out)
+        if problem:
+            tmp.unlink()
+            raise BackupError(problem)
+        tmp.replace(target)
+
+    def restore(self, name: str, base_dir: Path, db_path: Path = None,
+                files: bool = True, tables: Optional[Iterable[str]] = None,
+                snapshot_target: Path = None) -> Dict[str, int]:
+        """
+        Stellt ein Backup wieder her. Jede Datei wird erst nach erfolgreicher
+        Pruefsummen-Kontrolle an ihren Platz verschoben, Tabellen werden je in
+        einer Transaktion ersetzt und die Zeilenzahl kontrolliert.
+
+        Tabellen ohne gesicherte Zeilen werden uebersprungen - ein leer
+        gesicherter Stand loescht keine aktuellen Daten.
+
+        Args:
+            base_dir: Zielordner fuer die Dateien (Pfade relativ wie im Manifest)
+            db_path: Ziel-DB fuer Tabellen
+            tables: Nur diese Tabellen ersetzen (None = alle im Manifest, () = keine)
+            snapshot_target: Zieldatei fuer den DB-Snapshot (None = nicht wiederherstellen)
+
+        Returns:
+            {"files": n, "tables": n, "rows": n, "snapshot": 0/1}
+        """
+        manifest = self.load_manifest(name)
+        result = {"files": 0, "tables": 0, "rows": 0, "snapshot": 0}
+
+        if files:
+            for arcname, entry in manifest.get("files", {}).items():
+                target = (Path(base_dir) / arcname).resolve()
+                if Path(base_dir).resolve() not in target.parents:
+                    raise BackupError(f"Ungueltiger Pfad im Manifest: {arcname}")
+                self._restore_file(entry, target, arcname)
+                result["files"] += 1
+
+        wanted = None if tables is None else set(tables)
+        if wanted != set() and db_path is not None and manifest.get("tables"):
+            conn = sqlite3.connect(str(db_path))
+            try:
+                for table, entry in manifest["tables"].items():
+                    if (wanted is not None and table not in wanted) or not entry["rows"]:
+                        continue
+                    restored = self._restore_table(conn, table, entry)
+                    if restored is not None:
+                        result["tables"] += 1
+                        result["rows"] += restored
+            finally:
+                conn.close()
+
+        if snapshot_target is not None and manifest.get("db_snapshot"):
+            self._restore_file(manifest["db_snapshot"], Path(snapshot_target), "DB-Snapshot")
+            result["snapshot"] = 1
+
+        return result
+
+    def _restore_table(self, conn: sqlite3.Connection, table: str, entry: dict) -> Optional[int]:
+        local = {row[1] for row in conn.execute(f"PRAGMA table_info({_quote(table)})")}
+        if not local:
+            return None  # Tabelle gibt es (noch) nicht
+        keep = [i for i, c in enumerate(entry["columns"]) if c in local]
+        cols = [entry["columns"][i] for i in keep]
+        insert_sql = (f"INSERT OR REPLACE INTO {_quote(table)} ({', '.join(_quote(c) for c in cols)}) "
+                      f"VALUES ({', '.join('?' for _ in cols)})")
+        restored = 0
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute(f"DELETE FROM {_quote(table)}")
+            for chunk in entry["chunks"]:
+                rows = [json.loads(line) for line in self.objects.get(chunk["digest"]).decode("utf-8").splitlines()]
+                conn.executemany(insert_sql, [tuple(sql_value(r[i]) for i in keep) for r in rows])
+                restored += len(rows)
+            if restored != entry["rows"]:
+                raise BackupError(f"Tabelle {table}: {restored} statt {entry['rows']} Zeilen")
+        except BaseException:
+            conn.rollback()
+            raise
+        conn.commit()
+        return restored
+
+    # ---------- Pflege ----------
+
+    def _referenced(self) -> set:
+        referenced = set()
+        for name in self.list_manifests():
+            manifest = self.load_manifest(name)
+            for entry in manifest.get("files", {}).values():
+                referenced.update(entry["chunks"])
+            for entry in manifest.get("tables", {}).values():
+                referenced.update(c["digest"] for c in entry["chunks"])
+            if manifest.get("db_snapshot"):
+                referenced.update(manifest["db_snapshot"]["chunks"])
+        return referenced
+
+    def gc(self) -> int:
+        """Loescht Chunks, die kein Manifest mehr referenziert. Returns Anzahl."""
+        referenced = self._referenced()
+        removed = 0
+        for digest in list(self.objects.digests()):
+            if digest not in referenced:
+                self.objects.remove(digest)
+                removed += 1
+        return removed
+
+    def rotate(self, keep: int) -> List[str]:
+        """Behaelt die neuesten keep Backups, raeumt danach Chunks auf."""
+        names = self.list_manifests()
+        dropped = names[:-keep] if keep > 0 else names
+        for name in dropped:
+            self.delete(name)
+        if dropped:
+            self.gc()
+        return dropped
+
+    def copy_to(self, other_root: Path, name: str) -> int:
+        """Kopiert ein Backup inkrementell in einen anderen Store (z.B. NAS). Returns neue Chunks."""
+        other = BackupStore(other_root)
+        manifest = self.load_manifest(name)
+        copied = 0
+        digests = set()
+        for entry in manifest.get("files", {}).values():
+            digests.update(entry["chunks"])
+        for entry in manifest.get("tables", {}).values():
+            digests.update(c["digest"] for c in entry["chunks"])
+        if manifest.get("db_snapshot"):
+            digests.update(manifest["db_snapshot"]["chunks"])
+        for digest in digests:
+            if not other.objects.has(digest):
+                target = other.objects._path(digest)
+                target.parent.mkdir(exist_ok=True)
+                tmp = target.with_name(target.name + ".tmp")
+                tmp.write_bytes(self.objects._path(digest).read_bytes())
+                tmp.replace(target)
+                copied += 1
+        other._write_manifest(manifest)
+        return copied
+
+
+# ═══════════════════════════════════════════════════════════════
+# CLI
+# ═══════════════════════════════════════════════════════════════
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description="BACH Backup-Store")
+    parser.add_argument("root", help="Store-Ordner")
+    parser.add_argument("command", choices=["list", "verify", "gc"])
+    parser.add_argument("name", nargs="?")
+    args = parser.parse_args()
+
+    store = BackupStore(Path(args.root))
+    if args.command == "list":
+        for name in store.list_manifests():
+            stats = store.load_manifest(name).get("stats", {})
+            print(f"  {name:<35} {stats.get('logical_bytes', 0) / (1024 * 1024):>9.1f} MB  "
+                  f"neu {stats.get('stored_bytes', 0) / (1024 * 1024):>8.2f} MB  "
+                  f"Dedup x{stats.get('dedup_ratio') or '-'}")
+        return 0
+    if args.command == "verify":
+        ok, problems = store.verify(args.name or store.list_manifests()[-1])
+        for problem in problems:
+            print(f"  [ERR] {problem}")
+        print("[OK] Backup vollstaendig" if ok else f"[ERR] {len(problems)} Probleme")
+        return 0 if ok else 1
+    print(f"{store.gc()} Chunks entfernt")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,668 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# SPDX-License-Identifier: MIT
+"""
+Tool: catalog_index
+Version: 1.0.0
+Author: BACH Team
+Created: 2026-10-17
+Anthropic-Compatible: True
+
+Description:
+    Gemeinsamer Katalog fuer Skills (skills/**/*.txt|md) und Tools
+    (tools/**/*.py). Ersetzt rglob-und-lesen bei jeder Suche.
+
+    - catalog_entries: eine Zeile pro Datei mit Header-Metadaten
+      (Beschreibung, Version, Usage), mtime_ns und Groesse
+    - catalog_fts (FTS5): Name, Header und Inhalt, Ranking per bm25,
+      Snippets fuer die Trefferanzeige
+    - Pflege beim Zugriff: Verzeichnis wird nur per stat() abgeglichen,
+      gelesen werden nur neue/geaenderte Dateien
+    - Namensaufloesung ueber ein In-Memory-Dict (name -> Eintraege)
+
+    Genutzt von SkillsHandler (search/show), ToolsHandler (search/show/run)
+    und tool_auto_discovery.
+
+Usage:
+    python catalog_index.py --refresh
+    python catalog_index.py --search <begriff> [--kind skill|tool]
+    python catalog_index.py --bench [--skills 900] [--tools 370]
+"""
+
+__version__ = "1.0.0"
+__author__ = "BACH Team"
+
+import os
+import re
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+try:
+    import yaml
+except ImportError:
+    yaml = None  # Frontmatter dann per Regex
+
+BACH_ROOT = Path(__file__).parent.parent
+
+# kind -> (Verzeichnis relativ zu system/, Endungen)
+KINDS = {
+    "skill": ("skills", (".txt", ".md")),
+    "tool": ("tools", (".py",)),
+}
+
+# Abstand zwischen zwei Verzeichnis-Abgleichen pro Prozess
+REFRESH_INTERVAL_SEC = 2.0
+# Indexierter Inhalt pro Datei (Zeichen)
+MAX_BODY_CHARS = 200_000
+# Gewichte fuer bm25(catalog_fts): name, meta, body
+BM25_WEIGHTS = (10.0, 4.0, 1.0)
+
+ENTRY_COLUMNS = ("e.kind, e.name, e.rel_path, e.category, e.description, e.version, e.usage, "
+                 "e.mtime_ns, e.size")
+
+SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS catalog_entries (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    kind TEXT NOT NULL,              -- 'skill' | 'tool'
+    name TEXT NOT NULL,              -- Dateiname ohne Endung
+    rel_path TEXT NOT NULL,          -- relativ zum Kind-Verzeichnis, '/' getrennt
+    category TEXT,                   -- erster Unterordner (ohne '_')
+    description TEXT,
+    version TEXT,
+    usage TEXT,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    indexed_at TEXT DEFAULT CURRENT_TIMESTAMP,
+    UNIQUE(kind, rel_path)
+);
+CREATE INDEX IF NOT EXISTS idx_catalog_entries_name ON catalog_entries(kind, name);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS catalog_fts USING fts5(
+    name,
+    meta,
+    body,
+    tokenize='unicode61'
+);
+"""
+
+
+@dataclass(frozen=True)
+class CatalogEntry:
+    """Ein Skill oder Tool im Katalog."""
+    kind: str
+    name: str
+    rel_path: str
+    category: str
+    description: str
+    version: str
+    usage: str
+    mtime_ns: int
+    size: int
+
+    @property
+    def top_level(self) -> bool:
+        """Liegt direkt im Kind-Verzeichnis (kein Unterordner)."""
+        return "/" not in self.rel_path
+
+
+# ═══════════════════════════════════════════════════════════════
+# HEADER-PARSING
+# ═══════════════════════════════════════════════════════════════
+
+_DOCSTRING_RE = re.compile(r'"""(.*?)"""|\'\'\'(.*?)\'\'\'', re.DOTALL)
+_FIELD_RE = re.compile(r'^\s*(Version|Description|Usage)\s*:\s*(.*)$', re.IGNORECASE | re.MULTILINE)
+_FM_RE = re.compile(r'\A---\s*\n(.*?)\n---\s*(?:\n|\Z)', re.DOTALL)
+
+
+def _parse_tool(text: str) -> Tuple[str, str, str, str]:
+    """(meta, description, version, usage) aus dem Modul-Docstring."""
+    match = _DOCSTRING_RE.search(text)
+    if not match:
+        return "", "", "", ""
+    doc = (match.group(1) if match.group(1) is not None else match.group(2)).strip()
+    fields = {}
+    for key, value in _FIELD_RE.findall(doc):
+        fields.setdefault(key.lower(), value.strip())
+
+    description = ""
+    desc_match = re.search(r'^\s*Description:\s*\n(.*?)(?:\n\s*\n|\Z)', doc, re.MULTILINE | re.DOTALL)
+    if desc_match:
+        description = " ".join(desc_match.group(1).split())
+    if not description:
+        description = fields.get("description") or " ".join(doc.split("\n\n")[0].split())
+    return doc[:4000], description[:200], fields.get("version", "")[:40], fields.get("usage", "")[:200]
+
+
+def _parse_skill(text: str) -> Tuple[str, str, str, str]:
+    """(meta, description, version, usage) aus YAML-Frontmatter oder Kopfzeilen."""
+    match = _FM_RE.match(text)
+    if match:
+        header = match.group(1)
+        data = None
+        if yaml is not None:
+            try:
+                data = yaml.safe_load(header)
+            except Exception:
+                data = None
+        if isinstance(data, dict):
+            meta = data.get("metadata") if isinstance(data.get("metadata"), dict) else {}
+            description = " ".join(str(data.get("description") or "").split())
+            version = str(data.get("version") or meta.get("version") or "")
+        else:
+            desc = re.search(r'^description:\s*(.*)$', header, re.MULTILINE)
+            ver = re.search(r'^\s*version:\s*(\S+)', header, re.MULTILINE)
+            description = desc.group(1).strip(" >|\"'") if desc else ""
+            version = ver.group(1).strip("\"'") if ver else ""
+        return header[:4000], description[:200], version[:40], ""
+
+    head = text[:2000].splitlines()[:15]
+    version = ""
+    description = ""
+    for line in head:
+        stripped = line.strip()
+        ver = re.match(r'^#\s*Version:\s*(\S+)', stripped)
+        if ver:
+            version = version or ver.group(1)
+        elif not description and stripped and not re.match(r'^#\s*[\w ]+:\s', stripped):
+            description = stripped.lstrip("#").strip()
+    return "\n".join(head), description[:200], version[:40], ""
+
+
+# ═══════════════════════════════════════════════════════════════
+# KATALOG
+# ═══════════════════════════════════════════════════════════════
+
+def _fts_query(term: str) -> str:
+    """Freitext -> FTS5-Ausdruck (alle Woerter, Praefix-Suche)."""
+    words = re.findall(r'\w+', term, re.UNICODE)
+    return " ".join(f'"{w}"*' for w in words)
+
+
+def _like_pattern(term: str) -> str:
+    """Teilstring-Muster fuer LIKE ... ESCAPE '\\' (Platzhalter maskiert)."""
+    return "%" + re.sub(r'([\\%_])', r'\\\1', term) + "%"
+
+
+def _substring_snippet(text: str, term: str, width: int = 60) -> str:
+    """Ausschnitt um den ersten Treffer, markiert wie snippet() in FTS5."""
+    pos = text.lower().find(term.lower())
+    if pos < 0:
+        return ""
+    start, end = max(0, pos - width), pos + len(term)
+    return ("..." if start else "") + text[start:pos] + ">>>" + text[pos:end] + "<<<" \
+        + text[end:end + width] + ("..." if end + width < len(text) else "")
+
+
+class CatalogIndex:
+    """FTS5-Katalog ueber skills/ und tools/ einer BACH-Installation."""
+
+    def __init__(self, base_path: Path = BACH_ROOT, db_path: Optional[Path] = None):
+        self.base_path = Path(base_path)
+        self.db_path = Path(db_path) if db_path else self.base_path / "data" / "bach.db"
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.RLock()
+        self._refreshed_at: Dict[str, float] = {}
+        self._by_name: Dict[str, Dict[str, List[CatalogEntry]]] = {}
+        self._entries: Dict[str, List[CatalogEntry]] = {}
+        # Stand der geladenen Eintraege {rel_path: (mtime_ns, size)} - Vergleich mit der DB
+        self._loaded: Dict[str, Dict[str, Tuple[int, int]]] = {}
+        self.last_refresh: Dict[str, Dict[str, int]] = {}
+
+    # --- Verbindung -------------------------------------------------------
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            # Ohne bach.db (z.B. frisches Verzeichnis): Katalog nur im Speicher
+            target = str(self.db_path) if self.db_path.exists() else ":memory:"
+            conn = sqlite3.connect(target, timeout=30.0, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            conn.executescript(SCHEMA_SQL)
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    # --- Pflege -----------------------------------------------------------
+
+    def kind_dir(self, kind: str) -> Path:
+        return self.base_path / KINDS[kind][0]
+
+    def path(self, entry: CatalogEntry) -> Path:
+        """Absoluter Pfad eines Eintrags."""
+        return self.kind_dir(entry.kind) / entry.rel_path
+
+    def _walk(self, kind: str) -> Iterator[Tuple[str, int, int]]:
+        """(rel_path, mtime_ns, size) aller Dateien eines Kinds - nur stat()."""
+        root = self.kind_dir(kind)
+        suffixes = KINDS[kind][1]
+        stack = [(root, "")]
+        while stack:
+            directory, prefix = stack.pop()
+            try:
+                it = os.scandir(directory)
+            except OSError:
+                continue
+            with it:
+                for de in it:
+                    if de.name.startswith(("__", ".")):
+                        continue
+                    try:
+                        if de.is_dir(follow_symlinks=False):
+                            stack.append((de.path, f"{prefix}{de.name}/"))
+                        elif de.name.endswith(suffixes):
+                            st = de.stat()
+                            yield f"{prefix}{de.name}", st.st_mtime_ns, st.st_size
+                    except OSError:
+                        continue
+
+    def _read_entry(self, kind: str, rel_path: str, mtime_ns: int, size: int):
+        path = self.kind_dir(kind) / rel_path
+        try:
+            text = path.read_text(encoding="utf-8", errors="ignore")
+        except OSError:
+            return None
+        parse = _parse_tool if kind == "tool" else _parse_skill
+        meta, description, version, usage = parse(text)
+        name = rel_path.rsplit("/", 1)[-1].rsplit(".", 1)[0]
+        category = rel_path.split("/", 1)[0].lstrip("_") if "/" in rel_path else ""
+        entry = CatalogEntry(kind, name, rel_path, category, description, version, usage,
+                             mtime_ns, size)
+        return entry, meta, text[:MAX_BODY_CHARS]
+
+    def refresh(self, kind: Optional[str] = None, force: bool = False) -> Dict[str, int]:
+        """Gleicht den Katalog per mtime/Groesse mit dem Dateisystem ab.
+
+        Args:
+            kind: 'skill', 'tool' oder None (beide)
+            force: Intervall ignorieren
+
+        Returns:
+            dict mit added/updated/removed (summiert)
+        """
+        totals = {"added": 0, "updated": 0, "removed": 0}
+        for k in ([kind] if kind else list(KINDS)):
+            now = time.monotonic()
+            if not force and now - self._refreshed_at.get(k, -REFRESH_INTERVAL_SEC) < REFRESH_INTERVAL_SEC:
+                continue
+            with self._lock:
+                stats = self._refresh_kind(k)
+                self._refreshed_at[k] = time.monotonic()
+            self.last_refresh[k] = stats
+            for key in totals:
+                totals[key] += stats[key]
+        return totals
+
+    def _refresh_kind(self, kind: str) -> Dict[str, int]:
+        conn = self._db()
+        known = {row["rel_path"]: (row["id"], row["mtime_ns"], row["size"])
+                 for row in conn.execute(
+                     "SELECT id, rel_path, mtime_ns, size FROM catalog_entries WHERE kind = ?", (kind,))}
+        seen = set()
+        changed = []
+        for rel_path, mtime_ns, size in self._walk(kind):
+            seen.add(rel_path)
+            old = known.get(rel_path)
+            if old is None or old[1] != mtime_ns or old[2] != size:
+                changed.append((rel_path, mtime_ns, size, old[0] if old else None))
+        removed = [known[p][0] for p in known.keys() - seen]
+
+        stats = {"added": 0, "updated": 0, "removed": len(removed)}
+        if changed or removed:
+            with conn:
+                for row_id in removed:
+                    conn.execute("DELETE FROM catalog_entries WHERE id = ?", (row_id,))
+                    conn.execute("DELETE FROM catalog_fts WHERE rowid = ?", (row_id,))
+                for rel_path, mtime_ns, size, row_id in changed:
+                    parsed = self._read_entry(kind, rel_path, mtime_ns, size)
+                    if parsed is None:
+                        continue
+                    entry, meta, body = parsed
+                    if row_id is not None:
+                        conn.execute("DELETE FROM catalog_fts WHERE rowid = ?", (row_id,))
+                    cur = conn.execute("""
+                        INSERT OR REPLACE INTO catalog_entries
+                            (id, kind, name, rel_path, category, description, version, usage,
+                             mtime_ns, size, indexed_at)
+                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+                    """, (row_id, kind, entry.name, rel_path, entry.category, entry.description,
+                          entry.version, entry.usage, mtime_ns, size))
+                    conn.execute("INSERT INTO catalog_fts (rowid, name, meta, body) VALUES (?, ?, ?, ?)",
+                                 (cur.lastrowid, entry.name.replace("_", " ") + " " + entry.name,
+                                  meta, body))
+                    stats["updated" if row_id is not None else "added"] += 1
+
+        # Auch ohne eigene Aenderungen neu laden, wenn ein anderer Prozess die
+        # Zeilen schon aktualisiert hat (dann passt der stat-Abgleich zur DB)
+        db_state = {p: (m, s) for p, (_, m, s) in known.items()}
+        if changed or removed or self._loaded.get(kind) != db_state:
+            self._load_names(kind)
+        return stats
+
+    @staticmethod
+    def _row_entry(r) -> CatalogEntry:
+        return CatalogEntry(r["kind"], r["name"], r["rel_path"], r["category"] or "",
+                            r["description"] or "", r["version"] or "", r["usage"] or "",
+                            r["mtime_ns"], r["size"])
+
+    def _load_names(self, kind: str):
+        rows = self._db().execute(f"""
+            SELECT {ENTRY_COLUMNS}
+            FROM catalog_entries e WHERE kind = ? ORDER BY rel_path
+        """, (kind,)).fetchall()
+        entries = [self._row_entry(r) for r in rows]
+        by_name: Dict[str, List[CatalogEntry]] = {}
+        for entry in entries:
+            by_name.setdefault(entry.name.lower(), []).append(entry)
+        self._entries[kind] = entries
+        self._by_name[kind] = by_name
+        self._loaded[kind] = {e.rel_path: (e.mtime_ns, e.size) for e in entries}
+
+    def invalidate(self, kind: Optional[str] = None):
+        """Erzwingt beim naechsten Zugriff einen Abgleich (z.B. nach skills create)."""
+        for k in ([kind] if kind else list(KINDS)):
+            self._refreshed_at.pop(k, None)
+
+    # --- Abfragen ---------------------------------------------------------
+
+    def entries(self, kind: str) -> List[CatalogEntry]:
+        """Alle Eintraege eines Kinds (nach Pfad sortiert)."""
+        self.refresh(kind)
+        return list(self._entries.get(kind, []))
+
+    def resolve(self, kind: str, name: str, top_level: bool = False,
+                substring: bool = True) -> Optional[CatalogEntry]:
+        """Eintrag zu einem Namen.
+
+        Exakter Name per dict-Lookup; sonst (substring=True) der erste
+        Eintrag, dessen Name `name` enthaelt (wie die bisherige Suche).
+        """
+        self.refresh(kind)
+        key = name.lower()
+        for entry in self._by_name.get(kind, {}).get(key, ()):
+            if not top_level or entry.top_level:
+                return entry
+        if substring:
+            for entry in self._entries.get(kind, ()):
+                if key in entry.name.lower() and (not top_level or entry.top_level):
+                    return entry
+        return None
+
+    def search(self, term: str, kind: Optional[str] = None, limit: int = 20) -> List[dict]:
+        """Namens- und Volltextsuche.
+
+        Namens-Treffer (Teilstring) zuerst, danach FTS5-Treffer nach bm25
+        mit Snippet aus dem Inhalt. Findet FTS5 nichts, werden Name, Kopf
+        und Inhalt im Index nach dem Teilstring durchsucht (ohne Rang).
+
+        Returns:
+            Liste von dicts: entry, match ('Name'|'Inhalt'), snippet, rank
+        """
+        kinds = [kind] if kind else list(KINDS)
+        self.refresh(kind)
+        term_lower = term.lower().strip()
+        results = []
+        seen = set()
+        for k in kinds:
+            for entry in self._entries.get(k, ()):
+                if term_lower and term_lower in entry.name.lower():
+                    results.append({"entry": entry, "match": "Name",
+                                    "snippet": entry.description, "rank": None})
+                    seen.add((entry.kind, entry.rel_path))
+
+        query = _fts_query(term)
+        if not query or len(results) >= limit:
+            return results[:limit]
+
+        kind_sql = "AND e.kind = ?" if kind else ""
+        params = [query] + ([kind] if kind else []) + [limit + len(seen)]
+        w_name, w_meta, w_body = BM25_WEIGHTS
+        try:
+            with self._lock:
+                rows = self._db().execute(f"""
+                    SELECT {ENTRY_COLUMNS},
+                           snippet(catalog_fts, 2, '>>>', '<<<', '...', 12) AS snippet,
+                           bm25(catalog_fts, {w_name}, {w_meta}, {w_body}) AS rank
+                    FROM catalog_fts JOIN catalog_entries e ON e.id = catalog_fts.rowid
+                    WHERE catalog_fts MATCH ? {kind_sql}
+                    ORDER BY rank
+                    LIMIT ?
+                """, params).fetchall()
+        except sqlite3.OperationalError:
+            rows = []  # FTS5 fehlt oder Ausdruck ungueltig: nur Namens-Treffer
+        if not rows:
+            # Praefix-Suche findet keine Wortteile (rechnung -> Eingangsrechnung)
+            rows = self._substring_rows(kinds, term.strip(), limit + len(seen))
+
+        by_path = {(e.kind, e.rel_path): e for k in kinds for e in self._entries.get(k, ())}
+        for row in rows:
+            key = (row["kind"], row["rel_path"])
+            if key in seen:
+                continue
+            seen.add(key)
+            # Fehlt im geladenen Stand (parallel von anderem Prozess indexiert): aus der Zeile
+            entry = by_path.get(key) or self._row_entry(row)
+            results.append({"entry": entry, "match": "Inhalt",
+                            "snippet": " ".join((row["snippet"] or "").split()), "rank": row["rank"]})
+        return results[:limit]
+
+    def count(self, term: str, kind: Optional[str] = None) -> int:
+        """Anzahl aller Treffer von search() ohne Limit (ohne Snippets)."""
+        kinds = [kind] if kind else list(KINDS)
+        self.refresh(kind)
+        term_lower = term.lower().strip()
+        found = {(e.kind, e.rel_path) for k in kinds for e in self._entries.get(k, ())
+                 if term_lower and term_lower in e.name.lower()}
+        query = _fts_query(term)
+        if query:
+            placeholders = ",".join("?" * len(kinds))
+            try:
+                with self._lock:
+                    rows = self._db().execute(f"""
+                        SELECT kind, rel_path FROM catalog_entries
+                        WHERE kind IN ({placeholders})
+                          AND id IN (SELECT rowid FROM catalog_fts WHERE catalog_fts MATCH ?)
+                    """, kinds + [query]).fetchall()
+            except sqlite3.OperationalError:
+                rows = []
+            if not rows:
+                rows = self._substring_rows(kinds, term.strip())
+            found.update((r["kind"], r["rel_path"]) for r in rows)
+        return len(found)
+
+    def _substring_rows(self, kinds: List[str], term: str,
+                        limit: Optional[int] = None) -> List[dict]:
+        """Teilstring-Scan ueber den indexierten Text (liest keine Dateien).
+
+        Returns:
+            Zeilen wie in search(): Eintrags-Spalten, snippet, rank (None)
+        """
+        if not term:
+            return []
+        placeholders = ",".join("?" * len(kinds))
+        pattern = _like_pattern(term)
+        try:
+            with self._lock:
+                rows = self._db().execute(f"""
+                    SELECT {ENTRY_COLUMNS}, f.meta AS meta, f.body AS body
+                    FROM catalog_fts f JOIN catalog_entries e ON e.id = f.rowid
+                    WHERE e.kind IN ({placeholders})
+                      AND (f.name LIKE ? ESCAPE '\\' OR f.meta LIKE ? ESCAPE '\\'
+                           OR f.body LIKE ? ESCAPE '\\')
+                    ORDER BY e.kind, e.rel_path
+                    LIMIT ?
+                """, kinds + [pattern] * 3 + [-1 if limit is None else limit]).fetchall()
+        except sqlite3.OperationalError:
+            return []
+        return [dict(r, rank=None,
+                     snippet=_substring_snippet(r["body"] or "", term)
+                     or _substring_snippet(r["meta"] or "", term))
+                for r in rows]
+
+    def status(self) -> Dict[str, int]:
+        """Anzahl Eintraege pro Kind."""
+        self.refresh()
+        return {k: len(self._entries.get(k, ())) for k in KINDS}
+
+
+_catalogs: Dict[str, CatalogIndex] = {}
+_catalogs_lock = threading.Lock()
+
+
+def get_catalog(base_path: Path = BACH_ROOT) -> CatalogIndex:
+    """Prozessweit geteilter Katalog pro BACH-Installation."""
+    key = str(Path(base_path).resolve())
+    catalog = _catalogs.get(key)
+    if catalog is None:
+        with _catalogs_lock:
+            catalog = _catalogs.get(key)
+            if catalog is None:
+                catalog = _catalogs[key] = CatalogIndex(Path(base_path))
+    return catalog
+
+
+# ═══════════════════════════════════════════════════════════════
+# BENCHMARK
+# ═══════════════════════════════════════════════════════════════
+
+def _legacy_search(root: Path, suffixes: tuple, term: str) -> int:
+    """Bisherige Suche: rglob und jede Datei lesen."""
+    term_lower = term.lower()
+    found = 0
+    for f in root.rglob("*"):
+        if f.is_file() and f.suffix in suffixes:
+            if term_lower in f.stem.lower():
+                found += 1
+                continue
+            if term_lower in f.read_text(encoding="utf-8", errors="ignore").lower():
+                found += 1
+    return found
+
+
+def _bench_tree(base: Path, n_skills: int, n_tools: int, seed: int):
+    import random
+    rng = random.Random(seed)
+    vocab = ["steuer", "backup", "ocr", "mail", "kalender", "rechnung", "wiki", "agent",
+             "speicher", "export", "import", "analyse", "bericht", "netzwerk", "datei"]
+    filler = " ".join(f"wort{i}" for i in range(400))
+    for i in range(n_skills):
+        d = base / "skills" / rng.choice(["_services", "workflows", "_experts", "docs"])
+        d.mkdir(parents=True, exist_ok=True)
+        topic = rng.choice(vocab)
+        (d / f"skill_{i:04d}_{topic}.md").write_text(
+            f"---\nname: skill_{i}\ndescription: Skill fuer {topic}\nversion: 1.0.{i}\n---\n"
+            f"# Skill {i}\n{filler}\n{rng.choice(vocab)} {rng.choice(vocab)}\n", encoding="utf-8")
+    for i in range(n_tools):
+        d = base / "tools" / ("" if i % 3 else rng.choice(["rag", "agents", "schwarm"]))
+        d.mkdir(parents=True, exist_ok=True)
+        topic = rng.choice(vocab)
+        (d / f"tool_{i:04d}_{topic}.py").write_text(
+            f'"""\nTool: tool_{i}\nVersion: 1.0.0\n\nDescription:\n    Werkzeug fuer {topic}.\n\n'
+            f'Usage:\n    python tool_{i}.py\n"""\n' + "\n".join(f"X{j} = {j}" for j in range(300)),
+            encoding="utf-8")
+    (base / "data").mkdir(exist_ok=True)
+    sqlite3.connect(str(base / "data" / "bach.db")).close()
+    return vocab
+
+
+def run_benchmark(n_skills: int = 900, n_tools: int = 370, queries: int = 20, seed: int = 42) -> dict:
+    """Vergleicht rglob+read mit dem Katalog (kalt, warm, Namensaufloesung).
+
+    Returns:
+        dict mit Zeiten in ms pro Abfrage
+    """
+    import tempfile
+    with tempfile.TemporaryDirectory() as tmp:
+        base = Path(tmp)
+        vocab = _bench_tree(base, n_skills, n_tools, seed)
+        terms = [vocab[i % len(vocab)] for i in range(queries)]
+
+        t0 = time.perf_counter()
+        legacy = [_legacy_search(base / "skills", (".txt", ".md"), term) for term in terms]
+        t_legacy = (time.perf_counter() - t0) / queries
+
+        catalog = CatalogIndex(base)
+        t0 = time.perf_counter()
+        catalog.refresh(force=True)
+        t_build = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        catalog.refresh(force=True)
+        t_diff = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        hits = []
+        for term in terms:
+            catalog.search(term, kind="skill", limit=20)
+            hits.append(catalog.count(term, kind="skill"))
+        t_search = (time.perf_counter() - t0) / queries
+
+        names = [e.name for e in catalog.entries("tool")]
+        t0 = time.perf_counter()
+        for name in names:
+            catalog.resolve("tool", name)
+        t_resolve = (time.perf_counter() - t0) / max(1, len(names))
+        catalog.close()
+
+    return {
+        "skills": n_skills,
+        "tools": n_tools,
+        "legacy_search_ms": round(t_legacy * 1000, 2),
+        "build_ms": round(t_build * 1000, 1),
+        "mtime_diff_ms": round(t_diff * 1000, 2),
+        "catalog_search_ms": round(t_search * 1000, 3),
+        "resolve_us": round(t_resolve * 1e6, 2),
+        "hits_equal": hits == legacy,
+    }
+
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description="BACH Skill-/Tool-Katalog")
+    parser.add_argument("--refresh", action="store_true", help="Katalog abgleichen")
+    parser.add_argument("--search", help="Katalog durchsuchen")
+    parser.add_argument("--kind", choices=list(KINDS))
+    parser.add_argument("--bench", action="store_true", help="Micro-Benchmark ausfuehren")
+    parser.add_argument("--skills", type=int, default=900)
+    parser.add_argument("--tools", type=int, default=370)
+    args = parser.parse_args()
+
+    if args.bench:
+        r = run_benchmark(args.skills, args.tools)
+        print(f"[BENCH] {r['skills']} Skills, {r['tools']} Tools")
+        rows = [
+            ("rglob+read pro Suche", f"{r['legacy_search_ms']:.2f} ms"),
+            ("Katalog Aufbau (kalt)", f"{r['build_ms']:.1f} ms"),
+            ("mtime-Abgleich", f"{r['mtime_diff_ms']:.2f} ms"),
+            ("Katalog-Suche (Top 20 + Anzahl)", f"{r['catalog_search_ms']:.3f} ms"),
+            ("Namensaufloesung", f"{r['resolve_us']:.2f} us"),
+            ("Treffer gleich", str(r['hits_equal'])),
+        ]
+        for label, value in rows:
+            print(f"  {label + ':':<34}{value:>12}")
+        return 0 if r['hits_equal'] else 1
+
+    catalog = get_catalog()
+    if args.refresh:
+        stats = catalog.refresh(force=True)
+        print(f"[CATALOG] +{stats['added']} ~{stats['updated']} -{stats['removed']} | {catalog.status()}")
+    if args.search:
+        for r in catalog.search(args.search, kind=args.kind):
+            e = r["entry"]
+            print(f"  [{e.kind}/{r['match']}] {e.rel_path}  {r['snippet'][:80]}")
+    if not (args.refresh or args.search):
+        parser.print_help()
+    return 0
+
+
+if __name__ == "__main__":
+    import sys
+    sys.exit(main())
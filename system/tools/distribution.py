@@ -31,6 +31,13 @@ from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
+_SYSTEM_DIR = Path(__file__).resolve().parent.parent
+if str(_SYSTEM_DIR) not in sys.path:
+    sys.path.insert(0, str(_SYSTEM_DIR))  # fuer core.fingerprint
+
+# Kernel-Hash ueber Pfad + Datei-Hash (alte Siegel: "sha256:" ueber Rohdaten)
+KERNEL_HASH_PREFIX = "sha256fp:"
+
 # Windows Console UTF-8 Support
 if sys.platform == 'win32':
     import io
@@ -169,16 +176,33 @@ class DistributionManager:
     # SEAL (SIEGEL) MANAGEMENT
     # =========================================================================
 
-    def _calculate_kernel_hash(self) -> str:
-        """Berechnet SHA256 ueber alle CORE-Dateien (dist_type=2) aus distribution_manifest."""
+    def _calculate_kernel_hash(self, paranoid: bool = False) -> str:
+        """Berechnet SHA256 ueber alle CORE-Dateien (dist_type=2) aus distribution_manifest.
+
+        Kombiniert Pfad + Datei-Hash; die Datei-Hashes kommen aus dem
+        Fingerprint-Cache (core.fingerprint), paranoid=True liest alle neu.
+        """
+        from core.fingerprint import get_cache
+
         sha256 = hashlib.sha256()
         kernel_files = sorted(self._get_kernel_files())
+        file_hashes = get_cache(self.db_path).hash_files(kernel_files, paranoid=paranoid)
 
         for filepath in kernel_files:
+            file_hash = file_hashes.get(filepath)
+            if file_hash:
+                sha256.update(str(filepath.relative_to(self.root)).encode())
+                sha256.update(file_hash.encode())
+
+        return f"{KERNEL_HASH_PREFIX}{sha256.hexdigest()}"
+
+    def _calculate_legacy_kernel_hash(self) -> str:
+        """Kernel-Hash im alten Format (Pfad + Rohdaten), nur fuer Migration."""
+        sha256 = hashlib.sha256()
+        for filepath in sorted(self._get_kernel_files()):
             if filepath.exists():
                 sha256.update(str(filepath.relative_to(self.root)).encode())
                 sha256.update(filepath.read_bytes())
-
         return f"sha256:{sha256.hexdigest()}"
 
     def _get_kernel_files(self) -> List[Path]:
@@ -217,8 +241,8 @@ class DistributionManager:
 
         return kernel_files
 
-    def verify_seal(self) -> Tuple[bool, str]:
-        """Prueft ob Siegel intakt ist."""
+    def verify_seal(self, paranoid: bool = False) -> Tuple[bool, str]:
+        """Prueft ob Siegel intakt ist (paranoid: ohne Fingerprint-Cache)."""
         identity = self.load_identity()
         if not identity:
             return False, "Keine Identitaet gefunden"
@@ -226,11 +250,15 @@ class DistributionManager:
         if identity["seal"]["status"] == "broken":
             return False, f"Siegel gebrochen am {identity['seal']['broken_at']}"
 
-        current_hash = self._calculate_kernel_hash()
+        current_hash = self._calculate_kernel_hash(paranoid)
         stored_hash = identity["seal"].get("kernel_hash")
 
         if current_hash != stored_hash:
-            return False, "Kernel-Hash abweichend"
+            # Siegel im alten Format einmalig gegen die Rohdaten pruefen und umstellen
+            legacy = (stored_hash or "").startswith("sha256:")
+            if not legacy or self._calculate_legacy_kernel_hash() != stored_hash:
+                return False, "Kernel-Hash abweichend"
+            identity["seal"]["kernel_hash"] = current_hash
 
         identity["seal"]["last_verified"] = datetime.now().isoformat()
         self._save_identity(identity)
@@ -306,6 +334,7 @@ class DistributionManager:
             manifest_rows = conn.execute(
                 "SELECT id, path FROM distribution_manifest WHERE dist_type >= 1"
             ).fetchall()
+            snapshot_files = []
 
             for manifest_id, rel_path in manifest_rows:
                 if '*' in rel_path:
@@ -319,9 +348,20 @@ class DistributionManager:
 
                 try:
                     file_size = filepath.stat().st_size
-                    file_checksum = f"sha256:{hashlib.sha256(filepath.read_bytes()).hexdigest()}"
                 except OSError:
                     continue
+                snapshot_files.append((manifest_id, filepath, file_size))
+
+            # Datei-Hashes gesammelt ueber den Fingerprint-Cache (nur geaenderte lesen)
+            from core.fingerprint import get_cache
+            file_hashes = get_cache(self.db_path).hash_files(
+                [filepath for _, filepath, _ in snapshot_files])
+
+            for manifest_id, filepath, file_size in snapshot_files:
+                file_hash = file_hashes.get(filepath)
+                if not file_hash:
+                    continue
+                file_checksum = f"sha256:{file_hash}"
 
                 conn.execute("""
                     INSERT INTO distribution_snapshot_files
@@ -46,7 +46,6 @@ v1.0 - Initial
 import os
 import sys
 import shutil
-import hashlib
 import json
 import sqlite3
 import zipfile
@@ -65,6 +64,9 @@ SNAPSHOTS_DIR = DIST_DIR / "snapshots"
 MANIFEST_FILE = DATA_DIR / "fs_manifest.json"
 BACH_DB = DATA_DIR / "bach.db"
 
+if str(BASE_DIR) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR))  # fuer core.fingerprint
+
 
 # =============================================================================
 # DIST_TYPE KLASSIFIZIERUNG
@@ -244,16 +246,10 @@ class FSProtection:
         conn.row_factory = sqlite3.Row
         return conn
 
-    def _get_hash(self, filepath: Path) -> str:
-        """Berechnet SHA256-Hash einer Datei."""
-        hasher = hashlib.sha256()
-        try:
-            with open(filepath, 'rb') as f:
-                for chunk in iter(lambda: f.read(8192), b""):
-                    hasher.update(chunk)
-            return hasher.hexdigest()
-        except Exception:
-            return ""
+    def _get_hash(self, filepath: Path, paranoid: bool = False) -> str:
+        """Berechnet SHA256-Hash einer Datei (ueber den Fingerprint-Cache)."""
+        from core.fingerprint import get_cache
+        return get_cache(self.db_path).file_hash(filepath, paranoid=paranoid)
 
     def _path_to_snapshot_name(self, rel_path: str) -> str:
         """Konvertiert Pfad zu Snapshot-Dateiname."""
@@ -315,8 +311,14 @@ class FSProtection:
 
         MANIFEST_FILE.write_text(json.dumps(manifest, indent=2), encoding='utf-8')
 
-    def check_integrity(self) -> Tuple[bool, str]:
-        """Prueft Dateien gegen Snapshots und Manifest."""
+    def check_integrity(self, paranoid: bool = False) -> Tuple[bool, str]:
+        """Prueft Dateien gegen Snapshots und Manifest.
+
+        Hashes kommen aus dem Fingerprint-Cache, paranoid=True liest alle
+        Dateien neu.
+        """
+        from core.fingerprint import get_cache
+
         if not MANIFEST_FILE.exists():
             print("[FS] Kein Manifest gefunden. Erstelle neues...")
             self._update_manifest("initial")
@@ -337,6 +339,9 @@ class FSProtection:
         """).fetchall()
         conn.close()
 
+        hashed = [self.base_path / row["path"] for row in rows if row["template_hash"]]
+        actual_hashes = get_cache(self.db_path).hash_files(hashed, paranoid=paranoid)
+
         for row in rows:
             rel_path = row["path"]
             expected_hash = row["template_hash"]
@@ -348,7 +353,7 @@ class FSProtection:
                 continue
 
             if expected_hash:
-                actual_hash = self._get_hash(file_path)
+                actual_hash = actual_hashes.get(file_path, "")
                 if actual_hash != expected_hash:
                     results["modified"].append(rel_path)
                 else:
@@ -513,7 +518,7 @@ def main():
         success, msg = fs.create_backup(tag)
 
     elif op == "check":
-        success, msg = fs.check_integrity()
+        success, msg = fs.check_integrity(paranoid="--paranoid" in args)
 
     elif op == "heal":
         file_path = args[1] if len(args) > 1 else None
@@ -554,6 +559,7 @@ BACH Filesystem Protection v2.0
 Befehle:
   backup [tag]      Erstellt ZIP-Backup
   check             Prueft Integritaet gegen Snapshots
+  check --paranoid  ... ohne Fingerprint-Cache (alle Dateien lesen)
   heal [file]       Stellt Datei(en) aus Snapshots her
   heal --all        Stellt alle fehlenden Dateien her
   snapshot <file>   Erstellt Snapshot einer Datei
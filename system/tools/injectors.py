@@ -35,6 +35,7 @@ v1.1.75: Cooldown-Feature - Injektoren werden nach Anzeige X Min stumm geschalte
 """
 import re
 import json
+import sqlite3
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
@@ -184,6 +185,7 @@ class ContextInjector:
     _ttl_sec = 300
     base_path = None
     _session_triggered = set() # v1.1.82: IDs der Themen-Pakete die bereits gefeuert haben
+    _fallback_matcher = None   # Aho-Corasick ueber CONTEXT_TRIGGERS
 
     # Trigger-Woerter die Kontext-Suche vorschlagen (Hardcoded Fallback)
     CONTEXT_TRIGGERS = {
@@ -415,27 +417,42 @@ class ContextInjector:
         if cls._cache is None or cls._last_load is None or (now - cls._last_load).total_seconds() > cls._ttl_sec:
             cls._refresh_cache()
             
-        for trigger, data in cls._cache.items():
-            if trigger in text_lower:
-                # v1.1.82: Themen-Pakete nur einmal pro Session
-                if data.get('source') == 'theme':
-                    if data['id'] in cls._session_triggered:
-                        continue
-                    cls._session_triggered.add(data['id'])
-                    # Wir speichern den Session-Status NICHT persistent, 
-                    # da bach.py pro Aufruf neu startet.
-                    # TODO: Fuer dauerhafte Prozesse (GUI/Daemon) ist das OK.
-                    # Fuer CLI-Aufrufe brauchen wir ein File-basiertes Tracking.
-                    cls._mark_session_usage(data['id'])
-
-                # v1.1.81: Usage tracking
-                if data.get('id'):
-                    cls._mark_usage(data['id'])
-                    
-                return f"[KONTEXT] {data['hint']}"
+        # Alle Treffer in einem Durchlauf (Aho-Corasick), erste passende Phrase gewinnt
+        for data in cls._get_matcher().match(text_lower):
+            # v1.1.82: Themen-Pakete nur einmal pro Session
+            if data.get('source') == 'theme':
+                if data['id'] in cls._session_triggered:
+                    continue
+                cls._session_triggered.add(data['id'])
+                # Wir speichern den Session-Status NICHT persistent, 
+                # da bach.py pro Aufruf neu startet.
+                # TODO: Fuer dauerhafte Prozesse (GUI/Daemon) ist das OK.
+                # Fuer CLI-Aufrufe brauchen wir ein File-basiertes Tracking.
+                cls._mark_session_usage(data['id'])
+
+            # v1.1.81: Usage tracking
+            if data.get('id'):
+                cls._mark_usage(data['id'])
+                
+            return f"[KONTEXT] {data['hint_text']}"
         
         return None
 
+    @classmethod
+    def _get_matcher(cls):
+        """Geteilter DB-Matcher (tools/trigger_matcher.py) oder Fallback-Matcher."""
+        from tools.trigger_matcher import TriggerMatcher, get_trigger_matcher
+
+        if cls.base_path:
+            db_path = cls.base_path / "data" / "bach.db"
+            if db_path.exists():
+                matcher = get_trigger_matcher(db_path)
+                if len(matcher):
+                    return matcher
+        if cls._fallback_matcher is None:
+            cls._fallback_matcher = TriggerMatcher.from_dict(cls.CONTEXT_TRIGGERS)
+        return cls._fallback_matcher
+
     @classmethod
     def _refresh_cache(cls):
         """Lädt Triggers aus DB oder nutzt hardcoded Fallback."""
@@ -452,15 +469,12 @@ class ContextInjector:
             return
             
         try:
-            conn = sqlite3.connect(str(db_path))
-            conn.row_factory = sqlite3.Row
-            # Triggers aus DB laden
-            rows = conn.execute("SELECT id, trigger_phrase, hint_text, source FROM context_triggers WHERE is_active = 1").fetchall()
-            if rows:
-                # Wenn DB Daten hat, nutzen wir diese
-                cls._cache = {r['trigger_phrase']: {'id': r['id'], 'hint': r['hint_text'], 'source': r['source']} for r in rows}
-            conn.close()
-        except:
+            # DB-Triggers kommen aus dem geteilten Matcher (versioniert, kein Neuladen pro Aufruf)
+            entries = cls._get_matcher().entries
+            if entries and entries[0].get('id') is not None:
+                cls._cache = {e['trigger_phrase']: {'id': e['id'], 'hint': e['hint_text'], 'source': e['source']}
+                              for e in entries}
+        except Exception:
             pass
         
         # v1.1.82: Session-Usage laden
@@ -0,0 +1,478 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# SPDX-License-Identifier: MIT
+"""
+Tool: lang_catalog
+Version: 1.0.0
+Author: BACH Team
+Created: 2026-10-17
+Anthropic-Compatible: True
+
+Description:
+    Vorgeladener Uebersetzungs-Katalog fuer hub.lang.t().
+
+    Pro Sprache werden alle Keys mit einer einzigen Abfrage geladen und
+    die Fallback-Kette von t() (Zielsprache -> Woerterbuch -> Fallback-
+    Sprache) vorab aufgeloest. Ein Lookup ist danach ein dict-Zugriff,
+    auch fuer nicht vorhandene Keys.
+
+    Invalidierung: Ein Zaehler in languages_catalog_version wird per
+    SQLite-Trigger bei jeder Aenderung an languages_translations,
+    languages_dictionary und languages_config erhoeht (auch aus anderen
+    Prozessen). Zusaetzlich verwirft hub.lang.clear_t_cache() den Katalog
+    sofort, z.B. nach `bach lang add`.
+
+    Kaltstart: Jeder gebaute Katalog wird als Snapshot unter
+    data/cache/lang/ abgelegt und nur verwendet, wenn Token und Version
+    der DB passen (Token unterscheidet neu erstellte DBs).
+
+Usage:
+    python lang_catalog.py --bench [--keys 5000] [--lookups 100000]
+"""
+
+__version__ = "1.0.0"
+__author__ = "BACH Team"
+
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+CATALOG_FORMAT = 1
+
+VERSION_SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS languages_catalog_version (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    token TEXT NOT NULL,
+    version INTEGER NOT NULL DEFAULT 0
+);
+INSERT OR IGNORE INTO languages_catalog_version (id, token, version)
+VALUES (1, lower(hex(randomblob(8))), 0);
+"""
+
+_TRIGGER_SQL = """
+CREATE TRIGGER IF NOT EXISTS {table}_catalog_{suffix} AFTER {event} ON {table} BEGIN
+    UPDATE languages_catalog_version SET version = version + 1 WHERE id = 1;
+END;
+"""
+
+WATCHED_TABLES = ("languages_translations", "languages_dictionary", "languages_config")
+
+# Mindestabstand zwischen zwei Versions-Abfragen pro DB
+VERSION_CHECK_INTERVAL_SEC = 1.0
+# Ohne Versions-Tabelle (z.B. read-only DB): spaetestens nach TTL neu laden
+FALLBACK_TTL_SEC = 300
+
+DEFAULT_CONFIG = {'default': 'de', 'fallback': 'en'}
+
+# Eine Abfrage fuer alle drei Stufen der Fallback-Kette
+CATALOG_SQL = """
+SELECT 0 AS tier, key, value, id AS rank FROM languages_translations
+    WHERE language = :lang AND value != ''
+UNION ALL
+SELECT 1, term, translation, -usage_count FROM languages_dictionary
+    WHERE source_lang = :default AND target_lang = :lang AND is_preferred = 1
+      AND :lang != :default AND translation != ''
+UNION ALL
+SELECT 2, key, value, id FROM languages_translations
+    WHERE language = :fallback AND value != ''
+ORDER BY tier, rank
+"""
+
+
+class TranslationCatalog:
+    """Aufgeloeste Uebersetzungen einer Sprache.
+
+    values:   Eintraege der Zielsprache (entspricht t_exists)
+    fallback: Keys ohne Zielsprache - Woerterbuch oder Fallback-Sprache
+    terms:    Woerterbuch fuer beliebige Keys (Suche per key.lower())
+    """
+
+    __slots__ = ("lang", "values", "fallback", "terms", "token", "version")
+
+    def __init__(self, lang: str, values: Dict[str, str], fallback: Dict[str, str],
+                 terms: Dict[str, str], token: Optional[str] = None, version=None):
+        self.lang = lang
+        self.values = values
+        self.fallback = fallback
+        self.terms = terms
+        self.token = token
+        self.version = version
+
+    @classmethod
+    def build(cls, conn: sqlite3.Connection, lang: str, config: Dict[str, str],
+              token: Optional[str] = None, version=None) -> "TranslationCatalog":
+        """Laedt alle Keys einer Sprache mit einer Abfrage."""
+        default_lang = config['default']
+        fallback_lang = config['fallback'] if lang != config['fallback'] else default_lang
+        tiers = ({}, {}, {})
+        intern = sys.intern
+        for tier, key, value, _ in conn.execute(
+                CATALOG_SQL, {'lang': lang, 'default': default_lang, 'fallback': fallback_lang}):
+            if key is not None and value:
+                tiers[tier].setdefault(intern(key), value)  # erster Treffer gewinnt (wie LIMIT 1)
+
+        values, terms, fallback_values = tiers
+        fallback = {}
+        for key, value in fallback_values.items():
+            if key not in values:
+                fallback[key] = terms.get(key.lower(), value)
+        return cls(lang, values, fallback, terms, token, version)
+
+    def lookup(self, key: str) -> Optional[str]:
+        """Uebersetzung oder None."""
+        value = self.values.get(key)
+        if value is None:
+            value = self.fallback.get(key)
+            if value is None and self.terms:
+                value = self.terms.get(key.lower())
+        return value
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.values
+
+    def __len__(self):
+        return len(self.values) + len(self.fallback)
+
+    # --- Snapshot ---------------------------------------------------------
+
+    def to_dict(self) -> dict:
+        return {"format": CATALOG_FORMAT, "lang": self.lang, "token": self.token,
+                "version": self.version, "values": self.values,
+                "fallback": self.fallback, "terms": self.terms}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "TranslationCatalog":
+        return cls(data["lang"], data["values"], data["fallback"], data["terms"],
+                   data.get("token"), data.get("version"))
+
+
+class _DbState:
+    """Version, Sprachkonfiguration und geladene Kataloge einer DB."""
+
+    def __init__(self, token, version, config: Dict[str, str]):
+        self.token = token
+        self.version = version
+        self.config = config
+        self.catalogs: Dict[str, TranslationCatalog] = {}
+        self.built_at = time.monotonic()
+        self.checked_at = self.built_at
+
+
+_states: Dict[str, _DbState] = {}
+_lock = threading.Lock()
+
+
+def _install_version_table(conn: sqlite3.Connection) -> None:
+    script = [VERSION_SCHEMA_SQL]
+    for table in WATCHED_TABLES:
+        for suffix, event in (("ai", "INSERT"), ("ad", "DELETE"), ("au", "UPDATE")):
+            script.append(_TRIGGER_SQL.format(table=table, suffix=suffix, event=event))
+    conn.executescript("".join(script))
+
+
+def _read_version(conn: sqlite3.Connection):
+    """(token, version); installiert Versions-Tabelle und Trigger bei Bedarf."""
+    try:
+        row = conn.execute(
+            "SELECT token, version FROM languages_catalog_version WHERE id = 1").fetchone()
+        if row is not None:
+            return row[0], row[1]
+    except sqlite3.OperationalError:
+        pass
+    try:
+        _install_version_table(conn)
+        row = conn.execute(
+            "SELECT token, version FROM languages_catalog_version WHERE id = 1").fetchone()
+        return row[0], row[1]
+    except sqlite3.Error:
+        return None, None  # read-only oder Sprach-Tabellen fehlen
+
+
+def _read_config(conn: sqlite3.Connection) -> Dict[str, str]:
+    try:
+        row = conn.execute(
+            "SELECT default_language, fallback_language FROM languages_config LIMIT 1"
+        ).fetchone()
+    except sqlite3.Error:
+        row = None
+    if row:
+        return {'default': row[0] or 'de', 'fallback': row[1] or 'en'}
+    return dict(DEFAULT_CONFIG)
+
+
+def _connect(db_path: Path) -> sqlite3.Connection:
+    return sqlite3.connect(str(db_path), timeout=30.0)
+
+
+def _get_state(db_path: Path) -> Optional[_DbState]:
+    """Aktueller Zustand; prueft die Version hoechstens einmal pro Intervall."""
+    key = str(db_path)
+    now = time.monotonic()
+    state = _states.get(key)
+    if state is not None and now - state.checked_at < VERSION_CHECK_INTERVAL_SEC:
+        return state
+    if not db_path.exists():
+        return None
+
+    try:
+        conn = _connect(db_path)
+    except sqlite3.Error:
+        return state
+    try:
+        token, version = _read_version(conn)
+        if state is not None:
+            unchanged = (version is not None and (token, version) == (state.token, state.version))
+            if unchanged or (version is None and now - state.built_at < FALLBACK_TTL_SEC):
+                state.checked_at = now
+                return state
+        state = _DbState(token, version, _read_config(conn))
+    finally:
+        conn.close()
+
+    with _lock:
+        _states[key] = state
+    return state
+
+
+def snapshot_path(db_path: Path, lang: str) -> Path:
+    """Snapshot-Datei eines Katalogs (data/cache/lang/catalog_<lang>.json)."""
+    return Path(db_path).parent / "cache" / "lang" / f"catalog_{lang}.json"
+
+
+def _load_snapshot(path: Path, state: _DbState, lang: str) -> Optional[TranslationCatalog]:
+    if state.version is None:
+        return None
+    try:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if (data.get("format") != CATALOG_FORMAT or data.get("lang") != lang
+            or data.get("token") != state.token or data.get("version") != state.version):
+        return None
+    return TranslationCatalog.from_dict(data)
+
+
+def _write_snapshot(path: Path, catalog: TranslationCatalog) -> None:
+    if catalog.version is None:
+        return
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(catalog.to_dict(), f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp, path)
+    except OSError:
+        pass  # Snapshot ist nur Beschleunigung
+
+
+def get_config(db_path: Path) -> Dict[str, str]:
+    """Sprachkonfiguration {'default', 'fallback'} der DB (gecacht)."""
+    state = _get_state(Path(db_path))
+    return dict(state.config) if state is not None else dict(DEFAULT_CONFIG)
+
+
+def get_catalog(db_path: Path, lang: str, snapshot: bool = True) -> Optional[TranslationCatalog]:
+    """Geteilter Katalog einer Sprache.
+
+    Args:
+        db_path: Pfad zur bach.db
+        lang: Sprach-Code (z.B. "en")
+        snapshot: Snapshot unter data/cache/lang/ lesen/schreiben
+
+    Returns:
+        TranslationCatalog oder None (DB fehlt/nicht lesbar)
+    """
+    db_path = Path(db_path)
+    state = _get_state(db_path)
+    if state is None:
+        return None
+    catalog = state.catalogs.get(lang)
+    if catalog is not None:
+        return catalog
+
+    with _lock:
+        catalog = state.catalogs.get(lang)
+        if catalog is not None:
+            return catalog
+        path = snapshot_path(db_path, lang)
+        if snapshot:
+            catalog = _load_snapshot(path, state, lang)
+        if catalog is None:
+            try:
+                conn = _connect(db_path)
+                try:
+                    catalog = TranslationCatalog.build(conn, lang, state.config,
+                                                       state.token, state.version)
+                finally:
+                    conn.close()
+            except sqlite3.Error:
+                catalog = TranslationCatalog(lang, {}, {}, {})
+            else:
+                if snapshot:
+                    _write_snapshot(path, catalog)
+        state.catalogs[lang] = catalog
+    return catalog
+
+
+def invalidate(db_path: Optional[Path] = None) -> None:
+    """Verwirft geladene Kataloge (einer DB oder alle).
+
+    Snapshots bleiben liegen; sie werden ueber Token/Version validiert.
+    """
+    with _lock:
+        if db_path is None:
+            _states.clear()
+        else:
+            _states.pop(str(db_path), None)
+
+
+# ═══════════════════════════════════════════════════════════════
+# BENCHMARK
+# ═══════════════════════════════════════════════════════════════
+
+def _legacy_t(db_path: Path, key: str, lang: str) -> Optional[str]:
+    """Bisheriger Lookup von hub.lang.t() bei Cache-Miss (Referenz)."""
+    conn = sqlite3.connect(str(db_path))
+    try:
+        row = conn.execute("""
+            SELECT value FROM languages_translations
+            WHERE key = ? AND language = ? AND value != '' LIMIT 1
+        """, (key, lang)).fetchone()
+        if row and row[0]:
+            return row[0]
+        config = _read_config(conn)
+        if lang != config['default']:
+            row = conn.execute("""
+                SELECT translation FROM languages_dictionary
+                WHERE term = ? AND source_lang = ? AND target_lang = ? AND is_preferred = 1
+                ORDER BY usage_count DESC LIMIT 1
+            """, (key.lower(), config['default'], lang)).fetchone()
+            if row and row[0]:
+                return row[0]
+        fallback = config['fallback'] if lang != config['fallback'] else config['default']
+        row = conn.execute("""
+            SELECT value FROM languages_translations
+            WHERE key = ? AND language = ? AND value != '' LIMIT 1
+        """, (key, fallback)).fetchone()
+        return row[0] if row and row[0] else None
+    finally:
+        conn.close()
+
+
+def _bench_db(path: Path, n_keys: int, seed: int):
+    import random
+    rng = random.Random(seed)
+    conn = sqlite3.connect(str(path))
+    conn.executescript("""
+        CREATE TABLE languages_config (id INTEGER PRIMARY KEY, default_language TEXT,
+            fallback_language TEXT, enabled_languages TEXT, updated_at TEXT);
+        INSERT INTO languages_config VALUES (1, 'de', 'en', '["de", "en"]', NULL);
+        CREATE TABLE languages_translations (id INTEGER PRIMARY KEY, key TEXT NOT NULL,
+            namespace TEXT DEFAULT 'common', language TEXT NOT NULL, value TEXT NOT NULL,
+            is_verified BOOLEAN DEFAULT 0, source TEXT, created_at TEXT, updated_at TEXT,
+            UNIQUE(key, namespace, language));
+        CREATE INDEX idx_translations_key ON languages_translations(key);
+        CREATE TABLE languages_dictionary (id INTEGER PRIMARY KEY, term TEXT NOT NULL,
+            source_lang TEXT NOT NULL, target_lang TEXT NOT NULL, translation TEXT NOT NULL,
+            context TEXT, is_preferred BOOLEAN DEFAULT 1, usage_count INTEGER DEFAULT 0,
+            created_at TEXT);
+        CREATE INDEX idx_dict_term ON languages_dictionary(term);
+    """)
+    keys = [f"ui.{rng.choice(['btn', 'msg', 'err', 'help'])}.{i:05d}" for i in range(n_keys)]
+    rows = []
+    for key in keys:
+        rows.append((key, 'de', f"Text {key}"))
+        if rng.random() < 0.8:
+            rows.append((key, 'en', f"text {key}"))
+    conn.executemany("INSERT INTO languages_translations (key, language, value) VALUES (?, ?, ?)",
+                     rows)
+    conn.executemany(
+        "INSERT INTO languages_dictionary (term, source_lang, target_lang, translation) "
+        "VALUES (?, 'de', 'en', ?)",
+        [(f"wort{i}", f"word{i}") for i in range(n_keys // 5)])
+    conn.commit()
+    conn.close()
+    words = [f"wort{i}" for i in range(n_keys // 5)]
+    return keys, words
+
+
+def run_benchmark(n_keys: int = 5000, n_lookups: int = 100000, seed: int = 42) -> dict:
+    """Vergleicht den bisherigen Lookup mit Katalog kalt (DB/Snapshot) und warm.
+
+    Returns:
+        dict mit Zeiten und Durchsatz (Lookups/s)
+    """
+    import random
+    import tempfile
+    rng = random.Random(seed)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / "bach.db"
+        keys, words = _bench_db(db_path, n_keys, seed)
+        pool = keys + words + [f"missing.{i}" for i in range(n_keys // 10)]
+        sample = [rng.choice(pool) for _ in range(n_lookups)]
+        legacy_sample = sample[:min(2000, n_lookups)]
+
+        t0 = time.perf_counter()
+        legacy = [_legacy_t(db_path, k, 'en') for k in legacy_sample]
+        t_legacy = time.perf_counter() - t0
+
+        invalidate()
+        t0 = time.perf_counter()
+        catalog = get_catalog(db_path, 'en')
+        t_cold_db = time.perf_counter() - t0
+
+        invalidate()
+        t0 = time.perf_counter()
+        get_catalog(db_path, 'en')
+        t_cold_snapshot = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        for k in sample:
+            get_catalog(db_path, 'en').lookup(k)
+        t_warm = time.perf_counter() - t0
+
+        equal = [catalog.lookup(k) for k in legacy_sample] == legacy
+        invalidate(db_path)
+
+    return {
+        "keys": n_keys,
+        "lookups": n_lookups,
+        "legacy_per_s": round(len(legacy_sample) / t_legacy) if t_legacy else None,
+        "cold_db_ms": round(t_cold_db * 1000, 2),
+        "cold_snapshot_ms": round(t_cold_snapshot * 1000, 2),
+        "warm_per_s": round(n_lookups / t_warm) if t_warm else None,
+        "results_equal": equal,
+    }
+
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description="BACH Uebersetzungs-Katalog")
+    parser.add_argument("--bench", action="store_true", help="Micro-Benchmark ausfuehren")
+    parser.add_argument("--keys", type=int, default=5000)
+    parser.add_argument("--lookups", type=int, default=100000)
+    args = parser.parse_args()
+
+    if not args.bench:
+        parser.print_help()
+        return 0
+
+    r = run_benchmark(args.keys, args.lookups)
+    print(f"[BENCH] {r['keys']} Keys, {r['lookups']} Lookups (Sprache en)")
+    print(f"  Bisher (SQL je Miss):   {r['legacy_per_s']:>12,} t()/s")
+    print(f"  Katalog kalt (DB):      {r['cold_db_ms']:>12.2f} ms")
+    print(f"  Katalog kalt (Snapshot):{r['cold_snapshot_ms']:>12.2f} ms")
+    print(f"  Katalog warm:           {r['warm_per_s']:>12,} t()/s")
+    print(f"  Ergebnisse gleich:      {r['results_equal']}")
+    return 0 if r['results_equal'] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,587 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# SPDX-License-Identifier: MIT
+"""
+Tool: mcp_runtime
+Version: 1.0.0
+Author: BACH Team
+Created: 2026-10-17
+Anthropic-Compatible: True
+
+Description:
+    Warme Ausfuehrungsumgebung fuer tools/mcp_server.py. Lebt so lange wie
+    der Server-Prozess:
+
+    - App, Handler-Instanzen, DB-Pool und Schema-Metadaten werden einmal
+      in warm_up() geladen und danach wiederverwendet.
+    - Ergebnisse lesender Operationen (READ_OPERATIONS) und von db_query
+      werden pro Tabelle gecacht. Invalidierung: core.hooks-Events
+      (after_command fuer schreibende Operationen, after_task_done, ...)
+      verwerfen die betroffenen Tabellen; Schreibzugriffe anderer Prozesse
+      erkennt PRAGMA data_version und verwerfen den ganzen Cache.
+    - Latenz-Histogramme pro Tool (Resource bach:/metrics/latency).
+    - Tool-Aufrufe laufen in einem Thread-Pool; Aufrufe desselben
+      Handlers sind serialisiert, unabhaengige laufen parallel.
+
+Usage:
+    python mcp_runtime.py --bench [--calls 1000]
+"""
+
+__version__ = "1.0.0"
+__author__ = "BACH Team"
+
+import asyncio
+import functools
+import sqlite3
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional
+
+RUNTIME_WORKERS = 8        # Threads fuer parallele Tool-Aufrufe
+CACHE_ENTRIES = 512        # Max. gecachte Ergebnisse (LRU)
+CACHE_MAX_AGE = 30.0       # Sekunden; Obergrenze auch ohne Invalidierung
+HISTOGRAM_BOUNDS_MS = (0.25, 0.5, 1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 5000)
+
+# Lesende Handler-Operationen und die Tabellen, von denen ihr Ergebnis abhaengt
+READ_OPERATIONS: Dict[tuple, frozenset] = {
+    ("task", "list"): frozenset({"tasks"}),
+    ("lesson", "list"): frozenset({"memory_lessons"}),
+    ("lesson", "search"): frozenset({"memory_lessons"}),
+    ("memory", "search"): frozenset({"memory_working", "memory_facts", "memory_lessons"}),
+    ("memory", "facts"): frozenset({"memory_facts"}),
+    ("memory", "status"): frozenset({"memory_working", "memory_facts", "memory_lessons",
+                                     "memory_sessions"}),
+    ("contact", "list"): frozenset({"assistant_contacts", "contacts"}),
+    ("contact", "search"): frozenset({"assistant_contacts", "contacts"}),
+    ("steuer", "status"): frozenset({"steuer_posten", "steuer_dokumente"}),
+    ("skills", "list"): frozenset({"skills", "hierarchy_items", "hierarchy_assignments"}),
+}
+
+# Tabellen, die eine schreibende Operation eines Handlers beruehren kann
+HANDLER_TABLES: Dict[str, frozenset] = {}
+for (_handler, _op), _tables in READ_OPERATIONS.items():
+    HANDLER_TABLES[_handler] = HANDLER_TABLES.get(_handler, frozenset()) | _tables
+
+# Fachliche Hook-Events -> betroffene Tabellen
+EVENT_TABLES: Dict[str, frozenset] = {
+    "after_task_create": frozenset({"tasks"}),
+    "after_task_done": frozenset({"tasks"}),
+    "after_task_delete": frozenset({"tasks"}),
+    "after_memory_write": frozenset({"memory_working"}),
+    "after_lesson_add": frozenset({"memory_lessons"}),
+    "after_skill_create": frozenset({"skills", "hierarchy_items"}),
+    "after_skill_reload": frozenset({"skills", "hierarchy_items"}),
+}
+
+# Handler, die beim Start instanziiert werden (alle, die der MCP-Server nutzt)
+WARM_HANDLERS = ("task", "lesson", "memory", "backup", "steuer", "contact", "msg",
+                 "notify", "partner", "healthcheck", "status", "skills")
+
+
+# ═══════════════════════════════════════════════════════════════
+# RESULT CACHE
+# ═══════════════════════════════════════════════════════════════
+
+class ResultCache:
+    """LRU-Cache fuer Tool-Ergebnisse mit Invalidierung pro Tabelle.
+
+    Jede Tabelle hat einen Generationszaehler. put() verwirft ein
+    Ergebnis, wenn eine seiner Tabellen waehrend der Berechnung
+    invalidiert wurde (Lesen parallel zu einem Schreiber).
+    """
+
+    def __init__(self, max_entries: int = CACHE_ENTRIES, max_age: float = CACHE_MAX_AGE):
+        self.max_entries = max_entries
+        self.max_age = max_age
+        self._entries: "OrderedDict[tuple, tuple]" = OrderedDict()
+        self._by_table: Dict[str, set] = defaultdict(set)
+        self._generations: Dict[str, int] = defaultdict(int)
+        self._epoch = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def get(self, key: tuple):
+        """Gecachtes Ergebnis oder None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or time.monotonic() - entry[2] > self.max_age:
+                if entry is not None:
+                    self._drop(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def generation(self, tables: Iterable[str]) -> tuple:
+        """Stand der Tabellen vor einer Berechnung (fuer put())."""
+        with self._lock:
+            return self._epoch, tuple(self._generations[t] for t in sorted(tables))
+
+    def put(self, key: tuple, value, tables: Iterable[str], generation: tuple = None) -> bool:
+        """Speichert value, sofern seit generation keine Tabelle invalidiert wurde."""
+        tables = frozenset(tables)
+        with self._lock:
+            current = (self._epoch, tuple(self._generations[t] for t in sorted(tables)))
+            if generation is not None and generation != current:
+                return False
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (value, tables, time.monotonic())
+            for table in tables:
+                self._by_table[table].add(key)
+            while len(self._entries) > self.max_entries:
+                self._drop(next(iter(self._entries)))
+            return True
+
+    def invalidate(self, tables: Iterable[str]) -> int:
+        """Verwirft alle Ergebnisse, die von einer der Tabellen abhaengen."""
+        removed = 0
+        with self._lock:
+            for table in tables:
+                self._generations[table] += 1
+                for key in list(self._by_table.pop(table, ())):
+                    if key in self._entries:
+                        self._drop(key)
+                        removed += 1
+            self.invalidations += 1
+        return removed
+
+    def clear(self):
+        """Verwirft alles (z.B. nach Schreibzugriff eines anderen Prozesses)."""
+        with self._lock:
+            self._entries.clear()
+            self._by_table.clear()
+            self._epoch += 1
+            self.invalidations += 1
+
+    def _drop(self, key: tuple):
+        _, tables, _ = self._entries.pop(key)
+        for table in tables:
+            keys = self._by_table.get(table)
+            if keys is not None:
+                keys.discard(key)
+
+    def __len__(self):
+        return len(self._entries)
+
+
+# ═══════════════════════════════════════════════════════════════
+# LATENZ-HISTOGRAMM
+# ═══════════════════════════════════════════════════════════════
+
+class LatencyHistogram:
+    """Feste Buckets in Millisekunden; Perzentile als Bucket-Obergrenze."""
+
+    def __init__(self, bounds=HISTOGRAM_BOUNDS_MS):
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.cache_hits = 0
+        self.errors = 0
+
+    def record(self, ms: float, cached: bool = False, error: bool = False):
+        index = len(self.bounds)
+        for i, bound in enumerate(self.bounds):
+            if ms <= bound:
+                index = i
+                break
+        self.counts[index] += 1
+        self.count += 1
+        self.total_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+        if cached:
+            self.cache_hits += 1
+        if error:
+            self.errors += 1
+
+    def percentile(self, pct: float) -> float:
+        """Obergrenze des Buckets, in dem das Perzentil liegt (ms)."""
+        if not self.count:
+            return 0.0
+        rank = pct / 100 * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank and n:
+                return self.bounds[i] if i < len(self.bounds) else self.max_ms
+        return self.max_ms
+
+    def to_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "mean_ms": round(self.total_ms / self.count, 3) if self.count else 0.0,
+            "p50_ms": self.percentile(50),
+            "p95_ms": self.percentile(95),
+            "p99_ms": self.percentile(99),
+            "max_ms": round(self.max_ms, 3),
+            "cache_hits": self.cache_hits,
+            "errors": self.errors,
+            "buckets": {(f"<={b}" if i < len(self.bounds) else f">{self.bounds[-1]}"): n
+                        for i, (b, n) in enumerate(zip(self.bounds + (None,), self.counts)) if n},
+        }
+
+
+# ═══════════════════════════════════════════════════════════════
+# RUNTIME
+# ═══════════════════════════════════════════════════════════════
+
+class MCPRuntime:
+    """Persistente Ausfuehrungsumgebung fuer MCP-Tool-Aufrufe."""
+
+    def __init__(self, system_dir: Path, db_path: Path = None, app=None,
+                 max_workers: int = RUNTIME_WORKERS):
+        """
+        Args:
+            system_dir: system/-Verzeichnis
+            db_path: bach.db (Standard: system/data/bach.db)
+            app: Optional vorhandene App (sonst bach_api.get_app())
+            max_workers: Threads fuer parallele Aufrufe
+        """
+        self.system_dir = Path(system_dir)
+        self.db_path = Path(db_path) if db_path else self.system_dir / "data" / "bach.db"
+        self.cache = ResultCache()
+        self.histograms: Dict[str, LatencyHistogram] = defaultdict(LatencyHistogram)
+        self._app = app
+        self._hooks = None
+        self._handler_locks: Dict[str, threading.Lock] = defaultdict(threading.Lock)
+        self._locks_lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers,
+                                            thread_name_prefix="bach-mcp")
+        self._local = threading.local()
+        self._version_conn: Optional[sqlite3.Connection] = None
+        self._version_lock = threading.Lock()
+        self._data_version = None
+        self._own_writes = 0
+        self._schema: Dict[str, List[str]] = {}
+        self._schema_version = None
+        self.warmed_up_ms: Optional[float] = None
+
+    # ─── Lebenszyklus ───────────────────────────────────────────────
+
+    @property
+    def app(self):
+        if self._app is None:
+            from bach_api import get_app
+            self._app = get_app()
+        return self._app
+
+    def warm_up(self, handlers: Iterable[str] = WARM_HANDLERS) -> float:
+        """Laedt App, Handler, Hooks, Schema und DB-Verbindungen vor.
+
+        Returns:
+            Dauer in Millisekunden
+        """
+        start = time.perf_counter()
+        self.attach_hooks()
+        for name in handlers:
+            try:
+                self.app.get_handler(name)
+            except Exception:
+                pass  # Fehlt der Handler, meldet das der erste Aufruf
+        self._check_external_writes()
+        self.schema()
+        self.warmed_up_ms = (time.perf_counter() - start) * 1000
+        return self.warmed_up_ms
+
+    def attach_hooks(self, hooks=None):
+        """Registriert die Cache-Invalidierung auf der Hook-Registry der App."""
+        if self._hooks is not None:
+            return
+        if hooks is None:
+            hooks = getattr(self.app, "hooks", None)
+            if hooks is None:
+                from core.hooks import hooks
+        hooks.on("after_command", self._on_after_command, priority=90, name="mcp_runtime")
+        for event in EVENT_TABLES:
+            hooks.on(event, self._on_domain_event, priority=90, name="mcp_runtime")
+        self._hooks = hooks
+
+    def close(self):
+        """Beendet Pool und Verbindungen, meldet Hooks ab."""
+        if self._hooks is not None:
+            for event in ("after_command",) + tuple(EVENT_TABLES):
+                self._hooks.off(event, name="mcp_runtime")
+            self._hooks = None
+        self._executor.shutdown(wait=False)
+        with self._version_lock:
+            if self._version_conn is not None:
+                self._version_conn.close()
+                self._version_conn = None
+
+    # ─── Hook-Listener ──────────────────────────────────────────────
+
+    def _on_after_command(self, ctx: dict):
+        handler, operation = ctx.get("handler"), ctx.get("operation")
+        if (handler, operation) in READ_OPERATIONS:
+            return None
+        tables = HANDLER_TABLES.get(handler)
+        with self._version_lock:
+            self._own_writes += 1
+        if tables:
+            self.cache.invalidate(tables)
+        else:
+            # Unbekannte Tabellen (startup, backup, ...): alles verwerfen
+            self.cache.clear()
+        return None
+
+    def _on_domain_event(self, ctx: dict):
+        tables = EVENT_TABLES.get(ctx.get("_event"))
+        if tables:
+            self.cache.invalidate(tables)
+        return None
+
+    def _check_external_writes(self):
+        """Verwirft den Cache, wenn ein anderer Prozess die DB geaendert hat.
+
+        PRAGMA data_version aendert sich bei jedem Commit einer anderen
+        Verbindung. Sind seit der letzten Pruefung eigene Schreibbefehle
+        gelaufen, wurden deren Tabellen schon per Hook invalidiert - dann
+        wird nur der Vergleichswert nachgezogen. Ein fremder Commit im
+        selben Intervall bleibt so bis CACHE_MAX_AGE unbemerkt.
+        """
+        with self._version_lock:
+            try:
+                if self._version_conn is None:
+                    if not self.db_path.exists():
+                        return
+                    self._version_conn = sqlite3.connect(str(self.db_path), timeout=5.0,
+                                                         check_same_thread=False)
+                version = self._version_conn.execute("PRAGMA data_version").fetchone()[0]
+            except sqlite3.Error:
+                return
+            changed = self._data_version is not None and version != self._data_version
+            own_writes, self._own_writes = self._own_writes, 0
+            self._data_version = version
+        if changed and not own_writes:
+            self.cache.clear()
+
+    # ─── Ausfuehrung ────────────────────────────────────────────────
+
+    def _handler_lock(self, handler: str) -> threading.Lock:
+        with self._locks_lock:
+            return self._handler_locks[handler]
+
+    def execute(self, handler: str, operation: str, args: list = None) -> str:
+        """Handler-Operation ausfuehren; lesende Operationen aus dem Cache."""
+        args = [str(a) for a in (args or [])]
+        tables = READ_OPERATIONS.get((handler, operation))
+        key = ("exec", handler, operation, tuple(args))
+        if tables is not None:
+            self._check_external_writes()
+            cached = self.cache.get(key)
+            if cached is not None:
+                self._local.cached = True
+                return cached
+            generation = self.cache.generation(tables)
+        try:
+            with self._handler_lock(handler):
+                success, message = self.app.execute(handler, operation, args)
+        except Exception as e:
+            return f"[FEHLER] {handler} {operation}: {e}"
+        if tables is not None and success:
+            self.cache.put(key, message, tables, generation)
+        return message
+
+    def query(self, sql: str, params: tuple = (), tables: Iterable[str] = None,
+              limit: int = None) -> List[dict]:
+        """SELECT ueber den gepoolten read-only Zugang (optional gecacht).
+
+        Args:
+            tables: Tabellen der Query - nur dann wird gecacht
+            limit: Max. Zeilen (fetchmany statt fetchall)
+        """
+        key = ("query", sql, tuple(params), limit)
+        if tables is not None:
+            self._check_external_writes()
+            cached = self.cache.get(key)
+            if cached is not None:
+                self._local.cached = True
+                return cached
+            generation = self.cache.generation(tables)
+
+        from core.db import get_pool
+        conn = get_pool(self.db_path).acquire(readonly=True)
+        try:
+            cur = conn.execute(sql, params)
+            rows = cur.fetchmany(limit) if limit else cur.fetchall()
+            result = [dict(r) for r in rows]
+        finally:
+            conn.close()
+
+        if tables is not None:
+            self.cache.put(key, result, tables, generation)
+        return result
+
+    def schema(self) -> Dict[str, List[str]]:
+        """Tabellen -> Spalten, neu gelesen nur bei geaendertem schema_version."""
+        try:
+            from core.db import get_pool
+            conn = get_pool(self.db_path).acquire(readonly=True)
+        except Exception:
+            return self._schema
+        try:
+            version = conn.execute("PRAGMA schema_version").fetchone()[0]
+            if version != self._schema_version:
+                tables = [r[0] for r in conn.execute(
+                    "SELECT name FROM sqlite_master WHERE type IN ('table', 'view')")]
+                self._schema = {
+                    t: [c[1] for c in conn.execute(f'PRAGMA table_info("{t}")')]
+                    for t in tables
+                }
+                self._schema_version = version
+        except sqlite3.Error:
+            pass
+        finally:
+            conn.close()
+        return self._schema
+
+    # ─── Messung & Parallelitaet ────────────────────────────────────
+
+    def call(self, tool: str, fn: Callable, *args, **kwargs):
+        """Fuehrt fn aus und traegt die Latenz ins Histogramm des Tools ein."""
+        self._local.cached = False
+        start = time.perf_counter()
+        error = False
+        try:
+            result = fn(*args, **kwargs)
+            if isinstance(result, str) and result.startswith("[FEHLER]"):
+                error = True
+            return result
+        except Exception:
+            error = True
+            raise
+        finally:
+            ms = (time.perf_counter() - start) * 1000
+            self.histograms[tool].record(ms, cached=self._local.cached, error=error)
+
+    async def run(self, tool: str, fn: Callable, *args, **kwargs):
+        """Wie call(), aber im Runtime-Thread-Pool (blockiert den Event-Loop nicht)."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor, functools.partial(self.call, tool, fn, *args, **kwargs))
+
+    def tool(self, fn: Callable) -> Callable:
+        """Decorator: synchrone Tool-Funktion -> async, gemessen, im Pool.
+
+        functools.wraps erhaelt Signatur und Docstring fuer das MCP-Schema.
+        """
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs):
+            return await self.run(fn.__name__, fn, *args, **kwargs)
+        return wrapper
+
+    def metrics(self) -> dict:
+        """Histogramme pro Tool plus Cache-Kennzahlen."""
+        cache = self.cache
+        lookups = cache.hits + cache.misses
+        return {
+            "tools": {name: h.to_dict() for name, h in sorted(self.histograms.items())},
+            "cache": {
+                "entries": len(cache),
+                "hits": cache.hits,
+                "misses": cache.misses,
+                "hit_rate": round(cache.hits / lookups, 3) if lookups else None,
+                "invalidations": cache.invalidations,
+            },
+            "warm_up_ms": round(self.warmed_up_ms, 1) if self.warmed_up_ms is not None else None,
+        }
+
+    def format_metrics(self) -> str:
+        """Metriken als Text (fuer die MCP-Resource)."""
+        m = self.metrics()
+        c = m["cache"]
+        lines = [
+            "BACH MCP Runtime - Latenz pro Tool (ms)",
+            "=" * 72,
+            f"{'Tool':<22} {'Calls':>6} {'Cache':>6} {'p50':>7} {'p95':>7} {'p99':>7} {'max':>8}",
+        ]
+        for name, h in m["tools"].items():
+            lines.append(f"{name:<22} {h['count']:>6} {h['cache_hits']:>6} {h['p50_ms']:>7} "
+                         f"{h['p95_ms']:>7} {h['p99_ms']:>7} {h['max_ms']:>8}")
+        if not m["tools"]:
+            lines.append("(noch keine Aufrufe)")
+        hit_rate = f"{c['hit_rate']:.0%}" if c["hit_rate"] is not None else "-"
+        lines += [
+            "",
+            f"Cache: {c['entries']} Eintraege, Trefferquote {hit_rate}, "
+            f"{c['invalidations']} Invalidierungen",
+            f"Warm-up: {m['warm_up_ms']} ms" if m["warm_up_ms"] is not None else "Warm-up: -",
+        ]
+        return "\n".join(lines)
+
+
+# ═══════════════════════════════════════════════════════════════
+# BENCHMARK
+# ═══════════════════════════════════════════════════════════════
+
+def run_benchmark(calls: int = 1000, system_dir: Path = None) -> dict:
+    """Vergleicht kalte Einzelaufrufe (neue App je Aufruf) mit der Runtime.
+
+    Returns:
+        dict mit mittleren Latenzen und Metriken
+    """
+    system_dir = Path(system_dir) if system_dir else Path(__file__).parent.parent
+    import sys
+    if str(system_dir) not in sys.path:
+        sys.path.insert(0, str(system_dir))
+    from core.app import App
+
+    t0 = time.perf_counter()
+    cold_runs = max(1, calls // 100)
+    for _ in range(cold_runs):
+        App(system_dir).execute("task", "list", [])
+    cold_ms = (time.perf_counter() - t0) * 1000 / cold_runs
+
+    runtime = MCPRuntime(system_dir, app=App(system_dir))
+    warm_up = runtime.warm_up()
+    ops = [("task", "list", []), ("memory", "status", []), ("lesson", "list", [])]
+
+    # Warm, aber ohne Cache-Treffer
+    t0 = time.perf_counter()
+    for i in range(cold_runs * 10):
+        runtime.cache.clear()
+        handler, op, args = ops[i % len(ops)]
+        runtime.execute(handler, op, args)
+    uncached_ms = (time.perf_counter() - t0) * 1000 / (cold_runs * 10)
+
+    for i in range(calls):
+        handler, op, args = ops[i % len(ops)]
+        runtime.call(f"{handler}_{op}", runtime.execute, handler, op, args)
+    runtime.close()
+    metrics = runtime.metrics()
+    return {"cold_ms": round(cold_ms, 2), "warm_uncached_ms": round(uncached_ms, 2),
+            "warm_up_ms": round(warm_up, 1), **metrics}
+
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description="BACH MCP Runtime")
+    parser.add_argument("--bench", action="store_true", help="Latenz-Benchmark ausfuehren")
+    parser.add_argument("--calls", type=int, default=1000)
+    args = parser.parse_args()
+
+    if not args.bench:
+        parser.print_help()
+        return 0
+
+    r = run_benchmark(args.calls)
+    print(f"[BENCH] Kalt (neue App pro Aufruf): {r['cold_ms']} ms  |  Warm-up: {r['warm_up_ms']} ms  |  "
+          f"Warm ohne Cache: {r['warm_uncached_ms']} ms")
+    for name, h in r["tools"].items():
+        print(f"  {name:<16} {h['count']:>6} Aufrufe  mean {h['mean_ms']:>8} ms  "
+              f"p50 <= {h['p50_ms']} ms  p99 <= {h['p99_ms']} ms  Cache {h['cache_hits']}")
+    print(f"  Cache-Trefferquote: {r['cache']['hit_rate']}")
+    return 0
+
+
+if __name__ == "__main__":
+    import sys
+    sys.exit(main())
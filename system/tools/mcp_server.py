@@ -6,9 +6,10 @@ BACH MCP Server v2.0 - Model Context Protocol Integration
 ==========================================================
 
 Stellt BACH-Daten und -Funktionen ueber MCP bereit.
-Nutzt die Handler-Architektur via bach_api statt direktem SQLite-Zugriff.
+Nutzt die Handler-Architektur via bach_api statt direktem SQLite-Zugriff,
+ausgefuehrt ueber eine warme Runtime (tools/mcp_runtime.py).
 
-Resources (8):
+Resources (9):
   bach:/tasks/active      - Aktive Tasks
   bach:/tasks/stats       - Task-Statistiken
   bach:/status            - System-Status
@@ -17,6 +18,7 @@ Resources (8):
   bach:/skills/list       - Registrierte Skills
   bach:/contacts          - Kontakte
   bach:/version           - Server-Version und Capabilities
+  bach:/metrics/latency   - Latenz-Histogramme pro Tool, Cache-Trefferquote
 
 Tools (23):
   Task:     task_create, task_done, task_search, task_list
@@ -50,6 +52,10 @@ Claude Code Config (~/.claude/claude_code_config.json):
   }
 
 Changelog:
+  v2.3.0 - Warme Runtime (tools/mcp_runtime.py): Handler, DB-Pool und Schema
+           bleiben geladen, lesende Ergebnisse gecacht mit Invalidierung
+           ueber core.hooks, Tool-Aufrufe parallel im Thread-Pool
+         - Latenz-Resource (bach:/metrics/latency)
   v2.2.0 - Session-Tools (session_startup, session_shutdown)
          - Partner-Tools (partner_list, partner_status)
          - db_query Table-Whitelist (116 sichere Tabellen)
@@ -63,12 +69,11 @@ Changelog:
   v1.1.0 - Initiale Version mit direktem SQLite
 """
 
-__version__ = "2.2.0"
+__version__ = "2.3.0"
 __author__ = "BACH Team"
 
 import os
 import sys
-import sqlite3
 import logging
 from datetime import datetime
 
@@ -87,11 +92,17 @@ except ImportError:
     print("Danach: python tools/mcp_server.py")
     sys.exit(1)
 
-from bach_api import get_app
+try:
+    from tools.mcp_runtime import MCPRuntime
+except ImportError:
+    from mcp_runtime import MCPRuntime
 
 # Server initialisieren
 mcp = FastMCP("BACH Personal Assistant")
 
+# Warme Laufzeit: Handler, DB-Pool, Schema, Ergebnis-Cache, Latenz-Histogramme
+runtime = MCPRuntime(BACH_SYSTEM, db_path=BACH_DB)
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("bach-mcp")
 
@@ -101,17 +112,13 @@ logger = logging.getLogger("bach-mcp")
 # ------------------------------------------------------------------
 
 def _execute(handler: str, operation: str, args: list = None) -> str:
-    """Fuehrt eine BACH-Handler-Operation via bach_api aus.
+    """Fuehrt eine BACH-Handler-Operation ueber die warme Runtime aus.
 
     Alle Handler-Aufrufe laufen ueber app.execute(), das die Registry,
-    Validierung und Fehlerbehandlung der Handler-Schicht nutzt.
+    Validierung und Fehlerbehandlung der Handler-Schicht nutzt. Lesende
+    Operationen kommen bis zur naechsten Aenderung aus dem Cache.
     """
-    try:
-        app = get_app()
-        success, message = app.execute(handler, operation, args or [])
-        return message
-    except Exception as e:
-        return f"[FEHLER] {handler} {operation}: {e}"
+    return runtime.execute(handler, operation, args)
 
 
 # ------------------------------------------------------------------
@@ -119,34 +126,33 @@ def _execute(handler: str, operation: str, args: list = None) -> str:
 # ------------------------------------------------------------------
 
 @mcp.resource("bach:/tasks/active")
+@runtime.tool
 def get_active_tasks() -> str:
     """Alle offenen/aktiven Tasks aus der BACH-Datenbank."""
     return _execute("task", "list")
 
 
 @mcp.resource("bach:/tasks/stats")
+@runtime.tool
 def get_task_stats() -> str:
     """Task-Statistiken: offen, erledigt, nach Prioritaet."""
     # Eigene Aggregation, da kein Handler eine Stats-Operation hat
     try:
-        conn = sqlite3.connect(BACH_DB)
-        conn.row_factory = sqlite3.Row
-        total = conn.execute("SELECT COUNT(*) FROM tasks").fetchone()[0]
-        done = conn.execute(
-            "SELECT COUNT(*) FROM tasks WHERE status = 'done'"
-        ).fetchone()[0]
-        pending = conn.execute(
-            "SELECT COUNT(*) FROM tasks WHERE status = 'pending'"
-        ).fetchone()[0]
-        by_prio = conn.execute("""
+        counts = runtime.query("""
+            SELECT COUNT(*) AS total,
+                   SUM(status = 'done') AS done,
+                   SUM(status = 'pending') AS pending
+            FROM tasks
+        """, tables={"tasks"})[0]
+        by_prio = runtime.query("""
             SELECT priority, COUNT(*) as cnt
             FROM tasks WHERE status != 'done'
             GROUP BY priority ORDER BY priority
-        """).fetchall()
-        conn.close()
+        """, tables={"tasks"})
 
         lines = [
-            f"Tasks: {total} gesamt, {done} erledigt, {pending} offen",
+            f"Tasks: {counts['total']} gesamt, {counts['done'] or 0} erledigt, "
+            f"{counts['pending'] or 0} offen",
             "",
             "Nach Prioritaet (offen):",
         ]
@@ -158,30 +164,35 @@ def get_task_stats() -> str:
 
 
 @mcp.resource("bach:/status")
+@runtime.tool
 def get_system_status() -> str:
     """BACH System-Status mit Uebersicht."""
     return _execute("status", "run")
 
 
 @mcp.resource("bach:/memory/lessons")
+@runtime.tool
 def get_memory_lessons() -> str:
     """Gelernte Lessons aus dem Memory-System."""
     return _execute("lesson", "list")
 
 
 @mcp.resource("bach:/memory/status")
+@runtime.tool
 def get_memory_status_resource() -> str:
     """Memory-System Uebersicht (Working, Lessons, Facts)."""
     return _execute("memory", "status")
 
 
 @mcp.resource("bach:/skills/list")
+@runtime.tool
 def get_skills_list() -> str:
     """Alle registrierten und aktiven Skills."""
     return _execute("skills", "list")
 
 
 @mcp.resource("bach:/contacts")
+@runtime.tool
 def get_contacts() -> str:
     """Alle aktiven Kontakte."""
     return _execute("contact", "list")
@@ -192,6 +203,7 @@ def get_contacts() -> str:
 # ------------------------------------------------------------------
 
 @mcp.tool()
+@runtime.tool
 def task_create(title: str, priority: str = "P3",
                 category: str = "general",
                 assigned_to: str = "") -> str:
@@ -212,12 +224,14 @@ def task_create(title: str, priority: str = "P3",
 
 
 @mcp.tool()
+@runtime.tool
 def task_done(task_id: int) -> str:
     """Markiert einen Task als erledigt."""
     return _execute("task", "done", [str(task_id)])
 
 
 @mcp.tool()
+@runtime.tool
 def task_search(query: str, status: str = "pending") -> str:
     """Durchsucht Tasks nach Titel oder Beschreibung.
 
@@ -232,6 +246,7 @@ def task_search(query: str, status: str = "pending") -> str:
 
 
 @mcp.tool()
+@runtime.tool
 def task_list(status: str = "pending", priority: str = "") -> str:
     """Listet Tasks auf mit optionalen Filtern.
 
@@ -252,6 +267,7 @@ def task_list(status: str = "pending", priority: str = "") -> str:
 # ------------------------------------------------------------------
 
 @mcp.tool()
+@runtime.tool
 def memory_write(lesson: str, category: str = "general",
                  source: str = "mcp") -> str:
     """Schreibt eine neue Lesson ins Memory-System (Langzeitgedaechtnis).
@@ -268,6 +284,7 @@ def memory_write(lesson: str, category: str = "general",
 
 
 @mcp.tool()
+@runtime.tool
 def memory_note(text: str) -> str:
     """Schreibt eine Notiz ins Working Memory (Kurzzeitgedaechtnis).
 
@@ -278,6 +295,7 @@ def memory_note(text: str) -> str:
 
 
 @mcp.tool()
+@runtime.tool
 def memory_search(query: str) -> str:
     """Durchsucht Lessons und Working Memory nach Stichworten.
 
@@ -290,6 +308,7 @@ def memory_search(query: str) -> str:
 
 
 @mcp.tool()
+@runtime.tool
 def memory_facts(category: str = "", min_confidence: float = 0.0) -> str:
     """Fakten aus dem Memory-System abrufen (verifiziertes Wissen).
 
@@ -304,12 +323,14 @@ def memory_facts(category: str = "", min_confidence: float = 0.0) -> str:
 
 
 @mcp.tool()
+@runtime.tool
 def memory_status() -> str:
     """Zeigt Memory-System Status (Working Memory, Lessons, Facts Counts)."""
     return _execute("memory", "status")
 
 
 @mcp.tool()
+@runtime.tool
 def lesson_search(query: str, category: str = "") -> str:
     """Durchsucht gezielt die Lessons-Datenbank.
 
@@ -328,12 +349,14 @@ def lesson_search(query: str, category: str = "") -> str:
 # ------------------------------------------------------------------
 
 @mcp.tool()
+@runtime.tool
 def backup_create() -> str:
     """Erstellt ein Backup der BACH-Datenbank."""
     return _execute("backup", "create")
 
 
 @mcp.tool()
+@runtime.tool
 def backup_list() -> str:
     """Zeigt alle vorhandenen Backups mit Groesse und Datum."""
     return _execute("backup", "list")
@@ -344,6 +367,7 @@ def backup_list() -> str:
 # ------------------------------------------------------------------
 
 @mcp.tool()
+@runtime.tool
 def steuer_status(jahr: str = "") -> str:
     """Steuer-Status: Posten, Summen und offene Belege fuer ein Jahr.
 
@@ -355,6 +379,7 @@ def steuer_status(jahr: str = "") -> str:
 
 
 @mcp.tool()
+@runtime.tool
 def contact_search(query: str) -> str:
     """Durchsucht Kontakte nach Name, Email, Telefon, Firma.
 
@@ -369,6 +394,7 @@ def contact_search(query: str) -> str:
 # ------------------------------------------------------------------
 
 @mcp.tool()
+@runtime.tool
 def msg_send(recipient: str, text: str) -> str:
     """Sendet eine Nachricht an einen BACH-Partner.
 
@@ -380,12 +406,14 @@ def msg_send(recipient: str, text: str) -> str:
 
 
 @mcp.tool()
+@runtime.tool
 def msg_unread() -> str:
     """Zeigt ungelesene Nachrichten in der BACH-Inbox."""
     return _execute("msg", "unread")
 
 
 @mcp.tool()
+@runtime.tool
 def notify_send(channel: str, text: str) -> str:
     """Sendet eine Benachrichtigung ueber einen konfigurierten Channel.
 
@@ -401,6 +429,7 @@ def notify_send(channel: str, text: str) -> str:
 # ------------------------------------------------------------------
 
 @mcp.tool()
+@runtime.tool
 def session_startup() -> str:
     """Fuehrt das BACH-Startprotokoll aus.
 
@@ -411,6 +440,7 @@ def session_startup() -> str:
 
 
 @mcp.tool()
+@runtime.tool
 def session_shutdown() -> str:
     """Fuehrt das BACH-Shutdown-Protokoll aus.
 
@@ -425,12 +455,14 @@ def session_shutdown() -> str:
 # ------------------------------------------------------------------
 
 @mcp.tool()
+@runtime.tool
 def partner_list() -> str:
     """Listet alle BACH-Partner auf (Human, Local AI, External AI)."""
     return _execute("partner", "list")
 
 
 @mcp.tool()
+@runtime.tool
 def partner_status() -> str:
     """Zeigt den Status aller Partner (aktiv, verfuegbar, Token-Zone)."""
     return _execute("partner", "status")
@@ -441,6 +473,7 @@ def partner_status() -> str:
 # ------------------------------------------------------------------
 
 @mcp.tool()
+@runtime.tool
 def healthcheck() -> str:
     """Fuehrt System-Gesundheitschecks aus (Disk, Netzwerk, DB)."""
     return _execute("healthcheck", "status")
@@ -504,6 +537,7 @@ def _extract_table_names(sql: str) -> set:
 
 
 @mcp.tool()
+@runtime.tool
 def db_query(query: str) -> str:
     """Fuehrt eine SELECT-Query auf der BACH-Datenbank aus (read-only).
 
@@ -529,24 +563,28 @@ def db_query(query: str) -> str:
     if blocked:
         return f"Tabelle(n) nicht erlaubt: {', '.join(sorted(blocked))}"
 
+    # Schema-Metadaten sind warm: unbekannte Tabellen ohne DB-Zugriff abweisen
+    known = {t.lower() for t in runtime.schema()}
+    missing = tables - known if known else set()
+    if missing:
+        return f"Tabelle(n) nicht vorhanden: {', '.join(sorted(missing))}"
+
     try:
-        conn = sqlite3.connect(BACH_DB)
-        conn.row_factory = sqlite3.Row
-        rows = conn.execute(query).fetchall()
-        conn.close()
+        # 51 Zeilen holen, um "weitere" anzeigen zu koennen; gecacht pro Tabelle
+        rows = runtime.query(query, tables=tables, limit=51)
 
         if not rows:
             return "(keine Ergebnisse)"
 
         result_rows = rows[:50]
-        cols = result_rows[0].keys()
+        cols = list(result_rows[0].keys())
         lines = [" | ".join(cols), "-" * 60]
         for r in result_rows:
             vals = [str(r[c]) if r[c] is not None else "" for c in cols]
             lines.append(" | ".join(vals))
 
         if len(rows) > 50:
-            lines.append(f"... ({len(rows) - 50} weitere Zeilen)")
+            lines.append("... (weitere Zeilen, Ausgabe auf 50 begrenzt)")
 
         return "\n".join(lines)
     except Exception as e:
@@ -558,6 +596,7 @@ def db_query(query: str) -> str:
 # ------------------------------------------------------------------
 
 @mcp.resource("bach:/version")
+@runtime.tool
 def get_version_info() -> str:
     """BACH MCP Server Version und Capabilities."""
     db_size = ""
@@ -566,11 +605,11 @@ def get_version_info() -> str:
 
     return "\n".join([
         f"BACH MCP Server v{__version__}",
-        f"Backend: bach_api (Handler-basiert)",
+        f"Backend: bach_api (Handler-basiert, warme Runtime)",
         f"DB: {db_size}",
         "",
         "Capabilities:",
-        f"  Resources: 8",
+        f"  Resources: 9",
         f"  Tools: 23",
         f"  Prompts: 3",
         "",
@@ -580,6 +619,12 @@ def get_version_info() -> str:
     ])
 
 
+@mcp.resource("bach:/metrics/latency")
+def get_latency_metrics() -> str:
+    """Latenz-Histogramme pro Tool (p50/p95/p99) und Cache-Kennzahlen."""
+    return runtime.format_metrics()
+
+
 # ------------------------------------------------------------------
 # Prompts (wiederverwendbare Vorlagen)
 # ------------------------------------------------------------------
@@ -651,5 +696,9 @@ if __name__ == "__main__":
     logger.info(f"  System: {BACH_SYSTEM}")
     logger.info(f"  DB: {BACH_DB}")
     logger.info(f"  Backend: bach_api (Handler-basiert)")
-    logger.info(f"  Resources: 8 | Tools: 23 | Prompts: 3")
-    mcp.run()
+    logger.info(f"  Resources: 9 | Tools: 23 | Prompts: 3")
+    logger.info(f"  Warm-up: {runtime.warm_up():.0f} ms")
+    try:
+        mcp.run()
+    finally:
+        runtime.close()
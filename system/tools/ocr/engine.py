@@ -5,13 +5,29 @@ BACH OCR Engine
 
 Core logic for extracting text from images and PDFs using Tesseract and PyMuPDF.
 Based on tools/c_ocr_engine.py but refactored into a reusable package.
+
+Performance:
+- One Tesseract pass per page: text and confidence both come from
+  image_to_data (previously image_to_string + image_to_data).
+- PDF pages are rendered lazily inside a bounded process pool; each worker
+  renders, OCRs and drops its own page, so only `workers` pixmaps exist at
+  a time. Tesseract's own threading is limited to 1 per worker.
+- DPI is chosen from the page size (small receipts get more pixels, large
+  pages fewer) unless a fixed dpi is passed.
+- Results are cached per page hash (rendered pixels + language) in
+  system/data/ocr_page_cache.db, so re-running a scanned receipt is free.
 """
 
 from __future__ import annotations
 
+import hashlib
+import os
+import sqlite3
 import sys
+import threading
+import time
 from pathlib import Path
-from typing import List, Optional, Union, TYPE_CHECKING
+from typing import Dict, List, Optional, Tuple, Union, TYPE_CHECKING
 from dataclasses import dataclass
 import logging
 
@@ -32,6 +48,177 @@ except ImportError:
     PYMUPDF_AVAILABLE = False
 
 
+OCR_WORKERS = 4                 # max. processes for recognize_pdf
+TARGET_LONG_SIDE_PX = 3508      # A4 at 300 DPI
+MIN_DPI, MAX_DPI = 150, 400
+
+DEFAULT_CACHE_PATH = Path(__file__).resolve().parents[2] / "data" / "ocr_page_cache.db"
+
+
+def choose_dpi(width_pt: float, height_pt: float) -> int:
+    """Render DPI so the long side ends up near TARGET_LONG_SIDE_PX.
+
+    A4 -> 300, receipts/A6 -> up to 400, A3 and larger -> down to 150.
+    """
+    long_side_in = max(width_pt, height_pt) / 72
+    if long_side_in <= 0:
+        return 300
+    return int(round(max(MIN_DPI, min(MAX_DPI, TARGET_LONG_SIDE_PX / long_side_in))))
+
+
+def text_from_data(data: Dict[str, list]) -> Tuple[str, float, int]:
+    """Text, average confidence and word count from one image_to_data result.
+
+    Words are joined per line, lines with newlines and a blank line
+    between paragraphs - the layout image_to_string produces.
+    """
+    lines: List[List[str]] = []
+    last_par = last_line = None
+    confidences = []
+    for i, word in enumerate(data.get("text", [])):
+        try:
+            conf = float(data["conf"][i])
+        except (KeyError, IndexError, TypeError, ValueError):
+            conf = -1.0
+        if conf >= 0:
+            confidences.append(conf)
+        word = (word or "").strip()
+        if not word:
+            continue
+        par = (data["page_num"][i], data["block_num"][i], data["par_num"][i])
+        line = par + (data["line_num"][i],)
+        if line != last_line:
+            if last_par is not None and par != last_par:
+                lines.append([])  # blank line between paragraphs
+            lines.append([])
+            last_par, last_line = par, line
+        lines[-1].append(word)
+    text = "\n".join(" ".join(words) for words in lines)
+    avg_confidence = sum(confidences) / len(confidences) if confidences else 0.0
+    words = sum(len(words) for words in lines)
+    return text, avg_confidence, words
+
+
+class PageCache:
+    """SQLite cache: page hash + language -> OCR text."""
+
+    def __init__(self, db_path: Path):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.db_path), timeout=30.0, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS ocr_page_cache (
+                page_hash TEXT NOT NULL,
+                language TEXT NOT NULL,
+                text TEXT NOT NULL,
+                confidence REAL,
+                word_count INTEGER,
+                ocr_ms REAL,
+                created_at REAL,
+                PRIMARY KEY (page_hash, language)
+            )
+        """)
+        self._conn.commit()
+        self._lock = threading.Lock()
+
+    def get(self, page_hash: str, language: str) -> Optional[Tuple[str, float, int]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT text, confidence, word_count FROM ocr_page_cache "
+                "WHERE page_hash = ? AND language = ?", (page_hash, language)
+            ).fetchone()
+        return (row[0], row[1] or 0.0, row[2] or 0) if row else None
+
+    def put(self, page_hash: str, language: str, text: str, confidence: float,
+            word_count: int, seconds: float = 0.0):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO ocr_page_cache "
+                "(page_hash, language, text, confidence, word_count, ocr_ms, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (page_hash, language, text, confidence, word_count,
+                 round(seconds * 1000, 1), time.time())
+            )
+            self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def _open_cache(cache_path: Optional[Path]) -> Optional[PageCache]:
+    if cache_path is None:
+        return None
+    try:
+        return PageCache(cache_path)
+    except (sqlite3.Error, OSError) as e:
+        logging.warning("OCR page cache unavailable (%s), continuing without", e)
+        return None
+
+
+def _ocr_image(image, language: str) -> Tuple[str, float, int]:
+    """Single Tesseract pass: text + confidence from image_to_data."""
+    data = pytesseract.image_to_data(image, lang=language, output_type=pytesseract.Output.DICT)
+    return text_from_data(data)
+
+
+def _ocr_pdf_page(doc, page_idx: int, language: str, dpi: Optional[int],
+                  cache: Optional[PageCache]) -> tuple:
+    """Render one page, look it up in the cache, OCR on miss.
+
+    Returns (page_idx, page_hash, text, confidence, word_count, cached, seconds, error).
+    """
+    start = time.perf_counter()
+    page_hash = None
+    try:
+        page = doc[page_idx]
+        page_dpi = dpi or choose_dpi(page.rect.width, page.rect.height)
+        zoom = page_dpi / 72
+        pix = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom))
+        samples = getattr(pix, "samples_mv", None) or pix.samples
+        h = hashlib.sha256(f"{pix.width}x{pix.height}:".encode())
+        h.update(samples)
+        page_hash = h.hexdigest()
+
+        hit = cache.get(page_hash, language) if cache is not None else None
+        if hit is not None:
+            return page_idx, page_hash, hit[0], hit[1], hit[2], True, 0.0, None
+
+        img = Image.frombytes("RGB", [pix.width, pix.height], pix.samples)
+        del pix, samples
+        text, confidence, words = _ocr_image(img, language)
+        return (page_idx, page_hash, text, confidence, words, False,
+                time.perf_counter() - start, None)
+    except Exception as e:
+        return page_idx, page_hash, "", 0.0, 0, False, time.perf_counter() - start, str(e)
+
+
+# Per worker process: page cache (read-only use) and the currently open PDF
+_worker: Dict[str, object] = {}
+
+
+def _init_worker(tesseract_cmd: Optional[str], cache_path: Optional[str]):
+    # Tesseract parallelises internally via OpenMP; with one process per
+    # page that only oversubscribes the CPU.
+    os.environ["OMP_THREAD_LIMIT"] = "1"
+    if tesseract_cmd:
+        pytesseract.pytesseract.tesseract_cmd = tesseract_cmd
+    _worker["cache"] = _open_cache(Path(cache_path)) if cache_path else None
+    _worker["path"] = None
+    _worker["doc"] = None
+
+
+def _worker_ocr_page(item: tuple) -> tuple:
+    pdf_path, page_idx, language, dpi = item
+    if _worker.get("path") != pdf_path:
+        if _worker.get("doc") is not None:
+            _worker["doc"].close()
+        _worker["doc"] = fitz.open(pdf_path)
+        _worker["path"] = pdf_path
+    return _ocr_pdf_page(_worker["doc"], page_idx, language, dpi, _worker.get("cache"))
+
+
 @dataclass
 class OCRResult:
     """Result of an OCR operation."""
@@ -58,7 +245,19 @@ class OCREngine:
     
     DEFAULT_LANGUAGE = "deu+eng"
     
-    def __init__(self, tesseract_path: Optional[str] = None):
+    def __init__(self, tesseract_path: Optional[str] = None,
+                 cache_path: Optional[Path] = DEFAULT_CACHE_PATH,
+                 workers: int = OCR_WORKERS):
+        """
+        Args:
+            tesseract_path: Explicit tesseract executable
+            cache_path: SQLite page cache (None = no cache)
+            workers: Max. processes for recognize_pdf (1 = sequential)
+        """
+        self.cache_path = Path(cache_path) if cache_path is not None else None
+        self.workers = workers
+        self._cache: Optional[PageCache] = None
+        self._cache_opened = False
         if tesseract_path:
             pytesseract.pytesseract.tesseract_cmd = tesseract_path
         elif sys.platform == "win32":
@@ -89,6 +288,14 @@ class OCREngine:
 
         self.available = self._check_tesseract()
         
+    @property
+    def cache(self) -> Optional[PageCache]:
+        """Page cache, opened on first use."""
+        if not self._cache_opened:
+            self._cache = _open_cache(self.cache_path)
+            self._cache_opened = True
+        return self._cache
+
     def _check_tesseract(self) -> bool:
         if not TESSERACT_AVAILABLE:
             return False
@@ -122,27 +329,36 @@ class OCREngine:
             return f"[Error: Unsupported format {suffix}]"
 
     def recognize_image(self, image_path: str, language: str = DEFAULT_LANGUAGE) -> OCRResult:
-        """Recognizes text in an image file."""
+        """Recognizes text in an image file (cached by file content)."""
         if not self.available:
             return OCRResult(False, "", error="Tesseract not available")
-        
+
         try:
+            image_hash = None
+            if self.cache is not None:
+                h = hashlib.sha256(b"image:")
+                with open(image_path, "rb") as f:
+                    for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                        h.update(chunk)
+                image_hash = h.hexdigest()
+                hit = self.cache.get(image_hash, language)
+                if hit is not None:
+                    return OCRResult(True, hit[0], confidence=hit[1], language=language)
+
             image = Image.open(image_path)
-            return self._recognize_pil_image(image, language)
+            start = time.perf_counter()
+            result = self._recognize_pil_image(image, language)
+            if result.success and image_hash is not None:
+                self.cache.put(image_hash, language, result.text, result.confidence,
+                               len(result.text.split()), time.perf_counter() - start)
+            return result
         except Exception as e:
             return OCRResult(False, "", error=str(e))
 
     def _recognize_pil_image(self, image: Image.Image, language: str) -> OCRResult:
-        """Internal: OCR on PIL Image object."""
+        """Internal: OCR on PIL Image object (one Tesseract pass)."""
         try:
-            text = pytesseract.image_to_string(image, lang=language)
-            
-            # Confidence calculation
-            data = pytesseract.image_to_data(image, lang=language, output_type=pytesseract.Output.DICT)
-            # Filter layout blocks (-1) and calculate average confidence
-            confidences = [int(c) for c in data['conf'] if c != -1]
-            avg_confidence = sum(confidences) / len(confidences) if confidences else 0.0
-            
+            text, avg_confidence, _ = _ocr_image(image, language)
             return OCRResult(
                 success=True,
                 text=text.strip(),
@@ -152,10 +368,18 @@ class OCREngine:
         except Exception as e:
             return OCRResult(False, "", error=str(e))
 
-    def recognize_pdf(self, pdf_path: str, language: str = DEFAULT_LANGUAGE, pages: Optional[List[int]] = None) -> List[OCRPageResult]:
+    def recognize_pdf(self, pdf_path: str, language: str = DEFAULT_LANGUAGE, pages: Optional[List[int]] = None,
+                      dpi: Optional[int] = None, workers: Optional[int] = None) -> List[OCRPageResult]:
         """
         Recognizes text in a PDF by rendering pages to images.
         Requires PyMuPDF.
+
+        Args:
+            pdf_path: PDF file
+            language: Tesseract language(s)
+            pages: 1-based page numbers (default: all)
+            dpi: Fixed render DPI (default: choose_dpi per page)
+            workers: Max. processes (default: self.workers)
         """
         if not self.available:
             return []
@@ -164,45 +388,65 @@ class OCREngine:
             # Fallback could be added here, but PyMuPDF is preferred
             return [OCRPageResult(0, "[Error: PyMuPDF not available]", 0.0, 0)]
         
-        results = []
         try:
             doc = fitz.open(pdf_path)
+        except Exception as e:
+            return [OCRPageResult(0, f"[Error processing PDF: {e}]", 0.0, 0)]
+
+        results = []
+        try:
             # FitZ pages are 0-indexed, but valid range check uses count
-            page_indices = [p-1 for p in pages] if pages else range(doc.page_count)
-            
-            for page_idx in page_indices:
-                if page_idx < 0 or page_idx >= doc.page_count:
+            page_indices = [p - 1 for p in pages] if pages else range(doc.page_count)
+            page_indices = [i for i in page_indices if 0 <= i < doc.page_count]
+
+            for page_idx, page_hash, text, confidence, words, cached, seconds, error in \
+                    self._map_pages(doc, str(pdf_path), page_indices, language, dpi, workers):
+                if error is not None:
+                    logging.warning("OCR failed for %s page %d: %s", pdf_path, page_idx + 1, error)
                     continue
-                
-                page = doc[page_idx]
-                
-                # Render page to image (300 DPI is usually good for OCR)
-                # 72 points per inch -> 300/72 scale factor
-                zoom = 300 / 72
-                mat = fitz.Matrix(zoom, zoom)
-                pix = page.get_pixmap(matrix=mat)
-                
-                # Convert to PIL Image
-                # PyMuPDF's pix.samples is bytes
-                img = Image.frombytes("RGB", [pix.width, pix.height], pix.samples)
-                
-                # Perform OCR
-                result = self._recognize_pil_image(img, language)
-                
-                if result.success:
-                    results.append(OCRPageResult(
-                        page_num=page_idx + 1,
-                        text=result.text,
-                        confidence=result.confidence,
-                        word_count=len(result.text.split())
-                    ))
-            
-            doc.close()
+                if not cached and page_hash and self.cache is not None:
+                    try:
+                        self.cache.put(page_hash, language, text, confidence, words, seconds)
+                    except sqlite3.Error:
+                        pass  # cache is optional
+                results.append(OCRPageResult(
+                    page_num=page_idx + 1,
+                    text=text.strip(),
+                    confidence=confidence,
+                    word_count=words
+                ))
         except Exception as e:
             # Log error or return partial results
             results.append(OCRPageResult(0, f"[Error processing PDF: {e}]", 0.0, 0))
-            
+        finally:
+            doc.close()
+
         return results
 
+    def _map_pages(self, doc, pdf_path: str, page_indices: List[int], language: str,
+                   dpi: Optional[int], workers: Optional[int]):
+        """Yields _ocr_pdf_page results in page order; process pool when worthwhile."""
+        workers = min(workers or self.workers, os.cpu_count() or 1, len(page_indices))
+        if workers <= 1:
+            for page_idx in page_indices:
+                yield _ocr_pdf_page(doc, page_idx, language, dpi, self.cache)
+            return
+
+        import pickle
+        from concurrent.futures import ProcessPoolExecutor
+        cache_path = str(self.cache_path) if self.cache is not None else None
+        items = [(pdf_path, page_idx, language, dpi) for page_idx in page_indices]
+        done = 0
+        try:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                     initargs=(pytesseract.pytesseract.tesseract_cmd, cache_path)) as pool:
+                for result in pool.map(_worker_ocr_page, items):
+                    done += 1
+                    yield result
+        except (OSError, RuntimeError, ImportError, pickle.PicklingError):
+            # No process pool available (restricted env): continue sequentially
+            for page_idx in page_indices[done:]:
+                yield _ocr_pdf_page(doc, page_idx, language, dpi, self.cache)
+
 def get_engine() -> OCREngine:
     return OCREngine()
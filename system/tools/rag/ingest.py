@@ -6,7 +6,14 @@ ingest.py - BACH RAG Ingestion Pipeline
 ========================================
 
 Scannt BACH-Verzeichnisse, chunked Dokumente und speichert
-Embeddings in ChromaDB via Ollama.
+Embeddings via Ollama in ChromaDB oder im eingebetteten Vektor-Index
+(vector_store.py, ohne ChromaDB).
+
+Pipeline: Chunks mehrerer Dateien werden gesammelt und in Batches an
+/api/embed geschickt (mehrere Requests parallel). Ein Embedding-Cache
+(SHA-256 des Chunk-Texts) verhindert, dass unveraenderte Chunks erneut
+eingebettet werden. Eine Fortschrittsdatei macht abgebrochene Laeufe
+fortsetzbar.
 
 Usage:
     python tools/rag/ingest.py                    # Alles indexieren
@@ -14,18 +21,25 @@ Usage:
     python tools/rag/ingest.py --source help      # Nur docs/help/
     python tools/rag/ingest.py --status            # Index-Status
     python tools/rag/ingest.py --reset             # Index loeschen
+    python tools/rag/ingest.py --batch-size 64 --concurrency 4
+    python tools/rag/ingest.py --store builtin    # Ohne ChromaDB
 
 Voraussetzungen:
-    pip install chromadb
     ollama pull nomic-embed-text
+    optional: pip install chromadb | pip install numpy (schneller builtin-Index)
 """
 
 import os
 import sys
 import json
+import time
+import array
+import sqlite3
 import hashlib
 import argparse
 import re
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
 from typing import List, Dict, Optional
@@ -52,21 +66,38 @@ CHUNK_OVERLAP = 50     # Ueberlappung
 EMBEDDING_MODEL = "nomic-embed-text"
 COLLECTION_NAME = "bach_knowledge"
 
-
-def check_dependencies():
-    """Prueft ob ChromaDB und Ollama verfuegbar sind."""
+# Embedding-Pipeline
+OLLAMA_URL = os.environ.get("OLLAMA_HOST", "http://localhost:11434")
+if "://" not in OLLAMA_URL:
+    OLLAMA_URL = f"http://{OLLAMA_URL}"
+EMBED_BATCH_SIZE = 64      # Chunks pro /api/embed Request
+EMBED_CONCURRENCY = 4      # Parallele Requests
+EMBED_TIMEOUT = 120        # Sekunden pro Batch-Request
+EMBED_RETRIES = 2
+FLUSH_CHUNKS = 512         # Chunks sammeln, bevor eingebettet und gespeichert wird
+EMBED_CACHE_PATH = VECTOR_DIR / "embedding_cache.db"
+PROGRESS_PATH = VECTOR_DIR / "ingest_progress.json"
+
+try:
+    from .vector_store import open_collection
+except ImportError:
+    from vector_store import open_collection
+
+
+def check_dependencies(store: str = "auto"):
+    """Prueft ob ChromaDB (nur bei --store chroma) und Ollama verfuegbar sind."""
     errors = []
 
-    try:
-        import chromadb
-    except ImportError:
-        errors.append("ChromaDB nicht installiert: pip install chromadb")
+    if store == "chroma":
+        try:
+            import chromadb
+        except ImportError:
+            errors.append("ChromaDB nicht installiert: pip install chromadb")
 
     try:
-        import requests
-        r = requests.get("http:/localhost:11434/api/tags", timeout=3)
-        if r.status_code != 200:
-            errors.append("Ollama laeuft nicht: ollama serve")
+        with urllib.request.urlopen(f"{OLLAMA_URL}/api/tags", timeout=3) as r:
+            if r.status != 200:
+                errors.append("Ollama laeuft nicht: ollama serve")
     except Exception:
         errors.append("Ollama nicht erreichbar: ollama serve")
 
@@ -139,109 +170,302 @@ def scan_source(source_path: Path) -> List[Path]:
     return sorted(files)
 
 
+def _post_embed(texts: List[str], url: str = OLLAMA_URL, model: str = EMBEDDING_MODEL,
+                timeout: int = EMBED_TIMEOUT) -> List[List[float]]:
+    """Ein /api/embed Request fuer mehrere Texte. Wirft bei Fehlern."""
+    payload = json.dumps({"model": model, "input": texts}).encode("utf-8")
+    req = urllib.request.Request(f"{url}/api/embed", data=payload,
+                                 headers={"Content-Type": "application/json"})
+    with urllib.request.urlopen(req, timeout=timeout) as resp:
+        embeddings = json.loads(resp.read().decode("utf-8")).get("embeddings") or []
+    if len(embeddings) != len(texts):
+        raise ValueError(f"{len(embeddings)} Embeddings fuer {len(texts)} Texte")
+    return embeddings
+
+
 def get_embedding(text: str) -> Optional[List[float]]:
     """Holt Embedding via Ollama API."""
-    import requests
     try:
-        resp = requests.post(
-            "http:/localhost:11434/api/embed",
-            json={"model": EMBEDDING_MODEL, "input": text},
-            timeout=30
-        )
-        if resp.status_code == 200:
-            return resp.json().get("embeddings", [[]])[0]
+        return _post_embed([text], timeout=30)[0]
     except Exception as e:
         print(f"  [WARN] Ollama-Fehler: {e}")
     return None
 
 
-def ingest_file(filepath: Path, collection) -> int:
-    """Indexiert eine Datei in ChromaDB."""
+class EmbeddingCache:
+    """Persistenter Embedding-Cache (SQLite), Schluessel = SHA-256(Modell + Text).
+
+    Vektoren werden als float32-Blob gespeichert (wie in ChromaDB).
+    """
+
+    def __init__(self, path: Path, model: str = EMBEDDING_MODEL):
+        self.model = model
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(path))
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS embeddings (
+                key TEXT PRIMARY KEY,
+                vector BLOB NOT NULL
+            )
+        """)
+
+    def key(self, text: str) -> str:
+        return hashlib.sha256(f"{self.model}\0{text}".encode("utf-8")).hexdigest()
+
+    def get_many(self, keys: List[str]) -> Dict[str, List[float]]:
+        found = {}
+        for i in range(0, len(keys), 500):
+            part = keys[i:i + 500]
+            rows = self.conn.execute(
+                f"SELECT key, vector FROM embeddings WHERE key IN ({','.join('?' * len(part))})",
+                part).fetchall()
+            for key, blob in rows:
+                vec = array.array("f")
+                vec.frombytes(blob)
+                found[key] = vec.tolist()
+        return found
+
+    def put_many(self, items: Dict[str, List[float]]):
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)",
+            [(k, array.array("f", v).tobytes()) for k, v in items.items()])
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
+
+
+class Embedder:
+    """Batcht Texte fuer /api/embed, schickt Batches parallel, nutzt den Cache."""
+
+    def __init__(self, url: str = OLLAMA_URL, model: str = EMBEDDING_MODEL,
+                 batch_size: int = EMBED_BATCH_SIZE, concurrency: int = EMBED_CONCURRENCY,
+                 cache: Optional[EmbeddingCache] = None):
+        self.url = url
+        self.model = model
+        self.batch_size = max(1, batch_size)
+        self.cache = cache
+        self._pool = ThreadPoolExecutor(max_workers=max(1, concurrency),
+                                        thread_name_prefix="bach-embed")
+        self.stats = {"requests": 0, "embedded": 0, "cache_hits": 0, "failed": 0}
+
+    def _embed_batch(self, texts: List[str]) -> Optional[List[List[float]]]:
+        for attempt in range(EMBED_RETRIES + 1):
+            try:
+                return _post_embed(texts, self.url, self.model)
+            except Exception as e:
+                if attempt == EMBED_RETRIES:
+                    print(f"  [WARN] Ollama-Fehler ({len(texts)} Chunks): {e}")
+                    return None
+                time.sleep(0.5 * (attempt + 1))
+
+    def embed(self, texts: List[str]) -> List[Optional[List[float]]]:
+        """Embeddings fuer texts (None wo der Request fehlschlug)."""
+        unique = list(dict.fromkeys(texts))
+        vectors: Dict[str, List[float]] = {}
+
+        if self.cache is not None:
+            keys = {t: self.cache.key(t) for t in unique}
+            cached = self.cache.get_many(list(keys.values()))
+            for t in unique:
+                if keys[t] in cached:
+                    vectors[t] = cached[keys[t]]
+            self.stats["cache_hits"] += len(vectors)
+
+        missing = [t for t in unique if t not in vectors]
+        batches = [missing[i:i + self.batch_size] for i in range(0, len(missing), self.batch_size)]
+        self.stats["requests"] += len(batches)
+        fresh = {}
+        for batch, result in zip(batches, self._pool.map(self._embed_batch, batches)):
+            if result is None:
+                self.stats["failed"] += len(batch)
+                continue
+            fresh.update(zip(batch, result))
+        self.stats["embedded"] += len(fresh)
+        vectors.update(fresh)
+
+        if self.cache is not None and fresh:
+            self.cache.put_many({keys[t]: v for t, v in fresh.items()})
+
+        return [vectors.get(t) for t in texts]
+
+    def close(self):
+        self._pool.shutdown(wait=True)
+        if self.cache is not None:
+            self.cache.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class IngestProgress:
+    """Fortschrittsdatei: {rel_path: file_hash} vollstaendig indexierter Dateien."""
+
+    def __init__(self, path: Path, model: str = EMBEDDING_MODEL):
+        self.path = path
+        self.model = model
+        self.files: Dict[str, str] = {}
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+            if data.get("model") == model:
+                self.files = data.get("files", {})
+        except (OSError, ValueError):
+            pass
+
+    def is_done(self, rel_path: str, file_hash: str) -> bool:
+        return self.files.get(rel_path) == file_hash
+
+    def mark(self, rel_path: str, file_hash: str):
+        self.files[rel_path] = file_hash
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(json.dumps({"model": self.model, "files": self.files}), encoding="utf-8")
+        os.replace(tmp, self.path)
+
+
+def _prepare_file(filepath: Path, collection, progress: Optional[IngestProgress]) -> Optional[Dict]:
+    """Liest und chunked eine geaenderte Datei. None wenn unveraendert/leer."""
     rel_path = str(filepath.relative_to(BASE_DIR)).replace("\\", "/")
     file_hash = get_file_hash(filepath)
 
+    if progress is not None and progress.is_done(rel_path, file_hash):
+        return None
+
     # Pruefen ob Datei bereits mit gleichem Hash indexiert ist
+    old_ids = []
     existing = collection.get(where={"source": rel_path})
     if existing and existing["metadatas"]:
         if any(m.get("file_hash") == file_hash for m in existing["metadatas"]):
-            return 0  # Keine Aenderung
-        # Alte Eintraege loeschen (Datei geaendert)
-        if existing["ids"]:
-            collection.delete(ids=existing["ids"])
+            if progress is not None:
+                progress.mark(rel_path, file_hash)
+            return None  # Keine Aenderung
+        old_ids = existing["ids"] or []
 
     # Datei lesen
     try:
         content = filepath.read_text(encoding="utf-8", errors="replace")
     except Exception as e:
         print(f"  [WARN] Kann {rel_path} nicht lesen: {e}")
-        return 0
-
-    if not content.strip():
-        return 0
+        return None
 
     # Bereinigen und chunken
     if filepath.suffix == ".md":
         content = clean_markdown(content)
 
-    chunks = chunk_text(content)
-
-    # Embeddings generieren und speichern
-    ids = []
-    documents = []
-    metadatas = []
-    embeddings = []
+    return {
+        "rel_path": rel_path,
+        "file_hash": file_hash,
+        "file_type": filepath.suffix,
+        "chunks": chunk_text(content) if content.strip() else [],
+        "old_ids": old_ids,
+    }
+
+
+def _flush(pending: List[Dict], collection, embedder: Embedder,
+           progress: Optional[IngestProgress], on_file=None) -> int:
+    """Bettet alle gesammelten Chunks ein und schreibt sie dateiweise in ChromaDB."""
+    texts = [c for item in pending for c in item["chunks"]]
+    vectors = iter(embedder.embed(texts))
+    added = 0
+
+    for item in pending:
+        embeddings = [next(vectors) for _ in item["chunks"]]
+        if any(e is None for e in embeddings):
+            # Datei bleibt unvollstaendig -> beim naechsten Lauf erneut (Cache greift)
+            continue
 
-    for i, chunk in enumerate(chunks):
-        chunk_id = f"{rel_path}::chunk_{i}"
-        embedding = get_embedding(chunk)
-        if embedding is None:
+        if item["old_ids"]:
+            collection.delete(ids=item["old_ids"])
+
+        if item["chunks"]:
+            now = datetime.now().isoformat()
+            total = len(item["chunks"])
+            collection.add(
+                ids=[f"{item['rel_path']}::chunk_{i}" for i in range(total)],
+                documents=item["chunks"],
+                metadatas=[{
+                    "source": item["rel_path"],
+                    "chunk_index": i,
+                    "total_chunks": total,
+                    "file_hash": item["file_hash"],
+                    "file_type": item["file_type"],
+                    "indexed_at": now,
+                } for i in range(total)],
+                embeddings=embeddings,
+            )
+            added += total
+            if on_file:
+                on_file(item["rel_path"], total)
+
+        if progress is not None:
+            progress.mark(item["rel_path"], item["file_hash"])
+
+    if progress is not None:
+        progress.save()
+    return added
+
+
+def ingest_files(files: List[Path], collection, embedder: Embedder,
+                 progress: Optional[IngestProgress] = None,
+                 flush_chunks: int = FLUSH_CHUNKS, on_file=None) -> int:
+    """Streaming-Ingest: sammelt Chunks ueber Dateien hinweg und bettet sie gebatcht ein.
+
+    Returns:
+        Anzahl neu gespeicherter Chunks
+    """
+    pending: List[Dict] = []
+    pending_chunks = 0
+    added = 0
+
+    for filepath in files:
+        item = _prepare_file(filepath, collection, progress)
+        if item is None:
             continue
+        pending.append(item)
+        pending_chunks += len(item["chunks"])
+        if pending_chunks >= flush_chunks:
+            added += _flush(pending, collection, embedder, progress, on_file)
+            pending, pending_chunks = [], 0
+
+    if pending:
+        added += _flush(pending, collection, embedder, progress, on_file)
+    elif progress is not None:
+        progress.save()
+    return added
 
-        ids.append(chunk_id)
-        documents.append(chunk)
-        metadatas.append({
-            "source": rel_path,
-            "chunk_index": i,
-            "total_chunks": len(chunks),
-            "file_hash": file_hash,
-            "file_type": filepath.suffix,
-            "indexed_at": datetime.now().isoformat(),
-        })
-        embeddings.append(embedding)
-
-    if ids:
-        collection.add(
-            ids=ids,
-            documents=documents,
-            metadatas=metadatas,
-            embeddings=embeddings,
-        )
-
-    return len(ids)
-
-
-def show_status():
-    """Zeigt den aktuellen Index-Status."""
-    try:
-        import chromadb
-    except ImportError:
-        print("[FEHLER] ChromaDB nicht installiert: pip install chromadb")
-        return
 
+def ingest_file(filepath: Path, collection) -> int:
+    """Indexiert eine Datei in ChromaDB."""
+    with Embedder(cache=EmbeddingCache(EMBED_CACHE_PATH)) as embedder:
+        return ingest_files([filepath], collection, embedder)
+
+
+def _progress_path(backend: str) -> Path:
+    """Fortschrittsdatei pro Backend (chroma/builtin)."""
+    return PROGRESS_PATH.with_name(f"{PROGRESS_PATH.stem}_{backend}.json")
+
+
+def show_status(store: str = "auto"):
+    """Zeigt den aktuellen Index-Status."""
     if not VECTOR_DIR.exists():
         print("Kein Vector Store vorhanden.")
         print("Fuehre zuerst 'python tools/rag/ingest.py' aus.")
         return
 
-    client = chromadb.PersistentClient(path=str(VECTOR_DIR))
-
     try:
-        collection = client.get_collection(COLLECTION_NAME)
+        collection, backend = open_collection(store, COLLECTION_NAME, create=False)
         count = collection.count()
         print(f"BACH RAG Index Status")
         print(f"=====================")
         print(f"  Chunks indexiert:  {count}")
-        print(f"  Speicherort:       {VECTOR_DIR}")
+        print(f"  Speicherort:       {VECTOR_DIR} ({backend})")
         print(f"  Embedding Model:   {EMBEDDING_MODEL}")
 
         if count > 0:
@@ -259,26 +483,32 @@ def show_status():
             for d, c in sorted(by_dir.items()):
                 print(f"    {d}/: {c} Dateien")
 
+    except ImportError:
+        print("[FEHLER] ChromaDB nicht installiert: pip install chromadb")
     except Exception:
         print("Keine Collection vorhanden.")
         print("Fuehre zuerst 'python tools/rag/ingest.py' aus.")
 
 
-def reset_index():
+def reset_index(store: str = "auto"):
     """Loescht den gesamten Index."""
+    if not VECTOR_DIR.exists():
+        print("Kein Vector Store vorhanden.")
+        return
+
     try:
-        import chromadb
+        collection, backend = open_collection(store, COLLECTION_NAME)
     except ImportError:
         print("[FEHLER] ChromaDB nicht installiert")
         return
 
-    if not VECTOR_DIR.exists():
-        print("Kein Vector Store vorhanden.")
-        return
-
-    client = chromadb.PersistentClient(path=str(VECTOR_DIR))
+    _progress_path(backend).unlink(missing_ok=True)  # Embedding-Cache bleibt erhalten
     try:
-        client.delete_collection(COLLECTION_NAME)
+        if backend == "builtin":
+            collection.drop()
+        else:
+            import chromadb
+            chromadb.PersistentClient(path=str(VECTOR_DIR)).delete_collection(COLLECTION_NAME)
         print("[OK] Index geloescht.")
     except Exception:
         print("Keine Collection zum Loeschen vorhanden.")
@@ -290,34 +520,37 @@ def main():
                         default="all", help="Quell-Verzeichnis")
     parser.add_argument("--status", action="store_true", help="Index-Status anzeigen")
     parser.add_argument("--reset", action="store_true", help="Index loeschen")
+    parser.add_argument("--batch-size", type=int, default=EMBED_BATCH_SIZE,
+                        help="Chunks pro Embedding-Request")
+    parser.add_argument("--concurrency", type=int, default=EMBED_CONCURRENCY,
+                        help="Parallele Embedding-Requests")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Embedding-Cache nicht verwenden")
+    parser.add_argument("--store", choices=["auto", "chroma", "builtin"], default="auto",
+                        help="Vektor-Backend (auto: ChromaDB falls installiert)")
 
     args = parser.parse_args()
 
     if args.status:
-        show_status()
+        show_status(args.store)
         return
 
     if args.reset:
-        reset_index()
+        reset_index(args.store)
         return
 
     # Dependencies pruefen
-    errors = check_dependencies()
+    errors = check_dependencies(args.store)
     if errors:
         print("[FEHLER] Voraussetzungen nicht erfuellt:")
         for e in errors:
             print(f"  - {e}")
         sys.exit(1)
 
-    import chromadb
-
-    # ChromaDB initialisieren
+    # Vektor-Backend initialisieren
     VECTOR_DIR.mkdir(parents=True, exist_ok=True)
-    client = chromadb.PersistentClient(path=str(VECTOR_DIR))
-    collection = client.get_or_create_collection(
-        name=COLLECTION_NAME,
-        metadata={"embedding_model": EMBEDDING_MODEL}
-    )
+    collection, backend = open_collection(args.store, COLLECTION_NAME,
+                                          metadata={"embedding_model": EMBEDDING_MODEL})
 
     # Quellen bestimmen
     if args.source == "all":
@@ -328,26 +561,34 @@ def main():
     print(f"BACH RAG Indexierung")
     print(f"====================")
     print(f"Model: {EMBEDDING_MODEL}")
-    print(f"Store: {VECTOR_DIR}")
+    print(f"Store: {VECTOR_DIR} ({backend})")
     print()
 
     total_files = 0
     total_chunks = 0
+    started = time.time()
+
+    cache = None if args.no_cache else EmbeddingCache(EMBED_CACHE_PATH)
+    progress = IngestProgress(_progress_path(backend))
 
-    for name, path in sources.items():
-        files = scan_source(path)
-        print(f"[{name}] {len(files)} Dateien gefunden")
+    def on_file(rel, count):
+        print(f"  + {rel} ({count} Chunks)")
 
-        for filepath in files:
-            rel = filepath.relative_to(BASE_DIR)
-            chunks_added = ingest_file(filepath, collection)
-            if chunks_added > 0:
-                print(f"  + {rel} ({chunks_added} Chunks)")
-                total_chunks += chunks_added
-            total_files += 1
+    with Embedder(batch_size=args.batch_size, concurrency=args.concurrency,
+                  cache=cache) as embedder:
+        for name, path in sources.items():
+            files = scan_source(path)
+            print(f"[{name}] {len(files)} Dateien gefunden")
+            total_chunks += ingest_files(files, collection, embedder, progress,
+                                         on_file=on_file)
+            total_files += len(files)
+        stats = embedder.stats
 
+    elapsed = time.time() - started
     print()
     print(f"Fertig: {total_files} Dateien verarbeitet, {total_chunks} neue Chunks indexiert")
+    print(f"Embeddings: {stats['embedded']} neu, {stats['cache_hits']} aus Cache, "
+          f"{stats['failed']} fehlgeschlagen, {stats['requests']} Requests, {elapsed:.1f}s")
     print(f"Gesamt im Index: {collection.count()} Chunks")
 
 
@@ -13,15 +13,15 @@ Usage:
     python tools/rag/search.py "Steuer-Workflow" --sources
 
 Voraussetzungen:
-    pip install chromadb
     ollama pull nomic-embed-text
     Vorher: python tools/rag/ingest.py
+    optional: pip install chromadb (sonst eingebetteter Vektor-Index)
 """
 
 import sys
 import argparse
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import List, Dict
 
 BASE_DIR = Path(__file__).parent.parent.parent
 DATA_DIR = BASE_DIR / "data"
@@ -30,31 +30,17 @@ VECTOR_DIR = DATA_DIR / "vector_store"
 EMBEDDING_MODEL = "nomic-embed-text"
 COLLECTION_NAME = "bach_knowledge"
 
+try:
+    from .ingest import get_embedding
+    from .vector_store import open_collection
+except ImportError:
+    from ingest import get_embedding
+    from vector_store import open_collection
 
-def get_embedding(text: str) -> Optional[List[float]]:
-    """Holt Embedding via Ollama API."""
-    import requests
-    try:
-        resp = requests.post(
-            "http:/localhost:11434/api/embed",
-            json={"model": EMBEDDING_MODEL, "input": text},
-            timeout=30
-        )
-        if resp.status_code == 200:
-            return resp.json().get("embeddings", [[]])[0]
-    except Exception as e:
-        print(f"[FEHLER] Ollama nicht erreichbar: {e}")
-    return None
-
-
-def search(query: str, top_k: int = 3, show_sources: bool = False) -> List[Dict]:
-    """Fuehrt semantische Suche durch."""
-    try:
-        import chromadb
-    except ImportError:
-        print("[FEHLER] ChromaDB nicht installiert: pip install chromadb")
-        return []
 
+def search(query: str, top_k: int = 3, show_sources: bool = False,
+           store: str = "auto") -> List[Dict]:
+    """Fuehrt semantische Suche durch."""
     if not VECTOR_DIR.exists():
         print("[FEHLER] Kein Index vorhanden. Erst: python tools/rag/ingest.py")
         return []
@@ -64,10 +50,12 @@ def search(query: str, top_k: int = 3, show_sources: bool = False) -> List[Dict]
     if query_embedding is None:
         return []
 
-    # ChromaDB abfragen
-    client = chromadb.PersistentClient(path=str(VECTOR_DIR))
+    # Collection (Client/Store wird pro Prozess wiederverwendet)
     try:
-        collection = client.get_collection(COLLECTION_NAME)
+        collection, _ = open_collection(store, COLLECTION_NAME, create=False)
+    except ImportError:
+        print("[FEHLER] ChromaDB nicht installiert: pip install chromadb")
+        return []
     except Exception:
         print("[FEHLER] Collection nicht vorhanden. Erst: python tools/rag/ingest.py")
         return []
@@ -122,6 +110,8 @@ def main():
     parser.add_argument("query", nargs="?", help="Suchanfrage")
     parser.add_argument("--top", type=int, default=3, help="Anzahl Ergebnisse (default: 3)")
     parser.add_argument("--sources", action="store_true", help="Quell-Details anzeigen")
+    parser.add_argument("--store", choices=["auto", "chroma", "builtin"], default="auto",
+                        help="Vektor-Backend (auto: ChromaDB falls installiert)")
 
     args = parser.parse_args()
 
@@ -130,7 +120,7 @@ def main():
         print("       python tools/rag/search.py \"Suchanfrage\" --top 5 --sources")
         return
 
-    search(args.query, top_k=args.top, show_sources=args.sources)
+    search(args.query, top_k=args.top, show_sources=args.sources, store=args.store)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,538 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# SPDX-License-Identifier: MIT
+"""
+vector_store.py - Eingebetteter Vektor-Index fuer BACH RAG
+===========================================================
+
+Leichtgewichtiger Ersatz fuer ChromaDB:
+    - Vektoren: float32, L2-normiert, append-only in data/vector_store/<name>.f32
+      (memory-mapped gelesen)
+    - Metadaten: Tabellen rag_vectors / rag_vector_collections in bach.db
+    - Suche: Brute-Force Top-k Cosine (NumPy-vektorisiert, ohne NumPy
+      reiner Python-Fallback), optional IVF-Grobquantisierer fuer grosse
+      Korpora (build_ivf, nur mit NumPy)
+
+Die API ist eine Teilmenge der ChromaDB-Collection (add/get/delete/query/
+count), damit ingest.py und search.py beide Backends gleich benutzen.
+
+Usage:
+    python tools/rag/vector_store.py --status
+    python tools/rag/vector_store.py --build-ivf [--nlist 256]
+    python tools/rag/vector_store.py --compact
+"""
+
+import os
+import sys
+import json
+import mmap
+import math
+import sqlite3
+import argparse
+import threading
+from array import array
+from datetime import datetime
+from operator import mul
+from pathlib import Path
+from typing import Dict, List, Optional
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+BASE_DIR = Path(__file__).parent.parent.parent
+DATA_DIR = BASE_DIR / "data"
+VECTOR_DIR = DATA_DIR / "vector_store"
+DB_PATH = DATA_DIR / "bach.db"
+
+DEFAULT_COLLECTION = "bach_knowledge"
+IVF_NPROBE = 8            # Anzahl durchsuchter Cluster pro Anfrage
+IVF_MIN_ROWS = 20000      # Darunter lohnt IVF nicht (Brute-Force ist schnell genug)
+IVF_TRAIN_SAMPLE = 50000  # Max. Vektoren fuer k-Means-Training
+
+SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS rag_vector_collections (
+    name TEXT PRIMARY KEY,
+    dim INTEGER NOT NULL,
+    rows INTEGER NOT NULL DEFAULT 0,
+    nlist INTEGER NOT NULL DEFAULT 0,
+    version INTEGER NOT NULL DEFAULT 0,
+    updated_at TEXT
+);
+CREATE TABLE IF NOT EXISTS rag_vectors (
+    collection TEXT NOT NULL,
+    row_idx INTEGER NOT NULL,
+    doc_id TEXT NOT NULL,
+    source TEXT,
+    document TEXT,
+    metadata TEXT,
+    cluster INTEGER,
+    PRIMARY KEY (collection, row_idx)
+);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_rag_vectors_doc ON rag_vectors(collection, doc_id);
+CREATE INDEX IF NOT EXISTS idx_rag_vectors_source ON rag_vectors(collection, source);
+"""
+
+
+def _normalize(vec) -> List[float]:
+    norm = math.sqrt(sum(x * x for x in vec)) or 1.0
+    return [x / norm for x in vec]
+
+
+class VectorStore:
+    """Vektor-Collection mit ChromaDB-kompatibler Teil-API."""
+
+    def __init__(self, name: str = DEFAULT_COLLECTION, vector_dir: Path = VECTOR_DIR,
+                 db_path: Path = DB_PATH):
+        self.name = name
+        self.vector_dir = Path(vector_dir)
+        self.db_path = Path(db_path)
+        self.vector_path = self.vector_dir / f"{name}.f32"
+        self.centroid_path = self.vector_dir / f"{name}.ivf.f32"
+        self._lock = threading.RLock()
+        self._loaded = None  # (version, rows, dim, matrix, live_rows, ivf_lists, centroids)
+        self.vector_dir.mkdir(parents=True, exist_ok=True)
+        conn = self._get_db()
+        try:
+            conn.executescript(SCHEMA_SQL)
+        finally:
+            conn.close()
+
+    def _get_db(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(str(self.db_path), timeout=30.0)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _info(self, conn) -> Optional[sqlite3.Row]:
+        return conn.execute("SELECT * FROM rag_vector_collections WHERE name = ?",
+                            (self.name,)).fetchone()
+
+    # ------------------------------------------------------------------
+    # Schreiben
+    # ------------------------------------------------------------------
+
+    def add(self, ids: List[str], embeddings: List[List[float]],
+            documents: Optional[List[str]] = None, metadatas: Optional[List[Dict]] = None):
+        """Fuegt Vektoren hinzu (vorhandene ids werden ersetzt)."""
+        if not ids:
+            return
+        documents = documents or [None] * len(ids)
+        metadatas = metadatas or [{}] * len(ids)
+
+        with self._lock:
+            conn = self._get_db()
+            try:
+                conn.execute("BEGIN IMMEDIATE")
+                info = self._info(conn)
+                dim = len(embeddings[0])
+                if info is None:
+                    conn.execute(
+                        "INSERT INTO rag_vector_collections (name, dim, rows, updated_at) VALUES (?, ?, 0, ?)",
+                        (self.name, dim, datetime.now().isoformat()))
+                    info = self._info(conn)
+                if info["dim"] != dim or any(len(e) != dim for e in embeddings):
+                    raise ValueError(f"Dimension passt nicht zur Collection ({info['dim']})")
+
+                self._delete_ids(conn, ids)
+                start = info["rows"]
+                vectors = [_normalize(e) for e in embeddings]
+                clusters = self._assign_clusters(vectors, info["nlist"])
+
+                # Vektordatei: autoritativ ist rows aus der DB (Reste eines
+                # abgebrochenen Schreibvorgangs werden ueberschrieben)
+                mode = "r+b" if self.vector_path.exists() else "w+b"
+                with open(self.vector_path, mode) as f:
+                    f.seek(start * dim * 4)
+                    for v in vectors:
+                        f.write(array("f", v).tobytes())
+                    f.truncate()
+
+                conn.executemany("""
+                    INSERT INTO rag_vectors
+                        (collection, row_idx, doc_id, source, document, metadata, cluster)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                """, [(self.name, start + i, doc_id, (meta or {}).get("source"), doc,
+                       json.dumps(meta or {}, ensure_ascii=False), clusters[i])
+                      for i, (doc_id, doc, meta) in enumerate(zip(ids, documents, metadatas))])
+                conn.execute("""
+                    UPDATE rag_vector_collections
+                    SET rows = ?, version = version + 1, updated_at = ?
+                    WHERE name = ?
+                """, (start + len(ids), datetime.now().isoformat(), self.name))
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+            finally:
+                conn.close()
+
+    upsert = add
+
+    def _delete_ids(self, conn, ids: List[str]) -> int:
+        deleted = 0
+        for i in range(0, len(ids), 500):
+            part = ids[i:i + 500]
+            deleted += conn.execute(
+                f"DELETE FROM rag_vectors WHERE collection = ? AND doc_id IN ({','.join('?' * len(part))})",
+                [self.name] + part).rowcount
+        return deleted
+
+    def delete(self, ids: Optional[List[str]] = None, where: Optional[Dict] = None):
+        """Entfernt Eintraege (Slots in der Vektordatei bleiben bis compact())."""
+        if where and not ids:
+            ids = self.get(where=where)["ids"]
+        if not ids:
+            return
+        with self._lock:
+            conn = self._get_db()
+            try:
+                if self._delete_ids(conn, ids):
+                    conn.execute("UPDATE rag_vector_collections SET version = version + 1 WHERE name = ?",
+                                 (self.name,))
+                conn.commit()
+            finally:
+                conn.close()
+
+    def compact(self) -> int:
+        """Schreibt die Vektordatei ohne geloeschte Slots neu. Gibt freigegebene Slots zurueck."""
+        with self._lock:
+            conn = self._get_db()
+            try:
+                conn.execute("BEGIN IMMEDIATE")
+                info = self._info(conn)
+                if info is None:
+                    conn.rollback()
+                    return 0
+                dim = info["dim"]
+                rows = conn.execute(
+                    "SELECT row_idx FROM rag_vectors WHERE collection = ? ORDER BY row_idx",
+                    (self.name,)).fetchall()
+                freed = info["rows"] - len(rows)
+                if freed <= 0:
+                    conn.rollback()
+                    return 0
+
+                tmp = self.vector_path.with_suffix(".f32.tmp")
+                size = dim * 4
+                with open(self.vector_path, "rb") as src, open(tmp, "wb") as dst:
+                    for r in rows:
+                        src.seek(r["row_idx"] * size)
+                        dst.write(src.read(size))
+                # Neue Positionen: zuerst negativ (Primaerschluessel-Kollisionen vermeiden)
+                conn.executemany(
+                    "UPDATE rag_vectors SET row_idx = ? WHERE collection = ? AND row_idx = ?",
+                    [(-1 - new, self.name, r["row_idx"]) for new, r in enumerate(rows)])
+                conn.execute("UPDATE rag_vectors SET row_idx = -1 - row_idx WHERE collection = ?",
+                             (self.name,))
+                conn.execute("""
+                    UPDATE rag_vector_collections SET rows = ?, version = version + 1, updated_at = ?
+                    WHERE name = ?
+                """, (len(rows), datetime.now().isoformat(), self.name))
+                self._loaded = None
+                os.replace(tmp, self.vector_path)
+                conn.commit()
+                return freed
+            except Exception:
+                conn.rollback()
+                raise
+            finally:
+                conn.close()
+
+    # ------------------------------------------------------------------
+    # Lesen
+    # ------------------------------------------------------------------
+
+    def count(self) -> int:
+        conn = self._get_db()
+        try:
+            return conn.execute("SELECT COUNT(*) FROM rag_vectors WHERE collection = ?",
+                                (self.name,)).fetchone()[0]
+        finally:
+            conn.close()
+
+    def get(self, ids: Optional[List[str]] = None, where: Optional[Dict] = None,
+            include: Optional[List[str]] = None) -> Dict[str, list]:
+        """Eintraege nach ids oder Metadaten-Gleichheit (where={"source": ...})."""
+        clauses, params = ["collection = ?"], [self.name]
+        if ids is not None:
+            if not ids:
+                return {"ids": [], "metadatas": [], "documents": []}
+            clauses.append(f"doc_id IN ({','.join('?' * len(ids))})")
+            params.extend(ids)
+        for key, value in (where or {}).items():
+            if key == "source":
+                clauses.append("source = ?")
+            else:
+                clauses.append(f"json_extract(metadata, '$.{key}') = ?")
+            params.append(value)
+
+        conn = self._get_db()
+        try:
+            rows = conn.execute(
+                f"SELECT doc_id, document, metadata FROM rag_vectors WHERE {' AND '.join(clauses)} ORDER BY row_idx",
+                params).fetchall()
+        finally:
+            conn.close()
+        return {
+            "ids": [r["doc_id"] for r in rows],
+            "metadatas": [json.loads(r["metadata"] or "{}") for r in rows],
+            "documents": [r["document"] for r in rows],
+        }
+
+    def _load(self):
+        """Memory-mapped Vektoren + Liste lebender Zeilen (gecacht pro Version)."""
+        conn = self._get_db()
+        try:
+            info = self._info(conn)
+            if info is None or info["rows"] == 0:
+                return None
+            loaded = self._loaded
+            if loaded is not None and loaded[0] == info["version"]:
+                return loaded
+            live = conn.execute(
+                "SELECT row_idx, cluster FROM rag_vectors WHERE collection = ? ORDER BY row_idx",
+                (self.name,)).fetchall()
+        finally:
+            conn.close()
+
+        rows, dim = info["rows"], info["dim"]
+        live_rows = [r["row_idx"] for r in live]
+        clusters = [(-1 if r["cluster"] is None else r["cluster"]) for r in live]
+        centroids = ivf_lists = None
+        if NUMPY_AVAILABLE:
+            matrix = np.memmap(self.vector_path, dtype=np.float32, mode="r", shape=(rows, dim))
+            live_rows = np.asarray(live_rows, dtype=np.int64)
+            if info["nlist"] and self.centroid_path.exists():
+                centroids = np.fromfile(self.centroid_path, dtype=np.float32).reshape(info["nlist"], dim)
+                # Invertierte Listen: Zeilen nach Cluster sortiert, nicht zugeordnete (-1) zuerst
+                clusters = np.asarray(clusters, dtype=np.int64)
+                order = np.argsort(clusters, kind="stable")
+                bounds = np.searchsorted(clusters[order], np.arange(-1, info["nlist"] + 1))
+                ivf_lists = (live_rows[order], bounds)
+        else:
+            with open(self.vector_path, "rb") as f:
+                matrix = memoryview(mmap.mmap(f.fileno(), rows * dim * 4, access=mmap.ACCESS_READ)).cast("f")
+
+        self._loaded = (info["version"], rows, dim, matrix, live_rows, ivf_lists, centroids)
+        return self._loaded
+
+    def _top_k(self, query: List[float], k: int, nprobe: Optional[int]):
+        """(row_idx, score) der k aehnlichsten Vektoren."""
+        loaded = self._load()
+        if loaded is None:
+            return []
+        _, rows, dim, matrix, live_rows, ivf_lists, centroids = loaded
+        if len(query) != dim:
+            raise ValueError(f"Anfrage hat Dimension {len(query)}, Collection {dim}")
+        q = _normalize(query)
+
+        if NUMPY_AVAILABLE:
+            q = np.asarray(q, dtype=np.float32)
+            if centroids is not None and len(live_rows) >= IVF_MIN_ROWS and nprobe != 0:
+                probe = min(nprobe or IVF_NPROBE, len(centroids))
+                nearest = np.argpartition(-(centroids @ q), probe - 1)[:probe]
+                sorted_rows, bounds = ivf_lists
+                candidates = np.concatenate([sorted_rows[bounds[0]:bounds[1]]] +
+                                            [sorted_rows[bounds[c + 1]:bounds[c + 2]] for c in nearest])
+                scores = matrix[candidates] @ q
+            else:
+                candidates = live_rows
+                scores = (matrix @ q)[live_rows] if len(live_rows) < rows else matrix @ q
+            k = min(k, len(candidates))
+            if k <= 0:
+                return []
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top])]
+            return [(int(candidates[i]), float(scores[i])) for i in top]
+
+        import heapq
+        scored = ((r, sum(map(mul, q, matrix[r * dim:(r + 1) * dim]))) for r in live_rows)
+        return heapq.nlargest(k, scored, key=lambda t: t[1])
+
+    def query(self, query_embeddings: List[List[float]], n_results: int = 10,
+              include: Optional[List[str]] = None, nprobe: Optional[int] = None) -> Dict[str, list]:
+        """Top-k Cosine-Suche. distances = 1 - cosine (wie ChromaDB 'cosine')."""
+        result = {"ids": [], "documents": [], "metadatas": [], "distances": []}
+        with self._lock:
+            hits_per_query = [self._top_k(q, n_results, nprobe) for q in query_embeddings]
+
+        conn = self._get_db()
+        try:
+            for hits in hits_per_query:
+                by_row = {}
+                if hits:
+                    rows = conn.execute(
+                        f"""SELECT row_idx, doc_id, document, metadata FROM rag_vectors
+                            WHERE collection = ? AND row_idx IN ({','.join('?' * len(hits))})""",
+                        [self.name] + [h[0] for h in hits]).fetchall()
+                    by_row = {r["row_idx"]: r for r in rows}
+                hits = [h for h in hits if h[0] in by_row]
+                result["ids"].append([by_row[r]["doc_id"] for r, _ in hits])
+                result["documents"].append([by_row[r]["document"] for r, _ in hits])
+                result["metadatas"].append([json.loads(by_row[r]["metadata"] or "{}") for r, _ in hits])
+                result["distances"].append([1.0 - s for _, s in hits])
+        finally:
+            conn.close()
+        return result
+
+    # ------------------------------------------------------------------
+    # IVF
+    # ------------------------------------------------------------------
+
+    def _assign_clusters(self, vectors: List[List[float]], nlist: int) -> List[Optional[int]]:
+        """Naechster Centroid fuer neue Vektoren (None ohne IVF/NumPy)."""
+        if not nlist or not NUMPY_AVAILABLE or not self.centroid_path.exists():
+            return [None] * len(vectors)
+        centroids = np.fromfile(self.centroid_path, dtype=np.float32).reshape(nlist, -1)
+        return [int(c) for c in np.argmax(np.asarray(vectors, dtype=np.float32) @ centroids.T, axis=1)]
+
+    def build_ivf(self, nlist: Optional[int] = None, iterations: int = 15, seed: int = 0) -> int:
+        """Trainiert einen IVF-Grobquantisierer (sphaerisches k-Means). Gibt nlist zurueck."""
+        if not NUMPY_AVAILABLE:
+            raise RuntimeError("IVF benoetigt numpy: pip install numpy")
+        with self._lock:
+            loaded = self._load()
+            if loaded is None:
+                return 0
+            _, rows, dim, matrix, live_rows, _, _ = loaded
+            n = len(live_rows)
+            nlist = max(1, min(nlist or int(math.sqrt(n)), n))
+
+            rng = np.random.default_rng(seed)
+            sample_rows = live_rows if n <= IVF_TRAIN_SAMPLE else rng.choice(live_rows, IVF_TRAIN_SAMPLE, replace=False)
+            sample = np.asarray(matrix[np.sort(sample_rows)])
+            centroids = sample[rng.choice(len(sample), nlist, replace=False)].copy()
+            for _ in range(iterations):
+                assign = np.argmax(sample @ centroids.T, axis=1)
+                for c in range(nlist):
+                    members = sample[assign == c]
+                    if len(members):
+                        centroids[c] = members.sum(axis=0)
+                    else:
+                        centroids[c] = sample[rng.integers(len(sample))]
+                centroids /= np.linalg.norm(centroids, axis=1, keepdims=True) + 1e-12
+
+            assignments = []
+            for start in range(0, n, 65536):
+                block = live_rows[start:start + 65536]
+                assignments.extend(zip(np.argmax(matrix[block] @ centroids.T, axis=1).tolist(),
+                                       block.tolist()))
+
+            centroids.astype(np.float32).tofile(self.centroid_path)
+            conn = self._get_db()
+            try:
+                conn.executemany("UPDATE rag_vectors SET cluster = ? WHERE collection = ? AND row_idx = ?",
+                                 [(c, self.name, r) for c, r in assignments])
+                conn.execute("UPDATE rag_vector_collections SET nlist = ?, version = version + 1 WHERE name = ?",
+                             (nlist, self.name))
+                conn.commit()
+            finally:
+                conn.close()
+            self._loaded = None
+            return nlist
+
+    def drop(self):
+        """Loescht die Collection komplett (Metadaten + Dateien)."""
+        with self._lock:
+            conn = self._get_db()
+            try:
+                conn.execute("DELETE FROM rag_vectors WHERE collection = ?", (self.name,))
+                conn.execute("DELETE FROM rag_vector_collections WHERE name = ?", (self.name,))
+                conn.commit()
+            finally:
+                conn.close()
+            self._loaded = None
+            self.vector_path.unlink(missing_ok=True)
+            self.centroid_path.unlink(missing_ok=True)
+
+    def status(self) -> Dict:
+        conn = self._get_db()
+        try:
+            info = self._info(conn)
+        finally:
+            conn.close()
+        if info is None:
+            return {"collection": self.name, "rows": 0}
+        live = self.count()
+        return {
+            "collection": self.name,
+            "dim": info["dim"],
+            "vectors": live,
+            "dead_slots": info["rows"] - live,
+            "ivf_nlist": info["nlist"],
+            "numpy": NUMPY_AVAILABLE,
+            "file_mb": round(self.vector_path.stat().st_size / 1e6, 2) if self.vector_path.exists() else 0,
+        }
+
+
+_stores: Dict[tuple, VectorStore] = {}
+_chroma_clients: Dict[str, object] = {}
+
+
+def open_store(name: str = DEFAULT_COLLECTION, vector_dir: Path = VECTOR_DIR,
+               db_path: Path = DB_PATH) -> VectorStore:
+    """Prozessweit geteilte Store-Instanz (Vektoren bleiben gemappt)."""
+    key = (name, str(vector_dir), str(db_path))
+    store = _stores.get(key)
+    if store is None:
+        store = _stores[key] = VectorStore(name, vector_dir, db_path)
+    return store
+
+
+def open_collection(backend: str = "auto", name: str = DEFAULT_COLLECTION, create: bool = True,
+                    metadata: Optional[Dict] = None):
+    """Collection fuer RAG: ChromaDB falls installiert (oder erzwungen), sonst eingebettet.
+
+    Args:
+        backend: 'auto', 'chroma' oder 'builtin'
+        name: Collection-Name
+        create: Bei ChromaDB anlegen falls nicht vorhanden
+        metadata: Collection-Metadaten fuer ChromaDB
+
+    Returns:
+        (collection, backend_name)
+    """
+    if backend in ("auto", "chroma"):
+        try:
+            import chromadb
+        except ImportError:
+            if backend == "chroma":
+                raise
+        else:
+            client = _chroma_clients.get(str(VECTOR_DIR))
+            if client is None:
+                client = _chroma_clients[str(VECTOR_DIR)] = chromadb.PersistentClient(path=str(VECTOR_DIR))
+            if create:
+                return client.get_or_create_collection(name=name, metadata=metadata), "chroma"
+            return client.get_collection(name), "chroma"
+    return open_store(name), "builtin"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="BACH Vektor-Index")
+    parser.add_argument("--collection", default=DEFAULT_COLLECTION)
+    parser.add_argument("--status", action="store_true", help="Status anzeigen")
+    parser.add_argument("--build-ivf", action="store_true", help="IVF-Quantisierer trainieren")
+    parser.add_argument("--nlist", type=int, default=None, help="Anzahl IVF-Cluster")
+    parser.add_argument("--compact", action="store_true", help="Geloeschte Slots entfernen")
+    args = parser.parse_args()
+
+    store = VectorStore(args.collection)
+    if args.compact:
+        print(f"[OK] {store.compact()} Slots freigegeben")
+    if args.build_ivf:
+        try:
+            print(f"[OK] IVF mit {store.build_ivf(args.nlist)} Clustern gebaut")
+        except RuntimeError as e:
+            print(f"[FEHLER] {e}")
+            return 1
+    if args.status or not (args.compact or args.build_ivf):
+        print(json.dumps(store.status(), indent=2, ensure_ascii=False))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
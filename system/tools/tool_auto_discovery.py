@@ -32,34 +32,6 @@ BASE_DIR = Path(__file__).parent.parent
 DB_PATH = BASE_DIR / "data" / "bach.db"
 TOOLS_DIR = BASE_DIR / "tools"
 
-def extract_metadata(file_path):
-    """Extrahiert Beschreibung und Usage aus einem Python Script."""
-    description = ""
-    usage = f"python {file_path.relative_to(BASE_DIR)}"
-    
-    try:
-        with open(file_path, "r", encoding="utf-8") as f:
-            content = f.read()
-            # Docstring suchen (erstes """ oder ''')
-            doc_match = re.search(r'"""(.*?)"""', content, re.DOTALL)
-            if not doc_match:
-                doc_match = re.search(r"'''(.*?)'''", content, re.DOTALL)
-            
-            if doc_match:
-                doc = doc_match.group(1).strip()
-                # Nur die erste Zeile oder bis zum ersten Doppelzeilenumbruch
-                first_part = doc.split("\n\n")[0].strip()
-                description = first_part.replace("\n", " ")
-                
-                # Usage im Docstring suchen?
-                usage_match = re.search(r'Usage:\s*(.*)', doc, re.IGNORECASE)
-                if usage_match:
-                    usage = usage_match.group(1).strip()
-    except:
-        pass
-        
-    return description[:200], usage[:200]
-
 def get_keywords(name, description):
     """Generiert Keywords."""
     keywords = set()
@@ -83,23 +55,27 @@ def process_tools():
     cursor = conn.cursor()
 
     print("Scanne tools/ Verzeichnis...")
-    tool_files = list(TOOLS_DIR.rglob("*.py"))
+    # Katalog liest nur neue/geaenderte Dateien (mtime-Abgleich)
+    try:
+        from tools.catalog_index import get_catalog
+    except ImportError:
+        from catalog_index import get_catalog
+    catalog = get_catalog(BASE_DIR)
     
     tools_added = 0
     triggers_added = 0
     triggers_updated = 0
     
-    for tf_path in tool_files:
-        if tf_path.name.startswith("__"): continue
-        
-        rel_path = str(tf_path.relative_to(BASE_DIR)).replace("\\", "/")
-        name = tf_path.stem
+    for entry in catalog.entries("tool"):
+        rel_path = f"tools/{entry.rel_path}"
+        name = entry.name
         
         # In tools Tabelle prüfen
         cursor.execute("SELECT id, description FROM tools WHERE path = ? OR name = ?", (rel_path, name))
         row = cursor.fetchone()
         
-        description, usage = extract_metadata(tf_path)
+        description = entry.description
+        usage = entry.usage or f"python {rel_path}"
         
         if not row:
             # Neu in tools-Tabelle
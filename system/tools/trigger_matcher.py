@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# SPDX-License-Identifier: MIT
+"""
+Tool: trigger_matcher
+Version: 1.0.0
+Author: BACH Team
+Created: 2026-10-17
+Anthropic-Compatible: True
+
+Description:
+    Kompilierter Multi-Pattern-Matcher (Aho-Corasick) fuer context_triggers.
+    Wird einmal aus der Tabelle gebaut und von ContextInjector.check und
+    queue_processor.route_incoming gemeinsam genutzt. Die Laufzeit pro
+    Nachricht haengt von der Nachrichtenlaenge ab, nicht von der Anzahl
+    der Trigger.
+
+    Invalidierung: Ein Zaehler in context_triggers_version wird per
+    SQLite-Trigger bei INSERT/DELETE und bei Aenderungen an Phrase, Hint,
+    Quelle oder Aktiv-Status erhoeht. usage_count-Updates zaehlen nicht.
+
+Usage:
+    python trigger_matcher.py --bench [--triggers 10000] [--messages 10000]
+"""
+
+__version__ = "1.0.0"
+__author__ = "BACH Team"
+
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+VERSION_SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS context_triggers_version (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    version INTEGER NOT NULL DEFAULT 0
+);
+INSERT OR IGNORE INTO context_triggers_version (id, version) VALUES (1, 0);
+
+CREATE TRIGGER IF NOT EXISTS context_triggers_ver_ai AFTER INSERT ON context_triggers BEGIN
+    UPDATE context_triggers_version SET version = version + 1 WHERE id = 1;
+END;
+CREATE TRIGGER IF NOT EXISTS context_triggers_ver_ad AFTER DELETE ON context_triggers BEGIN
+    UPDATE context_triggers_version SET version = version + 1 WHERE id = 1;
+END;
+CREATE TRIGGER IF NOT EXISTS context_triggers_ver_au
+AFTER UPDATE OF trigger_phrase, hint_text, source, is_active ON context_triggers BEGIN
+    UPDATE context_triggers_version SET version = version + 1 WHERE id = 1;
+END;
+"""
+
+# Ohne Versions-Tabelle (z.B. read-only DB): spaetestens nach TTL neu bauen
+FALLBACK_TTL_SEC = 300
+# Mindestabstand zwischen zwei Versions-Abfragen pro DB
+VERSION_CHECK_INTERVAL_SEC = 1.0
+
+
+class AhoCorasick:
+    """Aho-Corasick-Automat ueber eine feste Liste von Mustern.
+
+    find(text) liefert die Indizes aller Muster, die als Teilstring in text
+    vorkommen - entspricht `[i for i, p in enumerate(patterns) if p in text]`,
+    aber in O(len(text) + Treffer).
+    """
+
+    def __init__(self, patterns: Iterable[str]):
+        self.patterns: List[str] = list(patterns)
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[tuple] = [()]
+        self._build()
+
+    def _build(self):
+        goto = self._goto
+        node_out: List[list] = [[]]
+        for idx, pattern in enumerate(self.patterns):
+            if not pattern:
+                continue  # Leere Phrasen matchen nie
+            node = 0
+            for ch in pattern:
+                nxt = goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[node][ch] = nxt
+                    goto.append({})
+                    node_out.append([])
+                node = nxt
+            node_out[node].append(idx)
+
+        # Breitensuche: Failure-Links und vereinigte Ausgaben
+        fail = [0] * len(goto)
+        queue = list(goto[0].values())  # Tiefe 1: Failure zeigt auf Wurzel
+        head = 0
+        while head < len(queue):
+            node = queue[head]
+            head += 1
+            for ch, child in goto[node].items():
+                queue.append(child)
+                f = fail[node]
+                while f and ch not in goto[f]:
+                    f = fail[f]
+                fail[child] = goto[f].get(ch, 0)
+                node_out[child].extend(node_out[fail[child]])
+
+        self._fail = fail
+        self._out = [tuple(o) for o in node_out]
+
+    def find(self, text: str) -> set:
+        """Indizes aller in text enthaltenen Muster."""
+        goto, fail, out = self._goto, self._fail, self._out
+        found = set()
+        node = 0
+        for ch in text:
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            if out[node]:
+                found.update(out[node])
+        return found
+
+    def __len__(self):
+        return len(self.patterns)
+
+
+class TriggerMatcher:
+    """Kompilierte context_triggers (Phrase -> id, hint, source)."""
+
+    def __init__(self, entries: List[dict], version=None):
+        self.entries = entries
+        self.version = version
+        self.built_at = time.monotonic()
+        self.checked_at = self.built_at
+        self._automaton = AhoCorasick(e['trigger_phrase'] for e in entries)
+
+    @classmethod
+    def from_dict(cls, triggers: Dict[str, str], source: str = 'manual') -> "TriggerMatcher":
+        """Matcher aus {phrase: hint} (z.B. hardcoded Fallback)."""
+        return cls([{'id': None, 'trigger_phrase': phrase, 'hint_text': hint, 'source': source}
+                    for phrase, hint in triggers.items()])
+
+    def match(self, text_lower: str) -> List[dict]:
+        """Alle passenden Eintraege in Tabellen-Reihenfolge.
+
+        text_lower muss bereits kleingeschrieben sein (wie bisher:
+        `trigger_phrase in content.lower()`).
+        """
+        return [self.entries[i] for i in sorted(self._automaton.find(text_lower))]
+
+    def __len__(self):
+        return len(self.entries)
+
+
+_matchers: Dict[str, TriggerMatcher] = {}
+_lock = threading.Lock()
+
+
+def _read_version(conn: sqlite3.Connection):
+    """Aktuelle Trigger-Version; installiert die Versions-Trigger bei Bedarf."""
+    try:
+        row = conn.execute("SELECT version FROM context_triggers_version WHERE id = 1").fetchone()
+        if row is not None:
+            return row[0]
+    except sqlite3.OperationalError:
+        pass
+    try:
+        conn.executescript(VERSION_SCHEMA_SQL)
+        return conn.execute("SELECT version FROM context_triggers_version WHERE id = 1").fetchone()[0]
+    except sqlite3.Error:
+        return None  # read-only oder context_triggers fehlt
+
+
+def _load_entries(conn: sqlite3.Connection) -> List[dict]:
+    rows = conn.execute(
+        "SELECT id, trigger_phrase, hint_text, source FROM context_triggers WHERE is_active = 1"
+    ).fetchall()
+    return [{'id': r[0], 'trigger_phrase': r[1], 'hint_text': r[2], 'source': r[3]}
+            for r in rows]
+
+
+def get_trigger_matcher(db_path: Path, conn: Optional[sqlite3.Connection] = None) -> TriggerMatcher:
+    """Geteilter Matcher fuer die context_triggers einer DB.
+
+    Baut den Automaten nur neu, wenn sich context_triggers geaendert hat.
+
+    Args:
+        db_path: Pfad zur bach.db
+        conn: Optionale offene Verbindung (sonst kurzlebige eigene)
+
+    Returns:
+        TriggerMatcher (leer, wenn Tabelle fehlt)
+    """
+    key = str(db_path)
+    now = time.monotonic()
+    cached = _matchers.get(key)
+    if cached is not None and now - cached.checked_at < VERSION_CHECK_INTERVAL_SEC:
+        return cached
+
+    own_conn = conn is None
+    try:
+        if own_conn:
+            conn = sqlite3.connect(str(db_path), timeout=30.0)
+        version = _read_version(conn)
+        if cached is not None:
+            if version is not None and version == cached.version:
+                cached.checked_at = now
+                return cached
+            if version is None and now - cached.built_at < FALLBACK_TTL_SEC:
+                cached.checked_at = now
+                return cached
+        try:
+            entries = _load_entries(conn)
+        except sqlite3.Error:
+            entries = []
+    except sqlite3.Error:
+        return cached if cached is not None else TriggerMatcher([])
+    finally:
+        if own_conn and conn is not None:
+            conn.close()
+
+    matcher = TriggerMatcher(entries, version)
+    with _lock:
+        _matchers[key] = matcher
+    return matcher
+
+
+def clear_cache():
+    """Verwirft alle kompilierten Matcher."""
+    with _lock:
+        _matchers.clear()
+
+
+# ═══════════════════════════════════════════════════════════════
+# BENCHMARK
+# ═══════════════════════════════════════════════════════════════
+
+def run_benchmark(n_triggers: int = 10000, n_messages: int = 10000, seed: int = 42) -> dict:
+    """Vergleicht lineare `in`-Suche mit dem Automaten.
+
+    Returns:
+        dict mit Build-/Match-Zeiten und Trefferzahlen
+    """
+    import random
+    rng = random.Random(seed)
+    alphabet = "abcdefghijklmnopqrstuvwxyzäöü"
+
+    def word(lo=4, hi=10):
+        return "".join(rng.choice(alphabet) for _ in range(rng.randint(lo, hi)))
+
+    phrases = list({word() if rng.random() < 0.7 else f"{word()} {word()}"
+                    for _ in range(n_triggers)})
+    messages = []
+    for _ in range(n_messages):
+        words = [word(2, 9) for _ in range(rng.randint(5, 40))]
+        if rng.random() < 0.3:
+            words.insert(rng.randrange(len(words) + 1), rng.choice(phrases))
+        messages.append(" ".join(words))
+
+    t0 = time.perf_counter()
+    linear_hits = sum(1 for m in messages for p in phrases if p in m)
+    t_linear = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    automaton = AhoCorasick(phrases)
+    t_build = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    ac_hits = sum(len(automaton.find(m)) for m in messages)
+    t_ac = time.perf_counter() - t0
+
+    return {
+        "triggers": len(phrases),
+        "messages": len(messages),
+        "linear_s": round(t_linear, 3),
+        "build_s": round(t_build, 3),
+        "automaton_s": round(t_ac, 3),
+        "speedup": round(t_linear / t_ac, 1) if t_ac else None,
+        "hits_equal": linear_hits == ac_hits,
+        "hits": ac_hits,
+    }
+
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description="BACH Trigger-Matcher")
+    parser.add_argument("--bench", action="store_true", help="Micro-Benchmark ausfuehren")
+    parser.add_argument("--triggers", type=int, default=10000)
+    parser.add_argument("--messages", type=int, default=10000)
+    args = parser.parse_args()
+
+    if not args.bench:
+        parser.print_help()
+        return 0
+
+    r = run_benchmark(args.triggers, args.messages)
+    print(f"[BENCH] {r['triggers']} Trigger x {r['messages']} Nachrichten")
+    print(f"  Linear (in):     {r['linear_s']:8.3f} s")
+    print(f"  Automat Build:   {r['build_s']:8.3f} s")
+    print(f"  Automat Match:   {r['automaton_s']:8.3f} s  (x{r['speedup']})")
+    print(f"  Treffer gleich:  {r['hits_equal']} ({r['hits']})")
+    return 0 if r['hits_equal'] else 1
+
+
+if __name__ == "__main__":
+    import sys
+    sys.exit(main())
@@ -14,12 +14,15 @@ Description:
     Includes ProFiler-inspired file discovery with hash-based dedup and
     tags derived from path structure.
 
-    Future: sqlite-vec vector search (cosine + BM25 hybrid).
+    Hybrid ranking: embeddings of search_index rows live in the embedded
+    vector store (tools/rag/vector_store.py); search_hybrid fuses cosine
+    and BM25 (search_fts) ranks via Reciprocal Rank Fusion.
 
 Architecture:
     search_index (table)  <-- unified metadata + content from all sources
     search_fts   (FTS5)   <-- full-text index synced via triggers
     search_tags  (table)  <-- tags per indexed item (ProFiler pattern)
+    rag_vectors  (table)  <-- embeddings per search_index row (collection 'unified_search')
 """
 
 __version__ = "1.0.0"
@@ -30,6 +33,7 @@ import hashlib
 import os
 import sys
 import json
+import time
 from pathlib import Path
 from datetime import datetime
 from typing import Dict, List, Optional, Tuple, Any
@@ -59,6 +63,17 @@ FILE_CATEGORIES = {
     '.zip': 'archiv', '.tar': 'archiv', '.gz': 'archiv',
 }
 
+# --- Scan tuning ---
+
+SCAN_BATCH_SIZE = 1000      # rows per write transaction
+SCAN_POOL_MIN_FILES = 32    # below this, hashing runs in-process
+
+# --- Hybrid search ---
+
+VECTOR_COLLECTION = "unified_search"
+EMBED_TEXT_CHARS = 2000     # title + leading content used for the embedding
+RRF_K = 60                  # Reciprocal Rank Fusion constant
+
 # --- Schema ---
 
 SCHEMA_SQL = """
@@ -74,6 +89,7 @@ CREATE TABLE IF NOT EXISTS search_index (
     content_hash TEXT,             -- SHA256 for dedup
     word_count INTEGER DEFAULT 0,
     file_size INTEGER DEFAULT 0,
+    file_mtime_ns INTEGER,         -- mtime for incremental scans (files only)
     indexed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     UNIQUE(source, source_id)
 );
@@ -99,14 +115,14 @@ CREATE TRIGGER IF NOT EXISTS search_idx_ai AFTER INSERT ON search_index BEGIN
     VALUES (new.id, new.title, COALESCE(new.content, ''));
 END;
 
+-- search_fts is a regular FTS5 table: the 'delete' command only exists for
+-- external-content tables, so rows are removed by rowid.
 CREATE TRIGGER IF NOT EXISTS search_idx_ad AFTER DELETE ON search_index BEGIN
-    INSERT INTO search_fts(search_fts, rowid, title, content)
-    VALUES ('delete', old.id, old.title, COALESCE(old.content, ''));
+    DELETE FROM search_fts WHERE rowid = old.id;
 END;
 
-CREATE TRIGGER IF NOT EXISTS search_idx_au AFTER UPDATE ON search_index BEGIN
-    INSERT INTO search_fts(search_fts, rowid, title, content)
-    VALUES ('delete', old.id, old.title, COALESCE(old.content, ''));
+CREATE TRIGGER IF NOT EXISTS search_idx_au AFTER UPDATE OF title, content ON search_index BEGIN
+    DELETE FROM search_fts WHERE rowid = old.id;
     INSERT INTO search_fts(rowid, title, content)
     VALUES (new.id, new.title, COALESCE(new.content, ''));
 END;
@@ -118,6 +134,24 @@ CREATE INDEX IF NOT EXISTS idx_search_index_hash ON search_index(content_hash);
 """
 
 
+def _rag_modules():
+    """Lazy import of tools/rag (ingest, vector_store)."""
+    tools_dir = str(Path(__file__).parent)
+    if tools_dir not in sys.path:
+        sys.path.insert(0, tools_dir)
+    from rag import ingest, vector_store
+    return ingest, vector_store
+
+
+def _extraction_service():
+    """Lazy import of the shared text extraction service (hub/_services/document)."""
+    system_dir = str(Path(__file__).parent.parent)
+    if system_dir not in sys.path:
+        sys.path.insert(0, system_dir)
+    from hub._services.document.extraction_service import get_extraction_service
+    return get_extraction_service()
+
+
 def _is_cloud_placeholder(path: str) -> bool:
     """Detect OneDrive cloud placeholders (ProFiler pattern)."""
     if os.name != 'nt':
@@ -162,8 +196,88 @@ def _path_to_tags(filepath: str, root: str) -> List[str]:
         return []
 
 
-def _extract_text(file_path: Path) -> str:
-    """Extract text content from a file. Supports text, PDF, DOCX."""
+def _walk_files(dir_path: Path, recursive: bool = True):
+    """Yield (path_str, stat) for all non-hidden files below dir_path.
+
+    os.walk/scandir instead of rglob + stat: hidden directories are pruned
+    and the stat comes from the directory entry where the OS provides it.
+    stat is None if the file could not be stat'ed.
+    """
+    # Same rule as before: any hidden path component excludes the file
+    if any(part.startswith('.') for part in dir_path.parts):
+        return
+    for root, dirs, files in os.walk(str(dir_path)):
+        dirs[:] = sorted(d for d in dirs if not d.startswith('.'))
+        if not recursive:
+            dirs[:] = []
+        for name in sorted(files):
+            if name.startswith('.'):
+                continue
+            path = os.path.join(root, name)
+            try:
+                st = os.stat(path)
+            except OSError:
+                yield path, None
+                continue
+            yield path, st
+
+
+def _hash_and_extract(item: tuple) -> tuple:
+    """Worker: hash a file and extract its text if the hash changed.
+
+    Args:
+        item: (path, size, mtime_ns, known_hash)
+
+    Returns:
+        (path, size, mtime_ns, content_hash, content, error)
+        content is None when the hash equals known_hash (no extraction needed).
+    """
+    path, size, mtime_ns, known_hash = item
+    try:
+        content_hash = _sha256_file(path)
+        if not content_hash or content_hash == known_hash:
+            return path, size, mtime_ns, content_hash, None, None
+        ext = os.path.splitext(path)[1].lower()
+        content = ""
+        if ext in SUPPORTED_TEXT_EXTENSIONS or ext in ('.pdf', '.docx'):
+            content = _extract_text(Path(path), content_hash)[:100000]
+        return path, size, mtime_ns, content_hash, content, None
+    except Exception as e:  # pragma: no cover - worker safety net
+        return path, size, mtime_ns, None, None, str(e)
+
+
+def _map_hash_extract(candidates: List[tuple], workers: Optional[int] = None):
+    """Run _hash_and_extract over candidates, in a process pool when worthwhile."""
+    if not candidates:
+        return
+    if workers is None:
+        workers = min(os.cpu_count() or 1, 8)
+    if workers <= 1 or len(candidates) < SCAN_POOL_MIN_FILES:
+        for item in candidates:
+            yield _hash_and_extract(item)
+        return
+
+    import pickle
+    from concurrent.futures import ProcessPoolExecutor
+    done = 0
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for result in pool.map(_hash_and_extract, candidates, chunksize=16):
+                done += 1
+                yield result
+    except (OSError, RuntimeError, ImportError, pickle.PicklingError):
+        # No process pool available (restricted env): continue sequentially
+        for item in candidates[done:]:
+            yield _hash_and_extract(item)
+
+
+def _extract_text(file_path: Path, content_hash: Optional[str] = None) -> str:
+    """Extract text content from a file. Supports text, PDF, DOCX.
+
+    PDF/DOCX go through the shared extraction service (content-hash cache);
+    content_hash skips re-hashing when the caller already has it.
+    Returns "" on failure.
+    """
     ext = file_path.suffix.lower()
 
     if ext in SUPPORTED_TEXT_EXTENSIONS:
@@ -175,28 +289,12 @@ def _extract_text(file_path: Path) -> str:
             except Exception:
                 return ""
 
-    if ext == '.pdf':
-        try:
-            from pypdf import PdfReader
-            reader = PdfReader(str(file_path))
-            return "\n".join(page.extract_text() or "" for page in reader.pages)
-        except (ImportError, Exception):
-            pass
-        try:
-            import pdfplumber
-            with pdfplumber.open(str(file_path)) as pdf:
-                return "\n".join(page.extract_text() or "" for page in pdf.pages)
-        except (ImportError, Exception):
-            pass
-        return ""
-
-    if ext == '.docx':
+    if ext in ('.pdf', '.docx'):
         try:
-            from docx import Document
-            doc = Document(str(file_path))
-            return "\n".join(p.text for p in doc.paragraphs)
-        except (ImportError, Exception):
+            result = _extraction_service().extract_result(file_path, content_hash)
+        except ImportError:
             return ""
+        return result.text if result.ok else ""
 
     return ""
 
@@ -225,7 +323,19 @@ class UnifiedSearch:
         """Create search_index, search_fts, search_tags if not exist."""
         conn = self._get_db()
         try:
+            # Upgrade: old triggers used the FTS5 'delete' command, which fails
+            # ("SQL logic error") on the regular search_fts table
+            old_trigger = conn.execute(
+                "SELECT sql FROM sqlite_master WHERE type='trigger' AND name='search_idx_au'"
+            ).fetchone()
+            if old_trigger and "'delete'" in (old_trigger[0] or ""):
+                conn.execute("DROP TRIGGER search_idx_au")
+                conn.execute("DROP TRIGGER IF EXISTS search_idx_ad")
             conn.executescript(SCHEMA_SQL)
+            # Upgrade: file_mtime_ns for existing search_index tables
+            cols = {row[1] for row in conn.execute("PRAGMA table_info(search_index)")}
+            if 'file_mtime_ns' not in cols:
+                conn.execute("ALTER TABLE search_index ADD COLUMN file_mtime_ns INTEGER")
             conn.commit()
         finally:
             conn.close()
@@ -642,114 +752,147 @@ class UnifiedSearch:
                 sys.path.remove(kd_parent)
 
     def scan_directory(self, directory: str, tags_from_path: bool = True,
-                       recursive: bool = True) -> Tuple[bool, str]:
+                       recursive: bool = True, incremental: bool = True,
+                       workers: Optional[int] = None) -> Tuple[bool, str]:
         """ProFiler-style directory scan: index files with hash dedup and path tags.
 
         This extends the index with files from arbitrary directories,
         not just BACH's own docs/wiki.
+
+        Incremental mode (default): files whose stored size and mtime match
+        are skipped without being read. Changed files are hashed and
+        text-extracted in a process pool and written in batched transactions.
+
+        Args:
+            directory: Directory to scan
+            tags_from_path: Derive tags from path structure
+            recursive: Descend into subdirectories
+            incremental: Skip files with unchanged size+mtime (False = rehash all)
+            workers: Process pool size (None = CPU count, 1 = no pool)
         """
         self.ensure_schema()
         dir_path = Path(directory)
         if not dir_path.exists():
             return False, f"Ordner nicht gefunden: {directory}"
 
+        started = time.perf_counter()
         conn = self._get_db()
         count = 0
+        unchanged = 0
         skipped = 0
         errors = 0
+        bytes_hashed = 0
+        seen = 0
 
         try:
-            pattern = dir_path.rglob("*") if recursive else dir_path.glob("*")
-            for filepath in pattern:
-                if not filepath.is_file():
+            # Known files in one query instead of one SELECT per file
+            known = {
+                row['source_path']: row
+                for row in conn.execute(
+                    "SELECT source_path, content_hash, file_size, file_mtime_ns "
+                    "FROM search_index WHERE source='file'"
+                )
+            }
+
+            candidates = []  # (path, size, mtime_ns, known_hash)
+            meta_only = []   # unchanged content, new mtime -> metadata update
+            for filepath, stat in _walk_files(dir_path, recursive):
+                seen += 1
+                if stat is None:
+                    errors += 1
                     continue
-                if any(part.startswith('.') for part in filepath.parts):
+                # Skip cloud placeholders
+                if _is_cloud_placeholder(filepath):
+                    skipped += 1
                     continue
 
-                ext = filepath.suffix.lower()
-                category = FILE_CATEGORIES.get(ext, 'sonstiges')
-
-                try:
-                    stat = filepath.stat()
-
-                    # Skip cloud placeholders
-                    if _is_cloud_placeholder(str(filepath)):
-                        skipped += 1
-                        continue
-
-                    # Hash for dedup
-                    content_hash = _sha256_file(str(filepath))
-                    if not content_hash:
-                        skipped += 1
-                        continue
-
-                    # Check if already indexed with same hash
-                    existing = conn.execute(
-                        "SELECT id, content_hash FROM search_index "
-                        "WHERE source='file' AND source_path=?",
-                        (str(filepath),)
-                    ).fetchone()
-
-                    if existing and existing['content_hash'] == content_hash:
-                        skipped += 1
-                        continue
-
-                    # Extract text for searchable types
-                    content = ""
-                    if ext in SUPPORTED_TEXT_EXTENSIONS or ext in ('.pdf', '.docx'):
-                        content = _extract_text(filepath)
-
-                    word_count = len(content.split()) if content else 0
-                    title = filepath.name
-
-                    conn.execute("""
-                        INSERT INTO search_index
-                            (source, source_id, source_path, title, content,
-                             category, content_hash, word_count, file_size)
-                        VALUES ('file', ?, ?, ?, ?, ?, ?, ?, ?)
-                        ON CONFLICT(source, source_id) DO UPDATE SET
-                            title=excluded.title, content=excluded.content,
-                            content_hash=excluded.content_hash,
-                            word_count=excluded.word_count,
-                            file_size=excluded.file_size,
-                            indexed_at=CURRENT_TIMESTAMP
-                    """, (
-                        str(filepath), str(filepath), title,
-                        content[:100000] if content else None,
-                        category, content_hash, word_count, stat.st_size
-                    ))
-
-                    # Tags from path structure
-                    if tags_from_path:
-                        search_id = conn.execute(
-                            "SELECT id FROM search_index WHERE source='file' AND source_id=?",
-                            (str(filepath),)
-                        ).fetchone()
-                        if search_id:
-                            for tag in _path_to_tags(str(filepath), directory):
-                                conn.execute(
-                                    "INSERT OR IGNORE INTO search_tags (search_id, tag) VALUES (?, ?)",
-                                    (search_id['id'], tag)
-                                )
-
-                    count += 1
-                    if count % 100 == 0:
-                        conn.commit()
+                row = known.get(filepath)
+                if (incremental and row is not None
+                        and row['file_size'] == stat.st_size
+                        and row['file_mtime_ns'] == stat.st_mtime_ns):
+                    unchanged += 1
+                    continue
+                candidates.append((filepath, stat.st_size, stat.st_mtime_ns,
+                                   row['content_hash'] if row is not None else None))
 
-                except (PermissionError, OSError):
+            pending = []
+            for result in _map_hash_extract(candidates, workers):
+                filepath, size, mtime_ns, content_hash, content, err = result
+                if err:
                     errors += 1
                     continue
+                if not content_hash:
+                    skipped += 1
+                    continue
+                bytes_hashed += size
 
-            conn.commit()
+                # Same content as indexed (e.g. touched file): only refresh metadata
+                if content is None:
+                    meta_only.append((size, mtime_ns, filepath))
+                    unchanged += 1
+                    continue
+
+                ext = os.path.splitext(filepath)[1].lower()
+                pending.append((
+                    filepath, filepath, os.path.basename(filepath),
+                    content[:100000] if content else None,
+                    FILE_CATEGORIES.get(ext, 'sonstiges'), content_hash,
+                    len(content.split()) if content else 0, size, mtime_ns,
+                ))
+                if len(pending) >= SCAN_BATCH_SIZE:
+                    self._write_scan_batch(conn, pending, directory, tags_from_path)
+                    count += len(pending)
+                    pending = []
+
+            if pending:
+                self._write_scan_batch(conn, pending, directory, tags_from_path)
+                count += len(pending)
+            if meta_only:
+                with conn:
+                    conn.executemany(
+                        "UPDATE search_index SET file_size=?, file_mtime_ns=? "
+                        "WHERE source='file' AND source_id=?", meta_only)
+
+            elapsed = max(time.perf_counter() - started, 1e-9)
             return True, (
                 f"[Scan] {directory}\n"
-                f"  Indexiert: {count} | Uebersprungen: {skipped} | Fehler: {errors}"
+                f"  Indexiert: {count} | Unveraendert: {unchanged} | "
+                f"Uebersprungen: {skipped} | Fehler: {errors}\n"
+                f"  {seen / elapsed:.0f} Dateien/s | "
+                f"{bytes_hashed / (1024 * 1024):.1f} MB gehasht | {elapsed:.2f}s"
             )
         except Exception as e:
             return False, f"[Scan] Fehler: {e}"
         finally:
             conn.close()
 
+    @staticmethod
+    def _write_scan_batch(conn: sqlite3.Connection, rows: List[tuple],
+                          directory: str, tags_from_path: bool):
+        """Upsert a batch of scanned files (and their path tags) in one transaction."""
+        with conn:
+            conn.executemany("""
+                INSERT INTO search_index
+                    (source, source_id, source_path, title, content,
+                     category, content_hash, word_count, file_size, file_mtime_ns)
+                VALUES ('file', ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(source, source_id) DO UPDATE SET
+                    title=excluded.title, content=excluded.content,
+                    content_hash=excluded.content_hash,
+                    word_count=excluded.word_count,
+                    file_size=excluded.file_size,
+                    file_mtime_ns=excluded.file_mtime_ns,
+                    indexed_at=CURRENT_TIMESTAMP
+            """, rows)
+
+            # Tags from path structure
+            if tags_from_path:
+                conn.executemany("""
+                    INSERT OR IGNORE INTO search_tags (search_id, tag)
+                    SELECT id, ? FROM search_index WHERE source='file' AND source_id=?
+                """, [(tag, row[0]) for row in rows
+                      for tag in _path_to_tags(row[0], directory)])
+
     # ------------------------------------------------------------------
     # SEARCH: Unified FTS5 search across all sources
     # ------------------------------------------------------------------
@@ -885,6 +1028,147 @@ class UnifiedSearch:
         finally:
             conn.close()
 
+    # ------------------------------------------------------------------
+    # VECTOR / HYBRID SEARCH
+    # ------------------------------------------------------------------
+
+    def vector_store(self):
+        """Embedded vector store for search_index rows (shared per process)."""
+        _, vector_store = _rag_modules()
+        return vector_store.open_store(VECTOR_COLLECTION,
+                                       vector_dir=Path(self.db_path).parent / "vector_store",
+                                       db_path=self.db_path)
+
+    def embed_index(self, embedder=None) -> Tuple[bool, str]:
+        """Embed new/changed search_index rows, drop vectors of removed rows.
+
+        Args:
+            embedder: rag.ingest.Embedder (default: Ollama with embedding cache)
+        """
+        self.ensure_schema()
+        ingest, _ = _rag_modules()
+        store = self.vector_store()
+
+        known = store.get()
+        known_hash = {doc_id: meta.get('hash') for doc_id, meta in zip(known['ids'], known['metadatas'])}
+
+        conn = self._get_db()
+        try:
+            rows = conn.execute(
+                "SELECT id, source, title, content, content_hash FROM search_index"
+            ).fetchall()
+        finally:
+            conn.close()
+
+        live_ids = {str(r['id']) for r in rows}
+        stale = [doc_id for doc_id in known_hash if doc_id not in live_ids]
+        store.delete(ids=stale)
+
+        todo = [r for r in rows
+                if known_hash.get(str(r['id']), '') != (r['content_hash'] or _sha256_text(r['title']))]
+        if not todo:
+            return True, f"[EMBED] Aktuell: {len(rows)} Eintraege, {len(stale)} entfernt"
+
+        own_embedder = embedder is None
+        if own_embedder:
+            embedder = ingest.Embedder(cache=ingest.EmbeddingCache(ingest.EMBED_CACHE_PATH))
+        start = time.time()
+        embedded = 0
+        try:
+            for i in range(0, len(todo), SCAN_BATCH_SIZE):
+                part = todo[i:i + SCAN_BATCH_SIZE]
+                texts = [f"{r['title']}\n{(r['content'] or '')[:EMBED_TEXT_CHARS]}" for r in part]
+                vectors = embedder.embed(texts)
+                ok = [(r, v) for r, v in zip(part, vectors) if v is not None]
+                store.add(
+                    ids=[str(r['id']) for r, _ in ok],
+                    embeddings=[v for _, v in ok],
+                    metadatas=[{'source': r['source'],
+                                'hash': r['content_hash'] or _sha256_text(r['title'])} for r, _ in ok],
+                )
+                embedded += len(ok)
+        finally:
+            if own_embedder:
+                embedder.close()
+
+        failed = len(todo) - embedded
+        return True, (f"[EMBED] {embedded} eingebettet, {failed} fehlgeschlagen, "
+                      f"{len(stale)} entfernt ({time.time() - start:.1f}s)")
+
+    def search_hybrid(self, query: str, query_embedding: Optional[List[float]] = None,
+                      sources: Optional[List[str]] = None, limit: int = 20,
+                      nprobe: Optional[int] = None) -> Tuple[bool, List[Dict[str, Any]]]:
+        """Hybrid search: BM25 (search_fts) + cosine (vector store), fused via RRF.
+
+        Args:
+            query: Search terms
+            query_embedding: Precomputed query vector (default: Ollama embedding of query)
+            sources: Filter by source
+            limit: Max results
+            nprobe: IVF clusters to probe (None: store default, 0: brute force)
+
+        Returns:
+            (success, list of result dicts with 'score', 'bm25_rank', 'vector_rank')
+        """
+        pool = limit * 3
+        ok, fts_results = self.search(query, sources=sources, limit=pool)
+        fts_results = fts_results if ok else []
+
+        if query_embedding is None:
+            ingest, _ = _rag_modules()
+            query_embedding = ingest.get_embedding(query)
+
+        vector_hits = []
+        if query_embedding is not None:
+            try:
+                res = self.vector_store().query([query_embedding], n_results=pool, nprobe=nprobe)
+                vector_hits = [(int(doc_id), 1.0 - dist, meta.get('source'))
+                               for doc_id, dist, meta in zip(res['ids'][0], res['distances'][0], res['metadatas'][0])]
+            except ValueError:
+                vector_hits = []  # dimension mismatch: different embedding model
+        if sources:
+            vector_hits = [h for h in vector_hits if h[2] in sources]
+
+        fused: Dict[int, Dict[str, Any]] = {}
+        for rank, r in enumerate(fts_results, 1):
+            item = dict(r, bm25_rank=rank, vector_rank=None, similarity=None, score=1.0 / (RRF_K + rank))
+            fused[r['id']] = item
+        for rank, (sid, similarity, _) in enumerate(vector_hits, 1):
+            item = fused.get(sid)
+            if item is None:
+                item = fused[sid] = {'id': sid, 'bm25_rank': None, 'score': 0.0}
+            item['vector_rank'] = rank
+            item['similarity'] = similarity
+            item['score'] += 1.0 / (RRF_K + rank)
+
+        ranked = sorted(fused.values(), key=lambda x: -x['score'])[:limit]
+
+        # Vector-only hits: load display fields from search_index
+        missing = [r['id'] for r in ranked if 'title' not in r]
+        if missing:
+            conn = self._get_db()
+            try:
+                rows = conn.execute(f"""
+                    SELECT id, source, source_id, source_path, title, category,
+                           word_count, file_size, indexed_at, substr(content, 1, 200) AS snippet
+                    FROM search_index WHERE id IN ({','.join('?' * len(missing))})
+                """, missing).fetchall()
+                tags = {}
+                for t in conn.execute(
+                        f"SELECT search_id, tag FROM search_tags WHERE search_id IN ({','.join('?' * len(missing))})",
+                        missing):
+                    tags.setdefault(t['search_id'], []).append(t['tag'])
+            finally:
+                conn.close()
+            by_id = {r['id']: r for r in rows}
+            for item in ranked:
+                row = by_id.get(item['id'])
+                if row is not None and 'title' not in item:
+                    item.update({k: row[k] for k in row.keys()}, relevance=0, tags=tags.get(row['id'], []))
+            ranked = [r for r in ranked if 'title' in r]
+
+        return True, ranked
+
     def search_by_tag(self, tags: List[str], limit: int = 20) -> Tuple[bool, List[Dict]]:
         """Find all items matching given tags (AND logic)."""
         self.ensure_schema()
@@ -1038,9 +1322,18 @@ def main():
     s.add_argument("--tag", "-t", action="append", help="Tag-Filter")
     s.add_argument("--limit", "-l", type=int, default=20)
 
+    h = sub.add_parser("hybrid", help="Hybrid-Suche (BM25 + Vektor)")
+    h.add_argument("query")
+    h.add_argument("--source", "-s", help="Quelle filtern")
+    h.add_argument("--limit", "-l", type=int, default=20)
+
+    sub.add_parser("embed", help="Embeddings fuer den Index erzeugen/aktualisieren")
+
     sc = sub.add_parser("scan", help="Verzeichnis scannen")
     sc.add_argument("directory")
     sc.add_argument("--no-tags", action="store_true")
+    sc.add_argument("--full", action="store_true", help="Alle Dateien neu hashen")
+    sc.add_argument("--workers", "-w", type=int, default=None, help="Prozesse fuer Hashing")
 
     sub.add_parser("tags", help="Alle Tags anzeigen")
     sub.add_parser("dupes", help="Duplikate finden")
@@ -1066,8 +1359,21 @@ def main():
             if r.get('snippet'):
                 print(f"    {r['snippet'][:120]}")
             print()
+    elif args.cmd == "hybrid":
+        sources = [args.source] if args.source else None
+        ok, results = engine.search_hybrid(args.query, sources=sources, limit=args.limit)
+        for r in results:
+            ranks = f"bm25={r['bm25_rank'] or '-'} vec={r['vector_rank'] or '-'}"
+            print(f"  [{r['source']}] {r['title']}  ({ranks})")
+            if r.get('snippet'):
+                print(f"    {r['snippet'][:120]}")
+            print()
+    elif args.cmd == "embed":
+        ok, msg = engine.embed_index()
+        print(msg)
     elif args.cmd == "scan":
-        ok, msg = engine.scan_directory(args.directory, tags_from_path=not args.no_tags)
+        ok, msg = engine.scan_directory(args.directory, tags_from_path=not args.no_tags,
+                                        incremental=not args.full, workers=args.workers)
         print(msg)
     elif args.cmd == "tags":
         ok, tags = engine.list_tags()